@@ -64,6 +64,9 @@ class PlanCommand(DirectCommand):
             plan_id = parts[1]
             return await self._delete_plan(plan_id)
 
+        if command == "reindex":
+            return await self._reindex()
+
         # Assume it's an objective for creating a plan
         objective = " ".join(parts)
         return await self._create_plan(objective, context)
@@ -287,15 +290,9 @@ class PlanCommand(DirectCommand):
         if plan.status == PlanStatus.RUNNING:
             raise CommandError(f"Cannot delete running plan '{plan_id}'. Stop it first with /stop {plan_id}")
         
-        # Delete plan files
-        plan_file = self.plan_manager.plans_dir / f"{plan_id}.json"
-        md_file = self.plan_manager.plans_dir / f"{plan_id}.md"
-        
+        # Delete plan files (and the catalog row)
         try:
-            if plan_file.exists():
-                plan_file.unlink()
-            if md_file.exists():
-                md_file.unlink()
+            await self.plan_manager.delete_plan(plan_id)
             
             success_message = f"✅ Plan '{plan_id}' deleted successfully"
             
@@ -307,6 +304,24 @@ class PlanCommand(DirectCommand):
         except Exception as e:
             raise CommandError(f"Failed to delete plan '{plan_id}': {str(e)}")
     
+    async def _reindex(self) -> CommandResult:
+        """Rebuild the plan and approval catalogs from the JSON files on disk"""
+        from ...orchestration.approval_system import get_approval_system
+
+        plan_stats = await self.plan_manager.rebuild_catalog()
+        approval_stats = await get_approval_system().rebuild_catalog()
+
+        lines = []
+        for label, stats in (("Plans", plan_stats), ("Approvals", approval_stats)):
+            lines.append(
+                f"{label}: {stats['scanned']} files, {stats['updated']} reindexed, "
+                f"{stats['removed']} removed, {stats['errors']} unreadable"
+            )
+        return CommandResult.success_result(
+            success_panel("\n".join(lines), title="🗂️ Catalog Rebuilt"),
+            "rich"
+        )
+
     def get_help(self) -> str:
         """Get command help"""
         return """Create and manage autonomous execution plans
@@ -318,6 +333,7 @@ Usage:
   /plan list [status]            List plans (optionally filter by status)
   /plan show <plan_id>           Show detailed plan information
   /plan delete <plan_id>         Delete a plan
+  /plan reindex                  Rebuild the plan/approval catalogs from disk
 
 Plan Status Values:
   draft, ready, running, paused, completed, failed, cancelled
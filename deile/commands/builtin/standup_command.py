@@ -19,6 +19,7 @@ from rich.text import Text
 
 from ...core.exceptions import CommandError
 from ...core.models.base import ModelMessage
+from ...core.models.coalescer import get_request_coalescer
 from ...core.models.router import get_model_router
 from ..base import CommandContext, CommandResult, DirectCommand
 from ._shared import emit_audit_event, wrap_command_errors
@@ -54,7 +55,9 @@ async def generate_narrative(prompt: str) -> str:
         raise CommandError("Nenhum provedor de IA disponível para gerar o standup.")
 
     messages = [ModelMessage(role="user", content=prompt)]
-    response = await provider.generate(messages, system_instruction="Você é um assistente técnico que gera resumos de standup em PT-BR.")
+    # Standups simultâneos (vários canais do bot) com os mesmos dados
+    # compartilham uma única chamada ao provedor.
+    response = await get_request_coalescer(provider).generate(messages, system_instruction="Você é um assistente técnico que gera resumos de standup em PT-BR.")
     return response.content
 
 
@@ -64,6 +64,14 @@ def _to_log_level(value: Any) -> LogLevel:
     return LogLevel(str(value).upper())
 
 
+def _to_log_drop_policy(value: Any) -> str:
+    # Mesmos valores de ``deile.storage.log_queue.DROP_POLICIES``.
+    policy = str(value).strip().lower()
+    if policy not in ("drop_newest", "drop_oldest", "block"):
+        raise ValueError(f"invalid logging.drop_policy: {value!r}")
+    return policy
+
+
 # Map of nested JSON paths in ``.deile/settings.json`` to ``Settings`` flat
 # fields, with a converter for each. Unknown keys are silently ignored —
 # that's how future-compatible forward-compat works.
@@ -80,6 +88,9 @@ _OVERRIDE_HANDLERS: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
     "logging.to_file": ("log_to_file", _to_bool),
     "logging.max_size_mb": ("log_file_max_size", _mb_to_bytes),
     "logging.backup_count": ("log_file_backup_count", int),
+    "logging.queue_size": ("log_queue_size", int),
+    "logging.drop_policy": ("log_drop_policy", _to_log_drop_policy),
+    "logging.compress_archives": ("log_compress_archives", _to_bool),
     "ui.streaming_enabled": ("streaming_enabled", _to_bool),
     "ui.show_tool_details": ("show_tool_details", _to_bool),
     "model.default_provider": ("default_model_provider", str),
@@ -220,6 +231,11 @@ class Settings:
     log_to_file: bool = True
     log_file_max_size: int = 10 * 1024 * 1024
     log_file_backup_count: int = 5
+    # Pipeline assíncrono (``deile.storage.log_queue``): capacidade da fila,
+    # política quando ela enche e compressão das horas arquivadas.
+    log_queue_size: int = 10_000
+    log_drop_policy: str = "drop_newest"
+    log_compress_archives: bool = False
 
     # Modelo (DELEGADO ao ConfigManager; mantido como fallback)
     default_model_provider: str = "gemini"
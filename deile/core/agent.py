@@ -1,5 +1,6 @@
 """Agent Orchestrator principal do DEILE"""
 
+import asyncio
 import logging
 import re
 import time
@@ -37,6 +38,8 @@ from .context_manager import ContextManager
 from .intent_analyzer import get_intent_analyzer
 from .models.reasoning import resolve_session_reasoning
 from .models.router import ModelRouter
+from .session_cache import (FlushState, SessionCache, flushed_state,
+                            persistable_context, plan_flush)
 from .proactive_analyzer import (ProactiveAction, ProactiveAnalyzer,
                                  get_proactive_analyzer)
 
@@ -271,9 +274,20 @@ def _select_configured_model_provider(
     return None, None, None, None
 
 
-def _self_record_circuit(provider_id: str, *, success: bool) -> None:
-    """Notify TierRouter's CircuitBreaker of a provider call outcome."""
+def _self_record_circuit(provider_id: str, *, success: bool,
+                         error: Optional[BaseException] = None) -> None:
+    """Notify TierRouter's CircuitBreaker of a provider call outcome.
+
+    A throttle (429/overload, see ``throttle_signal``) is back-pressure, not
+    breakage: the LoadTracker backs the provider off and the breaker is left
+    untouched.
+    """
     try:
+        if not success and error is not None:
+            from deile.core.models.routing_strategies import \
+                throttle_signal  # noqa: PLC0415
+            if throttle_signal(error) is not None:
+                return
         from deile.core.models.tier_router import \
             get_tier_router  # noqa: PLC0415
         tr = get_tier_router()
@@ -285,6 +299,22 @@ def _self_record_circuit(provider_id: str, *, success: bool) -> None:
         logger.debug("circuit-record failed for %s (success=%s): %s", provider_id, success, exc)
 
 
+def _begin_provider_call(provider: Any) -> Optional[Any]:
+    """Opens an in-flight slot in the shared LoadTracker (best-effort).
+
+    Returns a ``CallHandle`` the caller must ``finish`` — this is what gives
+    ``ADAPTIVE`` routing and tier spillover real in-flight counts, latency
+    EWMAs and 429 back-off.
+    """
+    try:
+        from deile.core.models.routing_strategies import (  # noqa: PLC0415
+            get_load_tracker, load_key)
+        return get_load_tracker().begin(load_key(provider))
+    except Exception as exc:
+        logger.debug("load-tracker begin failed: %s", exc)
+        return None
+
+
 async def _emit_router_event(event_type: str, payload: dict) -> None:
     """Best-effort observability emit; never raises."""
     try:
@@ -429,7 +459,9 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
         self.logger = get_logger()
 
         self._status = AgentStatus.IDLE
-        self._sessions: Dict[str, AgentSession] = {}
+        # LRU limitado com spill para o SessionStore (sessões persistidas).
+        self._sessions: SessionCache = SessionCache()
+        self._session_flush_state: Dict[str, FlushState] = {}
         self._request_count = 0
         self._skill_loader = None  # set by _auto_discover_components; used by reload_skills()
         self._skills_watcher = None  # set by _auto_discover_components; stopped in shutdown()
@@ -559,6 +591,7 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
             bot_context = kwargs.pop("bot_context", None)
 
             # Obtém ou cria sessão
+            await self._rehydrate_if_spilled(session_id)
             session = self._get_or_create_session(session_id, **kwargs)
             session.update_activity()
 
@@ -768,6 +801,9 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
     
     def delete_session(self, session_id: str) -> bool:
         """Remove sessão"""
+        flush_state = getattr(self, "_session_flush_state", None)
+        if flush_state is not None:
+            flush_state.pop(session_id, None)
         if session_id in self._sessions:
             del self._sessions[session_id]
             return True
@@ -805,6 +841,7 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
             "status": self._status.value,
             "request_count": self._request_count,
             "active_sessions": len(self._sessions),
+            "session_cache": self._sessions.get_stats() if isinstance(self._sessions, SessionCache) else {},
             "tools": self.tool_registry.get_stats(),
             "parsers": self.parser_registry.get_stats(),
             "context_manager": await self.context_manager.get_stats() if hasattr(self.context_manager, 'get_stats') else {},
@@ -837,7 +874,9 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
         Bot adapters call with `persisted=True` so a session survives restart.
         """
         if session_id in self._sessions:
-            return self._sessions[session_id]
+            session = self._sessions[session_id]
+            await self._spill_evicted_sessions()
+            return session
         if persisted:
             try:
                 store = await self.get_session_store()
@@ -852,8 +891,17 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
                         "last_activity": time.time(),
                     }
                     session = AgentSession.from_snapshot(snap)
+                    session.conversation_history = await store.get_messages(session_id)
                     self._sessions[session_id] = session
+                    # O que acabou de ser lido já está no store: a próxima
+                    # flush só escreve o que mudar daqui em diante.
+                    flush_state = getattr(self, "_session_flush_state", None)
+                    if flush_state is not None:
+                        flush_state[session_id] = flushed_state(session, plan_flush(session, None))
+                    if isinstance(self._sessions, SessionCache):
+                        self._sessions.rehydrations += 1
                     await store.touch(session_id)
+                    await self._spill_evicted_sessions()
                     return session
             except Exception:
                 logger.warning(
@@ -875,6 +923,7 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
                 )
             except Exception:
                 logger.warning("SessionStore upsert failed", exc_info=True)
+            await self._spill_evicted_sessions()
         return session
 
     async def get_session_store(self):
@@ -899,24 +948,80 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
         return self._session_store
 
     async def flush_persisted_sessions(self) -> int:
-        """Persist all sessions marked `persisted=True`. Returns count flushed."""
+        """Persist changed sessions marked `persisted=True`. Returns count written.
+
+        Sessões sem mudança desde a última flush são puladas; do histórico
+        só vão as entradas novas (append), salvo quando ele foi reescrito.
+        """
         if not hasattr(self, "_session_store") or self._session_store is None:
             return 0
-        flushed = 0
+        flushed = await self._spill_evicted_sessions()
         for sid, session in self._sessions.items():
             if not getattr(session, "persisted", False):
                 continue
             try:
-                await self._session_store.upsert(
-                    sid,
-                    str(session.working_directory),
-                    dict(session.context_data),
-                )
-                flushed += 1
+                if await self._write_session(sid, session):
+                    flushed += 1
             except Exception:
                 logger.warning(f"flush failed for session {sid}", exc_info=True)
         return flushed
 
+    async def _write_session(self, session_id: str, session: AgentSession) -> bool:
+        """Writes the dirty part of ``session``. Returns False when clean."""
+        if not hasattr(self, "_session_flush_state"):
+            self._session_flush_state = {}
+        state = self._session_flush_state.get(session_id)
+        plan = plan_flush(session, state)
+        working_directory = str(session.working_directory)
+        if plan.is_noop and state is not None and state.working_directory == working_directory:
+            return False
+        store = self._session_store
+        if plan.context_payload is not None or state is None or state.working_directory != working_directory:
+            payload = plan.context_payload
+            if payload is None:
+                payload = persistable_context(session.context_data)
+            await store.upsert(session_id, working_directory, payload)
+        else:
+            await store.touch(session_id)
+        await store.append_messages(
+            session_id, plan.history_start, plan.history_entries,
+            replace=plan.replace_history,
+        )
+        self._session_flush_state[session_id] = flushed_state(session, plan)
+        return True
+
+    async def _spill_evicted_sessions(self) -> int:
+        """Persists sessions the LRU evicted; they rehydrate on next access."""
+        cache = self._sessions
+        if not isinstance(cache, SessionCache):
+            return 0
+        pending = cache.take_pending_spill()
+        if not pending:
+            return 0
+        written = 0
+        try:
+            await self.get_session_store()
+        except Exception:
+            logger.warning("SessionStore unavailable; keeping evicted sessions resident", exc_info=True)
+            for sid, session in pending:
+                cache[sid] = session
+            return 0
+        for sid, session in pending:
+            try:
+                if await self._write_session(sid, session):
+                    written += 1
+                cache.mark_spilled(sid)
+            except Exception:
+                logger.warning(f"spill failed for session {sid}; keeping it resident", exc_info=True)
+                cache[sid] = session
+        return written
+
+    async def _rehydrate_if_spilled(self, session_id: str) -> None:
+        """Traz de volta do SessionStore uma sessão despejada pelo LRU."""
+        cache = getattr(self, "_sessions", None)
+        if isinstance(cache, SessionCache) and cache.was_spilled(session_id):
+            await self.get_or_create_session(session_id, persisted=True)
+
     async def shutdown(self) -> None:
         """Graceful shutdown — flush sessions, close store."""
         try:
@@ -953,6 +1058,9 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
             session = self.create_session(session_id, **kwargs)
         else:
             session = self._sessions[session_id]
+            if isinstance(self._sessions, SessionCache):
+                # Pesa o crescimento do turno anterior (incremental).
+                self._sessions.reweigh(session_id)
         # Re-injection em cada turn é barata (apenas escreve no dict) e
         # sobrevive a substituições de console em testes. ``getattr`` defensivo
         # pq fixtures de teste constroem o agente via ``__new__`` (skip __init__).
@@ -1264,6 +1372,7 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
                     message_content = message_parts
                     logger.info("Sent message with %d file attachments", len(context["file_data_parts"]))
 
+                _call = _begin_provider_call(model_provider)
                 try:
                     # `_gemini_chat_with_tools` agora devolve 3-tuple:
                     # (text, tool_results, ModelUsage agregado). Antes desse
@@ -1292,8 +1401,17 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
                             _rec_err,
                         )
                     _self_record_circuit(model_provider.provider_id, success=True)
+                    if _call is not None:
+                        _call.finish(output_tokens=getattr(_gemini_usage, "completion_tokens", 0) or 0)
+                except (asyncio.CancelledError, GeneratorExit):
+                    if _call is not None:
+                        _call.abandon()
+                    raise
                 except Exception as _gemini_err:
-                    _self_record_circuit(model_provider.provider_id, success=False)
+                    if _call is not None:
+                        _call.finish(success=False, error=_gemini_err)
+                    _self_record_circuit(model_provider.provider_id, success=False,
+                                         error=_gemini_err)
                     await _emit_router_event(
                         "cascade_fallback",
                         {
@@ -1383,6 +1501,7 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
                 while attempt < MAX_CASCADE_ATTEMPTS:
                     attempt += 1
                     tried_providers.add(model_provider.provider_id)
+                    _call = _begin_provider_call(model_provider)
                     try:
                         # Provider records its own usage internally via _record_usage()
                         content, tool_results_raw, _usage = await model_provider.chat_with_tools(
@@ -1393,11 +1512,20 @@ class DeileAgent(AgentStreamingMixin, AgentAutonomousMixin):
                             reasoning_effort=resolve_session_reasoning(session),
                         )
                         _self_record_circuit(model_provider.provider_id, success=True)
+                        if _call is not None:
+                            _call.finish(output_tokens=getattr(_usage, "completion_tokens", 0) or 0)
                         last_error = None
                         break
+                    except (asyncio.CancelledError, GeneratorExit):
+                        if _call is not None:
+                            _call.abandon()
+                        raise
                     except Exception as _chat_err:
+                        if _call is not None:
+                            _call.finish(success=False, error=_chat_err)
                         last_error = _chat_err
-                        _self_record_circuit(model_provider.provider_id, success=False)
+                        _self_record_circuit(model_provider.provider_id, success=False,
+                                             error=_chat_err)
                         await _emit_router_event(
                             "cascade_fallback",
                             {
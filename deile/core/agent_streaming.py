@@ -16,6 +16,7 @@ imported lazily inside each method to avoid a circular import at module load.
 
 from __future__ import annotations
 
+import asyncio
 import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
@@ -32,6 +33,55 @@ if TYPE_CHECKING:
     from .models.stream_events import UnifiedStreamEvent
 
 
+class _LoadTrackedProvider:
+    """Provider proxy that brackets each ``generate_stream`` round in the
+    LoadTracker.
+
+    ``ToolLoopExecutor`` calls ``generate_stream`` once per round and runs the
+    tools in between. A slot opened per round therefore measures only the
+    provider: TTFT is that round's first text delta, and the slot closes on the
+    round's USAGE_FINAL/ERROR, before any tool runs. Everything else is
+    delegated to the wrapped provider.
+    """
+
+    def __init__(self, provider: Any) -> None:
+        self._provider = provider
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._provider, name)
+
+    async def generate_stream(self, *args: Any, **kwargs: Any) -> AsyncIterator["UnifiedStreamEvent"]:
+        from deile.core.models.errors import ProviderInvocationError
+        from deile.core.models.stream_events import StreamEventType
+
+        from .agent import _begin_provider_call
+
+        call = _begin_provider_call(self._provider)
+        try:
+            async for event in self._provider.generate_stream(*args, **kwargs):
+                if call is not None:
+                    if event.type == StreamEventType.TEXT_DELTA:
+                        call.first_token()
+                    elif event.type == StreamEventType.USAGE_FINAL:
+                        call.finish(output_tokens=getattr(event.usage, "output_tokens", 0) or 0)
+                    elif event.type == StreamEventType.ERROR:
+                        error = (ProviderInvocationError(event.error_envelope)
+                                 if event.error_envelope is not None else None)
+                        call.finish(success=False, error=error)
+                yield event
+        except (GeneratorExit, asyncio.CancelledError):
+            if call is not None:
+                call.abandon()
+            raise
+        except Exception as exc:
+            if call is not None:
+                call.finish(success=False, error=exc)
+            raise
+        finally:
+            if call is not None:
+                call.finish()
+
+
 class AgentStreamingMixin:
     """Streaming-pipeline methods for :class:`DeileAgent`."""
 
@@ -86,6 +136,7 @@ class AgentStreamingMixin:
             # ficando "(sem atividade ainda)" o turno inteiro — confirmado em
             # teste end-to-end real com deepseek-v4-flash.
             skip_autonomous = bool(kwargs.pop("_skip_autonomous", False))
+            await self._rehydrate_if_spilled(session_id)
             session = self._get_or_create_session(session_id, **kwargs)
             session.update_activity()
             session.add_to_history("user", user_input)
@@ -629,9 +680,11 @@ class AgentStreamingMixin:
             )
         except Exception:  # noqa: BLE001
             _istate_stream = None
+        # Load signals for adaptive routing are recorded per provider round
+        # (see ``_LoadTrackedProvider``), never across tool execution.
         try:
             async for event in executor.run(
-                provider=model_provider,
+                provider=_LoadTrackedProvider(model_provider),
                 messages=messages_for_provider,
                 tools=tools,
                 system_instruction=system_instruction,
@@ -714,6 +767,7 @@ class AgentStreamingMixin:
         # Stash bot params on session before streaming consumer reads them.
         session_kwargs = dict(kwargs)
         if extra_system_prompt is not None or bot_context is not None:
+            await self._rehydrate_if_spilled(session_id)
             session = self._get_or_create_session(session_id, **session_kwargs)
             if extra_system_prompt is not None:
                 from deile.core.bot_hooks import sanitize_extra_system_prompt
@@ -25,6 +25,7 @@ from deile.core.models.stream_events import (ModelUsageSnapshot,
 from deile.core.models.tool_execution import (build_tool_result_payload,
                                               payload_to_text,
                                               resolve_and_execute_tool)
+from deile.tools.schema_export import export_schemas
 
 logger = logging.getLogger(__name__)
 
@@ -203,7 +204,7 @@ class AnthropicProvider(ModelProvider):
         system_instruction = self._compose_system_instruction(system_instruction)
         system = self._extract_system(messages, system_instruction)
         anthropic_msgs: List[Dict[str, Any]] = self._to_anthropic_messages(messages)
-        anthropic_tools = [t.to_anthropic_tool() for t in tools] if tools else []
+        anthropic_tools = export_schemas(tools, "anthropic") if tools else []
 
         total_input = total_output = total_cached = 0
         tool_results: List[Any] = []
@@ -365,7 +366,7 @@ class AnthropicProvider(ModelProvider):
         if system:
             create_kwargs["system"] = self._system_blocks(system)
         if tools:
-            create_kwargs["tools"] = [t.to_anthropic_tool() for t in tools]
+            create_kwargs["tools"] = export_schemas(tools, "anthropic")
         # Reasoning effort → output_config.effort via extra_body (best-effort).
         self._apply_reasoning_extra_body(
             create_kwargs, self._pop_reasoning_extra_body(kwargs)
@@ -0,0 +1,357 @@
+"""Request coalescing and micro-batching for auxiliary model calls.
+
+Small helper prompts (classification, triage labels, short summaries) used
+to go to the provider one by one, each paying a full round-trip, even when
+several were pending at once and many were identical. :class:`RequestCoalescer`
+sits in front of one :class:`~deile.core.models.base.ModelProvider`:
+
+- **singleflight** — concurrent ``generate`` calls with the same provider,
+  model, system prompt, messages and kwargs share one in-flight request.
+  Followers get a copy of the leader's response marked
+  ``metadata["coalesced"] = True`` (usage is reported once, by the leader).
+  The shared request runs in a task owned by the coalescer, so cancelling
+  any one caller — the leader included — leaves the others waiting; it is
+  cancelled only when every caller has gone;
+- **micro-batching** — calls that opt in with ``batchable=True`` (a single
+  short user message, no tools) wait up to ``batch_window_s`` for
+  compatible peers (same system prompt and kwargs). The group is sent as one
+  structured request asking for a JSON array of answers; each caller gets
+  its own :class:`ModelResponse` with a prorated share of the usage. If the
+  reply cannot be parsed, or some answers are missing, the affected
+  requests are re-sent individually, so batching never changes what a
+  caller receives — only how many round-trips it costs.
+
+Streaming and tool-loop calls are never coalesced.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import re
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import ModelMessage, ModelProvider, ModelResponse, ModelUsage
+
+logger = logging.getLogger(__name__)
+
+#: Prompts longer than this are never batched (batching targets small calls).
+DEFAULT_MAX_BATCH_PROMPT_CHARS = 2000
+
+_BATCH_INSTRUCTION = (
+    "You will receive several independent requests as a JSON object "
+    '{{"requests": [{{"id": <int>, "prompt": <str>}}, ...]}}. Answer each one '
+    "on its own, exactly as if it had been sent alone. Reply with ONLY a JSON "
+    'object {{"responses": [{{"id": <int>, "content": <str>}}, ...]}} holding '
+    "one entry for each of the {n} ids."
+)
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def _fingerprint(value: Any) -> Any:
+    """JSON-able, order-stable view of ``value`` used for request keys."""
+    if isinstance(value, dict):
+        return {str(k): _fingerprint(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _fingerprint(dataclasses.asdict(value))
+    if hasattr(value, "value"):  # Enum
+        return _fingerprint(value.value)
+    return repr(value)
+
+
+def _digest(*parts: Any) -> str:
+    blob = json.dumps(_fingerprint(parts), separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CoalescerStats:
+    """Counters exposed by :meth:`RequestCoalescer.get_stats`."""
+
+    requests: int = 0
+    provider_calls: int = 0
+    deduped: int = 0
+    batches: int = 0
+    batched_requests: int = 0
+    batch_fallbacks: int = 0
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Future
+    waiters: int = 0
+
+
+@dataclass
+class _Pending:
+    prompt: str
+    future: asyncio.Future
+
+
+@dataclass
+class _Batch:
+    system_instruction: Optional[str]
+    kwargs: Dict[str, Any]
+    items: List[_Pending] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class RequestCoalescer:
+    """Singleflight + micro-batching front for one provider (see module docstring)."""
+
+    def __init__(
+        self,
+        provider: ModelProvider,
+        *,
+        batch_window_s: float = 0.02,
+        max_batch_size: int = 8,
+        max_batch_prompt_chars: int = DEFAULT_MAX_BATCH_PROMPT_CHARS,
+    ) -> None:
+        self.provider = provider
+        self.batch_window_s = batch_window_s
+        self.max_batch_size = max_batch_size
+        self.max_batch_prompt_chars = max_batch_prompt_chars
+        self.stats = CoalescerStats()
+        self._inflight: Dict[str, _Flight] = {}
+        self._batches: Dict[str, _Batch] = {}
+        self._tasks: set = set()
+
+    # ------------------------------------------------------------- public
+
+    async def generate(
+        self,
+        messages: List[ModelMessage],
+        system_instruction: Optional[str] = None,
+        *,
+        batchable: bool = False,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        """Same contract as ``provider.generate``, with dedup and optional batching."""
+        self.stats.requests += 1
+        key = _digest(
+            getattr(self.provider, "provider_id", type(self.provider).__name__),
+            getattr(self.provider, "model_name", None), system_instruction,
+            [(m.role, m.content, m.metadata) for m in messages], kwargs,
+        )
+        flight = self._inflight.get(key)
+        leader = flight is None
+        if leader:
+            if batchable and self._can_batch(messages, kwargs):
+                work = self._enqueue(messages[0].content, system_instruction, kwargs)
+            else:
+                work = self._call(messages, system_instruction, kwargs)
+            flight = self._inflight[key] = _Flight(asyncio.ensure_future(work))
+            self._tasks.add(flight.task)
+            flight.task.add_done_callback(lambda task: self._land(key, flight))
+        else:
+            self.stats.deduped += 1
+
+        flight.waiters += 1
+        try:
+            response = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()  # nobody left to deliver to
+            raise
+        finally:
+            flight.waiters -= 1
+        return response if leader else self._follower_copy(response)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dataclasses.asdict(self.stats)
+        stats["calls_saved"] = max(0, self.stats.requests - self.stats.provider_calls)
+        return stats
+
+    # ----------------------------------------------------------- internal
+
+    def _land(self, key: str, flight: _Flight) -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        self._tasks.discard(flight.task)
+        if not flight.task.cancelled():
+            flight.task.exception()  # waiters re-raise; silence "never retrieved"
+
+    @staticmethod
+    def _follower_copy(response: ModelResponse) -> ModelResponse:
+        return dataclasses.replace(
+            response,
+            usage=ModelUsage(),
+            metadata={**response.metadata, "coalesced": True},
+        )
+
+    def _can_batch(self, messages: List[ModelMessage], kwargs: Dict[str, Any]) -> bool:
+        return (
+            self.max_batch_size > 1
+            and len(messages) == 1
+            and messages[0].role == "user"
+            and not messages[0].metadata
+            and len(messages[0].content) <= self.max_batch_prompt_chars
+            and not kwargs.get("tools")
+        )
+
+    async def _call(
+        self,
+        messages: List[ModelMessage],
+        system_instruction: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> ModelResponse:
+        self.stats.provider_calls += 1
+        return await self.provider.generate(messages, system_instruction, **kwargs)
+
+    def _enqueue(
+        self, prompt: str, system_instruction: Optional[str], kwargs: Dict[str, Any],
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        bkey = _digest(system_instruction, kwargs)
+        batch = self._batches.get(bkey)
+        if batch is None:
+            batch = self._batches[bkey] = _Batch(system_instruction, dict(kwargs))
+            batch.timer = loop.call_later(self.batch_window_s, self._flush, bkey)
+        item = _Pending(prompt, loop.create_future())
+        batch.items.append(item)
+        if len(batch.items) >= self.max_batch_size:
+            self._flush(bkey)
+        return item.future
+
+    def _flush(self, bkey: str) -> None:
+        batch = self._batches.pop(bkey, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: _Batch) -> None:
+        # Members whose every caller left were cancelled while the window was open.
+        items = [it for it in batch.items if not it.future.done()]
+        if not items:
+            return
+        if len(items) == 1:
+            await self._run_single(items[0], batch)
+            return
+        self.stats.batches += 1
+        self.stats.batched_requests += len(items)
+        payload = json.dumps(
+            {"requests": [{"id": i, "prompt": it.prompt} for i, it in enumerate(items)]},
+            ensure_ascii=False,
+        )
+        system = _BATCH_INSTRUCTION.format(n=len(items))
+        if batch.system_instruction:
+            system = batch.system_instruction.rstrip() + "\n\n" + system
+        try:
+            reply = await self._call(
+                [ModelMessage(role="user", content=payload)], system, batch.kwargs,
+            )
+        except Exception as exc:  # noqa: BLE001 — every member sees the error
+            for it in items:
+                if not it.future.done():
+                    it.future.set_exception(exc)
+            return
+        answers = self._parse_batch_reply(reply.content, len(items))
+        missing = [it for i, it in enumerate(items) if i not in answers]
+        if missing:
+            self.stats.batch_fallbacks += 1
+            logger.debug("batched reply answered %d/%d requests; re-sending the rest",
+                         len(items) - len(missing), len(items))
+        total_chars = sum(len(it.prompt) for i, it in enumerate(items) if i in answers) or 1
+        for i, it in enumerate(items):
+            if i in answers and not it.future.done():
+                it.future.set_result(self._member_response(
+                    reply, answers[i], len(it.prompt) / total_chars, len(items),
+                ))
+        await asyncio.gather(*(self._run_single(it, batch) for it in missing))
+
+    async def _run_single(self, item: _Pending, batch: _Batch) -> None:
+        if item.future.done():
+            return
+        try:
+            response = await self._call(
+                [ModelMessage(role="user", content=item.prompt)],
+                batch.system_instruction, batch.kwargs,
+            )
+        except Exception as exc:  # noqa: BLE001 — delivered to the caller
+            if not item.future.done():
+                item.future.set_exception(exc)
+        else:
+            if not item.future.done():
+                item.future.set_result(response)
+
+    @staticmethod
+    def _parse_batch_reply(content: str, n: int) -> Dict[int, str]:
+        text = _FENCE_RE.sub("", (content or "").strip())
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return {}
+        entries = data.get("responses") if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            return {}
+        out: Dict[int, str] = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            idx, answer = entry.get("id"), entry.get("content")
+            if isinstance(idx, int) and 0 <= idx < n and isinstance(answer, str):
+                out[idx] = answer
+        return out
+
+    @staticmethod
+    def _member_response(
+        reply: ModelResponse, content: str, share: float, batch_size: int,
+    ) -> ModelResponse:
+        u = reply.usage
+        usage = ModelUsage(
+            prompt_tokens=round(u.prompt_tokens * share),
+            completion_tokens=round(u.completion_tokens * share),
+            total_tokens=round(u.total_tokens * share),
+            cached_tokens=round(u.cached_tokens * share),
+            request_time=u.request_time,
+            cost_estimate=u.cost_estimate * share,
+        )
+        return dataclasses.replace(
+            reply, content=content, usage=usage, raw_response=None,
+            metadata={**reply.metadata, "batched": True, "batch_size": batch_size},
+        )
+
+
+#: loop → provider → coalescer (both levels weak).
+_coalescers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def get_request_coalescer(provider: ModelProvider) -> RequestCoalescer:
+    """Shared :class:`RequestCoalescer` for ``provider`` on the running loop.
+
+    One per ``(loop, provider)``: in-flight and batched requests hold futures
+    of the loop that created them, so a coalescer is never reused from another
+    loop (``asyncio.run`` per command, tests).
+
+    Raises:
+        RuntimeError: called without a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    per_loop = _coalescers.get(loop)
+    if per_loop is None:
+        per_loop = _coalescers[loop] = weakref.WeakKeyDictionary()
+    coalescer = per_loop.get(provider)
+    if coalescer is None:
+        coalescer = per_loop[provider] = RequestCoalescer(provider)
+    return coalescer
+
+
+__all__: Tuple[str, ...] = (
+    "CoalescerStats",
+    "RequestCoalescer",
+    "get_request_coalescer",
+)
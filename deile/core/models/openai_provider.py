@@ -27,6 +27,7 @@ from deile.core.models.tool_execution import (OUTCOME_EXCEPTION,
                                               build_tool_result_payload,
                                               payload_to_text,
                                               resolve_and_execute_tool)
+from deile.tools.schema_export import export_schemas
 
 logger = logging.getLogger(__name__)
 
@@ -211,7 +212,7 @@ class OpenAIProvider(ModelProvider):
         start = time.time()
         system_instruction = self._compose_system_instruction(system_instruction)
         oai_msgs: List[Dict[str, Any]] = self._to_openai_messages(messages, system_instruction)
-        oai_tools = [t.to_openai_function() for t in tools] if tools else []
+        oai_tools = export_schemas(tools, "openai") if tools else []
 
         total_prompt = total_completion = total_cached = 0
         total_reported_cost = 0.0  # sum of usage.cost reported by OpenRouter (OR5)
@@ -385,7 +386,7 @@ class OpenAIProvider(ModelProvider):
             "stream_options": {"include_usage": True},
         }
         if tools:
-            create_kwargs["tools"] = [t.to_openai_function() for t in tools]
+            create_kwargs["tools"] = export_schemas(tools, "openai")
             create_kwargs["tool_choice"] = "auto"
         # Reasoning effort → reasoning_effort / thinking via extra_body (best-effort).
         self._apply_reasoning_extra_body(create_kwargs, self._provider_extra_body())
@@ -0,0 +1,396 @@
+"""Persistent, content-addressed cache for deterministic model responses.
+
+Helper prompts (classification, triage labels, commit message drafts,
+rubric checks) are usually sent at temperature 0 and reappear verbatim
+across pipeline ticks and workers, yet every occurrence paid a provider
+round-trip. :class:`ResponseCache` stores their answers in SQLite, keyed by
+a hash of everything that can change the output:
+
+- provider id and model name;
+- the system instruction and the messages, normalized (CRLF → LF, trailing
+  whitespace per line and surrounding blank lines stripped) so cosmetic
+  differences in how a prompt was assembled do not defeat the cache. Message
+  ``metadata`` is part of the key too: providers read attachments and
+  tool-call ids from it;
+- tools (order-insensitive by name) and every sampling kwarg. Bookkeeping
+  kwargs that never reach the model (``session_id``, ``working_directory``,
+  ...) are left out so the same prompt hits across sessions.
+
+Caching is opt-in per call site: only calls routed through
+:meth:`ResponseCache.generate` with an explicit ``temperature=0`` are
+cached. Calls that leave the temperature out bypass it — provider defaults
+sample (usually ``temperature`` 1.0), so their answers are not
+reproducible. Entries expire after ``ttl_s`` and the file
+is kept under ``max_bytes`` by evicting least-recently-used rows. Each
+lookup is reported to :class:`~deile.storage.usage_repository.UsageRepository`
+(``record_cache_event``, in a worker thread), so hit rate and the tokens/cost saved show up
+next to the regular usage records.
+
+Modes (``DEILE_LLM_CACHE_MODE`` for the shared instance):
+
+- ``readwrite`` (default): serve hits, store misses;
+- ``replay``: serve hits only — a miss raises :class:`ResponseCacheMiss`
+  instead of calling the provider. Tests point ``DEILE_LLM_CACHE_PATH`` at a
+  recorded cache to run offline and deterministically;
+- ``off``: pass every call straight to the provider.
+
+Storage goes through :mod:`deile.storage.sqlite_pool`, so concurrent
+workers on the same host share one WAL-mode file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from deile.storage.sqlite_pool import get_database
+
+from .base import ModelMessage, ModelProvider, ModelResponse, ModelUsage
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DB_PATH = Path.home() / ".deile" / "db" / "llm_cache.db"
+DEFAULT_TTL_S = 7 * 86_400
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+MODES = ("readwrite", "replay", "off")
+
+#: kwargs consumed by the providers themselves, never sent to the model.
+_NON_SEMANTIC_KWARGS = frozenset({
+    "session_id", "session_data", "working_directory", "default_headers",
+})
+
+_KEY_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    key               TEXT    PRIMARY KEY,
+    provider_id       TEXT    NOT NULL,
+    model_id          TEXT    NOT NULL,
+    content           TEXT    NOT NULL,
+    finish_reason     TEXT,
+    metadata          TEXT    NOT NULL DEFAULT '{}',
+    prompt_tokens     INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    total_tokens      INTEGER NOT NULL DEFAULT 0,
+    cost_usd          REAL    NOT NULL DEFAULT 0.0,
+    size_bytes        INTEGER NOT NULL,
+    created_at        REAL    NOT NULL,
+    expires_at        REAL    NOT NULL,
+    last_used_at      REAL    NOT NULL,
+    hits              INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_response_cache (expires_at);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_lru ON llm_response_cache (last_used_at);
+"""
+
+
+class ResponseCacheMiss(LookupError):
+    """Raised in ``replay`` mode when a request has no recorded response."""
+
+    def __init__(self, key: str, provider_id: str, model_id: str) -> None:
+        super().__init__(
+            f"no cached response for {provider_id}:{model_id} (key {key[:16]}…) "
+            "and the response cache is in replay mode"
+        )
+        self.key = key
+
+
+def _normalize_text(text: Any) -> Any:
+    if not isinstance(text, str):
+        return text
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "value"):  # Enum
+        return _canonical(value.value)
+    return repr(value)
+
+
+def _tool_name(tool: Any) -> str:
+    if isinstance(tool, dict):
+        return str(tool.get("name") or tool.get("function", {}).get("name") or "")
+    return str(getattr(tool, "name", ""))
+
+
+def response_cache_key(
+    provider_id: str,
+    model_id: str,
+    messages: List[ModelMessage],
+    system_instruction: Optional[str] = None,
+    **kwargs: Any,
+) -> str:
+    """Content address of one ``generate`` call (see module docstring)."""
+    params = {k: v for k, v in kwargs.items() if k not in _NON_SEMANTIC_KWARGS}
+    tools = params.pop("tools", None)
+    if tools:
+        tools = sorted((_canonical(t) for t in tools), key=lambda t: (_tool_name(t), json.dumps(t, sort_keys=True)))
+    payload = {
+        "v": _KEY_VERSION,
+        "provider": provider_id,
+        "model": model_id,
+        "system": _normalize_text(system_instruction),
+        "messages": [[m.role.lower(), _normalize_text(m.content), _canonical(m.metadata or {})]
+                     for m in messages],
+        "tools": tools or None,
+        "params": _canonical(params),
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _json_metadata(metadata: Dict[str, Any]) -> str:
+    try:
+        return json.dumps(metadata or {}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return json.dumps({k: v for k, v in (metadata or {}).items()
+                           if isinstance(v, (str, int, float, bool)) or v is None})
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL and LRU size eviction."""
+
+    def __init__(
+        self,
+        db_path: Path = _DEFAULT_DB_PATH,
+        *,
+        ttl_s: float = DEFAULT_TTL_S,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        mode: str = "readwrite",
+        usage_repository: Optional[Any] = None,
+        prune_every: int = 64,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"invalid response cache mode {mode!r} (expected one of {MODES})")
+        self.db_path = Path(db_path)
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.prune_every = max(1, prune_every)
+        self._usage_repository = usage_repository
+        self._puts_since_prune = 0
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self.db = get_database(self.db_path)
+        self.db.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------ storage
+
+    def get(self, key: str, *, now: Optional[float] = None) -> Optional[ModelResponse]:
+        """Cached response for ``key`` (``None`` if absent or expired)."""
+        now = time.time() if now is None else now
+
+        def _tx(conn: sqlite3.Connection):
+            return conn.execute(
+                "SELECT * FROM llm_response_cache WHERE key=? AND expires_at>?", (key, now),
+            ).fetchone()
+
+        row = self.db.read(_tx)
+        if row is None:
+            return None
+        # Recency bookkeeping is fire-and-forget: the hit does not wait on it.
+        self.db.submit(lambda conn: conn.execute(
+            "UPDATE llm_response_cache SET last_used_at=?, hits=hits+1 WHERE key=?", (now, key),
+        ))
+        (_key, _provider, model_id, content, finish_reason, metadata,
+         prompt_tokens, completion_tokens, total_tokens, cost_usd,
+         _size, created_at, _expires, _last, _hits) = row
+        return ModelResponse(
+            content=content,
+            model_name=model_id,
+            usage=ModelUsage(),  # nothing billed for this answer
+            metadata={
+                **json.loads(metadata),
+                "cache_hit": True,
+                "cache_key": key,
+                "cached_at": created_at,
+                "cached_usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": total_tokens,
+                    "cost_usd": cost_usd,
+                },
+            },
+            finish_reason=finish_reason,
+        )
+
+    def put(
+        self,
+        key: str,
+        response: ModelResponse,
+        *,
+        provider_id: str,
+        ttl_s: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Stores ``response`` under ``key``; prunes every ``prune_every`` puts."""
+        now = time.time() if now is None else now
+        ttl = self.ttl_s if ttl_s is None else ttl_s
+        metadata = _json_metadata(response.metadata)
+        usage = response.usage
+        size = len(response.content.encode("utf-8")) + len(metadata) + len(key)
+
+        def _tx(conn: sqlite3.Connection):
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_response_cache
+                  (key, provider_id, model_id, content, finish_reason, metadata,
+                   prompt_tokens, completion_tokens, total_tokens, cost_usd,
+                   size_bytes, created_at, expires_at, last_used_at, hits)
+                VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,0)
+                """,
+                (key, provider_id, response.model_name, response.content,
+                 response.finish_reason, metadata, usage.prompt_tokens,
+                 usage.completion_tokens, usage.total_tokens, usage.cost_estimate,
+                 size, now, now + ttl, now),
+            )
+
+        self.db.write(_tx)
+        self.stats["stores"] += 1
+        self._puts_since_prune += 1
+        if self._puts_since_prune >= self.prune_every:
+            self.prune(now=now)
+
+    def prune(self, *, now: Optional[float] = None) -> int:
+        """Drops expired rows, then LRU rows until under ``max_bytes``."""
+        now = time.time() if now is None else now
+        max_bytes = self.max_bytes
+
+        def _tx(conn: sqlite3.Connection) -> int:
+            expired = conn.execute(
+                "DELETE FROM llm_response_cache WHERE expires_at<=?", (now,),
+            ).rowcount
+            over = conn.execute(
+                """
+                DELETE FROM llm_response_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size_bytes) OVER (
+                            ORDER BY last_used_at DESC, key
+                        ) AS running FROM llm_response_cache
+                    ) WHERE running > ?
+                )
+                """,
+                (max_bytes,),
+            ).rowcount
+            return expired + over
+
+        removed = self.db.write(_tx)
+        self._puts_since_prune = 0
+        self.stats["evictions"] += removed
+        if removed:
+            logger.debug("response cache %s: evicted %d entries", self.db_path, removed)
+        return removed
+
+    def clear(self) -> None:
+        self.db.write(lambda conn: conn.execute("DELETE FROM llm_response_cache"))
+
+    def size_bytes(self) -> int:
+        return int(self.db.read(lambda conn: conn.execute(
+            "SELECT COALESCE(SUM(size_bytes),0) FROM llm_response_cache").fetchone()[0]))
+
+    # ------------------------------------------------------------ calling
+
+    async def generate(
+        self,
+        provider: ModelProvider,
+        messages: List[ModelMessage],
+        system_instruction: Optional[str] = None,
+        *,
+        call_site: str = "",
+        ttl_s: Optional[float] = None,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        """``provider.generate`` served from the cache when possible.
+
+        ``call_site`` labels the lookup in the usage repository so hit rates
+        can be compared per helper prompt.
+        """
+        if self.mode == "off" or kwargs.get("temperature") != 0:
+            return await provider.generate(messages, system_instruction, **kwargs)
+
+        provider_id = getattr(provider, "provider_id", type(provider).__name__)
+        model_id = getattr(provider, "model_name", "") or ""
+        key = response_cache_key(provider_id, model_id, messages, system_instruction, **kwargs)
+
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            saved = cached.metadata["cached_usage"]
+            await self._report(provider_id, model_id, True, saved["total_tokens"],
+                               saved["cost_usd"], call_site)
+            return cached
+
+        self.stats["misses"] += 1
+        await self._report(provider_id, model_id, False, 0, 0.0, call_site)
+        if self.mode == "replay":
+            raise ResponseCacheMiss(key, provider_id, model_id)
+
+        response = await provider.generate(messages, system_instruction, **kwargs)
+        if response.content and not response.metadata.get("error"):
+            try:
+                await asyncio.to_thread(
+                    self.put, key, response, provider_id=provider_id, ttl_s=ttl_s)
+            except sqlite3.Error as exc:
+                logger.debug("response cache store failed (%s): %s", self.db_path, exc)
+        return response
+
+    async def _report(
+        self, provider_id: str, model_id: str, hit: bool,
+        saved_tokens: int, saved_cost_usd: float, call_site: str,
+    ) -> None:
+        # Telemetry fails open, like ModelProvider._record_usage. The
+        # repository opens a connection and commits per event: keep that
+        # blocking I/O off the event loop.
+        try:
+            repo = self._usage_repository
+            if repo is None:
+                from deile.storage.usage_repository import \
+                    get_usage_repository  # noqa: PLC0415
+                repo = get_usage_repository()
+            await asyncio.to_thread(
+                repo.record_cache_event,
+                provider_id=provider_id, model_id=model_id, hit=hit,
+                saved_tokens=saved_tokens, saved_cost_usd=saved_cost_usd,
+                call_site=call_site,
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("response cache event not recorded (%s): %s", provider_id, exc)
+
+
+# ---------------------------------------------------------------------------
+# Singleton factory
+# ---------------------------------------------------------------------------
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Shared cache configured from ``DEILE_LLM_CACHE_PATH`` / ``_MODE`` / ``_TTL_S``."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            Path(os.environ.get("DEILE_LLM_CACHE_PATH") or _DEFAULT_DB_PATH),
+            ttl_s=float(os.environ.get("DEILE_LLM_CACHE_TTL_S") or DEFAULT_TTL_S),
+            mode=os.environ.get("DEILE_LLM_CACHE_MODE") or "readwrite",
+        )
+    return _response_cache
+
+
+def reset_response_cache() -> None:
+    """Reset singleton (test helper)."""
+    global _response_cache
+    _response_cache = None
@@ -8,7 +8,8 @@ from typing import Any, Callable, Dict, List, Optional
 from ..exceptions import ModelError
 from .base import ModelProvider
 from .routing_strategies import (ModelMetrics, RoutingContext, RoutingStrategy,
-                                 RoutingStrategySelector)
+                                 RoutingStrategySelector, get_load_tracker,
+                                 load_key)
 from .tier import ModelTier
 from .tier_router import get_tier_router
 
@@ -45,7 +46,8 @@ class ModelRouter:
 
         # Máquina de estratégias legada (fallback quando não há tier ou o
         # TierRouter falha) — ver routing_strategies.py.
-        self._selector = RoutingStrategySelector()
+        self.load_tracker = get_load_tracker()
+        self._selector = RoutingStrategySelector(self.load_tracker)
 
         # Funções de decisão customizáveis
         self.custom_routing_functions: List[Callable[[RoutingContext, List[ModelProvider]], Optional[ModelProvider]]] = []
@@ -173,6 +175,9 @@ class ModelRouter:
         """Retorna estatísticas do router"""
         provider_stats = {}
         for key, metrics in self.metrics.items():
+            provider = self.providers.get(key)
+            if provider is not None:
+                metrics.active_requests = self.load_tracker.in_flight(load_key(provider))
             provider_stats[key] = {
                 "total_requests": metrics.total_requests,
                 "active_requests": metrics.active_requests,
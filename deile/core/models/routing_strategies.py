@@ -7,16 +7,24 @@ TierRouter-failure fallback. Keeping it here lets ``ModelRouter`` stay focused
 on its own responsibility — provider registration, metrics and circuit
 breaking.
 
+It also holds the load-aware pieces shared with ``TierRouter``:
+``LoadTracker`` (real in-flight counts, EWMA time-to-first-token / latency /
+tokens-per-second and 429/overload back-off per ``provider_id:model``) and
+``AdaptiveSelector`` (power-of-two-choices or least-outstanding-requests
+over those signals).
+
 Provider-agnostic: this module must NOT import any external SDK.
 """
 
 from __future__ import annotations
 
 import logging
+import random
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from deile.core.models.base import ModelProvider, ModelSize, ModelType
 
@@ -31,6 +39,7 @@ class RoutingStrategy(Enum):
     COST_OPTIMIZED = "cost_optimized"     # Otimizado para menor custo
     PERFORMANCE_OPTIMIZED = "performance" # Otimizado para performance
     LOAD_BALANCED = "load_balanced"       # Balanceamento de carga
+    ADAPTIVE = "adaptive"                 # In-flight + latência observada (P2C)
 
 
 @dataclass
@@ -54,14 +63,15 @@ class RoutingContext:
 class ModelMetrics:
     """Métricas de um modelo.
 
-    ``active_requests`` is kept for backwards compatibility but is never
-    incremented — a correct "active" counter would need symmetric
-    ``record_complete`` calls at every agent call site (refactor out of
-    scope). ``LEAST_BUSY``/``LOAD_BALANCED`` now use ``total_requests`` as
-    a monotonic proxy for "least historically used".
+    ``active_requests`` mirrors the in-flight count of the shared
+    :class:`LoadTracker` (refreshed by ``ModelRouter.get_stats``); the agent
+    call sites bracket every provider call with ``LoadTracker.begin`` /
+    ``finish``. ``LEAST_BUSY``/``LOAD_BALANCED`` keep using
+    ``total_requests`` as a monotonic proxy for "least historically used";
+    ``ADAPTIVE`` routes on the live signals.
     """
     total_requests: int = 0
-    active_requests: int = 0  # deprecated — always 0; see class docstring
+    active_requests: int = 0  # snapshot of LoadTracker in-flight; see docstring
     avg_response_time: float = 0.0
     error_rate: float = 0.0
     cost_per_token: float = 0.0
@@ -78,6 +88,260 @@ def _provider_key(provider: ModelProvider) -> str:
     return f"{provider.provider_name}:{provider.model_name}"
 
 
+def load_key(provider: Any) -> str:
+    """Key used by :class:`LoadTracker` — ``provider_id:model_name``."""
+    model = getattr(provider, "model_name", None)
+    provider_id = getattr(provider, "provider_id", None) or getattr(provider, "provider_name", "?")
+    return f"{provider_id}:{model}" if isinstance(model, str) and model else str(provider_id)
+
+
+# error_type values (see ``error_mapping.classify_http_error``) and HTTP
+# statuses that mean "back off", not "broken": they throttle a provider
+# without counting towards its circuit breaker.
+_THROTTLE_ERROR_TYPES = frozenset({"rate_limit", "overloaded"})
+_THROTTLE_STATUSES = frozenset({429, 503, 529})
+
+
+def throttle_signal(exc: BaseException) -> Optional[float]:
+    """Returns the back-off hint for a 429/overload error, else ``None``.
+
+    ``0.0`` means "throttled, no Retry-After"; a positive value is the
+    provider's Retry-After in seconds.
+    """
+    envelope = getattr(exc, "envelope", None)
+    error_type = getattr(envelope, "error_type", None)
+    status = getattr(envelope, "http_status", None) or getattr(exc, "status_code", None)
+    if error_type not in _THROTTLE_ERROR_TYPES and status not in _THROTTLE_STATUSES:
+        return None
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after", 0) or 0))
+    except (TypeError, ValueError, AttributeError):
+        return 0.0
+
+
+@dataclass
+class ProviderLoad:
+    """Live load signals of one ``provider_id:model``."""
+    in_flight: int = 0
+    ewma_ttft_s: Optional[float] = None
+    ewma_latency_s: Optional[float] = None
+    ewma_tokens_per_s: Optional[float] = None
+    completed: int = 0
+    failed: int = 0
+    throttled: int = 0
+    consecutive_throttles: int = 0
+    throttled_until: float = 0.0
+
+
+class CallHandle:
+    """One in-flight provider call (see :meth:`LoadTracker.begin`)."""
+
+    __slots__ = ("_tracker", "key", "started_at", "first_token_at", "_done")
+
+    def __init__(self, tracker: "LoadTracker", key: str, started_at: float):
+        self._tracker = tracker
+        self.key = key
+        self.started_at = started_at
+        self.first_token_at: Optional[float] = None
+        self._done = False
+
+    def first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = self._tracker.clock()
+
+    def finish(self, *, success: bool = True, output_tokens: int = 0,
+               error: Optional[BaseException] = None) -> None:
+        """Closes the call; idempotent so ``finally`` blocks can call it too."""
+        if self._done:
+            return
+        self._done = True
+        self._tracker._finish(self, success=success, output_tokens=output_tokens, error=error)
+
+    def abandon(self) -> None:
+        """Releases the slot without a sample (caller cancelled / went away)."""
+        if self._done:
+            return
+        self._done = True
+        self._tracker._release(self.key)
+
+
+class LoadTracker:
+    """Thread-safe per-provider in-flight counter and latency EWMAs.
+
+    ``begin(key)`` increments the in-flight count and returns a
+    :class:`CallHandle`; the call site reports the first streamed token and
+    then ``finish``es it with the output token count or the error. A
+    429/overload error opens a throttle window (Retry-After, or exponential
+    ``throttle_base_s`` back-off on repeats) during which selectors avoid the
+    provider while any alternative exists.
+    """
+
+    def __init__(self, *, alpha: float = 0.3, default_latency_s: float = 2.0,
+                 throttle_base_s: float = 2.0, throttle_max_s: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.alpha = alpha
+        self.default_latency_s = default_latency_s
+        self.throttle_base_s = throttle_base_s
+        self.throttle_max_s = throttle_max_s
+        self.clock = clock
+        self._loads: Dict[str, ProviderLoad] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> ProviderLoad:
+        load = self._loads.get(key)
+        if load is None:
+            load = self._loads[key] = ProviderLoad()
+        return load
+
+    def _ewma(self, old: Optional[float], sample: float) -> float:
+        return sample if old is None else old + self.alpha * (sample - old)
+
+    def begin(self, key: str) -> CallHandle:
+        with self._lock:
+            self._get(key).in_flight += 1
+        return CallHandle(self, key, self.clock())
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            load = self._get(key)
+            load.in_flight = max(0, load.in_flight - 1)
+
+    def _finish(self, handle: CallHandle, *, success: bool, output_tokens: int,
+                error: Optional[BaseException]) -> None:
+        now = self.clock()
+        retry_after = throttle_signal(error) if error is not None else None
+        with self._lock:
+            load = self._get(handle.key)
+            load.in_flight = max(0, load.in_flight - 1)
+            elapsed = max(0.0, now - handle.started_at)
+            if retry_after is not None:
+                load.throttled += 1
+                load.consecutive_throttles += 1
+                backoff = retry_after or min(
+                    self.throttle_max_s,
+                    self.throttle_base_s * 2 ** (load.consecutive_throttles - 1),
+                )
+                load.throttled_until = max(load.throttled_until, now + backoff)
+                return
+            if not success:
+                load.failed += 1
+                return
+            load.completed += 1
+            load.consecutive_throttles = 0
+            load.ewma_latency_s = self._ewma(load.ewma_latency_s, elapsed)
+            if handle.first_token_at is not None:
+                ttft = handle.first_token_at - handle.started_at
+                load.ewma_ttft_s = self._ewma(load.ewma_ttft_s, ttft)
+                gen_s = now - handle.first_token_at
+            else:
+                gen_s = elapsed
+            if output_tokens > 0 and gen_s > 0:
+                load.ewma_tokens_per_s = self._ewma(load.ewma_tokens_per_s, output_tokens / gen_s)
+
+    # ------------------------------------------------------------- queries
+
+    def snapshot(self, key: str) -> ProviderLoad:
+        with self._lock:
+            return replace(self._loads.get(key) or ProviderLoad())
+
+    def in_flight(self, key: str) -> int:
+        load = self._loads.get(key)
+        return load.in_flight if load else 0
+
+    def is_throttled(self, key: str) -> bool:
+        load = self._loads.get(key)
+        return bool(load) and load.throttled_until > self.clock()
+
+    def expected_latency(self, key: str) -> float:
+        load = self._loads.get(key)
+        if load is None or load.ewma_latency_s is None:
+            return self.default_latency_s
+        return load.ewma_latency_s
+
+    def cost(self, key: str) -> float:
+        """Expected completion time if routed now: ``(in_flight + 1) × latency``."""
+        return (self.in_flight(key) + 1) * self.expected_latency(key)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {k: dict(vars(v)) for k, v in self._loads.items()}
+
+
+class AdaptiveSelector:
+    """Load-aware choice among candidate providers.
+
+    ``mode="p2c"`` samples two candidates and keeps the one with the lower
+    :meth:`LoadTracker.cost` (power of two choices: near-optimal balance
+    without herding onto one "best" provider); ``"least_outstanding"`` takes
+    the global minimum of in-flight requests (ties → lower latency → order).
+    Throttled candidates are skipped while any other exists.
+
+    :meth:`choose_with_preference` keeps traffic on the first candidate (the
+    cascade primary) until it is throttled or busier than ``spill_factor``
+    times the best alternative, and counts those spillovers.
+    """
+
+    MODES = ("p2c", "least_outstanding")
+
+    def __init__(self, tracker: LoadTracker, *, mode: str = "p2c",
+                 spill_factor: float = 3.0, rng: Optional[random.Random] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"unknown adaptive mode {mode!r}; expected one of {self.MODES}")
+        self.tracker = tracker
+        self.mode = mode
+        self.spill_factor = spill_factor
+        self._rng = rng or random.Random()
+        self.spillovers = 0
+        self.decisions = 0
+
+    def _eligible(self, keys: Sequence[str]) -> List[int]:
+        idx = [i for i, k in enumerate(keys) if not self.tracker.is_throttled(k)]
+        return idx or list(range(len(keys)))
+
+    def choose(self, keys: Sequence[str]) -> int:
+        """Index into ``keys`` of the provider to use."""
+        if not keys:
+            raise ValueError("no candidates")
+        idx = self._eligible(keys)
+        if len(idx) == 1:
+            return idx[0]
+        if self.mode == "least_outstanding":
+            return min(idx, key=lambda i: (self.tracker.in_flight(keys[i]),
+                                           self.tracker.expected_latency(keys[i]), i))
+        a, b = self._rng.sample(idx, 2)
+        return a if self.tracker.cost(keys[a]) <= self.tracker.cost(keys[b]) else b
+
+    def choose_with_preference(self, keys: Sequence[str]) -> int:
+        """Like :meth:`choose`, but sticky to ``keys[0]`` until it saturates."""
+        self.decisions += 1
+        if len(keys) <= 1:
+            return 0
+        primary = keys[0]
+        if not self.tracker.is_throttled(primary):
+            rest = [i for i in range(1, len(keys)) if not self.tracker.is_throttled(keys[i])]
+            if not rest:
+                return 0
+            best_alt = min(self.tracker.cost(keys[i]) for i in rest)
+            if self.tracker.cost(primary) <= self.spill_factor * best_alt:
+                return 0
+        choice = self.choose(keys)
+        if choice != 0:
+            self.spillovers += 1
+        return choice
+
+
+_load_tracker: Optional[LoadTracker] = None
+
+
+def get_load_tracker() -> LoadTracker:
+    """Process-wide :class:`LoadTracker` shared by the routers and the agent."""
+    global _load_tracker
+    if _load_tracker is None:
+        _load_tracker = LoadTracker()
+    return _load_tracker
+
+
 class RoutingStrategySelector:
     """Applies a :class:`RoutingStrategy` to pick a provider from candidates.
 
@@ -86,7 +350,7 @@ class RoutingStrategySelector:
     :class:`ModelRouter`.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, load_tracker: Optional[LoadTracker] = None) -> None:
         # ``itertools.count`` is atomic under the CPython GIL — replaces a
         # non-atomic ``idx = self._cursor; self._cursor += 1`` that allowed
         # two concurrent ``select_provider`` callers to collide on the same
@@ -103,6 +367,7 @@ class RoutingStrategySelector:
             "translation": ModelSize.MEDIUM,
             "embedding": ModelType.EMBEDDING,
         }
+        self._adaptive = AdaptiveSelector(load_tracker or get_load_tracker())
 
     def select(
         self,
@@ -124,6 +389,8 @@ class RoutingStrategySelector:
             return self._performance_optimized_selection(providers, metrics)
         elif strategy == RoutingStrategy.LOAD_BALANCED:
             return self._load_balanced_selection(providers, metrics)
+        elif strategy == RoutingStrategy.ADAPTIVE:
+            return self._adaptive_selection(providers)
         else:
             logger.warning("Unknown routing strategy: %s", strategy)
             return providers[0] if providers else None
@@ -248,6 +515,14 @@ class RoutingStrategySelector:
 
         return min(providers, key=load_score)
 
+    def _adaptive_selection(
+        self, providers: List[ModelProvider]
+    ) -> Optional[ModelProvider]:
+        """Seleção por carga real (in-flight × latência EWMA, 429 evitado)."""
+        if not providers:
+            return None
+        return providers[self._adaptive.choose([load_key(p) for p in providers])]
+
     def _identify_task_type(self, user_input: str) -> str:
         """Identifica tipo de tarefa baseado na entrada do usuário"""
         input_lower = user_input.lower()
@@ -3,7 +3,9 @@
 Implements three collaborating components:
 - RoutingPolicy: loads tier→cascade mappings from model_providers.yaml
 - CircuitBreaker: per-provider consecutive-failure counter with cooldown
-- TierRouter: selects first healthy provider in a tier's cascade
+- TierRouter: selects first healthy provider in a tier's cascade (or, with
+  ``adaptive_routing`` enabled, spills over to the least-loaded healthy entry
+  when the primary is throttled or saturated — see ``AdaptiveSelector``)
 """
 
 from __future__ import annotations
@@ -19,6 +21,8 @@ import yaml
 
 from deile.core.models.base import ModelProvider
 from deile.core.models.catalog import ModelCatalog
+from deile.core.models.routing_strategies import (AdaptiveSelector,
+                                                  get_load_tracker, load_key)
 from deile.core.models.tier import ModelTier
 
 logger = logging.getLogger(__name__)
@@ -210,10 +214,13 @@ class TierRouter:
         catalog: ModelCatalog,
         policy: RoutingPolicy,
         circuit_breaker: CircuitBreaker,
+        adaptive: Optional[AdaptiveSelector] = None,
     ) -> None:
         self._catalog = catalog
         self._policy = policy
         self._circuit_breaker = circuit_breaker
+        # None → classic "first healthy entry wins" cascade.
+        self._adaptive = adaptive
         # Two indexes:
         #   _providers: full key "provider_id:model_id" → ModelProvider (cascade match)
         #   _providers_by_id: provider_id → ModelProvider (compat fallback when a
@@ -274,33 +281,44 @@ class TierRouter:
 
         skip_set = set(skip_provider_ids or ())
 
-        for key in cascade:
-            provider_id = key.split(":", 1)[0]
-            if provider_id in skip_set:
-                logger.debug("TierRouter: skipping %s (in skip_provider_ids)", key)
-                continue
-            # Check breaker without side-effects first — duplicate provider_ids
-            # in a cascade must not consume the HALF_OPEN probe slot before
-            # we've found a registered provider to actually use it.
-            if self._circuit_breaker.is_open(provider_id):
-                logger.debug("TierRouter: skipping %s (circuit open)", key)
-                continue
-            # Prefer exact provider:model_id match (lets cascade pick the right cheap/expensive variant)
-            if key in self._providers:
-                # Commit: consume the breaker probe slot for the chosen
-                # cascade entry only (side-effectful OPEN→HALF_OPEN transition).
-                self._circuit_breaker.allow_request(provider_id)
-                logger.debug("TierRouter: selected %s (exact match)", key)
-                return self._providers[key]
-            # Fall back to any registered instance for this provider
-            if provider_id in self._providers_by_id:
-                self._circuit_breaker.allow_request(provider_id)
-                logger.debug(
-                    "TierRouter: selected %s (provider_id fallback — exact model not registered)",
-                    provider_id,
+        if self._adaptive is not None:
+            candidates = self._usable_candidates(cascade, skip_set)
+            if candidates:
+                idx = self._adaptive.choose_with_preference(
+                    [load_key(provider) for _, _, provider in candidates]
                 )
-                return self._providers_by_id[provider_id]
-            logger.debug("TierRouter: skipping %s (not registered)", key)
+                key, provider_id, provider = candidates[idx]
+                self._circuit_breaker.allow_request(provider_id)
+                logger.debug("TierRouter: selected %s (adaptive, candidate %d)", key, idx)
+                return provider
+        else:
+            for key in cascade:
+                provider_id = key.split(":", 1)[0]
+                if provider_id in skip_set:
+                    logger.debug("TierRouter: skipping %s (in skip_provider_ids)", key)
+                    continue
+                # Check breaker without side-effects first — duplicate provider_ids
+                # in a cascade must not consume the HALF_OPEN probe slot before
+                # we've found a registered provider to actually use it.
+                if self._circuit_breaker.is_open(provider_id):
+                    logger.debug("TierRouter: skipping %s (circuit open)", key)
+                    continue
+                # Prefer exact provider:model_id match (lets cascade pick the right cheap/expensive variant)
+                if key in self._providers:
+                    # Commit: consume the breaker probe slot for the chosen
+                    # cascade entry only (side-effectful OPEN→HALF_OPEN transition).
+                    self._circuit_breaker.allow_request(provider_id)
+                    logger.debug("TierRouter: selected %s (exact match)", key)
+                    return self._providers[key]
+                # Fall back to any registered instance for this provider
+                if provider_id in self._providers_by_id:
+                    self._circuit_breaker.allow_request(provider_id)
+                    logger.debug(
+                        "TierRouter: selected %s (provider_id fallback — exact model not registered)",
+                        provider_id,
+                    )
+                    return self._providers_by_id[provider_id]
+                logger.debug("TierRouter: skipping %s (not registered)", key)
 
         raise NoProviderAvailable(
             f"All providers exhausted for tier={tier.value}. "
@@ -309,6 +327,29 @@ class TierRouter:
             f"Registered: {list(self._providers) or list(self._providers_by_id)}."
         )
 
+    def _usable_candidates(self, cascade: List[str], skip_set: set) -> List[tuple]:
+        """Cascade entries that ``select`` could return, in cascade order.
+
+        Same filters as the classic loop (skip set, open breaker, not
+        registered), without consuming any HALF_OPEN probe; duplicate
+        providers are collapsed to their first entry.
+        """
+        out: List[tuple] = []
+        seen: set = set()
+        for key in cascade:
+            provider_id = key.split(":", 1)[0]
+            if provider_id in skip_set or self._circuit_breaker.is_open(provider_id):
+                continue
+            provider = self._providers.get(key) or self._providers_by_id.get(provider_id)
+            if provider is None or id(provider) in seen:
+                continue
+            seen.add(id(provider))
+            out.append((key, provider_id, provider))
+        return out
+
+    def adaptive(self) -> Optional[AdaptiveSelector]:
+        return self._adaptive
+
     def record_success(self, provider_id: str) -> None:
         self._circuit_breaker.record_success(provider_id)
 
@@ -354,7 +395,8 @@ def get_tier_router(
     1. Loads ``ModelCatalog`` from the YAML.
     2. Reads ``default_strategy`` (or uses *policy_name*) to pick a ``RoutingPolicy``.
     3. Reads ``circuit_breaker`` config to build a ``CircuitBreaker``.
-    4. Constructs and returns a ``TierRouter``.
+    4. Reads ``adaptive_routing`` (opt-in) to build an ``AdaptiveSelector``.
+    5. Constructs and returns a ``TierRouter``.
 
     Providers must still be registered explicitly via ``router.register_provider()``.
     """
@@ -380,7 +422,16 @@ def get_tier_router(
         cooldown_seconds=float(cb_cfg.get("cooldown_seconds", 60.0)),
     )
 
-    _tier_router_singleton = TierRouter(catalog, policy, circuit_breaker)
+    adaptive = None
+    ad_cfg = data.get("adaptive_routing") or {}
+    if ad_cfg.get("enabled", False):
+        adaptive = AdaptiveSelector(
+            get_load_tracker(),
+            mode=str(ad_cfg.get("mode", "p2c")),
+            spill_factor=float(ad_cfg.get("spill_factor", 3.0)),
+        )
+
+    _tier_router_singleton = TierRouter(catalog, policy, circuit_breaker, adaptive)
     logger.info(
         "TierRouter bootstrapped: policy=%s, models=%d",
         resolved_policy,
@@ -0,0 +1,293 @@
+"""Bounded, memory-weighted LRU of hot ``AgentSession`` objects.
+
+``DeileAgent._sessions`` used to be a plain dict that never evicted, so a
+long-running worker grew with every session it ever served. ``SessionCache``
+keeps the same mapping interface (callers and tests still index it like a
+dict) but bounds both the number of resident sessions and their estimated
+footprint. Over budget, the least recently used *persisted* session is
+moved to a pending-spill area; the agent writes it to ``SessionStore`` on
+its next async hop (``get_or_create_session`` / ``flush_persisted_sessions``)
+and rehydrates it transparently on the next access.
+
+Sessions that are not persisted (CLI) have nowhere to spill to, so they
+are never evicted — they still count towards the weight budget. A session
+evicted while a turn still holds it is revived (same object) from a weak
+reference instead of being rehydrated as a second copy.
+
+``FlushState``/``plan_flush`` implement dirty tracking for
+``flush_persisted_sessions``: unchanged sessions are skipped, and history
+is written as an append of the new entries unless it was rewritten.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (TYPE_CHECKING, Any, Dict, Iterator, List, MutableMapping,
+                    Optional, Tuple)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .agent import AgentSession
+
+DEFAULT_MAX_SESSIONS = int(os.environ.get("DEILE_SESSION_CACHE_MAX", "256"))
+DEFAULT_MAX_BYTES = int(float(os.environ.get("DEILE_SESSION_CACHE_MB", "64")) * 1024 * 1024)
+
+# Rough per-object overheads (dict + str headers on CPython 64-bit).
+_ENTRY_OVERHEAD = 240
+_SESSION_OVERHEAD = 1024
+
+
+@dataclass
+class _Weight:
+    """Incremental footprint estimate: history is append-mostly."""
+    history_len: int = 0
+    history_bytes: int = 0
+    last_entry: Optional[Dict[str, Any]] = None
+    total: int = 0
+
+
+@dataclass
+class FlushState:
+    """What was last written to ``SessionStore`` for one session."""
+    context_digest: str = ""
+    working_directory: str = ""
+    history_len: int = 0
+    last_entry: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class FlushPlan:
+    context_payload: Optional[Dict[str, Any]]
+    context_digest: str
+    history_start: int
+    history_entries: List[Dict[str, Any]]
+    replace_history: bool
+
+    @property
+    def is_noop(self) -> bool:
+        return (self.context_payload is None and not self.history_entries
+                and not self.replace_history)
+
+
+# Live object handles re-injected on every turn by
+# ``DeileAgent._get_or_create_session``; persisting them only stored
+# ``repr()`` noise that changed whenever the agent's repr did.
+_RUNTIME_KEYS = frozenset({"_agent", "_console"})
+
+
+def persistable_context(context_data: Dict[str, Any]) -> Dict[str, Any]:
+    """``context_data`` without runtime handles."""
+    return {k: v for k, v in context_data.items() if k not in _RUNTIME_KEYS}
+
+
+def plan_flush(session: "AgentSession", state: Optional[FlushState]) -> FlushPlan:
+    """Computes the minimal write that brings the store up to ``session``."""
+    payload = persistable_context(session.context_data)
+    raw = json.dumps(payload, default=str, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.blake2b(
+        f"{session.working_directory}\0{raw}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+    history = session.conversation_history
+    if state is None:
+        return FlushPlan(payload, digest, 0, list(history), True)
+    appended = (
+        state.history_len <= len(history)
+        and (state.history_len == 0 or history[state.history_len - 1] is state.last_entry)
+    )
+    return FlushPlan(
+        context_payload=None if digest == state.context_digest else payload,
+        context_digest=digest,
+        history_start=state.history_len if appended else 0,
+        history_entries=list(history[state.history_len:] if appended else history),
+        replace_history=not appended,
+    )
+
+
+def flushed_state(session: "AgentSession", plan: FlushPlan) -> FlushState:
+    history = session.conversation_history
+    return FlushState(
+        context_digest=plan.context_digest,
+        working_directory=str(session.working_directory),
+        history_len=len(history),
+        last_entry=history[-1] if history else None,
+    )
+
+
+def _entry_bytes(entry: Dict[str, Any]) -> int:
+    content = entry.get("content")
+    size = len(content) if isinstance(content, str) else len(str(content))
+    return size + _ENTRY_OVERHEAD + 64 * len(entry.get("metadata") or ())
+
+
+def estimate_session_bytes(session: "AgentSession", prev: Optional[_Weight] = None) -> _Weight:
+    """Estimates the resident size of ``session``.
+
+    Only entries appended since ``prev`` are measured; a shrunk or rewritten
+    history (``/rewind``, validation-gate rollback) triggers a full pass.
+    """
+    history = session.conversation_history
+    w = _Weight()
+    if (prev is not None and prev.history_len <= len(history)
+            and (prev.history_len == 0 or history[prev.history_len - 1] is prev.last_entry)):
+        w.history_bytes = prev.history_bytes
+        start = prev.history_len
+    else:
+        start = 0
+    for entry in history[start:]:
+        w.history_bytes += _entry_bytes(entry)
+    w.history_len = len(history)
+    w.last_entry = history[-1] if history else None
+    ctx_bytes = sum(
+        len(k) + (len(v) if isinstance(v, str) else 64)
+        for k, v in session.context_data.items()
+    )
+    w.total = _SESSION_OVERHEAD + w.history_bytes + ctx_bytes
+    return w
+
+
+class SessionCache(MutableMapping[str, "AgentSession"]):
+    """LRU mapping ``session_id -> AgentSession`` bounded by count and bytes.
+
+    Reads through ``[]``/``get`` refresh recency. ``reweigh`` re-estimates a
+    session after it grew (called once per turn); eviction never picks the
+    most recently used entry, so the session serving the current turn is
+    always resident.
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_sessions = max(1, int(max_sessions))
+        self.max_bytes = max(1, int(max_bytes))
+        self._data: "OrderedDict[str, AgentSession]" = OrderedDict()
+        self._weights: Dict[str, _Weight] = {}
+        self._bytes = 0
+        self._pending_spill: "OrderedDict[str, AgentSession]" = OrderedDict()
+        self._ghosts: "weakref.WeakValueDictionary[str, AgentSession]" = weakref.WeakValueDictionary()
+        self._spilled: set = set()
+        self.evictions = 0
+        self.rehydrations = 0
+
+    # ----------------------------------------------------------- mapping
+
+    def __getitem__(self, session_id: str) -> "AgentSession":
+        try:
+            session = self._data[session_id]
+        except KeyError:
+            # Evicted but not yet written, or still held by an in-flight
+            # turn: promote the same object back without touching disk.
+            session = self._pending_spill.pop(session_id, None) or self._ghosts.get(session_id)
+            if session is None:
+                raise
+            self._insert(session_id, session)
+            return session
+        self._data.move_to_end(session_id)
+        return session
+
+    def __setitem__(self, session_id: str, session: "AgentSession") -> None:
+        self._pending_spill.pop(session_id, None)
+        self._ghosts.pop(session_id, None)
+        if session_id in self._data:
+            self._bytes -= self._weights.pop(session_id).total
+            del self._data[session_id]
+        self._insert(session_id, session)
+
+    def __delitem__(self, session_id: str) -> None:
+        self._ghosts.pop(session_id, None)
+        self._spilled.discard(session_id)
+        if session_id in self._data:
+            del self._data[session_id]
+            self._bytes -= self._weights.pop(session_id).total
+        elif self._pending_spill.pop(session_id, None) is None:
+            raise KeyError(session_id)
+
+    def __contains__(self, session_id: object) -> bool:
+        return (session_id in self._data or session_id in self._pending_spill
+                or session_id in self._ghosts)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # Bulk views do not count as use: flushes and stats iterate every
+    # session and must not reshuffle recency.
+    def items(self) -> List[Tuple[str, "AgentSession"]]:  # type: ignore[override]
+        return list(self._data.items())
+
+    def values(self) -> List["AgentSession"]:  # type: ignore[override]
+        return list(self._data.values())
+
+    # -------------------------------------------------------------- LRU
+
+    def _insert(self, session_id: str, session: "AgentSession") -> None:
+        self._spilled.discard(session_id)
+        weight = estimate_session_bytes(session)
+        self._data[session_id] = session
+        self._weights[session_id] = weight
+        self._bytes += weight.total
+        self._evict()
+
+    def reweigh(self, session_id: str) -> None:
+        """Re-estimates ``session_id`` (incrementally) and enforces the budget."""
+        session = self._data.get(session_id)
+        if session is None:
+            return
+        prev = self._weights[session_id]
+        weight = estimate_session_bytes(session, prev)
+        self._weights[session_id] = weight
+        self._bytes += weight.total - prev.total
+        self._evict()
+
+    def _evict(self) -> None:
+        if len(self._data) <= self.max_sessions and self._bytes <= self.max_bytes:
+            return
+        mru = next(reversed(self._data))
+        for session_id in list(self._data):
+            if len(self._data) <= self.max_sessions and self._bytes <= self.max_bytes:
+                break
+            if session_id == mru:
+                break
+            session = self._data[session_id]
+            if not getattr(session, "persisted", False):
+                continue
+            del self._data[session_id]
+            self._bytes -= self._weights.pop(session_id).total
+            self._pending_spill[session_id] = session
+            self._ghosts[session_id] = session
+            self.evictions += 1
+
+    def take_pending_spill(self) -> List[Tuple[str, "AgentSession"]]:
+        """Hands evicted sessions to the caller, which must persist them."""
+        items = list(self._pending_spill.items())
+        self._pending_spill.clear()
+        return items
+
+    def mark_spilled(self, session_id: str) -> None:
+        """Records that ``session_id`` now lives only in ``SessionStore``."""
+        if session_id not in self._data:
+            self._spilled.add(session_id)
+
+    def was_spilled(self, session_id: str) -> bool:
+        """True when the next access must rehydrate from ``SessionStore``."""
+        return session_id in self._spilled and session_id not in self
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "resident": len(self._data),
+            "resident_bytes": self._bytes,
+            "pending_spill": len(self._pending_spill),
+            "spilled": len(self._spilled),
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "rehydrations": self.rehydrations,
+        }
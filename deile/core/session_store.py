@@ -13,7 +13,7 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import aiosqlite
 
@@ -29,8 +29,19 @@ CREATE TABLE IF NOT EXISTS persisted_session (
     last_used_at      TEXT NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_session_last_used ON persisted_session(last_used_at);
+CREATE TABLE IF NOT EXISTS session_message (
+    session_id TEXT NOT NULL,
+    seq        INTEGER NOT NULL,
+    entry_json TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
 """
 
+_PRUNE_ORPHAN_MESSAGES = (
+    "DELETE FROM session_message WHERE session_id NOT IN "
+    "(SELECT session_id FROM persisted_session)"
+)
+
 
 def _utc_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
@@ -120,6 +131,55 @@ class SessionStore:
             )
             await db.commit()
 
+    async def append_messages(
+        self,
+        session_id: str,
+        start_seq: int,
+        entries: List[Dict[str, Any]],
+        *,
+        replace: bool = False,
+    ) -> None:
+        """Writes ``entries`` as conversation messages ``start_seq..``.
+
+        Flushes normally send only the entries appended since the previous
+        flush. ``replace=True`` drops everything from ``start_seq`` on first,
+        for histories that were truncated or rewritten in place.
+        """
+        if not entries and not replace:
+            return
+        async with self._lock:
+            db = self._require()
+            if replace:
+                await db.execute(
+                    "DELETE FROM session_message WHERE session_id = ? AND seq >= ?",
+                    (session_id, start_seq),
+                )
+            await db.executemany(
+                "INSERT OR REPLACE INTO session_message(session_id, seq, entry_json) "
+                "VALUES (?, ?, ?)",
+                [
+                    (session_id, start_seq + i, self._safe_serialize(entry))
+                    for i, entry in enumerate(entries)
+                ],
+            )
+            await db.commit()
+
+    async def get_messages(self, session_id: str) -> List[Dict[str, Any]]:
+        db = self._require()
+        cur = await db.execute(
+            "SELECT entry_json FROM session_message WHERE session_id = ? ORDER BY seq",
+            (session_id,),
+        )
+        rows = await cur.fetchall()
+        await cur.close()
+        out: List[Dict[str, Any]] = []
+        for (raw,) in rows:
+            try:
+                out.append(json.loads(raw))
+            except Exception:
+                continue
+        return out
+
     async def touch(self, session_id: str) -> None:
         async with self._lock:
             db = self._require()
@@ -140,6 +200,8 @@ class SessionStore:
             )
             removed = cur.rowcount or 0
             await cur.close()
+            if removed:
+                await db.execute(_PRUNE_ORPHAN_MESSAGES)
             await db.commit()
             return removed
 
@@ -189,6 +251,8 @@ class SessionStore:
             )
             removed = cur.rowcount or 0
             await cur.close()
+            if removed:
+                await db.execute(_PRUNE_ORPHAN_MESSAGES)
             await db.commit()
             return removed
 
@@ -15,19 +15,18 @@ from __future__ import annotations
 
 import logging
 import sqlite3
-import threading
 import uuid
-from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterator, List, Optional
+from typing import List, Optional
 
 from deile.core.exceptions import DEILEError
 from deile.cron.constants import CRON_RESULT_MAX_CHARS
 from deile.orchestration.pipeline._time_utils import (format_iso_utc, now_utc,
                                                       parse_iso_utc)
 from deile.orchestration.pipeline.cron import CronExpressionError, next_after
+from deile.storage.sqlite_pool import get_database
 
 logger = logging.getLogger(__name__)
 
@@ -149,51 +148,45 @@ class CronStore:
 
     def __init__(self, db_path: Path) -> None:
         self.db_path = Path(db_path).resolve()
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = threading.Lock()
-        with self._connect() as conn:
-            conn.executescript(self.SCHEMA)
-
-    @contextmanager
-    def _connect(self) -> Iterator[sqlite3.Connection]:
-        # SQLite is synchronous — wrap in a lock so concurrent async tasks
-        # don't trample each other. We open per-call to avoid threading
-        # surprises with the default check_same_thread=True.
-        with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            try:
-                yield conn
-                conn.commit()
-            finally:
-                conn.close()
+        # Pooled, long-lived connections shared by every CronStore on this
+        # file (tools re-open the store per call): writes are serialized by
+        # the pool's writer thread, reads run on per-thread WAL connections.
+        self._db = get_database(self.db_path)
+        self._db.executescript(self.SCHEMA)
+
+    @staticmethod
+    def _cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return cur
 
     # -- CRUD -------------------------------------------------------
 
     def add(self, entry: CronEntry) -> None:
-        with self._connect() as conn:
-            try:
-                conn.execute(
-                    """INSERT INTO cron_entries
-                       (id, prompt, cron, run_at, next_fire_at, last_fired_at,
-                        created_by, notify_user_id, enabled, created_at, last_result)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        entry.id, entry.prompt, entry.cron,
-                        format_iso_utc(entry.run_at), format_iso_utc(entry.next_fire_at),
-                        format_iso_utc(entry.last_fired_at), entry.created_by,
-                        entry.notify_user_id, int(entry.enabled),
-                        format_iso_utc(entry.created_at), entry.last_result,
-                    ),
-                )
-            except sqlite3.IntegrityError as exc:
-                raise CronStoreError(f"id already exists: {entry.id}") from exc
+        def _tx(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                """INSERT INTO cron_entries
+                   (id, prompt, cron, run_at, next_fire_at, last_fired_at,
+                    created_by, notify_user_id, enabled, created_at, last_result)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    entry.id, entry.prompt, entry.cron,
+                    format_iso_utc(entry.run_at), format_iso_utc(entry.next_fire_at),
+                    format_iso_utc(entry.last_fired_at), entry.created_by,
+                    entry.notify_user_id, int(entry.enabled),
+                    format_iso_utc(entry.created_at), entry.last_result,
+                ),
+            )
+
+        try:
+            self._db.write(_tx)
+        except sqlite3.IntegrityError as exc:
+            raise CronStoreError(f"id already exists: {entry.id}") from exc
 
     def get(self, entry_id: str) -> Optional[CronEntry]:
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM cron_entries WHERE id = ?", (entry_id,)
-            ).fetchone()
+        row = self._db.read(lambda conn: self._cursor(conn).execute(
+            "SELECT * FROM cron_entries WHERE id = ?", (entry_id,)
+        ).fetchone())
         return self._row_to_entry(row) if row else None
 
     def list_all(self, *, only_enabled: bool = False) -> List[CronEntry]:
@@ -201,36 +194,33 @@ class CronStore:
         if only_enabled:
             sql += " WHERE enabled = 1"
         sql += " ORDER BY next_fire_at IS NULL, next_fire_at ASC"
-        with self._connect() as conn:
-            rows = conn.execute(sql).fetchall()
+        rows = self._db.read(lambda conn: self._cursor(conn).execute(sql).fetchall())
         return [self._row_to_entry(r) for r in rows]
 
     def list_due(self, *, now: Optional[datetime] = None) -> List[CronEntry]:
         """Return enabled entries whose ``next_fire_at <= now``."""
         now = now or now_utc()
-        with self._connect() as conn:
-            rows = conn.execute(
-                """SELECT * FROM cron_entries
-                   WHERE enabled = 1 AND next_fire_at IS NOT NULL
-                     AND next_fire_at <= ?
-                   ORDER BY next_fire_at ASC""",
-                (format_iso_utc(now),),
-            ).fetchall()
+        rows = self._db.read(lambda conn: self._cursor(conn).execute(
+            """SELECT * FROM cron_entries
+               WHERE enabled = 1 AND next_fire_at IS NOT NULL
+                 AND next_fire_at <= ?
+               ORDER BY next_fire_at ASC""",
+            (format_iso_utc(now),),
+        ).fetchall())
         return [self._row_to_entry(r) for r in rows]
 
     def remove(self, entry_id: str) -> bool:
-        with self._connect() as conn:
-            cur = conn.execute(
-                "DELETE FROM cron_entries WHERE id = ?", (entry_id,)
-            )
-            return cur.rowcount > 0
+        return self._db.write(lambda conn: conn.execute(
+            "DELETE FROM cron_entries WHERE id = ?", (entry_id,)
+        ).rowcount > 0)
 
     def mark_fired(self, entry_id: str, *, when: Optional[datetime] = None,
                    result: Optional[str] = None) -> None:
         """Update ``last_fired_at`` + ``next_fire_at`` after firing (atomic)."""
         when = when or now_utc()
-        with self._connect() as conn:
-            row = conn.execute(
+
+        def _tx(conn: sqlite3.Connection) -> None:
+            row = self._cursor(conn).execute(
                 "SELECT * FROM cron_entries WHERE id = ?", (entry_id,)
             ).fetchone()
             if row is None:
@@ -254,13 +244,13 @@ class CronStore:
                 ),
             )
 
+        self._db.write(_tx)
+
     def set_enabled(self, entry_id: str, enabled: bool) -> bool:
-        with self._connect() as conn:
-            cur = conn.execute(
-                "UPDATE cron_entries SET enabled = ? WHERE id = ?",
-                (int(enabled), entry_id),
-            )
-            return cur.rowcount > 0
+        return self._db.write(lambda conn: conn.execute(
+            "UPDATE cron_entries SET enabled = ? WHERE id = ?",
+            (int(enabled), entry_id),
+        ).rowcount > 0)
 
     # -- helpers ----------------------------------------------------
 
@@ -11,6 +11,10 @@ the repository — and so the repository has no circular dependency on
 All transactions use parameterised queries; the only ``f"…{where_sql}…"``
 strings build their clauses from hardcoded literals (timestamp/category
 filters) — every value is bound via the ``params`` list.
+
+Connections come from :mod:`deile.storage.sqlite_pool`: writes are queued to
+the file's single writer thread and reads reuse a per-thread WAL connection,
+so no call pays a fresh ``sqlite3.connect`` any more.
 """
 from __future__ import annotations
 
@@ -19,6 +23,8 @@ import sqlite3
 from pathlib import Path
 from typing import Any, List, Optional, Tuple
 
+from deile.storage.sqlite_pool import get_database
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,12 +33,11 @@ class CostRepository:
 
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self.db = get_database(Path(db_path))
 
     def init_schema(self) -> None:
         """Create the 3 tables + indices if absent. Idempotent."""
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-
-        with sqlite3.connect(self.db_path) as conn:
+        def _tx(conn: sqlite3.Connection):
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS cost_entries (
                     id TEXT PRIMARY KEY,
@@ -87,13 +92,15 @@ class CostRepository:
                 "CREATE INDEX IF NOT EXISTS idx_cost_session ON cost_entries(session_id)"
             )
 
+        self.db.write(_tx)
+
     def fetch_active_budgets(self) -> List[Tuple]:
         """Return all active budget rows as raw tuples.
 
         Columns: ``(category, period, limit_amount, currency, alert_threshold,
         hard_limit, created_at)``.
         """
-        with sqlite3.connect(self.db_path) as conn:
+        def _tx(conn: sqlite3.Connection):
             cursor = conn.execute("""
                 SELECT category, period, limit_amount, currency,
                        alert_threshold, hard_limit, created_at
@@ -102,6 +109,8 @@ class CostRepository:
             """)
             return list(cursor.fetchall())
 
+        return self.db.read(_tx)
+
     def insert_cost_entry(
         self,
         entry_id: str,
@@ -115,7 +124,7 @@ class CostRepository:
         session_id: Optional[str],
         user_id: Optional[str],
     ) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        def _tx(conn: sqlite3.Connection):
             conn.execute(
                 """
                 INSERT INTO cost_entries
@@ -129,6 +138,8 @@ class CostRepository:
                 ),
             )
 
+        self.db.write(_tx)
+
     def replace_budget_limit(
         self,
         category: str,
@@ -139,7 +150,7 @@ class CostRepository:
         hard_limit: bool,
     ) -> None:
         """Deactivate any existing limit for ``(category, period)`` then insert."""
-        with sqlite3.connect(self.db_path) as conn:
+        def _tx(conn: sqlite3.Connection):
             conn.execute(
                 "UPDATE budget_limits SET active = FALSE WHERE category = ? AND period = ?",
                 (category, period),
@@ -153,9 +164,11 @@ class CostRepository:
                 (category, period, limit_amount, currency, alert_threshold, hard_limit),
             )
 
+        self.db.write(_tx)
+
     def period_usage_sum(self, category: str, start_timestamp: float) -> float:
         """Sum of cost ``amount`` for ``category`` from ``start_timestamp`` onward."""
-        with sqlite3.connect(self.db_path) as conn:
+        def _tx(conn: sqlite3.Connection):
             cursor = conn.execute(
                 """
                 SELECT COALESCE(SUM(amount), 0)
@@ -167,6 +180,8 @@ class CostRepository:
             result = cursor.fetchone()
             return float(result[0] if result and result[0] else 0)
 
+        return self.db.read(_tx)
+
     def insert_alert(
         self,
         alert_type: str,
@@ -176,7 +191,7 @@ class CostRepository:
         limit_amount: float,
         threshold_percentage: float,
     ) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        def _tx(conn: sqlite3.Connection):
             conn.execute(
                 """
                 INSERT INTO cost_alerts
@@ -186,6 +201,8 @@ class CostRepository:
                 (alert_type, category, period, current_amount, limit_amount, threshold_percentage),
             )
 
+        self.db.write(_tx)
+
     def summary_aggregates(
         self,
         start_timestamp: float,
@@ -206,7 +223,7 @@ class CostRepository:
             params.append(category)
         where_sql = " AND ".join(where_clauses)
 
-        with sqlite3.connect(self.db_path) as conn:
+        def _tx(conn: sqlite3.Connection):
             # nosec B608 — where_sql is built from hardcoded clause strings only;
             # all user-controlled values are bound via the `params` list.
             cursor = conn.execute(
@@ -242,8 +259,9 @@ class CostRepository:
                 params,
             )  # nosec B608
             top_expenses = list(cursor.fetchall())
+            return total_amount, entry_count, by_category, top_expenses
 
-        return total_amount, entry_count, by_category, top_expenses
+        return self.db.read(_tx)
 
     def fetch_entries_in_range(
         self, start_timestamp: float, end_timestamp: float
@@ -253,7 +271,7 @@ class CostRepository:
         Columns: ``(id, timestamp, category, subcategory, amount, currency,
         description, metadata, session_id, user_id)``.
         """
-        with sqlite3.connect(self.db_path) as conn:
+        def _tx(conn: sqlite3.Connection):
             cursor = conn.execute(
                 """
                 SELECT id, timestamp, category, subcategory, amount, currency,
@@ -265,3 +283,5 @@ class CostRepository:
                 (start_timestamp, end_timestamp),
             )
             return list(cursor.fetchall())
+
+        return self.db.read(_tx)
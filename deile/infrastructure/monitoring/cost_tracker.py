@@ -107,6 +107,9 @@ class CostTracker:
     - Resource usage costs
     - Export capabilities
     """
+
+    # Seconds before a cached period total is re-read from SQLite
+    PERIOD_USAGE_RESEED_S = 60.0
     
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or str(Path.home() / ".deile" / "costs.db")
@@ -116,6 +119,8 @@ class CostTracker:
         self.budget_limits = {}
         self.cost_alerts = []
         self.alert_callbacks = []
+        # (category, period) -> (period_start, running usage, seeded_at)
+        self._period_usage_cache: Dict[tuple, tuple] = {}
 
         # Thread safety
         self.lock = threading.RLock()
@@ -451,9 +456,10 @@ class CostTracker:
             if not key.startswith(f"{category}_"):
                 continue
             
-            # Calculate period usage
-            period_usage = self._get_period_usage(budget.category, budget.period)
-            new_usage = period_usage + cost_entry.amount
+            # Running period total (already includes ``cost_entry``, which
+            # was inserted before this check)
+            new_usage = self._advance_period_usage(budget.category, budget.period,
+                                                   cost_entry.amount)
             
             # Check thresholds
             usage_percentage = float(new_usage / budget.limit_amount)
@@ -467,8 +473,31 @@ class CostTracker:
                     f"${new_usage} > ${budget.limit_amount}"
                 )
     
-    def _get_period_usage(self, category: str, period: str) -> Decimal:
-        """Get usage for a specific period"""
+    def _advance_period_usage(self, category: str, period: str, amount: Decimal) -> Decimal:
+        """Add ``amount`` to the cached running total for ``(category, period)``.
+
+        The total is seeded from SQLite (which already holds the new entry)
+        on the first check of a period, when the period rolls over, or after
+        ``PERIOD_USAGE_RESEED_S`` so entries written by other processes are
+        eventually picked up. In between, each tracked cost is O(1) instead of
+        a ``SUM`` over the whole period.
+        """
+        cache_key = (category, period)
+        start_timestamp = self._period_start(period)
+        cached = self._period_usage_cache.get(cache_key)
+        now = time.monotonic()
+        if (cached is None or cached[0] != start_timestamp
+                or now - cached[2] > self.PERIOD_USAGE_RESEED_S):
+            usage = self._get_period_usage(category, period)
+            self._period_usage_cache[cache_key] = (start_timestamp, usage, now)
+            return usage
+        usage = cached[1] + amount
+        self._period_usage_cache[cache_key] = (start_timestamp, usage, cached[2])
+        return usage
+    
+    @staticmethod
+    def _period_start(period: str) -> float:
+        """Timestamp at which the current ``period`` started"""
         
         now = datetime.now()
         
@@ -486,7 +515,12 @@ class CostTracker:
             # Default to daily
             period_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
-        start_timestamp = period_start.timestamp()
+        return period_start.timestamp()
+    
+    def _get_period_usage(self, category: str, period: str) -> Decimal:
+        """Get usage for a specific period"""
+        
+        start_timestamp = self._period_start(period)
 
         try:
             return Decimal(str(self.repo.period_usage_sum(category, start_timestamp)))
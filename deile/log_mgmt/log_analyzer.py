@@ -4,6 +4,11 @@ Roda como DaemonSet em cada nó K8s, lendo logs dos pods DEILE
 e detectando: error spikes, auth expiry, flooding, crash loops, e
 silêncio do pipeline.
 
+A leitura é incremental (:class:`LogAnalyzer`): cada log é acompanhado a
+partir do último offset, as contagens usam o timestamp real das linhas em
+janelas deslizantes e o flooding é estimado com um sketch de tamanho fixo
+— CPU e memória não crescem com o tamanho acumulado dos logs.
+
 Uso standalone::
 
     python3 -m deile.log_mgmt.log_analyzer --log-dir /var/log/containers
@@ -15,17 +20,20 @@ Ou como entrypoint do DaemonSet::
 
 from __future__ import annotations
 
+import calendar
+import json
 import logging
 import os
+import re
 import time
-from collections import Counter
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
 from deile.log_mgmt.log_patterns import (AUTH_EXPIRED_PATTERNS,
-                                         PIPELINE_PATTERNS, Severity,
-                                         match_line)
+                                         PIPELINE_PATTERNS, ChunkMatcher,
+                                         Severity)
 
 logger = logging.getLogger("deile.log_analyzer")
 
@@ -86,10 +94,542 @@ def _get_config() -> dict:
         == "true",
         "log_dir": os.environ.get("DEILE_LOG_DIR", "/home/deile/logs"),
         "namespace": os.environ.get("DEILE_NAMESPACE", "deile"),
+        "window_s": int(os.environ.get("DEILE_LOG_ANALYZER_WINDOW_S", "300")),
+        "state_path": os.environ.get("DEILE_LOG_ANALYZER_STATE_PATH") or None,
     }
 
 
-# ── Scan engine ─────────────────────────────────────────────────────────────
+# ── Primitivas incrementais ─────────────────────────────────────────────────
+
+# ``2026-05-28T14:00:00``, ``2026-05-28 14:00:00,123`` (asctime do
+# formatter padrão, ver ``log_rotator``), ``...Z`` / ``...+00:00``.
+_TS_RE = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})"
+    r"(?:[.,]\d+)?(Z|[+-]\d{2}:?\d{2})?"
+)
+
+_READ_CHUNK_BYTES = 4 * 1024 * 1024
+_MAX_LINE_BYTES = 1024 * 1024
+_FLOOD_KEY_CHARS = 512
+_SAMPLE_SIZE = 5
+_STATE_VERSION = 1
+_AUTH_NAMES = frozenset(p.name for p in AUTH_EXPIRED_PATTERNS)
+_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "WARN", "ERROR", "CRITICAL", "FATAL"})
+
+
+# Linhas vizinhas quase sempre compartilham o segundo: memoiza o epoch.
+_TS_CACHE: Dict[str, float] = {}
+_TS_CACHE_MAX = 4096
+
+
+def _parse_timestamp(line: str) -> Tuple[Optional[float], int]:
+    """``(epoch, fim do prefixo)`` do timestamp no início da linha.
+
+    Timestamps sem fuso são tratados como UTC (os pods rodam em UTC).
+    Retorna ``(None, 0)`` se a linha não começa com timestamp.
+    """
+    m = _TS_RE.match(line)
+    if m is None:
+        return None, 0
+    tz = m.group(7)
+    key = line[:19] + (tz or "")
+    epoch = _TS_CACHE.get(key)
+    if epoch is None:
+        try:
+            epoch = float(calendar.timegm((
+                int(m.group(1)), int(m.group(2)), int(m.group(3)),
+                int(m.group(4)), int(m.group(5)), int(m.group(6)), 0, 0, 0,
+            )))
+        except (ValueError, OverflowError):
+            return None, 0
+        if tz and tz != "Z":
+            sign = 1 if tz[0] == "+" else -1
+            digits = tz[1:].replace(":", "")
+            epoch -= sign * (int(digits[:2]) * 3600 + int(digits[2:]) * 60)
+        if len(_TS_CACHE) >= _TS_CACHE_MAX:
+            _TS_CACHE.clear()
+        _TS_CACHE[key] = epoch
+    return epoch, m.end()
+
+
+def _flood_key(line: str, ts_end: int) -> str:
+    """Corpo da linha sem timestamp/nível (iguais fora eles = mesmo flood)."""
+    if ts_end:
+        body = line[ts_end:].strip()
+        head, _, rest = body.partition(" ")
+        if head in _LEVELS:
+            body = rest.strip()
+        return body[:_FLOOD_KEY_CHARS]
+    # Compat: prefixo ISO de 26 chars que o scan antigo descartava.
+    if len(line) > 26 and line[4] == "-" and line[10] == "T":
+        return line[26:].strip()[:_FLOOD_KEY_CHARS]
+    return line.strip()[:_FLOOD_KEY_CHARS]
+
+
+class _WindowCounter:
+    """Contador de eventos numa janela deslizante de ``window_s`` segundos.
+
+    Um bucket por segundo: memória limitada a ``window_s`` entradas,
+    independente do volume de eventos.
+    """
+
+    __slots__ = ("window_s", "_buckets", "_total")
+
+    def __init__(self, window_s: float) -> None:
+        self.window_s = window_s
+        self._buckets: Deque[List[int]] = deque()
+        self._total = 0
+
+    def add(self, ts: float, n: int = 1) -> None:
+        sec = int(ts)
+        if self._buckets and self._buckets[-1][0] >= sec:
+            # Mesmo segundo (ou linha fora de ordem): soma no bucket atual.
+            self._buckets[-1][1] += n
+        else:
+            self._buckets.append([sec, n])
+        self._total += n
+        self._expire(ts)
+
+    def count(self, now: float) -> int:
+        self._expire(now)
+        return self._total
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_s
+        while self._buckets and self._buckets[0][0] <= cutoff:
+            self._total -= self._buckets.popleft()[1]
+
+
+class _SpaceSaving:
+    """Sketch Space-Saving (Metwally et al.) para heavy hitters.
+
+    Mantém no máximo ``capacity`` chaves; quando cheio, a nova chave herda
+    o contador da menor (registrado como ``erro``). Qualquer chave com
+    frequência real acima de ``N / capacity`` está garantidamente no
+    sketch, e ``count - error`` é um limite inferior da frequência real.
+    As chaves ficam agrupadas por contador (``_buckets``), então achar a
+    menor é O(1).
+    """
+
+    __slots__ = ("capacity", "counts", "_buckets", "_min")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.counts: Dict[str, List[int]] = {}
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        self._min = 0
+
+    def _link(self, key: str, count: int) -> None:
+        self._buckets.setdefault(count, {})[key] = None
+
+    def _unlink(self, key: str, count: int) -> None:
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min == count:
+                self._min = count + 1  # a chave foi para count+1 (ou foi substituída lá)
+
+    def add(self, key: str) -> None:
+        entry = self.counts.get(key)
+        if entry is not None:
+            self._unlink(key, entry[0])
+            entry[0] += 1
+            self._link(key, entry[0])
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = [1, 0]
+            self._link(key, 1)
+            self._min = 1
+            return
+        floor = self._min
+        victim = next(iter(self._buckets[floor]))
+        del self.counts[victim]
+        self.counts[key] = [floor + 1, floor]
+        self._link(key, floor + 1)
+        self._unlink(victim, floor)
+
+    def guaranteed(self, key: str) -> int:
+        count, error = self.counts.get(key, (0, 0))
+        return count - error
+
+
+class _FloodSketch:
+    """Heavy hitters por janela: um :class:`_SpaceSaving` por época de
+    ``window_s`` segundos, somando a época anterior (flood que cruza a
+    virada da janela não se divide em dois pela metade)."""
+
+    __slots__ = ("window_s", "capacity", "epoch", "current", "previous")
+
+    def __init__(self, window_s: float, capacity: int) -> None:
+        self.window_s = window_s
+        self.capacity = capacity
+        self.epoch: Optional[int] = None
+        self.current = _SpaceSaving(capacity)
+        self.previous = _SpaceSaving(capacity)
+
+    def _roll(self, epoch: int) -> None:
+        if self.epoch is None or epoch > self.epoch:
+            self.previous = self.current if self.epoch == epoch - 1 else _SpaceSaving(self.capacity)
+            self.current = _SpaceSaving(self.capacity)
+            self.epoch = epoch
+
+    def add(self, key: str, ts: float) -> None:
+        self._roll(int(ts // self.window_s))
+        self.current.add(key)
+
+    def heavy_hitters(self, now: float, threshold: int) -> List[Tuple[str, int]]:
+        self._roll(int(now // self.window_s))
+        keys = set(self.current.counts) | set(self.previous.counts)
+        hits = []
+        for key in keys:
+            count = self.current.guaranteed(key) + self.previous.guaranteed(key)
+            if count >= threshold and key:
+                hits.append((key, count))
+        hits.sort(key=lambda kc: (-kc[1], kc[0]))
+        return hits
+
+
+@dataclass
+class _PodState:
+    """Estado incremental de um arquivo de log (um por pod)."""
+
+    window_s: float
+    flood_capacity: int
+    inode: Optional[int] = None
+    offset: int = 0
+    skip_partial: bool = False
+    silent_run: int = 0
+    last_silent_run: int = 0
+    last_ts: Optional[float] = None
+    tail: Deque[str] = field(default_factory=lambda: deque(maxlen=_SAMPLE_SIZE))
+    errors: Optional[_WindowCounter] = None
+    error_samples: Deque[str] = field(default_factory=lambda: deque(maxlen=_SAMPLE_SIZE))
+    auth: Dict[str, Tuple[_WindowCounter, Deque[str]]] = field(default_factory=dict)
+    flood: Optional[_FloodSketch] = None
+
+    def __post_init__(self) -> None:
+        self.errors = _WindowCounter(self.window_s)
+        self.flood = _FloodSketch(self.window_s, self.flood_capacity)
+
+    def to_json(self) -> dict:
+        return {
+            "inode": self.inode, "offset": self.offset,
+            "silent_run": self.silent_run, "last_silent_run": self.last_silent_run,
+        }
+
+
+class LogAnalyzer:
+    """Analisador incremental: acompanha cada log a partir do último offset.
+
+    O scan antigo relia o arquivo inteiro de cada pod a cada intervalo e
+    passava cada linha por todos os patterns — uma vez para erros, de novo
+    por pattern de auth, e um ``Counter`` de todas as linhas para flooding.
+    Aqui cada passada:
+
+    - lê só os bytes novos desde o offset salvo (``(inode, offset)`` por
+      pod; rotação é detectada pelo inode — o resto do arquivo rotacionado
+      ``.1`` é lido antes — e truncamento pelo tamanho), limitado a
+      ``max_bytes_per_scan`` por pod para CPU previsível;
+    - classifica o bloco novo com um único :class:`ChunkMatcher`;
+    - conta erros e auth em janelas deslizantes pelo timestamp real da
+      linha (linhas sem timestamp herdam o da anterior no mesmo bloco, ou
+      o horário do scan);
+    - detecta flooding com um sketch Space-Saving de tamanho fixo.
+
+    Memória e CPU ficam proporcionais à janela e ao volume novo, não ao
+    tamanho acumulado dos logs. Um log visto pela primeira vez começa a ser
+    lido nos últimos ``initial_tail_bytes`` (como ``tail``). Com
+    ``state_path``, offsets e sequências de ticks silenciosos sobrevivem a
+    restarts.
+    """
+
+    def __init__(
+        self,
+        log_dir: str,
+        *,
+        window_s: float = 300.0,
+        state_path: Optional[str] = None,
+        flood_capacity: int = 64,
+        max_bytes_per_scan: int = 64 * 1024 * 1024,
+        initial_tail_bytes: int = 8 * 1024 * 1024,
+    ) -> None:
+        self.log_dir = Path(log_dir)
+        self.window_s = float(window_s)
+        self.state_path = Path(state_path) if state_path else None
+        self.flood_capacity = flood_capacity
+        self.max_bytes_per_scan = max_bytes_per_scan
+        self.initial_tail_bytes = initial_tail_bytes
+        self.matcher = ChunkMatcher()
+        self.pods: Dict[str, _PodState] = {}
+        self.stats: Dict[str, int] = {"scans": 0, "bytes_read": 0, "lines": 0}
+        self._load()
+
+    # -- persistência ---------------------------------------------------------
+
+    def _new_state(self) -> _PodState:
+        return _PodState(window_s=self.window_s, flood_capacity=self.flood_capacity)
+
+    def _load(self) -> None:
+        if self.state_path is None:
+            return
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != _STATE_VERSION or data.get("log_dir") != str(self.log_dir):
+            return
+        for pod, raw in (data.get("pods") or {}).items():
+            st = self._new_state()
+            st.inode = raw.get("inode")
+            st.offset = int(raw.get("offset") or 0)
+            st.silent_run = int(raw.get("silent_run") or 0)
+            st.last_silent_run = int(raw.get("last_silent_run") or 0)
+            self.pods[pod] = st
+
+    def save(self) -> None:
+        """Grava offsets/inodes (escrita atômica). No-op sem ``state_path``."""
+        if self.state_path is None:
+            return
+        payload = {
+            "version": _STATE_VERSION,
+            "log_dir": str(self.log_dir),
+            "pods": {pod: st.to_json() for pod, st in self.pods.items()},
+        }
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, self.state_path)
+        except OSError:
+            logger.debug("could not persist analyzer state to %s", self.state_path)
+
+    # -- leitura incremental --------------------------------------------------
+
+    def _log_files(self, pod_filter: Optional[List[str]]):
+        if not self.log_dir.is_dir():
+            return
+        for pod_dir in sorted(self.log_dir.iterdir()):
+            if not pod_dir.is_dir():
+                continue
+            pod_name = pod_dir.name
+            if pod_filter and pod_name not in pod_filter:
+                continue
+            log_file = pod_dir / f"{pod_name}.log"
+            if log_file.is_file():
+                yield pod_name, log_file
+
+    def ingest(self, pod_name: str, log_file: Path, now: Optional[float] = None) -> int:
+        """Processa os bytes novos de ``log_file``; retorna quantos leu."""
+        now = time.time() if now is None else now
+        try:
+            st = os.stat(log_file)
+        except OSError:
+            return 0
+        state = self.pods.get(pod_name)
+        if state is None:
+            state = self.pods[pod_name] = self._new_state()
+            if st.st_size > self.initial_tail_bytes:
+                state.offset = st.st_size - self.initial_tail_bytes
+                state.skip_partial = not self._at_line_start(log_file, state.offset)
+            state.inode = st.st_ino
+        budget = self.max_bytes_per_scan
+        read = 0
+        state.last_ts = None
+        if state.inode != st.st_ino:
+            rotated = log_file.with_name(log_file.name + ".1")
+            try:
+                if os.stat(rotated).st_ino == state.inode:
+                    read += self._consume(state, rotated, budget, now)
+            except OSError:
+                pass
+            state.inode, state.offset, state.skip_partial = st.st_ino, 0, False
+        elif st.st_size < state.offset:
+            state.offset, state.skip_partial = 0, False  # truncado
+        read += self._consume(state, log_file, budget - read, now)
+        self.stats["bytes_read"] += read
+        return read
+
+    @staticmethod
+    def _at_line_start(path: Path, offset: int) -> bool:
+        try:
+            with open(path, "rb") as fh:
+                fh.seek(offset - 1)
+                return fh.read(1) == b"\n"
+        except OSError:
+            return False
+
+    def _consume(self, state: _PodState, path: Path, budget: int, now: float) -> int:
+        consumed = 0
+        try:
+            fh = open(path, "rb")
+        except OSError:
+            logger.debug("could not read %s", path)
+            return 0
+        with fh:
+            fh.seek(state.offset)
+            while consumed < budget:
+                data = fh.read(min(_READ_CHUNK_BYTES, budget - consumed))
+                if not data:
+                    break
+                cut = data.rfind(b"\n")
+                if cut < 0:
+                    if len(data) < _MAX_LINE_BYTES:
+                        break  # linha ainda sendo escrita (ou fim do orçamento)
+                    cut = len(data) - 1  # linha gigante: processa como está
+                block = data[:cut + 1]
+                fh.seek(state.offset + consumed + len(block))
+                consumed += len(block)
+                if state.skip_partial:
+                    state.skip_partial = False
+                    nl = block.find(b"\n")
+                    block = block[nl + 1:]
+                if block:
+                    self._process(state, block.decode("utf-8", errors="replace"), now)
+        state.offset += consumed
+        return consumed
+
+    def _process(self, state: _PodState, text: str, now: float) -> None:
+        lines = text.split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        hits = self.matcher.scan(text, lines)
+        self.stats["lines"] += len(lines)
+        last_ts = state.last_ts
+        for idx, raw in enumerate(lines):
+            line = raw.rstrip("\r")
+            ts, ts_end = _parse_timestamp(line)
+            if ts is None:
+                ts = last_ts if last_ts is not None else now
+            else:
+                last_ts = ts
+            key = _flood_key(line, ts_end)
+            if key:
+                state.flood.add(key, ts)
+            state.tail.append(line)
+            matched = hits.get(idx)
+            silent = False
+            if matched:
+                for pat in matched:
+                    if pat.name == "pipeline_tick_silent":
+                        silent = True
+                    elif pat.name in _AUTH_NAMES:
+                        counter, samples = state.auth.get(pat.name) or state.auth.setdefault(
+                            pat.name, (_WindowCounter(self.window_s), deque(maxlen=_SAMPLE_SIZE)))
+                        counter.add(ts)
+                        samples.append(line)
+                if any(p.severity in (Severity.ERROR, Severity.CRITICAL) for p in matched):
+                    state.errors.add(ts)
+                    state.error_samples.append(line)
+            if silent:
+                state.silent_run += 1
+            elif state.silent_run:
+                state.last_silent_run, state.silent_run = state.silent_run, 0
+        state.last_ts = last_ts
+
+    # -- avaliação ------------------------------------------------------------
+
+    def evaluate(
+        self,
+        pod_name: str,
+        *,
+        error_rate_threshold: int,
+        flood_threshold: int,
+        silent_tick_threshold: int,
+        now: Optional[float] = None,
+    ) -> List[Anomaly]:
+        """Anomalias atuais de ``pod_name`` a partir do estado acumulado."""
+        now = time.time() if now is None else now
+        state = self.pods.get(pod_name)
+        if state is None:
+            return []
+        out: List[Anomaly] = []
+
+        errors = state.errors.count(now)
+        if errors and errors / max(self.window_s / 60.0, 1.0) > error_rate_threshold:
+            out.append(Anomaly(
+                pattern_name="error_rate_spike", severity=Severity.WARNING,
+                pod_name=pod_name, sample_lines=list(state.error_samples),
+                count=errors, threshold=error_rate_threshold,
+            ))
+
+        for pat in AUTH_EXPIRED_PATTERNS:
+            entry = state.auth.get(pat.name)
+            if entry is None:
+                continue
+            count = entry[0].count(now)
+            if count:
+                out.append(Anomaly(
+                    pattern_name=pat.name, severity=pat.severity, pod_name=pod_name,
+                    sample_lines=list(entry[1]), count=count,
+                ))
+
+        for key, count in state.flood.heavy_hitters(now, flood_threshold)[:3]:
+            out.append(Anomaly(
+                pattern_name="log_flooding", severity=Severity.WARNING,
+                pod_name=pod_name, sample_lines=[key], count=count,
+                threshold=flood_threshold,
+            ))
+
+        silent = state.silent_run or state.last_silent_run
+        if "pipeline" in pod_name.lower() and silent >= silent_tick_threshold:
+            out.append(Anomaly(
+                pattern_name="pipeline_silent", severity=Severity.INFO,
+                pod_name=pod_name, sample_lines=list(state.tail)[-3:],
+                count=silent, threshold=silent_tick_threshold,
+            ))
+        return out
+
+    def scan(
+        self,
+        *,
+        error_rate_threshold: int,
+        flood_threshold: int,
+        silent_tick_threshold: int,
+        pod_filter: Optional[List[str]] = None,
+        now: Optional[float] = None,
+    ) -> List[Anomaly]:
+        """Lê o que há de novo em cada log e devolve as anomalias atuais."""
+        now = time.time() if now is None else now
+        self.stats["scans"] += 1
+        anomalies: List[Anomaly] = []
+        seen = set()
+        for pod_name, log_file in self._log_files(pod_filter):
+            seen.add(pod_name)
+            self.ingest(pod_name, log_file, now)
+            anomalies.extend(self.evaluate(
+                pod_name,
+                error_rate_threshold=error_rate_threshold,
+                flood_threshold=flood_threshold,
+                silent_tick_threshold=silent_tick_threshold,
+                now=now,
+            ))
+        if not pod_filter:
+            for gone in set(self.pods) - seen:
+                del self.pods[gone]  # pod removido: esquece offset e janelas
+        self.save()
+        return anomalies
+
+
+# Um analyzer por diretório: ``main()`` chama ``scan_logs()`` a cada
+# intervalo e o estado incremental precisa sobreviver entre as chamadas.
+_ANALYZERS: Dict[Tuple[str, Optional[str], float], LogAnalyzer] = {}
+
+
+def get_analyzer(
+    log_dir: str, *, state_path: Optional[str] = None, window_s: float = 300.0,
+) -> LogAnalyzer:
+    """:class:`LogAnalyzer` compartilhado para ``log_dir``."""
+    key = (str(Path(log_dir).resolve()), state_path, float(window_s))
+    analyzer = _ANALYZERS.get(key)
+    if analyzer is None:
+        analyzer = _ANALYZERS[key] = LogAnalyzer(
+            log_dir, state_path=state_path, window_s=window_s,
+        )
+    return analyzer
+
+
+# ── Detectores sobre listas de linhas ───────────────────────────────────────
 
 
 def _scan_files(
@@ -97,6 +637,9 @@ def _scan_files(
 ) -> Dict[str, List[str]]:
     """Lê todos os arquivos .log no diretório e retorna linhas por pod.
 
+    Carrega os arquivos inteiros — útil para inspeção pontual e testes; o
+    scan periódico usa :class:`LogAnalyzer`, que lê incrementalmente.
+
     Args:
         log_dir: Diretório raiz de logs (contém subpastas por pod).
         pod_filter: Lista opcional de nomes de pods para filtrar.
@@ -127,6 +670,9 @@ def _scan_files(
     return pods
 
 
+_LIST_MATCHER = ChunkMatcher()
+
+
 def _detect_error_spike(
     pod_name: str,
     lines: List[str],
@@ -135,22 +681,31 @@ def _detect_error_spike(
 ) -> List[Anomaly]:
     """Detecta spike de erros: >N erros/minuto.
 
-    Conta linhas contendo ERROR/CRITICAL/Traceback e verifica se a taxa
-    excede ``threshold`` por minuto em uma janela de ``window_minutes``.
+    Conta linhas com pattern ERROR/CRITICAL (ERROR, CRITICAL, Traceback...)
+    cujo timestamp cai nos últimos ``window_minutes`` antes do timestamp
+    mais recente da lista. Linhas sem timestamp herdam o da linha anterior;
+    se nenhuma linha tem timestamp, todas contam.
     """
-    errors: List[int] = []  # timestamp de cada linha de erro
-    for line in lines:
-        matches = match_line(line)
-        if any(m.severity in (Severity.ERROR, Severity.CRITICAL) for m in matches):
-            # Timestamp aproximado: usa a posição como proxy
-            # (em produção usaríamos parse de timestamp real)
-            errors.append(1)
-
-    if not errors:
+    if not lines:
+        return []
+    hits = _LIST_MATCHER.scan("\n".join(lines), lines)
+    stamps: List[Optional[float]] = []
+    last: Optional[float] = None
+    newest: Optional[float] = None
+    for idx, line in enumerate(lines):
+        ts, _end = _parse_timestamp(line)
+        if ts is not None:
+            last = ts
+            newest = ts if newest is None else max(newest, ts)
+        matched = hits.get(idx)
+        if matched and any(m.severity in (Severity.ERROR, Severity.CRITICAL) for m in matched):
+            stamps.append(last)
+
+    if not stamps:
         return []
 
-    # Taxa de erro por minuto
-    total = len(errors)
+    cutoff = None if newest is None else newest - max(window_minutes, 1) * 60
+    total = sum(1 for ts in stamps if cutoff is None or ts is None or ts > cutoff)
     rate_per_min = total / max(window_minutes, 1)
 
     if rate_per_min > threshold:
@@ -170,64 +725,64 @@ def _detect_error_spike(
 def _detect_auth_expiry(
     pod_name: str, lines: List[str]
 ) -> List[Anomaly]:
-    """Detecta tokens/auth expirados nos logs."""
-    anomalies: List[Anomaly] = []
-    auth_lines: List[str] = []
+    """Detecta tokens/auth expirados nos logs (uma passada só)."""
+    matcher = ChunkMatcher(AUTH_EXPIRED_PATTERNS)
+    by_pattern: Dict[str, List[str]] = {}
+    for idx, matched in matcher.scan("\n".join(lines), lines).items():
+        for pat in matched:
+            by_pattern.setdefault(pat.name, []).append(lines[idx])
 
-    for line in lines:
-        for pat in AUTH_EXPIRED_PATTERNS:
-            if pat.pattern.search(line):
-                auth_lines.append(line)
-                break
-
-    if auth_lines:
-        # Agrupa por pattern
-        for pat in AUTH_EXPIRED_PATTERNS:
-            matching = [line for line in auth_lines if pat.pattern.search(line)]
-            if matching:
-                anomalies.append(
-                    Anomaly(
-                        pattern_name=pat.name,
-                        severity=pat.severity,
-                        pod_name=pod_name,
-                        sample_lines=matching[:5],
-                        count=len(matching),
-                    )
+    anomalies: List[Anomaly] = []
+    for pat in AUTH_EXPIRED_PATTERNS:
+        matching = by_pattern.get(pat.name)
+        if matching:
+            anomalies.append(
+                Anomaly(
+                    pattern_name=pat.name,
+                    severity=pat.severity,
+                    pod_name=pod_name,
+                    sample_lines=matching[:5],
+                    count=len(matching),
                 )
+            )
     return anomalies
 
 
 def _detect_flooding(
-    pod_name: str, lines: List[str], threshold: int
+    pod_name: str, lines: List[str], threshold: int, capacity: int = 64,
 ) -> List[Anomaly]:
-    """Detecta flooding: 200+ linhas idênticas consecutivas."""
+    """Detecta flooding: ``threshold``+ linhas idênticas (fora o timestamp).
+
+    Usa um sketch Space-Saving de ``capacity`` entradas em vez de contar
+    todas as linhas distintas; a contagem reportada é um limite inferior
+    garantido.
+    """
     if len(lines) < threshold:
         return []
 
-    # Conta linhas idênticas (ignora timestamp prefix)
-    line_counts: Counter = Counter()
+    sketch = _SpaceSaving(capacity)
     for line in lines:
-        # Remove timestamp prefix para comparação (formato ISO 8601)
-        # Ex: "2026-05-28T14:00:00 ERROR ..." -> "ERROR ..."
-        normalized = line
-        if len(line) > 26 and line[4] == "-" and line[10] == "T":
-            normalized = line[26:].strip()
-        line_counts[normalized] += 1
-
-    anomalies: List[Anomaly] = []
-    for normalized_line, count in line_counts.items():
-        if count >= threshold and normalized_line.strip():
-            anomalies.append(
-                Anomaly(
-                    pattern_name="log_flooding",
-                    severity=Severity.WARNING,
-                    pod_name=pod_name,
-                    sample_lines=[normalized_line],
-                    count=count,
-                    threshold=threshold,
-                )
-            )
-    return anomalies[:3]  # limita a 3 tipos de flood por scan
+        _ts, ts_end = _parse_timestamp(line)
+        key = _flood_key(line, ts_end)
+        if key:
+            sketch.add(key)
+
+    heavy = sorted(
+        ((key, sketch.guaranteed(key)) for key in sketch.counts),
+        key=lambda kc: (-kc[1], kc[0]),
+    )
+    return [
+        Anomaly(
+            pattern_name="log_flooding",
+            severity=Severity.WARNING,
+            pod_name=pod_name,
+            sample_lines=[key],
+            count=count,
+            threshold=threshold,
+        )
+        for key, count in heavy
+        if count >= threshold
+    ][:3]  # limita a 3 tipos de flood por scan
 
 
 def _detect_silent_pipeline(
@@ -273,7 +828,11 @@ def scan_logs(
     silent_tick_threshold: Optional[int] = None,
     pod_filter: Optional[List[str]] = None,
 ) -> List[Anomaly]:
-    """Executa um scan completo de todos os logs.
+    """Executa um scan de todos os logs (incremental entre chamadas).
+
+    Usa o :class:`LogAnalyzer` compartilhado de ``log_dir``: cada chamada
+    lê só o que foi escrito desde a anterior e avalia as janelas
+    deslizantes.
 
     Args:
         log_dir: Diretório raiz de logs. Default via env var ou ``/home/deile/logs``.
@@ -300,37 +859,19 @@ def scan_logs(
         logger.debug("analyzer disabled via DEILE_LOG_ANALYZER_ENABLED=false")
         return []
 
-    pods = _scan_files(log_dir, pod_filter=pod_filter)
-    if not pods:
+    if not Path(log_dir).is_dir():
         logger.debug("no log files found in %s", log_dir)
         return []
 
-    all_anomalies: List[Anomaly] = []
-
-    for pod_name, lines in pods.items():
-        if not lines:
-            continue
-
-        # 1. Error spike
-        all_anomalies.extend(
-            _detect_error_spike(pod_name, lines, error_rate_threshold)
-        )
-
-        # 2. Auth expiry
-        all_anomalies.extend(_detect_auth_expiry(pod_name, lines))
-
-        # 3. Flooding
-        all_anomalies.extend(
-            _detect_flooding(pod_name, lines, flood_threshold)
-        )
-
-        # 4. Pipeline silencioso (apenas para pods pipeline)
-        if "pipeline" in pod_name.lower():
-            all_anomalies.extend(
-                _detect_silent_pipeline(pod_name, lines, silent_tick_threshold)
-            )
-
-    return all_anomalies
+    analyzer = get_analyzer(
+        log_dir, state_path=cfg["state_path"], window_s=cfg["window_s"],
+    )
+    return analyzer.scan(
+        error_rate_threshold=error_rate_threshold,
+        flood_threshold=flood_threshold,
+        silent_tick_threshold=silent_tick_threshold,
+        pod_filter=pod_filter,
+    )
 
 
 def scan_crash_loops(
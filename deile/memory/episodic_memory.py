@@ -1,17 +1,27 @@
 """Episodic Memory - Histórico de sessões e conversas"""
 
+import asyncio
 import json
 import logging
+import sqlite3
+import threading
 import time
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
-import aiosqlite
+from ..storage.embeddings import (EmbeddingFunction, HashingEmbedder,
+                                  VectorIndex, load_or_create_index)
+from .retrieval import (create_fts_table, fts_match_query, open_index_db,
+                        reciprocal_rank_fusion)
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+_COLUMNS = "episode_id, session_id, user_input, agent_response, timestamp, context, metadata"
+
 
 @dataclass
 class Episode:
@@ -26,45 +36,145 @@ class Episode:
 
 
 class EpisodicMemory:
-    """Gerencia histórico de episódios/interações usando SQLite"""
+    """Gerencia histórico de episódios/interações usando SQLite
+
+    Recuperação híbrida: FTS5 (BM25) sobre ``user_input``/``agent_response``
+    + índice vetorial (``episodes.vec.npz``, ao lado de ``episodes.db``)
+    alimentado por um embedder local plugável, fundidos por RRF.
 
-    def __init__(self, storage_dir: Path, max_episodes_per_session: int = 1000, retention_days: int = 30):
+    Uma única conexão persiste durante a vida da memória; as chamadas
+    síncronas rodam em ``asyncio.to_thread`` serializadas por um lock.
+    """
+
+    def __init__(self, storage_dir: Path, max_episodes_per_session: int = 1000, retention_days: int = 30,
+                 embedder: Optional[EmbeddingFunction] = None, enable_vector_index: bool = True,
+                 vector_min_score: float = 0.2, index_flush_every: int = 256):
         self.storage_dir = storage_dir
         self.max_episodes_per_session = max_episodes_per_session
         self.retention_days = retention_days
+        self.embedder = embedder or HashingEmbedder()
+        self.enable_vector_index = enable_vector_index
+        # Hits só-vetoriais (sem casamento lexical) abaixo disto são ruído.
+        self.vector_min_score = vector_min_score
+        self.index_flush_every = index_flush_every
 
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self.db_path = self.storage_dir / "episodes.db"
+        self.vector_path = self.storage_dir / "episodes.vec.npz"
 
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._fts_enabled = False
+        self._index: Optional[VectorIndex] = None
+        self._index_dirty = 0
         self._is_initialized = False
 
+    # ------------------------------------------------------------------ infra
+
+    def _open(self) -> sqlite3.Connection:
+        """Abre conexão, garante schema/FTS e reconcilia o índice vetorial."""
+        if self._conn is not None:
+            return self._conn
+        conn = open_index_db(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS episodes (
+                episode_id TEXT PRIMARY KEY,
+                session_id TEXT,
+                user_input TEXT,
+                agent_response TEXT,
+                timestamp REAL,
+                context TEXT,
+                metadata TEXT
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_episodes_session_id ON episodes (session_id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_episodes_timestamp ON episodes (timestamp)"
+        )
+        created = create_fts_table(
+            conn, "episodes_fts", ["user_input", "agent_response"], content="episodes"
+        )
+        if created is not None:
+            self._fts_enabled = True
+            # Triggers mantêm o índice external-content em sincronia com
+            # qualquer escrita (inclusive de ferramentas externas ao módulo).
+            conn.executescript("""
+                CREATE TRIGGER IF NOT EXISTS episodes_fts_ai AFTER INSERT ON episodes BEGIN
+                    INSERT INTO episodes_fts(rowid, user_input, agent_response)
+                    VALUES (new.rowid, new.user_input, new.agent_response);
+                END;
+                CREATE TRIGGER IF NOT EXISTS episodes_fts_ad AFTER DELETE ON episodes BEGIN
+                    INSERT INTO episodes_fts(episodes_fts, rowid, user_input, agent_response)
+                    VALUES ('delete', old.rowid, old.user_input, old.agent_response);
+                END;
+                CREATE TRIGGER IF NOT EXISTS episodes_fts_au AFTER UPDATE ON episodes BEGIN
+                    INSERT INTO episodes_fts(episodes_fts, rowid, user_input, agent_response)
+                    VALUES ('delete', old.rowid, old.user_input, old.agent_response);
+                    INSERT INTO episodes_fts(rowid, user_input, agent_response)
+                    VALUES (new.rowid, new.user_input, new.agent_response);
+                END;
+            """)
+            if created:
+                # Banco pré-existente (schema antigo): indexa o histórico.
+                conn.execute("INSERT INTO episodes_fts(episodes_fts) VALUES ('rebuild')")
+        conn.commit()
+        self._conn = conn
+        if self.enable_vector_index:
+            self._index = load_or_create_index(self.vector_path, self.embedder)
+            self._reconcile_index(conn)
+        return conn
+
+    def _reconcile_index(self, conn: sqlite3.Connection) -> None:
+        """O índice vetorial é derivado: alinha-o com a tabela ``episodes``.
+
+        Cobre crash entre flushes, índice de outro embedder e episódios
+        gravados/apagados por fora.
+        """
+        index = self._index
+        db_ids = {row[0] for row in conn.execute("SELECT episode_id FROM episodes")}
+        stale = [i for i in index.ids if i not in db_ids]
+        index.remove(stale)
+        missing = [i for i in db_ids if i not in index]
+        for start in range(0, len(missing), 512):
+            chunk = missing[start:start + 512]
+            marks = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT episode_id, user_input, agent_response FROM episodes "
+                f"WHERE episode_id IN ({marks})", chunk,
+            ).fetchall()
+            index.add([r[0] for r in rows], self.embedder([_episode_text(r[1], r[2]) for r in rows]))
+        if stale or missing:
+            logger.info("Índice vetorial de episódios reconciliado: +%d -%d",
+                        len(missing), len(stale))
+            self._save_index()
+
+    def _save_index(self) -> None:
+        if self._index is None:
+            return
+        self._index.save(self.vector_path, meta={"embedder": self.embedder.name})
+        self._index_dirty = 0
+
+    def _locked(self, fn: Callable[[sqlite3.Connection], _T]) -> _T:
+        with self._lock:
+            return fn(self._open())
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], _T]) -> _T:
+        return await asyncio.to_thread(self._locked, fn)
+
+    # -------------------------------------------------------------------- API
+
     async def initialize(self) -> None:
         """Inicializa o banco de dados"""
         if self._is_initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS episodes (
-                    episode_id TEXT PRIMARY KEY,
-                    session_id TEXT,
-                    user_input TEXT,
-                    agent_response TEXT,
-                    timestamp REAL,
-                    context TEXT,
-                    metadata TEXT
-                )
-            """)
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_episodes_session_id ON episodes (session_id)"
-            )
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_episodes_timestamp ON episodes (timestamp)"
-            )
-            await db.commit()
+        await self._run(lambda conn: None)
 
         self._is_initialized = True
-        logger.info("EpisodicMemory inicializada")
+        logger.info("EpisodicMemory inicializada (fts5=%s, vetores=%s)",
+                    self._fts_enabled, self._index is not None)
 
     async def store_episode(
         self,
@@ -79,9 +189,9 @@ class EpisodicMemory:
         episode_id = f"ep_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
         session_id = session_id or "default"
 
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT INTO episodes (episode_id, session_id, user_input, agent_response, timestamp, context, metadata)
+        def _store(conn: sqlite3.Connection) -> None:
+            conn.execute(f"""
+                INSERT INTO episodes ({_COLUMNS})
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (
                 episode_id,
@@ -92,8 +202,14 @@ class EpisodicMemory:
                 json.dumps(context or {}),
                 json.dumps({})
             ))
-            await db.commit()
+            conn.commit()
+            if self._index is not None:
+                self._index.add([episode_id], self.embedder([_episode_text(user_input, agent_response)]))
+                self._index_dirty += 1
+                if self._index_dirty >= self.index_flush_every:
+                    self._save_index()
 
+        await self._run(_store)
         return episode_id
 
     async def search_episodes(
@@ -102,81 +218,111 @@ class EpisodicMemory:
         session_id: str = None,
         max_results: int = 10
     ) -> List[Dict[str, Any]]:
-        """Busca episódios"""
-        results = []
+        """Busca episódios por relevância (BM25 + similaridade vetorial).
+
+        Consulta vazia devolve os episódios mais recentes. Cada resultado
+        traz ``score`` (RRF); sem FTS5 a perna lexical usa ``LIKE``.
+        """
+        pool = max(max_results * 4, 50)
+
+        def _search(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+            match = fts_match_query(query)
+            if match is None:
+                return self._recent(conn, session_id, max_results)
 
-        async with aiosqlite.connect(self.db_path) as db:
+            lexical = self._lexical_ids(conn, query, match, session_id, pool)
+            vector: List[str] = []
+            if self._index is not None:
+                qvec = self.embedder([query])[0]
+                candidates = None
+                if session_id:
+                    candidates = [r[0] for r in conn.execute(
+                        "SELECT episode_id FROM episodes WHERE session_id = ?", (session_id,)
+                    )]
+                lexical_set = set(lexical)
+                vector = [
+                    doc_id for doc_id, score in self._index.search(qvec, pool, candidates=candidates)
+                    if doc_id in lexical_set or score >= self.vector_min_score
+                ]
+
+            fused = reciprocal_rank_fusion([lexical, vector])[:max_results]
+            rows = _fetch_by_ids(conn, [doc_id for doc_id, _ in fused])
+            return [dict(rows[doc_id], score=score) for doc_id, score in fused if doc_id in rows]
+
+        return await self._run(_search)
+
+    def _lexical_ids(self, conn: sqlite3.Connection, query: str, match: str,
+                     session_id: Optional[str], limit: int) -> List[str]:
+        if self._fts_enabled:
+            sql = (
+                "SELECT e.episode_id FROM episodes_fts "
+                "JOIN episodes e ON e.rowid = episodes_fts.rowid "
+                "WHERE episodes_fts MATCH ?"
+            )
+            params: List[Any] = [match]
             if session_id:
-                cursor = await db.execute("""
-                    SELECT * FROM episodes
-                    WHERE session_id = ? AND (user_input LIKE ? OR agent_response LIKE ?)
-                    ORDER BY timestamp DESC LIMIT ?
-                """, (session_id, f"%{query}%", f"%{query}%", max_results))
-            else:
-                cursor = await db.execute("""
-                    SELECT * FROM episodes
-                    WHERE user_input LIKE ? OR agent_response LIKE ?
-                    ORDER BY timestamp DESC LIMIT ?
-                """, (f"%{query}%", f"%{query}%", max_results))
-
-            rows = await cursor.fetchall()
-            for row in rows:
-                results.append({
-                    "episode_id": row[0],
-                    "session_id": row[1],
-                    "user_input": row[2],
-                    "agent_response": row[3],
-                    "timestamp": row[4],
-                    "context": json.loads(row[5]),
-                    "metadata": json.loads(row[6])
-                })
-
-        return results
+                sql += " AND e.session_id = ?"
+                params.append(session_id)
+            sql += " ORDER BY bm25(episodes_fts) LIMIT ?"
+            params.append(limit)
+            try:
+                return [r[0] for r in conn.execute(sql, params)]
+            except sqlite3.OperationalError as e:
+                logger.debug("FTS MATCH falhou (%s); usando LIKE", e)
+
+        like = f"%{query}%"
+        sql = "SELECT episode_id FROM episodes WHERE (user_input LIKE ? OR agent_response LIKE ?)"
+        params = [like, like]
+        if session_id:
+            sql += " AND session_id = ?"
+            params.append(session_id)
+        sql += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
+        return [r[0] for r in conn.execute(sql, params)]
+
+    @staticmethod
+    def _recent(conn: sqlite3.Connection, session_id: Optional[str],
+                limit: int) -> List[Dict[str, Any]]:
+        if session_id:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM episodes WHERE session_id = ? "
+                "ORDER BY timestamp DESC LIMIT ?", (session_id, limit),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM episodes ORDER BY timestamp DESC LIMIT ?", (limit,),
+            ).fetchall()
+        return [_row_to_dict(row) for row in rows]
 
     async def get_episodes_for_session(self, session_id: str) -> List[Dict[str, Any]]:
         """Return all episodes for a session ordered by timestamp ASC."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT * FROM episodes WHERE session_id = ? ORDER BY timestamp ASC",
-                (session_id,),
-            )
-            rows = await cursor.fetchall()
-        return [
-            {
-                "episode_id": row[0],
-                "session_id": row[1],
-                "user_input": row[2],
-                "agent_response": row[3],
-                "timestamp": row[4],
-                "context": json.loads(row[5]) if row[5] is not None else {},
-                "metadata": json.loads(row[6]) if row[6] is not None else {},
-            }
-            for row in rows
-        ]
+        rows = await self._run(lambda conn: conn.execute(
+            f"SELECT {_COLUMNS} FROM episodes WHERE session_id = ? ORDER BY timestamp ASC",
+            (session_id,),
+        ).fetchall())
+        return [_row_to_dict(row) for row in rows]
 
     async def list_sessions(self, max_sessions: int = 30) -> List[Dict[str, Any]]:
         """Return recent sessions ordered by last activity DESC.
 
         Each entry: session_id, episode_count, last_activity, first_user_input.
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """
-                SELECT
-                    session_id,
-                    COUNT(*) AS episode_count,
-                    MAX(timestamp) AS last_activity,
-                    (SELECT user_input FROM episodes e2
-                     WHERE e2.session_id = e.session_id
-                     ORDER BY e2.timestamp ASC LIMIT 1) AS first_user_input
-                FROM episodes e
-                GROUP BY session_id
-                ORDER BY last_activity DESC
-                LIMIT ?
-                """,
-                (max_sessions,),
-            )
-            rows = await cursor.fetchall()
+        rows = await self._run(lambda conn: conn.execute(
+            """
+            SELECT
+                session_id,
+                COUNT(*) AS episode_count,
+                MAX(timestamp) AS last_activity,
+                (SELECT user_input FROM episodes e2
+                 WHERE e2.session_id = e.session_id
+                 ORDER BY e2.timestamp ASC LIMIT 1) AS first_user_input
+            FROM episodes e
+            GROUP BY session_id
+            ORDER BY last_activity DESC
+            LIMIT ?
+            """,
+            (max_sessions,),
+        ).fetchall())
         return [
             {
                 "session_id": row[0],
@@ -189,20 +335,62 @@ class EpisodicMemory:
 
     async def get_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas"""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM episodes")
-            total_episodes = (await cursor.fetchone())[0]
+        def _stats(conn: sqlite3.Connection):
+            total_episodes = conn.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
+            total_sessions = conn.execute(
+                "SELECT COUNT(DISTINCT session_id) FROM episodes"
+            ).fetchone()[0]
+            return total_episodes, total_sessions
 
-            cursor = await db.execute("SELECT COUNT(DISTINCT session_id) FROM episodes")
-            total_sessions = (await cursor.fetchone())[0]
+        total_episodes, total_sessions = await self._run(_stats)
+        db_bytes = self.db_path.stat().st_size if self.db_path.exists() else 0
 
         return {
             "total_episodes": total_episodes,
             "total_sessions": total_sessions,
-            "memory_mb": 0.1,  # Estimativa básica
+            "memory_mb": round(db_bytes / (1024 * 1024), 3),
+            "fts_enabled": self._fts_enabled,
+            "vector_index_size": len(self._index) if self._index is not None else 0,
             "is_initialized": self._is_initialized
         }
 
     async def shutdown(self) -> None:
-        """Finalização"""
-        self._is_initialized = False
\ No newline at end of file
+        """Finalização: persiste o índice vetorial pendente e fecha a conexão."""
+        def _close() -> None:
+            with self._lock:
+                if self._conn is None:
+                    return
+                if self._index_dirty:
+                    self._save_index()
+                self._conn.close()
+                self._conn = None
+                self._index = None
+
+        await asyncio.to_thread(_close)
+        self._is_initialized = False
+
+
+def _episode_text(user_input: Optional[str], agent_response: Optional[str]) -> str:
+    return f"{user_input or ''}\n{agent_response or ''}"
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    return {
+        "episode_id": row[0],
+        "session_id": row[1],
+        "user_input": row[2],
+        "agent_response": row[3],
+        "timestamp": row[4],
+        "context": json.loads(row[5]) if row[5] is not None else {},
+        "metadata": json.loads(row[6]) if row[6] is not None else {},
+    }
+
+
+def _fetch_by_ids(conn: sqlite3.Connection, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    if not ids:
+        return {}
+    marks = ",".join("?" * len(ids))
+    rows = conn.execute(
+        f"SELECT {_COLUMNS} FROM episodes WHERE episode_id IN ({marks})", ids
+    ).fetchall()
+    return {row[0]: _row_to_dict(row) for row in rows}
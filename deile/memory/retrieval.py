@@ -0,0 +1,96 @@
+"""Primitivas de recuperação compartilhadas pelas memórias episódica e semântica.
+
+- Conexão SQLite persistente (WAL) usada a partir de ``asyncio.to_thread``.
+- Tabelas FTS5 (ranking BM25) com detecção de suporte em runtime.
+- Tradução de texto livre para uma expressão ``MATCH`` segura.
+- Fusão híbrida por Reciprocal Rank Fusion (lexical + vetorial).
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..storage.embeddings import tokenize
+
+logger = logging.getLogger(__name__)
+
+#: Constante ``k`` do RRF (Cormack et al.); 60 é o valor de referência.
+RRF_K = 60
+
+
+def open_index_db(path: Path) -> sqlite3.Connection:
+    """Abre a conexão persistente de uma memória.
+
+    ``check_same_thread=False`` porque as chamadas chegam por
+    ``asyncio.to_thread`` (threads do pool variam); o chamador serializa o
+    acesso com um ``threading.Lock``. Evitamos aiosqlite aqui: cada conexão
+    dele é uma thread não-daemon, e uma memória não finalizada seguraria o
+    processo na saída.
+    """
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def create_fts_table(conn: sqlite3.Connection, name: str, columns: Sequence[str],
+                     *, content: Optional[str] = None) -> Optional[bool]:
+    """Cria a tabela FTS5 ``name`` se necessário.
+
+    Retorna ``True`` se acabou de ser criada (o chamador deve popular),
+    ``False`` se já existia e ``None`` se o SQLite não tem FTS5 — nesse caso
+    o chamador cai para ``LIKE``.
+    """
+    if table_exists(conn, name):
+        return False
+    options = list(columns)
+    if content:
+        options += [f"content='{content}'", "content_rowid='rowid'"]
+    options.append("tokenize='unicode61 remove_diacritics 2'")
+    try:
+        conn.execute(f"CREATE VIRTUAL TABLE {name} USING fts5({', '.join(options)})")
+    except sqlite3.OperationalError as e:
+        logger.warning("FTS5 indisponível (%s); busca lexical via LIKE", e)
+        return None
+    return True
+
+
+def fts_match_query(text: str) -> Optional[str]:
+    """Converte texto livre numa expressão FTS5 ``OR`` de prefixos.
+
+    Cada token vira ``"tok"*`` (aspas neutralizam operadores como ``NOT``/
+    ``NEAR``; o ``*`` preserva a semântica de substring-prefixo do antigo
+    ``LIKE``). BM25 cuida de premiar documentos que casam mais termos.
+    """
+    tokens = list(dict.fromkeys(tokenize(text)))
+    if not tokens:
+        return None
+    return " OR ".join(f'"{t}"*' for t in tokens)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], *,
+                           k: int = RRF_K,
+                           weights: Optional[Sequence[float]] = None,
+                           ) -> List[Tuple[str, float]]:
+    """Funde listas ranqueadas: ``score(d) = Σ w_i / (k + rank_i(d))``.
+
+    Insensível à escala dos scores de origem (BM25 e cosseno não são
+    comparáveis), o que dispensa calibração. Empates preservam a ordem da
+    primeira lista em que o documento apareceu.
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[str, float] = {}
+    for ranking, w in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + w / (k + rank)
+    return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
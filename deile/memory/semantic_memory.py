@@ -3,26 +3,49 @@
 import asyncio
 import json
 import logging
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from ..storage.embeddings import (EmbeddingFunction, HashingEmbedder,
+                                  VectorIndex, load_or_create_index)
+from .retrieval import (create_fts_table, fts_match_query, open_index_db,
+                        reciprocal_rank_fusion)
 
 logger = logging.getLogger(__name__)
 
 
 class SemanticMemory:
-    """Gerencia conhecimento estruturado (implementação básica)"""
+    """Gerencia conhecimento estruturado
+
+    ``knowledge.jsonl`` continua sendo a fonte de verdade; ``facts.db``
+    (FTS5/BM25) e ``facts.vec.npz`` (vetores do embedder local) são índices
+    derivados, reconstruídos no ``initialize`` se divergirem do JSONL. A
+    busca funde as duas pernas por RRF sobre a base inteira.
+    """
 
     def __init__(self, storage_dir: Path, enable_vector_store: bool = True,
-                 vector_dimensions: int = 768, similarity_threshold: float = 0.7):
+                 vector_dimensions: int = 768, similarity_threshold: float = 0.7,
+                 embedder: Optional[EmbeddingFunction] = None):
         self.storage_dir = storage_dir
         self.enable_vector_store = enable_vector_store
         self.vector_dimensions = vector_dimensions
+        # Corte para fatos encontrados só pela perna vetorial.
         self.similarity_threshold = similarity_threshold
+        self.embedder = embedder or HashingEmbedder(dim=vector_dimensions)
 
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self.knowledge_file = self.storage_dir / "knowledge.jsonl"
+        self.index_db_path = self.storage_dir / "facts.db"
+        self.vector_path = self.storage_dir / "facts.vec.npz"
 
         self._knowledge_base = []
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._fts_enabled = False
+        self._index: Optional[VectorIndex] = None
+        self._index_dirty = 0
         self._is_initialized = False
 
     async def initialize(self) -> None:
@@ -35,10 +58,49 @@ class SemanticMemory:
             self._knowledge_base.extend(
                 await asyncio.to_thread(_read_jsonl, self.knowledge_file)
             )
+        await asyncio.to_thread(self._open_indexes)
 
         self._is_initialized = True
         logger.info("SemanticMemory inicializada")
 
+    def _open_indexes(self) -> None:
+        """Abre ``facts.db``/``facts.vec.npz`` e alinha com ``_knowledge_base``."""
+        with self._lock:
+            if self._conn is not None:
+                return
+            conn = open_index_db(self.index_db_path)
+            created = create_fts_table(conn, "facts_fts", ["content"])
+            self._fts_enabled = created is not None
+            if self._fts_enabled:
+                indexed = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM facts_fts").fetchone()[0]
+                if indexed != len(self._knowledge_base):
+                    conn.execute("DELETE FROM facts_fts")
+                    conn.executemany(
+                        "INSERT INTO facts_fts(rowid, content) VALUES (?, ?)",
+                        ((pos + 1, _fact_text(rec)) for pos, rec in enumerate(self._knowledge_base)),
+                    )
+                conn.commit()
+            self._conn = conn
+
+            if self.enable_vector_store:
+                index = load_or_create_index(self.vector_path, self.embedder)
+                if len(index) != len(self._knowledge_base) or (
+                        len(index) and str(len(index) - 1) not in index):
+                    index.clear()
+                    texts = [_fact_text(rec) for rec in self._knowledge_base]
+                    for start in range(0, len(texts), 512):
+                        chunk = texts[start:start + 512]
+                        index.add([str(start + i) for i in range(len(chunk))], self.embedder(chunk))
+                    self._index = index
+                    self._save_index()
+                else:
+                    self._index = index
+
+    def _save_index(self) -> None:
+        if self._index is not None:
+            self._index.save(self.vector_path, meta={"embedder": self.embedder.name})
+            self._index_dirty = 0
+
     async def store_knowledge(self, knowledge: Dict[str, Any]) -> None:
         """Armazena conhecimento.
 
@@ -53,23 +115,68 @@ class SemanticMemory:
         record = dict(knowledge)
         record['stored_at'] = record.get('extracted_at', record.get('stored_at', 0))
         self._knowledge_base.append(record)
+        position = len(self._knowledge_base) - 1
 
         await asyncio.to_thread(_append_jsonl_record, self.knowledge_file, record)
+        if self._conn is not None:
+            await asyncio.to_thread(self._index_fact, position, record)
+
+    def _index_fact(self, position: int, record: Dict[str, Any]) -> None:
+        text = _fact_text(record)
+        with self._lock:
+            if self._conn is None:
+                return
+            if self._fts_enabled:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO facts_fts(rowid, content) VALUES (?, ?)",
+                    (position + 1, text),
+                )
+                self._conn.commit()
+            if self._index is not None:
+                self._index.add([str(position)], self.embedder([text]))
+                self._index_dirty += 1
+                if self._index_dirty >= 256:
+                    self._save_index()
 
     async def search_knowledge(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
-        """Busca conhecimento (implementação básica)"""
-        results = []
-        query_lower = query.lower()
-
-        for knowledge in self._knowledge_base[-max_results:]:  # Pega os mais recentes
-            content = str(knowledge.get('user_input', '')) + str(knowledge.get('agent_response', ''))
-            if query_lower in content.lower():
-                results.append({
-                    "content": content,
-                    "score": 1.0,
-                    "metadata": knowledge
-                })
+        """Busca conhecimento por relevância (BM25 + vetores, fundidos por RRF)."""
+        if self._conn is None:
+            await asyncio.to_thread(self._open_indexes)
+        pool = max(max_results * 4, 50)
+        return await asyncio.to_thread(self._search, query, pool, max_results)
+
+    def _search(self, query: str, pool: int, max_results: int) -> List[Dict[str, Any]]:
+        match = fts_match_query(query)
+        if match is None:
+            return []
+        with self._lock:
+            if self._fts_enabled:
+                lexical = [str(r[0] - 1) for r in self._conn.execute(
+                    "SELECT rowid FROM facts_fts WHERE facts_fts MATCH ? "
+                    "ORDER BY bm25(facts_fts) LIMIT ?", (match, pool),
+                )]
+            else:
+                query_lower = query.lower()
+                lexical = [
+                    str(pos) for pos in range(len(self._knowledge_base) - 1, -1, -1)
+                    if query_lower in _fact_text(self._knowledge_base[pos]).lower()
+                ][:pool]
+            vector: List[str] = []
+            if self._index is not None:
+                lexical_set = set(lexical)
+                vector = [
+                    doc_id for doc_id, score in self._index.search(self.embedder([query])[0], pool)
+                    if doc_id in lexical_set or score >= self.similarity_threshold
+                ]
 
+        results = []
+        for doc_id, score in reciprocal_rank_fusion([lexical, vector])[:max_results]:
+            knowledge = self._knowledge_base[int(doc_id)]
+            results.append({
+                "content": _fact_text(knowledge),
+                "score": score,
+                "metadata": knowledge
+            })
         return results
 
     async def store_correction(self, interaction_id: str, correction_data: Dict[str, Any]) -> None:
@@ -87,13 +194,37 @@ class SemanticMemory:
         return {
             "total_knowledge_entries": len(self._knowledge_base),
             "memory_mb": 0.1,
+            "fts_enabled": self._fts_enabled,
+            "vector_index_size": len(self._index) if self._index is not None else 0,
             "is_initialized": self._is_initialized
         }
 
     async def shutdown(self) -> None:
         """Finalização"""
+        def _close() -> None:
+            with self._lock:
+                if self._conn is None:
+                    return
+                if self._index_dirty:
+                    self._save_index()
+                self._conn.close()
+                self._conn = None
+                self._index = None
+
+        await asyncio.to_thread(_close)
         self._is_initialized = False
 
+
+def _fact_text(record: Dict[str, Any]) -> str:
+    """Texto indexável de um fato: a interação, ou o JSON do registro."""
+    if 'user_input' in record or 'agent_response' in record:
+        return f"{record.get('user_input', '')}\n{record.get('agent_response', '')}"
+    return json.dumps(
+        {k: v for k, v in record.items() if k not in ('stored_at', 'extracted_at')},
+        ensure_ascii=False, default=str,
+    )
+
+
 def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
     """Sync JSONL reader called from ``asyncio.to_thread``."""
     out: List[Dict[str, Any]] = []
@@ -0,0 +1,251 @@
+"""Catálogo SQLite de planos e pedidos de aprovação.
+
+``PlanManager`` e ``ApprovalSystem`` persistem um JSON por plano/pedido.
+Listar a partir desses arquivos custa O(arquivos × tamanho): cada listagem
+abria e parseava tudo só para montar um resumo. O catálogo guarda uma linha
+de resumo por arquivo (id, status, timestamps, contadores, risco) num
+``.catalog.db`` ao lado dos JSONs, mantida a cada save, com filtros
+indexados e paginação.
+
+Os JSONs continuam sendo a fonte de verdade. ``rebuild`` reconcilia o
+catálogo com o diretório (arquivos novos, alterados por fora ou apagados),
+re-parseando apenas os arquivos cuja versão (``mtime_ns``, mais o estado do
+journal de steps no caso dos planos) mudou. Helper interno do subpacote
+``orchestration``.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..storage.sqlite_pool import get_database
+
+__all__ = ["PlanCatalog", "ApprovalCatalog", "CATALOG_FILENAME"]
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = ".catalog.db"
+
+# Parser de um arquivo do diretório para a linha do catálogo; ``None`` pula.
+Summarizer = Callable[[Path], Optional[Dict[str, Any]]]
+
+
+class _DirCatalog:
+    """Índice de um diretório de JSONs (um arquivo por ``<id>.json``)."""
+
+    TABLE = ""
+    KEY = ""
+    COLUMNS: Sequence[str] = ()
+    ORDER_BY = ""
+    SCHEMA = ""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.db_path = self.directory / CATALOG_FILENAME
+        self._db = get_database(self.db_path)
+        self._db.executescript(self.SCHEMA)
+        cols = ", ".join((*self.COLUMNS, "file_mtime_ns"))
+        marks = ", ".join("?" * (len(self.COLUMNS) + 1))
+        updates = ", ".join(f"{c} = excluded.{c}" for c in (*self.COLUMNS, "file_mtime_ns")
+                            if c != self.KEY)
+        self._upsert_sql = (
+            f"INSERT INTO {self.TABLE} ({cols}) VALUES ({marks}) "
+            f"ON CONFLICT({self.KEY}) DO UPDATE SET {updates}"
+        )
+
+    # -- escrita ----------------------------------------------------
+
+    def _row(self, summary: Dict[str, Any], version: Any) -> tuple:
+        return (*(summary.get(c) for c in self.COLUMNS), version)
+
+    def upsert(self, summary: Dict[str, Any], version: Any = None) -> None:
+        """Grava/atualiza o resumo de um item (chamado a cada save).
+
+        ``version`` deve vir de ``file_version`` para o ``rebuild`` seguinte
+        reconhecer o arquivo como já indexado.
+        """
+        row = self._row(summary, version)
+        self._db.write(lambda conn: conn.execute(self._upsert_sql, row))
+
+    def file_version(self, path: Path) -> Any:
+        """Versão do arquivo guardada em ``file_mtime_ns``; ``OSError`` se sumiu.
+
+        Tudo que o ``summarize`` lê precisa entrar aqui, senão o ``rebuild``
+        pula um item que mudou.
+        """
+        return path.stat().st_mtime_ns
+
+    def delete(self, key: str) -> bool:
+        return self._db.write(lambda conn: conn.execute(
+            f"DELETE FROM {self.TABLE} WHERE {self.KEY} = ?", (key,)
+        ).rowcount > 0)
+
+    def rebuild(self, summarize: Summarizer) -> Dict[str, int]:
+        """Reconcilia o catálogo com os ``*.json`` do diretório.
+
+        Arquivos com ``file_version`` igual à registrada não são relidos;
+        linhas sem arquivo correspondente são removidas. Devolve contagens
+        (``scanned``, ``updated``, ``removed``, ``errors``).
+        """
+        known = dict(self._db.read(lambda conn: conn.execute(
+            f"SELECT {self.KEY}, file_mtime_ns FROM {self.TABLE}"
+        ).fetchall()))
+
+        rows: List[tuple] = []
+        seen = set()
+        errors = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                version = self.file_version(path)
+            except OSError:
+                continue
+            key = path.stem
+            seen.add(key)
+            if known.get(key) == version:
+                continue
+            try:
+                summary = summarize(path)
+            except Exception as e:
+                logger.warning(f"Catalog: failed to index {path}: {e}")
+                summary = None
+            if summary is None:
+                errors += 1
+                continue
+            summary[self.KEY] = key
+            rows.append(self._row(summary, version))
+
+        stale = [(key,) for key in known if key not in seen]
+
+        def _tx(conn: sqlite3.Connection) -> None:
+            conn.executemany(self._upsert_sql, rows)
+            conn.executemany(f"DELETE FROM {self.TABLE} WHERE {self.KEY} = ?", stale)
+
+        if rows or stale:
+            self._db.write(_tx)
+        return {"scanned": len(seen), "updated": len(rows),
+                "removed": len(stale), "errors": errors}
+
+    # -- leitura ----------------------------------------------------
+
+    def query(self, filters: Optional[Dict[str, Any]] = None, *,
+              exclude: Sequence[str] = (), limit: Optional[int] = None,
+              offset: int = 0) -> List[Dict[str, Any]]:
+        """Resumos filtrados por igualdade, na ordem do catálogo, paginados."""
+        where, params = self._where(filters, exclude)
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM {self.TABLE}{where} ORDER BY {self.ORDER_BY}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend((-1 if limit is None else int(limit), int(offset)))
+
+        def _read(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+            cur = conn.execute(sql, params)
+            return [dict(zip(self.COLUMNS, r)) for r in cur.fetchall()]
+
+        return self._db.read(_read)
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        where, params = self._where(filters, ())
+        return self._db.read(lambda conn: conn.execute(
+            f"SELECT COUNT(*) FROM {self.TABLE}{where}", params
+        ).fetchone()[0])
+
+    def _where(self, filters: Optional[Dict[str, Any]],
+               exclude: Sequence[str]) -> tuple:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (filters or {}).items():
+            if value is None:
+                continue
+            if column not in self.COLUMNS:
+                raise ValueError(f"Unknown catalog filter: {column}")
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        if exclude:
+            clauses.append(f"{self.KEY} NOT IN ({', '.join('?' * len(exclude))})")
+            params.extend(exclude)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class PlanCatalog(_DirCatalog):
+    """Resumo por plano para ``PlanManager.list_plans``."""
+
+    TABLE = "plans"
+    KEY = "id"
+    COLUMNS = (
+        "id", "title", "description", "status", "created_at", "started_at",
+        "completed_at", "total_steps", "completed_steps", "failed_steps",
+        "skipped_steps", "risk_level",
+    )
+    # created_at é ISO-8601 local (datetime.isoformat) — ordena como texto.
+    ORDER_BY = "created_at DESC, id"
+    JOURNAL_SUFFIX = ".steps.jsonl"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS plans (
+        id TEXT PRIMARY KEY,
+        title TEXT,
+        description TEXT,
+        status TEXT,
+        created_at TEXT,
+        started_at TEXT,
+        completed_at TEXT,
+        total_steps INTEGER NOT NULL DEFAULT 0,
+        completed_steps INTEGER NOT NULL DEFAULT 0,
+        failed_steps INTEGER NOT NULL DEFAULT 0,
+        skipped_steps INTEGER NOT NULL DEFAULT 0,
+        risk_level TEXT,
+        file_mtime_ns INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS idx_plans_created ON plans(created_at);
+    CREATE INDEX IF NOT EXISTS idx_plans_status ON plans(status, created_at);
+    CREATE INDEX IF NOT EXISTS idx_plans_risk ON plans(risk_level, created_at);
+    """
+
+    def file_version(self, path: Path) -> Any:
+        """``mtime_ns`` do snapshot, mais ``(mtime_ns, size)`` do journal.
+
+        ``PlanManager._save_step`` só anexa ao ``<plan>.steps.jsonl``; o JSON
+        do plano fica intocado até o próximo snapshot. Sem o journal na
+        versão, o ``rebuild`` não veria progresso gravado por outro processo.
+        """
+        mtime_ns = path.stat().st_mtime_ns
+        try:
+            journal = path.with_name(path.stem + self.JOURNAL_SUFFIX).stat()
+        except FileNotFoundError:
+            return mtime_ns
+        return f"{mtime_ns}:{journal.st_mtime_ns}:{journal.st_size}"
+
+
+class ApprovalCatalog(_DirCatalog):
+    """Resumo por pedido para ``ApprovalSystem.list_requests``."""
+
+    TABLE = "approvals"
+    KEY = "request_id"
+    COLUMNS = (
+        "request_id", "plan_id", "step_id", "tool_name", "operation",
+        "risk_level", "status", "description", "created_at", "expires_at",
+        "approved_at", "approved_by", "denied_by", "denial_reason",
+    )
+    ORDER_BY = "created_at DESC, request_id"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS approvals (
+        request_id TEXT PRIMARY KEY,
+        plan_id TEXT,
+        step_id TEXT,
+        tool_name TEXT,
+        operation TEXT,
+        risk_level TEXT,
+        status TEXT,
+        description TEXT,
+        created_at REAL,
+        expires_at REAL,
+        approved_at REAL,
+        approved_by TEXT,
+        denied_by TEXT,
+        denial_reason TEXT,
+        file_mtime_ns INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS idx_approvals_created ON approvals(created_at);
+    CREATE INDEX IF NOT EXISTS idx_approvals_status ON approvals(status, created_at);
+    CREATE INDEX IF NOT EXISTS idx_approvals_plan ON approvals(plan_id, created_at);
+    """
@@ -78,7 +78,7 @@ class PlanStep:
                 "success": self.result.is_success,
                 "status": self.result.status.value,
                 "output_preview": str(self.result.data)[:200] if self.result.data is not None else "",
-                "artifact_path": self.result.artifact_path
+                "artifact_ref": self.result.artifact_ref
             }
         return data
 
@@ -9,6 +9,7 @@ Author: DEILE
 """
 
 import asyncio
+import json
 import logging
 import time
 import uuid
@@ -18,6 +19,7 @@ from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Union
 
 from ..storage.aio_fileio import read_json, write_json
+from ._catalog import ApprovalCatalog
 
 logger = logging.getLogger(__name__)
 
@@ -156,6 +158,11 @@ class ApprovalSystem:
         # FileNotFoundError; default ``Path("APPROVALS")`` is a single segment
         # under cwd so the new flag is also harmless there.
         self.approvals_dir.mkdir(parents=True, exist_ok=True)
+
+        # SQLite summary index for list_requests; the JSON files stay the
+        # source of truth. Opened on first use, reconciled on the first listing.
+        self._catalog: Optional[ApprovalCatalog] = None
+        self._catalog_synced = False
         
         # Active requests
         self.pending_requests: Dict[str, ApprovalRequest] = {}
@@ -171,6 +178,18 @@ class ApprovalSystem:
         # Background task for cleanup
         self._cleanup_task = None
         
+    @property
+    def catalog(self) -> ApprovalCatalog:
+        if self._catalog is None:
+            self._catalog = ApprovalCatalog(self.approvals_dir)
+        return self._catalog
+
+    async def _get_catalog(self) -> ApprovalCatalog:
+        """``catalog`` opened off the loop: creating it runs DDL on the writer."""
+        if self._catalog is None:
+            await asyncio.to_thread(getattr, self, "catalog")
+        return self._catalog
+
     def _load_default_rules(self):
         """Load default approval rules"""
         
@@ -413,59 +432,55 @@ class ApprovalSystem:
     async def list_requests(self,
                            status_filter: Optional[ApprovalStatus] = None,
                            plan_id_filter: Optional[str] = None,
-                           limit: int = 50) -> List[Dict[str, Any]]:
-        """List approval requests with filtering"""
-        
-        requests = []
-        
-        # Add pending requests
-        for request in self.pending_requests.values():
-            if status_filter and request.status != status_filter:
-                continue
-            if plan_id_filter and request.plan_id != plan_id_filter:
-                continue
-            
-            requests.append(self._request_to_summary(request))
-        
-        # Add completed requests from storage
+                           limit: int = 50,
+                           offset: int = 0,
+                           risk_level_filter: Optional[RiskLevel] = None) -> List[Dict[str, Any]]:
+        """List approval requests with filtering, most recent first.
+
+        Pending requests come from memory; everything else is served from
+        the catalog indexes without opening the per-request JSON files.
+        """
+        if not self._catalog_synced:
+            await self.rebuild_catalog()
+
+        requests = [
+            self._request_to_summary(request)
+            for request in self.pending_requests.values()
+            if (not status_filter or request.status == status_filter)
+            and (not plan_id_filter or request.plan_id == plan_id_filter)
+            and (not risk_level_filter or request.risk_level == risk_level_filter)
+        ]
+
+        filters = {
+            "status": status_filter.value if status_filter else None,
+            "plan_id": plan_id_filter,
+            "risk_level": risk_level_filter.value if risk_level_filter else None,
+        }
         try:
-            for request_file in self.approvals_dir.glob("*.json"):
-                if len(requests) >= limit:
-                    break
-
-                data = await read_json(request_file)
-                
-                # Skip if already in pending
-                if data.get('request_id') in self.pending_requests:
-                    continue
-                
-                if status_filter and data.get('status') != status_filter.value:
-                    continue
-                if plan_id_filter and data.get('plan_id') != plan_id_filter:
-                    continue
-                
-                requests.append({
-                    "request_id": data.get("request_id"),
-                    "plan_id": data.get("plan_id"),
-                    "step_id": data.get("step_id"),
-                    "tool_name": data.get("tool_name"),
-                    "operation": data.get("operation"),
-                    "risk_level": data.get("risk_level"),
-                    "status": data.get("status"),
-                    "created_at": data.get("created_at"),
-                    "approved_at": data.get("approved_at"),
-                    "approved_by": data.get("approved_by"),
-                    "denied_by": data.get("denied_by"),
-                    "denial_reason": data.get("denial_reason")
-                })
-                
+            # The page can be made of any mix of pending and stored rows, so
+            # fetch enough stored rows to fill it on their own.
+            catalog = await self._get_catalog()
+            stored = await asyncio.to_thread(
+                catalog.query, filters,
+                exclude=list(self.pending_requests), limit=offset + limit,
+            )
+            requests.extend({k: row[k] for k in _SUMMARY_FIELDS} for row in stored)
         except Exception as e:
-            logger.warning(f"Error reading approval requests: {e}")
-        
+            logger.warning(f"Error reading approval catalog: {e}")
+
         # Sort by creation time (most recent first)
-        requests.sort(key=lambda x: x.get("created_at", 0), reverse=True)
-        
-        return requests[:limit]
+        requests.sort(key=lambda x: x.get("created_at") or 0, reverse=True)
+
+        return requests[offset:offset + limit]
+
+    async def rebuild_catalog(self) -> Dict[str, int]:
+        """Reconcile the catalog with the JSON files on disk (repairs drift)."""
+        catalog = await self._get_catalog()
+        stats = await asyncio.to_thread(catalog.rebuild, _summarize_request_file)
+        self._catalog_synced = True
+        if stats["updated"] or stats["removed"]:
+            logger.info(f"Approval catalog rebuilt: {stats}")
+        return stats
     
     def _check_rules(self, request: ApprovalRequest) -> Optional[str]:
         """Check approval rules for auto-decision"""
@@ -527,6 +542,14 @@ class ApprovalSystem:
         except Exception as e:
             logger.error(f"Failed to save approval request {request.request_id}: {e}")
             raise
+        await asyncio.to_thread(self._index_request, request, request_file)
+
+    def _index_request(self, request: ApprovalRequest, request_file: Path) -> None:
+        """Upsert the request summary; failures are repaired by rebuild_catalog."""
+        try:
+            self.catalog.upsert(request.to_dict(), self.catalog.file_version(request_file))
+        except Exception as e:
+            logger.warning(f"Failed to index approval request {request.request_id}: {e}")
 
     async def _load_request(self, request_id: str) -> Optional[ApprovalRequest]:
         """Load request from storage (offloaded to a worker thread)."""
@@ -592,6 +615,19 @@ class ApprovalSystem:
                 await asyncio.sleep(60)
 
 
+_SUMMARY_FIELDS = (
+    "request_id", "plan_id", "step_id", "tool_name", "operation", "risk_level",
+    "status", "created_at", "approved_at", "approved_by", "denied_by",
+    "denial_reason",
+)
+
+
+def _summarize_request_file(request_file: Path) -> Dict[str, Any]:
+    """Catalog row for a stored request (raw JSON; tolerates partial records)."""
+    with open(request_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 # Global instance
 _approval_system: Optional[ApprovalSystem] = None
 
@@ -1,17 +1,53 @@
-"""Artifact Management System for DEILE"""
+"""Artifact Management System for DEILE
+
+Outputs de tools vão para um blob store endereçado por conteúdo: o JSON do
+output é serializado em streaming (``iterencode``), comprimido em chunks
+(zstd quando ``zstandard`` está instalado, gzip caso contrário) e gravado em
+``blobs/<hh>/<sha256>``. Outputs idênticos — na mesma run ou em runs
+diferentes — compartilham o mesmo blob.
+
+Os metadados de cada artefato (run, tool, sequência, input, status, blob)
+ficam numa única tabela SQLite indexada por raiz (``index.db``);
+listagem, estatísticas e retenção são consultas nesse índice, sem varrer a
+árvore de diretórios. Blobs sem referência são removidos pela retenção.
+
+``store_artifact`` devolve uma referência opaca
+(``artifact://<run_id>/<artifact_id>``), não um arquivo: o conteúdo só é
+acessível por ``get_artifact``, ``get_artifact_metadata`` e
+``open_artifact_output``. Runs do layout antigo (``<run>/<tool>_NNN.json[.gz]``
++ ``_metadata.json`` por invocação) são importadas para o índice uma única
+vez, na abertura da raiz; paths antigos já entregues continuam resolvendo.
+"""
 
 import gzip
 import hashlib
 import json
 import logging
+import os
+import sqlite3
+import tempfile
 import time
 import uuid
+import zlib
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, List, Optional
+
+from ..storage.sqlite_pool import get_database
+
+try:
+    import zstandard
+except ImportError:  # extra opcional ``artifacts``
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+_CHUNK_SIZE = 256 * 1024
+_INDEX_FILENAME = "index.db"
+_BLOBS_DIRNAME = "blobs"
+_REF_SCHEME = "artifact://"
+_LEGACY_SUFFIXES = (".json.gz", ".json")
+
 
 @dataclass
 class ArtifactMetadata:
@@ -26,211 +62,533 @@ class ArtifactMetadata:
     status: str
     error_info: Optional[Dict[str, Any]] = None
     compressed: bool = False
-    
+    blob_hash: Optional[str] = None
+    stored_size: int = 0
+    codec: Optional[str] = None
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return asdict(self)
 
 
+class _BlobWriter:
+    """Hash + compressão em streaming para um arquivo temporário."""
+
+    def __init__(self, tmp_dir: Path, codec: str):
+        self.codec = codec
+        self.size = 0
+        self.stored_size = 0
+        self._hash = hashlib.sha256()
+        fd, name = tempfile.mkstemp(dir=tmp_dir, prefix=".blob-")
+        self.tmp_path = Path(name)
+        self._file = os.fdopen(fd, "wb")
+        if codec == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        else:
+            # wbits=31 → container gzip, legível por ``gzip.open``.
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def write(self, data: bytes) -> None:
+        self.size += len(data)
+        self._hash.update(data)
+        self._emit(self._compressor.compress(data))
+
+    def _emit(self, data: bytes) -> None:
+        if data:
+            self.stored_size += len(data)
+            self._file.write(data)
+
+    def finish(self) -> str:
+        self._emit(self._compressor.flush())
+        self._file.close()
+        return self._hash.hexdigest()
+
+    def discard(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
 class ArtifactManager:
-    """Gerenciador central de artefatos"""
-    
-    def __init__(self, artifacts_dir: Path = None):
+    """Gerenciador central de artefatos (blob store + índice SQLite)."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS blobs (
+        hash TEXT PRIMARY KEY,
+        codec TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        stored_size INTEGER NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS artifacts (
+        run_id TEXT NOT NULL,
+        artifact_id TEXT NOT NULL,
+        tool_name TEXT NOT NULL,
+        sequence INTEGER NOT NULL,
+        timestamp REAL NOT NULL,
+        input_json TEXT NOT NULL,
+        input_hash TEXT NOT NULL,
+        output_size INTEGER NOT NULL,
+        execution_time REAL NOT NULL,
+        status TEXT NOT NULL,
+        error_json TEXT,
+        blob_hash TEXT NOT NULL REFERENCES blobs(hash),
+        PRIMARY KEY (run_id, artifact_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_artifacts_run_seq ON artifacts(run_id, sequence);
+    CREATE INDEX IF NOT EXISTS idx_artifacts_timestamp ON artifacts(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_artifacts_blob ON artifacts(blob_hash);
+    """
+
+    def __init__(self, artifacts_dir: Path = None, codec: Optional[str] = None):
         self.artifacts_dir = artifacts_dir or Path("ARTIFACTS")
         self.artifacts_dir.mkdir(parents=True, exist_ok=True)
-        self._sequence_counter = 0
-        
+        self.blobs_dir = self.artifacts_dir / _BLOBS_DIRNAME
+        self.blobs_dir.mkdir(exist_ok=True)
+        if codec is None:
+            codec = "zstd" if zstandard is not None else "gzip"
+        if codec not in ("zstd", "gzip"):
+            raise ValueError(f"Unsupported artifact codec: {codec}")
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("codec 'zstd' requires the 'zstandard' package")
+        self.codec = codec
+        self._db = get_database(self.artifacts_dir / _INDEX_FILENAME)
+        self._db.executescript(self.SCHEMA)
+        self._migrate_legacy_runs()
+
     def _generate_run_id(self) -> str:
         """Generate unique run ID"""
         timestamp = int(time.time())
         return f"run_{timestamp}_{uuid.uuid4().hex[:8]}"
-        
+
     def _hash_input(self, input_data: Any) -> str:
         """Generate hash of input data"""
         input_str = json.dumps(input_data, sort_keys=True)
         return hashlib.md5(input_str.encode(), usedforsecurity=False).hexdigest()
-        
-    def _should_compress(self, data_size: int) -> bool:
-        """Determine if data should be compressed (>10KB)"""
-        return data_size > 10 * 1024
-        
-    def store_artifact(self, 
+
+    def _blob_path(self, blob_hash: str) -> Path:
+        return self.blobs_dir / blob_hash[:2] / blob_hash
+
+    def _artifact_ref(self, run_id: str, artifact_id: str) -> str:
+        return f"{_REF_SCHEME}{run_id}/{artifact_id}"
+
+    # -- escrita ------------------------------------------------------
+
+    def _write_blob(self, output_data: Any) -> Dict[str, Any]:
+        """Serializa ``output_data`` em chunks direto para um blob deduplicado."""
+        writer = _BlobWriter(self.blobs_dir, self.codec)
+        try:
+            buffer: List[str] = []
+            buffered = 0
+            for piece in json.JSONEncoder(default=str).iterencode(output_data):
+                if len(piece) >= _CHUNK_SIZE:
+                    # Uma string grande (ex.: stdout) sai inteira do encoder;
+                    # codifica em fatias para não duplicá-la em bytes.
+                    if buffer:
+                        writer.write("".join(buffer).encode("utf-8"))
+                        buffer.clear()
+                        buffered = 0
+                    for start in range(0, len(piece), _CHUNK_SIZE):
+                        writer.write(piece[start:start + _CHUNK_SIZE].encode("utf-8"))
+                    continue
+                buffer.append(piece)
+                buffered += len(piece)
+                if buffered >= _CHUNK_SIZE:
+                    writer.write("".join(buffer).encode("utf-8"))
+                    buffer.clear()
+                    buffered = 0
+            if buffer:
+                writer.write("".join(buffer).encode("utf-8"))
+            blob_hash = writer.finish()
+        except BaseException:
+            writer.discard()
+            raise
+
+        final_path = self._blob_path(blob_hash)
+        if final_path.exists():
+            # Conteúdo já armazenado (em qualquer run): dedup.
+            writer.discard()
+            codec, stored_size = self._blob_info(blob_hash)
+        else:
+            final_path.parent.mkdir(exist_ok=True)
+            os.replace(writer.tmp_path, final_path)
+            codec, stored_size = writer.codec, writer.stored_size
+        return {"hash": blob_hash, "codec": codec, "size": writer.size,
+                "stored_size": stored_size}
+
+    def _blob_info(self, blob_hash: str) -> tuple:
+        row = self._db.read(lambda conn: conn.execute(
+            "SELECT codec, stored_size FROM blobs WHERE hash = ?", (blob_hash,)
+        ).fetchone())
+        if row:
+            return row[0], row[1]
+        # Blob presente sem linha no índice (ex.: crash entre rename e commit).
+        return _sniff_codec(self._blob_path(blob_hash)), self._blob_path(blob_hash).stat().st_size
+
+    def store_artifact(self,
                       run_id: str,
-                      tool_name: str, 
+                      tool_name: str,
                       input_data: Dict[str, Any],
                       output_data: Any,
                       execution_time: float,
                       status: str = "success",
                       error_info: Optional[Dict[str, Any]] = None) -> str:
-        """Armazena artefato com metadata completo"""
+        """Armazena artefato: output no blob store, metadata no índice.
+
+        Returns:
+            Referência opaca do artefato (``artifact://<run_id>/<artifact_id>``);
+            não é um path no disco.
+        """
         try:
-            self._sequence_counter += 1
-            
-            # Create run directory
-            run_dir = self.artifacts_dir / run_id
-            run_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Generate artifact ID
-            artifact_id = f"{tool_name}_{self._sequence_counter:03d}"
-            
-            # Prepare artifact data
-            artifact_data = {
-                "input": input_data,
-                "output": output_data,
-                "timestamp": time.time(),
-                "execution_time": execution_time,
-                "status": status
-            }
-            
-            if error_info:
-                artifact_data["error"] = error_info
-            
-            # Serialize data
-            artifact_json = json.dumps(artifact_data, indent=2, default=str)
-            artifact_bytes = artifact_json.encode('utf-8')
-            
-            # Determine if compression is needed
-            should_compress = self._should_compress(len(artifact_bytes))
-            
-            # Save artifact file
-            if should_compress:
-                artifact_path = run_dir / f"{artifact_id}.json.gz"
-                with gzip.open(artifact_path, 'wb') as f:
-                    f.write(artifact_bytes)
-            else:
-                artifact_path = run_dir / f"{artifact_id}.json"
-                with open(artifact_path, 'wb') as f:
-                    f.write(artifact_bytes)
-            
-            # Create metadata
-            metadata = ArtifactMetadata(
-                run_id=run_id,
-                tool_name=tool_name,
-                sequence=self._sequence_counter,
-                timestamp=time.time(),
-                input_hash=self._hash_input(input_data),
-                output_size=len(artifact_bytes),
-                execution_time=execution_time,
-                status=status,
-                error_info=error_info,
-                compressed=should_compress
-            )
-            
-            # Save metadata
-            metadata_path = run_dir / f"{artifact_id}_metadata.json"
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata.to_dict(), f, indent=2)
-            
+            timestamp = time.time()
+            input_json = json.dumps(input_data, default=str)
+            input_hash = self._hash_input(input_data)
+            error_json = json.dumps(error_info, default=str) if error_info else None
+
+            def _tx(conn: sqlite3.Connection) -> Optional[str]:
+                return self._index_artifact(
+                    conn, blob, run_id, tool_name, None, timestamp, input_json,
+                    input_hash, execution_time, status, error_json)
+
+            artifact_id = None
+            for _ in range(2):
+                blob = self._write_blob(output_data)
+                artifact_id = self._db.write(_tx)
+                if artifact_id is not None:
+                    break
+            if artifact_id is None:
+                raise RuntimeError(f"Blob {blob['hash']} vanished while storing artifact")
             logger.info(f"Artifact stored: {artifact_id} in {run_id}")
-            return str(artifact_path)
-            
+            return self._artifact_ref(run_id, artifact_id)
+
         except Exception as e:
             logger.error(f"Failed to store artifact: {e}")
             raise
-            
+
+    def _index_artifact(self, conn: sqlite3.Connection, blob: Dict[str, Any],
+                        run_id: str, tool_name: str, artifact_id: Optional[str],
+                        timestamp: float, input_json: str, input_hash: str,
+                        execution_time: float, status: str,
+                        error_json: Optional[str], sequence: Optional[int] = None,
+                        ) -> Optional[str]:
+        """Insere blob + linha do artefato (na thread de escrita).
+
+        Sem ``sequence``/``artifact_id``, usa o próximo da run. Devolve
+        ``None`` se o blob sumiu antes do commit: a retenção apaga blobs
+        órfãos nesta mesma thread, e o chamador regrava o output.
+        """
+        if not self._blob_path(blob["hash"]).exists():
+            return None
+        conn.execute(
+            "INSERT OR IGNORE INTO blobs (hash, codec, size, stored_size, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (blob["hash"], blob["codec"], blob["size"], blob["stored_size"], timestamp),
+        )
+        if sequence is None:
+            sequence = conn.execute(
+                "SELECT COALESCE(MAX(sequence), 0) + 1 FROM artifacts WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()[0]
+        # Importação do layout antigo é idempotente (crash entre o commit e
+        # o unlink reimporta o mesmo arquivo); artefato novo nunca colide.
+        verb = "INSERT OR IGNORE" if artifact_id else "INSERT"
+        artifact_id = artifact_id or f"{tool_name}_{sequence:03d}"
+        conn.execute(
+            f"""{verb} INTO artifacts
+               (run_id, artifact_id, tool_name, sequence, timestamp, input_json,
+                input_hash, output_size, execution_time, status, error_json, blob_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (run_id, artifact_id, tool_name, sequence, timestamp, input_json,
+             input_hash, blob["size"], execution_time, status, error_json,
+             blob["hash"]),
+        )
+        return artifact_id
+
+    # -- migração do layout antigo ------------------------------------
+
+    def _migrate_legacy_runs(self) -> int:
+        """Importa para o índice as runs ``<run>/<tool>_NNN.json[.gz]``.
+
+        Sem isso a retenção, as estatísticas e a listagem (todas consultas
+        ao índice) não enxergariam runs gravadas antes do blob store. Cada
+        arquivo importado é apagado, então a varredura só custa na primeira
+        abertura; arquivo ilegível fica no lugar e é logado. Retorna o
+        número de artefatos importados.
+        """
+        imported = 0
+        for run_dir in sorted(self.artifacts_dir.iterdir()):
+            if not run_dir.is_dir() or run_dir.name == _BLOBS_DIRNAME:
+                continue
+            for artifact_file in sorted(run_dir.iterdir()):
+                stem = _legacy_stem(artifact_file.name)
+                if stem is None or stem.endswith("_metadata"):
+                    continue
+                try:
+                    self._import_legacy_artifact(run_dir.name, stem, artifact_file)
+                except Exception as e:
+                    logger.warning(f"Failed to migrate legacy artifact {artifact_file}: {e}")
+                    continue
+                imported += 1
+            try:
+                run_dir.rmdir()
+            except OSError:
+                pass  # sobrou algo que não é artefato (ou falhou a importação)
+        if imported:
+            logger.info(f"Migrated {imported} legacy artifacts into {self.artifacts_dir}")
+        return imported
+
+    def _import_legacy_artifact(self, run_id: str, stem: str, artifact_file: Path) -> None:
+        metadata_file = artifact_file.with_name(f"{stem}_metadata.json")
+        artifact = _read_legacy_artifact(artifact_file)
+        metadata: Dict[str, Any] = {}
+        if metadata_file.exists():
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        tool_name, _, seq = stem.rpartition("_")
+        input_data = artifact.get("input", {})
+        error = artifact.get("error") or metadata.get("error_info")
+        timestamp = (metadata.get("timestamp") or artifact.get("timestamp")
+                     or artifact_file.stat().st_mtime)
+
+        def _tx(conn: sqlite3.Connection) -> Optional[str]:
+            return self._index_artifact(
+                conn, blob, run_id, metadata.get("tool_name") or tool_name or stem,
+                stem, timestamp, json.dumps(input_data, default=str),
+                metadata.get("input_hash") or self._hash_input(input_data),
+                artifact.get("execution_time", metadata.get("execution_time", 0.0)),
+                artifact.get("status", metadata.get("status", "success")),
+                json.dumps(error, default=str) if error else None,
+                sequence=metadata.get("sequence") or (int(seq) if seq.isdigit() else 0),
+            )
+
+        for _ in range(2):
+            blob = self._write_blob(artifact.get("output"))
+            if self._db.write(_tx) is not None:
+                break
+        else:
+            raise RuntimeError(f"Blob {blob['hash']} vanished while migrating")
+        artifact_file.unlink()
+        metadata_file.unlink(missing_ok=True)
+
+    # -- leitura ------------------------------------------------------
+
+    def _lookup(self, artifact_path: str) -> Optional[sqlite3.Row]:
+        """Linha do artefato por referência ou path do layout antigo."""
+        artifact_path = str(artifact_path)
+        if artifact_path.startswith(_REF_SCHEME):
+            run_id, _, artifact_id = artifact_path[len(_REF_SCHEME):].partition("/")
+        else:
+            ref = Path(artifact_path)
+            run_id, artifact_id = ref.parent.name, _legacy_stem(ref.name) or ref.name
+
+        def _read(conn: sqlite3.Connection):
+            cur = conn.cursor()
+            cur.row_factory = sqlite3.Row
+            return cur.execute(
+                """SELECT a.*, b.codec, b.stored_size FROM artifacts a
+                   JOIN blobs b ON b.hash = a.blob_hash
+                   WHERE a.run_id = ? AND a.artifact_id = ?""",
+                (run_id, artifact_id),
+            ).fetchone()
+
+        return self._db.read(_read)
+
+    def open_artifact_output(self, artifact_path: str) -> IO[bytes]:
+        """Stream binário (descomprimido) do JSON do output, sem carregá-lo todo."""
+        row = self._lookup(artifact_path)
+        if row is None:
+            raise FileNotFoundError(f"Artifact not found: {artifact_path}")
+        return _open_blob(self._blob_path(row["blob_hash"]), row["codec"])
+
     def get_artifact(self, artifact_path: str) -> Dict[str, Any]:
-        """Recupera artefato por path"""
+        """Recupera artefato por referência (ou path do layout antigo)"""
         try:
-            artifact_path = Path(artifact_path)
-            
-            if artifact_path.suffix == '.gz':
-                with gzip.open(artifact_path, 'rt', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                with open(artifact_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-                    
+            row = self._lookup(artifact_path)
+            if row is None:
+                if str(artifact_path).startswith(_REF_SCHEME):
+                    raise FileNotFoundError(f"Artifact not found: {artifact_path}")
+                # Arquivo antigo que a migração não conseguiu importar.
+                return _read_legacy_artifact(Path(artifact_path))
+
+            with _open_blob(self._blob_path(row["blob_hash"]), row["codec"]) as f:
+                output = json.load(f)
+            artifact = {
+                "input": json.loads(row["input_json"]),
+                "output": output,
+                "timestamp": row["timestamp"],
+                "execution_time": row["execution_time"],
+                "status": row["status"],
+            }
+            if row["error_json"]:
+                artifact["error"] = json.loads(row["error_json"])
+            return artifact
+
         except Exception as e:
             logger.error(f"Failed to get artifact {artifact_path}: {e}")
             raise
-            
+
     def get_artifact_metadata(self, artifact_path: str) -> Optional[ArtifactMetadata]:
         """Get artifact metadata"""
         try:
+            row = self._lookup(artifact_path)
+            if row is not None:
+                return _row_to_metadata(row)
+
+            if str(artifact_path).startswith(_REF_SCHEME):
+                return None
             artifact_path = Path(artifact_path)
-            metadata_path = artifact_path.parent / f"{artifact_path.stem}_metadata.json"
-            
+            stem = _legacy_stem(artifact_path.name) or artifact_path.name
+            metadata_path = artifact_path.parent / f"{stem}_metadata.json"
             if metadata_path.exists():
                 with open(metadata_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     return ArtifactMetadata(**data)
             return None
-            
+
         except Exception as e:
             logger.error(f"Failed to get artifact metadata: {e}")
             return None
-            
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        def _read(conn: sqlite3.Connection):
+            cur = conn.cursor()
+            cur.row_factory = sqlite3.Row
+            return cur.execute(sql, params).fetchall()
+
+        return self._db.read(_read)
+
     def list_run_artifacts(self, run_id: str) -> List[Dict[str, Any]]:
         """List all artifacts for a run"""
         try:
-            run_dir = self.artifacts_dir / run_id
-            if not run_dir.exists():
-                return []
-                
-            artifacts = []
-            for artifact_file in run_dir.glob("*.json"):
-                if not artifact_file.stem.endswith("_metadata"):
-                    metadata = self.get_artifact_metadata(artifact_file)
-                    
-                    artifacts.append({
-                        "path": str(artifact_file),
-                        "metadata": metadata.to_dict() if metadata else None,
-                        "size": artifact_file.stat().st_size
-                    })
-                    
-            return sorted(artifacts, key=lambda x: x["metadata"]["sequence"] if x["metadata"] else 0)
-            
+            rows = self._query(
+                """SELECT a.*, b.codec, b.stored_size FROM artifacts a
+                   JOIN blobs b ON b.hash = a.blob_hash
+                   WHERE a.run_id = ? ORDER BY a.sequence""",
+                (run_id,),
+            )
+            return [
+                {
+                    "ref": self._artifact_ref(run_id, row["artifact_id"]),
+                    "metadata": _row_to_metadata(row).to_dict(),
+                    "size": row["stored_size"],
+                }
+                for row in rows
+            ]
+
         except Exception as e:
             logger.error(f"Failed to list artifacts for run {run_id}: {e}")
             return []
-            
+
+    # -- retenção e estatísticas ----------------------------------------
+
     def cleanup_old_artifacts(self, days_old: int = 30) -> int:
-        """Clean up artifacts older than specified days"""
+        """Clean up runs whose oldest artifact is older than ``days_old``.
+
+        Remove as linhas das runs e depois os blobs que ficaram sem
+        referência. Retorna o número de runs removidas.
+        """
         try:
             cutoff_time = time.time() - (days_old * 24 * 60 * 60)
-            cleaned_count = 0
-            
-            for run_dir in self.artifacts_dir.iterdir():
-                if run_dir.is_dir():
-                    # Check if run is old enough
-                    oldest_file_time = min((f.stat().st_mtime for f in run_dir.iterdir() if f.is_file()), default=time.time())
-                    
-                    if oldest_file_time < cutoff_time:
-                        # Remove entire run directory
-                        import shutil
-                        shutil.rmtree(run_dir)
-                        cleaned_count += 1
-                        logger.info(f"Cleaned up old run: {run_dir.name}")
-                        
-            return cleaned_count
-            
+
+            def _tx(conn: sqlite3.Connection) -> tuple:
+                runs = [r[0] for r in conn.execute(
+                    "SELECT run_id FROM artifacts GROUP BY run_id HAVING MIN(timestamp) < ?",
+                    (cutoff_time,),
+                )]
+                conn.executemany("DELETE FROM artifacts WHERE run_id = ?",
+                                 [(run,) for run in runs])
+                orphans = [r[0] for r in conn.execute(
+                    """SELECT hash FROM blobs
+                       WHERE NOT EXISTS (SELECT 1 FROM artifacts WHERE blob_hash = blobs.hash)"""
+                )]
+                conn.executemany("DELETE FROM blobs WHERE hash = ?",
+                                 [(h,) for h in orphans])
+                for blob_hash in orphans:
+                    self._blob_path(blob_hash).unlink(missing_ok=True)
+                return runs, orphans
+
+            runs, _orphans = self._db.write(_tx)
+            for run_id in runs:
+                logger.info(f"Cleaned up old run: {run_id}")
+            return len(runs)
+
         except Exception as e:
             logger.error(f"Failed to cleanup artifacts: {e}")
             return 0
-            
+
     def get_storage_stats(self) -> Dict[str, Any]:
-        """Get artifact storage statistics"""
+        """Get artifact storage statistics (do índice, sem varrer o disco)"""
         try:
-            total_size = 0
-            total_files = 0
-            run_count = 0
-            
-            for run_dir in self.artifacts_dir.iterdir():
-                if run_dir.is_dir():
-                    run_count += 1
-                    for file_path in run_dir.rglob("*"):
-                        if file_path.is_file():
-                            total_files += 1
-                            total_size += file_path.stat().st_size
-                            
+            blobs = self._query(
+                "SELECT COUNT(*) AS n, COALESCE(SUM(stored_size), 0) AS stored, "
+                "COALESCE(SUM(size), 0) AS unique_bytes FROM blobs"
+            )[0]
+            artifacts = self._query(
+                "SELECT COUNT(*) AS n, COUNT(DISTINCT run_id) AS runs, "
+                "COALESCE(SUM(output_size), 0) AS logical FROM artifacts"
+            )[0]
+            total_size = blobs["stored"]
             return {
                 "total_size_bytes": total_size,
                 "total_size_mb": round(total_size / (1024 * 1024), 2),
-                "total_files": total_files,
-                "run_count": run_count,
+                "total_files": blobs["n"],
+                "run_count": artifacts["runs"],
+                "artifact_count": artifacts["n"],
+                "logical_size_bytes": artifacts["logical"],
+                "dedup_saved_bytes": artifacts["logical"] - blobs["unique_bytes"],
+                "codec": self.codec,
                 "storage_dir": str(self.artifacts_dir)
             }
-            
+
         except Exception as e:
             logger.error(f"Failed to get storage stats: {e}")
-            return {}
\ No newline at end of file
+            return {}
+
+
+def _row_to_metadata(row: sqlite3.Row) -> ArtifactMetadata:
+    return ArtifactMetadata(
+        run_id=row["run_id"],
+        tool_name=row["tool_name"],
+        sequence=row["sequence"],
+        timestamp=row["timestamp"],
+        input_hash=row["input_hash"],
+        output_size=row["output_size"],
+        execution_time=row["execution_time"],
+        status=row["status"],
+        error_info=json.loads(row["error_json"]) if row["error_json"] else None,
+        compressed=True,
+        blob_hash=row["blob_hash"],
+        stored_size=row["stored_size"],
+        codec=row["codec"],
+    )
+
+
+def _sniff_codec(path: Path) -> str:
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    return "zstd" if magic == b"\x28\xb5\x2f\xfd" else "gzip"
+
+
+def _open_blob(path: Path, codec: str) -> IO[bytes]:
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    if zstandard is None:
+        raise RuntimeError("Artifact blob is zstd-compressed but 'zstandard' is not installed")
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+
+def _legacy_stem(name: str) -> Optional[str]:
+    """``bash_execute_001.json.gz`` → ``bash_execute_001``; ``None`` se não é JSON."""
+    for suffix in _LEGACY_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return None
+
+
+def _read_legacy_artifact(artifact_path: Path) -> Dict[str, Any]:
+    """Arquivo do layout antigo (``<run>/<tool>_NNN.json[.gz]``)."""
+    if artifact_path.suffix == '.gz':
+        with gzip.open(artifact_path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    with open(artifact_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
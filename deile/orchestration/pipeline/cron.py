@@ -31,6 +31,7 @@ from __future__ import annotations
 
 import re
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import List, Tuple
 
 _FIELD_RANGES: List[Tuple[int, int]] = [
@@ -119,27 +120,33 @@ def parse(expression: str) -> List[List[int]]:
     ]
 
 
+@lru_cache(maxsize=256)
+def _compiled(expression: str) -> Tuple[frozenset, frozenset, frozenset, frozenset, frozenset, bool, bool]:
+    """Parsed fields as frozensets plus the DOM/DOW "restricted" flags (memoized)."""
+    minute_set, hour_set, dom_set, mon_set, dow_set = (frozenset(f) for f in parse(expression))
+    return (minute_set, hour_set, dom_set, mon_set, dow_set,
+            len(dom_set) != 31, len(dow_set) != 7)
+
+
+def _fires_at(fields: tuple, candidate: datetime) -> bool:
+    minute_set, hour_set, dom_set, mon_set, dow_set, dom_restricted, dow_restricted = fields
+    if candidate.minute not in minute_set or candidate.hour not in hour_set:
+        return False
+    if candidate.month not in mon_set:
+        return False
+    dom_match = candidate.day in dom_set
+    # datetime.weekday(): Mon=0..Sun=6. cron: Sun=0..Sat=6.
+    dow_match = (candidate.weekday() + 1) % 7 in dow_set
+    if dom_restricted and dow_restricted:
+        return dom_match or dow_match
+    return dom_match and dow_match
+
+
 def matches(expression: str, when: datetime) -> bool:
     """Return True iff ``when`` (UTC, minute precision) satisfies the cron."""
-    minute_set, hour_set, dom_set, mon_set, dow_set = parse(expression)
     # Vixie-cron rule: when both DOM and DOW are restricted (not "*"), ANY
     # match counts. We approximate "is restricted" by len < full range.
-    dom_restricted = len(dom_set) != 31
-    dow_restricted = len(dow_set) != 7
-    dom_match = when.day in dom_set
-    # datetime.weekday(): Mon=0..Sun=6. cron: Sun=0..Sat=6.
-    cron_dow = (when.weekday() + 1) % 7
-    dow_match = cron_dow in dow_set
-    if dom_restricted and dow_restricted:
-        date_ok = dom_match or dow_match
-    else:
-        date_ok = dom_match and dow_match
-    return (
-        when.minute in minute_set
-        and when.hour in hour_set
-        and when.month in mon_set
-        and date_ok
-    )
+    return _fires_at(_compiled(expression), when)
 
 
 def next_after(expression: str, after: datetime, *, max_iterations: int = 525600) -> datetime:
@@ -151,26 +158,36 @@ def next_after(expression: str, after: datetime, *, max_iterations: int = 525600
     """
     if after.tzinfo is None:
         after = after.replace(tzinfo=timezone.utc)
-    # Parse once outside the loop — avoids tokenizing the expression on every
+    # Parsed once per expression (memoized) — avoids tokenizing on every
     # iteration (up to 525,600 calls for rare expressions like "0 0 1 1 *").
-    minute_set, hour_set, dom_set, mon_set, dow_set = parse(expression)
-    dom_restricted = len(dom_set) != 31
-    dow_restricted = len(dow_set) != 7
+    fields = _compiled(expression)
     # Round up to the next minute boundary (crons fire on minute boundaries).
     candidate = (after + timedelta(minutes=1)).replace(second=0, microsecond=0)
     for _ in range(max_iterations):
-        cron_dow = (candidate.weekday() + 1) % 7
-        dom_match = candidate.day in dom_set
-        dow_match = cron_dow in dow_set
-        date_ok = (dom_match or dow_match) if (dom_restricted and dow_restricted) else (dom_match and dow_match)
-        if (
-            candidate.minute in minute_set
-            and candidate.hour in hour_set
-            and candidate.month in mon_set
-            and date_ok
-        ):
+        if _fires_at(fields, candidate):
             return candidate
         candidate += timedelta(minutes=1)
     raise CronExpressionError(
         f"no match within {max_iterations} minutes for {expression!r}"
     )
+
+
+def previous_at_or_before(
+    expression: str, when: datetime, *, max_iterations: int = 525600
+) -> datetime:
+    """Return the latest datetime ``<= when`` that matches.
+
+    Mirror image of :func:`next_after`. Lets catch-up find the most recent
+    missed slot directly instead of walking every slot since the last run.
+    """
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    fields = _compiled(expression)
+    candidate = when.replace(second=0, microsecond=0)
+    for _ in range(max_iterations):
+        if _fires_at(fields, candidate):
+            return candidate
+        candidate -= timedelta(minutes=1)
+    raise CronExpressionError(
+        f"no match within {max_iterations} minutes for {expression!r}"
+    )
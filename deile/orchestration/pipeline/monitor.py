@@ -52,7 +52,10 @@ from deile.orchestration.pipeline.lockfile import release as release_lock
 from deile.orchestration.pipeline.notifier import DiscordNotifier
 from deile.orchestration.pipeline import pipeline_logger
 from deile.orchestration.pipeline.resume_state import ResumeTracker
+from deile.orchestration.pipeline.schedule_service import ScheduleService
 from deile.orchestration.pipeline.scheduler import PendingRun, ScheduleStore
+from deile.orchestration.pipeline.stage_scheduler import (StageScheduler,
+                                                          StageSpec)
 from deile.orchestration.pipeline.stages import (_extract_pr_url,
                                                  _render_follow_up_report)
 from deile.orchestration.pipeline.worktree_manager import WorktreeManager
@@ -175,6 +178,14 @@ class PipelineConfig:
     # partir de ``settings.pipeline_refinement_gate`` (default ON) em
     # ``build_default_pipeline_config``; dispatch_mode apenas seleciona o executor (issue #85).
     enable_refinement_gate: bool = False
+    # Stage scheduler (see ``stage_scheduler.py``). Stages whose declared
+    # read/write sets do not conflict run concurrently within a tick;
+    # ``concurrent_stages=False`` restores the strict one-after-another order.
+    # ``stage_deadline_seconds`` caps how long a tick waits for its stages —
+    # stages not started by then are deferred to the next tick. ``None``
+    # uses ``poll_interval_seconds``; ``0`` disables the deadline.
+    concurrent_stages: bool = True
+    stage_deadline_seconds: Optional[float] = None
 
 
 def _resolve_auto_max_parallel(namespace: str = "deile") -> Optional[int]:
@@ -439,9 +450,14 @@ class PipelineMonitor:
         self.schedule_store = schedule_store or ScheduleStore(
             config.base_repo_path, monitor_id=self.identity.monitor_id
         )
+        # Parsed schedule + next-fire heap kept across ticks; the YAML is
+        # only re-read when the file actually changes.
+        self.schedule_service = ScheduleService(self.schedule_store)
         # Guard anti-double-dispatch para force-tick: impede que o callback
         # agende um novo tick() enquanto o anterior ainda está em andamento.
         self._tick_in_flight: bool = False
+        # Per-tick stage DAG + per-stage latency histograms (``_dispatch_stages``).
+        self._stage_scheduler = StageScheduler()
 
     def spawn_background(self, coro) -> None:
         """Roda *coro* detached (fire-and-forget interno) sem bloquear o tick.
@@ -587,7 +603,7 @@ class PipelineMonitor:
                 logger.warning("startup worktree cleanup failed: %s", exc)
 
         try:
-            schedule = self.schedule_store.load()
+            schedule = self.schedule_service.load()
         except Exception as exc:  # noqa: BLE001 — schedule errors must not block boot
             logger.warning("schedule load failed; skipping catch-up: %s", exc)
             return
@@ -597,12 +613,12 @@ class PipelineMonitor:
         if removed:
             logger.info("startup: gc'd %d completed oneshots from schedule", removed)
 
-        pending = schedule.compute_pending(
-            replay_window_hours=self.config.bootstrap_replay_window_hours
+        pending = self.schedule_service.compute_pending(
+            schedule, replay_window_hours=self.config.bootstrap_replay_window_hours
         )
         if not pending:
             try:
-                self.schedule_store.save(schedule)
+                self.schedule_service.save(schedule)
             except Exception as exc:  # noqa: BLE001
                 logger.warning("could not persist schedule after startup gc: %s", exc)
             return
@@ -615,7 +631,7 @@ class PipelineMonitor:
             schedule.mark_run(run)
             self._stats.catchup_runs += 1
         try:
-            self.schedule_store.save(schedule)
+            self.schedule_service.save(schedule)
         except Exception as exc:  # noqa: BLE001
             logger.warning("could not persist schedule after catch-up: %s", exc)
 
@@ -645,6 +661,7 @@ class PipelineMonitor:
         self._stop_event.set()
         for t in list(self._bg_tasks):
             t.cancel()
+        await self._stage_scheduler.cancel_overruns()
         if self._task is not None:
             try:
                 await asyncio.wait_for(self._task, timeout=PIPELINE_STOP_TIMEOUT_SECONDS)
@@ -739,20 +756,20 @@ class PipelineMonitor:
         # silently drop stages. Schedule entries override; gaps fall back to legacy.
         # Only-oneshot schedules are respected as-is (no recurring fallback).
         try:
-            schedule = self.schedule_store.load()
+            schedule = self.schedule_service.load()
         except Exception as exc:  # noqa: BLE001
             logger.warning("schedule load failed on tick; falling back to legacy mode: %s", exc)
             schedule = None
 
         if schedule and (schedule.recurring or schedule.oneshot):
-            pending = schedule.compute_pending()
+            pending = self.schedule_service.compute_pending(schedule)
             for run in pending:
                 await self._run_scheduled(run)
                 schedule.mark_run(run)
                 self._stats.scheduled_runs += 1
             if pending:
                 try:
-                    self.schedule_store.save(schedule)
+                    self.schedule_service.save(schedule)
                 except Exception as exc:  # noqa: BLE001
                     logger.warning("could not persist schedule after tick: %s", exc)
 
@@ -796,6 +813,8 @@ class PipelineMonitor:
                     ticks_total=self._stats.ticks,
                     errors_total=self._stats.errors,
                 )
+            if hasattr(state, "set_stage_timings"):
+                state.set_stage_timings(self._stage_scheduler.snapshot())
             if hasattr(state, "set_ledger_snapshot"):
                 try:
                     impl = getattr(self, "implementer", None)
@@ -872,8 +891,14 @@ class PipelineMonitor:
                 implemented_n, dispatched_n,
             )
 
+    def _stage_deadline(self) -> Optional[float]:
+        deadline = self.config.stage_deadline_seconds
+        if deadline is None:
+            deadline = self.config.poll_interval_seconds
+        return float(deadline) if deadline and deadline > 0 else None
+
     async def _dispatch_stages(self, skip: set[str] | None = None) -> None:
-        """Run the per-tick stage sequence.
+        """Run the per-tick stage set through the stage scheduler.
 
         Stages whose key is in ``skip`` are bypassed because the scheduler
         has already run them in this tick. Stages without a schedule key
@@ -882,85 +907,160 @@ class PipelineMonitor:
 
         ``skip=None`` is the legacy "every action every tick" mode used
         when there is no schedule file with recurring entries.
+
+        The list below is in the historical sequential order; each stage
+        declares what it reads/writes (see :meth:`_stage_plan`) and only
+        waits for the earlier stages it conflicts with.
         """
         skip = skip or set()
-        scheduled_mode = bool(skip)
-        cfg = self.config
         # Anti-loop (issue #418): zera o set de "promovidas a revisada neste tick"
         # no começo do tick, antes do reconcile que o preenche e do refine que o lê.
         self._refine_promoted_this_tick.clear()
+        await self._stage_scheduler.run(
+            self._stage_plan(skip),
+            deadline=self._stage_deadline(),
+            sequential=not self.config.concurrent_stages,
+        )
 
-        async def _scheduled(enabled: bool, key: str, handler) -> None:
-            """Run a schedulable stage unless the scheduler already covered it."""
+    def _stage_plan(self, skip: set[str]) -> list[StageSpec]:
+        """Declare this tick's stages with their read/write sets.
+
+        Resources are the shared state two stages can race on:
+
+        - ``issues:<state>`` / ``prs:<state>`` — the workflow-label queue a
+          stage lists from (read) or moves items into/out of (write);
+        - ``worker_slots`` — in-flight capacity. Stages that count capacity
+          and then dispatch hold it *exclusively* (the count and the claim
+          must not interleave) but are not ordered by it. Reconciles only
+          free slots, so a consumer running beside one can at worst see a
+          slot still taken and dispatch on the next tick;
+        - ``reviewed_snapshot`` / ``refine_promoted`` — in-memory hand-offs
+          between stages of the same tick.
+
+        Mention routing only *adds* ``~workflow:nova`` to issues outside the
+        pipeline; whether review sees them this tick or the next is already
+        at the mercy of the forge's eventually consistent label index, so
+        it is not declared as a conflicting write.
+        """
+        scheduled_mode = bool(skip)
+        cfg = self.config
+        # ``revisada`` holds two disjoint queues: code issues (implement) and
+        # intents (decompose). Stages that move issues INTO it touch both.
+        revisada = {"issues:revisada:code", "issues:revisada:intent"}
+        slots = {"worker_slots"}
+        plan: list[StageSpec] = []
+
+        def stage(name: str, run, *, reads=(), writes=(), exclusive=()) -> None:
+            plan.append(StageSpec(name, run, frozenset(reads), frozenset(writes),
+                                  frozenset(exclusive)))
+
+        def scheduled(enabled: bool, key: str, handler):
+            """A schedulable stage, unless the scheduler already covered it."""
             if not enabled or key in skip:
-                return
-            if scheduled_mode:
-                logger.debug("%s not in schedule; running legacy fallback", key)
-            await handler()
+                return None
+
+            async def _run() -> None:
+                if scheduled_mode:
+                    logger.debug("%s not in schedule; running legacy fallback", key)
+                await handler()
+            return _run
+
+        def add_scheduled(enabled: bool, key: str, handler, **sets) -> None:
+            run = scheduled(enabled, key, handler)
+            if run is not None:
+                stage(key, run, **sets)
+
+        # PR #380 follow-up: the ``~workflow:revisada`` snapshot is fetched
+        # ONCE and ownership ensured ONCE, then shared by implement (PRE-ensure
+        # view: an orphan code issue is adopted now, implemented next tick) and
+        # decompose (POST-ensure view: an orphan intent is decomposed the same
+        # tick). On a forge error both are None and each stage falls back to its
+        # own fetch. Via the scheduler ``implement`` runs by name and fetches
+        # its own.
+        reviewed: dict = {"pre": None, "post": None}
+
+        async def _fetch_reviewed() -> None:
+            reviewed["pre"], reviewed["post"] = \
+                await stages.fetch_reviewed_and_ensure_ownership(self)
 
         # Issue #373: a crítica é fire-and-forget — reconcilia o veredito das
         # críticas em voo ANTES de despachar novas (libera capacidade no mesmo
         # tick, espelha o reconcile do implement).
         if cfg.enable_refinement_gate:
-            await self._reconcile_critique_issues()
-        await _scheduled(cfg.enable_classify, "classify", self._classify_new_issues)
-        await _scheduled(cfg.enable_review, "review", self._review_one_new_issue)
+            stage("reconcile_critique", self._reconcile_critique_issues,
+                  reads={"issues:em_revisao"},
+                  writes={"issues:em_revisao", "issues:refinement", *revisada,
+                          "refine_promoted"})
+        add_scheduled(cfg.enable_classify, "classify", self._classify_new_issues,
+                      reads={"issues:unclassified"},
+                      writes={"issues:unclassified", "issues:nova"})
+        add_scheduled(cfg.enable_review, "review", self._review_one_new_issue,
+                      reads={"issues:nova"},
+                      writes={"issues:nova", "issues:em_revisao", *revisada},
+                      exclusive=slots)
         # Refinement loop (issue #257/#373): reconcilia o veredito dos refinos em
         # voo ANTES de despachar novos; o dispatch é fire-and-forget.
         if cfg.enable_refinement_gate:
-            await self._reconcile_refine_issues()
-            await self._refine_one_issue()
+            stage("reconcile_refine", self._reconcile_refine_issues,
+                  reads={"issues:refinement"},
+                  writes={"issues:refinement", *revisada, "refine_promoted"})
+            stage("refine", self._refine_one_issue,
+                  reads={"issues:refinement", "refine_promoted"},
+                  writes={"issues:refinement"}, exclusive=slots)
         # Issue #373: reconcile fire-and-forget implementing issues FIRST —
         # completed issues (PR exists via ground truth) move to ``em_pr`` BEFORE
-        # both resume and implement run. Ordem crítica (anti-double-dispatch):
-        # reconcile precede o resume para que uma issue cujo worker acabou de
-        # concluir (PR aberta) seja promovida a ``em_pr`` ANTES de o resume
-        # cogitar re-despachá-la — fecha a janela de corrida de 1 tick na
-        # conclusão. Também libera capacidade para novos dispatches no mesmo tick.
+        # both resume and implement run (anti-double-dispatch: a worker that just
+        # finished must not be resumed) and capacity is freed for this tick.
         if cfg.enable_implement:
-            await self._reconcile_implementing_issues()
-        # Resume parked, continuable work BEFORE claiming new issues
-        # (issue #254) so a freshly-claimed issue is not re-dispatched in
-        # the same tick; its first resume lands on the next tick. Roda DEPOIS do
-        # reconcile (acima) e ANTES do implement (abaixo).
+            stage("reconcile_implementing", self._reconcile_implementing_issues,
+                  reads={"issues:implementing"},
+                  writes={"issues:implementing", "issues:em_pr"})
+        # Resume parked, continuable work BEFORE claiming new issues (issue
+        # #254) so a freshly-claimed issue is not re-dispatched in the same
+        # tick; its first resume lands on the next tick.
         if cfg.enable_resume:
-            await self._resume_in_progress_issues()
-        # PR #380 follow-up (non-blocking review suggestion): fetch the
-        # ``~workflow:revisada`` snapshot ONCE and ensure ownership ONCE, then
-        # share it with both the implement and decompose stages — halving the
-        # per-tick reviewed-list forge calls (each stage used to fetch + ensure
-        # independently). The two stages target disjoint issue types (implement
-        # → non-intent, decompose → intent), so a shared snapshot is safe.
-        #
-        # Two views preserve the exact prior pickup timing: implement gets the
-        # PRE-ensure snapshot (it always filtered its own un-ensured fetch, so an
-        # orphan code issue is adopted next tick); decompose gets the POST-ensure
-        # snapshot (it used to re-fetch a fresh one carrying the label, so an
-        # orphan intent is decomposed the same tick). On a forge error both are
-        # None and each stage falls back to its own self-contained fetch.
-        # ``implement`` only consumes the shared snapshot in legacy (non-schedule)
-        # mode; when run via the scheduler it is invoked by name with no args and
-        # fetches its own (unchanged).
-        reviewed_pre = reviewed_post = None
+            stage("resume", self._resume_in_progress_issues,
+                  reads={"issues:implementing"},
+                  writes={"issues:implementing"}, exclusive=slots)
         if (cfg.enable_implement and "implement" not in skip) or cfg.enable_refinement_gate:
-            reviewed_pre, reviewed_post = await stages.fetch_reviewed_and_ensure_ownership(self)
-        await _scheduled(
-            cfg.enable_implement, "implement",
-            lambda: self._implement_one_reviewed_issue(reviewed_pre),
-        )
-        # Decompose CLEAR intents into derived issues (issue #257).
+            stage("fetch_reviewed", _fetch_reviewed,
+                  reads=revisada, writes={*revisada, "reviewed_snapshot"})
+        add_scheduled(cfg.enable_implement, "implement",
+                      lambda: self._implement_one_reviewed_issue(reviewed["pre"]),
+                      reads={"reviewed_snapshot", "issues:revisada:code"},
+                      writes={"issues:revisada:code", "issues:implementing"},
+                      exclusive=slots)
+        # Decompose CLEAR intents into derived issues (issue #257). Implement
+        # and decompose pick disjoint issue types out of ``revisada`` (code vs
+        # intent), so they do not conflict with each other.
         if cfg.enable_refinement_gate:
-            await self._decompose_one_reviewed_intent(reviewed_post)
+            stage("decompose",
+                  lambda: self._decompose_one_reviewed_intent(reviewed["post"]),
+                  reads={"reviewed_snapshot", "issues:revisada:intent"},
+                  writes={"issues:revisada:intent"})
         # Issue #373: review fresh é fire-and-forget — reconcilia o veredito das
         # reviews em voo (por ground-truth: PR merged?) ANTES de despachar novas.
         if cfg.enable_pr_review and "pr_review" not in skip:
-            await self._reconcile_review_prs()
-        await self._reconcile_closed_issues()
-        await _scheduled(cfg.enable_pr_review, "pr_review", self._review_one_open_pr)
+            stage("reconcile_review", self._reconcile_review_prs,
+                  reads={"prs:review"},
+                  writes={"prs:review"})
+        stage("reconcile_closed", self._reconcile_closed_issues,
+              reads={"issues:em_pr"}, writes={"issues:em_pr"})
+        add_scheduled(cfg.enable_pr_review, "pr_review", self._review_one_open_pr,
+                      reads={"prs:review"}, writes={"prs:review"},
+                      exclusive=slots)
         if cfg.enable_pr_triage:
-            await self._classify_new_prs()
+            stage("pr_triage", self._classify_new_prs,
+                  reads={"prs:unclassified"},
+                  writes={"prs:unclassified", "prs:review"})
         if cfg.enable_mention_handling:
-            await self._process_mentions()
+            stage("mentions", self._process_mentions,
+                  reads={"mentions"}, writes={"mentions"})
+        return plan
+
+    def stage_timings(self) -> dict:
+        """Per-stage latency histograms and deferral counts (status panel)."""
+        return self._stage_scheduler.snapshot()
 
     # ------------------------------------------------------------------
     # stage handlers — thin delegators to ``stages.py``
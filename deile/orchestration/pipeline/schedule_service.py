@@ -0,0 +1,248 @@
+"""In-memory schedule service in front of :class:`ScheduleStore`.
+
+``PipelineMonitor`` consults the schedule on every tick. Going straight to
+the store meant re-reading and re-parsing the YAML (and re-validating every
+cron) each time, then scanning every entry in ``compute_pending`` even when
+nothing was due. :class:`ScheduleService` keeps the work proportional to
+what actually changed:
+
+- the parsed :class:`Schedule` stays in memory and is only rebuilt when the
+  file's ``(mtime_ns, size)`` changes *and* its content hash differs. Files
+  modified within :data:`_RACY_WINDOW_NS` of the last read are re-hashed
+  even when the stat matches, since coarse filesystem timestamps can hide a
+  quick rewrite of the same size;
+- each entry's next fire time is precomputed once into a min-heap, so
+  ``compute_pending`` only pops the entries that are due — O(due · log n)
+  instead of one cron evaluation per entry per tick;
+- heap items remember the entry state they were computed from. ``mark_run``
+  on the schedule (or any in-place edit of ``cron``/``last_run_at``/
+  ``enabled``/``completed``) makes the item stale; it is recomputed lazily
+  when it reaches the top. Adding or removing entries rebuilds the index.
+
+Stores without a filesystem ``path`` (test doubles, in-memory stores) are
+passed through uncached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from deile.orchestration.pipeline._time_utils import now_utc
+from deile.orchestration.pipeline.scheduler import (OneshotEntry, PendingRun,
+                                                    RecurringEntry, Schedule,
+                                                    ScheduleStore, first_fire,
+                                                    oneshot_pending,
+                                                    recurring_pending)
+
+logger = logging.getLogger(__name__)
+
+#: Files modified this close to the last read are re-hashed even if their
+#: stat signature is unchanged (mtime granularity can be 1–2 s).
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _entry_state(entry) -> tuple:
+    if isinstance(entry, RecurringEntry):
+        return (entry.cron, entry.enabled, entry.last_run_at)
+    return (entry.run_at, entry.completed)
+
+
+class _FireIndex:
+    """Min-heap of ``(next_fire, position, entry, state)`` for one Schedule.
+
+    ``position`` (``(0|1, list index)``) is unique, so ties never compare
+    entries and due items can be returned in declaration order.
+    """
+
+    def __init__(self, schedule: Schedule) -> None:
+        self.schedule = schedule
+        # The list objects themselves (not ``id()``s) so a replaced list can
+        # never be mistaken for the indexed one.
+        self._recurring = schedule.recurring
+        self._oneshot = schedule.oneshot
+        self._shape = (len(schedule.recurring), len(schedule.oneshot))
+        self._heap: List[tuple] = []
+        # Entries that cannot fire in their current state (disabled,
+        # completed, invalid cron), re-checked cheaply on every query.
+        self._parked: List[tuple] = []
+        for pos, r in enumerate(schedule.recurring):
+            self._push((0, pos), r)
+        for pos, o in enumerate(schedule.oneshot):
+            self._push((1, pos), o)
+
+    def matches(self, schedule: Schedule) -> bool:
+        return (
+            schedule is self.schedule
+            and schedule.recurring is self._recurring
+            and schedule.oneshot is self._oneshot
+            and (len(schedule.recurring), len(schedule.oneshot)) == self._shape
+        )
+
+    def _push(self, pos: Tuple[int, int], entry) -> None:
+        state = _entry_state(entry)
+        if isinstance(entry, RecurringEntry):
+            when = first_fire(entry) if entry.enabled else None
+        else:
+            when = None if entry.completed else entry.run_at
+        if when is None:
+            self._parked.append((pos, entry, state))
+        else:
+            heapq.heappush(self._heap, (when, pos, entry, state))
+
+    def _unpark(self) -> None:
+        if not self._parked:
+            return
+        parked, self._parked = self._parked, []
+        for pos, entry, state in parked:
+            if _entry_state(entry) == state:
+                self._parked.append((pos, entry, state))
+            else:
+                self._push(pos, entry)
+
+    def due(self, now: datetime) -> List[tuple]:
+        """Heap items due at ``now`` (left in the heap: still due until marked)."""
+        self._unpark()
+        due: List[tuple] = []
+        while self._heap and self._heap[0][0] <= now:
+            item = heapq.heappop(self._heap)
+            if _entry_state(item[2]) != item[3]:
+                self._push(item[1], item[2])  # stale: recompute, maybe still due
+                continue
+            due.append(item)
+        for item in due:
+            heapq.heappush(self._heap, item)
+        due.sort(key=lambda item: item[1])  # declaration order, like Schedule
+        return due
+
+    def next_fire(self) -> Optional[datetime]:
+        """Earliest upcoming fire time (stale tops are refreshed first)."""
+        self._unpark()
+        while self._heap:
+            item = self._heap[0]
+            if _entry_state(item[2]) == item[3]:
+                return item[0]
+            heapq.heappop(self._heap)
+            self._push(item[1], item[2])
+        return None
+
+
+class ScheduleService:
+    """Cached :class:`Schedule` plus a next-fire index (see module docstring)."""
+
+    def __init__(self, store: ScheduleStore) -> None:
+        self.store = store
+        self._schedule: Optional[Schedule] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._digest: Optional[bytes] = None
+        self._read_at_ns = 0
+        self._index: Optional[_FireIndex] = None
+        self.stats: Dict[str, int] = {"hits": 0, "rehashes": 0, "reloads": 0}
+
+    # ------------------------------------------------------------ loading
+
+    def _path(self) -> Optional[Path]:
+        path = getattr(self.store, "path", None)
+        return path if isinstance(path, Path) else None
+
+    def load(self) -> Schedule:
+        """The current schedule, re-parsed only if the file content changed."""
+        path = self._path()
+        if path is None:
+            return self.store.load()
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            if self._schedule is None or self._signature is not None:
+                self._remember(Schedule(), None, None)
+                self.stats["reloads"] += 1
+            else:
+                self.stats["hits"] += 1
+            return self._schedule
+        signature = (st.st_mtime_ns, st.st_size)
+        racy = st.st_mtime_ns >= self._read_at_ns - _RACY_WINDOW_NS
+        if self._schedule is not None and signature == self._signature and not racy:
+            self.stats["hits"] += 1
+            return self._schedule
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).digest()
+        if self._schedule is not None and digest == self._digest:
+            self.stats["rehashes"] += 1
+            self._signature = signature
+            self._read_at_ns = time.time_ns()
+            return self._schedule
+        schedule = self.store.parse(data.decode("utf-8"))
+        self._remember(schedule, signature, digest)
+        self.stats["reloads"] += 1
+        logger.debug("schedule %s reloaded (%d recurring, %d oneshot)",
+                     path, len(schedule.recurring), len(schedule.oneshot))
+        return schedule
+
+    def save(self, schedule: Schedule) -> None:
+        """Persists ``schedule``; our own write does not trigger a re-parse."""
+        self.store.save(schedule)
+        path = self._path()
+        if path is None:
+            return
+        try:
+            data = path.read_bytes()
+            st = os.stat(path)
+        except OSError:
+            self.invalidate()
+            return
+        self._remember(schedule, (st.st_mtime_ns, st.st_size),
+                       hashlib.sha256(data).digest())
+
+    def invalidate(self) -> None:
+        """Forgets the cached schedule and index (next ``load`` re-reads)."""
+        self._schedule = None
+        self._signature = None
+        self._digest = None
+        self._index = None
+
+    def _remember(self, schedule: Schedule, signature, digest) -> None:
+        if schedule is not self._schedule:
+            self._index = None
+        self._schedule = schedule
+        self._signature = signature
+        self._digest = digest
+        self._read_at_ns = time.time_ns()
+
+    # ------------------------------------------------------------ queries
+
+    def _index_for(self, schedule: Schedule) -> _FireIndex:
+        if self._index is None or not self._index.matches(schedule):
+            self._index = _FireIndex(schedule)
+        return self._index
+
+    def compute_pending(
+        self,
+        schedule: Schedule,
+        now: Optional[datetime] = None,
+        *,
+        replay_window_hours: Optional[int] = None,
+    ) -> List[PendingRun]:
+        """Same result as ``schedule.compute_pending``, touching only due entries."""
+        if not isinstance(schedule, Schedule):
+            return schedule.compute_pending(now, replay_window_hours=replay_window_hours)
+        now = now or now_utc()
+        out: List[PendingRun] = []
+        for when, _pos, entry, _state in self._index_for(schedule).due(now):
+            if isinstance(entry, OneshotEntry):
+                out.extend(oneshot_pending(entry, now))
+            else:
+                out.extend(recurring_pending(
+                    entry, now, replay_window_hours=replay_window_hours, next_at=when,
+                ))
+        out.sort(key=lambda p: p.when)
+        return out
+
+    def next_fire(self, schedule: Schedule) -> Optional[datetime]:
+        """When the next entry of ``schedule`` becomes due (None if never)."""
+        return self._index_for(schedule).next_fire()
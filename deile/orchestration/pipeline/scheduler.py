@@ -51,7 +51,8 @@ from deile.core.exceptions import DEILEError
 from deile.orchestration.pipeline._time_utils import (format_iso_utc, now_utc,
                                                       parse_iso_utc)
 from deile.orchestration.pipeline.actions import ACTION_NAMES
-from deile.orchestration.pipeline.cron import CronExpressionError, next_after
+from deile.orchestration.pipeline.cron import (CronExpressionError, next_after,
+                                              previous_at_or_before)
 
 logger = logging.getLogger(__name__)
 
@@ -166,6 +167,98 @@ class PendingRun:
     target_pr: Optional[int] = None
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def first_fire(entry: RecurringEntry) -> Optional[datetime]:
+    """First slot after ``last_run_at`` (epoch if never run); None if invalid.
+
+    An entry is pending exactly when this is ``<= now``, which is what
+    :class:`~deile.orchestration.pipeline.schedule_service.ScheduleService`
+    indexes.
+    """
+    try:
+        return next_after(entry.cron, entry.last_run_at or _EPOCH)
+    except CronExpressionError:
+        logger.warning("invalid cron in recurring %s", entry.id)
+        return None
+
+
+def recurring_pending(
+    r: RecurringEntry,
+    now: datetime,
+    *,
+    replay_window_hours: Optional[int] = None,
+    next_at: Optional[datetime] = None,
+) -> List[PendingRun]:
+    """Pending runs of one recurring entry (see :meth:`Schedule.compute_pending`).
+
+    ``next_at`` may carry an already computed :func:`first_fire`.
+    """
+    if not r.enabled:
+        return []
+    if next_at is None:
+        next_at = first_fire(r)
+    if next_at is None or next_at > now:
+        return []  # invalid cron / not due yet
+    if replay_window_hours:
+        cutoff = now - timedelta(hours=replay_window_hours)
+        if next_at < cutoff:
+            # The first pending slot is older than the replay window;
+            # treat it as "already ran" for catch-up purposes — advance
+            # to the latest slot within the window instead.
+            # Re-compute with the cutoff as anchor so we only replay slots
+            # that are recent enough to matter.
+            try:
+                next_at = next_after(r.cron, cutoff)
+            except CronExpressionError:
+                return []
+            if next_at > now:
+                return []
+    if not r.replay_all:
+        # Coalesce: collapse N misses to 1, fire at the latest miss. The
+        # latest slot <= now is found directly (walking back from now)
+        # rather than by stepping through every slot since ``next_at``.
+        try:
+            latest = previous_at_or_before(r.cron, now)
+        except CronExpressionError:
+            latest = next_at
+        return [PendingRun(
+            when=max(latest, next_at),
+            entry_id=r.id,
+            action=r.action,
+            is_oneshot=False,
+        )]
+    out: List[PendingRun] = []
+    cursor = next_at
+    while cursor <= now:
+        out.append(PendingRun(
+            when=cursor,
+            entry_id=r.id,
+            action=r.action,
+            is_oneshot=False,
+        ))
+        try:
+            cursor = next_after(r.cron, cursor)
+        except CronExpressionError:
+            break
+    return out
+
+
+def oneshot_pending(o: OneshotEntry, now: datetime) -> List[PendingRun]:
+    """``[PendingRun]`` if the one-shot is due and not completed, else ``[]``."""
+    if o.completed or o.run_at > now:
+        return []
+    return [PendingRun(
+        when=o.run_at,
+        entry_id=o.id,
+        action=o.action,
+        is_oneshot=True,
+        target_issue=o.target_issue,
+        target_pr=o.target_pr,
+    )]
+
+
 @dataclass
 class Schedule:
     """All schedule entries for one monitor."""
@@ -222,76 +315,11 @@ class Schedule:
         legacy behaviour.
         """
         now = now or now_utc()
-        cutoff = (now - timedelta(hours=replay_window_hours)) if replay_window_hours else None
         out: List[PendingRun] = []
-
         for r in self.recurring:
-            if not r.enabled:
-                continue
-            try:
-                # First fire after last_run_at (or epoch if never).
-                anchor = r.last_run_at or datetime(1970, 1, 1, tzinfo=timezone.utc)
-                next_at = next_after(r.cron, anchor)
-            except CronExpressionError:
-                logger.warning("invalid cron in recurring %s", r.id)
-                continue
-            if next_at > now:
-                continue  # not due yet
-            if cutoff is not None and next_at < cutoff:
-                # The first pending slot is older than the replay window;
-                # treat it as "already ran" for catch-up purposes — advance
-                # to the latest slot within the window instead.
-                # Re-compute with the cutoff as anchor so we only replay slots
-                # that are recent enough to matter.
-                try:
-                    next_at = next_after(r.cron, cutoff)
-                except CronExpressionError:
-                    continue
-                if next_at > now:
-                    continue
-            if not r.replay_all:
-                # Coalesce: collapse N misses to 1, fire at the latest miss.
-                latest = next_at
-                while True:
-                    try:
-                        candidate = next_after(r.cron, latest)
-                    except CronExpressionError:
-                        break
-                    if candidate > now:
-                        break
-                    latest = candidate
-                out.append(PendingRun(
-                    when=latest,
-                    entry_id=r.id,
-                    action=r.action,
-                    is_oneshot=False,
-                ))
-            else:
-                cursor = next_at
-                while cursor <= now:
-                    out.append(PendingRun(
-                        when=cursor,
-                        entry_id=r.id,
-                        action=r.action,
-                        is_oneshot=False,
-                    ))
-                    try:
-                        cursor = next_after(r.cron, cursor)
-                    except CronExpressionError:
-                        break
-
+            out.extend(recurring_pending(r, now, replay_window_hours=replay_window_hours))
         for o in self.oneshot:
-            if o.completed or o.run_at > now:
-                continue
-            out.append(PendingRun(
-                when=o.run_at,
-                entry_id=o.id,
-                action=o.action,
-                is_oneshot=True,
-                target_issue=o.target_issue,
-                target_pr=o.target_pr,
-            ))
-
+            out.extend(oneshot_pending(o, now))
         out.sort(key=lambda p: p.when)
         return out
 
@@ -339,8 +367,12 @@ class ScheduleStore:
         """Load the schedule. Returns an empty Schedule if file is missing."""
         if not self.path.exists():
             return Schedule()
+        return self.parse(self.path.read_text(encoding="utf-8"))
+
+    def parse(self, text: str) -> Schedule:
+        """Build a :class:`Schedule` from the YAML document ``text``."""
         try:
-            data = yaml.safe_load(self.path.read_text(encoding="utf-8")) or {}
+            data = yaml.safe_load(text) or {}
         except yaml.YAMLError as exc:
             raise ScheduleError(f"could not parse {self.path}: {exc}") from exc
         recurring = [self._build_recurring(d) for d in (data.get("recurring") or [])]
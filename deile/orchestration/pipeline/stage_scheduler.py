@@ -0,0 +1,384 @@
+"""Concurrent per-tick stage scheduler for :class:`PipelineMonitor`.
+
+Each tick used to ``await`` every stage in a fixed sequence, so one slow
+forge call (a classification listing, a reconcile that walks 50 issues)
+held up every stage behind it. :class:`StageScheduler` runs the same
+sequence as a dependency graph instead:
+
+- every :class:`StageSpec` declares the shared resources it ``reads`` and
+  ``writes`` (workflow-label queues, the in-memory snapshots passed between
+  stages, worker capacity);
+- a stage waits only for the *earlier* stages it conflicts with
+  (read-after-write, write-after-read, write-after-write). Conflicting
+  stages therefore keep their original relative order; the rest run
+  concurrently;
+- ``exclusive`` resources are mutexes rather than data: stages sharing one
+  never overlap, but are not ordered against each other (a stage blocked
+  on its inputs does not hold up the others);
+- a per-tick ``deadline`` bounds how long the tick waits. Stages that have
+  not started by then are *deferred* to the next tick. Stages already
+  running are never cancelled (a half-applied label transition is worse
+  than a late one): they keep running detached and the next tick orders
+  its conflicting stages after them;
+- a stage deferred ``max_deferrals`` ticks in a row is *forced* on the
+  next one: it and the stages it depends on ignore the deadline, and the
+  tick waits for them. A stage stuck behind a chronically slow one would
+  otherwise never run;
+- every completed stage feeds a fixed-bucket latency histogram.
+
+A stage that raises fails alone: its dependents are skipped for the tick,
+independent stages still run, and the first error is re-raised once the
+tick settles so the monitor loop keeps its crash accounting.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+#: Upper bounds (seconds) of the latency buckets; an implicit +Inf follows.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+#: Consecutive deferrals after which a stage is forced past the deadline.
+DEFAULT_MAX_DEFERRALS = 3
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """One schedulable stage and the shared resources it touches."""
+
+    name: str
+    run: Callable[[], Awaitable[None]]
+    reads: frozenset = frozenset()
+    writes: frozenset = frozenset()
+    exclusive: frozenset = frozenset()
+
+    def conflicts_with(self, other: "StageSpec") -> bool:
+        return bool(
+            self.writes & (other.reads | other.writes) or self.reads & other.writes
+        )
+
+
+class StageHistogram:
+    """Fixed-bucket latency histogram (cumulative buckets on export)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (``max`` for +Inf)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max  # pragma: no cover - rank <= count
+
+    def snapshot(self) -> dict:
+        cumulative: Dict[str, int] = {}
+        running = 0
+        for bound, n in zip(list(self.buckets) + ["+Inf"], self.counts):
+            running += n
+            cumulative[str(bound)] = running
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "buckets": cumulative,
+        }
+
+
+@dataclass
+class TickReport:
+    """What happened to each stage in one :meth:`StageScheduler.run`."""
+
+    completed: List[str] = field(default_factory=list)
+    deferred: List[str] = field(default_factory=list)
+    overrun: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    #: Run without a deadline because of repeated deferrals (plus their deps).
+    forced: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+class _Node:
+    __slots__ = ("spec", "deps", "task", "state", "error", "carried", "forced")
+
+    def __init__(self, spec: StageSpec) -> None:
+        self.spec = spec
+        self.deps: List["_Node"] = []
+        self.task: Optional[asyncio.Task] = None
+        # waiting → running → done | failed ; or deferred / skipped
+        self.state = "waiting"
+        self.error: Optional[BaseException] = None
+        # True once it overran a tick: later ticks only order after it.
+        self.carried = False
+        # Starvation guard: runs without the tick deadline.
+        self.forced = False
+
+
+class StageScheduler:
+    """Runs a tick's stages as a conflict-ordered DAG (see module docstring)."""
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        *,
+        max_deferrals: int = DEFAULT_MAX_DEFERRALS,
+    ) -> None:
+        self._buckets = tuple(buckets)
+        self.max_deferrals = max(1, max_deferrals)
+        self.histograms: Dict[str, StageHistogram] = {}
+        self.deferred_total: Dict[str, int] = {}
+        # Consecutive ticks each stage was deferred (reset once it runs).
+        self._deferred_streak: Dict[str, int] = {}
+        self.last_report: Optional[TickReport] = None
+        # Stages still running from a previous tick's overrun.
+        self._overruns: Dict[asyncio.Task, _Node] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    # ------------------------------------------------------------- public
+
+    async def run(
+        self,
+        specs: Sequence[StageSpec],
+        *,
+        deadline: Optional[float] = None,
+        sequential: bool = False,
+    ) -> TickReport:
+        """Runs ``specs`` (in declaration order for conflicts) within ``deadline`` s.
+
+        ``sequential=True`` makes every stage depend on the previous one —
+        the legacy one-after-another behaviour, still with deadline and
+        timing. ``deadline=None`` waits for everything.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        expires = loop.time() + deadline if deadline is not None else None
+        report = TickReport()
+
+        carried = [n for t, n in self._overruns.items() if not t.done()]
+        nodes: List[_Node] = []
+        for spec in specs:
+            node = _Node(spec)
+            earlier = carried + nodes
+            if sequential and nodes:
+                node.deps = carried + [nodes[-1]]
+            else:
+                node.deps = [prev for prev in earlier if prev.spec.conflicts_with(spec)]
+            nodes.append(node)
+        if expires is not None:
+            self._mark_forced(nodes, report)
+        for node in nodes:
+            node.task = asyncio.ensure_future(
+                self._run_node(node, None if node.forced else expires))
+
+        tasks = [n.task for n in nodes]
+        if tasks:
+            timeout = None if expires is None else max(0.0, expires - loop.time())
+            try:
+                await asyncio.wait(tasks, timeout=timeout)
+                forced = [n.task for n in nodes if n.forced and not n.task.done()]
+                if forced:
+                    await asyncio.wait(forced)
+            except asyncio.CancelledError:
+                for task in tasks:
+                    task.cancel()
+                raise
+
+        first_error: Optional[BaseException] = None
+        for node in nodes:
+            if node.state == "running":
+                # Overran the deadline: leave it running, order the next
+                # tick's conflicting stages after it.
+                report.overrun.append(node.spec.name)
+                self._deferred_streak.pop(node.spec.name, None)
+                node.carried = True
+                self._overruns[node.task] = node
+                node.task.add_done_callback(self._forget_overrun)
+                continue
+            if node.state == "waiting":
+                node.task.cancel()
+                node.state = "deferred"
+            if node.state == "deferred":
+                report.deferred.append(node.spec.name)
+                self.deferred_total[node.spec.name] = (
+                    self.deferred_total.get(node.spec.name, 0) + 1
+                )
+                self._deferred_streak[node.spec.name] = (
+                    self._deferred_streak.get(node.spec.name, 0) + 1
+                )
+                continue
+            self._deferred_streak.pop(node.spec.name, None)
+            if node.state == "done":
+                report.completed.append(node.spec.name)
+            elif node.state == "skipped":
+                report.skipped.append(node.spec.name)
+            elif node.state == "failed":
+                report.failed.append(node.spec.name)
+                if first_error is None:
+                    first_error = node.error
+        report.elapsed = time.perf_counter() - started
+        self.last_report = report
+        if report.deferred or report.overrun:
+            logger.info(
+                "stage scheduler: deadline hit after %.2fs — deferred=%s overrun=%s",
+                report.elapsed, report.deferred, report.overrun,
+            )
+        if first_error is not None:
+            raise first_error
+        return report
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Per-stage timing histograms plus deferral counts."""
+        out = {}
+        for name, hist in self.histograms.items():
+            entry = hist.snapshot()
+            entry["deferred"] = self.deferred_total.get(name, 0)
+            out[name] = entry
+        for name, n in self.deferred_total.items():
+            out.setdefault(name, {"count": 0, "deferred": n})
+        return out
+
+    def overrun_stages(self) -> List[str]:
+        return [n.spec.name for t, n in self._overruns.items() if not t.done()]
+
+    async def cancel_overruns(self) -> None:
+        """Cancels stages still running past their tick (monitor shutdown)."""
+        tasks = list(self._overruns)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------ internal
+
+    def _mark_forced(self, nodes: List[_Node], report: TickReport) -> None:
+        """Lifts the deadline for starved stages and everything they wait on."""
+        stack = [n for n in nodes
+                 if self._deferred_streak.get(n.spec.name, 0) >= self.max_deferrals]
+        for node in stack:
+            logger.warning(
+                "stage scheduler: %s deferred %d ticks in a row — running it past the deadline",
+                node.spec.name, self._deferred_streak[node.spec.name],
+            )
+        while stack:
+            node = stack.pop()
+            if node.forced or node.carried:
+                continue
+            node.forced = True
+            stack.extend(node.deps)
+        report.forced = [n.spec.name for n in nodes if n.forced]
+
+    async def _run_node(self, node: _Node, expires: Optional[float]) -> None:
+        loop = asyncio.get_running_loop()
+        pending = [d.task for d in node.deps if not d.task.done()]
+        if pending:
+            timeout = None if expires is None else max(0.0, expires - loop.time())
+            await asyncio.wait(pending, timeout=timeout)
+            if any(not t.done() for t in pending):
+                node.state = "deferred"
+                return
+        this_tick = [d for d in node.deps if not d.carried]
+        if any(d.state in ("failed", "skipped") for d in this_tick):
+            node.state = "skipped"
+            return
+        if any(d.state == "deferred" for d in this_tick):
+            # Its inputs were not produced this tick; run after them next tick.
+            node.state = "deferred"
+            return
+        if expires is not None and loop.time() >= expires:
+            node.state = "deferred"
+            return
+        held: List[asyncio.Lock] = []
+        try:
+            for name in sorted(node.spec.exclusive):
+                lock = self._locks.setdefault(name, asyncio.Lock())
+                timeout = None if expires is None else max(0.0, expires - loop.time())
+                if not await _acquire_within(lock, timeout):
+                    raise asyncio.TimeoutError
+                held.append(lock)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            # Timed out, or cancelled as a waiting stage at the deadline.
+            for lock in held:
+                lock.release()
+            node.state = "deferred"
+            if isinstance(exc, asyncio.TimeoutError):
+                return
+            raise
+        node.state = "running"
+        t0 = time.perf_counter()
+        try:
+            await node.spec.run()
+        except asyncio.CancelledError:
+            node.state = "failed"
+            raise
+        except Exception as exc:  # noqa: BLE001 — surfaced through the report
+            node.state = "failed"
+            node.error = exc
+            logger.error("pipeline stage %s failed: %s", node.spec.name, exc, exc_info=exc)
+        else:
+            node.state = "done"
+        finally:
+            for lock in held:
+                lock.release()
+            self._observe(node.spec.name, time.perf_counter() - t0)
+
+    def _observe(self, name: str, seconds: float) -> None:
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = StageHistogram(self._buckets)
+        hist.observe(seconds)
+
+    def _forget_overrun(self, task: "asyncio.Task") -> None:
+        self._overruns.pop(task, None)
+
+
+async def _acquire_within(lock: asyncio.Lock, timeout: Optional[float]) -> bool:
+    """``lock.acquire()`` bounded by ``timeout``; ``False`` if it timed out.
+
+    ``asyncio.wait_for(lock.acquire(), timeout)`` can report a timeout after
+    the acquire already succeeded (Python < 3.12), leaking the lock. Here an
+    abandoned acquire — timed out, or cancelled along with the caller —
+    releases the lock itself if it ends up getting it.
+    """
+    acquire = asyncio.ensure_future(lock.acquire())
+    try:
+        done, _ = await asyncio.wait((acquire,), timeout=timeout)
+    except asyncio.CancelledError:
+        _abandon(acquire, lock)
+        raise
+    if done:
+        acquire.result()
+        return True
+    _abandon(acquire, lock)
+    return False
+
+
+def _abandon(acquire: "asyncio.Future", lock: asyncio.Lock) -> None:
+    acquire.cancel()
+    acquire.add_done_callback(
+        lambda t: lock.release() if not t.cancelled() and t.exception() is None else None
+    )
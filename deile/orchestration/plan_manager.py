@@ -1,11 +1,13 @@
 """Plan Manager - Sistema de orquestração autônoma com plans e execução"""
 
 import asyncio
+import json
 import logging
+import os
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from ..core.exceptions import DEILEError
 from ..security import (AuditEventType, SeverityLevel, get_audit_logger,
@@ -13,6 +15,7 @@ from ..security import (AuditEventType, SeverityLevel, get_audit_logger,
 from ..storage.aio_fileio import read_json, write_json, write_text
 from ..tools.base import ToolContext, ToolResult
 from ..tools.registry import get_tool_registry
+from ._catalog import PlanCatalog
 from ._objective_steps import derive_step_specs
 from ._paths import resolve_data_dir
 from ._plan_models import ExecutionPlan, PlanStatus, PlanStep, RiskLevel, StepStatus
@@ -46,10 +49,20 @@ class PlanManager:
 
         self.plans_dir.mkdir(parents=True, exist_ok=True)
         self.runs_dir.mkdir(parents=True, exist_ok=True)
+
+        # Índice SQLite dos resumos (list_plans); os JSONs seguem como fonte
+        # de verdade. Aberto no primeiro uso e reconciliado com o disco na
+        # primeira listagem.
+        self._catalog: Optional[PlanCatalog] = None
+        self._catalog_synced = False
         
         self._active_plans: Dict[str, ExecutionPlan] = {}
         self._execution_locks: Dict[str, asyncio.Lock] = {}
         self._stop_flags: Dict[str, bool] = {}
+        # Acorda o executor do plano (aprovação, stop) sem polling.
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        # Steps aprovados via approve_step — não voltam a pedir aprovação.
+        self._approved_steps: Dict[str, Set[str]] = {}
         
         self.tool_registry = get_tool_registry()
         
@@ -57,6 +70,18 @@ class PlanManager:
         self.permission_manager = get_permission_manager()
         self.audit_logger = get_audit_logger()
     
+    @property
+    def catalog(self) -> PlanCatalog:
+        if self._catalog is None:
+            self._catalog = PlanCatalog(self.plans_dir)
+        return self._catalog
+
+    async def _get_catalog(self) -> PlanCatalog:
+        """``catalog`` aberto numa thread: a criação roda o DDL no writer."""
+        if self._catalog is None:
+            await asyncio.to_thread(getattr, self, "catalog")
+        return self._catalog
+
     async def create_plan(self, title: str, description: str, 
                          objective: str, context: Optional[Dict[str, Any]] = None) -> ExecutionPlan:
         """Cria um novo plano baseado em um objetivo"""
@@ -94,42 +119,70 @@ class PlanManager:
 
         try:
             data = await read_json(plan_file)
-            return ExecutionPlan.from_dict(data)
+            plan = ExecutionPlan.from_dict(data)
         except Exception as e:
             logger.error(f"Failed to load plan {plan_id}: {e}")
             return None
 
-    async def list_plans(self, status_filter: Optional[PlanStatus] = None) -> List[Dict[str, Any]]:
-        """Lista planos disponíveis (I/O por arquivo em worker thread)."""
-        plans_info = []
+        # Reaplica transições de step gravadas depois do último snapshot
+        # (execução interrompida no meio).
+        journal = await asyncio.to_thread(_read_step_journal, self._journal_path(plan_id))
+        _apply_step_journal(plan, journal)
+        return plan
 
-        for plan_file in self.plans_dir.glob("*.json"):
-            try:
-                data = await read_json(plan_file)
+    async def list_plans(self, status_filter: Optional[PlanStatus] = None, *,
+                         risk_level: Optional[RiskLevel] = None,
+                         limit: Optional[int] = None,
+                         offset: int = 0) -> List[Dict[str, Any]]:
+        """Lista planos pelo catálogo (mais recente primeiro), com paginação.
 
-                # Filtra por status se necessário
-                if status_filter and data.get("status") != status_filter.value:
-                    continue
-                
-                # Informações resumidas
-                plans_info.append({
-                    "id": data["id"],
-                    "title": data["title"],
-                    "description": data["description"],
-                    "status": data["status"],
-                    "created_at": data["created_at"],
-                    "total_steps": data["total_steps"],
-                    "completed_steps": data["completed_steps"],
-                    "failed_steps": data["failed_steps"]
-                })
-                
-            except Exception as e:
-                logger.warning(f"Failed to read plan {plan_file}: {e}")
-        
-        # Ordena por data de criação (mais recente primeiro)
-        plans_info.sort(key=lambda x: x["created_at"], reverse=True)
-        
-        return plans_info
+        Não abre os JSONs: filtros e ordenação usam os índices do catálogo.
+        Na primeira chamada o catálogo é reconciliado com ``plans_dir``.
+        """
+        if not self._catalog_synced:
+            await self.rebuild_catalog()
+
+        filters = {
+            "status": status_filter.value if status_filter else None,
+            "risk_level": risk_level.value if risk_level else None,
+        }
+        catalog = await self._get_catalog()
+        return await asyncio.to_thread(
+            catalog.query, filters, limit=limit, offset=offset
+        )
+
+    async def count_plans(self, status_filter: Optional[PlanStatus] = None) -> int:
+        """Número de planos (opcionalmente por status) sem listar."""
+        if not self._catalog_synced:
+            await self.rebuild_catalog()
+        filters = {"status": status_filter.value if status_filter else None}
+        catalog = await self._get_catalog()
+        return await asyncio.to_thread(catalog.count, filters)
+
+    async def rebuild_catalog(self) -> Dict[str, int]:
+        """Reconcilia o catálogo com os JSONs em disco (repara drift).
+
+        Só re-parseia arquivos cujo mtime mudou; remove linhas órfãs.
+        """
+        catalog = await self._get_catalog()
+        stats = await asyncio.to_thread(catalog.rebuild, self._summarize_plan_file)
+        self._catalog_synced = True
+        if stats["updated"] or stats["removed"]:
+            logger.info(f"Plan catalog rebuilt: {stats}")
+        return stats
+
+    async def delete_plan(self, plan_id: str) -> bool:
+        """Remove os arquivos do plano e sua linha no catálogo."""
+        removed = False
+        for path in (self.plans_dir / f"{plan_id}.json",
+                     self.plans_dir / f"{plan_id}.md",
+                     self._journal_path(plan_id)):
+            if path.exists():
+                await asyncio.to_thread(path.unlink)
+                removed = True
+        catalog = await self._get_catalog()
+        await asyncio.to_thread(catalog.delete, plan_id)
+        return removed
     
     async def execute_plan(self, plan_id: str, 
                           auto_approve_low_risk: bool = True) -> Dict[str, Any]:
@@ -148,6 +201,8 @@ class PlanManager:
         self._active_plans[plan_id] = plan
         self._execution_locks[plan_id] = asyncio.Lock()
         self._stop_flags[plan_id] = False
+        self._wakeups[plan_id] = asyncio.Event()
+        self._approved_steps[plan_id] = set()
         
         try:
             # Log início da execução do plano
@@ -227,6 +282,8 @@ class PlanManager:
             self._active_plans.pop(plan_id, None)
             self._execution_locks.pop(plan_id, None)
             self._stop_flags.pop(plan_id, None)
+            self._wakeups.pop(plan_id, None)
+            self._approved_steps.pop(plan_id, None)
     
     async def stop_plan(self, plan_id: str) -> bool:
         """Para a execução de um plano"""
@@ -235,6 +292,9 @@ class PlanManager:
             return False
         
         self._stop_flags[plan_id] = True
+        wakeup = self._wakeups.get(plan_id)
+        if wakeup is not None:
+            wakeup.set()
         
         plan = self._active_plans[plan_id]
         plan.status = PlanStatus.CANCELLED
@@ -256,6 +316,7 @@ class PlanManager:
         
         if approved:
             step.status = StepStatus.PENDING
+            self._approved_steps.setdefault(plan_id, set()).add(step_id)
             action = "granted"
             logger.info(f"Approved step {step_id} in plan {plan_id}")
         else:
@@ -272,7 +333,10 @@ class PlanManager:
             risk_level=step.risk_level.value
         )
         
-        await self._save_plan(plan)
+        await self._save_step(plan, step)
+        wakeup = self._wakeups.get(plan_id)
+        if wakeup is not None:
+            wakeup.set()
         return True
     
     def active_plan_count(self) -> int:
@@ -309,6 +373,8 @@ class PlanManager:
         self._active_plans.clear()
         self._execution_locks.clear()
         self._stop_flags.clear()
+        self._wakeups.clear()
+        self._approved_steps.clear()
         return count
 
     async def get_plan_status(self, plan_id: str) -> Optional[Dict[str, Any]]:
@@ -396,103 +462,89 @@ class PlanManager:
 
         return steps
     
-    async def _execute_plan_steps(self, plan: ExecutionPlan, 
+    async def _execute_plan_steps(self, plan: ExecutionPlan,
                                 auto_approve_low_risk: bool) -> Dict[str, Any]:
-        """Executa os steps de um plano"""
-        
+        """Executa os steps de um plano.
+
+        Steps prontos viram tasks assim que há vaga (até
+        ``plan.max_concurrent_steps`` simultâneos, via semáforo) e cada
+        conclusão é tratada quando chega — um step lento não segura os
+        independentes dele. Aprovações e ``stop_plan`` acordam o loop pelo
+        evento do plano, sem polling; cada transição de step vai para o
+        journal incremental em vez de regravar o plano inteiro.
+        """
+
         execution_log = []
-        
-        while True:
-            # Verifica flag de parada
-            if self._stop_flags.get(plan.id, False):
-                break
-            
-            # Obtém próximos steps
-            ready_steps = plan.get_next_steps()
-            if not ready_steps:
-                # Verifica se há steps aguardando aprovação
-                approval_steps = [s for s in plan.steps if s.status == StepStatus.REQUIRES_APPROVAL]
-                if approval_steps:
+        slots = asyncio.Semaphore(max(1, plan.max_concurrent_steps))
+        wakeup = self._wakeups.setdefault(plan.id, asyncio.Event())
+        approved = self._approved_steps.setdefault(plan.id, set())
+        running: Dict[asyncio.Task, PlanStep] = {}
+        waiter: Optional[asyncio.Task] = None
+
+        try:
+            while True:
+                stopping = self._stop_flags.get(plan.id, False)
+
+                if not stopping:
+                    for step in plan.get_next_steps():
+                        # Steps de risco que exigem aprovação ficam parados
+                        # até approve_step — o executor segue com os demais.
+                        if (step.requires_approval and step.risk_level != RiskLevel.LOW
+                                and step.id not in approved):
+                            step.status = StepStatus.REQUIRES_APPROVAL
+                            await self._save_step(plan, step)
+                            continue
+                        if slots.locked():
+                            break
+                        await slots.acquire()
+                        # Marca RUNNING antes de ceder o loop para que o
+                        # próximo get_next_steps não lance o mesmo step.
+                        step.status = StepStatus.RUNNING
+                        step.started_at = datetime.now()
+                        running[asyncio.create_task(self._run_plan_step(plan, step))] = step
+
+                if not running:
+                    approval_steps = [s for s in plan.steps if s.status == StepStatus.REQUIRES_APPROVAL]
+                    if stopping or not approval_steps:
+                        # Não há mais steps para executar
+                        break
                     execution_log.append({
                         "action": "waiting_approval",
                         "steps": [s.id for s in approval_steps],
                         "timestamp": datetime.now().isoformat()
                     })
-                    # Aguarda aprovação (em implementação real, seria um mecanismo de notificação)
-                    await asyncio.sleep(1)
-                    continue
-                else:
-                    # Não há mais steps para executar
-                    break
-            
-            # Executa steps (respeitando max_concurrent_steps)
-            concurrent_steps = ready_steps[:plan.max_concurrent_steps]
-            
-            for step in concurrent_steps:
-                try:
-                    # Verifica se precisa de aprovação
-                    if step.requires_approval and step.risk_level not in [RiskLevel.LOW]:
-                        if not auto_approve_low_risk or step.risk_level != RiskLevel.LOW:
-                            step.status = StepStatus.REQUIRES_APPROVAL
-                            continue
-                    
-                    # Executa step
-                    step.status = StepStatus.RUNNING
-                    step.started_at = datetime.now()
-                    
-                    result = await self._execute_step(step)
-                    
-                    step.result = result
-                    step.completed_at = datetime.now()
-                    
-                    if result.is_success:
-                        step.status = StepStatus.COMPLETED
-                        execution_log.append({
-                            "step_id": step.id,
-                            "action": "completed",
-                            "duration": (step.completed_at - step.started_at).total_seconds(),
-                            "timestamp": step.completed_at.isoformat()
-                        })
-                    else:
-                        step.status = StepStatus.FAILED
-                        step.error_message = result.message
-                        execution_log.append({
-                            "step_id": step.id,
-                            "action": "failed",
-                            "error": result.message,
-                            "timestamp": step.completed_at.isoformat()
-                        })
-
-                        # ``break`` only exits the inner for-loop; without
-                        # setting the stop_flag the outer while-loop would
-                        # ignore ``stop_on_failure`` and resume execution.
-                        if plan.stop_on_failure:
-                            self._stop_flags[plan.id] = True
-                            break
 
-                except Exception as e:
-                    step.status = StepStatus.FAILED
-                    step.error_message = str(e)
-                    step.completed_at = datetime.now()
+                if waiter is None:
+                    waiter = asyncio.create_task(wakeup.wait())
+                done, _ = await asyncio.wait(
+                    [*running, waiter], return_when=asyncio.FIRST_COMPLETED
+                )
 
-                    execution_log.append({
-                        "step_id": step.id,
-                        "action": "error",
-                        "error": str(e),
-                        "timestamp": step.completed_at.isoformat()
-                    })
+                if waiter in done:
+                    wakeup.clear()
+                    waiter = None
 
-                    if plan.stop_on_failure:
+                for task in done:
+                    step = running.pop(task, None)
+                    if step is None:
+                        continue
+                    slots.release()
+                    entry = self._record_step_outcome(step, task)
+                    execution_log.append(entry)
+                    if entry["action"] != "completed" and plan.stop_on_failure:
+                        # Não lança novos steps; os que já rodam terminam e
+                        # têm o resultado registrado.
                         self._stop_flags[plan.id] = True
-                        break
-            
-            # Atualiza estatísticas
-            plan.update_stats()
-            await self._save_plan(plan)
-            
-            # Small delay entre iterations
-            await asyncio.sleep(0.1)
-        
+
+                plan.update_stats()
+        finally:
+            if waiter is not None:
+                waiter.cancel()
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
         return {
             "execution_log": execution_log,
             "final_stats": {
@@ -501,7 +553,57 @@ class PlanManager:
                 "skipped": plan.skipped_steps
             }
         }
-    
+
+    async def _run_plan_step(self, plan: ExecutionPlan, step: PlanStep) -> ToolResult:
+        """Executa um step já marcado RUNNING e persiste as transições."""
+        await self._save_step(plan, step)
+        try:
+            result = await self._execute_step(step)
+            step.result = result
+            step.completed_at = datetime.now()
+            if result.is_success:
+                step.status = StepStatus.COMPLETED
+            else:
+                step.status = StepStatus.FAILED
+                step.error_message = result.message
+            return result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            step.status = StepStatus.FAILED
+            step.error_message = str(e)
+            step.completed_at = datetime.now()
+            raise
+        finally:
+            if step.status != StepStatus.RUNNING:
+                await self._save_step(plan, step)
+
+    @staticmethod
+    def _record_step_outcome(step: PlanStep, task: asyncio.Task) -> Dict[str, Any]:
+        """Monta a entrada do execution_log para uma task de step concluída."""
+        completed_at = step.completed_at or datetime.now()
+        error = task.exception() if not task.cancelled() else asyncio.CancelledError()
+        if error is not None:
+            return {
+                "step_id": step.id,
+                "action": "error",
+                "error": str(error),
+                "timestamp": completed_at.isoformat()
+            }
+        if step.status == StepStatus.COMPLETED:
+            return {
+                "step_id": step.id,
+                "action": "completed",
+                "duration": (completed_at - step.started_at).total_seconds(),
+                "timestamp": completed_at.isoformat()
+            }
+        return {
+            "step_id": step.id,
+            "action": "failed",
+            "error": step.error_message,
+            "timestamp": completed_at.isoformat()
+        }
+
     async def _execute_step(self, step: PlanStep) -> ToolResult:
         """Executa um step individual com verificações de segurança"""
         
@@ -717,17 +819,63 @@ class PlanManager:
             )
     
     async def _save_plan(self, plan: ExecutionPlan) -> None:
-        """Salva plano em arquivo JSON (I/O em worker thread)."""
+        """Salva plano em arquivo JSON (I/O em worker thread).
+
+        O snapshot completo incorpora o journal de steps, que é descartado.
+        """
         plan_file = self.plans_dir / f"{plan.id}.json"
 
         try:
             await write_json(plan_file, plan.to_dict())
+            await asyncio.to_thread(self._journal_path(plan.id).unlink, missing_ok=True)
+            await asyncio.to_thread(self._index_plan, plan)
             # Também salva versão human-readable
             md_file = self.plans_dir / f"{plan.id}.md"
             await self._save_plan_markdown(plan, md_file)
         except Exception as e:
             logger.error(f"Failed to save plan {plan.id}: {e}")
             raise
+
+    def _journal_path(self, plan_id: str) -> Path:
+        return self.plans_dir / f"{plan_id}{PlanCatalog.JOURNAL_SUFFIX}"
+
+    async def _save_step(self, plan: ExecutionPlan, step: PlanStep) -> None:
+        """Anexa o estado de um step ao journal do plano (uma linha JSONL).
+
+        Custo proporcional ao step, não ao plano: durante a execução só o
+        journal cresce; ``load_plan`` o reaplica sobre o snapshot e o
+        próximo ``_save_plan`` o consolida. Falha de I/O é só logada — o
+        estado em memória continua valendo e o snapshot final o grava.
+        """
+        line = json.dumps(step.to_dict(), ensure_ascii=False)
+        try:
+            await asyncio.to_thread(_append_line, self._journal_path(plan.id), line)
+        except Exception as e:
+            logger.warning(f"Failed to journal step {step.id} of plan {plan.id}: {e}")
+        plan.update_stats()
+        await asyncio.to_thread(self._index_plan, plan)
+
+    def _index_plan(self, plan: ExecutionPlan) -> None:
+        """Atualiza a linha do plano no catálogo (best-effort).
+
+        Falha aqui não derruba o save: o JSON já foi gravado e
+        ``rebuild_catalog`` corrige a divergência.
+        """
+        try:
+            version = self.catalog.file_version(self.plans_dir / f"{plan.id}.json")
+        except OSError:
+            version = None
+        try:
+            self.catalog.upsert(_plan_summary(plan), version)
+        except Exception as e:
+            logger.warning(f"Failed to index plan {plan.id}: {e}")
+
+    def _summarize_plan_file(self, plan_file: Path) -> Dict[str, Any]:
+        """Resumo de um JSON de plano (+ journal pendente) para o rebuild."""
+        with open(plan_file, "r", encoding="utf-8") as f:
+            plan = ExecutionPlan.from_dict(json.load(f))
+        _apply_step_journal(plan, _read_step_journal(self._journal_path(plan_file.stem)))
+        return _plan_summary(plan)
     
     async def _save_plan_markdown(self, plan: ExecutionPlan, file_path: Path) -> None:
         """Salva plano em formato markdown legível"""
@@ -799,6 +947,80 @@ class PlanManager:
             logger.warning(f"Failed to save plan markdown {file_path}: {e}")
 
 
+_RISK_ORDER = list(RiskLevel)
+
+
+def _plan_summary(plan: ExecutionPlan) -> Dict[str, Any]:
+    """Linha do catálogo: metadados, contadores e o maior risco entre os steps."""
+    risk = max((step.risk_level for step in plan.steps), key=_RISK_ORDER.index, default=None)
+    return {
+        "id": plan.id,
+        "title": plan.title,
+        "description": plan.description,
+        "status": plan.status.value,
+        "created_at": plan.created_at.isoformat(),
+        "started_at": plan.started_at.isoformat() if plan.started_at else None,
+        "completed_at": plan.completed_at.isoformat() if plan.completed_at else None,
+        "total_steps": plan.total_steps,
+        "completed_steps": plan.completed_steps,
+        "failed_steps": plan.failed_steps,
+        "skipped_steps": plan.skipped_steps,
+        "risk_level": risk.value if risk else None,
+    }
+
+
+def _apply_step_journal(plan: ExecutionPlan, journal: List[Dict[str, Any]]) -> None:
+    """Reaplica sobre o snapshot as transições de step gravadas depois dele."""
+    for step_data in journal:
+        step = plan.get_step(step_data.get("id", ""))
+        if step is None:
+            continue
+        try:
+            restored = PlanStep.from_dict(step_data)
+        except Exception as e:
+            logger.warning(f"Ignoring bad journal entry for plan {plan.id}: {e}")
+            continue
+        plan.steps[plan.steps.index(step)] = restored
+    if journal:
+        plan.update_stats()
+
+
+def _append_line(path: Path, line: str) -> None:
+    """Anexa ``line`` com um único ``write()`` num fd ``O_APPEND``.
+
+    O ``open(..., "a")`` bufferizado quebra linhas maiores que o buffer
+    (8 KiB) em vários ``write()``; dois steps gravados em paralelo (threads
+    do ``to_thread`` ou outro processo) podiam se intercalar no journal. Com
+    ``O_APPEND`` o kernel posiciona e grava a linha inteira de uma vez.
+    """
+    data = (line + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        written = os.write(fd, data)
+    finally:
+        os.close(fd)
+    if written != len(data):
+        # Escrita curta (disco cheio): o resto não pode ir num write à parte
+        # sem risco de intercalar. A linha truncada é ignorada na leitura.
+        raise OSError(f"short write to {path}: {written}/{len(data)} bytes")
+
+
+def _read_step_journal(path: Path) -> List[Dict[str, Any]]:
+    """Lê o journal de steps; linha truncada (crash no meio da escrita) é ignorada."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = f.readlines()
+    except FileNotFoundError:
+        return []
+    entries = []
+    for line in raw:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries
+
+
 # Singleton instance
 _plan_manager: Optional[PlanManager] = None
 
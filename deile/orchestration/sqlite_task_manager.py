@@ -10,9 +10,10 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import aiosqlite
+import sqlite3
 
 from ..core.exceptions import DEILEError
+from ..storage.sqlite_pool import get_database
 from ._deps import all_dependencies_met
 from ._paths import resolve_data_dir
 
@@ -206,8 +207,11 @@ class SQLiteTaskManager:
         self._cache_timestamps: Dict[str, float] = {}
         self._cache_ttl = 300  # 5 minutos
 
-        # Lock para operações assíncronas
-        self._db_lock = asyncio.Lock()
+        # Conexões persistentes compartilhadas (pool por arquivo): escritas
+        # serializadas pela thread escritora do pool, leituras em conexões
+        # WAL por thread. Substitui um ``aiosqlite.connect`` (thread nova +
+        # abertura do arquivo) por operação.
+        self._db = get_database(self.db_path)
 
         # Inicialização lazy de schema: criada on-demand de forma idempotente.
         # O Lock é criado preguiçosamente (já em contexto async) para suportar
@@ -233,58 +237,59 @@ class SQLiteTaskManager:
 
     async def _initialize_database(self):
         """Inicializa schema do banco de dados"""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Tabela de task lists
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS task_lists (
-                    id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    created_at TEXT NOT NULL,
-                    sequential_mode BOOLEAN DEFAULT TRUE,
-                    auto_start_next BOOLEAN DEFAULT TRUE,
-                    stop_on_failure BOOLEAN DEFAULT TRUE,
-                    active BOOLEAN DEFAULT FALSE,
-                    current_task_id TEXT,
-                    total_tasks INTEGER DEFAULT 0,
-                    completed_tasks INTEGER DEFAULT 0,
-                    failed_tasks INTEGER DEFAULT 0,
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Tabela de tasks
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id TEXT PRIMARY KEY,
-                    list_id TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    status TEXT NOT NULL,
-                    priority TEXT NOT NULL,
-                    depends_on TEXT,  -- JSON array
-                    blocks TEXT,      -- JSON array
-                    created_at TEXT NOT NULL,
-                    started_at TEXT,
-                    completed_at TEXT,
-                    estimated_duration REAL,
-                    tags TEXT,        -- JSON array
-                    metadata TEXT,    -- JSON object
-                    success BOOLEAN,
-                    result_data TEXT, -- JSON object
-                    error_message TEXT,
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (list_id) REFERENCES task_lists (id) ON DELETE CASCADE
-                )
-            """)
-
-            # Índices para performance
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_tasks_list_id ON tasks(list_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority)")
-
-            await db.commit()
-            logger.info(f"SQLite database initialized at {self.db_path}")
+        await asyncio.to_thread(self._db.executescript, """
+            -- Tabela de task lists
+            CREATE TABLE IF NOT EXISTS task_lists (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                description TEXT,
+                created_at TEXT NOT NULL,
+                sequential_mode BOOLEAN DEFAULT TRUE,
+                auto_start_next BOOLEAN DEFAULT TRUE,
+                stop_on_failure BOOLEAN DEFAULT TRUE,
+                active BOOLEAN DEFAULT FALSE,
+                current_task_id TEXT,
+                total_tasks INTEGER DEFAULT 0,
+                completed_tasks INTEGER DEFAULT 0,
+                failed_tasks INTEGER DEFAULT 0,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+
+            -- Tabela de tasks
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                list_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                status TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                depends_on TEXT,  -- JSON array
+                blocks TEXT,      -- JSON array
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                completed_at TEXT,
+                estimated_duration REAL,
+                tags TEXT,        -- JSON array
+                metadata TEXT,    -- JSON object
+                success BOOLEAN,
+                result_data TEXT, -- JSON object
+                error_message TEXT,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (list_id) REFERENCES task_lists (id) ON DELETE CASCADE
+            );
+
+            -- Índices para performance
+            CREATE INDEX IF NOT EXISTS idx_tasks_list_id ON tasks(list_id);
+            CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+            CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+        """)
+        logger.info(f"SQLite database initialized at {self.db_path}")
+
+    @staticmethod
+    def _dict_rows(conn: sqlite3.Connection, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return [dict(row) for row in cur.execute(sql, params).fetchall()]
 
     async def create_task_list(self, title: str, description: str = "",
                               sequential: bool = True, auto_start: bool = True) -> TaskList:
@@ -300,18 +305,15 @@ class SQLiteTaskManager:
             auto_start_next=auto_start
         )
 
-        async with self._db_lock:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
-                    INSERT INTO task_lists
-                    (id, title, description, created_at, sequential_mode, auto_start_next, stop_on_failure, active)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    task_list.id, task_list.title, task_list.description,
-                    task_list.created_at.isoformat(), task_list.sequential_mode,
-                    task_list.auto_start_next, task_list.stop_on_failure, task_list.active
-                ))
-                await db.commit()
+        await self._db.awrite(lambda conn: conn.execute("""
+            INSERT INTO task_lists
+            (id, title, description, created_at, sequential_mode, auto_start_next, stop_on_failure, active)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            task_list.id, task_list.title, task_list.description,
+            task_list.created_at.isoformat(), task_list.sequential_mode,
+            task_list.auto_start_next, task_list.stop_on_failure, task_list.active
+        )))
 
         # Atualiza cache
         self._cache[list_id] = task_list
@@ -324,13 +326,10 @@ class SQLiteTaskManager:
     async def activate_task_list(self, list_id: str) -> None:
         """Marca lista como ativa no banco de dados."""
         await self._ensure_schema()
-        async with self._db_lock:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute(
-                    "UPDATE task_lists SET active = TRUE, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                    (list_id,)
-                )
-                await db.commit()
+        await self._db.awrite(lambda conn: conn.execute(
+            "UPDATE task_lists SET active = TRUE, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (list_id,)
+        ))
         self._invalidate_cache(list_id)
         logger.info("Activated task list %s", list_id)
 
@@ -372,33 +371,33 @@ class SQLiteTaskManager:
             except Exception as e:
                 logger.warning(f"Could not validate dependencies: {e}")
 
-        async with self._db_lock:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Insere task
-                task_dict = task.to_dict()
-                await db.execute("""
-                    INSERT INTO tasks
-                    (id, list_id, title, description, status, priority, depends_on, blocks,
-                     created_at, started_at, completed_at, estimated_duration, tags, metadata,
-                     success, result_data, error_message)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    task.id, list_id, task.title, task.description, task.status.value,
-                    task.priority.value, task_dict["depends_on"], task_dict["blocks"],
-                    task_dict["created_at"], task_dict["started_at"], task_dict["completed_at"],
-                    task_dict["estimated_duration"], task_dict["tags"], task_dict["metadata"],
-                    task.success, task_dict["result_data"], task.error_message
-                ))
-
-                # Atualiza contadores da lista
-                await db.execute("""
-                    UPDATE task_lists
-                    SET total_tasks = (SELECT COUNT(*) FROM tasks WHERE list_id = ?),
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (list_id, list_id))
-
-                await db.commit()
+        task_dict = task.to_dict()
+
+        def _insert(conn: sqlite3.Connection) -> None:
+            # Insere task
+            conn.execute("""
+                INSERT INTO tasks
+                (id, list_id, title, description, status, priority, depends_on, blocks,
+                 created_at, started_at, completed_at, estimated_duration, tags, metadata,
+                 success, result_data, error_message)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                task.id, list_id, task.title, task.description, task.status.value,
+                task.priority.value, task_dict["depends_on"], task_dict["blocks"],
+                task_dict["created_at"], task_dict["started_at"], task_dict["completed_at"],
+                task_dict["estimated_duration"], task_dict["tags"], task_dict["metadata"],
+                task.success, task_dict["result_data"], task.error_message
+            ))
+
+            # Atualiza contadores da lista
+            conn.execute("""
+                UPDATE task_lists
+                SET total_tasks = (SELECT COUNT(*) FROM tasks WHERE list_id = ?),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (list_id, list_id))
+
+        await self._db.awrite(_insert)
 
         # Limpa cache para forçar reload
         self._invalidate_cache(list_id)
@@ -414,26 +413,28 @@ class SQLiteTaskManager:
         if list_id in self._cache and self._is_cache_valid(list_id):
             return self._cache[list_id]
 
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM task_lists WHERE id = ?", (list_id,)) as cursor:
-                row = await cursor.fetchone()
+        def _load(conn: sqlite3.Connection):
+            rows = self._dict_rows(conn, "SELECT * FROM task_lists WHERE id = ?", (list_id,))
+            if not rows:
+                return None
+            return rows[0], self._task_list_stats(conn, list_id)
 
-                if not row:
-                    return None
+        loaded = await self._db.aread(_load)
+        if not loaded:
+            return None
 
-                # Converte para TaskList
-                data = dict(row)
-                task_list = TaskList.from_dict(data)
+        # Converte para TaskList
+        data, stats = loaded
+        task_list = TaskList.from_dict(data)
 
-                # Recalcula estatísticas
-                await self._update_task_list_stats(task_list, db)
+        # Recalcula estatísticas
+        task_list.total_tasks, task_list.completed_tasks, task_list.failed_tasks = stats
 
-                # Atualiza cache
-                self._cache[list_id] = task_list
-                self._cache_timestamps[list_id] = asyncio.get_event_loop().time()
+        # Atualiza cache
+        self._cache[list_id] = task_list
+        self._cache_timestamps[list_id] = asyncio.get_event_loop().time()
 
-                return task_list
+        return task_list
 
     async def _get_tasks_for_list(self, list_id: str) -> List[Task]:
         """Obtém todas as tasks de uma lista"""
@@ -442,25 +443,22 @@ class SQLiteTaskManager:
         if list_id in self._task_cache and self._is_cache_valid(list_id):
             return self._task_cache[list_id]
 
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("""
-                SELECT * FROM tasks WHERE list_id = ? ORDER BY created_at ASC
-            """, (list_id,)) as cursor:
-                rows = await cursor.fetchall()
-
-                tasks = []
-                for row in rows:
-                    try:
-                        task = Task.from_dict(dict(row))
-                        tasks.append(task)
-                    except Exception as e:
-                        logger.error(f"Failed to load task {row['id']}: {e}")
-
-                # Atualiza cache
-                self._task_cache[list_id] = tasks
-                self._cache_timestamps[list_id] = asyncio.get_event_loop().time()
-                return tasks
+        rows = await self._db.aread(lambda conn: self._dict_rows(conn, """
+            SELECT * FROM tasks WHERE list_id = ? ORDER BY created_at ASC
+        """, (list_id,)))
+
+        tasks = []
+        for row in rows:
+            try:
+                task = Task.from_dict(row)
+                tasks.append(task)
+            except Exception as e:
+                logger.error(f"Failed to load task {row['id']}: {e}")
+
+        # Atualiza cache
+        self._task_cache[list_id] = tasks
+        self._cache_timestamps[list_id] = asyncio.get_event_loop().time()
+        return tasks
 
     async def get_next_tasks(self, list_id: str) -> List[Task]:
         """Obtém próximas tasks prontas para execução"""
@@ -493,40 +491,40 @@ class SQLiteTaskManager:
         """Marca task como completada com transação atômica"""
         await self._ensure_schema()
 
-        async with self._db_lock:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Verifica se task existe
-                async with db.execute("SELECT id FROM tasks WHERE id = ? AND list_id = ?",
-                                    (task_id, list_id)) as cursor:
-                    if not await cursor.fetchone():
-                        return False
-
-                # Atualiza task
-                status = TaskStatus.COMPLETED if success else TaskStatus.FAILED
-                now = datetime.now().isoformat()
-
-                await db.execute("""
-                    UPDATE tasks
-                    SET status = ?, completed_at = ?, success = ?,
-                        result_data = ?, error_message = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ? AND list_id = ?
-                """, (
-                    status.value, now, success,
-                    json.dumps(result_data) if result_data else None,
-                    error_message, task_id, list_id
-                ))
-
-                # Atualiza estatísticas da lista
-                await db.execute("""
-                    UPDATE task_lists
-                    SET completed_tasks = (SELECT COUNT(*) FROM tasks WHERE list_id = ? AND status = 'completed'),
-                        failed_tasks = (SELECT COUNT(*) FROM tasks WHERE list_id = ? AND status = 'failed'),
-                        current_task_id = CASE WHEN current_task_id = ? THEN NULL ELSE current_task_id END,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (list_id, list_id, task_id, list_id))
-
-                await db.commit()
+        def _complete(conn: sqlite3.Connection) -> bool:
+            # Verifica se task existe
+            if not conn.execute("SELECT id FROM tasks WHERE id = ? AND list_id = ?",
+                                (task_id, list_id)).fetchone():
+                return False
+
+            # Atualiza task
+            status = TaskStatus.COMPLETED if success else TaskStatus.FAILED
+            now = datetime.now().isoformat()
+
+            conn.execute("""
+                UPDATE tasks
+                SET status = ?, completed_at = ?, success = ?,
+                    result_data = ?, error_message = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND list_id = ?
+            """, (
+                status.value, now, success,
+                json.dumps(result_data) if result_data else None,
+                error_message, task_id, list_id
+            ))
+
+            # Atualiza estatísticas da lista
+            conn.execute("""
+                UPDATE task_lists
+                SET completed_tasks = (SELECT COUNT(*) FROM tasks WHERE list_id = ? AND status = 'completed'),
+                    failed_tasks = (SELECT COUNT(*) FROM tasks WHERE list_id = ? AND status = 'failed'),
+                    current_task_id = CASE WHEN current_task_id = ? THEN NULL ELSE current_task_id END,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (list_id, list_id, task_id, list_id))
+            return True
+
+        if not await self._db.awrite(_complete):
+            return False
 
         # Limpa cache
         self._invalidate_cache(list_id)
@@ -565,20 +563,17 @@ class SQLiteTaskManager:
             ]
         }
 
-    async def _update_task_list_stats(self, task_list: TaskList, db: aiosqlite.Connection):
-        """Atualiza estatísticas da task list"""
-        async with db.execute("""
+    @staticmethod
+    def _task_list_stats(conn: sqlite3.Connection, list_id: str) -> tuple:
+        """Calcula (total, completed, failed) da task list"""
+        row = conn.execute("""
             SELECT
                 COUNT(*) as total,
                 SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed,
                 SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed
             FROM tasks WHERE list_id = ?
-        """, (task_list.id,)) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                task_list.total_tasks = row[0]
-                task_list.completed_tasks = row[1] or 0
-                task_list.failed_tasks = row[2] or 0
+        """, (list_id,)).fetchone()
+        return row[0], row[1] or 0, row[2] or 0
 
     def _is_cache_valid(self, list_id: str) -> bool:
         """Verifica se cache é válido"""
@@ -599,13 +594,10 @@ class SQLiteTaskManager:
         await self._ensure_schema()
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
 
-        async with self._db_lock:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
-                    DELETE FROM task_lists
-                    WHERE created_at < ? AND active = FALSE
-                """, (cutoff_date,))
-                await db.commit()
+        await self._db.awrite(lambda conn: conn.execute("""
+            DELETE FROM task_lists
+            WHERE created_at < ? AND active = FALSE
+        """, (cutoff_date,)))
 
         logger.info(f"Cleaned up tasks older than {days} days")
 
@@ -2,24 +2,33 @@
 
 Sistema de plugins enterprise-grade com:
 - Plugin lifecycle management
-- Hot-reload capability
+- Hot-reload com debounce, hash de conteúdo e ordem de dependentes
 - Dependency resolution automática
-- Plugin isolation skeleton (PluginSandbox does not isolate; see issue #54)
+- Plugin isolation em subprocesso com limites de recursos (PluginSandbox)
 - Plugin marketplace integration
 - Auto-discovery de plugins
 """
 
 from .dependency_resolver import DependencyResolver
-from .hot_loader import HotLoader
+from .hot_loader import HotLoader, ReloadCoordinator
 from .marketplace import PluginMarketplace
 from .plugin_manager import PluginManager
-from .sandbox import PluginSandbox
+from .sandbox import (PluginCallError, PluginCrashedError, PluginSandbox,
+                      PluginSandboxError, PluginTimeoutError, SandboxedPlugin,
+                      SandboxLimits)
 
 __all__ = [
     "PluginManager",
     "HotLoader",
+    "ReloadCoordinator",
     "DependencyResolver",
     "PluginSandbox",
+    "SandboxLimits",
+    "SandboxedPlugin",
+    "PluginSandboxError",
+    "PluginCallError",
+    "PluginTimeoutError",
+    "PluginCrashedError",
     "PluginMarketplace"
 ]
 
@@ -0,0 +1,202 @@
+"""Processo hospedeiro de um plugin isolado (lado filho do ``PluginSandbox``).
+
+Executado como script (``python _sandbox_host.py <spec-json>``) e não como
+``-m deile...``: o hospedeiro em si só usa stdlib, para que os limites
+valham a partir de um interpretador enxuto. O plugin pode importar
+``deile`` normalmente (o pai exporta ``PYTHONPATH``).
+
+Sequência:
+
+1. Separa o canal RPC dos fds 0/1 (``print`` do plugin vai para stderr e
+   ``input()`` lê ``/dev/null``, sem corromper os frames).
+2. ``unshare`` de namespaces user/net/ipc/uts quando o kernel permite
+   (sem seccomp); falha é silenciosa e reportada no handshake.
+3. ``RLIMIT_NOFILE`` e ``RLIMIT_AS``; ``RLIMIT_CPU`` recebe o orçamento
+   de carregamento (``load_cpu_seconds``) para o import e o handshake, e é
+   rearmado com o orçamento por chamada só depois, antes de cada chamada —
+   importar ``deile`` não consome o orçamento da primeira chamada.
+4. Importa ``main.py``, instancia a subclasse de ``BasePlugin`` e responde
+   o handshake; depois atende uma chamada por vez até EOF ou ``shutdown``.
+
+Protocolo: frames ``>I`` (tamanho) + JSON UTF-8, o mesmo de
+:mod:`deile.plugins.sandbox` (duplicado aqui de propósito).
+"""
+
+import asyncio
+import ctypes
+import importlib.util
+import inspect
+import json
+import os
+import resource
+import struct
+import sys
+import traceback
+
+_FRAME = struct.Struct(">I")
+_MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+_CLONE_NEWUTS = 0x04000000
+_CLONE_NEWIPC = 0x08000000
+_CLONE_NEWUSER = 0x10000000
+_CLONE_NEWNET = 0x40000000
+
+
+def _read_exactly(fd, n):
+    chunks = []
+    while n:
+        chunk = os.read(fd, n)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(fd):
+    header = _read_exactly(fd, _FRAME.size)
+    if header is None:
+        return None
+    (size,) = _FRAME.unpack(header)
+    if size > _MAX_FRAME_BYTES:
+        return None
+    payload = _read_exactly(fd, size)
+    return None if payload is None else json.loads(payload)
+
+
+def _encode(message):
+    payload = json.dumps(message).encode("utf-8")
+    return _FRAME.pack(len(payload)) + payload
+
+
+def _send(fd, frame):
+    data = memoryview(frame)
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _unshare():
+    """Tenta namespaces novos; devolve os que foram aplicados."""
+    if not sys.platform.startswith("linux"):
+        return []
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return []
+    attempts = [
+        (_CLONE_NEWUSER | _CLONE_NEWNET | _CLONE_NEWIPC | _CLONE_NEWUTS, ["user", "net", "ipc", "uts"]),
+        # Como root (sem user ns disponível) os demais ainda podem funcionar.
+        (_CLONE_NEWNET | _CLONE_NEWIPC | _CLONE_NEWUTS, ["net", "ipc", "uts"]),
+    ]
+    for flags, names in attempts:
+        if libc.unshare(flags) == 0:
+            return names
+    return []
+
+
+def _apply_limits(spec):
+    nofile = int(spec["max_open_files"])
+    resource.setrlimit(resource.RLIMIT_NOFILE, (nofile, nofile))
+    memory = int(spec["memory_bytes"])
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+
+def _arm_cpu(seconds):
+    """Soft ``RLIMIT_CPU`` = CPU já consumida + orçamento (SIGXCPU ao estourar)."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _load_plugin(spec):
+    """Importa ``main.py`` e instancia a subclasse de ``BasePlugin``.
+
+    Mesmo critério do ``PluginManager`` (subclasse de ``BasePlugin`` que
+    não seja a própria), comparando pelo nome para não importar ``deile``
+    aqui.
+    """
+    module_name = f"plugin_{spec['plugin_id']}"
+    module_spec = importlib.util.spec_from_file_location(module_name, spec["main_path"])
+    module = importlib.util.module_from_spec(module_spec)
+    sys.modules[module_name] = module
+    module_spec.loader.exec_module(module)
+    for _, obj in inspect.getmembers(module, inspect.isclass):
+        if obj.__name__ != "BasePlugin" and any(
+            base.__name__ == "BasePlugin" for base in obj.__mro__[1:]
+        ):
+            return obj(spec["plugin_id"])
+    raise LookupError("Classe de plugin não encontrada")
+
+
+def _describe(plugin, attr):
+    getter = getattr(plugin, attr, None)
+    try:
+        return list(getter()) if callable(getter) else []
+    except Exception:  # noqa: BLE001 — metadado opcional
+        return []
+
+
+def _dispatch(plugin, loop, request):
+    method = request.get("method") or ""
+    if method.startswith("_"):
+        raise AttributeError(f"Método privado não exposto: {method}")
+    fn = getattr(plugin, method)
+    result = fn(*request.get("args", []), **request.get("kwargs", {}))
+    if inspect.isawaitable(result):
+        result = loop.run_until_complete(result)
+    return result
+
+
+def main():
+    spec = json.loads(sys.argv[1])
+    rpc_in, rpc_out = os.dup(0), os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(2, 1)
+    os.close(devnull)
+
+    namespaces = _unshare() if spec.get("namespaces") else []
+    try:
+        _apply_limits(spec)
+        _arm_cpu(spec.get("load_cpu_seconds", spec["cpu_seconds"]))
+        plugin = _load_plugin(spec)
+    except BaseException as exc:  # noqa: BLE001 — reporta e sai
+        _send(rpc_out, _encode({"ok": False, "error": f"{type(exc).__name__}: {exc}"}))
+        return 1
+
+    _send(rpc_out, _encode({
+        "ok": True,
+        "pid": os.getpid(),
+        "namespaces": namespaces,
+        "capabilities": _describe(plugin, "get_capabilities"),
+        "dependencies": _describe(plugin, "get_dependencies"),
+    }))
+
+    loop = asyncio.new_event_loop()
+    while True:
+        request = _recv(rpc_in)
+        if request is None or request.get("op") == "shutdown":
+            break
+        _arm_cpu(spec["cpu_seconds"])
+        try:
+            # Serializa dentro do try: resultado não-JSON vira erro (TypeError).
+            frame = _encode({"id": request.get("id"), "ok": True,
+                             "result": _dispatch(plugin, loop, request)})
+        except Exception as exc:  # noqa: BLE001 — erro do plugin (inclui MemoryError) vira resposta
+            frame = _encode({
+                "id": request.get("id"),
+                "ok": False,
+                "error_type": type(exc).__name__,
+                "error": str(exc),
+                "traceback": traceback.format_exc()[-2000:],
+            })
+        _send(rpc_out, frame)
+    loop.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
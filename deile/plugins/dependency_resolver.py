@@ -23,23 +23,61 @@ class DependencyResolver:
         self.dependency_graph: Dict[str, DependencyNode] = {}
 
     def add_plugin(self, plugin_id: str, dependencies: List[str]) -> None:
-        """Adiciona plugin ao grafo de dependências"""
-        if plugin_id not in self.dependency_graph:
-            self.dependency_graph[plugin_id] = DependencyNode(
+        """Adiciona plugin ao grafo de dependências
+
+        Se o nó já existe (ex.: criado antes como dependência de outro
+        plugin), as dependências informadas são acrescentadas a ele.
+        """
+        node = self.dependency_graph.get(plugin_id)
+        if node is None:
+            node = self.dependency_graph[plugin_id] = DependencyNode(
                 plugin_id=plugin_id,
-                dependencies=set(dependencies),
+                dependencies=set(),
                 dependents=set()
             )
-
-            # Atualiza dependents nos plugins dependidos
-            for dep_id in dependencies:
-                if dep_id not in self.dependency_graph:
-                    self.dependency_graph[dep_id] = DependencyNode(
-                        plugin_id=dep_id,
-                        dependencies=set(),
-                        dependents=set()
-                    )
-                self.dependency_graph[dep_id].dependents.add(plugin_id)
+        node.dependencies.update(dependencies)
+
+        # Atualiza dependents nos plugins dependidos
+        for dep_id in dependencies:
+            if dep_id not in self.dependency_graph:
+                self.dependency_graph[dep_id] = DependencyNode(
+                    plugin_id=dep_id,
+                    dependencies=set(),
+                    dependents=set()
+                )
+            self.dependency_graph[dep_id].dependents.add(plugin_id)
+
+    def get_dependents(self, plugin_id: str) -> Set[str]:
+        """Retorna todos os plugins que dependem (direta ou transitivamente) de plugin_id"""
+        found: Set[str] = set()
+        stack = [plugin_id]
+        while stack:
+            node = self.dependency_graph.get(stack.pop())
+            if node is None:
+                continue
+            for dependent in node.dependents:
+                if dependent not in found and dependent != plugin_id:
+                    found.add(dependent)
+                    stack.append(dependent)
+        return found
+
+    def resolve_reload_order(self, plugin_id: str) -> List[str]:
+        """Ordem de reload após mudança em plugin_id: ele e seus dependentes
+
+        Topológica sobre o grafo inteiro (dependências fora do conjunto
+        afetado continuam valendo), filtrada para os afetados. Nós presos
+        em ciclo, que o topological sort descarta, vão para o fim — o
+        próprio plugin_id sempre primeiro.
+        """
+        affected = self.get_dependents(plugin_id) | {plugin_id}
+        order = [
+            p for p in self.resolve_load_order(list(self.dependency_graph))
+            if p in affected
+        ]
+        if plugin_id not in order:
+            order.insert(0, plugin_id)
+        order.extend(sorted(affected - set(order)))
+        return order
 
     def resolve_load_order(self, plugins: List[str]) -> List[str]:
         """Resolve ordem de carregamento usando topological sort"""
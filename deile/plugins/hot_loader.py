@@ -1,82 +1,263 @@
-"""Hot Loader - Recarregamento de plugins em runtime"""
+"""Hot Loader - Recarregamento de plugins em runtime
+
+Um save no editor gera vários eventos do watchdog (write + truncate +
+rename, swap files...). O handler só traduz cada evento num ``plugin_id``
+e entrega ao :class:`ReloadCoordinator`, que:
+
+- coalesce eventos por plugin numa janela de debounce (``debounce_s``);
+- compara o hash do conteúdo (``.py``/``.json``) com o último carregado e
+  pula o reload quando nada mudou (ex.: ``touch``, save sem alteração);
+- serializa reloads por plugin (nunca dois ``reload_plugin`` do mesmo
+  plugin ao mesmo tempo);
+- recarrega os dependentes em ordem topológica via ``DependencyResolver``
+  — só os que estão LOADED/ACTIVE, e nenhum cujo plugin-base falhou no
+  reload (``reload_plugin`` devolve ``False``): um save pela metade com
+  erro de sintaxe não derruba a árvore de dependentes.
+"""
 
 import asyncio
+import hashlib
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set
 
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+from .dependency_resolver import DependencyResolver
+from .plugin_manager import PluginStatus
+
 logger = logging.getLogger(__name__)
 
+_WATCHED_SUFFIXES = ('.py', '.json')
+_DEFAULT_DEBOUNCE_S = 0.3
+_RELOADABLE_STATUSES = (PluginStatus.LOADED, PluginStatus.ACTIVE)
+
+
+class ReloadCoordinator:
+    """Coalesce, deduplica por hash e ordena os reloads de plugins.
+
+    Todos os métodos rodam no event loop; o handler do watchdog entra via
+    ``loop.call_soon_threadsafe(coordinator.notify, plugin_id)``.
+    """
+
+    def __init__(self, plugin_manager, debounce_s: float = _DEFAULT_DEBOUNCE_S):
+        self.plugin_manager = plugin_manager
+        self.debounce_s = debounce_s
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._hashes: Dict[str, str] = {}
+        self._stats = {
+            "events": 0,
+            "coalesced": 0,
+            "skipped_unchanged": 0,
+            "reloads": 0,
+            "failed": 0,
+        }
+
+    def notify(self, plugin_id: str) -> None:
+        """Registra um evento; reinicia a janela de debounce do plugin"""
+        self._stats["events"] += 1
+        timer = self._timers.pop(plugin_id, None)
+        if timer is not None:
+            timer.cancel()
+            self._stats["coalesced"] += 1
+        loop = asyncio.get_running_loop()
+        self._timers[plugin_id] = loop.call_later(self.debounce_s, self._fire, plugin_id)
+
+    async def prime(self) -> None:
+        """Guarda o hash atual de todos os plugins (conteúdo já carregado)"""
+        plugins_dir = Path(self.plugin_manager.plugins_dir)
+        if not plugins_dir.is_dir():
+            return
+        for plugin_dir in plugins_dir.iterdir():
+            if plugin_dir.is_dir() and not plugin_dir.name.startswith('.'):
+                self._hashes[plugin_dir.name] = await asyncio.to_thread(
+                    self._content_hash, plugin_dir
+                )
+
+    async def drain(self) -> None:
+        """Espera reloads agendados e em andamento (útil em testes e no stop)"""
+        while self._timers or self._tasks:
+            if self._tasks:
+                await asyncio.gather(*list(self._tasks), return_exceptions=True)
+            else:
+                await asyncio.sleep(self.debounce_s / 2)
+
+    def cancel(self) -> None:
+        """Descarta eventos pendentes (reloads em andamento terminam)"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    def _fire(self, plugin_id: str) -> None:
+        self._timers.pop(plugin_id, None)
+        task = asyncio.get_running_loop().create_task(self._reload(plugin_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _reload(self, plugin_id: str) -> None:
+        plugin_dir = Path(self.plugin_manager.plugins_dir) / plugin_id
+        async with self._lock(plugin_id):
+            digest = await asyncio.to_thread(self._content_hash, plugin_dir)
+            if digest == self._hashes.get(plugin_id):
+                self._stats["skipped_unchanged"] += 1
+                logger.debug("Plugin %s sem mudança de conteúdo; reload ignorado", plugin_id)
+                return
+            self._hashes[plugin_id] = digest
+
+        infos = self._plugin_infos()
+        blocked: Set[str] = set()
+        for target in self._reload_order(plugin_id, infos):
+            if target != plugin_id:
+                info = infos.get(target)
+                if info is None or info.status not in _RELOADABLE_STATUSES:
+                    continue  # dependente não carregado: reload_plugin o ativaria
+                if blocked.intersection(info.dependencies):
+                    blocked.add(target)
+                    logger.warning(
+                        "Hot-reload of plugin %s skipped: dependency failed to reload", target
+                    )
+                    continue
+            async with self._lock(target):
+                try:
+                    ok = await self.plugin_manager.reload_plugin(target)
+                except Exception as exc:
+                    ok = False
+                    logger.error("Hot-reload failed for plugin %s: %s", target, exc)
+                else:
+                    if not ok:
+                        logger.error("Hot-reload failed for plugin %s", target)
+            if ok:
+                self._stats["reloads"] += 1
+            else:
+                # Não derruba os dependentes: continuam com a versão anterior.
+                self._stats["failed"] += 1
+                blocked.add(target)
+                if target == plugin_id and self._hashes.get(plugin_id) == digest:
+                    # reload_plugin já descarregou o plugin: o mesmo conteúdo
+                    # salvo de novo (retry, ``touch``) precisa tentar outra vez.
+                    del self._hashes[plugin_id]
+
+    def _plugin_infos(self) -> Dict[str, Any]:
+        list_plugins = getattr(self.plugin_manager, "list_plugins", None)
+        if not callable(list_plugins):
+            return {}
+        return {info.plugin_id: info for info in list_plugins() or []}
+
+    def _reload_order(self, plugin_id: str, infos: Dict[str, Any]) -> List[str]:
+        """plugin_id seguido dos dependentes, em ordem topológica"""
+        resolver = DependencyResolver()
+        for info in infos.values():
+            resolver.add_plugin(info.plugin_id, list(info.dependencies))
+        return resolver.resolve_reload_order(plugin_id)
+
+    def _lock(self, plugin_id: str) -> asyncio.Lock:
+        lock = self._locks.get(plugin_id)
+        if lock is None:
+            lock = self._locks[plugin_id] = asyncio.Lock()
+        return lock
+
+    @staticmethod
+    def _content_hash(plugin_dir: Path) -> str:
+        """sha256 dos arquivos observados (caminho relativo + bytes)"""
+        digest = hashlib.sha256()
+        if not plugin_dir.is_dir():
+            return ""
+        for path in sorted(plugin_dir.rglob('*')):
+            if not path.is_file() or path.suffix not in _WATCHED_SUFFIXES:
+                continue
+            rel = path.relative_to(plugin_dir)
+            if any(part.startswith('.') or part == '__pycache__' for part in rel.parts):
+                continue
+            try:
+                data = path.read_bytes()
+            except OSError:
+                continue  # removido entre o rglob e a leitura
+            digest.update(rel.as_posix().encode('utf-8') + b'\0')
+            digest.update(hashlib.sha256(data).digest())
+        return digest.hexdigest()
+
 
 class PluginFileHandler(FileSystemEventHandler):
     """Handler para mudanças em arquivos de plugins.
 
-    ``watchdog.Observer`` extends ``threading.Thread``, so ``on_modified``
-    runs OFF the asyncio loop. Calling ``asyncio.create_task`` from a thread
-    with no running loop raises ``RuntimeError`` silently inside watchdog,
-    leaving the reload coroutine unscheduled. ``HotLoader.start()`` captures
-    the loop and passes it here; we hop back onto it via
-    ``run_coroutine_threadsafe``.
+    ``watchdog.Observer`` extends ``threading.Thread``, so the ``on_*``
+    callbacks run OFF the asyncio loop. ``HotLoader.start()`` captures the
+    loop and passes it here; each event is handed to the
+    :class:`ReloadCoordinator` via ``call_soon_threadsafe`` — the handler
+    itself never schedules a reload.
     """
 
-    def __init__(self, plugin_manager, loop: asyncio.AbstractEventLoop):
+    def __init__(self, plugin_manager, loop: asyncio.AbstractEventLoop,
+                 coordinator: Optional[ReloadCoordinator] = None):
         self.plugin_manager = plugin_manager
         self._loop = loop
+        self.coordinator = coordinator or ReloadCoordinator(plugin_manager)
+        self._plugins_dir = Path(plugin_manager.plugins_dir)
         super().__init__()
 
     def on_modified(self, event):
         """Chamado quando arquivo é modificado"""
-        if event.is_directory:
+        self._dispatch_path(event, event.src_path)
+
+    def on_created(self, event):
+        """Arquivo novo (inclui saves via arquivo temporário)"""
+        self._dispatch_path(event, event.src_path)
+
+    def on_moved(self, event):
+        """Rename atômico de editores: vale o destino"""
+        self._dispatch_path(event, getattr(event, "dest_path", "") or event.src_path)
+
+    def _dispatch_path(self, event, src_path: str) -> None:
+        if event.is_directory or not str(src_path).endswith(_WATCHED_SUFFIXES):
             return
 
-        if event.src_path.endswith(('.py', '.json')):
-            # Identifica plugin baseado no path
-            plugin_path = Path(event.src_path)
-            plugin_dir = None
-
-            # Procura diretório do plugin
-            for parent in plugin_path.parents:
-                if parent.parent == self.plugin_manager.plugins_dir:
-                    plugin_dir = parent
-                    break
-
-            if plugin_dir:
-                plugin_id = plugin_dir.name
-                logger.info(f"Arquivo modificado em plugin {plugin_id}: {event.src_path}")
-                coro = self.plugin_manager.reload_plugin(plugin_id)
-                if self._loop.is_closed():
-                    logger.warning(
-                        "Hot-reload event for plugin %s ignored: event loop is closed",
-                        plugin_id,
-                    )
-                    coro.close()
-                    return
-                future = asyncio.run_coroutine_threadsafe(coro, self._loop)
-                # Surface failures from the threadsafe future so reload errors
-                # are not swallowed silently.
-                future.add_done_callback(
-                    lambda f, pid=plugin_id: self._on_reload_done(f, pid)
-                )
+        plugin_id = self._plugin_id_for(Path(src_path))
+        if plugin_id is None:
+            return
 
-    @staticmethod
-    def _on_reload_done(future, plugin_id: str) -> None:
+        if self._loop.is_closed():
+            logger.warning(
+                "Hot-reload event for plugin %s ignored: event loop is closed",
+                plugin_id,
+            )
+            return
+        logger.debug(f"Arquivo modificado em plugin {plugin_id}: {src_path}")
+        try:
+            self._loop.call_soon_threadsafe(self.coordinator.notify, plugin_id)
+        except RuntimeError:
+            # Loop fechou entre o is_closed() e o agendamento.
+            logger.warning(
+                "Hot-reload event for plugin %s ignored: event loop is closed",
+                plugin_id,
+            )
+
+    def _plugin_id_for(self, path: Path) -> Optional[str]:
+        """Primeiro componente relativo a plugins_dir (arquivos na raiz: None)"""
         try:
-            future.result()
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.error("Hot-reload failed for plugin %s: %s", plugin_id, exc)
+            parts = path.relative_to(self._plugins_dir).parts
+        except ValueError:
+            return None
+        if len(parts) < 2 or parts[0].startswith('.'):
+            return None
+        return parts[0]
 
 
 class HotLoader:
     """Gerencia hot-reload de plugins"""
 
-    def __init__(self, plugin_manager):
+    def __init__(self, plugin_manager, debounce_s: float = _DEFAULT_DEBOUNCE_S):
         self.plugin_manager = plugin_manager
+        self.debounce_s = debounce_s
         self._observer: Optional[Observer] = None
         self._is_active = False
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.coordinator: Optional[ReloadCoordinator] = None
 
     async def start(self) -> None:
         """Inicia hot-reload"""
@@ -85,8 +266,10 @@ class HotLoader:
 
         try:
             self._loop = asyncio.get_running_loop()
+            self.coordinator = ReloadCoordinator(self.plugin_manager, self.debounce_s)
+            await self.coordinator.prime()
             self._observer = Observer()
-            handler = PluginFileHandler(self.plugin_manager, self._loop)
+            handler = PluginFileHandler(self.plugin_manager, self._loop, self.coordinator)
             self._observer.schedule(
                 handler,
                 str(self.plugin_manager.plugins_dir),
@@ -106,6 +289,9 @@ class HotLoader:
             self._observer.stop()
             self._observer.join()
             self._observer = None
+            if self.coordinator is not None:
+                self.coordinator.cancel()
+                await self.coordinator.drain()
             self._is_active = False
             self._loop = None
 
@@ -10,6 +10,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Type
 
+from .sandbox import PluginSandbox, SandboxedPlugin
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,15 +83,18 @@ class PluginManager:
     - Auto-discovery de plugins
     - Hot-reload com recarregamento em runtime
     - Resolução automática de dependências
-    - Skeleton de isolamento (PluginSandbox não isola; ver issue #54)
+    - Isolamento opcional em subprocesso (``sandbox=PluginSandbox(...)``)
     - Plugin lifecycle management
     - Monitoring de saúde dos plugins
     """
 
-    def __init__(self, plugins_dir: Path = None):
+    def __init__(self, plugins_dir: Path = None, sandbox: Optional[PluginSandbox] = None):
         self.plugins_dir = plugins_dir or Path("deile/plugins/installed")
         self.plugins_dir.mkdir(parents=True, exist_ok=True)
 
+        # Com sandbox, cada plugin roda em subprocesso com limites
+        self._sandbox = sandbox
+
         # Storage de plugins
         self._plugins: Dict[str, PluginInfo] = {}
         self._plugin_instances: Dict[str, BasePlugin] = {}
@@ -197,6 +202,9 @@ class PluginManager:
             if not main_module_path.exists():
                 raise Exception("Arquivo main.py não encontrado")
 
+            if self._sandbox is not None:
+                return await self._load_sandboxed(plugin_info)
+
             # Import dinâmico do módulo
             spec = importlib.util.spec_from_file_location(
                 f"plugin_{plugin_id}", main_module_path
@@ -243,6 +251,32 @@ class PluginManager:
             logger.error(f"Erro ao carregar plugin {plugin_id}: {e}")
             return False
 
+    async def _load_sandboxed(self, plugin_info: PluginInfo) -> bool:
+        """Carrega o plugin num subprocesso do sandbox (import acontece lá)"""
+        plugin_id = plugin_info.plugin_id
+        if not await self._sandbox.isolate_plugin(plugin_id, plugin_info):
+            raise Exception("Falha ao isolar plugin no sandbox")
+
+        plugin_instance = SandboxedPlugin(plugin_id, self._sandbox)
+        try:
+            await plugin_instance.initialize()
+        except Exception:
+            await self._sandbox.release_plugin(plugin_id)
+            raise
+
+        plugin_info.main_class = None
+        plugin_info.instance = plugin_instance
+        plugin_info.status = PluginStatus.LOADED
+        plugin_info.loaded_at = time.time()
+        plugin_info.last_error = None
+
+        self._plugin_instances[plugin_id] = plugin_instance
+
+        self._stats["plugins_loaded"] += 1
+        logger.info(f"Plugin carregado em sandbox: {plugin_info.name}")
+
+        return True
+
     async def activate_plugin(self, plugin_id: str) -> bool:
         """Ativa um plugin carregado"""
         if plugin_id not in self._plugin_instances:
@@ -1,55 +1,473 @@
-"""Plugin Sandbox - skeleton sem isolamento real.
+"""Plugin Sandbox - plugins em subprocesso com limites de recursos.
 
-Esta classe NÃO isola plugins. `isolate_plugin` apenas guarda a instância
-em um dicionário; `execute_in_sandbox` faz dispatch direto via `getattr`,
-sem qualquer contenção (subprocess, container, RestrictedPython, etc.).
+Cada plugin isolado roda num processo próprio
+(:mod:`deile.plugins._sandbox_host`) que conversa com o DEILE por RPC em
+frames (``>I`` tamanho + JSON) sobre pipes. Um plugin lento ou guloso
+deixa de travar o event loop e a memória do agente:
 
-`PluginManager` também não invoca esta classe — plugins carregados rodam
-no processo DEILE com privilégios totais. Trate como código auditável e
-só carregue plugins de fontes confiáveis.
+- ``RLIMIT_CPU`` rearmado a cada chamada (orçamento por chamada; estourou,
+  o kernel mata com SIGXCPU) — o carregamento tem orçamento próprio
+  (``load_cpu_seconds``), já que importar ``deile`` custa segundos de CPU —,
+  ``RLIMIT_AS`` (alocação além do teto vira
+  ``MemoryError`` dentro do plugin) e ``RLIMIT_NOFILE``;
+- namespaces Linux user/net/ipc/uts via ``unshare`` quando o kernel
+  permite (sem seccomp) — sem rede por padrão;
+- timeout por chamada: chamada que não responde a tempo mata o processo;
+- reinício automático na próxima chamada após crash/timeout, com replay de
+  ``initialize``/``activate`` e teto de reinícios por janela.
 
+Argumentos e resultados precisam ser serializáveis em JSON — nunca
+``pickle``, que executaria código do plugin no processo do agente.
+
+``PluginManager`` usa este sandbox quando recebe ``sandbox=`` (ver
+:class:`SandboxedPlugin`); sem ele, plugins continuam in-process.
 Referência: issue #54.
 """
 
+import asyncio
+import json
 import logging
-from typing import Any, Dict
+import os
+import signal
+import struct
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from ..core.exceptions import DEILEError
 
 logger = logging.getLogger(__name__)
 
+_HOST_SCRIPT = Path(__file__).with_name("_sandbox_host.py")
+# Raiz que contém o pacote ``deile`` — exportada no PYTHONPATH do filho.
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_FRAME = struct.Struct(">I")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+_STDERR_TAIL_LINES = 20
+# Métodos de ciclo de vida refeitos quando o processo é reiniciado.
+_REPLAYED_LIFECYCLE = ("initialize", "activate")
 
-class PluginSandbox:
-    """Skeleton de sandbox de plugins. NÃO fornece isolamento.
 
-    Mantida como ponto de extensão futuro. Hoje todo método é equivalente
-    a invocar o plugin diretamente — não confie nesta classe para garantir
-    segurança. Veja issue #54 para histórico e roadmap.
-    """
+class PluginSandboxError(DEILEError):
+    """Erro do sandbox de plugins (registro, protocolo, reinícios esgotados)"""
+
+    def __init__(self, message: str, plugin_id: Optional[str] = None, **kwargs):
+        super().__init__(message, **kwargs)
+        self.plugin_id = plugin_id
+        if plugin_id:
+            self.context["plugin_id"] = plugin_id
+
+
+class PluginCallError(PluginSandboxError):
+    """O método do plugin levantou exceção dentro do subprocesso"""
+
+    def __init__(self, message: str, remote_type: str = "", remote_traceback: str = "", **kwargs):
+        super().__init__(message, error_code="PLUGIN_CALL_FAILED", **kwargs)
+        self.remote_type = remote_type
+        self.remote_traceback = remote_traceback
+
+
+class PluginTimeoutError(PluginSandboxError):
+    """A chamada excedeu ``call_timeout_s``; o processo foi morto"""
+
+    def __init__(self, message: str, **kwargs):
+        super().__init__(message, error_code="PLUGIN_TIMEOUT", **kwargs)
+
+
+class PluginCrashedError(PluginSandboxError):
+    """O processo do plugin morreu (sinal, limite de CPU, ``os._exit``...)"""
+
+    def __init__(self, message: str, returncode: Optional[int] = None, **kwargs):
+        super().__init__(message, error_code="PLUGIN_CRASHED", **kwargs)
+        self.returncode = returncode
+
+
+@dataclass
+class SandboxLimits:
+    """Limites aplicados a cada processo de plugin"""
+    cpu_seconds_per_call: float = 10.0
+    load_cpu_seconds: float = 30.0
+    memory_bytes: int = 1024 * 1024 * 1024
+    max_open_files: int = 64
+    call_timeout_s: float = 30.0
+    start_timeout_s: float = 15.0
+    max_restarts: int = 3
+    restart_window_s: float = 60.0
+    namespaces: bool = True
+
 
-    def __init__(self):
-        self._isolated_plugins: Dict[str, Any] = {}
+class _PluginProcess:
+    """Um subprocesso hospedeiro + o canal RPC com ele (uma chamada por vez)"""
 
-    async def isolate_plugin(self, plugin_id: str, plugin_instance: Any) -> bool:
-        """Registra o plugin no dicionário interno (não isola)."""
+    def __init__(self, plugin_id: str, main_path: Path, limits: SandboxLimits):
+        self.plugin_id = plugin_id
+        self.main_path = main_path
+        self.limits = limits
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self.info: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+        self._next_id = 0
+        self._stderr_tail: Deque[str] = deque(maxlen=_STDERR_TAIL_LINES)
+        self._stderr_task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    async def start(self) -> None:
+        spec = {
+            "plugin_id": self.plugin_id,
+            "main_path": str(self.main_path),
+            "cpu_seconds": self.limits.cpu_seconds_per_call,
+            "load_cpu_seconds": self.limits.load_cpu_seconds,
+            "memory_bytes": self.limits.memory_bytes,
+            "max_open_files": self.limits.max_open_files,
+            "namespaces": self.limits.namespaces,
+        }
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (str(_PROJECT_ROOT), env.get("PYTHONPATH", "")) if p
+        )
+        self._stderr_tail.clear()
+        self.proc = await asyncio.create_subprocess_exec(
+            sys.executable, str(_HOST_SCRIPT), json.dumps(spec),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            start_new_session=True,
+        )
+        self._stderr_task = asyncio.create_task(self._drain_stderr(self.proc))
         try:
-            self._isolated_plugins[plugin_id] = plugin_instance
-            logger.debug(
-                "Plugin %s registrado no PluginSandbox skeleton (sem isolamento real)",
-                plugin_id,
+            hello = await asyncio.wait_for(self._read_frame(), self.limits.start_timeout_s)
+        except asyncio.TimeoutError:
+            await self.kill()
+            raise PluginTimeoutError(
+                f"Plugin {self.plugin_id} não respondeu ao handshake em "
+                f"{self.limits.start_timeout_s}s", plugin_id=self.plugin_id,
+            )
+        except (asyncio.IncompleteReadError, ConnectionError):
+            await self.kill()
+            raise self._crashed("durante o carregamento")
+        if not hello.get("ok"):
+            await self.kill()
+            raise PluginSandboxError(
+                f"Falha ao carregar plugin {self.plugin_id}: {hello.get('error')}",
+                plugin_id=self.plugin_id,
+            )
+        self.info = hello
+        logger.debug(
+            "Plugin %s isolado no pid %s (namespaces: %s)",
+            self.plugin_id, hello.get("pid"), ",".join(hello.get("namespaces", [])) or "nenhum",
+        )
+
+    async def call(self, method: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        async with self._lock:
+            if not self.alive:
+                raise self._crashed("antes da chamada")
+            self._next_id += 1
+            request_id = self._next_id
+            try:
+                frame = self._encode({"id": request_id, "op": "call", "method": method,
+                                      "args": list(args), "kwargs": kwargs})
+            except (TypeError, ValueError) as e:
+                raise PluginSandboxError(
+                    f"Argumentos de {self.plugin_id}.{method} não são serializáveis em JSON: {e}",
+                    plugin_id=self.plugin_id,
+                )
+            try:
+                self.proc.stdin.write(frame)
+                await self.proc.stdin.drain()
+                reply = await asyncio.wait_for(self._read_frame(), self.limits.call_timeout_s)
+            except asyncio.TimeoutError:
+                await self.kill()
+                raise PluginTimeoutError(
+                    f"{self.plugin_id}.{method} excedeu {self.limits.call_timeout_s}s",
+                    plugin_id=self.plugin_id,
+                )
+            except (asyncio.IncompleteReadError, ConnectionError):
+                await self._reap()
+                raise self._crashed(f"em {method}")
+            except asyncio.CancelledError:
+                # A resposta ainda viria pelo pipe e seria lida pela próxima
+                # chamada: mata o processo (reiniciado sob demanda) antes de
+                # soltar o lock.
+                await self.kill()
+                raise
+
+            if reply.get("id") != request_id:
+                await self.kill()
+                raise PluginSandboxError(
+                    f"Resposta fora de ordem de {self.plugin_id}", plugin_id=self.plugin_id,
+                )
+
+        if reply.get("ok"):
+            return reply.get("result")
+        raise PluginCallError(
+            f"{self.plugin_id}.{method} falhou: {reply.get('error_type')}: {reply.get('error')}",
+            remote_type=reply.get("error_type", ""),
+            remote_traceback=reply.get("traceback", ""),
+            plugin_id=self.plugin_id,
+        )
+
+    async def stop(self, timeout: float = 2.0) -> None:
+        """Pede ``shutdown`` e espera; mata o grupo se não sair a tempo."""
+        if self.alive:
+            try:
+                self.proc.stdin.write(self._encode({"op": "shutdown"}))
+                await self.proc.stdin.drain()
+                await asyncio.wait_for(self.proc.wait(), timeout)
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+        await self.kill()
+
+    async def kill(self) -> None:
+        if self.proc is None:
+            return
+        if self.proc.returncode is None:
+            try:
+                # Grupo inteiro: o plugin pode ter criado filhos.
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        await self._reap()
+
+    async def _reap(self) -> None:
+        await self.proc.wait()
+        if self._stderr_task is not None:
+            try:
+                await asyncio.wait_for(self._stderr_task, 1.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._stderr_task.cancel()
+            self._stderr_task = None
+
+    async def _read_frame(self) -> Dict[str, Any]:
+        header = await self.proc.stdout.readexactly(_FRAME.size)
+        (size,) = _FRAME.unpack(header)
+        if size > MAX_FRAME_BYTES:
+            await self.kill()
+            raise PluginSandboxError(
+                f"Frame de {size} bytes excede o limite de {MAX_FRAME_BYTES}",
+                plugin_id=self.plugin_id,
             )
-            return True
+        return json.loads(await self.proc.stdout.readexactly(size))
+
+    @staticmethod
+    def _encode(message: Dict[str, Any]) -> bytes:
+        payload = json.dumps(message).encode("utf-8")
+        return _FRAME.pack(len(payload)) + payload
 
-        except Exception as e:
-            logger.error(f"Erro ao registrar plugin {plugin_id}: {e}")
+    async def _drain_stderr(self, proc: asyncio.subprocess.Process) -> None:
+        """stderr (inclui ``print`` do plugin) vai para o log em DEBUG"""
+        while True:
+            line = await proc.stderr.readline()
+            if not line:
+                return
+            text = line.decode("utf-8", "replace").rstrip()
+            self._stderr_tail.append(text)
+            logger.debug("[plugin %s] %s", self.plugin_id, text)
+
+    def _crashed(self, where: str) -> PluginCrashedError:
+        returncode = self.proc.returncode if self.proc else None
+        if returncode is not None and returncode < 0:
+            try:
+                cause = signal.Signals(-returncode).name
+            except ValueError:
+                cause = f"sinal {-returncode}"
+            if -returncode == signal.SIGXCPU:
+                cause += (" (limite de CPU do carregamento)" if where == "durante o carregamento"
+                          else " (limite de CPU por chamada)")
+        else:
+            cause = f"código {returncode}"
+        tail = f" — {self._stderr_tail[-1]}" if self._stderr_tail else ""
+        return PluginCrashedError(
+            f"Processo do plugin {self.plugin_id} morreu {where}: {cause}{tail}",
+            returncode=returncode,
+            plugin_id=self.plugin_id,
+        )
+
+
+class PluginSandbox:
+    """Hospeda plugins em subprocessos isolados e despacha chamadas por RPC.
+
+    Uso::
+
+        sandbox = PluginSandbox(SandboxLimits(call_timeout_s=5))
+        await sandbox.isolate_plugin("meu_plugin", plugin_info)   # ou Path
+        await sandbox.execute_in_sandbox("meu_plugin", "initialize")
+        ...
+        await sandbox.shutdown()
+
+    Crash ou timeout numa chamada propagam a exceção (a chamada não é
+    repetida — pode não ser idempotente); a próxima chamada reinicia o
+    processo, até ``max_restarts`` vezes por ``restart_window_s``.
+    """
+
+    def __init__(self, limits: Optional[SandboxLimits] = None):
+        self.limits = limits or SandboxLimits()
+        self._isolated_plugins: Dict[str, _PluginProcess] = {}
+        self._lifecycle: Dict[str, List[str]] = {}
+        self._restarts: Dict[str, Deque[float]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def isolate_plugin(self, plugin_id: str, plugin: Any) -> bool:
+        """Sobe o processo do plugin.
+
+        ``plugin`` é um ``PluginInfo`` (usa ``plugin_dir``), o diretório do
+        plugin ou o caminho do ``main.py``. Instâncias já criadas não podem
+        ser isoladas — o código precisa ser carregado no subprocesso.
+        """
+        try:
+            main_path = self._resolve_main(plugin)
+            if plugin_id in self._isolated_plugins:
+                await self.release_plugin(plugin_id)
+            process = _PluginProcess(plugin_id, main_path, self.limits)
+            await process.start()
+        except (PluginSandboxError, OSError, TypeError) as e:
+            logger.error(f"Erro ao isolar plugin {plugin_id}: {e}")
             return False
 
+        self._isolated_plugins[plugin_id] = process
+        self._lifecycle[plugin_id] = []
+        self._restarts[plugin_id] = deque()
+        self._stats[plugin_id] = {"calls": 0, "errors": 0, "timeouts": 0,
+                                  "crashes": 0, "restarts": 0}
+        return True
+
     async def execute_in_sandbox(self, plugin_id: str, method: str, *args, **kwargs) -> Any:
-        """Despacha método do plugin diretamente (sem contenção)."""
+        """Chama ``method`` no processo do plugin (reinicia se estiver morto)."""
         if plugin_id not in self._isolated_plugins:
-            raise Exception(f"Plugin {plugin_id} não está registrado")
+            raise PluginSandboxError(f"Plugin {plugin_id} não está registrado", plugin_id=plugin_id)
+
+        process = await self._ensure_running(plugin_id)
+        stats = self._stats[plugin_id]
+        stats["calls"] += 1
+        try:
+            result = await process.call(method, args, kwargs)
+        except PluginTimeoutError:
+            stats["timeouts"] += 1
+            raise
+        except PluginCrashedError:
+            stats["crashes"] += 1
+            raise
+        except PluginSandboxError:
+            stats["errors"] += 1
+            raise
+
+        lifecycle = self._lifecycle[plugin_id]
+        if method in _REPLAYED_LIFECYCLE and method not in lifecycle:
+            lifecycle.append(method)
+        elif method == "deactivate" and "activate" in lifecycle:
+            lifecycle.remove("activate")
+        elif method == "shutdown":
+            lifecycle.clear()
+        return result
+
+    async def release_plugin(self, plugin_id: str) -> None:
+        """Encerra o processo e esquece o plugin."""
+        process = self._isolated_plugins.pop(plugin_id, None)
+        self._lifecycle.pop(plugin_id, None)
+        self._restarts.pop(plugin_id, None)
+        if process is not None:
+            await process.stop()
+
+    async def shutdown(self) -> None:
+        for plugin_id in list(self._isolated_plugins):
+            await self.release_plugin(plugin_id)
+
+    def plugin_metadata(self, plugin_id: str) -> Dict[str, Any]:
+        """Handshake do processo atual (pid, namespaces, capabilities...)"""
+        process = self._isolated_plugins.get(plugin_id)
+        return dict(process.info) if process else {}
+
+    def get_stats(self, plugin_id: str) -> Dict[str, Any]:
+        process = self._isolated_plugins.get(plugin_id)
+        return {
+            **self._stats.get(plugin_id, {}),
+            "alive": bool(process and process.alive),
+            "pid": process.info.get("pid") if process else None,
+        }
 
-        plugin = self._isolated_plugins[plugin_id]
+    async def _ensure_running(self, plugin_id: str) -> _PluginProcess:
+        process = self._isolated_plugins[plugin_id]
+        if process.alive:
+            return process
+
+        now = time.monotonic()
+        history = self._restarts[plugin_id]
+        while history and now - history[0] > self.limits.restart_window_s:
+            history.popleft()
+        if len(history) >= self.limits.max_restarts:
+            raise PluginSandboxError(
+                f"Plugin {plugin_id} reiniciou {len(history)} vezes em "
+                f"{self.limits.restart_window_s:.0f}s; desistindo",
+                error_code="PLUGIN_RESTARTS_EXHAUSTED",
+                plugin_id=plugin_id,
+            )
+        history.append(now)
+        self._stats[plugin_id]["restarts"] += 1
+        logger.warning("Reiniciando processo do plugin %s", plugin_id)
+
+        await process.start()
+        for method in self._lifecycle[plugin_id]:
+            await process.call(method, (), {})
+        return process
+
+    @staticmethod
+    def _resolve_main(plugin: Any) -> Path:
+        plugin_dir = getattr(plugin, "plugin_dir", None)
+        if plugin_dir is not None:
+            path = Path(plugin_dir) / "main.py"
+        elif isinstance(plugin, (str, os.PathLike)):
+            path = Path(plugin)
+            if path.is_dir():
+                path = path / "main.py"
+        else:
+            raise TypeError(
+                f"Esperado PluginInfo ou caminho do plugin, recebido {type(plugin).__name__}"
+            )
+        if not path.is_file():
+            raise PluginSandboxError(f"Arquivo {path} não encontrado")
+        return path
+
+
+class SandboxedPlugin:
+    """Proxy in-process com a interface de ``BasePlugin`` para um plugin isolado.
+
+    É o que o ``PluginManager`` guarda como instância quando roda com
+    sandbox. Métodos além do ciclo de vida: :meth:`call`.
+    """
+
+    def __init__(self, plugin_id: str, sandbox: PluginSandbox):
+        self.plugin_id = plugin_id
+        self.is_active = False
+        self._sandbox = sandbox
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        return await self._sandbox.execute_in_sandbox(self.plugin_id, method, *args, **kwargs)
+
+    async def initialize(self) -> None:
+        await self.call("initialize")
+
+    async def activate(self) -> None:
+        await self.call("activate")
+        self.is_active = True
+
+    async def deactivate(self) -> None:
+        await self.call("deactivate")
+        self.is_active = False
+
+    async def shutdown(self) -> None:
+        try:
+            await self.call("shutdown")
+        finally:
+            await self._sandbox.release_plugin(self.plugin_id)
 
-        if not hasattr(plugin, method):
-            raise Exception(f"Método {method} não encontrado no plugin {plugin_id}")
+    def get_capabilities(self) -> List[str]:
+        return list(self._sandbox.plugin_metadata(self.plugin_id).get("capabilities", []))
 
-        return await getattr(plugin, method)(*args, **kwargs)
+    def get_dependencies(self) -> List[str]:
+        return list(self._sandbox.plugin_metadata(self.plugin_id).get("dependencies", []))
@@ -14,6 +14,10 @@ API pública (Fases 2/3 — status server + registry):
     from deile.runtime import StatusServer, StatusClient
     from deile.runtime import Registry, RegistryEntry
 
+Heartbeats mmap (slots de tamanho fixo, leitura seqlock lock-free):
+
+    from deile.runtime import SlotTable, SlotHandle, SlotRecord
+
 Ver issue #303 e ``docs/system_design/DECISOES.md`` #35 (state file + heartbeat),
 #36 (status server + registry).
 """
@@ -23,6 +27,7 @@ from deile.runtime.instance_state import (InstanceState, get_instance_state,
                                           reset_instance_state)
 from deile.runtime.registry import (REGISTRY_SCHEMA_VERSION, Registry,
                                     RegistryEntry)
+from deile.runtime.slots import SlotHandle, SlotRecord, SlotTable
 from deile.runtime.status_server import (MAX_LINE_BYTES, StatusClient,
                                          StatusServer, format_metrics)
 
@@ -42,4 +47,8 @@ __all__ = [
     "Registry",
     "RegistryEntry",
     "REGISTRY_SCHEMA_VERSION",
+    # slots
+    "SlotTable",
+    "SlotHandle",
+    "SlotRecord",
 ]
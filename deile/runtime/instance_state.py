@@ -39,6 +39,14 @@ Async: ``heartbeat_loop`` é uma task asyncio; o flush é síncrono (``write_tex
 + ``os.replace`` é <1ms em SSD) e roda direto no event loop sem ``to_thread``
 para minimizar latência e simplificar o ciclo de vida da task. Princípio 1
 (Async-First) é respeitado para qualquer I/O que não seja triviamente rápido.
+
+Heartbeat vs flush: com o registry ativo, o heartbeat é só um timestamp
+gravado in-place no slot do processo em ``registry.slots``
+(:mod:`deile.runtime.slots`). O JSON só é reescrito quando ``current_action``
+ou ``stats`` mudam de fato; ``last_heartbeat_at`` no arquivo reflete o
+último flush e leitores que precisam do valor vivo consultam o slot (ou o
+status server). Sem slot (registry desabilitado, tabela lotada) o heartbeat
+volta a reescrever o JSON.
 """
 
 from __future__ import annotations
@@ -58,6 +66,7 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 if TYPE_CHECKING:
     from deile.runtime.registry import Registry, RegistryEntry
+    from deile.runtime.slots import SlotHandle
     from deile.runtime.status_server import StatusServer
 
 __all__ = [
@@ -183,6 +192,7 @@ class InstanceState:
 
         self._lock = threading.Lock()
         self._closed = False
+        self._slot: Optional["SlotHandle"] = None
 
         now = _utc_now_iso()
         self._state: Dict[str, Any] = {
@@ -227,6 +237,7 @@ class InstanceState:
                     registry_path=self._runtime_dir / "registry.json"
                 )
                 self._registry.register(self._build_registry_entry())
+                self._slot = self._registry.slot(self._instance_id)
             except Exception as exc:  # noqa: BLE001 — best-effort observability
                 logger.warning(
                     "Falha ao registrar no Registry (id=%s): %s",
@@ -241,6 +252,11 @@ class InstanceState:
             self._status_server is not None, self._registry is not None,
         )
 
+    @property
+    def slot(self) -> Optional["SlotHandle"]:
+        """Slot de heartbeat em ``registry.slots`` (None sem registry)."""
+        return self._slot
+
     # ── identidade ────────────────────────────────────────────────────────
 
     @property
@@ -357,8 +373,7 @@ class InstanceState:
         with self._lock:
             if self._closed:
                 return
-            self._state["last_heartbeat_at"] = _utc_now_iso()
-            self._flush_unlocked()
+            self._touch_unlocked(flush=False)
 
     # ── ações / stats ─────────────────────────────────────────────────────
 
@@ -397,18 +412,22 @@ class InstanceState:
         with self._lock:
             if self._closed:
                 return
+            if _same_action(self._state["current_action"], action):
+                # Mesma ação re-anunciada: preserva o ``started_at`` original
+                # e não reescreve o JSON — vale como heartbeat.
+                self._touch_unlocked(flush=False)
+                return
             self._state["current_action"] = action
-            self._state["last_heartbeat_at"] = _utc_now_iso()
-            self._flush_unlocked()
+            self._touch_unlocked(flush=True)
 
     def clear_action(self) -> None:
-        """Define ``current_action = None`` e faz flush."""
+        """Define ``current_action = None`` e faz flush (se havia ação)."""
         with self._lock:
             if self._closed:
                 return
+            changed = self._state["current_action"] is not None
             self._state["current_action"] = None
-            self._state["last_heartbeat_at"] = _utc_now_iso()
-            self._flush_unlocked()
+            self._touch_unlocked(flush=changed)
 
     def update_stats(
         self,
@@ -425,9 +444,13 @@ class InstanceState:
         Todos os parâmetros são keyword-only e default zero — chamadas
         parciais ficam concisas: ``update_stats(tool_calls=1)``.
         """
+        deltas = (tokens_in, tokens_out, cost_usd, turns, tool_calls, errors)
         with self._lock:
             if self._closed:
                 return
+            if not any(deltas):
+                self._touch_unlocked(flush=False)
+                return
             stats = self._state["stats"]
             stats["tokens_in"] = int(stats["tokens_in"]) + int(tokens_in)
             stats["tokens_out"] = int(stats["tokens_out"]) + int(tokens_out)
@@ -435,8 +458,7 @@ class InstanceState:
             stats["turns"] = int(stats["turns"]) + int(turns)
             stats["tool_calls"] = int(stats["tool_calls"]) + int(tool_calls)
             stats["errors"] = int(stats["errors"]) + int(errors)
-            self._state["last_heartbeat_at"] = _utc_now_iso()
-            self._flush_unlocked()
+            self._touch_unlocked(flush=True)
 
     # ── leitura ───────────────────────────────────────────────────────────
 
@@ -464,6 +486,7 @@ class InstanceState:
             if self._closed:
                 return
             self._closed = True
+            self._slot = None
             for candidate in (self._path, self._tmp_path):
                 try:
                     candidate.unlink()
@@ -531,6 +554,17 @@ class InstanceState:
 
     # ── internals ─────────────────────────────────────────────────────────
 
+    def _touch_unlocked(self, *, flush: bool) -> None:
+        """Atualiza ``last_heartbeat_at``; reescreve o JSON só se ``flush``.
+
+        Sem slot não há onde publicar o heartbeat barato, então cai no flush.
+        """
+        self._state["last_heartbeat_at"] = _utc_now_iso()
+        if flush or self._slot is None:
+            self._flush_unlocked()
+        else:
+            self._slot.beat()
+
     def _flush_unlocked(self) -> None:
         """Escreve o estado atomicamente. Caller deve segurar ``self._lock``.
 
@@ -548,6 +582,20 @@ class InstanceState:
                 "InstanceState flush failed (id=%s, path=%s): %s",
                 self._instance_id, self._path, exc,
             )
+            return
+        if self._slot is not None:
+            self._slot.beat()
+            self._slot.bump_state_version()
+
+
+def _same_action(current: Optional[Dict[str, Any]], new: Dict[str, Any]) -> bool:
+    """True quando ``new`` só repete ``current`` (ignora ``started_at``)."""
+    if current is None:
+        return False
+    return all(
+        current.get(key) == new.get(key)
+        for key in ("kind", "detail", "session_id", "model")
+    )
 
 
 # ── singleton ─────────────────────────────────────────────────────────────
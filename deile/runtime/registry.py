@@ -12,6 +12,14 @@ Operações:
   - :meth:`Registry.list` devolve entries; GC opcional remove entries cujo
     PID está morto OU cujo ``state_file`` sumiu.
 
+Heartbeat/liveness: o processo dono de uma entry também reivindica um slot
+em ``registry.slots`` (:mod:`deile.runtime.slots`) — heartbeats viram
+escritas in-place no slot e :meth:`Registry.heartbeats` lê a frota inteira
+sem lock. O ``registry.json`` só é reescrito em register/deregister/GC; o
+:meth:`Registry.list` relê o JSON apenas quando o arquivo mudou (chave
+``mtime_ns``/``size``/``ino``) e só toma o lock quando há órfãos para
+remover.
+
 Concorrência: ``fcntl.flock(LOCK_EX)`` em POSIX. Em Windows o lock vira
 no-op (best-effort) — mesma postura do :class:`StatusServer`. Registry
 ainda funciona em Windows, só perde a serialização entre processos
@@ -29,10 +37,12 @@ import sys
 from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from deile.runtime.instance_state import (_DEFAULT_RUNTIME_DIR,
                                           _ENV_RUNTIME_DIR, pid_alive)
+from deile.runtime.slots import (DEFAULT_SLOTS_FILENAME, SlotHandle,
+                                 SlotRecord, SlotTable)
 
 __all__ = [
     "Registry",
@@ -114,8 +124,9 @@ class Registry:
     """Gerencia ``<runtime_dir>/registry.json`` com lock atômico.
 
     Thread-safe via lock de arquivo (cobre também concorrência inter-processo).
-    Operações ``register``/``deregister``/``list`` fazem o ciclo completo
-    read-modify-write sob ``LOCK_EX``.
+    ``register``/``deregister`` fazem o ciclo completo read-modify-write sob
+    ``LOCK_EX``; :meth:`list` lê sem lock (o dump é ``os.replace`` atômico)
+    e reaproveita o parse anterior enquanto o arquivo não mudar.
 
     O GC dentro de :meth:`list` é opcional (``gc=True`` por padrão): remove
     entries cujo PID não está vivo OU cujo ``state_file`` não existe — cobre
@@ -128,11 +139,21 @@ class Registry:
         else:
             runtime_dir = _resolve_runtime_dir(None).resolve()
             self._path = runtime_dir / DEFAULT_REGISTRY_FILENAME
+        self._slots_path = self._path.parent / DEFAULT_SLOTS_FILENAME
+        self._slots: Optional[SlotTable] = None
+        self._slots_failed = False
+        self._handles: Dict[str, SlotHandle] = {}
+        self._cache_key: Optional[Tuple[int, int, int]] = None
+        self._cache_entries: List[RegistryEntry] = []
 
     @property
     def path(self) -> Path:
         return self._path
 
+    @property
+    def slots_path(self) -> Path:
+        return self._slots_path
+
     # ── operações públicas ────────────────────────────────────────────────
 
     def register(self, entry: RegistryEntry) -> None:
@@ -145,12 +166,22 @@ class Registry:
             entries = [e for e in entries if e.instance_id != entry.instance_id]
             entries.append(entry)
             self._dump_unlocked(entries)
+        # Só o próprio processo bate heartbeat no slot — entries de outros
+        # PIDs (registradas em nome de terceiros) ficam só no JSON.
+        if entry.pid == os.getpid():
+            self._claim_slot(entry)
 
     def deregister(self, instance_id: str) -> None:
         """Remove a entry de ``instance_id`` (no-op se ausente)."""
         instance_id = str(instance_id).strip()
         if not instance_id:
             return
+        handle = self._handles.pop(instance_id, None)
+        if handle is not None:
+            try:
+                handle.release()
+            except (OSError, ValueError) as exc:
+                logger.debug("Registry: release do slot de %s falhou: %s", instance_id, exc)
         # Evita criar registry.json vazio só para deregister algo que nunca
         # foi registrado.
         if not self._path.exists():
@@ -168,21 +199,83 @@ class Registry:
         Órfão = PID morto OU state_file ausente. Ambas as condições são
         proxies para "processo encerrou sem deregister limpo".
         """
-        if not self._path.exists():
-            return []
+        entries = self._load_cached()
+        if not gc:
+            return list(entries)
+        alive = [e for e in entries if self._is_alive(e)]
+        if len(alive) == len(entries):
+            return alive
+        # Há órfãos: relê sob lock (outro processo pode ter escrito nesse
+        # meio tempo) e reescreve — evita lista voltar a ter órfãos no
+        # próximo read.
         with self._locked():
             entries = self._load_unlocked()
-            if not gc:
-                return list(entries)
             alive = [e for e in entries if self._is_alive(e)]
             if len(alive) != len(entries):
-                # Reescreve se removeu alguma — evita lista voltar a ter
-                # órfãos no próximo read.
                 self._dump_unlocked(alive)
-            return alive
+        return alive
+
+    def slot(self, instance_id: str) -> Optional[SlotHandle]:
+        """Slot reivindicado por este processo para ``instance_id`` (ou None)."""
+        return self._handles.get(instance_id)
+
+    def heartbeats(self) -> Dict[str, SlotRecord]:
+        """Slots vivos por ``instance_id`` — leitura lock-free, sem JSON.
+
+        Vazio quando o arquivo de slots não existe ou é incompatível.
+        """
+        table = self._slot_table(create=False)
+        if table is None:
+            return {}
+        return {r.instance_id: r for r in table.read_all()}
 
     # ── internos ──────────────────────────────────────────────────────────
 
+    def _slot_table(self, *, create: bool) -> Optional[SlotTable]:
+        """Abre (lazy) o arquivo de slots; None se indisponível.
+
+        Falha ao criar desliga os slots para esta instance do Registry —
+        o JSON continua funcionando sozinho.
+        """
+        if self._slots is not None or self._slots_failed:
+            return self._slots
+        try:
+            self._slots = SlotTable(self._slots_path, create=create)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Registry: slots indisponíveis (%s): %s", self._slots_path, exc)
+            self._slots_failed = True
+        return self._slots
+
+    def _claim_slot(self, entry: RegistryEntry) -> None:
+        table = self._slot_table(create=True)
+        if table is None:
+            return
+        try:
+            handle = table.claim(instance_id=entry.instance_id, pid=entry.pid, role=entry.role)
+        except (OSError, ValueError) as exc:
+            logger.warning("Registry: claim de slot falhou (%s): %s", entry.instance_id, exc)
+            return
+        if handle is not None:
+            self._handles[entry.instance_id] = handle
+
+    def _load_cached(self) -> List[RegistryEntry]:
+        """Entries do ``registry.json`` sem lock, reparseando só se mudou."""
+        try:
+            st = self._path.stat()
+        except FileNotFoundError:
+            self._cache_key = None
+            return []
+        except OSError as exc:
+            logger.warning("Registry.stat(%s) falhou: %s", self._path, exc)
+            return []
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if key != self._cache_key:
+            self._cache_entries = self._load_unlocked()
+            self._cache_key = key
+        return self._cache_entries
+
     @staticmethod
     def _is_alive(entry: RegistryEntry) -> bool:
         """True quando o processo ainda parece vivo (PID + state_file)."""
@@ -0,0 +1,368 @@
+"""Tabela de slots mmap — heartbeat e liveness de instâncias sem reescrever JSON.
+
+Cada processo DEILE reivindica **um slot fixo** em ``<runtime_dir>/registry.slots``
+(arquivo mapeado em memória, compartilhado entre processos) no
+:meth:`Registry.register`. A partir daí:
+
+  - o heartbeat é uma escrita *in-place* de 8 bytes (timestamp em ns) no
+    próprio slot — nada de ``json.dumps`` + ``write_text`` + ``os.replace``
+    a cada 2 s por processo;
+  - ``state_version`` é incrementado a cada flush do state file JSON, então
+    um leitor sabe quando vale a pena reler o JSON daquela instância;
+  - leituras são lock-free no estilo *seqlock*: o dono do slot deixa
+    ``seq`` ímpar enquanto escreve e par ao terminar; o leitor descarta e
+    relê o slot quando ``seq`` está ímpar ou mudou durante a cópia.
+
+Cada slot tem um único escritor (o processo dono), então o heartbeat não
+precisa de lock. O ``flock`` do arquivo só é tomado para reivindicar ou
+liberar slots (register/deregister — eventos raros). Slots de PIDs mortos
+(``kill -9``) são reaproveitados na próxima reivindicação.
+
+Layout (little-endian)::
+
+    header (64 B): magic "DSLT" | u32 version | u32 slot_count | u32 slot_size
+                   | u32 high_water (slots já usados ao menos uma vez)
+    slot  (128 B): u64 seq | u32 pid | u32 flags | u64 heartbeat_ns
+                   | u64 started_ns | u64 state_version
+                   | 32 B instance_id | 16 B role | padding
+
+Ordem de memória: o protocolo depende de as stores do escritor ficarem
+visíveis na ordem do programa (garantido em x86; best-effort em ARM — o
+pior caso é um slot descartado e relido no próximo ciclo do painel).
+
+Ver decisão #36 (status server + registry) em ``docs/system_design/DECISOES.md``.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from deile.runtime.instance_state import pid_alive
+
+__all__ = [
+    "SlotTable",
+    "SlotHandle",
+    "SlotRecord",
+    "DEFAULT_SLOTS_FILENAME",
+    "DEFAULT_SLOT_COUNT",
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOTS_FILENAME = "registry.slots"
+DEFAULT_SLOT_COUNT = 256
+
+_MAGIC = b"DSLT"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIII")
+_HEADER_SIZE = 64
+_HIGH_WATER = struct.Struct("<I")
+_HIGH_WATER_OFFSET = _HEADER.size
+_SLOT_SIZE = 128
+_SEQ = struct.Struct("<Q")
+_U64 = struct.Struct("<Q")
+# pid, flags, heartbeat_ns, started_ns, state_version, instance_id, role
+_BODY = struct.Struct("<IIQQQ32s16s")
+_HEARTBEAT_OFFSET = 16
+_STATE_VERSION_OFFSET = 32
+_ID_MAX = 32
+_ROLE_MAX = 16
+# Tentativas por slot quando o leitor pega uma escrita em andamento.
+_READ_RETRIES = 16
+
+
+class SlotRecord(NamedTuple):
+    """Cópia consistente de um slot ocupado.
+
+    ``NamedTuple`` (e não dataclass) porque o painel monta dezenas destes a
+    cada refresh — a construção precisa ser barata.
+    """
+
+    index: int
+    pid: int
+    instance_id: str
+    role: str
+    heartbeat_ns: int
+    started_ns: int
+    state_version: int
+
+    @property
+    def heartbeat_at(self) -> float:
+        """Último heartbeat em segundos epoch (compatível com ``time.time()``)."""
+        return self.heartbeat_ns / 1e9
+
+    def age_s(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.heartbeat_at
+
+
+def _encode(text: str, size: int) -> bytes:
+    return text.encode("utf-8")[:size]
+
+
+def _decode(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("utf-8", errors="replace")
+
+
+def _slot_offset(index: int) -> int:
+    return _HEADER_SIZE + index * _SLOT_SIZE
+
+
+class SlotTable:
+    """Arquivo de slots mapeado em memória (um por ``runtime_dir``).
+
+    ``create=False`` abre só se o arquivo já existe (leitores como o painel
+    não devem criar nada); levanta ``FileNotFoundError`` caso contrário.
+    Header com magic/versão/tamanho incompatível levanta ``ValueError`` —
+    o caller desliga os slots e segue no caminho JSON.
+    """
+
+    def __init__(self, path: Path, *, slot_count: int = DEFAULT_SLOT_COUNT,
+                 create: bool = True) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        flags = os.O_RDWR | (os.O_CREAT if create else 0)
+        if create:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(str(self._path), flags, 0o600)
+        try:
+            with self._locked():
+                self._slot_count = self._init_header(slot_count)
+            self._mm = mmap.mmap(self._fd, _slot_offset(self._slot_count))
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def slot_count(self) -> int:
+        return self._slot_count
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        finally:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+
+    # ── escrita (dono do slot) ────────────────────────────────────────────
+
+    def claim(self, *, instance_id: str, pid: int, role: str,
+              started_ns: Optional[int] = None) -> Optional["SlotHandle"]:
+        """Reivindica um slot para ``instance_id``; ``None`` se a tabela lotou.
+
+        Idempotente por ``instance_id`` (re-register reaproveita o slot).
+        Slots livres ou de PID morto são elegíveis.
+        """
+        instance_id = _decode(_encode(instance_id, _ID_MAX))
+        now_ns = time.time_ns()
+        with self._locked():
+            free: Optional[int] = None
+            high_water = self._high_water()
+            for index in range(high_water):
+                record = self._read_slot(index)
+                if record is None:
+                    # Livre, ou seq ímpar de um escritor que morreu no meio:
+                    # o PID gravado (do dono antigo ou do novo) está morto.
+                    owner = self._pid_at(index)
+                    if free is None and (owner == 0 or not pid_alive(owner)):
+                        free = index
+                    continue
+                if record.instance_id == instance_id:
+                    free = index
+                    break
+                if free is None and not pid_alive(record.pid):
+                    free = index
+            if free is None and high_water < self._slot_count:
+                free = high_water
+                _HIGH_WATER.pack_into(self._mm, _HIGH_WATER_OFFSET, high_water + 1)
+            if free is None:
+                logger.warning("SlotTable %s lotada (%d slots)", self._path, self._slot_count)
+                return None
+            self._write_slot(
+                free, pid=pid, heartbeat_ns=now_ns,
+                started_ns=now_ns if started_ns is None else started_ns,
+                state_version=0, instance_id=instance_id, role=role,
+            )
+        return SlotHandle(self, free, instance_id)
+
+    def release(self, index: int, instance_id: str) -> None:
+        """Zera o slot se ainda pertencer a ``instance_id``."""
+        with self._locked():
+            record = self._read_slot(index)
+            if record is None or record.instance_id != instance_id:
+                return
+            self._write_slot(index, pid=0, heartbeat_ns=0, started_ns=0,
+                             state_version=0, instance_id="", role="")
+
+    def _write_slot(self, index: int, *, pid: int, heartbeat_ns: int,
+                    started_ns: int, state_version: int, instance_id: str,
+                    role: str) -> None:
+        off = _slot_offset(index)
+        seq = self._begin_write(off)
+        _BODY.pack_into(
+            self._mm, off + _SEQ.size, pid, 0, heartbeat_ns, started_ns,
+            state_version, _encode(instance_id, _ID_MAX), _encode(role, _ROLE_MAX),
+        )
+        _SEQ.pack_into(self._mm, off, seq + 1)
+
+    def _write_u64(self, index: int, field_offset: int, value: int) -> None:
+        off = _slot_offset(index)
+        seq = self._begin_write(off)
+        _U64.pack_into(self._mm, off + field_offset, value)
+        _SEQ.pack_into(self._mm, off, seq + 1)
+
+    def _begin_write(self, off: int) -> int:
+        """Marca o slot como "em escrita" (seq ímpar) e devolve o seq ímpar.
+
+        Um seq já ímpar (escritor morreu no meio) é mantido — a próxima
+        escrita completa volta a deixá-lo par.
+        """
+        seq = _SEQ.unpack_from(self._mm, off)[0] | 1
+        _SEQ.pack_into(self._mm, off, seq)
+        return seq
+
+    # ── leitura (lock-free) ───────────────────────────────────────────────
+
+    def read_all(self, *, alive_only: bool = True) -> List[SlotRecord]:
+        """Todos os slots ocupados, sem lock.
+
+        Copia os slots já usados de uma vez (um memcpy até o
+        ``high_water``) e só relê individualmente os que tinham ``seq``
+        ímpar ou que mudaram depois da cópia. ``alive_only`` descarta slots
+        de PID morto.
+        """
+        high_water = self._high_water()
+        snapshot = self._mm[_HEADER_SIZE:_slot_offset(high_water)]
+        out: List[SlotRecord] = []
+        for index in range(high_water):
+            base = index * _SLOT_SIZE
+            seq = _SEQ.unpack_from(snapshot, base)[0]
+            record: Optional[SlotRecord]
+            if seq & 1 or seq != _SEQ.unpack_from(self._mm, _slot_offset(index))[0]:
+                record = self._read_slot(index)
+            else:
+                record = self._parse(index, snapshot, base + _SEQ.size)
+            if record is None:
+                continue
+            if alive_only and not pid_alive(record.pid):
+                continue
+            out.append(record)
+        return out
+
+    def heartbeats(self) -> Dict[str, float]:
+        """Mapa ``instance_id`` → último heartbeat (segundos epoch)."""
+        return {r.instance_id: r.heartbeat_at for r in self.read_all()}
+
+    def _read_slot(self, index: int) -> Optional[SlotRecord]:
+        off = _slot_offset(index)
+        for _ in range(_READ_RETRIES):
+            before = _SEQ.unpack_from(self._mm, off)[0]
+            if before & 1:
+                continue
+            record = self._parse(index, self._mm, off + _SEQ.size)
+            if _SEQ.unpack_from(self._mm, off)[0] == before:
+                return record
+        return None
+
+    def _high_water(self) -> int:
+        return min(_HIGH_WATER.unpack_from(self._mm, _HIGH_WATER_OFFSET)[0], self._slot_count)
+
+    def _pid_at(self, index: int) -> int:
+        return struct.unpack_from("<I", self._mm, _slot_offset(index) + _SEQ.size)[0]
+
+    @staticmethod
+    def _parse(index: int, buf, offset: int) -> Optional[SlotRecord]:
+        pid, _flags, hb_ns, started_ns, version, raw_id, raw_role = _BODY.unpack_from(buf, offset)
+        if pid == 0:
+            return None
+        return SlotRecord(index, pid, _decode(raw_id), _decode(raw_role),
+                          hb_ns, started_ns, version)
+
+    # ── internos ──────────────────────────────────────────────────────────
+
+    def _init_header(self, slot_count: int) -> int:
+        """Valida o header existente ou inicializa um arquivo vazio."""
+        size = os.fstat(self._fd).st_size
+        if size >= _HEADER_SIZE:
+            raw = os.pread(self._fd, _HEADER.size, 0)
+            magic, version, count, slot_size = _HEADER.unpack(raw)
+            if magic != _MAGIC or version != _VERSION or slot_size != _SLOT_SIZE:
+                raise ValueError(f"SlotTable {self._path}: header incompatível")
+            if size < _slot_offset(count):
+                os.ftruncate(self._fd, _slot_offset(count))
+            return count
+        os.ftruncate(self._fd, _slot_offset(slot_count))
+        os.pwrite(self._fd, _HEADER.pack(_MAGIC, _VERSION, slot_count, _SLOT_SIZE), 0)
+        return slot_count
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """``flock`` no próprio arquivo de slots (POSIX) + lock de thread.
+
+        O lock de thread cobre threads do mesmo processo compartilhando
+        este objeto (``flock`` no mesmo fd não as exclui). Em Windows só
+        resta o lock de thread — mesma postura do :class:`Registry`.
+        """
+        with self._lock:
+            try:
+                import fcntl  # POSIX-only — import tardio
+            except ImportError:
+                yield
+                return
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class SlotHandle:
+    """Slot reivindicado por este processo; só o dono escreve nele."""
+
+    def __init__(self, table: SlotTable, index: int, instance_id: str) -> None:
+        self._table = table
+        self._index = index
+        self._instance_id = instance_id
+        self._released = False
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def beat(self, now_ns: Optional[int] = None) -> None:
+        """Heartbeat in-place: grava só o timestamp do slot."""
+        if self._released:
+            return
+        self._table._write_u64(
+            self._index, _HEARTBEAT_OFFSET, time.time_ns() if now_ns is None else now_ns,
+        )
+
+    def bump_state_version(self) -> None:
+        """Sinaliza aos leitores que o state file JSON foi reescrito."""
+        if self._released:
+            return
+        record = self._table._read_slot(self._index)
+        version = record.state_version + 1 if record is not None else 1
+        self._table._write_u64(self._index, _STATE_VERSION_OFFSET, version)
+
+    def read(self) -> Optional[SlotRecord]:
+        return self._table._read_slot(self._index)
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._table.release(self._index, self._instance_id)
@@ -0,0 +1,317 @@
+"""Compiled permission policy used by ``PermissionManager.check_permission``.
+
+The naive evaluation sorts every rule by priority and tries each rule's
+regex in turn, on every tool invocation. ``CompiledPolicy`` does that work
+once per rule-set version instead:
+
+- enabled rules are sorted by priority (stable, insertion order breaks
+  ties) and split into baseline / org chains (see ``PermissionManager``);
+- rules whose pattern starts with a literal path (``^/home/x/…``) are
+  indexed in a character trie, so a resource only tests the rules whose
+  literal prefix it actually starts with; ``.*suffix$`` rules get the same
+  treatment on the reversed string;
+- the remaining patterns of each chain are merged, per tool, into one
+  alternation regex. ``re.match`` on ``(a)|(b)|…`` returns the first
+  alternative that matches, which is exactly the highest-priority rule;
+- patterns that cannot be safely merged (backreferences, named groups,
+  inline flags) are still tried one by one, in priority order.
+
+``DecisionCache`` is the bounded LRU of final verdicts in front of it.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .permissions import PermissionRule
+
+_META = frozenset(".^$*+?{}[]|()")
+_OPTIONAL_SUFFIX = frozenset("*?{")
+# Constructs whose meaning changes (or that fail to compile) once the
+# pattern is wrapped in a group and concatenated with other patterns.
+_UNMERGEABLE = re.compile(r"\(\?P[<=]|\(\?[aiLmsux-]+[:)]|\\\d")
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+            if pattern[i + 1:i + 2] == "^":
+                i += 1
+            if pattern[i + 1:i + 2] == "]":
+                i += 1
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def _scan_literal(pattern: str, i: int) -> Tuple[str, int]:
+    """Reads literal characters from ``pattern[i:]``; returns (text, end)."""
+    out: List[str] = []
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            nxt = pattern[i + 1:i + 2]
+            if not nxt or nxt.isalnum():
+                break
+            lit, step = nxt, 2
+        elif c in _META:
+            break
+        else:
+            lit, step = c, 1
+        follow = pattern[i + step:i + step + 1]
+        if follow and follow in _OPTIONAL_SUFFIX:
+            break
+        out.append(lit)
+        i += step
+    return "".join(out), i
+
+
+def _anchor_end(pattern: str) -> int:
+    if pattern.startswith("^"):
+        return 1
+    if pattern.startswith("\\A"):
+        return 2
+    return 0
+
+
+def literal_prefix(pattern: str) -> str:
+    """Longest literal string every ``re.match`` of ``pattern`` starts with.
+
+    Rules are applied with ``match`` (anchored at position 0), so a leading
+    ``^``/``\\A`` is optional. Returns ``""`` when the pattern does not start
+    with a literal (``.*\\.git``, ``^(/etc|/usr)``, top-level ``|``).
+    """
+    if _has_top_level_alternation(pattern):
+        return ""
+    return _scan_literal(pattern, _anchor_end(pattern))[0]
+
+
+def literal_suffix(pattern: str) -> str:
+    """``LIT`` for patterns of the form ``^.*LIT$`` (e.g. ``.*\\.env$``), else ``""``."""
+    i = _anchor_end(pattern)
+    if not pattern.startswith(".*", i) or _has_top_level_alternation(pattern):
+        return ""
+    text, end = _scan_literal(pattern, i + 2)
+    if text and pattern[end:] in ("$", "\\Z"):
+        return text
+    return ""
+
+
+class PrefixTrie:
+    """Character trie mapping literal prefixes to rule positions."""
+
+    __slots__ = ("_root", "size")
+
+    def __init__(self) -> None:
+        # node = (children, positions)
+        self._root: Tuple[Dict[str, tuple], List[int]] = ({}, [])
+        self.size = 0
+
+    def insert(self, prefix: str, position: int) -> None:
+        node = self._root
+        for ch in prefix:
+            child = node[0].get(ch)
+            if child is None:
+                child = ({}, [])
+                node[0][ch] = child
+            node = child
+        node[1].append(position)
+        self.size += 1
+
+    def candidates(self, text: str) -> List[int]:
+        """Positions of every rule whose prefix is a prefix of ``text``."""
+        found: List[int] = []
+        node = self._root
+        for ch in text:
+            node = node[0].get(ch)
+            if node is None:
+                break
+            if node[1]:
+                found.extend(node[1])
+        return found
+
+
+class _Chain:
+    """First-match evaluator over one priority-ordered list of rules."""
+
+    __slots__ = ("rules", "combined", "group_pos", "individual")
+
+    def __init__(self, rules: Sequence["PermissionRule"], residual: Sequence[int]):
+        self.rules = rules
+        mergeable: List[int] = []
+        self.individual: List[int] = []
+        for pos in residual:
+            pattern = rules[pos].compiled_pattern.pattern
+            (self.individual if _UNMERGEABLE.search(pattern) else mergeable).append(pos)
+        self.combined: Optional[re.Pattern] = None
+        self.group_pos: Dict[int, int] = {}
+        if mergeable:
+            self._merge(mergeable)
+
+    def _merge(self, positions: List[int]) -> None:
+        parts = []
+        group = 1
+        for pos in positions:
+            compiled = self.rules[pos].compiled_pattern
+            self.group_pos[group] = pos
+            parts.append(f"({compiled.pattern})")
+            group += 1 + compiled.groups
+        try:
+            self.combined = re.compile("|".join(parts))
+        except (re.error, OverflowError, RecursionError):
+            self.combined = None
+            self.group_pos = {}
+            self.individual = sorted(self.individual + positions)
+
+    def first_match(self, resource: str, trie_hits: Sequence[int]) -> Optional["PermissionRule"]:
+        best = len(self.rules)
+        if self.combined is not None:
+            m = self.combined.match(resource)
+            if m is not None:
+                best = self._outer_position(m)
+        for pos in self.individual:
+            if pos >= best:
+                break
+            if self.rules[pos].compiled_pattern.match(resource):
+                best = pos
+                break
+        for pos in trie_hits:
+            if pos >= best:
+                break
+            if self.rules[pos].compiled_pattern.match(resource):
+                best = pos
+                break
+        return self.rules[best] if best < len(self.rules) else None
+
+    def _outer_position(self, m: "re.Match") -> int:
+        # Exactly one alternative participated. Its wrapper group closes
+        # after any inner group, so it is normally ``lastindex``.
+        pos = self.group_pos.get(m.lastindex or 0)
+        if pos is not None and m.start(m.lastindex) != -1:
+            return pos
+        for group, pos in self.group_pos.items():
+            if m.start(group) != -1:
+                return pos
+        return len(self.rules)  # pragma: no cover - a match implies a group
+
+
+class CompiledPolicy:
+    """Rule set compiled for fast ``(tool, resource)`` → matching-rule lookup."""
+
+    def __init__(self, rules: Sequence["PermissionRule"], org_prefix: str):
+        enabled = [r for r in rules if r.enabled and r.compiled_pattern is not None]
+        enabled.sort(key=lambda r: r.priority)
+        self.org_prefix = org_prefix
+        self.base = [r for r in enabled if not r.id.startswith(org_prefix)]
+        self.org = [r for r in enabled if r.id.startswith(org_prefix)]
+        self._tries: Dict[str, Tuple[PrefixTrie, PrefixTrie]] = {}
+        self._residual: Dict[str, List[int]] = {}
+        for name, chain in (("base", self.base), ("org", self.org)):
+            # ``^/path/...`` rules by prefix; ``.*suffix$`` rules by their
+            # reversed suffix. Both only yield candidates that still have to
+            # pass the rule's own regex.
+            prefixes, suffixes = PrefixTrie(), PrefixTrie()
+            residual: List[int] = []
+            for pos, rule in enumerate(chain):
+                pattern = rule.compiled_pattern.pattern
+                prefix = literal_prefix(pattern)
+                if prefix:
+                    prefixes.insert(prefix, pos)
+                    continue
+                suffix = literal_suffix(pattern)
+                if suffix:
+                    suffixes.insert(suffix[::-1], pos)
+                else:
+                    residual.append(pos)
+            self._tries[name] = (prefixes, suffixes)
+            self._residual[name] = residual
+        self._per_tool: Dict[str, Tuple[_Chain, _Chain]] = {}
+        self._lock = threading.Lock()
+
+    def _chains_for(self, tool_name: str) -> Tuple[_Chain, _Chain]:
+        chains = self._per_tool.get(tool_name)
+        if chains is None:
+            built = []
+            for name, rules in (("base", self.base), ("org", self.org)):
+                residual = [p for p in self._residual[name] if rules[p].applies_to_tool(tool_name)]
+                built.append(_Chain(rules, residual))
+            chains = (built[0], built[1])
+            with self._lock:
+                self._per_tool.setdefault(tool_name, chains)
+        return chains
+
+    def _first(self, chain: _Chain, name: str, tool_name: str,
+               resource: str) -> Optional["PermissionRule"]:
+        prefixes, suffixes = self._tries[name]
+        hits = prefixes.candidates(resource)
+        if suffixes.size:
+            hits += suffixes.candidates(resource[::-1])
+            if resource.endswith("\n"):  # ``$`` also matches before a final newline
+                hits += suffixes.candidates(resource[-2::-1])
+        if hits:
+            rules = chain.rules
+            hits = sorted(p for p in hits if rules[p].applies_to_tool(tool_name))
+        return chain.first_match(resource, hits)
+
+    def match(self, tool_name: str, resource: str
+              ) -> Tuple[Optional["PermissionRule"], Optional["PermissionRule"]]:
+        """Highest-priority matching ``(baseline_rule, org_rule)`` for a call."""
+        base_chain, org_chain = self._chains_for(tool_name)
+        base = self._first(base_chain, "base", tool_name, resource)
+        org = self._first(org_chain, "org", tool_name, resource) if self.org else None
+        return base, org
+
+
+class DecisionCache:
+    """Thread-safe bounded LRU of permission verdicts."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bool]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: bool) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -2,6 +2,7 @@
 
 import logging
 import re
+import weakref
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -9,6 +10,8 @@ from typing import Any, Dict, List, Optional
 
 import yaml
 
+from .permission_policy import CompiledPolicy, DecisionCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +33,16 @@ class ResourceType(Enum):
     SYSTEM = "system"
 
 
+# Fields whose in-place edit (e.g. ``rule.enabled = False`` from
+# ``/permissions disable``) invalidates the compiled policy of every
+# ``PermissionManager`` holding the rule. Only managers the rule was added to
+# are notified, so building a rule touches no manager's cache.
+_POLICY_FIELDS = frozenset({
+    "id", "resource_pattern", "compiled_pattern", "tool_names",
+    "permission_level", "priority", "enabled",
+})
+
+
 @dataclass
 class PermissionRule:
     """Single permission rule"""
@@ -52,6 +65,26 @@ class PermissionRule:
             logger.error(f"Invalid regex pattern in rule {self.id}: {e}")
             self.compiled_pattern = None
             
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in _POLICY_FIELDS:
+            for manager in list(self.__dict__.get("_managers", ())):
+                manager.invalidate_cache()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copies and pickles start detached from the managers of the original.
+        state = self.__dict__.copy()
+        state.pop("_managers", None)
+        return state
+
+    def _attach(self, manager: "PermissionManager") -> None:
+        self.__dict__.setdefault("_managers", weakref.WeakSet()).add(manager)
+
+    def _detach(self, manager: "PermissionManager") -> None:
+        managers = self.__dict__.get("_managers")
+        if managers is not None:
+            managers.discard(manager)
+
     def matches_resource(self, resource: str) -> bool:
         """Check if this rule matches the given resource"""
         if not self.compiled_pattern:
@@ -77,6 +110,13 @@ class PermissionManager:
         self.sandbox_enabled: bool = False
         self.config_path: Optional[Path] = config_path
 
+        # Compiled policy + verdict cache, rebuilt lazily whenever the rule
+        # set changes (see ``_policy_signature``).
+        self._rules_version = 0
+        self._policy: Optional[CompiledPolicy] = None
+        self._policy_signature: Optional[tuple] = None
+        self._decisions = DecisionCache()
+
         if config_path and config_path.exists():
             self.load_rules_from_config(config_path)
         else:
@@ -203,35 +243,58 @@ class PermissionManager:
 
         context = context or {}
 
-        # Find applicable rules, sorted by priority (lowest number = highest).
-        applicable_rules = [
-            rule for rule in sorted(self.rules, key=lambda r: r.priority)
-            if rule.enabled and rule.applies_to_tool(tool_name) and rule.matches_resource(resource)
-        ]
+        policy = self._compiled_policy()
+        cache_key = (tool_name, resource, action.lower())
+        cached = self._decisions.get(cache_key)
+        if cached is not None:
+            return cached
 
-        org_rules = [r for r in applicable_rules if r.id.startswith(self._ORG_RULE_PREFIX)]
-        base_rules = [r for r in applicable_rules if not r.id.startswith(self._ORG_RULE_PREFIX)]
+        # Highest-priority applicable rule (lowest number) of each layer.
+        base_rule, org_rule = policy.match(tool_name, resource)
 
         # Veredito baseline — semântica original (regras de org excluídas):
         # regra de maior prioridade vence, ou o default quando nenhuma casa.
-        if base_rules:
+        if base_rule is not None:
             base_allowed = self._action_allowed_by_permission(
-                action, base_rules[0].permission_level, context
+                action, base_rule.permission_level, context
             )
         else:
             base_allowed = self._check_default_permission(action)
 
         # Sem regras de org → comportamento byte-idêntico ao baseline.
-        if not org_rules:
-            return base_allowed
-
-        # Monotonicidade (issue #741): org só APERTA. Efetivo = baseline AND org;
-        # se o baseline já nega, nenhuma concessão de org o reverte.
-        org_allowed = self._action_allowed_by_permission(
-            action, org_rules[0].permission_level, context
-        )
-        return base_allowed and org_allowed
-    
+        if org_rule is None:
+            allowed = base_allowed
+        else:
+            # Monotonicidade (issue #741): org só APERTA. Efetivo = baseline AND org;
+            # se o baseline já nega, nenhuma concessão de org o reverte.
+            org_allowed = self._action_allowed_by_permission(
+                action, org_rule.permission_level, context
+            )
+            allowed = base_allowed and org_allowed
+
+        self._decisions.put(cache_key, allowed)
+        return allowed
+
+    def _compiled_policy(self) -> CompiledPolicy:
+        """Returns the compiled policy, rebuilding it if the rules changed.
+
+        ``_rules_version`` is bumped by ``add_rule`` / ``remove_rule`` and by
+        field changes on rules added through them; the signature also covers
+        list reassignment or growth and ``default_permission``.
+        """
+        signature = (self._rules_version, id(self.rules),
+                     len(self.rules), self.default_permission)
+        if self._policy is None or signature != self._policy_signature:
+            self._policy = CompiledPolicy(self.rules, self._ORG_RULE_PREFIX)
+            self._policy_signature = signature
+            self._decisions.clear()
+        return self._policy
+
+    def invalidate_cache(self) -> None:
+        """Drops the compiled policy and cached verdicts (e.g. after mutating
+        a rule's ``tool_names`` list in place)."""
+        self._rules_version += 1
+
     def _check_default_permission(self, action: str) -> bool:
         """Check if action is allowed by default permission"""
         return self._action_allowed_by_permission(action, self.default_permission, {})
@@ -274,17 +337,26 @@ class PermissionManager:
     def add_rule(self, rule: PermissionRule) -> None:
         """Add a permission rule"""
         # Remove existing rule with same ID
+        for old in self.rules:
+            if old.id == rule.id and old is not rule:
+                old._detach(self)
         self.rules = [r for r in self.rules if r.id != rule.id]
         self.rules.append(rule)
+        rule._attach(self)
+        self._rules_version += 1
         logger.debug(f"Added permission rule: {rule.id}")
     
     def remove_rule(self, rule_id: str) -> bool:
         """Remove a permission rule"""
         original_count = len(self.rules)
+        for rule in self.rules:
+            if rule.id == rule_id:
+                rule._detach(self)
         self.rules = [r for r in self.rules if r.id != rule_id]
         removed = len(self.rules) < original_count
         
         if removed:
+            self._rules_version += 1
             logger.debug(f"Removed permission rule: {rule_id}")
         return removed
     
@@ -421,7 +493,12 @@ class PermissionManager:
             "enabled_rules": len([r for r in self.rules if r.enabled]),
             "rules_by_priority": len(set(r.priority for r in self.rules)),
             "default_permission": self.default_permission.value,
-            "resource_types": list(set(r.resource_type.value for r in self.rules))
+            "resource_types": list(set(r.resource_type.value for r in self.rules)),
+            "decision_cache": {
+                "entries": len(self._decisions),
+                "hits": self._decisions.hits,
+                "misses": self._decisions.misses,
+            },
         }
 
 
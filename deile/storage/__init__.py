@@ -1,6 +1,6 @@
 """Storage module for DEILE - logs and embeddings."""
 
-from .embeddings import EmbeddingStore
+from .embeddings import EmbeddingStore, HashingEmbedder, VectorIndex
 from .logs import get_logger
 
-__all__ = ["get_logger", "EmbeddingStore"]
+__all__ = ["get_logger", "EmbeddingStore", "HashingEmbedder", "VectorIndex"]
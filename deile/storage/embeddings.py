@@ -1,22 +1,394 @@
-"""Stub EmbeddingStore - kept lightweight; embedding pipeline is opt-in."""
+"""Embeddings locais e índice vetorial (flat/IVF) para a camada de memória.
 
-from typing import Any, Iterable, List, Optional
+Nada aqui depende de rede ou de modelos baixados: o embedder padrão é um
+vetorizador *hashing-trick* (palavras + trigramas de caracteres projetados
+num espaço de dimensão fixa), determinístico entre processos. Qualquer
+callable ``Sequence[str] -> np.ndarray`` com atributos ``dim`` e ``name``
+pode substituí-lo (ex.: um sentence-transformer local).
+
+``VectorIndex`` guarda vetores normalizados numa matriz contígua e faz busca
+exata (flat) por produto interno; acima de ``ivf_threshold`` vetores treina
+um IVF (k-means esférico) e passa a sondar só as ``nprobe`` listas mais
+próximas. O índice é um artefato derivado: persiste em ``.npz`` e quem o usa
+reconcilia com a fonte de verdade (SQLite/JSONL) no carregamento.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import math
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import (Any, Dict, Iterable, Iterator, List, Optional, Protocol,
+                    Sequence, Tuple)
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokens de palavra em minúsculas (mesma noção de token do FTS5 unicode61)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class EmbeddingFunction(Protocol):
+    """Contrato de um embedder plugável."""
+
+    dim: int
+    name: str
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        ...
+
+
+class HashingEmbedder:
+    """Vetorizador hashing-trick: sem vocabulário, sem treino, sem estado.
+
+    Cada palavra e cada trigrama de caracteres (com marcadores de borda)
+    vira um índice ``crc32(feature) % dim`` com sinal derivado do próprio
+    hash, o que mantém colisões com média zero. TF sublinear + normalização
+    L2 tornam o produto interno igual ao cosseno. Trigramas dão tolerância
+    a flexões e erros de digitação que o BM25 por token não pega.
+    """
+
+    def __init__(self, dim: int = 384, char_ngrams: int = 3,
+                 word_weight: float = 1.0, ngram_weight: float = 0.5):
+        if dim <= 0:
+            raise ValueError("dim deve ser positivo")
+        self.dim = int(dim)
+        self.char_ngrams = int(char_ngrams)
+        self.word_weight = float(word_weight)
+        self.ngram_weight = float(ngram_weight)
+        self.name = f"hashing-v1:{self.dim}:{self.char_ngrams}"
+
+    def _features(self, text: str) -> Dict[int, float]:
+        counts: Dict[int, float] = {}
+        n = self.char_ngrams
+        for tok in tokenize(text):
+            feats = [(tok, self.word_weight)]
+            if n > 0 and len(tok) >= n:
+                padded = f"<{tok}>"
+                feats.extend(
+                    (padded[i:i + n], self.ngram_weight)
+                    for i in range(len(padded) - n + 1)
+                )
+            for feat, weight in feats:
+                h = zlib.crc32(feat.encode("utf-8"))
+                idx = h % self.dim
+                sign = 1.0 if (h >> 31) & 1 else -1.0
+                counts[idx] = counts.get(idx, 0.0) + sign * weight
+        return counts
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for idx, val in self._features(text or "").items():
+                out[row, idx] = math.copysign(math.log1p(abs(val)), val)
+        return normalize_rows(out)
+
+
+def normalize_rows(mat: np.ndarray) -> np.ndarray:
+    """Normaliza linhas para norma L2 unitária (linhas nulas ficam nulas)."""
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (mat / norms).astype(np.float32, copy=False)
+
+
+class VectorIndex:
+    """Índice de vetores normalizados com busca flat e IVF opcional.
+
+    - ``add``/``remove`` são upsert/delete por id (delete faz swap com a
+      última linha, mantendo a matriz densa).
+    - Com ``len(self) >= ivf_threshold`` o IVF é (re)treinado de forma
+      preguiçosa na próxima busca e sempre que o índice dobra de tamanho
+      desde o último treino; inserções entre treinos são atribuídas ao
+      centróide mais próximo.
+    - ``search(..., candidates=ids)`` restringe a busca a um subconjunto
+      (ex.: episódios de uma sessão) e sempre é exata.
+    """
+
+    def __init__(self, dim: int, *, ivf_threshold: int = 200_000,
+                 nlist: Optional[int] = None, nprobe: int = 32,
+                 kmeans_iters: int = 8, seed: int = 0):
+        self.dim = int(dim)
+        self.ivf_threshold = int(ivf_threshold)
+        self.nlist = nlist
+        self.nprobe = int(nprobe)
+        self.kmeans_iters = int(kmeans_iters)
+        self.seed = int(seed)
+        self.clear()
+
+    def clear(self) -> None:
+        self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._trained_at = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._pos
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    @property
+    def is_ivf(self) -> bool:
+        return self._centroids is not None
+
+    def _reserve(self, extra: int) -> None:
+        need = self._size + extra
+        cap = self._vectors.shape[0]
+        if need <= cap:
+            return
+        new_cap = max(need, cap * 2, 64)
+        grown = np.zeros((new_cap, self.dim), dtype=np.float32)
+        grown[:self._size] = self._vectors[:self._size]
+        self._vectors = grown
+        assign = np.full(new_cap, -1, dtype=np.int32)
+        assign[:self._size] = self._assign[:self._size]
+        self._assign = assign
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(ids) != vectors.shape[0]:
+            raise ValueError("ids e vetores com tamanhos diferentes")
+        self._reserve(len(ids))
+        rows = np.empty(len(ids), dtype=np.int64)
+        for i, item_id in enumerate(ids):
+            row = self._pos.get(item_id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._ids.append(item_id)
+                self._pos[item_id] = row
+            rows[i] = row
+        self._vectors[rows] = vectors
+        if self._centroids is not None and len(rows):
+            self._assign[rows] = np.argmax(vectors @ self._centroids.T, axis=1)
+        else:
+            self._assign[rows] = -1
+
+    def remove(self, ids: Iterable[str]) -> int:
+        removed = 0
+        for item_id in ids:
+            row = self._pos.pop(item_id, None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                moved = self._ids[last]
+                self._vectors[row] = self._vectors[last]
+                self._assign[row] = self._assign[last]
+                self._ids[row] = moved
+                self._pos[moved] = row
+            self._ids.pop()
+            self._size -= 1
+            removed += 1
+        return removed
+
+    # ------------------------------------------------------------------ IVF
+
+    def train(self) -> None:
+        """Treina centróides IVF (k-means esférico numa amostra)."""
+        n = self._size
+        if n == 0:
+            return
+        nlist = self.nlist or max(1, int(math.sqrt(n)))
+        nlist = min(nlist, n)
+        rng = np.random.default_rng(self.seed)
+        data = self._vectors[:n]
+        sample_n = min(n, max(nlist * 64, 10_000))
+        sample = data[rng.choice(n, size=sample_n, replace=False)]
+        centroids = sample[rng.choice(sample_n, size=nlist, replace=False)].copy()
+        for _ in range(self.kmeans_iters):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids = normalize_rows(centroids)
+        self._centroids = centroids
+        assign = np.empty(n, dtype=np.int32)
+        for start in range(0, n, 65_536):
+            block = data[start:start + 65_536]
+            assign[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        self._assign[:n] = assign
+        self._trained_at = n
+
+    def _maybe_train(self) -> None:
+        if self._size < self.ivf_threshold:
+            return
+        if self._centroids is None or self._size >= 2 * self._trained_at:
+            self.train()
+
+    # --------------------------------------------------------------- search
+
+    def search(self, query: np.ndarray, top_k: int = 10, *,
+               candidates: Optional[Iterable[str]] = None,
+               nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Top-k por similaridade de cosseno: ``[(id, score), ...]``."""
+        if self._size == 0 or top_k <= 0:
+            return []
+        q = np.asarray(query, dtype=np.float32).reshape(-1)
+        if candidates is not None:
+            rows = np.fromiter(
+                (self._pos[c] for c in candidates if c in self._pos),
+                dtype=np.int64,
+            )
+        else:
+            self._maybe_train()
+            rows = None
+            if self._centroids is not None:
+                probes = min(nprobe or self.nprobe, len(self._centroids))
+                near = np.argpartition(-(self._centroids @ q), probes - 1)[:probes]
+                rows = np.flatnonzero(np.isin(self._assign[:self._size], near))
+        if rows is None:
+            scores = self._vectors[:self._size] @ q
+            rows_view = None
+        else:
+            if rows.size == 0:
+                return []
+            scores = self._vectors[rows] @ q
+            rows_view = rows
+        k = min(top_k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        out = []
+        for i in top:
+            row = int(i if rows_view is None else rows_view[i])
+            out.append((self._ids[row], float(scores[i])))
+        return out
+
+    # ---------------------------------------------------------- persistence
+
+    def save(self, path: Path, *, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Grava atomicamente em ``path`` (tmp + ``os.replace``)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "vectors": self._vectors[:self._size],
+            "ids": np.array(self._ids, dtype=str),
+            "assign": self._assign[:self._size],
+            "meta": np.array(json.dumps({
+                "dim": self.dim,
+                "trained_at": self._trained_at,
+                **(meta or {}),
+            })),
+        }
+        if self._centroids is not None:
+            payload["centroids"] = self._centroids
+        buf = io.BytesIO()
+        np.savez(buf, **payload)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(buf.getbuffer())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, **kwargs: Any) -> Tuple["VectorIndex", Dict[str, Any]]:
+        """Carrega um índice salvo. Levanta ``OSError``/``ValueError`` se inválido."""
+        with np.load(Path(path), allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            index = cls(int(meta["dim"]), **kwargs)
+            vectors = np.asarray(data["vectors"], dtype=np.float32)
+            ids = [str(x) for x in data["ids"]]
+            index.add(ids, vectors)
+            if "centroids" in data.files:
+                index._centroids = np.asarray(data["centroids"], dtype=np.float32)
+                index._assign[:index._size] = data["assign"]
+                index._trained_at = int(meta.get("trained_at", index._size))
+        return index, meta
+
+
+def load_or_create_index(path: Path, embedder: EmbeddingFunction,
+                         **kwargs: Any) -> VectorIndex:
+    """Carrega o índice em ``path`` se foi gerado pelo mesmo embedder.
+
+    Arquivo ausente, corrompido ou de outro embedder (``name`` diferente)
+    resulta num índice vazio — o chamador reconcilia com a fonte de verdade.
+    """
+    path = Path(path)
+    if path.exists():
+        try:
+            index, meta = VectorIndex.load(path, **kwargs)
+            if meta.get("embedder") == embedder.name and index.dim == embedder.dim:
+                return index
+            logger.info("Índice vetorial %s de outro embedder; reconstruindo", path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Índice vetorial %s ilegível (%s); reconstruindo", path, e)
+    return VectorIndex(embedder.dim, **kwargs)
 
 
 class EmbeddingStore:
-    """No-op embedding store. Replace with a real implementation when needed."""
+    """Store de textos com busca por similaridade sobre ``VectorIndex``.
+
+    Mantém a API histórica (``add``/``search``/``clear``/iteração) e, se
+    ``path`` for informado, persiste textos + vetores num único ``.npz``.
+    """
 
-    def __init__(self, *_: Any, **__: Any) -> None:
-        self._items: list[dict[str, Any]] = []
+    def __init__(self, embedder: Optional[EmbeddingFunction] = None,
+                 path: Optional[Path] = None, **index_kwargs: Any) -> None:
+        self.embedder: EmbeddingFunction = embedder or HashingEmbedder()
+        self.path = Path(path) if path else None
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._next_id = 0
+        self._index = VectorIndex(self.embedder.dim, **index_kwargs)
+        if self.path is not None and self.path.exists():
+            self._load(index_kwargs)
 
-    def add(self, text: str, metadata: Optional[dict] = None) -> None:
-        self._items.append({"text": text, "metadata": metadata or {}})
+    def _load(self, index_kwargs: Dict[str, Any]) -> None:
+        try:
+            index, meta = VectorIndex.load(self.path, **index_kwargs)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("EmbeddingStore %s ilegível (%s); iniciando vazio", self.path, e)
+            return
+        items = meta.get("items", {})
+        if meta.get("embedder") == self.embedder.name:
+            self._index = index
+        else:
+            self._index.add(list(items), self.embedder([i["text"] for i in items.values()]))
+        self._items = items
+        self._next_id = int(meta.get("next_id", len(items)))
 
-    def search(self, _query: str, top_k: int = 5) -> List[dict[str, Any]]:
-        return self._items[:top_k]
+    def add(self, text: str, metadata: Optional[dict] = None) -> str:
+        item_id = str(self._next_id)
+        self._next_id += 1
+        self._items[item_id] = {"text": text, "metadata": metadata or {}}
+        self._index.add([item_id], self.embedder([text]))
+        return item_id
+
+    def search(self, query: str, top_k: int = 5) -> List[dict[str, Any]]:
+        hits = self._index.search(self.embedder([query])[0], top_k)
+        return [{**self._items[i], "id": i, "score": s} for i, s in hits]
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self._index.save(self.path, meta={
+            "embedder": self.embedder.name,
+            "items": self._items,
+            "next_id": self._next_id,
+        })
 
     def clear(self) -> None:
         self._items.clear()
+        self._index.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
 
-    def __iter__(self) -> Iterable[dict[str, Any]]:
-        return iter(self._items)
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(list(self._items.values()))
@@ -0,0 +1,236 @@
+"""Pipeline de logging não-bloqueante: ``QueueHandler`` → fila limitada → ``QueueListener``.
+
+Sem este pipeline o logger ``deile`` tinha o
+:class:`~deile.storage.log_rotation.HourlyDailyDirRotatingHandler` pendurado
+direto: cada ``logger.info`` fazia ``write()`` + ``flush()`` síncronos na
+thread do event loop, e a virada de hora (rename, append de colisão,
+compressão, ``_purge_old_dirs``) rodava inline na coroutine que por acaso
+logou naquele instante.
+
+Agora o caller só formata a mensagem e enfileira (O(1), sem I/O). Uma
+thread dedicada (:class:`LogPipeline`) drena a fila e entrega aos handlers
+reais — rotação e purge acontecem nela.
+
+Política de descarte (fila cheia), explícita e contabilizada:
+
+- ``drop_newest`` (default): descarta o record que está chegando.
+- ``drop_oldest``: descarta o record mais antigo da fila para abrir vaga.
+- ``block``: espera vaga por até ``block_timeout_s`` e só então descarta.
+
+Records ``WARNING`` ou acima nunca são descartados de imediato: mesmo nas
+políticas ``drop_*`` eles esperam vaga como em ``block``. Descartes são
+contados (total e por nível, ver :meth:`BoundedQueueHandler.stats`) e o
+listener emite um ``WARNING`` resumindo quantos records se perderam assim
+que a fila volta a andar.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+__all__ = [
+    "BoundedQueueHandler",
+    "LogPipeline",
+    "DROP_NEWEST",
+    "DROP_OLDEST",
+    "BLOCK",
+    "DROP_POLICIES",
+    "DEFAULT_QUEUE_SIZE",
+]
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+DROP_POLICIES = frozenset({DROP_NEWEST, DROP_OLDEST, BLOCK})
+
+DEFAULT_QUEUE_SIZE = 10_000
+_DEFAULT_BLOCK_TIMEOUT_S = 0.5
+# A partir deste nível o record nunca é descartado sem antes esperar vaga.
+_PROTECTED_LEVEL = logging.WARNING
+
+
+class BoundedQueueHandler(QueueHandler):
+    """``QueueHandler`` sobre uma ``queue.Queue`` limitada, com contadores.
+
+    Parameters
+    ----------
+    queue_size
+        Capacidade da fila (records). ``<= 0`` é rejeitado — fila
+        ilimitada é justamente o que a política de descarte evita.
+    drop_policy
+        ``drop_newest``, ``drop_oldest`` ou ``block``.
+    block_timeout_s
+        Espera máxima por vaga em ``block`` (e para records protegidos).
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 drop_policy: str = DROP_NEWEST,
+                 block_timeout_s: float = _DEFAULT_BLOCK_TIMEOUT_S) -> None:
+        if queue_size <= 0:
+            raise ValueError(f"queue_size deve ser > 0, recebido {queue_size}")
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(
+                f"drop_policy inválida: {drop_policy!r}. Esperado um de {sorted(DROP_POLICIES)}"
+            )
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.queue_size = int(queue_size)
+        self.drop_policy = drop_policy
+        self.block_timeout_s = float(block_timeout_s)
+        self._stats_lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.dropped_by_level: Dict[str, int] = {}
+        self._unreported_drops = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._enqueue_full(record)
+            return
+        self._count(enqueued=record)
+
+    def _enqueue_full(self, record: logging.LogRecord) -> None:
+        if self.drop_policy == BLOCK or record.levelno >= _PROTECTED_LEVEL:
+            try:
+                self.queue.put(record, timeout=self.block_timeout_s)
+            except queue.Full:
+                self._count(dropped=record)
+            else:
+                self._count(enqueued=record)
+            return
+        if self.drop_policy == DROP_OLDEST:
+            try:
+                victim = self.queue.get_nowait()
+            except queue.Empty:
+                victim = record  # a fila esvaziou nesse meio tempo
+            else:
+                if victim is QueueListener._sentinel:
+                    # Listener parando: o sentinela não pode sumir da fila.
+                    self.queue.put_nowait(victim)
+                    self._count(dropped=record)
+                    return
+                self._count(dropped=victim)
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self._count(dropped=record)
+            else:
+                self._count(enqueued=record)
+            return
+        self._count(dropped=record)
+
+    def _count(self, *, enqueued: Optional[logging.LogRecord] = None,
+               dropped: Optional[logging.LogRecord] = None) -> None:
+        with self._stats_lock:
+            if enqueued is not None:
+                self.enqueued += 1
+            if dropped is not None:
+                self.dropped += 1
+                self._unreported_drops += 1
+                level = dropped.levelname
+                self.dropped_by_level[level] = self.dropped_by_level.get(level, 0) + 1
+
+    def take_unreported_drops(self) -> int:
+        """Descartes desde a última chamada (usado pelo aviso do listener)."""
+        with self._stats_lock:
+            count, self._unreported_drops = self._unreported_drops, 0
+            return count
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "dropped_by_level": dict(self.dropped_by_level),
+                "queue_depth": self.queue.qsize(),
+                "queue_size": self.queue_size,
+                "drop_policy": self.drop_policy,
+            }
+
+
+class _ReportingListener(QueueListener):
+    """``QueueListener`` que anuncia descartes antes do próximo record."""
+
+    def __init__(self, source: BoundedQueueHandler, *handlers: logging.Handler) -> None:
+        super().__init__(source.queue, *handlers, respect_handler_level=True)
+        self._source = source
+
+    def handle(self, record: logging.LogRecord) -> None:
+        dropped = self._source.take_unreported_drops()
+        if dropped:
+            super().handle(logging.makeLogRecord({
+                "name": record.name.split(".", 1)[0],
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": (f"log queue full: dropped {dropped} record(s) "
+                        f"(policy={self._source.drop_policy})"),
+            }))
+        super().handle(record)
+
+    def enqueue_sentinel(self) -> None:
+        # O default usa ``put_nowait`` e estoura com a fila cheia; aqui a
+        # thread do listener está drenando, então esperar é seguro.
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    """Fila limitada + thread listener na frente de ``handlers``.
+
+    Uso::
+
+        pipeline = LogPipeline(file_handler, queue_size=10_000)
+        pipeline.start()
+        logger.addHandler(pipeline.handler)
+        ...
+        pipeline.stop()   # drena a fila e faz join da thread
+
+    ``stop`` é idempotente; o bootstrap registra via ``atexit`` para o
+    que ainda estiver na fila chegar ao disco no shutdown.
+    """
+
+    def __init__(self, *handlers: logging.Handler,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 drop_policy: str = DROP_NEWEST,
+                 block_timeout_s: float = _DEFAULT_BLOCK_TIMEOUT_S) -> None:
+        if not handlers:
+            raise ValueError("LogPipeline precisa de ao menos um handler")
+        self.handlers = handlers
+        self.handler = BoundedQueueHandler(
+            queue_size=queue_size, drop_policy=drop_policy,
+            block_timeout_s=block_timeout_s,
+        )
+        self._listener = _ReportingListener(self.handler, *handlers)
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            self._listener.start()
+            self._running = True
+
+    def stop(self) -> None:
+        """Drena o que está na fila, para a thread e faz flush dos handlers."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._listener.stop()
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:  # noqa: BLE001 — shutdown não levanta
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.handler.stats(), "running": self._running}
@@ -39,6 +39,10 @@ Como funciona o rollover:
    isso o rename quebra na primeira virada de hora do dia.
 5. GC silencioso (``_purge_old_dirs``) remove subpastas diárias mais
    velhas que ``retention_days``.
+6. Opcional (``compress=True``): a hora arquivada vira ``HH.log.gz`` em
+   vez de ``HH.log``. Com o pipeline de :mod:`deile.storage.log_queue`
+   tudo isso (rename, compressão, purge) roda na thread do listener, fora
+   do event loop.
 
 Trade-offs explícitos:
 
@@ -58,6 +62,7 @@ Trade-offs explícitos:
 
 from __future__ import annotations
 
+import gzip
 import os
 import shutil
 from datetime import datetime, timedelta
@@ -73,7 +78,7 @@ _DEFAULT_RETENTION_DAYS = 30
 import re as _re  # noqa: E402 — local-only
 
 _DAILY_DIR_RE = _re.compile(r"^\d{4}-\d{2}-\d{2}$")
-_HOUR_FILE_RE = _re.compile(r"^\d{2}\.log$")
+_HOUR_FILE_RE = _re.compile(r"^\d{2}\.log(\.gz)?$")
 
 
 class HourlyDailyDirRotatingHandler(TimedRotatingFileHandler):
@@ -90,6 +95,9 @@ class HourlyDailyDirRotatingHandler(TimedRotatingFileHandler):
         Idade máxima (em dias) das subpastas diárias antes do GC. ``0``
         ou negativo desliga o GC (todas as subpastas mantidas — útil
         em testes ou perícia).
+    compress
+        Arquiva cada hora como ``HH.log.gz`` (gzip). Colisão de hora vira
+        um membro gzip a mais no mesmo arquivo — ``gzip.open`` lê tudo.
     encoding, delay, utc, atTime, errors
         Repassados para :class:`TimedRotatingFileHandler`.
     """
@@ -103,6 +111,7 @@ class HourlyDailyDirRotatingHandler(TimedRotatingFileHandler):
         utc: bool = False,
         atTime=None,
         errors: Optional[str] = None,
+        compress: bool = False,
     ) -> None:
         super().__init__(
             filename=filename,
@@ -116,6 +125,7 @@ class HourlyDailyDirRotatingHandler(TimedRotatingFileHandler):
             errors=errors,
         )
         self.retention_days = int(retention_days)
+        self.compress = bool(compress)
         self._logs_root = Path(self.baseFilename).parent
         # `namer` reescreve o filename do rollover; `rotator` faz o
         # mkdir + replace seguro. Anexar AQUI (não inline em emit) é o
@@ -163,7 +173,9 @@ class HourlyDailyDirRotatingHandler(TimedRotatingFileHandler):
         try:
             dest_path = Path(dest)
             dest_path.parent.mkdir(parents=True, exist_ok=True)
-            if dest_path.exists():
+            if self.compress:
+                self._gzip_into(source, dest_path.with_name(dest_path.name + ".gz"))
+            elif dest_path.exists():
                 # Colisão rara: append source no final do dest e remove
                 # source. Preserva a ordem cronológica.
                 with open(source, "rb") as src_fh, open(dest, "ab") as dest_fh:
@@ -179,6 +191,31 @@ class HourlyDailyDirRotatingHandler(TimedRotatingFileHandler):
         # GC oportunista após cada rollover (1×/hora) — barato.
         self._purge_old_dirs()
 
+    @staticmethod
+    def _gzip_into(source: str, gz_path: Path) -> None:
+        """Comprime ``source`` para ``gz_path`` e remove ``source``.
+
+        Destino novo: escreve em ``.tmp`` + ``os.replace`` (nunca deixa um
+        ``.gz`` truncado). Destino existente (colisão): anexa um membro
+        gzip novo ao final, preservando a ordem cronológica.
+        """
+        if gz_path.exists():
+            with open(source, "rb") as src_fh, gzip.open(gz_path, "ab") as dest_fh:
+                shutil.copyfileobj(src_fh, dest_fh)
+        else:
+            tmp = gz_path.with_name(gz_path.name + ".tmp")
+            try:
+                with open(source, "rb") as src_fh, gzip.open(tmp, "wb") as dest_fh:
+                    shutil.copyfileobj(src_fh, dest_fh)
+                os.replace(tmp, gz_path)
+            except OSError:
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
+                raise
+        os.unlink(source)
+
     # ------------------------------------------------------------------
     # GC de subpastas diárias antigas
     # ------------------------------------------------------------------
@@ -220,7 +257,8 @@ class HourlyDailyDirRotatingHandler(TimedRotatingFileHandler):
 def list_archived_log_files(logs_root: Path) -> List[Path]:
     """Retorna paths de arquivos rotacionados (ordem cronológica asc).
 
-    Inclui ``<logs_root>/YYYY-MM-DD/HH.log`` mas NÃO inclui o
+    Inclui ``<logs_root>/YYYY-MM-DD/HH.log`` (e ``HH.log.gz`` quando a
+    compressão está ligada) mas NÃO inclui o
     ``deile.log`` corrente no raiz. Útil pra ferramentas que precisam
     listar/abrir logs históricos.
     """
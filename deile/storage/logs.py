@@ -1,13 +1,16 @@
 """Logger utilities for DEILE."""
 
+import atexit
 import logging
 import os
 import sys
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 
 _LOGGER_NAME = "deile"
 _initialized = False
 _encrypt_logs_warned = False
+_pipeline = None  # LogPipeline ativo (None em pytest / antes do init)
 
 
 def _is_running_under_pytest() -> bool:
@@ -43,6 +46,53 @@ def _is_encrypt_logs_enabled() -> bool:
         return False
 
 
+def _log_pipeline_options() -> Tuple[int, str, bool]:
+    """(queue_size, drop_policy, compress_archives) do profile ativo.
+
+    Mesmo padrão de :func:`_is_encrypt_logs_enabled`: qualquer falha ao
+    carregar settings cai nos defaults do pipeline.
+    """
+    from .log_queue import DEFAULT_QUEUE_SIZE, DROP_NEWEST  # noqa: PLC0415
+
+    try:
+        from ..config.settings import get_settings  # noqa: PLC0415
+
+        settings = get_settings()
+        return (int(settings.log_queue_size), str(settings.log_drop_policy),
+                bool(settings.log_compress_archives))
+    except Exception:  # pragma: no cover — guard against import errors at startup
+        return DEFAULT_QUEUE_SIZE, DROP_NEWEST, False
+
+
+def _start_pipeline(target: logging.Handler, queue_size: int,
+                    drop_policy: str) -> logging.Handler:
+    """Põe ``target`` atrás de um :class:`LogPipeline` e devolve o handler da fila.
+
+    O caller (event loop incluso) só enfileira; write, rotação horária e
+    purge rodam na thread do listener. ``atexit`` drena a fila antes do
+    ``logging.shutdown``. Config inválida cai no handler síncrono.
+    """
+    global _pipeline
+    from .log_queue import LogPipeline  # noqa: PLC0415
+
+    try:
+        pipeline = LogPipeline(target, queue_size=queue_size, drop_policy=drop_policy)
+    except ValueError:
+        return target
+    pipeline.start()
+    atexit.register(pipeline.stop)
+    _pipeline = pipeline
+    return pipeline.handler
+
+
+def log_pipeline_stats() -> Optional[Dict[str, Any]]:
+    """Contadores do pipeline de logging (enfileirados, descartes, fila).
+
+    ``None`` quando o logger não usa o pipeline (pytest, init pendente).
+    """
+    return _pipeline.stats() if _pipeline is not None else None
+
+
 def _ensure_initialized() -> None:
     global _initialized, _encrypt_logs_warned
     if _initialized:
@@ -55,6 +105,7 @@ def _ensure_initialized() -> None:
             # inspecionar logs devem usar a fixture `caplog` do pytest.
             handler: logging.Handler = logging.NullHandler()
         else:
+            queue_size, drop_policy, compress = _log_pipeline_options()
             log_dir = Path.home() / ".deile" / "logs"
             try:
                 log_dir.mkdir(parents=True, exist_ok=True)
@@ -68,6 +119,7 @@ def _ensure_initialized() -> None:
                 handler = HourlyDailyDirRotatingHandler(
                     filename=str(log_dir / "deile.log"),
                     encoding="utf-8",
+                    compress=compress,
                 )
             except OSError:
                 handler = logging.StreamHandler()
@@ -82,6 +134,10 @@ def _ensure_initialized() -> None:
                 "%(asctime)s [%(process)d] [%(levelname)s] %(name)s: %(message)s"
             )
         )
+        if not isinstance(handler, logging.NullHandler):
+            # Fila limitada + thread listener: nenhum write/rotação no
+            # event loop. Ver ``deile/storage/log_queue.py``.
+            handler = _start_pipeline(handler, queue_size, drop_policy)
         logger.addHandler(handler)
         logger.setLevel(logging.INFO)
         logger.propagate = False
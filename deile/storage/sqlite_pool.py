@@ -0,0 +1,334 @@
+"""Shared long-lived SQLite access: one writer thread per file + read connections.
+
+Several stores used to ``sqlite3.connect(...)`` for every operation, paying
+file open, schema parse, PRAGMA setup and statement compilation each time
+(and, for the async ones, spawning an aiosqlite thread per call).
+``SQLiteDatabase`` keeps everything warm instead:
+
+- **Writes** go through a queue to a single writer thread that owns one
+  WAL-mode connection. Jobs that pile up while a transaction is running are
+  group-committed in the next one, each inside its own ``SAVEPOINT`` so a
+  failing job rolls back alone. ``write()`` returns only after the commit,
+  so callers keep read-your-writes semantics.
+- **Reads** use one connection per calling thread (``query_only``); in WAL
+  mode they never block on the writer. A thread's connection is closed when
+  the thread exits, so ``to_thread`` worker churn does not leak descriptors.
+- Statements are compiled once per connection and reused through the
+  ``sqlite3`` statement cache (``cached_statements``).
+
+``get_database(path)`` returns the process-wide instance for a file, so
+every store pointed at the same DB shares the writer. The writer thread
+exits after ``idle_timeout`` seconds without work and restarts on demand;
+the registry keeps the most recently used files warm and lets the least
+recently used ones go past a small bound — while something still holds an
+evicted instance, ``get_database`` keeps returning it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_MAX_BATCH = 64
+_STATEMENT_CACHE = 256
+
+
+def _configure(conn: sqlite3.Connection, busy_timeout_ms: int) -> sqlite3.Connection:
+    conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def _release(conns: List[sqlite3.Connection], lock: threading.Lock,
+             conn: sqlite3.Connection) -> None:
+    """Finalizer of a thread's read slot: forget and close its connection."""
+    with lock:
+        try:
+            conns.remove(conn)
+        except ValueError:
+            return  # already closed by close()/_close_all
+    try:
+        conn.close()
+    except Exception:  # pragma: no cover - best effort at teardown
+        pass
+
+
+class _ReadSlot:
+    """Thread-local holder; dropped (and finalized) when its thread exits."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _close_all(conns: List[sqlite3.Connection]) -> None:
+    for conn in conns:
+        try:
+            conn.close()
+        except Exception:  # pragma: no cover - best effort at teardown
+            pass
+    conns.clear()
+
+
+class SQLiteDatabase:
+    """Pooled access to one SQLite file (see module docstring)."""
+
+    def __init__(self, path: Path, *, busy_timeout_ms: int = 10_000,
+                 idle_timeout: float = 5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.idle_timeout = idle_timeout
+        self._queue: "queue.Queue[Tuple[Callable, Future]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        self._closed = False
+        self.stats = {"writes": 0, "transactions": 0, "reads": 0}
+        self._stats_lock = threading.Lock()
+        self._warned_loop_write = False
+        weakref.finalize(self, _close_all, self._conns)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self.path), isolation_level=None, check_same_thread=False,
+            cached_statements=_STATEMENT_CACHE, timeout=self.busy_timeout_ms / 1000,
+        )
+        _configure(conn, self.busy_timeout_ms)
+        with self._conns_lock:
+            self._conns.append(conn)
+        return conn
+
+    # ---------------------------------------------------------------- reads
+
+    def _bump(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _read_conn(self) -> sqlite3.Connection:
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            slot = self._local.slot = _ReadSlot(conn)
+            # Thread-local values are released when the thread ends.
+            weakref.finalize(slot, _release, self._conns, self._conns_lock, conn)
+        return slot.conn
+
+    def read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Runs ``fn(conn)`` on this thread's read connection."""
+        if self._closed:
+            raise sqlite3.ProgrammingError(f"database {self.path} is closed")
+        if threading.current_thread() is self._writer:
+            return fn(self._write_conn)
+        self._bump("reads")
+        return fn(self._read_conn())
+
+    async def aread(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        return await asyncio.to_thread(self.read, fn)
+
+    # --------------------------------------------------------------- writes
+
+    def submit(self, fn: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        """Queues ``fn(conn)`` for the writer thread; result via the future."""
+        if self._closed:
+            raise sqlite3.ProgrammingError(f"database {self.path} is closed")
+        fut: "Future[T]" = Future()
+        self._queue.put((fn, fut))
+        self._ensure_writer()
+        return fut
+
+    def write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Runs ``fn(conn)`` in a committed write transaction and returns its result."""
+        if threading.current_thread() is self._writer:
+            # Re-entrant call from inside another write job.
+            return fn(self._write_conn)
+        self._warn_if_on_loop()
+        return self.submit(fn).result()
+
+    async def awrite(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        return await asyncio.wrap_future(self.submit(fn))
+
+    def _warn_if_on_loop(self) -> None:
+        if self._warned_loop_write:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._warned_loop_write = True
+        logger.warning(
+            "Blocking SQLite write on %s from the event loop thread; use awrite()",
+            self.path,
+        )
+
+    def executescript(self, script: str) -> None:
+        """DDL helper (``executescript`` commits on its own, so no savepoint)."""
+        self.write(_Script(script))
+
+    def _ensure_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is not None and self._writer.is_alive():
+                return
+            if self._write_conn is None:
+                self._write_conn = self._connect()
+            self._writer = threading.Thread(
+                target=self._writer_loop, name=f"sqlite-writer:{self.path.name}",
+                daemon=True,
+            )
+            self._writer.start()
+
+    def _writer_loop(self) -> None:
+        conn = self._write_conn
+        while True:
+            try:
+                first = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._writer_lock:
+                    if self._queue.empty():
+                        self._writer = None
+                        return
+                continue
+            batch = [first]
+            while len(batch) < _MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._run_batch(conn, batch)
+
+    def _run_batch(self, conn: sqlite3.Connection,
+                   batch: List[Tuple[Callable, Future]]) -> None:
+        # Scripts (DDL) commit on their own; run them in queue order between
+        # group-committed segments of regular jobs.
+        segment: List[Tuple[Callable, Future]] = []
+        for fn, fut in batch:
+            if not isinstance(fn, _Script):
+                segment.append((fn, fut))
+                continue
+            self._run_transaction(conn, segment)
+            segment = []
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                conn.executescript(fn.script)
+                fut.set_result(None)
+            except BaseException as exc:  # noqa: BLE001 - forwarded to caller
+                fut.set_exception(exc)
+        self._run_transaction(conn, segment)
+
+    def _run_transaction(self, conn: sqlite3.Connection,
+                         batch: List[Tuple[Callable, Future]]) -> None:
+        if not batch:
+            return
+        outcomes: List[Tuple[Future, bool, object]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for i, (fn, fut) in enumerate(batch):
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                conn.execute(f"SAVEPOINT job{i}")
+                try:
+                    result = fn(conn)
+                    conn.execute(f"RELEASE job{i}")
+                    outcomes.append((fut, True, result))
+                except BaseException as exc:  # noqa: BLE001 - forwarded to caller
+                    conn.execute(f"ROLLBACK TO job{i}")
+                    conn.execute(f"RELEASE job{i}")
+                    outcomes.append((fut, False, exc))
+            conn.execute("COMMIT")
+        except BaseException as exc:  # noqa: BLE001 - commit/begin failure fails the batch
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            logger.warning("SQLite write batch on %s failed: %s", self.path, exc)
+            for fn, fut in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        with self._stats_lock:
+            self.stats["transactions"] += 1
+            self.stats["writes"] += len(outcomes)
+        for fut, ok, value in outcomes:
+            if ok:
+                fut.set_result(value)
+            else:
+                fut.set_exception(value)  # type: ignore[arg-type]
+
+    def close(self) -> None:
+        """Drains pending writes and closes every connection."""
+        if self._closed:
+            return
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self.write(lambda conn: None)
+        self._closed = True
+        with _REGISTRY_LOCK:
+            if _REGISTRY.get(self.path) is self:
+                del _REGISTRY[self.path]
+            if _LIVE.get(self.path) is self:
+                del _LIVE[self.path]
+        with self._conns_lock:
+            _close_all(self._conns)
+
+
+class _Script:
+    __slots__ = ("script",)
+
+    def __init__(self, script: str):
+        self.script = script
+
+    def __call__(self, conn: sqlite3.Connection) -> None:  # pragma: no cover
+        conn.executescript(self.script)
+
+
+# Strong references on purpose: stores such as ``open_cron_store()`` are
+# built per call, and a weak registry would close the warm connections as
+# soon as each caller returned. Bounded so test suites / tools that touch
+# many files do not accumulate descriptors: an evicted instance is only
+# dropped from the registry and closes once its last holder lets go. Until
+# then ``_LIVE`` still resolves it, so a path never gets a second writer.
+_MAX_OPEN_DATABASES = 32
+_REGISTRY: "OrderedDict[Path, SQLiteDatabase]" = OrderedDict()
+_LIVE: "weakref.WeakValueDictionary[Path, SQLiteDatabase]" = weakref.WeakValueDictionary()
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_database(path: Path, **kwargs) -> SQLiteDatabase:
+    """Process-wide ``SQLiteDatabase`` for ``path`` (one writer per file)."""
+    key = Path(path).resolve()
+    with _REGISTRY_LOCK:
+        db = _REGISTRY.get(key) or _LIVE.get(key)
+        if db is None or db._closed:
+            db = SQLiteDatabase(key, **kwargs)
+            _LIVE[key] = db
+        _REGISTRY[key] = db
+        _REGISTRY.move_to_end(key)
+        while len(_REGISTRY) > _MAX_OPEN_DATABASES:
+            _REGISTRY.popitem(last=False)
+        return db
+
+
+def open_databases() -> Dict[Path, SQLiteDatabase]:
+    """Snapshot of live instances (diagnostics/tests)."""
+    with _REGISTRY_LOCK:
+        return dict(_REGISTRY)
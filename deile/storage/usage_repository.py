@@ -39,6 +39,26 @@ CREATE INDEX IF NOT EXISTS idx_usage_provider_ts
 ON usage_records (provider_id, timestamp)
 """
 
+# Hits/misses of the LLM response cache (deile/core/models/response_cache.py):
+# a hit records the tokens/cost the original call billed, i.e. what was saved.
+_CREATE_CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS response_cache_events (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp       REAL    NOT NULL,
+    provider_id     TEXT    NOT NULL,
+    model_id        TEXT    NOT NULL,
+    call_site       TEXT    NOT NULL DEFAULT '',
+    hit             INTEGER NOT NULL,
+    saved_tokens    INTEGER NOT NULL DEFAULT 0,
+    saved_cost_usd  REAL    NOT NULL DEFAULT 0.0
+)
+"""
+
+_CREATE_CACHE_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_cache_events_ts
+ON response_cache_events (timestamp)
+"""
+
 
 @dataclass
 class UsageRecord:
@@ -72,6 +92,8 @@ class UsageRepository:
         with self._connect() as conn:
             conn.execute(_CREATE_TABLE)
             conn.execute(_CREATE_INDEX)
+            conn.execute(_CREATE_CACHE_TABLE)
+            conn.execute(_CREATE_CACHE_INDEX)
 
     @contextmanager
     def _connect(self) -> Iterator[sqlite3.Connection]:
@@ -266,6 +288,53 @@ class UsageRepository:
             for r in rows
         ]
 
+    # -- response cache ------------------------------------------------------
+
+    def record_cache_event(
+        self,
+        provider_id: str,
+        model_id: str,
+        hit: bool,
+        saved_tokens: int = 0,
+        saved_cost_usd: float = 0.0,
+        call_site: str = "",
+    ) -> None:
+        """Log one response-cache lookup (hits carry the tokens/cost they saved)."""
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO response_cache_events
+                  (timestamp, provider_id, model_id, call_site, hit,
+                   saved_tokens, saved_cost_usd)
+                VALUES (?,?,?,?,?,?,?)
+                """,
+                (time.time(), provider_id, model_id, call_site, int(hit),
+                 int(saved_tokens), float(saved_cost_usd)),
+            )
+
+    def cache_summary(
+        self, since_ts: float = 0.0, call_site: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Hit rate and saved tokens/cost of the response cache since *since_ts*."""
+        sql = (
+            "SELECT COUNT(*), COALESCE(SUM(hit),0), COALESCE(SUM(saved_tokens),0), "
+            "COALESCE(SUM(saved_cost_usd),0) FROM response_cache_events WHERE timestamp>=?"
+        )
+        params: List[Any] = [since_ts]
+        if call_site is not None:
+            sql += " AND call_site=?"
+            params.append(call_site)
+        with self._connect() as conn:
+            lookups, hits, tokens, cost = conn.execute(sql, params).fetchone()
+        return {
+            "lookups": int(lookups),
+            "hits": int(hits),
+            "misses": int(lookups) - int(hits),
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+            "saved_tokens": int(tokens),
+            "saved_cost_usd": float(cost),
+        }
+
 
 # ---------------------------------------------------------------------------
 # BudgetGuard
@@ -0,0 +1,170 @@
+"""Load-aware routing: ``LoadTracker``, ``AdaptiveSelector`` and the
+``TierRouter`` spillover built on them (``routing_strategies.py``)."""
+
+from __future__ import annotations
+
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from deile.core.models.errors import (ProviderErrorEnvelope,
+                                      ProviderInvocationError)
+from deile.core.models.routing_strategies import (AdaptiveSelector,
+                                                  LoadTracker, RoutingContext,
+                                                  RoutingStrategy,
+                                                  RoutingStrategySelector,
+                                                  load_key, throttle_signal)
+from deile.core.models.tier import ModelTier
+from deile.core.models.tier_router import (CircuitBreaker, RoutingPolicy,
+                                           TierRouter)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _provider(provider_id: str, model: str = "m") -> MagicMock:
+    p = MagicMock()
+    p.provider_id = provider_id
+    p.provider_name = provider_id
+    p.model_name = model
+    return p
+
+
+def _rate_limited(retry_after=None) -> ProviderInvocationError:
+    exc = ProviderInvocationError(ProviderErrorEnvelope(
+        provider_id="a", model_id="m", error_type="rate_limit", message="429",
+        http_status=429,
+    ))
+    if retry_after is not None:
+        exc.response = MagicMock(headers={"retry-after": str(retry_after)})
+    return exc
+
+
+def test_tracker_counts_in_flight_and_ewmas():
+    clock = _Clock()
+    tracker = LoadTracker(alpha=0.5, clock=clock)
+    a = tracker.begin("p:m")
+    b = tracker.begin("p:m")
+    assert tracker.in_flight("p:m") == 2
+    clock.now = 1.0
+    a.first_token()
+    clock.now = 3.0
+    a.finish(output_tokens=100)
+    a.finish(output_tokens=100)  # idempotent
+    snap = tracker.snapshot("p:m")
+    assert snap.in_flight == 1 and snap.completed == 1
+    assert snap.ewma_ttft_s == pytest.approx(1.0)
+    assert snap.ewma_latency_s == pytest.approx(3.0)
+    assert snap.ewma_tokens_per_s == pytest.approx(50.0)
+    clock.now = 4.0
+    b.finish(output_tokens=0)
+    assert tracker.snapshot("p:m").ewma_latency_s == pytest.approx(3.5)
+    c = tracker.begin("p:m")
+    c.abandon()
+    assert tracker.in_flight("p:m") == 0
+    assert tracker.snapshot("p:m").failed == 0
+
+
+def test_throttle_backoff_and_retry_after():
+    clock = _Clock()
+    tracker = LoadTracker(throttle_base_s=2.0, clock=clock)
+    tracker.begin("p:m").finish(success=False, error=_rate_limited())
+    assert tracker.is_throttled("p:m")
+    clock.now = 2.1
+    assert not tracker.is_throttled("p:m")
+    tracker.begin("p:m").finish(success=False, error=_rate_limited())
+    assert tracker.snapshot("p:m").throttled_until == pytest.approx(2.1 + 4.0)
+    tracker.begin("p:m").finish(success=False, error=_rate_limited(retry_after=30))
+    assert tracker.snapshot("p:m").throttled_until == pytest.approx(2.1 + 30)
+    # Ordinary failures do not throttle.
+    tracker.begin("q:m").finish(success=False, error=RuntimeError("boom"))
+    assert not tracker.is_throttled("q:m")
+
+
+def test_throttle_signal_classification():
+    assert throttle_signal(_rate_limited()) == 0.0
+    overloaded = RuntimeError("overloaded")
+    overloaded.status_code = 529
+    assert throttle_signal(overloaded) == 0.0
+    assert throttle_signal(RuntimeError("nope")) is None
+
+
+def test_p2c_prefers_less_loaded_and_skips_throttled():
+    tracker = LoadTracker()
+    for _ in range(5):
+        tracker.begin("busy:m")
+    selector = AdaptiveSelector(tracker, rng=random.Random(1))
+    picks = [selector.choose(["busy:m", "idle:m"]) for _ in range(20)]
+    assert set(picks) == {1}
+
+    tracker.begin("idle:m").finish(success=False, error=_rate_limited())
+    assert selector.choose(["busy:m", "idle:m"]) == 0
+
+
+def test_least_outstanding_breaks_ties_by_latency():
+    clock = _Clock()
+    tracker = LoadTracker(clock=clock)
+    slow = tracker.begin("slow:m")
+    clock.now = 5.0
+    slow.finish()
+    fast = tracker.begin("fast:m")
+    clock.now = 5.5
+    fast.finish()
+    selector = AdaptiveSelector(tracker, mode="least_outstanding")
+    assert selector.choose(["slow:m", "fast:m"]) == 1
+    with pytest.raises(ValueError):
+        AdaptiveSelector(tracker, mode="fastest")
+
+
+def test_strategy_selector_adaptive_routes_on_live_load():
+    tracker = LoadTracker()
+    providers = [_provider("a"), _provider("b")]
+    for _ in range(3):
+        tracker.begin(load_key(providers[0]))
+    selector = RoutingStrategySelector(tracker)
+    chosen = selector.select(RoutingStrategy.ADAPTIVE, RoutingContext(user_input="x"),
+                             providers, {})
+    assert chosen is providers[1]
+
+
+def test_tier_router_spills_over_only_when_primary_saturates():
+    tracker = LoadTracker()
+    policy = RoutingPolicy("t", {ModelTier.TIER_1: ["a:m", "b:m"]})
+    adaptive = AdaptiveSelector(tracker, spill_factor=2.0, rng=random.Random(0))
+    router = TierRouter(MagicMock(), policy, CircuitBreaker(), adaptive)
+    a, b = _provider("a"), _provider("b")
+    router.register_provider(a)
+    router.register_provider(b)
+
+    assert router.select(ModelTier.TIER_1) is a
+    handles = [tracker.begin("a:m")]
+    # (1 + 1) × latency <= 2 × best alternative → primary keeps the traffic.
+    assert router.select(ModelTier.TIER_1) is a
+    handles.append(tracker.begin("a:m"))
+    assert router.select(ModelTier.TIER_1) is b
+    assert adaptive.spillovers == 1
+    for h in handles:
+        h.finish()
+    tracker.begin("a:m").finish(success=False, error=_rate_limited())
+    assert router.select(ModelTier.TIER_1) is b
+    # Skip set and breaker filters still apply before the adaptive pick.
+    assert router.select(ModelTier.TIER_1, skip_provider_ids={"b"}) is a
+
+
+def test_agent_throttle_does_not_count_towards_the_breaker(monkeypatch):
+    from deile.core import agent
+    router = MagicMock()
+    monkeypatch.setattr("deile.core.models.tier_router.get_tier_router",
+                        lambda *a, **k: router)
+
+    agent._self_record_circuit("a", success=False, error=_rate_limited())
+    router.record_failure.assert_not_called()
+
+    agent._self_record_circuit("a", success=False, error=RuntimeError("boom"))
+    router.record_failure.assert_called_once_with("a")
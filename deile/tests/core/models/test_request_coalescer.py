@@ -0,0 +1,238 @@
+"""Singleflight dedup and micro-batching in ``RequestCoalescer`` (``coalescer.py``)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from deile.core.models.base import ModelMessage, ModelResponse, ModelUsage
+from deile.core.models.coalescer import RequestCoalescer, get_request_coalescer
+
+
+class _CountingProvider:
+    """Fake provider: counts calls and answers batched payloads as instructed."""
+
+    provider_id = "fake"
+    model_name = "fake-1"
+
+    def __init__(self, delay: float = 0.01, batch_reply=None, fail=None):
+        self.delay = delay
+        self.batch_reply = batch_reply
+        self.fail = fail
+        self.calls = []
+
+    async def generate(self, messages, system_instruction=None, **kwargs):
+        self.calls.append((messages, system_instruction, kwargs))
+        await asyncio.sleep(self.delay)
+        if self.fail is not None:
+            raise self.fail
+        content = messages[-1].content
+        usage = ModelUsage(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+        if system_instruction and '"responses"' in system_instruction:
+            requests = json.loads(content)["requests"]
+            if self.batch_reply is not None:
+                reply = self.batch_reply(requests)
+            else:
+                reply = json.dumps({"responses": [
+                    {"id": r["id"], "content": f"answer:{r['prompt']}"} for r in requests
+                ]})
+            return ModelResponse(content=reply, model_name=self.model_name, usage=usage)
+        return ModelResponse(content=f"answer:{content}", model_name=self.model_name, usage=usage)
+
+
+def _msg(text: str):
+    return [ModelMessage(role="user", content=text)]
+
+
+async def test_identical_inflight_prompts_share_one_call():
+    provider = _CountingProvider()
+    coalescer = RequestCoalescer(provider)
+
+    results = await asyncio.gather(*(
+        coalescer.generate(_msg("classify: foo"), "sys") for _ in range(5)
+    ))
+
+    assert len(provider.calls) == 1
+    assert {r.content for r in results} == {"answer:classify: foo"}
+    assert sum(1 for r in results if r.metadata.get("coalesced")) == 4
+    assert sum(r.usage.total_tokens for r in results) == 120  # counted once
+    assert coalescer.get_stats()["deduped"] == 4
+
+
+async def test_different_kwargs_or_system_are_not_deduped():
+    provider = _CountingProvider()
+    coalescer = RequestCoalescer(provider)
+    await asyncio.gather(
+        coalescer.generate(_msg("x"), "a"),
+        coalescer.generate(_msg("x"), "b"),
+        coalescer.generate(_msg("x"), "a", temperature=0.1),
+    )
+    assert len(provider.calls) == 3
+
+
+async def test_sequential_calls_are_not_cached():
+    provider = _CountingProvider(delay=0)
+    coalescer = RequestCoalescer(provider)
+    await coalescer.generate(_msg("x"))
+    await coalescer.generate(_msg("x"))
+    assert len(provider.calls) == 2
+
+
+async def test_errors_reach_every_waiter():
+    provider = _CountingProvider(fail=RuntimeError("boom"))
+    coalescer = RequestCoalescer(provider)
+    results = await asyncio.gather(
+        *(coalescer.generate(_msg("x")) for _ in range(3)), return_exceptions=True,
+    )
+    assert len(provider.calls) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_cancelling_the_leader_does_not_cancel_followers():
+    provider = _CountingProvider(delay=0.05)
+    coalescer = RequestCoalescer(provider)
+    leader = asyncio.ensure_future(coalescer.generate(_msg("x")))
+    await asyncio.sleep(0)
+    followers = [asyncio.ensure_future(coalescer.generate(_msg("x"))) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    results = await asyncio.gather(*followers)
+
+    assert leader.cancelled()
+    assert [r.content for r in results] == ["answer:x", "answer:x"]
+    assert len(provider.calls) == 1
+
+
+async def test_shared_call_is_cancelled_when_every_caller_leaves():
+    provider = _CountingProvider(delay=10)
+    coalescer = RequestCoalescer(provider)
+    callers = [asyncio.ensure_future(coalescer.generate(_msg("x"))) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    (flight,) = coalescer._inflight.values()
+
+    callers[0].cancel()
+    await asyncio.sleep(0)
+    assert not flight.task.done()
+    callers[1].cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert flight.task.cancelled()
+    assert coalescer._inflight == {}
+
+
+async def test_batchable_requests_share_one_structured_call():
+    provider = _CountingProvider()
+    coalescer = RequestCoalescer(provider, batch_window_s=0.01)
+
+    results = await asyncio.gather(*(
+        coalescer.generate(_msg(f"label {i}"), "triage", batchable=True) for i in range(4)
+    ))
+
+    assert len(provider.calls) == 1
+    messages, system, _ = provider.calls[0]
+    assert system.startswith("triage")
+    assert len(json.loads(messages[0].content)["requests"]) == 4
+    assert [r.content for r in results] == [f"answer:label {i}" for i in range(4)]
+    assert all(r.metadata["batched"] and r.metadata["batch_size"] == 4 for r in results)
+    assert sum(r.usage.total_tokens for r in results) == pytest.approx(120, abs=2)
+
+
+async def test_batch_flushes_at_max_size_without_waiting_for_window():
+    provider = _CountingProvider(delay=0)
+    coalescer = RequestCoalescer(provider, batch_window_s=60, max_batch_size=3)
+    results = await asyncio.wait_for(asyncio.gather(*(
+        coalescer.generate(_msg(f"p{i}"), batchable=True) for i in range(3)
+    )), timeout=2)
+    assert len(provider.calls) == 1
+    assert [r.content for r in results] == ["answer:p0", "answer:p1", "answer:p2"]
+
+
+async def test_incompatible_requests_go_in_separate_batches():
+    provider = _CountingProvider()
+    coalescer = RequestCoalescer(provider, batch_window_s=0.01)
+    await asyncio.gather(
+        coalescer.generate(_msg("a"), "s1", batchable=True),
+        coalescer.generate(_msg("b"), "s1", batchable=True),
+        coalescer.generate(_msg("c"), "s2", batchable=True),
+    )
+    # One two-item batch plus one lone request sent as-is.
+    assert len(provider.calls) == 2
+    assert any(call[1] == "s2" and call[0][0].content == "c" for call in provider.calls)
+
+
+async def test_missing_answers_fall_back_to_individual_calls():
+    def partial(requests):
+        return "```json\n" + json.dumps({"responses": [
+            {"id": requests[0]["id"], "content": "only first"}]}) + "\n```"
+
+    provider = _CountingProvider(batch_reply=partial)
+    coalescer = RequestCoalescer(provider, batch_window_s=0.01)
+    results = await asyncio.gather(*(
+        coalescer.generate(_msg(f"q{i}"), batchable=True) for i in range(3)
+    ))
+
+    assert [r.content for r in results] == ["only first", "answer:q1", "answer:q2"]
+    assert len(provider.calls) == 3  # 1 batch + 2 re-sends
+    assert coalescer.get_stats()["batch_fallbacks"] == 1
+
+
+async def test_unparseable_batch_reply_degrades_to_plain_calls():
+    provider = _CountingProvider(batch_reply=lambda requests: "sorry, no JSON")
+    coalescer = RequestCoalescer(provider, batch_window_s=0.01)
+    results = await asyncio.gather(*(
+        coalescer.generate(_msg(f"q{i}"), batchable=True) for i in range(2)
+    ))
+    assert [r.content for r in results] == ["answer:q0", "answer:q1"]
+
+
+async def test_long_or_multi_turn_prompts_are_never_batched():
+    provider = _CountingProvider()
+    coalescer = RequestCoalescer(provider, batch_window_s=0.01, max_batch_prompt_chars=10)
+    await asyncio.gather(
+        coalescer.generate(_msg("x" * 50), batchable=True),
+        coalescer.generate(_msg("short") + _msg("turn 2"), batchable=True),
+    )
+    assert len(provider.calls) == 2
+    assert all(call[1] is None for call in provider.calls)
+
+
+async def test_get_request_coalescer_is_per_provider():
+    a, b = _CountingProvider(), _CountingProvider()
+    assert get_request_coalescer(a) is get_request_coalescer(a)
+    assert get_request_coalescer(a) is not get_request_coalescer(b)
+
+
+def test_get_request_coalescer_is_per_event_loop():
+    provider = _CountingProvider()
+
+    async def _use():
+        coalescer = get_request_coalescer(provider)
+        await coalescer.generate(_msg("x"))
+        return coalescer
+
+    first = asyncio.run(_use())
+    second = asyncio.run(_use())
+
+    assert first is not second
+    assert len(provider.calls) == 2
+
+
+async def test_cancelled_batch_members_are_not_sent():
+    provider = _CountingProvider()
+    coalescer = RequestCoalescer(provider, batch_window_s=0.05)
+    kept = [asyncio.ensure_future(coalescer.generate(_msg(p), batchable=True))
+            for p in ("a", "b")]
+    gone = asyncio.ensure_future(coalescer.generate(_msg("c"), batchable=True))
+    await asyncio.sleep(0.01)
+    gone.cancel()
+
+    results = await asyncio.gather(*kept)
+
+    assert [r.content for r in results] == ["answer:a", "answer:b"]
+    (call,) = provider.calls
+    prompts = [r["prompt"] for r in json.loads(call[0][-1].content)["requests"]]
+    assert prompts == ["a", "b"]
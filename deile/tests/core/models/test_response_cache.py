@@ -0,0 +1,195 @@
+"""Persistent response cache: keys, TTL/LRU eviction, replay and usage reporting."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from deile.core.models.base import ModelMessage, ModelResponse, ModelUsage
+from deile.core.models.response_cache import (ResponseCache, ResponseCacheMiss,
+                                              get_response_cache,
+                                              reset_response_cache,
+                                              response_cache_key)
+from deile.storage.usage_repository import UsageRepository
+
+
+class _CountingProvider:
+    provider_id = "fake"
+    model_name = "fake-1"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, messages, system_instruction=None, **kwargs):
+        self.calls += 1
+        return ModelResponse(
+            content=f"label for {messages[-1].content.strip()}",
+            model_name=self.model_name,
+            usage=ModelUsage(prompt_tokens=90, completion_tokens=10,
+                             total_tokens=100, cost_estimate=0.002),
+            finish_reason="stop",
+        )
+
+
+def _msg(text: str):
+    return [ModelMessage(role="user", content=text)]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    return UsageRepository(db_path=tmp_path / "usage.db")
+
+
+@pytest.fixture
+def cache(tmp_path, repo):
+    return ResponseCache(tmp_path / "cache.db", usage_repository=repo)
+
+
+class TestKey:
+
+    def test_cosmetic_whitespace_and_bookkeeping_kwargs_do_not_matter(self):
+        a = response_cache_key("p", "m", _msg("classify:\r\n  foo  \n\n"), "sys ",
+                               temperature=0, session_id="s1")
+        b = response_cache_key("p", "m", _msg("classify:\n  foo"), "sys",
+                               temperature=0, session_id="s2")
+        assert a == b
+
+    def test_semantic_inputs_change_the_key(self):
+        base = response_cache_key("p", "m", _msg("x"), "sys", temperature=0)
+        assert base != response_cache_key("p", "m2", _msg("x"), "sys", temperature=0)
+        assert base != response_cache_key("q", "m", _msg("x"), "sys", temperature=0)
+        assert base != response_cache_key("p", "m", _msg("y"), "sys", temperature=0)
+        assert base != response_cache_key("p", "m", _msg("x"), "other", temperature=0)
+        assert base != response_cache_key("p", "m", _msg("x"), "sys", temperature=0, max_tokens=5)
+
+    def test_message_metadata_is_part_of_the_key(self):
+        def key(metadata):
+            return response_cache_key("p", "m", [ModelMessage(role="tool", content="ok",
+                                                              metadata=metadata)])
+        assert key({"tool_call_id": "a"}) != key({"tool_call_id": "b"})
+        assert key({"tool_call_id": "a"}) != key({})
+        assert key({"a": 1, "b": 2}) == key({"b": 2, "a": 1})
+
+    def test_tool_order_is_irrelevant(self):
+        t1, t2 = {"name": "a", "parameters": {}}, {"name": "b", "parameters": {}}
+        assert (response_cache_key("p", "m", _msg("x"), tools=[t1, t2])
+                == response_cache_key("p", "m", _msg("x"), tools=[t2, t1]))
+
+
+class TestGenerate:
+
+    async def test_second_call_is_served_from_cache(self, cache, repo):
+        provider = _CountingProvider()
+        first = await cache.generate(provider, _msg("issue 1"), "triage",
+                                     call_site="triage", temperature=0)
+        second = await cache.generate(provider, _msg("issue 1"), "triage",
+                                      call_site="triage", temperature=0)
+
+        assert provider.calls == 1
+        assert second.content == first.content
+        assert second.metadata["cache_hit"] is True
+        assert second.usage.total_tokens == 0
+        summary = repo.cache_summary(call_site="triage")
+        assert summary["hits"] == 1 and summary["misses"] == 1
+        assert summary["hit_rate"] == 0.5
+        assert summary["saved_tokens"] == 100
+        assert summary["saved_cost_usd"] == pytest.approx(0.002)
+
+    async def test_cache_is_shared_across_instances(self, tmp_path, repo):
+        provider = _CountingProvider()
+        await ResponseCache(tmp_path / "c.db", usage_repository=repo).generate(
+            provider, _msg("x"), temperature=0)
+        other = ResponseCache(tmp_path / "c.db", usage_repository=repo)
+        assert (await other.generate(provider, _msg("x"), temperature=0)).metadata["cache_hit"]
+        assert provider.calls == 1
+
+    async def test_nonzero_temperature_bypasses_cache(self, cache):
+        provider = _CountingProvider()
+        for _ in range(2):
+            await cache.generate(provider, _msg("x"), temperature=0.7)
+        assert provider.calls == 2
+        assert cache.stats["stores"] == 0
+
+    async def test_usage_events_are_written_off_the_event_loop(self, cache, repo, monkeypatch):
+        threads = []
+        record = repo.record_cache_event
+
+        def _spy(**kwargs):
+            threads.append(threading.get_ident())
+            record(**kwargs)
+
+        monkeypatch.setattr(repo, "record_cache_event", _spy)
+        await cache.generate(_CountingProvider(), _msg("x"), temperature=0)
+        await cache.generate(_CountingProvider(), _msg("x"), temperature=0)
+
+        assert len(threads) == 2
+        assert threading.get_ident() not in threads
+        assert repo.cache_summary()["hits"] == 1
+
+    async def test_default_temperature_bypasses_cache(self, cache, repo):
+        provider = _CountingProvider()
+        for _ in range(2):
+            await cache.generate(provider, _msg("x"))
+        assert provider.calls == 2
+        assert cache.stats["stores"] == 0
+        assert repo.cache_summary()["lookups"] == 0
+
+    async def test_replay_mode_never_calls_the_provider(self, tmp_path, repo):
+        provider = _CountingProvider()
+        await ResponseCache(tmp_path / "c.db", usage_repository=repo).generate(
+            provider, _msg("known"), temperature=0)
+
+        replay = ResponseCache(tmp_path / "c.db", mode="replay", usage_repository=repo)
+        assert (await replay.generate(provider, _msg("known"), temperature=0)).content == "label for known"
+        with pytest.raises(ResponseCacheMiss):
+            await replay.generate(provider, _msg("unknown"), temperature=0)
+        assert provider.calls == 1
+
+    async def test_off_mode_passes_through(self, tmp_path, repo):
+        provider = _CountingProvider()
+        cache = ResponseCache(tmp_path / "c.db", mode="off", usage_repository=repo)
+        await cache.generate(provider, _msg("x"), temperature=0)
+        await cache.generate(provider, _msg("x"), temperature=0)
+        assert provider.calls == 2
+        assert repo.cache_summary()["lookups"] == 0
+
+    def test_invalid_mode_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            ResponseCache(tmp_path / "c.db", mode="bogus")
+
+
+class TestEviction:
+
+    def _resp(self, text: str) -> ModelResponse:
+        return ModelResponse(content=text, model_name="m")
+
+    def test_expired_entries_are_misses_and_pruned(self, cache):
+        cache.put("k", self._resp("v"), provider_id="p", ttl_s=10, now=1000.0)
+        assert cache.get("k", now=1005.0) is not None
+        assert cache.get("k", now=1011.0) is None
+        assert cache.prune(now=1011.0) == 1
+
+    def test_size_cap_evicts_least_recently_used(self, tmp_path, repo):
+        cache = ResponseCache(tmp_path / "c.db", max_bytes=300, usage_repository=repo)
+        for i, key in enumerate(("old", "mid", "new")):
+            cache.put(key, self._resp("x" * 100), provider_id="p", now=1000.0 + i)
+        cache.get("old", now=1010.0)  # touched: now the most recent
+        cache.db.write(lambda conn: None)  # flush the fire-and-forget touch
+        cache.prune(now=1011.0)
+        assert cache.get("mid", now=1012.0) is None
+        assert cache.get("old", now=1012.0) is not None
+        assert cache.size_bytes() <= 300
+
+
+def test_get_response_cache_reads_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEILE_LLM_CACHE_PATH", str(tmp_path / "env.db"))
+    monkeypatch.setenv("DEILE_LLM_CACHE_MODE", "replay")
+    reset_response_cache()
+    try:
+        cache = get_response_cache()
+        assert cache is get_response_cache()
+        assert cache.mode == "replay"
+        assert cache.db_path == tmp_path / "env.db"
+    finally:
+        reset_response_cache()
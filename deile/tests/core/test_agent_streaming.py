@@ -894,3 +894,38 @@ async def test_tool_use_start_emits_tool_call_started_chunk(
     started = [c for c in chunks if c.kind == "tool_call_started"]
     assert len(started) == 1, f"expected 1 tool_call_started chunk, got {chunks}"
     assert started[0].payload["tool_name"] == "read_file"
+
+
+@pytest.mark.asyncio
+async def test_load_tracker_samples_each_provider_round(monkeypatch):
+    """One LoadTracker slot per ``generate_stream`` round, closed on that
+    round's USAGE_FINAL — tool execution in between is not provider latency."""
+    from deile.core.agent_streaming import _LoadTrackedProvider
+    from deile.core.models.routing_strategies import LoadTracker, load_key
+
+    now = [0.0]
+    tracker = LoadTracker(clock=lambda: now[0])
+    monkeypatch.setattr("deile.core.models.routing_strategies.get_load_tracker",
+                        lambda: tracker)
+    usage = UnifiedStreamEvent(type=StreamEventType.USAGE_FINAL,
+                               usage=ModelUsageSnapshot(input_tokens=1, output_tokens=4))
+    fake = _FakeProvider(iterations=[
+        [UnifiedStreamEvent(type=StreamEventType.TEXT_DELTA, text="a"), usage],
+        [UnifiedStreamEvent(type=StreamEventType.TEXT_DELTA, text="b"), usage],
+    ])
+    provider = _LoadTrackedProvider(fake)
+    key = load_key(fake)
+
+    for _ in range(2):
+        async for event in provider.generate_stream([]):
+            if event.type == StreamEventType.TEXT_DELTA:
+                assert tracker.in_flight(key) == 1
+            now[0] += 1.0
+        assert tracker.in_flight(key) == 0
+        now[0] += 30.0  # tools run between rounds
+
+    load = tracker.snapshot(key)
+    assert load.completed == 2
+    assert load.ewma_latency_s == pytest.approx(1.0)
+    assert load.ewma_ttft_s == pytest.approx(0.0)
+    assert provider.model_name == "fake-1"
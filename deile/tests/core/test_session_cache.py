@@ -0,0 +1,140 @@
+"""Tests for the bounded session LRU (``SessionCache``) and dirty flushes."""
+
+from __future__ import annotations
+
+import gc
+
+import pytest
+
+from deile.core.agent import AgentSession, DeileAgent
+from deile.core.session_cache import SessionCache
+from deile.core.session_store import SessionStore
+
+
+def _session(sid: str, persisted: bool = True, history: int = 0) -> AgentSession:
+    s = AgentSession(session_id=sid, persisted=persisted)
+    for i in range(history):
+        s.add_to_history("user", f"msg {i} " + "x" * 100)
+    return s
+
+
+class TestSessionCache:
+    def test_count_bound_evicts_lru_persisted_only(self):
+        cache = SessionCache(max_sessions=2)
+        cache["cli"] = _session("cli", persisted=False)
+        cache["a"] = _session("a")
+        cache["b"] = _session("b")
+        # "cli" is LRU but has nowhere to spill: "a" goes instead.
+        assert list(cache) == ["cli", "b"]
+        assert [sid for sid, _ in cache.take_pending_spill()] == ["a"]
+        assert cache.evictions == 1
+
+    def test_access_refreshes_recency(self):
+        cache = SessionCache(max_sessions=2)
+        cache["a"] = _session("a")
+        cache["b"] = _session("b")
+        _ = cache["a"]
+        cache["c"] = _session("c")
+        assert set(cache) == {"a", "c"}
+
+    def test_byte_budget_via_reweigh_never_evicts_mru(self):
+        cache = SessionCache(max_sessions=100, max_bytes=6000)
+        a, b = _session("a"), _session("b")
+        cache["a"] = a
+        cache["b"] = b
+        for i in range(20):
+            b.add_to_history("user", "y" * 400)
+        cache.reweigh("b")
+        assert list(cache) == ["b"]  # "a" spilled, "b" kept although over budget
+        assert cache.resident_bytes > cache.max_bytes
+
+    def test_pending_and_ghost_revive_same_object(self):
+        cache = SessionCache(max_sessions=1)
+        a = _session("a")
+        cache["a"] = a
+        cache["b"] = _session("b")
+        assert "a" in cache and cache["a"] is a  # promoted from pending
+        cache["c"] = _session("c")
+        cache.take_pending_spill()
+        cache.mark_spilled("a")
+        assert cache["a"] is a  # still referenced here -> revived from weakref
+        cache["d"] = _session("d")
+        cache.take_pending_spill()
+        cache.mark_spilled("a")
+        del a
+        gc.collect()
+        assert "a" not in cache and cache.was_spilled("a")
+
+
+@pytest.fixture
+async def agent(tmp_path, monkeypatch):
+    store_path = tmp_path / "sessions.sqlite"
+
+    async def fake_get_store(self):
+        if not getattr(self, "_session_store", None):
+            self._session_store = SessionStore(store_path)
+            await self._session_store.init()
+        return self._session_store
+
+    monkeypatch.setattr(DeileAgent, "get_session_store", fake_get_store)
+    ag = DeileAgent()
+    ag._sessions = SessionCache(max_sessions=2)
+    yield ag
+    await ag.shutdown()
+
+
+class TestAgentSpill:
+    async def test_evicted_session_spills_and_rehydrates(self, agent):
+        s1 = await agent.get_or_create_session("s1", persisted=True)
+        s1.add_to_history("user", "hello")
+        s1.add_to_history("assistant", "hi there")
+        s1.context_data["name"] = "Alice"
+        await agent.get_or_create_session("s2", persisted=True)
+        await agent.get_or_create_session("s3", persisted=True)
+
+        assert "s1" not in agent._sessions._data
+        rows = await agent._session_store.get_messages("s1")
+        assert [r["content"] for r in rows] == ["hello", "hi there"]
+
+        del s1
+        gc.collect()
+        await agent._rehydrate_if_spilled("s1")
+        back = agent._sessions["s1"]
+        assert back.context_data["name"] == "Alice"
+        assert [e["content"] for e in back.conversation_history] == ["hello", "hi there"]
+        assert agent._sessions.rehydrations == 1
+
+    async def test_flush_writes_only_dirty_sessions_and_appends(self, agent, monkeypatch):
+        a = await agent.get_or_create_session("a", persisted=True)
+        await agent.get_or_create_session("b", persisted=True)
+        assert await agent.flush_persisted_sessions() == 2
+        assert await agent.flush_persisted_sessions() == 0
+
+        store = agent._session_store
+        calls = []
+        orig = store.append_messages
+
+        async def spy(session_id, start_seq, entries, *, replace=False):
+            calls.append((session_id, start_seq, len(entries), replace))
+            await orig(session_id, start_seq, entries, replace=replace)
+
+        monkeypatch.setattr(store, "append_messages", spy)
+        a.add_to_history("user", "one")
+        a.add_to_history("assistant", "two")
+        assert await agent.flush_persisted_sessions() == 1
+        a.add_to_history("user", "three")
+        assert await agent.flush_persisted_sessions() == 1
+        assert calls == [("a", 0, 2, False), ("a", 2, 1, False)]
+
+        # In-place rewrite (e.g. /rewind) replaces the stored history.
+        a.conversation_history = [dict(e) for e in a.conversation_history[:1]]
+        assert await agent.flush_persisted_sessions() == 1
+        assert calls[-1] == ("a", 0, 1, True)
+        assert [m["content"] for m in await store.get_messages("a")] == ["one"]
+
+        # Context-only change: upsert, no message rows.
+        a.context_data["k"] = "v"
+        assert await agent.flush_persisted_sessions() == 1
+        assert calls[-1] == ("a", 1, 0, False)
+        row = await store.get("a")
+        assert row.context_data["k"] == "v" and "_agent" not in row.context_data
@@ -1899,6 +1899,24 @@ class TestLocalInstancesProvider:
         assert 12345 in snaps
         assert snaps[12345].stale is True
 
+    @pytest.mark.skipif(pd._SLOT_TABLE_CLS is None, reason="deile not importable")
+    def test_slot_heartbeat_overrides_old_file_heartbeat(self, tmp_path, monkeypatch):
+        """Instância ociosa: o state file não é reescrito pelo heartbeat,
+        mas o slot mmap em `registry.slots` está fresco → não é stale."""
+        rt = tmp_path / "run"
+        rt.mkdir()
+        _write_state(rt, "cli-idle", pid=os.getpid(), heartbeat_age_s=120.0)
+        table = pd._SLOT_TABLE_CLS(rt / "registry.slots")
+        table.claim(instance_id="cli-idle", pid=os.getpid(), role="cli")
+        provider = pd.LocalInstancesProvider(
+            runtime_dir=rt, stale_after_s=30.0, prefer_socket=False,
+        )
+        snap = provider.get()[os.getpid()]
+        assert snap.stale is False
+        age = (datetime.now(timezone.utc) - snap.last_heartbeat_at).total_seconds()
+        assert age < 30.0
+        table.close()
+
     def test_idle_current_action_renders_idle(self, tmp_path, monkeypatch):
         rt = tmp_path / "run"
         rt.mkdir()
@@ -0,0 +1,176 @@
+"""Followers ``kubectl logs -f`` do painel (``infra/k8s/_log_follower.py``).
+
+Roda offline: um script Python faz o papel de ``kubectl``. Cada invocação é
+registrada num arquivo; a 1ª conexão emite o backfill e "cai" (exit), a 2ª
+(``--since-time``) re-entrega a linha de fronteira + linhas novas e fica
+pendurada como um ``-f`` real até ser terminada.
+
+Cobre:
+  1. Dedupe por timestamp (fração RFC3339Nano normalizada) e ring limitado.
+  2. ``snapshot(since=...)`` respeita a janela temporal.
+  3. Follower reconecta com ``--since-time`` e não duplica a sobreposição.
+  4. Hub compartilha um follower por alvo e encerra os ociosos.
+  5. ``WorkerProvider`` lê do hub sem spawnar ``kubectl logs`` por refresh.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import textwrap
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+_REPO = Path(__file__).resolve().parents[3]
+for _p in (_REPO / "infra", _REPO / "infra" / "k8s"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+import _log_follower as lf  # noqa: E402
+import _panel_data as pd  # noqa: E402
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="fake kubectl usa shebang POSIX",
+)
+
+_T0 = "2026-10-18T12:00:00"
+
+
+def _line(sec: int, frac: str, body: str) -> str:
+    return f"{_T0[:-2]}{sec:02d}.{frac}Z {body}"
+
+
+@pytest.fixture
+def fake_kubectl(tmp_path):
+    """Escreve um ``kubectl`` falso e devolve (path, calls_file)."""
+    calls = tmp_path / "calls.jsonl"
+    script = tmp_path / "kubectl"
+    first = [_line(1, "1", "boot"), _line(2, "5", "a"), _line(3, "25", "b")]
+    second = [_line(3, "25", "b"), _line(4, "0", "c"), _line(5, "123456789", "d")]
+    script.write_text(textwrap.dedent(f"""\
+        #!{sys.executable}
+        import json, sys, time
+        calls = {str(calls)!r}
+        with open(calls, "a") as fh:
+            fh.write(json.dumps(sys.argv[1:]) + "\\n")
+        n = sum(1 for _ in open(calls))
+        lines = {first!r} if n == 1 else {second!r}
+        for ln in lines:
+            print(ln, flush=True)
+        if n >= 2:
+            time.sleep(30)
+    """))
+    script.chmod(0o755)
+    return str(script), calls
+
+
+def _wait(cond, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_ring_buffer_dedupes_by_timestamp_and_is_bounded():
+    buf = lf.LogRingBuffer(max_lines=3)
+    assert buf.append(_line(1, "5", "x"))
+    # .123 < .5 numericamente, embora seja "maior" como string.
+    assert not buf.append(_line(1, "123", "older"))
+    assert not buf.append(_line(1, "5", "x"))
+    assert buf.append(_line(1, "5", "y"))  # mesmo ts, linha distinta
+    assert buf.append(_line(2, "0", "z"))
+    assert buf.append(_line(3, "0", "w"))
+    assert len(buf) == 3
+    assert buf.dropped_duplicates == 2
+    assert buf.last_timestamp == f"{_T0[:-2]}03.0Z"
+    assert [ln.split()[-1] for ln in buf.snapshot()] == ["y", "z", "w"]
+
+
+def test_snapshot_since_window():
+    buf = lf.LogRingBuffer()
+    now = datetime.now(timezone.utc)
+    for age, body in ((120, "old"), (30, "mid"), (1, "new")):
+        ts = (now - timedelta(seconds=age)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        buf.append(f"{ts} {body}")
+    recent = buf.snapshot(since=now - timedelta(seconds=60))
+    assert [ln.split()[-1] for ln in recent] == ["mid", "new"]
+    assert [ln.split()[-1] for ln in buf.snapshot(tail=1)] == ["new"]
+
+
+def test_follower_reconnects_with_since_time_without_duplicates(fake_kubectl):
+    kubectl, calls = fake_kubectl
+    fol = lf.PodLogFollower(kubectl, "ns", "deploy/x", backfill_lines=50,
+                            backoff_min_s=0.05)
+    fol.start()
+    try:
+        assert _wait(lambda: len(fol.buffer) == 5)
+        argv = [json.loads(ln) for ln in calls.read_text().splitlines()]
+        assert argv[0] == ["-n", "ns", "logs", "deploy/x", "-f",
+                           "--timestamps", "--tail=50"]
+        assert argv[1][-1] == f"--since-time={_T0[:-2]}03.25Z"
+        bodies = [ln.split()[-1] for ln in fol.buffer.snapshot()]
+        assert bodies == ["boot", "a", "b", "c", "d"]
+        assert fol.buffer.dropped_duplicates == 1
+        assert fol.is_ready()
+    finally:
+        fol.stop()
+    assert not fol.alive
+
+
+def test_hub_shares_follower_and_prunes_idle(fake_kubectl):
+    kubectl, _ = fake_kubectl
+    hub = lf.LogFollowerHub(idle_ttl_s=60.0, backoff_min_s=0.05)
+    try:
+        a = hub.follower(kubectl, "ns", "pod-1")
+        b = hub.follower(kubectl, "ns", "pod-1")
+        assert a is b
+        assert _wait(lambda: len(a.buffer) == 5)
+        text = hub.read(kubectl, "ns", "pod-1", tail=2)
+        assert [ln.split()[-1] for ln in text.splitlines()] == ["c", "d"]
+        assert hub.targets() == [("ns", "pod-1")]
+        a.last_read -= 120.0
+        assert hub.prune_idle() == 1
+        assert hub.targets() == []
+        assert not a.alive
+    finally:
+        hub.close()
+    assert hub.follower(kubectl, "ns", "pod-2") is None
+
+
+def test_parse_since():
+    assert lf.parse_since("10s") == 10.0
+    assert lf.parse_since("10m") == 600.0
+    assert lf.parse_since("1h") == 3600.0
+    assert lf.parse_since("bogus") is None
+
+
+def test_worker_provider_reads_from_hub_without_log_subprocess():
+    class _Hub:
+        def __init__(self):
+            self.reads = []
+
+        def read(self, kubectl, namespace, target, *, tail=None, since_s=None):
+            self.reads.append((namespace, target, tail, since_s))
+            return ""
+
+    hub = _Hub()
+    prov = pd.WorkerProvider(namespace="ns", log_hub=hub)
+    prov._kubectl = "kubectl"
+    spawned = []
+
+    def _fake_capture(cmd, timeout=5.0):
+        spawned.append(cmd)
+        return "worker-a worker-b"
+
+    with patch.object(pd, "_capture_text", side_effect=_fake_capture):
+        states = prov.get(force=True)
+    assert set(states) == {"worker-a", "worker-b"}
+    # Só o ``get pods`` spawna; logs vêm do hub.
+    assert len(spawned) == 1 and "get" in spawned[0]
+    assert [r[1] for r in hub.reads] == ["worker-a", "worker-b"]
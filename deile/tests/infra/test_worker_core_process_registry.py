@@ -0,0 +1,162 @@
+"""Registro de processos do CLI (``_worker_core.ProcessRegistry``).
+
+``_find_claude_pid``/``_count_claude_processes`` liam ``/proc/<pid>/cmdline``
+de todos os processos a cada consulta. Estes testes usam filhos falsos
+(``python -c 'sleep'`` com um marcador no argv) e um ``/proc`` falso
+para provar que o PID entra no spawn, sai quando o filho é colhido, e que a
+varredura de ``/proc`` só acontece em miss, limitada pelo intervalo de
+recuperação.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+_REPO = Path(__file__).resolve().parents[3]
+for _p in (_REPO / "infra", _REPO / "infra" / "k8s"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+import _worker_core as core  # noqa: E402
+
+#: Filho falso: um único processo (sem netos segurando o pipe) cujo argv
+#: carrega o marcador da sessão.
+_SLEEPER = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+
+def _fake_proc(root: Path, pid: int, argv: list) -> None:
+    (root / str(pid)).mkdir(parents=True)
+    (root / str(pid) / "cmdline").write_bytes(b"\0".join(a.encode() for a in argv) + b"\0")
+
+
+async def _wait_until(cond, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not cond():
+        assert loop.time() < deadline, "condição não atingida"
+        await asyncio.sleep(0.01)
+
+
+async def test_spawned_child_is_tracked_until_reaped(tmp_path):
+    marker = f"sess-{uuid.uuid4().hex}"
+    reg = core.ProcessRegistry()
+    empty = tmp_path / "proc"
+    empty.mkdir()
+    run = asyncio.ensure_future(core.run_subprocess_with_progress(
+        [*_SLEEPER, marker], cwd=tmp_path, task_id="a" * 16,
+        timeout=30, root=tmp_path, registry=reg,
+    ))
+    await _wait_until(lambda: reg.stats["registered"] == 1)
+    pid = reg.find(marker, proc_root=empty)
+    assert pid is not None
+    assert reg.count(lambda p: p.argv0 == sys.executable, proc_root=empty) == 1
+    assert reg.stats["scans"] == 1  # só a recuperação inicial do count
+
+    os.kill(pid, signal.SIGKILL)
+    res = await run
+    assert res.returncode == -signal.SIGKILL
+    assert reg.stats["reaped"] == 1
+    assert reg.find(marker, proc_root=empty) is None
+
+
+async def test_timeout_kill_also_unregisters(tmp_path):
+    reg = core.ProcessRegistry()
+    res = await core.run_subprocess_with_progress(
+        _SLEEPER, cwd=tmp_path, task_id="b" * 16,
+        timeout=0.2, root=tmp_path, registry=reg,
+    )
+    assert res.returncode == 124
+    assert reg.stats == {"registered": 1, "reaped": 1, "scans": 0}
+
+
+def test_recovery_scan_is_throttled_and_filtered(tmp_path):
+    root = tmp_path / "proc"
+    _fake_proc(root, 101, ["claude", "-p", "--session-id", "s-1"])
+    _fake_proc(root, 102, ["bash", "-c", "true"])
+    (root / "self").mkdir()
+    reg = core.ProcessRegistry(rescan_interval_s=3600,
+                               adopt_filter=lambda c: b"claude" in c)
+
+    assert reg.find("s-1", proc_root=root) == 101
+    assert reg.stats["scans"] == 1
+    _fake_proc(root, 103, ["claude", "-p", "--session-id", "s-2"])
+    assert reg.find("s-2", proc_root=root) is None  # dentro do intervalo
+    assert reg.find("s-1", proc_root=root) == 101
+    assert reg.stats["scans"] == 1
+    assert reg.recover(root, force=True)
+    assert reg.find("s-2", proc_root=root) == 103
+    assert reg.count(lambda p: p.argv0 == "claude", proc_root=root) == 2
+
+
+def test_adopted_pid_reuse_and_exit_are_detected(tmp_path):
+    root = tmp_path / "proc"
+    _fake_proc(root, 201, ["claude", "--session-id", "s-1"])
+    reg = core.ProcessRegistry(rescan_interval_s=3600)
+    assert reg.find("s-1", proc_root=root) == 201
+
+    # PID reciclado por outro programa: a entrada adotada cai.
+    (root / "201" / "cmdline").write_bytes(b"nginx\0")
+    assert reg.count(lambda p: True, proc_root=root) == 0
+    assert reg.find("s-1", proc_root=root) is None
+
+
+def test_switching_proc_root_drops_adopted_entries(tmp_path):
+    a, b = tmp_path / "a", tmp_path / "b"
+    _fake_proc(a, 301, ["claude", "s-a"])
+    b.mkdir()
+    reg = core.ProcessRegistry(rescan_interval_s=3600)
+    assert reg.find("s-a", proc_root=a) == 301
+    assert reg.find("s-a", proc_root=b) is None
+    assert reg.stats["scans"] == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open")
+                    or not Path("/proc/self").exists(), reason="requer pidfd + /proc")
+async def test_adopted_process_exit_via_pidfd():
+    marker = f"adopt-{uuid.uuid4().hex}"
+    child = subprocess.Popen([*_SLEEPER, marker])
+    try:
+        # Logo após o Popen o cmdline ainda pode estar vazio (pré-exec).
+        await _wait_until(lambda: marker.encode() in (
+            core._read_cmdline(Path("/proc"), child.pid) or b""))
+        reg = core.ProcessRegistry(adopt_filter=lambda c: marker.encode() in c)
+        assert reg.find(marker, proc_root=Path("/proc")) == child.pid
+        child.kill()
+        child.wait()
+        await _wait_until(lambda: reg.stats["reaped"] == 1)
+        assert reg.find(marker, proc_root=Path("/proc")) is None
+    finally:
+        if child.poll() is None:
+            child.kill()
+            child.wait()
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open")
+                    or not Path("/proc/self").exists(), reason="requer pidfd + /proc")
+async def test_unregister_off_loop_releases_pidfd_on_the_loop():
+    marker = f"adopt-{uuid.uuid4().hex}"
+    child = subprocess.Popen([*_SLEEPER, marker])
+    try:
+        await _wait_until(lambda: marker.encode() in (
+            core._read_cmdline(Path("/proc"), child.pid) or b""))
+        reg = core.ProcessRegistry(adopt_filter=lambda c: marker.encode() in c)
+        assert reg.find(marker, proc_root=Path("/proc")) == child.pid
+        _, fd = reg._pidfds[child.pid]
+        selector = asyncio.get_running_loop()._selector
+
+        await asyncio.to_thread(reg.unregister, child.pid)
+        await _wait_until(lambda: fd not in selector.get_map())
+
+        with pytest.raises(OSError):
+            os.fstat(fd)
+    finally:
+        child.kill()
+        child.wait()
@@ -0,0 +1,183 @@
+"""Contabilidade incremental de workspaces (``_worker_core.WorkspaceAccounting``).
+
+O cleanup periódico varria todos os arquivos de todos os workdirs a cada
+passada. Estes testes provam que os tamanhos ficam em memória entre passadas,
+que a re-medição respeita o orçamento de entradas (retomando de onde parou),
+e que o despejo segue a ordem LRU do heap.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+_REPO = Path(__file__).resolve().parents[3]
+for _p in (_REPO / "infra", _REPO / "infra" / "k8s"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+import _worker_core as core  # noqa: E402
+
+
+def _mk_workspace(root: Path, name: str, files: int, size: int = 10) -> Path:
+    ws = root / name
+    (ws / "repo" / "node_modules").mkdir(parents=True)
+    for i in range(files):
+        (ws / "repo" / "node_modules" / f"f{i}.js").write_bytes(b"x" * size)
+    return ws
+
+
+def test_dir_bytes_counts_regular_files_without_following_symlinks(tmp_path):
+    ws = _mk_workspace(tmp_path, "w", files=3)
+    os.symlink(ws / "repo", ws / "link")
+    assert core.dir_bytes(ws) == 30
+    assert core.dir_bytes(tmp_path / "missing") == 0
+
+
+def test_refresh_measures_within_budget_and_resumes(tmp_path):
+    ws = tmp_path / ("a" * 16)
+    for d in range(20):
+        (ws / f"pkg{d}").mkdir(parents=True)
+        for f in range(2):
+            (ws / f"pkg{d}" / f"f{f}").write_bytes(b"x" * 10)
+    acc = core.WorkspaceAccounting(stat_budget=15)
+
+    assert acc.total_bytes(tmp_path) == 0  # medição em andamento
+    spent = [acc.refresh(tmp_path) for _ in range(6)]
+    assert acc.total_bytes(tmp_path) == 400
+    assert all(s <= 15 + 20 for s in spent)  # estouro máx.: um diretório
+
+    # Limpo: passadas seguintes não tocam no disco.
+    assert acc.refresh(tmp_path) == 0
+
+
+def test_record_and_pop_avoid_rescans(tmp_path, monkeypatch):
+    ws = _mk_workspace(tmp_path, "a" * 16, files=5)
+    acc = core.WorkspaceAccounting()
+    assert acc.record(ws) == 50
+
+    monkeypatch.setattr(core, "dir_bytes", lambda p: pytest.fail("rescanned"))
+    assert acc.known_size(ws) == 50
+    assert acc.total_bytes(tmp_path) == 50
+    assert acc.pop(ws) == 50
+    assert acc.known_size(ws) is None
+
+
+def test_dirty_workspace_is_remeasured(tmp_path):
+    ws = _mk_workspace(tmp_path, "a" * 16, files=1)
+    acc = core.WorkspaceAccounting()
+    acc.record(ws)
+    (ws / "big.bin").write_bytes(b"y" * 1000)
+    acc.mark_dirty(ws)
+    assert acc.known_size(ws) is None
+    assert acc.total_bytes(tmp_path) == 1010
+
+
+def test_workspace_in_use_stays_dirty_until_record(tmp_path):
+    ws = _mk_workspace(tmp_path, "a" * 16, files=1)
+    acc = core.WorkspaceAccounting()
+    acc.mark_dirty(ws)  # dispatch: lease adquirido
+
+    # Medição no meio da task não o dá por limpo; a próxima passada re-mede.
+    assert acc.total_bytes(tmp_path) == 10
+    assert acc.known_size(ws) is None
+    (ws / "big.bin").write_bytes(b"y" * 1000)
+    assert acc.total_bytes(tmp_path) == 1010
+
+    acc.record(ws)  # fim da task
+    assert acc.known_size(ws) == 1010
+    assert acc.refresh(tmp_path) == 0
+
+
+async def test_record_soon_logs_failures(tmp_path, monkeypatch, caplog):
+    acc = core.WorkspaceAccounting()
+
+    def _boom(path):
+        raise OSError("disco sumiu")
+
+    monkeypatch.setattr(core, "dir_bytes", _boom)
+    with caplog.at_level("WARNING", logger="deile.worker_core"):
+        with pytest.raises(OSError):
+            await acc.record_soon(tmp_path)
+    assert "disco sumiu" in caplog.text
+
+
+def test_vanished_workspaces_are_forgotten(tmp_path):
+    ws = _mk_workspace(tmp_path, "a" * 16, files=2)
+    acc = core.WorkspaceAccounting()
+    acc.record(ws)
+    shutil.rmtree(ws)
+    assert acc.total_bytes(tmp_path) == 0
+
+
+def test_eviction_order_is_lru_then_largest(tmp_path):
+    acc = core.WorkspaceAccounting()
+    old_small = _mk_workspace(tmp_path, "a" * 16, files=1)
+    old_big = _mk_workspace(tmp_path, "b" * 16, files=9)
+    recent = _mk_workspace(tmp_path, "c" * 16, files=1)
+    acc.record(old_small, last_used=100.0)
+    acc.record(old_big, last_used=100.0)
+    acc.record(recent, last_used=200.0)
+    assert acc.eviction_order([recent, old_small, old_big]) == [old_big, old_small, recent]
+
+
+def test_startup_cleanup_uses_accounted_size(tmp_path, monkeypatch):
+    ws = _mk_workspace(tmp_path, "a" * 16, files=4)
+    old = time.time() - 30 * 86400
+    os.utime(ws, (old, old))
+    acc = core.WorkspaceAccounting()
+    acc.record(ws, last_used=old)
+    os.utime(ws, (old, old))
+    monkeypatch.setattr(core, "dir_bytes", lambda p: pytest.fail("rescanned"))
+    res = core.startup_cleanup(tmp_path, retention_days=7, accounting=acc)
+    assert res["workdirs_removed"] == 1
+    assert res["bytes_freed"] == 40
+
+
+def test_filesystem_used_bytes(tmp_path):
+    used = core.filesystem_used_bytes(tmp_path)
+    assert used is None or used > 0
+
+
+# --------------------------------------------------------------------------- #
+# claude_worker_server: despejo LRU parando abaixo do cap
+# --------------------------------------------------------------------------- #
+
+
+@pytest.fixture
+def cws():
+    spec = importlib.util.spec_from_file_location(
+        "cws_accounting_test", str(_REPO / "infra" / "k8s" / "claude_worker_server.py"),
+    )
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules["cws_accounting_test"] = mod
+    spec.loader.exec_module(mod)  # type: ignore[union-attr]
+    return mod
+
+
+def test_aggressive_cleanup_evicts_coldest_until_under_cap(cws, tmp_path, monkeypatch):
+    now = time.time()
+    ages = {"a" * 16: 1200, "b" * 16: 1000, "c" * 16: 900}  # > TTL agressivo, < padrão
+    for name, age in ages.items():
+        ws = _mk_workspace(tmp_path, name, files=10, size=100)  # 1000 bytes
+        (ws / ".lease.json").write_text(json.dumps({"heartbeat_at": now - age}))
+        cws._WORKSPACE_ACCOUNTING.record(ws, last_used=now - age)
+    monkeypatch.setattr(cws, "_WORKSPACE_AGGRESSIVE_BYTES", 2500)
+    monkeypatch.setattr(cws, "_WORKSPACE_AGGRESSIVE_TTL_S", 600)
+    monkeypatch.setattr(cws, "_WORKSPACE_STALE_TTL_S", 1800)
+    monkeypatch.setattr(cws, "_get_alive_pods", lambda root: None)
+
+    summary = cws._cleanup_stale_workspaces(tmp_path)
+
+    assert summary["threshold_s"] == 600
+    assert summary["removed"] == 1
+    lease_bytes = len(json.dumps({"heartbeat_at": now - 1200}))
+    assert summary["bytes_freed"] == 1000 + lease_bytes
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["b" * 16, "c" * 16]
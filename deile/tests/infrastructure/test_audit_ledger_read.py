@@ -181,3 +181,31 @@ def test_audit_cost_functions_come_from_shared_module(audit, jc):
     tk = {"in": 100, "out": 50, "cc": 200, "cr": 300, "cc_5m": 150, "cc_1h": 50}
     assert audit.cost_of_model(tk, "claude-opus-4-5") == jc.cost_of_model(
         tk, "claude-opus-4-5")
+
+
+def test_parser_resumes_from_checkpoint(audit, tmp_path):
+    """Segunda execução só lê o anexado e chega aos mesmos totais."""
+    proj = tmp_path / ".claude" / "projects" / "-home-claude-work-t1"
+    proj.mkdir(parents=True)
+    f = proj / "s1.jsonl"
+
+    def _rec(mid, n):
+        return json.dumps({"type": "assistant", "requestId": "r" + mid,
+                           "timestamp": "2026-06-01T10:00:00.000Z",
+                           "message": {"id": mid, "role": "assistant",
+                                       "model": "claude-opus-4-5",
+                                       "usage": {"input_tokens": n,
+                                                 "output_tokens": 1}}}) + "\n"
+
+    f.write_text(_rec("m1", 10) + _rec("m1", 10), encoding="utf-8")
+    code = audit.IN_POD_PARSER.replace(
+        '"/home/claude/.claude/projects"', json.dumps(str(proj.parent)))
+    ledger = tmp_path / ".claude" / "cost-ledger.jsonl"
+    first = _run_parser(code, ledger)
+    assert first[0]["models"]["claude-opus-4-5"]["in"] == 10
+    assert (tmp_path / ".claude" / ".audit-checkpoint.json").is_file()
+    with open(f, "a", encoding="utf-8") as fh:
+        fh.write(_rec("m2", 5))
+    second = _run_parser(code, ledger)
+    assert second[0]["models"]["claude-opus-4-5"]["in"] == 15
+    assert second[0]["assistant_rounds"] == 2
@@ -140,6 +140,8 @@ def test_main_logs_warning_when_oauth_token_absent(cws_mod, monkeypatch, tmp_pat
     """Sem CLAUDE_CODE_OAUTH_TOKEN → warning logado no startup (não abort)."""
     monkeypatch.delenv("CLAUDE_CODE_OAUTH_TOKEN", raising=False)
     monkeypatch.setenv("DEILE_CLAUDE_WORKER_ROOT", str(tmp_path))
+    # O startup cleanup colhe/poda ~/.claude/projects — nunca o HOME real.
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
     monkeypatch.setenv("DEILE_CLAUDE_WORKER_HOST", "127.0.0.1")
     monkeypatch.setenv("DEILE_CLAUDE_WORKER_PORT", "19999")
     # Bearer de teste (fallback env de _read_auth_token) — sem ele o startup
@@ -306,3 +306,43 @@ def test_harvested_record_preserves_full_detail(cws, env, monkeypatch):
     assert rec["ultracode"] is True
     assert rec["stage"] == "implement"
     assert rec["source_mtime"] == pytest.approx(old, abs=2)
+
+
+# --------------------------------------------------------------------------- #
+# Catálogo de sessões: resolve/órfãos sem varrer projects/ a cada ciclo.
+# --------------------------------------------------------------------------- #
+def test_orphan_scan_reuses_catalog_between_cycles(cws, env):
+    _make_project(env["projects"], TASK_A, "sess-a", mtime_age_s=7200)
+    _make_project(env["projects"], TASK_B, "sess-b", mtime_age_s=7200)
+    (env["work"] / TASK_B).mkdir()
+    now = time.time()
+
+    first = cws._orphan_jsonl_scan(env["work"], env["projects"], 3600, now, 0)
+    catalog = cws._session_catalog(env["projects"])
+    relists, measures = catalog.stats["relists"], catalog.stats["measures"]
+    second = cws._orphan_jsonl_scan(env["work"], env["projects"], 3600, now, 0)
+
+    assert first == second
+    assert [p.name for p in first[0]] == [f"-home-claude-work-{TASK_A}"]
+    assert first[1] > 0
+    assert catalog.stats["relists"] == relists
+    assert catalog.stats["measures"] == measures
+
+
+def test_harvest_persists_catalog_and_forgets_pruned(cws, env):
+    _make_project(env["projects"], TASK_A, "sess-a", mtime_age_s=7200)
+    cws._harvest_and_prune_orphan_jsonl(
+        env["work"], projects_dir=env["projects"], ledger_path=env["ledger"],
+        grace_s=3600, retention_days=0, now=time.time(),
+    )
+    catalog = cws._session_catalog(env["projects"])
+    assert catalog.session("sess-a") is None
+    assert (env["home"] / ".claude" / "session-catalog.json").exists()
+
+
+def test_resolve_jsonl_path_falls_back_to_catalog(cws, env, monkeypatch):
+    monkeypatch.setenv("HOME", str(env["home"]))
+    pdir = _make_project(env["projects"], TASK_A, "sess-x", mtime_age_s=7200)
+    got = cws._resolve_jsonl_path("sess-x", Path("/somewhere/else"))
+    assert got == pdir / "sess-x.jsonl"
+    assert cws._resolve_jsonl_path("nope", Path("/somewhere/else")) is None
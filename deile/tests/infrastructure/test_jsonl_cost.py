@@ -323,3 +323,306 @@ def test_summarize_brief_capped(jc, tmp_path):
 ])
 def test_context_window_of_model(jc, model, expected):
     assert jc.context_window_of_model(model) == expected
+
+
+# --- IncrementalAggregator / read_appended (checkpoint por arquivo) -----------
+def _append(path: Path, records, *, newline: bool = True):
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write("\n".join(json.dumps(r) for r in records) + ("\n" if newline else ""))
+
+
+def _usage_rec(mid, tokens_in):
+    return _assistant("claude-opus-4-5", mid, "r-" + mid,
+                      {"input_tokens": tokens_in, "output_tokens": 1})
+
+
+def test_incremental_parses_only_appended_bytes(jc, tmp_path):
+    f = tmp_path / "sess-inc.jsonl"
+    _append(f, [_usage_rec("m1", 10), _usage_rec("m1", 10)])
+    state = tmp_path / "ck.json"
+    agg = jc.IncrementalAggregator(str(state))
+    first = agg.update(str(f))
+    assert first["reset"] is True
+    assert first["delta"]["claude-opus-4-5"]["in"] == 10
+    assert agg.update(str(f)) is None  # nada novo
+    _append(f, [_usage_rec("m1", 10), _usage_rec("m2", 5)])  # m1 repetido = dedup
+    second = agg.update(str(f))
+    assert second["reset"] is False
+    assert second["delta"] == {"claude-opus-4-5": {
+        "in": 5, "out": 1, "cc": 0, "cr": 0, "cc_5m": 0, "cc_1h": 0}}
+    # Paridade com o parse completo.
+    assert second["summary"] == jc.summarize_jsonl(str(f))
+    agg.save()
+    # Checkpoint persistido: nova instância retoma sem reler.
+    agg2 = jc.IncrementalAggregator(str(state))
+    assert agg2.update(str(f)) is None
+    assert agg2.summary(str(f))["assistant_rounds"] == 2
+
+
+def test_incremental_defers_partial_trailing_line(jc, tmp_path):
+    f = tmp_path / "sess-partial.jsonl"
+    _append(f, [_usage_rec("m1", 7)])
+    full = json.dumps(_usage_rec("m2", 3))
+    with open(f, "a", encoding="utf-8") as fh:
+        fh.write(full[:20])  # escrita em andamento
+    agg = jc.IncrementalAggregator()
+    agg.update(str(f))
+    assert agg.summary(str(f))["assistant_rounds"] == 1
+    with open(f, "a", encoding="utf-8") as fh:
+        fh.write(full[20:])  # completa sem \n final — JSON válido é consumido
+    upd = agg.update(str(f))
+    assert upd["delta"]["claude-opus-4-5"]["in"] == 3
+    assert agg.summary(str(f)) == jc.summarize_jsonl(str(f))
+
+
+def test_incremental_resets_on_truncation_and_rotation(jc, tmp_path):
+    f = tmp_path / "sess-rot.jsonl"
+    _append(f, [_usage_rec("m1", 10), _usage_rec("m2", 10)])
+    agg = jc.IncrementalAggregator()
+    agg.update(str(f))
+    f.write_text(json.dumps(_usage_rec("m9", 4)) + "\n", encoding="utf-8")  # truncou
+    upd = agg.update(str(f))
+    assert upd["reset"] is True
+    assert agg.summary(str(f))["models"]["claude-opus-4-5"]["in"] == 4
+    # Rotação: arquivo novo (inode novo) no mesmo path.
+    rotated = tmp_path / "new.jsonl"
+    _append(rotated, [_usage_rec("m5", 1), _usage_rec("m6", 1), _usage_rec("m7", 1)])
+    rotated.replace(f)
+    upd = agg.update(str(f))
+    assert upd["reset"] is True
+    assert agg.summary(str(f))["assistant_rounds"] == 3
+
+
+def test_incremental_scan_prunes_missing_files(jc, tmp_path):
+    a, b = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    _append(a, [_usage_rec("m1", 1)])
+    _append(b, [_usage_rec("m1", 2)])
+    agg = jc.IncrementalAggregator()
+    assert len(agg.scan([str(a), str(b)])) == 2
+    b.unlink()
+    assert agg.scan([str(a)]) == []
+    assert set(agg.summaries()) == {str(a)}
+
+
+def test_incremental_state_keeps_only_recent_dedup_keys(jc, tmp_path):
+    f = tmp_path / "sess-long.jsonl"
+    _append(f, [_usage_rec(f"m{i}", 1) for i in range(jc.DEDUP_WINDOW + 50)])
+    state = tmp_path / "ck.json"
+    agg = jc.IncrementalAggregator(str(state))
+    agg.update(str(f))
+    agg.save()
+
+    entry = json.loads(state.read_text().splitlines()[1])["e"]
+    assert len(entry["acc"]["seen"]) == jc.DEDUP_WINDOW
+    assert "records" not in entry["acc"]
+    # Streaming repete o round logo em seguida: a janela recente basta.
+    _append(f, [_usage_rec(f"m{jc.DEDUP_WINDOW + 49}", 1), _usage_rec("new", 1)])
+    agg2 = jc.IncrementalAggregator(str(state))
+    agg2.update(str(f))
+    assert agg2.summary(str(f))["assistant_rounds"] == jc.DEDUP_WINDOW + 51
+
+
+def test_incremental_save_appends_only_changed_files(jc, tmp_path):
+    files = [tmp_path / f"s{i}.jsonl" for i in range(3)]
+    for i, f in enumerate(files):
+        _append(f, [_usage_rec("m1", i + 1)])
+    state = tmp_path / "ck.json"
+    agg = jc.IncrementalAggregator(str(state))
+    agg.scan([str(f) for f in files])
+    agg.save()
+    assert len(state.read_text().splitlines()) == 4  # cabeçalho + 3 entradas
+
+    agg.save()  # nada mudou: não reescreve
+    assert len(state.read_text().splitlines()) == 4
+    _append(files[1], [_usage_rec("m2", 7)])
+    agg.scan([str(f) for f in files])
+    agg.save()
+    lines = state.read_text().splitlines()
+    assert len(lines) == 5 and json.loads(lines[-1])["p"] == str(files[1])
+
+    files[2].unlink()
+    agg.scan([str(f) for f in files[:2]])
+    agg.save()
+    assert json.loads(state.read_text().splitlines()[-1]) == {"p": str(files[2]), "e": None}
+
+    reloaded = jc.IncrementalAggregator(str(state))
+    assert set(reloaded.summaries()) == {str(files[0]), str(files[1])}
+    assert reloaded.summary(str(files[1]))["models"]["claude-opus-4-5"]["in"] == 9
+    assert reloaded.update(str(files[1])) is None
+
+
+def test_incremental_journal_is_compacted(jc, tmp_path):
+    f = tmp_path / "sess.jsonl"
+    state = tmp_path / "ck.json"
+    agg = jc.IncrementalAggregator(str(state))
+    for i in range(agg._COMPACT_SLACK + 5):
+        _append(f, [_usage_rec(f"m{i}", 1)])
+        agg.update(str(f))
+        agg.save()
+    assert len(state.read_text().splitlines()) <= agg._COMPACT_SLACK + 3
+    reloaded = jc.IncrementalAggregator(str(state))
+    assert reloaded.summary(str(f)) == jc.summarize_jsonl(str(f))
+
+
+def test_incremental_cli_emits_only_deltas(jc, tmp_path, capsys):
+    root = tmp_path / "projects" / "-home-claude-work-t1"
+    root.mkdir(parents=True)
+    f = root / "s1.jsonl"
+    _append(f, [_usage_rec("m1", 10)])
+    state = tmp_path / "ck.json"
+    argv = ["--root", str(tmp_path / "projects"), "--state", str(state)]
+    assert jc.main(argv) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert [d["session_id"] for d in out] == ["s1"]
+    assert jc.main(argv) == 0
+    assert json.loads(capsys.readouterr().out) == []
+    _append(f, [_usage_rec("m2", 3)])
+    jc.main(argv)
+    out = json.loads(capsys.readouterr().out)
+    assert out[0]["delta"]["claude-opus-4-5"]["in"] == 3
+
+
+# --------------------------------------------------------------------------- #
+# SessionCatalog — índice session_id → JSONL sem varrer projects/             #
+# --------------------------------------------------------------------------- #
+def _ctx_rec(mid, inp, cache_read):
+    return _assistant("claude-opus-4-5", mid, "r-" + mid, {
+        "input_tokens": inp, "cache_read_input_tokens": cache_read,
+        "output_tokens": 1})
+
+
+def _age_dir(path, seconds=60):
+    import os
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - int(seconds * 1e9)))
+
+
+def test_catalog_context_peak_reads_only_appended_bytes(jc, tmp_path):
+    f = tmp_path / "sess.jsonl"
+    _append(f, [_ctx_rec("m1", 100, 5000), _ctx_rec("m2", 100, 9000)])
+    cat = jc.SessionCatalog(str(tmp_path / "projects"))
+    assert cat.context_peak(str(f)) == 9100
+    read = cat.stats["bytes_read"]
+    assert cat.context_peak(str(f)) == 9100
+    assert cat.stats["bytes_read"] == read  # nada novo, nada lido
+    _append(f, [_ctx_rec("m3", 10, 100)])
+    assert cat.context_peak(str(f)) == 9100  # pico, não soma
+    _append(f, [_ctx_rec("m4", 10, 20000)])
+    assert cat.context_peak(str(f)) == 20010
+    assert cat.session("sess")["peak_context_tokens"] == 20010
+    # Truncamento: o pico antigo não sobrevive à reescrita.
+    f.write_text(json.dumps(_ctx_rec("m9", 1, 2)) + "\n", encoding="utf-8")
+    assert cat.context_peak(str(f)) == 3
+
+
+def test_catalog_locate_relists_only_changed_dirs(jc, tmp_path):
+    projects = tmp_path / "projects"
+    for i in range(5):
+        d = projects / f"-home-claude-work-t{i}"
+        d.mkdir(parents=True)
+        _append(d / f"s{i}.jsonl", [_ctx_rec("m", 1, 1)])
+        _age_dir(d)
+    cat = jc.SessionCatalog(str(projects))
+    assert cat.locate("s3") == str(projects / "-home-claude-work-t3" / "s3.jsonl")
+    assert cat.stats["relists"] == 5
+    assert cat.locate("s1") is not None
+    assert cat.stats["syncs"] == 1  # hit: sem tocar no filesystem além do isfile
+
+    new_dir = projects / "-home-claude-work-t1"
+    _append(new_dir / "s-new.jsonl", [_ctx_rec("m", 1, 1)])
+    assert cat.locate("s-new") == str(new_dir / "s-new.jsonl")
+    assert cat.stats["relists"] == 6  # só o dir que mudou
+    assert cat.locate("missing") is None
+
+
+def test_catalog_persists_and_ignores_other_roots(jc, tmp_path):
+    projects = tmp_path / "projects"
+    d = projects / "-home-claude-work-t1"
+    d.mkdir(parents=True)
+    f = d / "s1.jsonl"
+    _append(f, [_ctx_rec("m1", 10, 40)])
+    _age_dir(d)
+    state = tmp_path / "catalog.json"
+    cat = jc.SessionCatalog(str(projects), str(state))
+    cat.sync()
+    assert cat.context_peak(str(f)) == 50
+    cat.save()
+
+    warm = jc.SessionCatalog(str(projects), str(state))
+    assert warm.session("s1")["peak_context_tokens"] == 50
+    assert warm.context_peak(str(f)) == 50
+    assert warm.stats["bytes_read"] == 0
+    assert warm.sync() == 0
+
+    other = jc.SessionCatalog(str(tmp_path / "elsewhere"), str(state))
+    assert other.session("s1") is None
+
+
+def test_catalog_project_bytes_and_forget(jc, tmp_path):
+    projects = tmp_path / "projects"
+    d = projects / "-home-claude-work-t1"
+    (d / "sub").mkdir(parents=True)
+    (d / "s1.jsonl").write_bytes(b"x" * 30)
+    (d / "sub" / "extra.bin").write_bytes(b"y" * 12)
+    _age_dir(d)
+    cat = jc.SessionCatalog(str(projects))
+    cat.sync()
+    assert cat.project_sessions(d.name) == [str(d / "s1.jsonl")]
+    assert cat.project_bytes(d.name) == 42
+    assert cat.project_bytes(d.name) == 42
+    assert cat.stats["measures"] == 1
+    cat.forget_project(d.name)
+    assert cat.projects() == []
+    assert cat.session("s1") is None
+
+
+def test_catalog_project_bytes_follow_appends_without_rescanning(jc, tmp_path):
+    projects = tmp_path / "projects"
+    d = projects / "-home-claude-work-t1"
+    (d / "s1" / "subagents").mkdir(parents=True)
+    (d / "s1.jsonl").write_bytes(b"x" * 30)
+    (d / "s1" / "subagents" / "agent-a.jsonl").write_bytes(b"y" * 10)
+    for sub in (d / "s1" / "subagents", d / "s1", d):
+        _age_dir(sub)
+    cat = jc.SessionCatalog(str(projects))
+    cat.sync()
+    assert cat.project_bytes(d.name) == 40
+
+    # Append não mexe no mtime de dir nenhum.
+    with open(d / "s1.jsonl", "ab") as fh:
+        fh.write(b"x" * 5)
+    with open(d / "s1" / "subagents" / "agent-a.jsonl", "ab") as fh:
+        fh.write(b"y" * 7)
+    assert cat.project_bytes(d.name) == 52
+    assert cat.stats["measures"] == 1
+
+    (d / "s1" / "subagents" / "agent-b.jsonl").write_bytes(b"z" * 3)
+    assert cat.project_bytes(d.name) == 55
+    assert cat.stats["measures"] == 2
+
+
+def test_catalog_locate_does_not_hold_the_lock_while_scanning(jc, tmp_path, monkeypatch):
+    import threading
+    projects = tmp_path / "projects"
+    d = projects / "-home-claude-work-t1"
+    d.mkdir(parents=True)
+    _append(d / "s1.jsonl", [_ctx_rec("m", 1, 1)])
+    cat = jc.SessionCatalog(str(projects))
+    real = jc._list_sessions
+    lock_free = []
+
+    def _probe(path):
+        def _try():
+            acquired = cat._lock.acquire(timeout=1)
+            if acquired:
+                cat._lock.release()
+            lock_free.append(acquired)
+
+        t = threading.Thread(target=_try)
+        t.start()
+        t.join()
+        return real(path)
+
+    monkeypatch.setattr(jc, "_list_sessions", _probe)
+    assert cat.locate("s1") == str(d / "s1.jsonl")
+    assert lock_free == [True]
@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import tempfile
+import time
 from pathlib import Path
 
-from deile.log_mgmt.log_analyzer import (Anomaly, _detect_auth_expiry,
+from deile.log_mgmt.log_analyzer import (Anomaly, LogAnalyzer,
+                                         _detect_auth_expiry,
                                          _detect_error_spike, _detect_flooding,
                                          _detect_silent_pipeline, _get_config,
-                                         _scan_files, scan_crash_loops,
-                                         scan_logs)
+                                         _scan_files, get_analyzer,
+                                         scan_crash_loops, scan_logs)
 from deile.log_mgmt.log_patterns import Severity
 
 
@@ -360,3 +362,157 @@ class TestAnomaly:
         assert len(d["sample_lines"]) == 5  # capped at 5
         assert d["count"] == 42
         assert d["threshold"] == 10
+
+
+# ── LogAnalyzer incremental ─────────────────────────────────────────────────
+
+
+def _pod_log(root: Path, pod: str = "deile-pipeline") -> Path:
+    (root / pod).mkdir(parents=True, exist_ok=True)
+    return root / pod / f"{pod}.log"
+
+
+def _ts(epoch: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(epoch)) + ",000"
+
+
+_THRESHOLDS = dict(error_rate_threshold=1, flood_threshold=1000, silent_tick_threshold=1000)
+
+
+class TestLogAnalyzer:
+    """Tests for the incremental LogAnalyzer behind scan_logs."""
+
+    def test_second_scan_reads_only_appended_bytes(self, tmp_path):
+        log = _pod_log(tmp_path)
+        log.write_text("INFO boot\n" * 100)
+        analyzer = LogAnalyzer(str(tmp_path))
+        analyzer.scan(**_THRESHOLDS)
+        first = analyzer.stats["bytes_read"]
+        assert first == log.stat().st_size
+
+        with log.open("a") as fh:
+            fh.write("INFO more\n")
+        analyzer.scan(**_THRESHOLDS)
+        assert analyzer.stats["bytes_read"] - first == len("INFO more\n")
+
+    def test_partial_line_waits_for_newline(self, tmp_path):
+        log = _pod_log(tmp_path)
+        log.write_text("INFO ok\nERROR half")
+        analyzer = LogAnalyzer(str(tmp_path))
+        analyzer.scan(**_THRESHOLDS)
+        assert analyzer.pods["deile-pipeline"].offset == len("INFO ok\n")
+        with log.open("a") as fh:
+            fh.write(" done\n")
+        analyzer.scan(**_THRESHOLDS)
+        assert list(analyzer.pods["deile-pipeline"].error_samples) == ["ERROR half done"]
+
+    def test_error_rate_uses_real_timestamps(self, tmp_path):
+        now = 1_780_000_000.0
+        old = [f"{_ts(now - 3600)} ERROR deile.x old failure"] * 50
+        recent = [f"{_ts(now - 30)} ERROR deile.x new failure"] * 4
+        _pod_log(tmp_path).write_text("\n".join(old + recent) + "\n")
+        analyzer = LogAnalyzer(str(tmp_path), window_s=300)
+
+        anomalies = analyzer.scan(error_rate_threshold=0, flood_threshold=1000,
+                                  silent_tick_threshold=1000, now=now)
+        spike = [a for a in anomalies if a.pattern_name == "error_rate_spike"]
+        assert [a.count for a in spike] == [4]  # the hour-old burst is outside the window
+
+    def test_continuation_lines_inherit_timestamp(self, tmp_path):
+        now = 1_780_000_000.0
+        _pod_log(tmp_path).write_text(
+            f"{_ts(now - 3600)} ERROR deile.x boom\nTraceback (most recent call last):\n")
+        analyzer = LogAnalyzer(str(tmp_path))
+        assert analyzer.scan(error_rate_threshold=0, flood_threshold=1000,
+                             silent_tick_threshold=1000, now=now) == []
+
+    def test_auth_and_flood_detected_in_one_pass(self, tmp_path):
+        now = time.time()
+        lines = [f"{_ts(now - i % 60)} WARNING deile.bot retrying send" for i in range(300)]
+        lines.append(f"{_ts(now)} ERROR deile.bot invalid authentication credentials")
+        _pod_log(tmp_path, "deile-bot").write_text("\n".join(lines) + "\n")
+        analyzer = LogAnalyzer(str(tmp_path))
+
+        anomalies = analyzer.scan(error_rate_threshold=100, flood_threshold=200,
+                                  silent_tick_threshold=1000, now=now)
+        by_name = {a.pattern_name: a for a in anomalies}
+        assert by_name["log_flooding"].count == 300
+        assert by_name["log_flooding"].sample_lines == ["deile.bot retrying send"]
+        assert by_name["auth_expired_anthropic"].count == 1
+
+    def test_rotation_reads_tail_of_rotated_file(self, tmp_path):
+        log = _pod_log(tmp_path)
+        log.write_text("INFO a\n")
+        analyzer = LogAnalyzer(str(tmp_path))
+        analyzer.scan(**_THRESHOLDS)
+
+        with log.open("a") as fh:
+            fh.write("ERROR written before rotation\n")
+        log.rename(log.with_name(log.name + ".1"))
+        log.write_text("ERROR after rotation\n")
+        analyzer.scan(**_THRESHOLDS)
+        assert list(analyzer.pods["deile-pipeline"].error_samples) == [
+            "ERROR written before rotation", "ERROR after rotation"]
+
+    def test_truncation_restarts_from_zero(self, tmp_path):
+        log = _pod_log(tmp_path)
+        log.write_text("INFO x\n" * 50)
+        analyzer = LogAnalyzer(str(tmp_path))
+        analyzer.scan(**_THRESHOLDS)
+        with log.open("r+") as fh:
+            fh.truncate(0)
+        log.write_text("ERROR fresh\n")
+        analyzer.scan(**_THRESHOLDS)
+        assert list(analyzer.pods["deile-pipeline"].error_samples) == ["ERROR fresh"]
+
+    def test_first_sight_starts_near_the_tail(self, tmp_path):
+        log = _pod_log(tmp_path)
+        log.write_text("ERROR ancient\n" * 1000 + "INFO recent\n")
+        analyzer = LogAnalyzer(str(tmp_path), initial_tail_bytes=64)
+        analyzer.scan(**_THRESHOLDS)
+        assert analyzer.stats["bytes_read"] <= 64
+        assert list(analyzer.pods["deile-pipeline"].tail)[-1] == "INFO recent"
+
+    def test_state_survives_restart(self, tmp_path):
+        log = _pod_log(tmp_path / "logs")
+        log.write_text("tick completed activity=0\n" * 5)
+        state = tmp_path / "state.json"
+        LogAnalyzer(str(tmp_path / "logs"), state_path=str(state)).scan(**_THRESHOLDS)
+
+        restarted = LogAnalyzer(str(tmp_path / "logs"), state_path=str(state))
+        with log.open("a") as fh:
+            fh.write("tick completed activity=0\n" * 5)
+        anomalies = restarted.scan(error_rate_threshold=100, flood_threshold=1000,
+                                   silent_tick_threshold=10)
+        assert restarted.stats["bytes_read"] == len("tick completed activity=0\n") * 5
+        assert [a.count for a in anomalies if a.pattern_name == "pipeline_silent"] == [10]
+
+    def test_flood_sketch_memory_is_bounded(self, tmp_path):
+        lines = [f"INFO unique {i}" for i in range(5000)] + ["INFO flood"] * 300
+        _pod_log(tmp_path).write_text("\n".join(lines) + "\n")
+        analyzer = LogAnalyzer(str(tmp_path), flood_capacity=32)
+        anomalies = analyzer.scan(error_rate_threshold=100, flood_threshold=200,
+                                  silent_tick_threshold=1000)
+        sketch = analyzer.pods["deile-pipeline"].flood
+        assert len(sketch.current.counts) <= 32
+        assert [a.sample_lines for a in anomalies if a.pattern_name == "log_flooding"] == [
+            ["INFO flood"]]
+
+    def test_removed_pods_are_forgotten(self, tmp_path):
+        log = _pod_log(tmp_path, "deile-old")
+        log.write_text("INFO x\n")
+        analyzer = LogAnalyzer(str(tmp_path))
+        analyzer.scan(**_THRESHOLDS)
+        log.unlink()
+        log.parent.rmdir()
+        analyzer.scan(**_THRESHOLDS)
+        assert analyzer.pods == {}
+
+    def test_scan_logs_reuses_analyzer_between_calls(self, tmp_path):
+        _pod_log(tmp_path).write_text("INFO x\n")
+        scan_logs(log_dir=str(tmp_path))
+        analyzer = get_analyzer(str(tmp_path))
+        read = analyzer.stats["bytes_read"]
+        scan_logs(log_dir=str(tmp_path))
+        assert analyzer.stats["bytes_read"] == read
+        assert analyzer.stats["scans"] == 2
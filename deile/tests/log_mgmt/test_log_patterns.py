@@ -6,6 +6,7 @@ import pytest
 
 from deile.log_mgmt.log_patterns import (ALL_PATTERNS, AUTH_EXPIRED_PATTERNS,
                                          CRASH_PATTERNS, PIPELINE_PATTERNS,
+                                         ChunkMatcher,
                                          RUNTIME_ERROR_PATTERNS, Severity,
                                          match_critical, match_line)
 
@@ -167,3 +168,30 @@ class TestMatchCritical:
         matches = match_critical(line)
         names = [m.name for m in matches]
         assert "module_not_found" not in names  # ERROR, not CRITICAL
+
+
+class TestChunkMatcher:
+    """ChunkMatcher must agree with match_line line by line."""
+
+    def test_agrees_with_match_line(self):
+        lines = [
+            "2026-05-28 14:00:00,001 INFO deile.pipeline tick completed activity=0",
+            "2026-05-28 14:00:01,002 ERROR deile.worker Connection Refused by host",
+            "Traceback (most recent call last):",
+            "please run `claude auth login` — Not Logged In",
+            "plain line without anything",
+            "",
+            "ModuleNotFoundError: No module named 'x'  /  modulenotfounderror lower",
+            "İstanbul CRASHLOOPBACKOFF detected",
+            "dispatch.completed ok=False; also Timed Out",
+        ]
+        hits = ChunkMatcher().scan("\n".join(lines))
+        for idx, line in enumerate(lines):
+            expected = [p.name for p in match_line(line)]
+            assert sorted(p.name for p in hits.get(idx, [])) == sorted(expected), line
+
+    def test_subset_of_patterns(self):
+        matcher = ChunkMatcher(AUTH_EXPIRED_PATTERNS)
+        hits = matcher.scan("ERROR boom\ninvalid api key")
+        assert {idx: [p.name for p in pats] for idx, pats in hits.items()} == {
+            1: ["auth_expired_openai"]}
@@ -0,0 +1,116 @@
+"""Hybrid retrieval for episodic and semantic memory.
+
+Covers:
+  1. ``fts_match_query`` neutralises FTS operators and emits prefix terms.
+  2. RRF rewards documents returned by both legs.
+  3. Episodes: BM25 ranks by relevance (not recency), session filter,
+     empty query returns the most recent, one connection is reused.
+  4. Legacy ``episodes.db`` (no FTS, no vector file) is indexed on
+     initialize, and a missing vector index is rebuilt from SQLite.
+  5. Semantic: search spans the whole base (not just the last N entries)
+     and derived indexes are rebuilt from ``knowledge.jsonl``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from deile.memory.episodic_memory import EpisodicMemory
+from deile.memory.retrieval import fts_match_query, reciprocal_rank_fusion
+from deile.memory.semantic_memory import SemanticMemory
+
+
+def test_fts_match_query_quotes_tokens():
+    assert fts_match_query('deploy NOT "prod"') == '"deploy"* OR "not"* OR "prod"*'
+    assert fts_match_query("  ?! ") is None
+
+
+def test_rrf_prefers_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "b", "x"]])
+    assert {doc for doc, _ in fused[:2]} == {"b", "c"}
+    assert {doc for doc, _ in fused} == {"a", "b", "c", "x"}
+
+
+async def test_episode_search_ranks_by_relevance(tmp_path: Path) -> None:
+    mem = EpisodicMemory(storage_dir=tmp_path)
+    await mem.initialize()
+    try:
+        target = await mem.store_episode(
+            "how do I configure the redis cache eviction policy",
+            "set maxmemory-policy to allkeys-lru in redis.conf", session_id="s1")
+        await mem.store_episode("redis is installed?", "yes", session_id="s2")
+        for i in range(20):
+            await mem.store_episode(f"unrelated question {i}", "about gardening", session_id="s1")
+        conn = mem._conn
+
+        hits = await mem.search_episodes("redis eviction policy")
+        assert hits[0]["episode_id"] == target
+        assert hits[0]["score"] > 0
+        assert all("redis" in h["user_input"] + h["agent_response"] for h in hits[:2])
+
+        only_s2 = await mem.search_episodes("redis", session_id="s2")
+        assert {h["session_id"] for h in only_s2} == {"s2"}
+
+        recent = await mem.search_episodes("", max_results=3)
+        assert [h["user_input"] for h in recent][0] == "unrelated question 19"
+
+        stats = await mem.get_stats()
+        assert stats["fts_enabled"] and stats["vector_index_size"] == 22
+        assert mem._conn is conn
+    finally:
+        await mem.shutdown()
+    assert (tmp_path / "episodes.vec.npz").exists()
+
+
+async def test_legacy_db_is_backfilled(tmp_path: Path) -> None:
+    db = sqlite3.connect(tmp_path / "episodes.db")
+    db.execute("""CREATE TABLE episodes (episode_id TEXT PRIMARY KEY, session_id TEXT,
+                  user_input TEXT, agent_response TEXT, timestamp REAL,
+                  context TEXT, metadata TEXT)""")
+    db.execute("INSERT INTO episodes VALUES ('old1', 's', 'terraform plan drift', 'ok', 1.0, '{}', '{}')")
+    db.commit()
+    db.close()
+
+    mem = EpisodicMemory(storage_dir=tmp_path)
+    await mem.initialize()
+    try:
+        assert [h["episode_id"] for h in await mem.search_episodes("terraform")] == ["old1"]
+        # Typo: no lexical match for that token; the vector leg (trigrams) finds it.
+        assert [h["episode_id"] for h in await mem.search_episodes("terrafrom plan drift")][0] == "old1"
+    finally:
+        await mem.shutdown()
+
+    (tmp_path / "episodes.vec.npz").unlink()
+    mem = EpisodicMemory(storage_dir=tmp_path)
+    await mem.initialize()
+    try:
+        assert (await mem.get_stats())["vector_index_size"] == 1
+    finally:
+        await mem.shutdown()
+
+
+async def test_semantic_search_covers_whole_base_and_rebuilds(tmp_path: Path) -> None:
+    sm = SemanticMemory(storage_dir=tmp_path)
+    await sm.initialize()
+    try:
+        await sm.store_knowledge({"user_input": "postgres vacuum tuning",
+                                  "agent_response": "raise autovacuum workers", "extracted_at": 1})
+        for i in range(50):
+            await sm.store_knowledge({"user_input": f"note {i}", "agent_response": "misc",
+                                      "extracted_at": i + 2})
+        hits = await sm.search_knowledge("vacuum", max_results=5)
+        assert hits and hits[0]["metadata"]["user_input"] == "postgres vacuum tuning"
+    finally:
+        await sm.shutdown()
+
+    (tmp_path / "facts.db").unlink()
+    (tmp_path / "facts.vec.npz").unlink(missing_ok=True)
+    sm = SemanticMemory(storage_dir=tmp_path)
+    await sm.initialize()
+    try:
+        hits = await sm.search_knowledge("autovacuum", max_results=3)
+        assert hits[0]["metadata"]["extracted_at"] == 1
+        assert (await sm.get_stats())["vector_index_size"] == 51
+    finally:
+        await sm.shutdown()
@@ -0,0 +1,157 @@
+"""Tests: cached schedule loading + next-fire index (``schedule_service.py``)."""
+
+from __future__ import annotations
+
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from deile.orchestration.pipeline.cron import previous_at_or_before
+from deile.orchestration.pipeline.schedule_service import ScheduleService
+from deile.orchestration.pipeline.scheduler import (OneshotEntry,
+                                                    RecurringEntry, Schedule,
+                                                    ScheduleStore)
+
+NOW = datetime(2026, 5, 6, 12, 0, 30, tzinfo=timezone.utc)
+
+
+def _store(tmp_path, schedule: Schedule) -> ScheduleStore:
+    store = ScheduleStore(tmp_path)
+    store.save(schedule)
+    return store
+
+
+def _age(path, seconds: float = 60.0) -> None:
+    """Push mtime into the past so the racy-window re-hash does not apply."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - int(seconds * 1e9)))
+
+
+class TestLoadCache:
+
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        store = _store(tmp_path, Schedule(recurring=[
+            RecurringEntry(id="r", action="review", cron="*/5 * * * *")]))
+        _age(store.path)
+        service = ScheduleService(store)
+        with patch.object(store, "parse", wraps=store.parse) as parse:
+            first = service.load()
+            assert service.load() is first
+            assert service.load() is first
+        assert parse.call_count == 1
+        assert service.stats["hits"] == 2
+
+    def test_external_edit_is_picked_up(self, tmp_path):
+        store = _store(tmp_path, Schedule())
+        service = ScheduleService(store)
+        assert service.load().recurring == []
+
+        other = Schedule(recurring=[
+            RecurringEntry(id="r", action="review", cron="*/5 * * * *")])
+        ScheduleStore(tmp_path).save(other)
+        assert [e.id for e in service.load().recurring] == ["r"]
+
+    def test_touch_without_content_change_only_rehashes(self, tmp_path):
+        store = _store(tmp_path, Schedule())
+        _age(store.path)
+        service = ScheduleService(store)
+        first = service.load()
+        os.utime(store.path)  # new mtime, same bytes
+        assert service.load() is first
+        assert service.stats == {"hits": 0, "rehashes": 1, "reloads": 1}
+
+    def test_own_save_does_not_reparse(self, tmp_path):
+        store = _store(tmp_path, Schedule())
+        service = ScheduleService(store)
+        schedule = service.load()
+        schedule.add_oneshot(OneshotEntry(id="o", action="review", run_at=NOW))
+        service.save(schedule)
+        with patch.object(store, "parse") as parse:
+            assert service.load() is schedule
+        parse.assert_not_called()
+
+    def test_missing_file_and_store_without_path(self, tmp_path):
+        service = ScheduleService(ScheduleStore(tmp_path))
+        assert service.load().recurring == []
+
+        double = MagicMock()
+        double.load.return_value = Schedule()
+        assert ScheduleService(double).load() is double.load.return_value
+
+
+class TestComputePending:
+
+    def test_only_due_entries_evaluate_cron(self):
+        schedule = Schedule(recurring=[
+            RecurringEntry(id=f"r{i}", action="review", cron="0 0 1 1 *",
+                           last_run_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+            for i in range(50)
+        ] + [RecurringEntry(id="due", action="implement", cron="*/5 * * * *",
+                            last_run_at=NOW - timedelta(hours=1))])
+        service = ScheduleService(MagicMock())
+        service.compute_pending(schedule, NOW)  # builds the index
+        with patch("deile.orchestration.pipeline.scheduler.next_after") as spy:
+            pending = service.compute_pending(schedule, NOW)
+        assert [p.entry_id for p in pending] == ["due"]
+        assert spy.call_count == 0
+
+    def test_mark_run_moves_entry_out_of_due_set(self):
+        schedule = Schedule(
+            recurring=[RecurringEntry(id="r", action="review", cron="*/5 * * * *",
+                                      last_run_at=NOW - timedelta(hours=1))],
+            oneshot=[OneshotEntry(id="o", action="implement",
+                                  run_at=NOW - timedelta(minutes=1))],
+        )
+        service = ScheduleService(MagicMock())
+        pending = service.compute_pending(schedule, NOW)
+        assert [p.entry_id for p in pending] == ["o", "r"]
+        for run in pending:
+            schedule.mark_run(run, when=NOW)
+        assert service.compute_pending(schedule, NOW) == []
+        assert service.next_fire(schedule) == datetime(2026, 5, 6, 12, 5, tzinfo=timezone.utc)
+
+    def test_structural_changes_rebuild_the_index(self):
+        schedule = Schedule()
+        service = ScheduleService(MagicMock())
+        assert service.compute_pending(schedule, NOW) == []
+        schedule.add_oneshot(OneshotEntry(id="o", action="review", run_at=NOW))
+        assert [p.entry_id for p in service.compute_pending(schedule, NOW)] == ["o"]
+        schedule.remove("o")
+        assert service.compute_pending(schedule, NOW) == []
+
+    def test_reenabled_entry_becomes_due(self):
+        entry = RecurringEntry(id="r", action="review", cron="* * * * *",
+                               enabled=False, last_run_at=NOW - timedelta(hours=1))
+        schedule = Schedule(recurring=[entry])
+        service = ScheduleService(MagicMock())
+        assert service.compute_pending(schedule, NOW) == []
+        entry.enabled = True
+        assert [p.entry_id for p in service.compute_pending(schedule, NOW)] == ["r"]
+
+    def test_matches_schedule_compute_pending(self):
+        rng = random.Random(7)
+        crons = ["*/5 * * * *", "0 * * * *", "30 9 * * 1-5", "@daily", "*/15 8-18 * * *"]
+        schedule = Schedule()
+        for i in range(300):
+            schedule.add_recurring(RecurringEntry(
+                id=f"r{i}", action="review", cron=rng.choice(crons),
+                enabled=rng.random() > 0.1, replay_all=rng.random() < 0.1,
+                last_run_at=NOW - timedelta(minutes=rng.randint(0, 3000)),
+            ))
+            schedule.add_oneshot(OneshotEntry(
+                id=f"o{i}", action="implement", completed=rng.random() < 0.2,
+                run_at=NOW + timedelta(minutes=rng.randint(-600, 600)),
+            ))
+        service = ScheduleService(MagicMock())
+        for window in (None, 6):
+            expected = schedule.compute_pending(NOW, replay_window_hours=window)
+            assert service.compute_pending(
+                schedule, NOW, replay_window_hours=window) == expected
+
+
+def test_previous_at_or_before_is_inclusive():
+    slot = datetime(2026, 5, 6, 12, 0, tzinfo=timezone.utc)
+    assert previous_at_or_before("*/5 * * * *", slot) == slot
+    assert previous_at_or_before("*/5 * * * *", slot + timedelta(minutes=4, seconds=59)) == slot
+    assert previous_at_or_before("0 0 * * *", slot) == slot.replace(hour=0)
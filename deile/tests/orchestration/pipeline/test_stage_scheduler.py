@@ -0,0 +1,276 @@
+"""Tests: conflict-ordered concurrent stage scheduler (``stage_scheduler.py``)
+and its wiring into ``PipelineMonitor._dispatch_stages``.
+
+The monitor-level tests drive a fake forge whose calls sleep for an injected
+latency, so "runs concurrently" and "deferred at the deadline" are observed
+through real timing rather than mocked scheduling.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from deile.orchestration.pipeline.labels import WORKFLOW_NEW
+from deile.orchestration.pipeline.monitor import PipelineConfig, PipelineMonitor
+from deile.orchestration.pipeline.stage_scheduler import (StageHistogram,
+                                                          StageScheduler,
+                                                          StageSpec,
+                                                          _acquire_within)
+
+
+def _spec(name, log, delay=0.0, *, reads=(), writes=(), fail=False):
+    async def _run():
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{name} boom")
+        log.append(("end", name))
+    return StageSpec(name, _run, frozenset(reads), frozenset(writes))
+
+
+def _starts(log):
+    return [n for ev, n in log if ev == "start"]
+
+
+# ---------------------------------------------------------------------------
+# StageScheduler
+# ---------------------------------------------------------------------------
+
+class TestStageScheduler:
+
+    async def test_independent_stages_overlap(self):
+        log = []
+        specs = [_spec(n, log, 0.1, writes={n}) for n in ("a", "b", "c")]
+        t0 = time.perf_counter()
+        report = await StageScheduler().run(specs)
+        assert time.perf_counter() - t0 < 0.25
+        assert report.completed == ["a", "b", "c"]
+
+    async def test_conflicting_stages_keep_declaration_order(self):
+        log = []
+        specs = [
+            _spec("producer", log, 0.05, writes={"q"}),
+            _spec("consumer", log, 0.0, reads={"q"}),
+            _spec("other", log, 0.0, writes={"x"}),
+        ]
+        await StageScheduler().run(specs)
+        assert log.index(("start", "consumer")) > log.index(("end", "producer"))
+        # ``other`` does not wait for the producer.
+        assert log.index(("end", "other")) < log.index(("end", "producer"))
+
+    async def test_write_after_read_is_ordered(self):
+        log = []
+        specs = [
+            _spec("reader", log, 0.05, reads={"q"}),
+            _spec("writer", log, 0.0, writes={"q"}),
+        ]
+        await StageScheduler().run(specs)
+        assert log.index(("start", "writer")) > log.index(("end", "reader"))
+
+    async def test_sequential_mode_runs_one_after_another(self):
+        log = []
+        specs = [_spec(n, log, 0.01, writes={n}) for n in ("a", "b", "c")]
+        await StageScheduler().run(specs, sequential=True)
+        assert log == [("start", "a"), ("end", "a"), ("start", "b"),
+                       ("end", "b"), ("start", "c"), ("end", "c")]
+
+    async def test_deadline_defers_unstarted_and_carries_running(self):
+        log = []
+        scheduler = StageScheduler()
+        specs = [
+            _spec("slow", log, 0.3, writes={"q"}),
+            _spec("after_slow", log, 0.0, reads={"q"}),
+            _spec("fast", log, 0.0, writes={"x"}),
+        ]
+        t0 = time.perf_counter()
+        report = await scheduler.run(specs, deadline=0.05)
+        assert time.perf_counter() - t0 < 0.2
+        assert report.completed == ["fast"]
+        assert report.overrun == ["slow"]
+        assert report.deferred == ["after_slow"]
+        assert scheduler.overrun_stages() == ["slow"]
+
+        # Next tick: the conflicting stage waits for the carried-over one
+        # instead of racing it.
+        log.clear()
+        report = await scheduler.run([_spec("after_slow", log, reads={"q"})])
+        assert report.completed == ["after_slow"]
+        assert log[0] == ("end", "slow")
+        assert scheduler.overrun_stages() == []
+        assert scheduler.snapshot()["after_slow"]["deferred"] == 1
+
+    async def test_repeatedly_deferred_stage_is_forced_past_the_deadline(self):
+        log = []
+        scheduler = StageScheduler(max_deferrals=2)
+        specs = [
+            _spec("slow", log, 0.12, writes={"q"}),
+            _spec("victim", log, 0.0, reads={"q"}),
+        ]
+        for _ in range(2):
+            report = await scheduler.run(specs, deadline=0.03)
+            assert "victim" in report.deferred and report.forced == []
+
+        t0 = time.perf_counter()
+        report = await scheduler.run(specs, deadline=0.03)
+
+        assert report.forced == ["slow", "victim"]
+        assert report.completed == ["slow", "victim"]
+        assert time.perf_counter() - t0 > 0.12
+        # The streak resets once it ran: the next tick honours the deadline.
+        report = await scheduler.run(specs, deadline=0.03)
+        assert report.forced == [] and report.deferred == ["victim"]
+
+    async def test_exclusive_lock_times_out_without_leaking(self):
+        log = []
+        hog = StageSpec("hog", _spec("hog", log, 0.1).run, exclusive=frozenset({"gh"}))
+        other = StageSpec("other", _spec("other", log).run, exclusive=frozenset({"gh"}))
+        scheduler = StageScheduler()
+
+        report = await scheduler.run([hog, other], deadline=0.03)
+        assert report.deferred == ["other"]
+        await asyncio.sleep(0.12)
+        assert not scheduler._locks["gh"].locked()
+        assert (await scheduler.run([other], deadline=0.03)).completed == ["other"]
+
+    async def test_lock_granted_to_a_cancelled_waiter_is_released(self):
+        lock = asyncio.Lock()
+        await lock.acquire()
+        waiter = asyncio.ensure_future(_acquire_within(lock, 10))
+        await asyncio.sleep(0)
+
+        lock.release()  # handed to the pending acquire...
+        waiter.cancel()  # ...but its caller is cancelled before resuming
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+
+        assert not lock.locked()
+
+    async def test_failure_skips_dependents_and_reraises(self):
+        log = []
+        specs = [
+            _spec("bad", log, fail=True, writes={"q"}),
+            _spec("dependent", log, reads={"q"}),
+            _spec("independent", log, writes={"x"}),
+        ]
+        scheduler = StageScheduler()
+        with pytest.raises(RuntimeError, match="bad boom"):
+            await scheduler.run(specs)
+        report = scheduler.last_report
+        assert report.failed == ["bad"]
+        assert report.skipped == ["dependent"]
+        assert report.completed == ["independent"]
+
+    async def test_records_histograms(self):
+        scheduler = StageScheduler()
+        for _ in range(3):
+            await scheduler.run([_spec("a", [], 0.0)])
+        snap = scheduler.snapshot()["a"]
+        assert snap["count"] == 3
+        assert snap["buckets"]["+Inf"] == 3
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    hist = StageHistogram(buckets=(0.1, 1.0))
+    for v in (0.05, 0.05, 0.5, 5.0):
+        hist.observe(v)
+    assert hist.quantile(0.5) == 0.1
+    assert hist.quantile(0.75) == 1.0
+    assert hist.quantile(1.0) == 5.0  # +Inf bucket reports the observed max
+    assert hist.snapshot()["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+
+
+# ---------------------------------------------------------------------------
+# PipelineMonitor wiring (fake forge with injected latency)
+# ---------------------------------------------------------------------------
+
+class _LatencyForge:
+    """Records when each listing call starts/ends; sleeps ``latency[name]``."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.events = []
+        self.mock = MagicMock()
+        self.mock.ensure_pipeline_labels = AsyncMock()
+        self.mock.on_label_change = None
+        for name in ("list_unclassified_issues", "list_unclassified_prs",
+                     "list_open_prs", "list_issues_with_label"):
+            setattr(self.mock, name, self._call(name))
+
+    def _call(self, name):
+        async def _fn(*args, **kwargs):
+            key = f"{name}:{args[0]}" if args else name
+            self.events.append(("start", key, time.perf_counter()))
+            await asyncio.sleep(self.latency.get(key, self.latency.get(name, 0.0)))
+            self.events.append(("end", key, time.perf_counter()))
+            return []
+        return _fn
+
+    def first(self, ev, key):
+        return next(t for e, k, t in self.events if e == ev and k == key)
+
+
+def _make_monitor(forge, **overrides):
+    cfg = PipelineConfig(
+        repo="owner/repo",
+        base_repo_path=Path("/tmp/fake"),
+        notify_user_id="42",
+        dispatch_mode="deile_worker",
+        enable_refinement_gate=False,
+        enable_resume=False,
+        enable_implement=False,
+        enable_mention_handling=False,
+        enable_classify=True,
+        enable_review=True,
+        enable_pr_review=True,
+        enable_pr_triage=True,
+        **overrides,
+    )
+    return PipelineMonitor(
+        cfg, forge=forge.mock, notifier=MagicMock(), implementer=MagicMock(),
+        schedule_store=MagicMock(),
+    )
+
+
+class TestMonitorStageScheduling:
+
+    async def test_slow_classification_does_not_delay_pr_stages(self):
+        forge = _LatencyForge({"list_unclassified_issues": 0.3, "list_open_prs": 0.01})
+        monitor = _make_monitor(forge)
+        await monitor._dispatch_stages()
+
+        classify_end = forge.first("end", "list_unclassified_issues")
+        # PR-side stages (reconcile_review, pr_review, pr_triage) are independent
+        # of issue classification and finish while it is still in flight.
+        assert forge.first("end", "list_unclassified_prs") < classify_end
+        assert forge.first("start", "list_open_prs") < classify_end
+        # Review reads the queue classification writes: it waits.
+        assert forge.first("start", f"list_issues_with_label:{WORKFLOW_NEW}") >= classify_end
+
+        timings = monitor.stage_timings()
+        assert timings["classify"]["count"] == 1
+        assert timings["classify"]["max"] >= 0.3
+
+    async def test_deadline_defers_review_behind_slow_classification(self):
+        forge = _LatencyForge({"list_unclassified_issues": 0.4})
+        monitor = _make_monitor(forge, stage_deadline_seconds=0.1)
+        t0 = time.perf_counter()
+        await monitor._dispatch_stages()
+        assert time.perf_counter() - t0 < 0.3
+        report = monitor._stage_scheduler.last_report
+        assert report.overrun == ["classify"]
+        assert "review" in report.deferred
+        assert "pr_triage" in report.completed
+        await monitor.stop()
+        assert monitor._stage_scheduler.overrun_stages() == []
+
+    async def test_concurrent_stages_flag_restores_sequential_order(self):
+        forge = _LatencyForge({"list_unclassified_issues": 0.05})
+        monitor = _make_monitor(forge, concurrent_stages=False)
+        await monitor._dispatch_stages()
+        assert (forge.first("start", "list_unclassified_prs")
+                > forge.first("end", "list_unclassified_issues"))
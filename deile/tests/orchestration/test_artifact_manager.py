@@ -0,0 +1,159 @@
+"""Content-addressed blob store and SQLite index behind ``ArtifactManager``."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import time
+
+import pytest
+
+from deile.orchestration import artifact_manager as am
+from deile.orchestration.artifact_manager import ArtifactManager
+
+
+@pytest.fixture()
+def manager(tmp_path):
+    return ArtifactManager(artifacts_dir=tmp_path / "artifacts", codec="gzip")
+
+
+def _blob_files(manager):
+    return [p for p in manager.blobs_dir.rglob("*") if p.is_file()]
+
+
+class TestArtifactStore:
+    def test_round_trip(self, manager):
+        ref = manager.store_artifact(
+            "run_a", "bash_execute", {"command": "ls"}, {"stdout": "a\nb", "exit_code": 0},
+            execution_time=0.5, status="error", error_info={"code": 2},
+        )
+
+        artifact = manager.get_artifact(ref)
+        assert artifact["input"] == {"command": "ls"}
+        assert artifact["output"] == {"stdout": "a\nb", "exit_code": 0}
+        assert artifact["status"] == "error"
+        assert artifact["error"] == {"code": 2}
+
+        metadata = manager.get_artifact_metadata(ref)
+        assert metadata.run_id == "run_a"
+        assert metadata.sequence == 1
+        assert metadata.codec == "gzip"
+        assert metadata.output_size == len(json.dumps(artifact["output"]))
+
+    def test_identical_outputs_share_one_blob_across_runs(self, manager):
+        output = {"stdout": "same output " * 1000}
+        refs = [manager.store_artifact(run, "bash_execute", {"i": i}, output, 0.1)
+                for i, run in enumerate(["run_a", "run_a", "run_b"])]
+
+        assert len(set(refs)) == 3
+        assert len(_blob_files(manager)) == 1
+        stats = manager.get_storage_stats()
+        assert stats["artifact_count"] == 3
+        assert stats["total_files"] == 1
+        assert stats["run_count"] == 2
+        assert stats["dedup_saved_bytes"] == 2 * stats["logical_size_bytes"] // 3
+        assert stats["total_size_bytes"] < stats["logical_size_bytes"] // 3
+
+    def test_sequences_are_per_run_and_listed_from_index(self, manager):
+        manager.store_artifact("run_a", "read_file", {}, "x", 0.1)
+        manager.store_artifact("run_b", "read_file", {}, "y", 0.1)
+        manager.store_artifact("run_a", "bash_execute", {}, "z", 0.1)
+
+        listed = manager.list_run_artifacts("run_a")
+        assert [a["metadata"]["sequence"] for a in listed] == [1, 2]
+        assert [a["ref"] for a in listed] == ["artifact://run_a/read_file_001",
+                                              "artifact://run_a/bash_execute_002"]
+        assert manager.list_run_artifacts("missing") == []
+
+    def test_large_output_is_streamed_in_chunks(self, manager, monkeypatch):
+        monkeypatch.setattr(am, "_CHUNK_SIZE", 1024)
+        writes = []
+        original = am._BlobWriter.write
+
+        def _spy(self, data):
+            writes.append(len(data))
+            original(self, data)
+
+        monkeypatch.setattr(am._BlobWriter, "write", _spy)
+        output = {"stdout": "0123456789" * 10_000, "lines": list(range(2000))}
+
+        ref = manager.store_artifact("run_a", "bash_execute", {}, output, 0.1)
+
+        assert max(writes) <= 1024 * 2
+        assert manager.get_artifact(ref)["output"] == output
+        with manager.open_artifact_output(ref) as stream:
+            assert stream.read(11) == b'{"stdout": '
+
+    def test_retention_drops_old_runs_and_orphan_blobs(self, manager, monkeypatch):
+        ten_days_ago = time.time() - 10 * 86400
+        monkeypatch.setattr(am.time, "time", lambda: ten_days_ago)
+        manager.store_artifact("run_old", "t", {}, "old only", 0.1)
+        manager.store_artifact("run_old", "t", {}, "shared", 0.1)
+        monkeypatch.undo()
+        manager.store_artifact("run_new", "t", {}, "shared", 0.1)
+
+        removed = manager.cleanup_old_artifacts(days_old=1)
+
+        assert removed == 1
+        assert manager.list_run_artifacts("run_old") == []
+        assert len(manager.list_run_artifacts("run_new")) == 1
+        # "old only" is gone, "shared" is still referenced by run_new.
+        assert len(_blob_files(manager)) == 1
+        assert manager.get_storage_stats()["run_count"] == 1
+
+    def test_reference_is_opaque(self, manager):
+        ref = manager.store_artifact("run_a", "bash_execute", {}, "out", 0.1)
+
+        assert ref == "artifact://run_a/bash_execute_001"
+        assert not (manager.artifacts_dir / "run_a").exists()
+        with pytest.raises(FileNotFoundError):
+            manager.get_artifact("artifact://run_a/missing_009")
+
+    def test_legacy_runs_are_migrated_into_the_index(self, tmp_path):
+        root = tmp_path / "artifacts"
+        run_dir = root / "run_legacy"
+        run_dir.mkdir(parents=True)
+        payload = {"input": {"command": "ls"}, "output": "legacy", "timestamp": 5.0,
+                   "execution_time": 0.1, "status": "success"}
+        with gzip.open(run_dir / "bash_execute_001.json.gz", "wt") as f:
+            json.dump(payload, f)
+        (run_dir / "bash_execute_001_metadata.json").write_text(json.dumps({
+            "run_id": "run_legacy", "tool_name": "bash_execute", "sequence": 1,
+            "timestamp": 5.0, "input_hash": "h", "output_size": 10,
+            "execution_time": 0.1, "status": "success", "compressed": True,
+        }))
+        (run_dir / "read_file_002.json").write_text(json.dumps({**payload, "output": "plain"}))
+
+        manager = ArtifactManager(artifacts_dir=root, codec="gzip")
+
+        assert not run_dir.exists()
+        listed = manager.list_run_artifacts("run_legacy")
+        assert [a["metadata"]["sequence"] for a in listed] == [1, 2]
+        # Paths handed out before the migration still resolve.
+        old_path = str(run_dir / "bash_execute_001.json.gz")
+        assert manager.get_artifact(old_path) == {
+            k: payload[k] for k in ("input", "output", "timestamp", "execution_time", "status")}
+        assert manager.get_artifact_metadata(old_path).input_hash == "h"
+        assert manager.get_storage_stats()["run_count"] == 1
+        # Retention sees them: the legacy run is ancient.
+        assert manager.cleanup_old_artifacts(days_old=1) == 1
+        assert _blob_files(manager) == []
+        # New artifacts in the same run continue the sequence.
+        assert ArtifactManager(artifacts_dir=root, codec="gzip").store_artifact(
+            "run_legacy", "t", {}, "x", 0.1) == "artifact://run_legacy/t_001"
+
+    def test_unreadable_legacy_file_is_left_in_place(self, tmp_path):
+        run_dir = tmp_path / "artifacts" / "run_legacy"
+        run_dir.mkdir(parents=True)
+        (run_dir / "bash_execute_001.json").write_text("{truncated")
+
+        manager = ArtifactManager(artifacts_dir=tmp_path / "artifacts", codec="gzip")
+
+        assert (run_dir / "bash_execute_001.json").exists()
+        assert manager.list_run_artifacts("run_legacy") == []
+
+    @pytest.mark.skipif(am.zstandard is None, reason="zstandard not installed")
+    def test_zstd_codec_round_trip(self, tmp_path):
+        manager = ArtifactManager(artifacts_dir=tmp_path / "z", codec="zstd")
+        ref = manager.store_artifact("run", "t", {}, {"k": "v" * 5000}, 0.1)
+        assert manager.get_artifact(ref)["output"] == {"k": "v" * 5000}
@@ -0,0 +1,172 @@
+"""SQLite catalog behind ``PlanManager.list_plans`` and ``ApprovalSystem.list_requests``."""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from deile.orchestration.approval_system import ApprovalStatus, ApprovalSystem
+from deile.orchestration.plan_manager import (ExecutionPlan, PlanManager,
+                                              PlanStatus, PlanStep, RiskLevel,
+                                              StepStatus)
+from deile.tools.registry import ToolRegistry
+
+_BASE = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _plan(plan_id: str, minutes: int, status=PlanStatus.READY,
+          risk=RiskLevel.LOW) -> ExecutionPlan:
+    return ExecutionPlan(
+        id=plan_id, title=f"plan {plan_id}", description="d",
+        created_at=_BASE + timedelta(minutes=minutes), status=status,
+        steps=[PlanStep(id="s1", tool_name="missing", params={}, risk_level=risk)],
+    )
+
+
+@pytest.fixture()
+def pm(tmp_path):
+    manager = PlanManager(plans_dir=tmp_path / "plans")
+    manager.tool_registry = ToolRegistry()
+    return manager
+
+
+class TestPlanCatalog:
+    async def test_list_filters_orders_and_paginates(self, pm):
+        await pm._save_plan(_plan("a", 1))
+        await pm._save_plan(_plan("b", 2, PlanStatus.COMPLETED))
+        await pm._save_plan(_plan("c", 3, risk=RiskLevel.HIGH))
+
+        assert [p["id"] for p in await pm.list_plans()] == ["c", "b", "a"]
+        assert [p["id"] for p in await pm.list_plans(PlanStatus.READY)] == ["c", "a"]
+        assert [p["id"] for p in await pm.list_plans(risk_level=RiskLevel.HIGH)] == ["c"]
+        assert [p["id"] for p in await pm.list_plans(limit=1, offset=1)] == ["b"]
+        assert await pm.count_plans(PlanStatus.READY) == 2
+
+        row = (await pm.list_plans(limit=1))[0]
+        assert row["total_steps"] == 1
+        assert row["created_at"] == (_BASE + timedelta(minutes=3)).isoformat()
+
+    async def test_listing_does_not_open_plan_files(self, pm, monkeypatch):
+        await pm._save_plan(_plan("a", 1))
+        await pm.list_plans()
+
+        def _boom(*_a, **_k):
+            raise AssertionError("list_plans parsed a plan file")
+
+        monkeypatch.setattr("deile.orchestration.plan_manager.read_json", _boom)
+        monkeypatch.setattr(ExecutionPlan, "from_dict", _boom)
+        assert [p["id"] for p in await pm.list_plans()] == ["a"]
+
+    async def test_existing_plans_are_indexed_on_first_listing(self, tmp_path):
+        plans_dir = tmp_path / "plans"
+        plans_dir.mkdir()
+        (plans_dir / "old.json").write_text(json.dumps(_plan("old", 0).to_dict()))
+
+        manager = PlanManager(plans_dir=plans_dir)
+        assert [p["id"] for p in await manager.list_plans()] == ["old"]
+
+    async def test_rebuild_repairs_drift(self, pm):
+        await pm._save_plan(_plan("a", 1))
+        await pm._save_plan(_plan("b", 2))
+        await pm.list_plans()
+
+        # Changed, added and removed behind the manager's back.
+        plan_b = _plan("b", 2, PlanStatus.FAILED)
+        path_b = pm.plans_dir / "b.json"
+        path_b.write_text(json.dumps(plan_b.to_dict()))
+        st = path_b.stat()
+        os.utime(path_b, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        (pm.plans_dir / "c.json").write_text(json.dumps(_plan("c", 3).to_dict()))
+        (pm.plans_dir / "a.json").unlink()
+        (pm.plans_dir / "broken.json").write_text("{not json")
+
+        stats = await pm.rebuild_catalog()
+
+        assert stats == {"scanned": 3, "updated": 2, "removed": 1, "errors": 1}
+        rows = {p["id"]: p["status"] for p in await pm.list_plans()}
+        assert rows == {"b": "failed", "c": "ready"}
+        # Unchanged files are not re-read.
+        assert (await pm.rebuild_catalog())["updated"] == 0
+
+    async def test_step_writes_keep_counters_current(self, pm):
+        plan = _plan("a", 1)
+        await pm._save_plan(plan)
+        step = plan.get_step("s1")
+        step.status = StepStatus.COMPLETED
+
+        await pm._save_step(plan, step)
+
+        assert (await pm.list_plans())[0]["completed_steps"] == 1
+        # A rebuild replays the step journal instead of reverting to the snapshot.
+        pm.catalog.delete("a")
+        await pm.rebuild_catalog()
+        assert (await pm.list_plans())[0]["completed_steps"] == 1
+
+    async def test_rebuild_sees_steps_journaled_by_another_process(self, pm):
+        plan = _plan("a", 1)
+        await pm._save_plan(plan)
+        await pm.list_plans()
+        snapshot_mtime = (pm.plans_dir / "a.json").stat().st_mtime_ns
+
+        # Another manager on the same directory: only the journal grows.
+        other = PlanManager(plans_dir=pm.plans_dir)
+        step = plan.get_step("s1")
+        step.status = StepStatus.COMPLETED
+        await other._save_step(plan, step)
+        # ...and its best-effort index write was lost (row still at the snapshot).
+        pm.catalog.upsert({**(await pm.list_plans())[0], "completed_steps": 0},
+                          snapshot_mtime)
+        assert (pm.plans_dir / "a.json").stat().st_mtime_ns == snapshot_mtime
+
+        assert (await pm.rebuild_catalog())["updated"] == 1
+        assert (await pm.list_plans())[0]["completed_steps"] == 1
+        assert (await pm.rebuild_catalog())["updated"] == 0
+
+    async def test_delete_plan_removes_files_and_row(self, pm):
+        await pm._save_plan(_plan("a", 1))
+
+        assert await pm.delete_plan("a")
+
+        assert await pm.list_plans() == []
+        assert not (pm.plans_dir / "a.json").exists()
+        assert not (pm.plans_dir / "a.md").exists()
+
+
+class TestApprovalCatalog:
+    async def _request(self, system, plan_id="p1", step_id="s1"):
+        return await system.request_approval(
+            step_id=step_id, plan_id=plan_id, tool_name="bash_execute",
+            operation="make deploy", risk_level="high", description="deploy",
+        )
+
+    async def test_list_merges_pending_and_stored(self, tmp_path):
+        system = ApprovalSystem(approvals_dir=tmp_path / "approvals")
+        approved = await self._request(system, step_id="s1")
+        denied = await self._request(system, plan_id="p2", step_id="s2")
+        pending = await self._request(system, step_id="s3")
+        await system.approve_request(approved)
+        await system.deny_request(denied, reason="no")
+
+        ids = [r["request_id"] for r in await system.list_requests()]
+        assert set(ids) == {approved, denied, pending}
+
+        by_status = await system.list_requests(status_filter=ApprovalStatus.DENIED)
+        assert [r["request_id"] for r in by_status] == [denied]
+        assert by_status[0]["denial_reason"] == "no"
+        by_plan = await system.list_requests(plan_id_filter="p1")
+        assert {r["request_id"] for r in by_plan} == {approved, pending}
+
+        page = await system.list_requests(limit=2, offset=1)
+        assert [r["request_id"] for r in page] == ids[1:3]
+
+    async def test_stored_requests_survive_restart(self, tmp_path):
+        system = ApprovalSystem(approvals_dir=tmp_path / "approvals")
+        request_id = await self._request(system)
+        await system.approve_request(request_id)
+
+        fresh = ApprovalSystem(approvals_dir=tmp_path / "approvals")
+        rows = await fresh.list_requests(status_filter=ApprovalStatus.APPROVED)
+        assert [r["request_id"] for r in rows] == [request_id]
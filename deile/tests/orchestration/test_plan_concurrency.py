@@ -0,0 +1,208 @@
+"""Concurrent step execution in ``PlanManager._execute_plan_steps``.
+
+The executor used to slice ``ready_steps[:max_concurrent_steps]`` and then
+await each step one by one, sleep 0.1 s per iteration and poll approvals
+every second. Steps now run as tasks bounded by the plan's concurrency
+limit, approvals wake the executor immediately and step transitions are
+journaled instead of rewriting the whole plan.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from deile.orchestration.plan_manager import (ExecutionPlan, PlanManager,
+                                              PlanStatus, PlanStep, RiskLevel,
+                                              StepStatus)
+from deile.tools.base import (SecurityLevel, Tool, ToolCategory, ToolContext,
+                              ToolResult, ToolSchema)
+from deile.tools.registry import ToolRegistry
+
+
+class _SleepTool(Tool):
+    """Async tool that sleeps ``delay`` seconds and tracks concurrency."""
+
+    def __init__(self) -> None:
+        super().__init__(schema=ToolSchema(
+            name="sleep",
+            description="sleeps",
+            parameters={"delay": {"type": "number", "description": "seconds"}},
+            required=["delay"],
+            security_level=SecurityLevel.SAFE,
+            category=ToolCategory.OTHER,
+        ))
+        self.in_flight = 0
+        self.peak = 0
+
+    @property
+    def name(self) -> str:
+        return "sleep"
+
+    @property
+    def description(self) -> str:
+        return "sleeps"
+
+    @property
+    def category(self) -> str:
+        return ToolCategory.OTHER.value
+
+    async def execute(self, context: ToolContext) -> ToolResult:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(context.parsed_args["delay"])
+        finally:
+            self.in_flight -= 1
+        return ToolResult.success_result(data=context.parsed_args["delay"])
+
+
+@pytest.fixture()
+def pm(tmp_path):
+    manager = PlanManager(plans_dir=tmp_path)
+    manager.tool_registry = ToolRegistry()
+    manager.sleep_tool = _SleepTool()
+    manager.tool_registry.register(manager.sleep_tool)
+    return manager
+
+
+def _step(step_id: str, delay: float, depends_on=(), **kwargs) -> PlanStep:
+    return PlanStep(id=step_id, tool_name="sleep", params={"delay": delay},
+                    depends_on=list(depends_on), **kwargs)
+
+
+def _plan(steps, max_concurrent: int) -> ExecutionPlan:
+    return ExecutionPlan(id="p1", title="t", description="d", created_at=datetime.now(),
+                         steps=steps, status=PlanStatus.RUNNING,
+                         max_concurrent_steps=max_concurrent)
+
+
+async def test_wall_time_follows_critical_path(pm) -> None:
+    # a -> (b, c, e) -> d: serial sum 1.1 s, critical path 0.5 s.
+    plan = _plan([
+        _step("a", 0.1),
+        _step("b", 0.3, ["a"]),
+        _step("c", 0.3, ["a"]),
+        _step("e", 0.3, ["a"]),
+        _step("d", 0.1, ["b", "c", "e"]),
+    ], max_concurrent=3)
+
+    t0 = time.monotonic()
+    summary = await pm._execute_plan_steps(plan, auto_approve_low_risk=True)
+    elapsed = time.monotonic() - t0
+
+    assert summary["final_stats"]["completed"] == 5
+    assert elapsed < 0.8, f"steps ran serially; elapsed={elapsed:.2f}s"
+    assert pm.sleep_tool.peak == 3
+
+
+async def test_completions_are_handled_as_they_arrive(pm) -> None:
+    # A slow step must not hold back the dependents of a fast one.
+    plan = _plan([
+        _step("slow", 0.5),
+        _step("fast", 0.05),
+        _step("after_fast", 0.05, ["fast"]),
+    ], max_concurrent=2)
+
+    await pm._execute_plan_steps(plan, auto_approve_low_risk=True)
+
+    after_fast = plan.get_step("after_fast")
+    slow = plan.get_step("slow")
+    assert after_fast.completed_at < slow.completed_at
+
+
+async def test_concurrency_limit_is_respected(pm) -> None:
+    plan = _plan([_step(f"s{i}", 0.05) for i in range(6)], max_concurrent=2)
+
+    await pm._execute_plan_steps(plan, auto_approve_low_risk=True)
+
+    assert pm.sleep_tool.peak == 2
+    assert all(s.status == StepStatus.COMPLETED for s in plan.steps)
+
+
+async def test_approval_wakes_executor_without_polling(pm) -> None:
+    plan = _plan([
+        _step("free", 0.01),
+        _step("gated", 0.01, requires_approval=True, risk_level=RiskLevel.HIGH),
+    ], max_concurrent=2)
+    pm._active_plans[plan.id] = plan
+    pm._stop_flags[plan.id] = False
+
+    runner = asyncio.create_task(pm._execute_plan_steps(plan, auto_approve_low_risk=True))
+    for _ in range(100):
+        if (plan.get_step("gated").status == StepStatus.REQUIRES_APPROVAL
+                and plan.get_step("free").status == StepStatus.COMPLETED):
+            break
+        await asyncio.sleep(0.01)
+    assert plan.get_step("gated").status == StepStatus.REQUIRES_APPROVAL
+
+    t0 = time.monotonic()
+    assert await pm.approve_step(plan.id, "gated")
+    summary = await asyncio.wait_for(runner, timeout=2)
+
+    assert time.monotonic() - t0 < 0.5
+    assert plan.get_step("gated").status == StepStatus.COMPLETED
+    assert summary["final_stats"]["completed"] == 2
+    assert any(e.get("action") == "waiting_approval" for e in summary["execution_log"])
+
+
+async def test_stop_plan_wakes_executor_waiting_for_approval(pm) -> None:
+    plan = _plan([
+        _step("gated", 0.01, requires_approval=True, risk_level=RiskLevel.HIGH),
+    ], max_concurrent=1)
+    pm._active_plans[plan.id] = plan
+    pm._stop_flags[plan.id] = False
+
+    runner = asyncio.create_task(pm._execute_plan_steps(plan, auto_approve_low_risk=True))
+    await asyncio.sleep(0.05)
+    assert await pm.stop_plan(plan.id)
+
+    await asyncio.wait_for(runner, timeout=1)
+    assert plan.get_step("gated").status == StepStatus.REQUIRES_APPROVAL
+
+
+async def test_step_transitions_are_journaled_and_replayed(pm) -> None:
+    plan = _plan([_step("a", 0.01), _step("b", 0.01, ["a"])], max_concurrent=1)
+    await pm._save_plan(plan)
+    snapshot = (pm.plans_dir / "p1.json").read_text()
+
+    await pm._execute_plan_steps(plan, auto_approve_low_risk=True)
+
+    # The snapshot is untouched during execution; only the journal grows.
+    assert (pm.plans_dir / "p1.json").read_text() == snapshot
+    journal = pm.plans_dir / "p1.steps.jsonl"
+    assert len(journal.read_text().splitlines()) == 4  # running + completed per step
+
+    reloaded = await pm.load_plan("p1")
+    assert [s.status for s in reloaded.steps] == [StepStatus.COMPLETED, StepStatus.COMPLETED]
+    assert reloaded.completed_steps == 2
+
+    await pm._save_plan(reloaded)
+    assert not journal.exists()
+
+
+async def test_large_concurrent_journal_lines_do_not_interleave(pm, monkeypatch) -> None:
+    steps = [_step(f"s{i}", 0.0, description="x" * 64 * 1024) for i in range(16)]
+    plan = _plan(steps, max_concurrent=16)
+    await pm._save_plan(plan)
+    writes = []
+    real_write = os.write
+
+    def _spy(fd, data):
+        writes.append(len(data))
+        return real_write(fd, data)
+
+    monkeypatch.setattr(os, "write", _spy)
+    # Lines far above the 8 KiB stdio buffer, written from parallel threads.
+    await asyncio.gather(*(pm._save_step(plan, step) for step in steps))
+    monkeypatch.undo()
+
+    lines = (pm.plans_dir / "p1.steps.jsonl").read_text().splitlines()
+    assert sorted(json.loads(line)["id"] for line in lines) == sorted(s.id for s in steps)
+    # One O_APPEND write per line: nothing for another writer to split.
+    assert sorted(writes) == sorted(len(line.encode()) + 1 for line in lines)
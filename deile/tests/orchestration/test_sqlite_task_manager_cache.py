@@ -13,7 +13,6 @@ from __future__ import annotations
 
 from unittest.mock import patch
 
-import aiosqlite
 import pytest
 
 from deile.orchestration.sqlite_task_manager import SQLiteTaskManager
@@ -52,15 +51,15 @@ async def test_get_tasks_for_list_second_call_uses_cache(tmp_path) -> None:
     # First call: hits DB and populates cache
     first_result = await manager._get_tasks_for_list(list_id)
 
-    # Wrap aiosqlite.connect with a spy; second call must not trigger it
+    # Wrap the pooled read path with a spy; second call must not trigger it
     connect_calls: list = []
-    original_connect = aiosqlite.connect
+    original_aread = manager._db.aread
 
-    def spy_connect(*args, **kwargs):
+    async def spy_aread(*args, **kwargs):
         connect_calls.append(args)
-        return original_connect(*args, **kwargs)
+        return await original_aread(*args, **kwargs)
 
-    with patch("deile.orchestration.sqlite_task_manager.aiosqlite.connect", new=spy_connect):
+    with patch.object(manager._db, "aread", new=spy_aread):
         second_result = await manager._get_tasks_for_list(list_id)
 
     assert connect_calls == [], (
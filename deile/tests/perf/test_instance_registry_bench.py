@@ -0,0 +1,70 @@
+"""Heartbeat and fleet listing with 48 instances: JSON rewrite versus mmap slots.
+
+The "json" rows are what every process and every panel refresh used to pay:
+a full state-file rewrite per heartbeat, and ``flock`` + parse of
+``registry.json`` per listing. Run with ``pytest -s -m perf`` for the table.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from deile.runtime.instance_state import InstanceState
+from deile.runtime.registry import Registry, RegistryEntry
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+_INSTANCES = 48
+_ROUNDS = 200
+
+
+def _per_op(fn, rounds: int = _ROUNDS) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds
+
+
+def test_heartbeat_and_listing(tmp_path):
+    reg = Registry(registry_path=tmp_path / "registry.json")
+    for i in range(_INSTANCES):
+        state_file = tmp_path / f"cli-{i:04d}.json"
+        state_file.write_text("{}")
+        reg.register(RegistryEntry(
+            instance_id=f"cli-{i:04d}", pid=os.getpid(), role="cli",
+            started_at="2026-01-01T00:00:00+00:00", endpoint="",
+            state_file=str(state_file),
+        ))
+
+    legacy = InstanceState(role="cli", runtime_dir=tmp_path / "legacy",
+                           enable_status_server=False, enable_registry=False)
+    slotted = InstanceState(role="cli", runtime_dir=tmp_path / "slotted",
+                            enable_status_server=False)
+    try:
+        rows = [
+            ("heartbeat, json rewrite", _per_op(legacy._heartbeat)),
+            ("heartbeat, slot", _per_op(slotted._heartbeat)),
+        ]
+    finally:
+        legacy.close()
+        slotted.close()
+
+    def _locked_list():
+        with reg._locked():
+            return [e for e in reg._load_unlocked() if reg._is_alive(e)]
+
+    rows.append(("list, flock + parse", _per_op(_locked_list)))
+    rows.append(("list, cached", _per_op(reg.list)))
+    rows.append(("heartbeats, seqlock read", _per_op(reg.heartbeats)))
+
+    print(f"\n{'operation':<28} {'us':>9}")
+    for label, seconds in rows:
+        print(f"{label:<28} {seconds * 1e6:>9.1f}")
+
+    timings = dict(rows)
+    assert len(reg.list()) == len(reg.heartbeats()) == _INSTANCES
+    assert timings["heartbeat, slot"] * 10 < timings["heartbeat, json rewrite"]
+    assert timings["list, cached"] < timings["list, flock + parse"]
@@ -0,0 +1,82 @@
+"""Live tail of a 100 MB Claude session: stateless ``parse_all`` versus the tailer.
+
+The "parse_all" row is what a screen refresh used to cost on a long
+session: re-read and ``json.loads`` every line to keep the last N turns.
+The tailer pays one newline scan on attach, then each poll only reads the
+bytes appended since the previous one, and scrolling back one page seeks
+through the sparse index. Run with ``pytest -s -m perf`` for the table.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from deile.ui.panel.observability import ClaudeJsonlParser, ClaudeJsonlTailer
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+_TARGET_BYTES = 100 * 1024 * 1024
+_WINDOW = 200
+
+
+def _session_lines():
+    i = 0
+    while True:
+        yield json.dumps({"type": "assistant", "content": f"step {i} " + "lorem ipsum " * 60,
+                          "model": "claude", "usage": {"input_tokens": i, "output_tokens": 7}})
+        yield json.dumps({"type": "tool_use", "id": f"toolu_{i}", "name": "Bash",
+                          "input": {"command": "ls -la " + "x" * 120}})
+        yield json.dumps({"type": "tool_result", "tool_use_id": f"toolu_{i}",
+                          "content": "total 0\n" + "-rw-r--r-- file\n" * 20})
+        i += 1
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def test_tail_100mb_session(tmp_path):
+    path = tmp_path / "session.jsonl"
+    written = 0
+    with path.open("w", encoding="utf-8") as fh:
+        for line in _session_lines():
+            fh.write(line + "\n")
+            written += len(line) + 1
+            if written >= _TARGET_BYTES:
+                break
+
+    parser = ClaudeJsonlParser(path)
+    full, full_s = _timed(lambda: parser.parse_all(max_turns=_WINDOW))
+
+    tailer = ClaudeJsonlTailer(path, capacity=_WINDOW)
+    attach, attach_s = _timed(tailer.poll)
+
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"type": "user", "content": "one more"}) + "\n")
+    update, poll_s = _timed(tailer.poll)
+
+    middle = tailer.line_count // 2
+    page, page_s = _timed(lambda: tailer.load_earlier(middle, count=50))
+
+    rows = [
+        ("parse_all, last 200", full_s),
+        ("tailer attach", attach_s),
+        ("tailer poll, 1 line", poll_s),
+        ("tailer page, mid-file", page_s),
+    ]
+    print(f"\n{written / 2**20:.0f} MB, {tailer.line_count} lines")
+    print(f"{'operation':<24} {'ms':>9}")
+    for label, seconds in rows:
+        print(f"{label:<24} {seconds * 1e3:>9.2f}")
+
+    assert [t.raw for t in full.turns] == [t.raw for t in attach.new_turns]
+    assert [t.content for t in update.new_turns] == ["one more"]
+    assert [t.index for t in page] == list(range(middle - 50, middle))
+    assert attach_s * 2 < full_s
+    assert poll_s * 100 < full_s
+    assert page_s * 100 < full_s
@@ -0,0 +1,75 @@
+"""Per-scan cost of the log analyzer on a growing log.
+
+Compares the full re-read (``_scan_files`` + the list detectors, what
+``scan_logs`` did every interval) with ``LogAnalyzer.scan`` after a small
+append, at two log sizes. Run with ``pytest -s -m perf`` for the table.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+
+from deile.log_mgmt.log_analyzer import (LogAnalyzer, _detect_auth_expiry,
+                                         _detect_error_spike, _detect_flooding,
+                                         _detect_silent_pipeline, _scan_files)
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+_SIZES = [20_000, 100_000]
+_APPEND = 500
+_MSGS = [
+    "INFO deile.pipeline.monitor processed item {i} status ok",
+    "DEBUG deile.core.agent turn {i} tokens=123",
+    "WARNING deile.bot retrying send",
+    "ERROR deile.worker dispatch failed for {i}",
+]
+_THRESHOLDS = dict(error_rate_threshold=10, flood_threshold=200, silent_tick_threshold=30)
+
+
+def _write(path, n: int, start: int, rng: random.Random) -> None:
+    base = time.time() - 120
+    with path.open("a") as fh:
+        for i in range(start, start + n):
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(base + i / 5000))
+            fh.write(f"{stamp},000 {rng.choice(_MSGS).format(i=i)}\n")
+
+
+def _full_rescan(log_dir: str) -> None:
+    for pod, lines in _scan_files(log_dir).items():
+        _detect_error_spike(pod, lines, 10)
+        _detect_auth_expiry(pod, lines)
+        _detect_flooding(pod, lines, 200)
+        _detect_silent_pipeline(pod, lines, 30)
+
+
+def test_incremental_scan_cost_is_flat(tmp_path):
+    rng = random.Random(0)
+    rows = []
+    for n in _SIZES:
+        root = tmp_path / str(n)
+        (root / "deile-pipeline").mkdir(parents=True)
+        log = root / "deile-pipeline" / "deile-pipeline.log"
+        _write(log, n, 0, rng)
+        analyzer = LogAnalyzer(str(root), initial_tail_bytes=1 << 40)
+        analyzer.scan(**_THRESHOLDS)  # catch up once
+
+        _write(log, _APPEND, n, rng)
+        t0 = time.perf_counter()
+        _full_rescan(str(root))
+        full = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        analyzer.scan(**_THRESHOLDS)
+        incremental = time.perf_counter() - t0
+        rows.append((n, log.stat().st_size, full * 1e3, incremental * 1e3))
+
+    print(f"\n{'lines':>8} {'MB':>6} {'full ms':>9} {'incr ms':>9} {'speedup':>8}")
+    for n, size, full, incr in rows:
+        print(f"{n:>8} {size / 1e6:>6.1f} {full:>9.1f} {incr:>9.2f} {full / incr:>7.0f}x")
+
+    assert rows[-1][3] * 10 < rows[-1][2]
+    # Cost follows the appended bytes, not the size of the file.
+    assert rows[-1][3] < rows[0][3] * 5 + 5
@@ -0,0 +1,104 @@
+"""Event-loop stalls under heavy logging: direct file handler versus the queue pipeline.
+
+A coroutine logs in a tight loop while hourly rollovers (rename + gzip +
+purge over a logs root with a few hundred daily folders) are forced every
+``_ROLLOVER_EVERY`` records. Each ``logger.info`` call is timed as the
+stall it imposes on the event loop; the calls that trigger a rollover are
+also reported on their own. With the pipeline the residual tail comes from
+GIL hand-offs to the listener thread (bounded by the interpreter switch
+interval), not from file I/O. Run with ``pytest -s -m perf`` for the table.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from deile.storage.log_queue import LogPipeline
+from deile.storage.log_rotation import HourlyDailyDirRotatingHandler
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+_RECORDS = 20_000
+_ROLLOVER_EVERY = 2_000
+_DAILY_DIRS = 300
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]  # noqa: E731
+    rollover = [samples[i] for i in range(_ROLLOVER_EVERY, _RECORDS, _ROLLOVER_EVERY)]
+    return {"p50": pick(0.50), "p99": pick(0.99), "p999": pick(0.999),
+            "max": ordered[-1], "rollover": statistics.median(rollover)}
+
+
+def _handler(root):
+    root.mkdir()
+    today = date.today()
+    for i in range(_DAILY_DIRS):
+        day = root / (today - timedelta(days=i)).isoformat()
+        day.mkdir()
+        (day / "00.log").write_text("x" * 4096)
+    handler = HourlyDailyDirRotatingHandler(
+        filename=str(root / "deile.log"), compress=True, retention_days=_DAILY_DIRS + 1,
+    )
+    handler.setFormatter(logging.Formatter(
+        "%(asctime)s [%(process)d] [%(levelname)s] %(name)s: %(message)s"))
+    return handler
+
+
+async def _log_burst(logger, file_handler):
+    stalls = []
+    payload = "tool_execution finished " + "x" * 160
+    for i in range(_RECORDS):
+        if i and i % _ROLLOVER_EVERY == 0:
+            file_handler.rolloverAt = int(time.time()) - 1
+        t0 = time.perf_counter()
+        logger.info("%s %d", payload, i)
+        stalls.append(time.perf_counter() - t0)
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    return stalls
+
+
+async def _run(logger, file_handler, pipeline=None):
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    if pipeline is None:
+        logger.addHandler(file_handler)
+    else:
+        pipeline.start()
+        logger.addHandler(pipeline.handler)
+    try:
+        return await _log_burst(logger, file_handler)
+    finally:
+        if pipeline is not None:
+            pipeline.stop()
+        logger.handlers.clear()
+        file_handler.close()
+
+
+async def test_event_loop_stalls(tmp_path):
+    direct_handler = _handler(tmp_path / "direct")
+    direct = await _run(logging.getLogger("bench.logs.direct"), direct_handler)
+
+    queued_handler = _handler(tmp_path / "queued")
+    pipeline = LogPipeline(queued_handler, queue_size=50_000)
+    queued = await _run(logging.getLogger("bench.logs.queued"), queued_handler, pipeline)
+
+    rows = [("direct handler", _percentiles(direct)), ("queue pipeline", _percentiles(queued))]
+    print(f"\n{'per-call stall (us)':<20} {'p50':>8} {'p99':>8} {'p99.9':>8} "
+          f"{'max':>9} {'rollover':>9}")
+    for label, p in rows:
+        print(f"{label:<20} {p['p50'] * 1e6:>8.1f} {p['p99'] * 1e6:>8.1f} "
+              f"{p['p999'] * 1e6:>8.1f} {p['max'] * 1e6:>9.1f} {p['rollover'] * 1e6:>9.1f}")
+
+    direct_p, queued_p = rows[0][1], rows[1][1]
+    assert pipeline.stats()["dropped"] == 0
+    assert queued_p["rollover"] * 10 < direct_p["rollover"]
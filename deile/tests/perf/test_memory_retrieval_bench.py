@@ -0,0 +1,165 @@
+"""Recall/latency benchmark for the memory retrieval layer.
+
+Synthetic corpus: documents are drawn from latent topics over a
+pseudo-word vocabulary; each query samples a few words of one target
+document (``typo`` queries also corrupt one word). We report recall@10 of
+the target plus p50/p99 latency for:
+
+- ``EpisodicMemory.search_episodes`` (FTS5/BM25 + vectors, fused by RRF),
+  with the corpus bulk-loaded as a legacy ``episodes.db`` so the backfill
+  path (FTS rebuild + vector reconciliation) is exercised too;
+- ``VectorIndex`` flat vs IVF on the same embeddings.
+
+Default size is 10k items. Larger corpora are opt-in, e.g.::
+
+    DEILE_MEMORY_BENCH_SIZES=10000,100000,1000000 \\
+        pytest -s -m perf deile/tests/perf/test_memory_retrieval_bench.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from deile.memory.episodic_memory import EpisodicMemory
+from deile.storage.embeddings import HashingEmbedder, VectorIndex
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+_SIZES = [int(s) for s in os.environ.get("DEILE_MEMORY_BENCH_SIZES", "10000").split(",") if s]
+_QUERIES = 200
+_SYLLABLES = ["ka", "lo", "mi", "ster", "pra", "ne", "vol", "tu", "ri", "gan",
+              "dor", "se", "bel", "qui", "fa", "zen", "mor", "ta", "lin", "ex"]
+
+
+def _vocab(rng: random.Random, n: int) -> List[str]:
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _corpus(n: int, seed: int = 0) -> Tuple[List[str], List[Tuple[int, str, str]]]:
+    """Returns (docs, queries) where each query is (target_idx, clean, typo)."""
+    rng = random.Random(seed)
+    vocab = _vocab(rng, 20_000)
+    topics = [rng.sample(vocab, 60) for _ in range(max(50, n // 200))]
+    docs = []
+    for _ in range(n):
+        topic = rng.choice(topics)
+        words = rng.sample(topic, 10) + rng.sample(vocab, 6)
+        rng.shuffle(words)
+        docs.append(" ".join(words))
+    queries = []
+    for target in rng.sample(range(n), _QUERIES):
+        words = rng.sample(docs[target].split(), 5)
+        clean = " ".join(words)
+        w = words[0]
+        i = rng.randrange(len(w) - 1)
+        words[0] = w[:i] + w[i + 1] + w[i] + w[i + 2:]
+        queries.append((target, clean, " ".join(words)))
+    return docs, queries
+
+
+def _pct(samples: List[float], p: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+
+def _write_legacy_db(path: Path, docs: List[str]) -> None:
+    db = sqlite3.connect(path)
+    db.execute("""CREATE TABLE episodes (episode_id TEXT PRIMARY KEY, session_id TEXT,
+                  user_input TEXT, agent_response TEXT, timestamp REAL,
+                  context TEXT, metadata TEXT)""")
+    db.executemany(
+        "INSERT INTO episodes VALUES (?, 'bench', ?, '', ?, '{}', '{}')",
+        ((f"d{i}", doc, float(i)) for i, doc in enumerate(docs)),
+    )
+    db.commit()
+    db.close()
+
+
+@pytest.mark.parametrize("size", _SIZES)
+def test_episode_hybrid_recall_and_latency(tmp_path: Path, size: int) -> None:
+    docs, queries = _corpus(size)
+    _write_legacy_db(tmp_path / "episodes.db", docs)
+
+    async def _run():
+        mem = EpisodicMemory(storage_dir=tmp_path)
+        t0 = time.perf_counter()
+        await mem.initialize()
+        build_s = time.perf_counter() - t0
+        results = {}
+        try:
+            for kind in ("clean", "typo"):
+                hits, lat = 0, []
+                for target, clean, typo in queries:
+                    q = clean if kind == "clean" else typo
+                    t = time.perf_counter()
+                    found = await mem.search_episodes(q, max_results=10)
+                    lat.append(time.perf_counter() - t)
+                    hits += any(h["episode_id"] == f"d{target}" for h in found)
+                results[kind] = (hits / len(queries), _pct(lat, 0.5), _pct(lat, 0.99))
+        finally:
+            await mem.shutdown()
+        return build_s, results
+
+    build_s, results = asyncio.run(_run())
+    print(f"\n[episodes n={size}] build={build_s:.1f}s")
+    for kind, (recall, p50, p99) in results.items():
+        print(f"  {kind:5s} recall@10={recall:.3f} p50={p50:.1f}ms p99={p99:.1f}ms")
+
+    assert results["clean"][0] >= 0.9
+    assert results["typo"][0] >= 0.8
+    if size <= 10_000:
+        assert results["clean"][1] < 100
+
+
+@pytest.mark.parametrize("size", _SIZES)
+def test_vector_index_flat_vs_ivf(size: int) -> None:
+    docs, queries = _corpus(size)
+    emb = HashingEmbedder()
+    vecs = np.concatenate([emb(docs[i:i + 4096]) for i in range(0, size, 4096)])
+    ids = [str(i) for i in range(size)]
+    flat = VectorIndex(emb.dim, ivf_threshold=size + 1)
+    flat.add(ids, vecs)
+    ivf = VectorIndex(emb.dim, ivf_threshold=1)
+    ivf.add(ids, vecs)
+    t0 = time.perf_counter()
+    ivf.train()
+    train_s = time.perf_counter() - t0
+
+    qvecs = emb([typo for _, _, typo in queries])
+    report = {}
+    for name, index in (("flat", flat), ("ivf", ivf)):
+        hits, lat, tops = 0, [], []
+        for (target, _, _), q in zip(queries, qvecs):
+            t = time.perf_counter()
+            top = index.search(q, 10)
+            lat.append(time.perf_counter() - t)
+            hits += any(i == str(target) for i, _ in top)
+            tops.append({i for i, _ in top})
+        report[name] = (hits / len(queries), _pct(lat, 0.5), _pct(lat, 0.99), tops)
+
+    overlap = statistics.mean(
+        len(a & b) / 10 for a, b in zip(report["flat"][3], report["ivf"][3])
+    )
+    print(f"\n[vectors n={size}] ivf train={train_s:.1f}s overlap@10 vs flat={overlap:.3f}")
+    for name, (recall, p50, p99, _) in report.items():
+        print(f"  {name:4s} recall@10={recall:.3f} p50={p50:.2f}ms p99={p99:.2f}ms")
+
+    # IVF trades recall for latency and only pays off past the default
+    # ``ivf_threshold`` (200k); the hybrid search keeps recall through the
+    # BM25 leg. Guard against a broken probe, not the approximation.
+    assert report["flat"][0] >= 0.8
+    if size <= 100_000:
+        assert report["ivf"][0] >= 0.5
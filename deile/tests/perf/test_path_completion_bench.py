@@ -0,0 +1,81 @@
+"""Per-keystroke ``@`` completion latency: directory listing versus the path index.
+
+The "listing" row is what every keystroke used to pay in a directory with a
+few thousand entries: ``sorted(iterdir())`` plus one ``stat`` per match. The
+index rows type a query one character at a time against a ~100k-entry tree;
+each keystroke only touches memory and is cut at ``KEYSTROKE_BUDGET_S``.
+Run with ``pytest -s -m perf`` for the table.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+from prompt_toolkit.document import Document
+
+from deile.ui.completers import HybridCompleter
+from deile.ui.completers.path_index import KEYSTROKE_BUDGET_S
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+_DIRS = 400
+_FILES_PER_DIR = 250
+_FLAT_FILES = 5_000
+
+
+def _legacy_listing(base_dir: Path, fragment: str) -> list:
+    out = []
+    for item in sorted(base_dir.iterdir()):
+        if item.name.lower().startswith(fragment):
+            out.append((item.name, item.stat().st_size))
+    return out
+
+
+def _keystrokes(completer: HybridCompleter, query: str) -> list:
+    latencies = []
+    for n in range(len(query) + 1):
+        document = Document("@" + query[:n])
+        t0 = time.perf_counter()
+        list(completer.get_completions(document, None))
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def test_keystroke_latency(tmp_path):
+    for d in range(_DIRS):
+        sub = tmp_path / "repo" / f"pkg_{d:03d}"
+        sub.mkdir(parents=True)
+        for f in range(_FILES_PER_DIR):
+            (sub / f"module_{f:03d}.py").touch()
+    flat = tmp_path / "repo" / "flat"
+    flat.mkdir()
+    for f in range(_FLAT_FILES):
+        (flat / f"m{f:05d}.txt").touch()
+
+    completer = HybridCompleter(working_directory=str(tmp_path / "repo"))
+    t0 = time.perf_counter()
+    completer._get_path_index()
+    assert completer._path_index.wait_ready(120)
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    _legacy_listing(flat, "m")
+    listing_s = time.perf_counter() - t0
+
+    cold = _keystrokes(completer, "pkg_399/module_249")
+    fuzzy = _keystrokes(completer, "p399m249")
+
+    rows = [
+        ("listing, 5k-entry dir", listing_s),
+        ("index, worst keystroke", max(cold)),
+        ("index, fuzzy worst", max(fuzzy)),
+    ]
+    print(f"\nindex build: {build_s * 1e3:.0f} ms for {len(completer._path_index)} entries")
+    print(f"{'per keystroke':<26} {'ms':>8}")
+    for label, seconds in rows:
+        print(f"{label:<26} {seconds * 1e3:>8.2f}")
+
+    assert max(cold + fuzzy) < KEYSTROKE_BUDGET_S * 4
+    assert max(fuzzy) < listing_s
@@ -0,0 +1,78 @@
+"""Per-check latency of the permission engine at 10 / 1k / 10k rules.
+
+Compares the old evaluation (sort all rules, try each regex) with
+``PermissionManager.check_permission`` backed by the compiled policy, on
+distinct paths (decision-cache misses, as in a bulk file operation) and on
+repeated paths (cache hits). Run with ``pytest -s -m perf`` for the table.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+
+from deile.security.permissions import (PermissionLevel, PermissionManager,
+                                        PermissionRule, ResourceType)
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+_SIZES = [10, 1_000, 10_000]
+_CHECKS = 2_000
+_TOOLS = ["read_file", "write_file", "delete_file", "bash_execute"]
+
+
+def _build(n: int, rng: random.Random) -> PermissionManager:
+    pm = PermissionManager()
+    for i in range(n):
+        if i % 10 == 0:
+            pattern = rf".*\.ext{i}$"
+        else:
+            pattern = rf"^/srv/team{i % 97}/proj{i}/.*"
+        pm.add_rule(PermissionRule(
+            id=f"bench_{i}", name=f"bench {i}", description="",
+            resource_type=ResourceType.FILE, resource_pattern=pattern,
+            tool_names=["*"] if i % 3 else [rng.choice(_TOOLS)],
+            permission_level=rng.choice(list(PermissionLevel)),
+            priority=rng.randint(1, 200),
+        ))
+    return pm
+
+
+def _linear(pm: PermissionManager, tool: str, resource: str, action: str) -> bool:
+    applicable = [
+        r for r in sorted(pm.rules, key=lambda r: r.priority)
+        if r.enabled and r.applies_to_tool(tool) and r.matches_resource(resource)
+    ]
+    level = applicable[0].permission_level if applicable else pm.default_permission
+    return pm._action_allowed_by_permission(action, level, {})
+
+
+def _per_check_us(fn, calls) -> float:
+    t0 = time.perf_counter()
+    for call in calls:
+        fn(*call)
+    return (time.perf_counter() - t0) / len(calls) * 1e6
+
+
+def test_compiled_policy_scales_with_rule_count():
+    rng = random.Random(0)
+    print(f"\n{'rules':>7}{'linear us':>12}{'compiled us':>13}{'cached us':>11}{'speedup':>9}")
+    for n in _SIZES:
+        pm = _build(n, rng)
+        calls = [
+            (rng.choice(_TOOLS), f"/srv/team{rng.randrange(97)}/proj{rng.randrange(n or 1)}/f{k}.py",
+             rng.choice(["read", "write"]))
+            for k in range(_CHECKS)
+        ]
+        linear_calls = calls[:200] if n >= 10_000 else calls
+        linear = _per_check_us(lambda t, r, a: _linear(pm, t, r, a), linear_calls)
+        pm.check_permission(*calls[0])  # compile outside the timed loop
+        compiled = _per_check_us(pm.check_permission, calls)
+        cached = _per_check_us(pm.check_permission, calls)
+        print(f"{n:>7}{linear:>12.1f}{compiled:>13.1f}{cached:>11.1f}{linear / compiled:>8.0f}x")
+        for call in calls[:200]:
+            assert pm.check_permission(*call) == _linear(pm, *call)
+        if n >= 1_000:
+            assert compiled < linear
@@ -0,0 +1,90 @@
+"""Listing 10k plans: directory scan versus the SQLite catalog.
+
+The scan is what ``PlanManager.list_plans`` used to do (glob + parse every
+plan JSON). The catalog numbers cover the one-off indexing of an existing
+directory, a no-op reconcile, and indexed listings. Run with
+``pytest -s -m perf`` for the table.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from deile.orchestration.plan_manager import (ExecutionPlan, PlanManager,
+                                              PlanStatus, PlanStep, RiskLevel)
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+_PLANS = 10_000
+_STATUSES = [PlanStatus.COMPLETED, PlanStatus.FAILED, PlanStatus.READY, PlanStatus.CANCELLED]
+
+
+def _write_plans(plans_dir) -> None:
+    plans_dir.mkdir()
+    base = datetime(2026, 1, 1)
+    for i in range(_PLANS):
+        plan = ExecutionPlan(
+            id=f"p{i:05d}", title=f"plan {i}", description="bench " * 20,
+            created_at=base + timedelta(minutes=i), status=_STATUSES[i % len(_STATUSES)],
+            steps=[PlanStep(id=f"s{j}", tool_name="list_files", params={"path": "."},
+                            description="step " * 10, risk_level=RiskLevel.LOW)
+                   for j in range(5)],
+        )
+        (plans_dir / f"{plan.id}.json").write_text(json.dumps(plan.to_dict(), indent=2))
+
+
+def _scan(plans_dir, status_filter=None):
+    plans = []
+    for plan_file in plans_dir.glob("*.json"):
+        data = json.loads(plan_file.read_text())
+        if status_filter and data.get("status") != status_filter.value:
+            continue
+        plans.append({k: data[k] for k in ("id", "title", "status", "created_at",
+                                          "total_steps", "completed_steps")})
+    plans.sort(key=lambda x: x["created_at"], reverse=True)
+    return plans
+
+
+async def test_list_10k_plans(tmp_path):
+    plans_dir = tmp_path / "plans"
+    _write_plans(plans_dir)
+    rows = []
+
+    t0 = time.perf_counter()
+    scanned = _scan(plans_dir)
+    rows.append(("dir scan, all", time.perf_counter() - t0))
+    t0 = time.perf_counter()
+    _scan(plans_dir, PlanStatus.FAILED)[:50]
+    rows.append(("dir scan, failed top 50", time.perf_counter() - t0))
+
+    pm = PlanManager(plans_dir=plans_dir)
+    t0 = time.perf_counter()
+    stats = await pm.rebuild_catalog()
+    rows.append(("catalog initial index", time.perf_counter() - t0))
+    assert stats["updated"] == _PLANS
+
+    t0 = time.perf_counter()
+    await pm.rebuild_catalog()
+    rows.append(("catalog reconcile (no drift)", time.perf_counter() - t0))
+
+    t0 = time.perf_counter()
+    listed = await pm.list_plans()
+    full = time.perf_counter() - t0
+    rows.append(("catalog, all", full))
+    t0 = time.perf_counter()
+    top = await pm.list_plans(PlanStatus.FAILED, limit=50)
+    page = time.perf_counter() - t0
+    rows.append(("catalog, failed top 50", page))
+
+    print(f"\n{'operation':<30} {'ms':>9}")
+    for label, seconds in rows:
+        print(f"{label:<30} {seconds * 1e3:>9.1f}")
+
+    assert [p["id"] for p in listed] == [p["id"] for p in scanned]
+    assert len(top) == 50 and all(p["status"] == "failed" for p in top)
+    assert full * 5 < rows[0][1]
+    assert page * 50 < rows[1][1]
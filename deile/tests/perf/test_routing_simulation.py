@@ -0,0 +1,201 @@
+"""Discrete-event simulation of provider routing under load.
+
+Fake providers have a lognormal base latency, a concurrency ``capacity``
+past which service time grows linearly (queueing inside the provider), a
+``rate_limit`` on in-flight requests past which they answer 429, and a
+random error rate. Requests arrive as a Poisson process and retry on
+another provider after a 429/error (up to 3 attempts, like the agent's
+cascade loop). Everything runs on a virtual clock, so the run is
+deterministic and takes well under a second.
+
+Compared policies:
+
+- ``cascade``: classic ``TierRouter`` — first healthy cascade entry;
+- ``spillover``: ``TierRouter`` + ``AdaptiveSelector`` (sticky primary);
+- ``p2c`` / ``least_outstanding``: pure ``AdaptiveSelector.choose``.
+
+Reported: p50/p99 end-to-end latency, failure rate and spillover (share of
+requests served by a non-primary provider). ``pytest -s -m perf`` prints
+the table.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import random
+import statistics
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+from unittest.mock import MagicMock
+
+import pytest
+
+from deile.core.models.errors import (ProviderErrorEnvelope,
+                                      ProviderInvocationError)
+from deile.core.models.routing_strategies import AdaptiveSelector, LoadTracker
+from deile.core.models.tier import ModelTier
+from deile.core.models.tier_router import (CircuitBreaker, RoutingPolicy,
+                                           TierRouter)
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+
+@dataclass
+class FakeProvider:
+    name: str
+    median_latency_s: float
+    sigma: float = 0.4
+    capacity: int = 4
+    rate_limit: int = 1_000
+    error_rate: float = 0.0
+    in_flight: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}:m"
+
+    def service_time(self, rng: random.Random) -> float:
+        base = rng.lognormvariate(math.log(self.median_latency_s), self.sigma)
+        overload = max(0, self.in_flight - self.capacity) / self.capacity
+        return base * (1.0 + overload)
+
+
+class _Clock:
+    now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _throttled(provider: FakeProvider) -> ProviderInvocationError:
+    return ProviderInvocationError(ProviderErrorEnvelope(
+        provider_id=provider.name, model_id="m", error_type="rate_limit",
+        message="429", http_status=429,
+    ))
+
+
+def simulate(policy: str, providers: Sequence[FakeProvider], *, rate_per_s: float,
+             requests: int = 4_000, seed: int = 0) -> Dict[str, float]:
+    rng = random.Random(seed)
+    clock = _Clock()
+    tracker = LoadTracker(clock=clock, throttle_base_s=1.0)
+    by_key = {p.key: p for p in providers}
+    selector = AdaptiveSelector(
+        tracker, mode="least_outstanding" if policy == "least_outstanding" else "p2c",
+        rng=random.Random(seed + 1),
+    )
+
+    router: Optional[TierRouter] = None
+    if policy in ("cascade", "spillover"):
+        router = TierRouter(
+            MagicMock(), RoutingPolicy("sim", {ModelTier.TIER_1: [p.key for p in providers]}),
+            CircuitBreaker(failure_threshold=10**9),
+            selector if policy == "spillover" else None,
+        )
+        for p in providers:
+            mock = MagicMock()
+            mock.provider_id, mock.provider_name, mock.model_name = p.name, p.name, "m"
+            router.register_provider(mock)
+
+    def pick(tried: set) -> FakeProvider:
+        if router is not None:
+            chosen = router.select(ModelTier.TIER_1, skip_provider_ids=tried)
+            return by_key[f"{chosen.provider_id}:m"]
+        pool = [p for p in providers if p.name not in tried] or list(providers)
+        return pool[selector.choose([p.key for p in pool])]
+
+    events: List[tuple] = []
+    seq = 0
+
+    def schedule(at: float, fn: Callable[[], None]) -> None:
+        nonlocal seq
+        seq += 1
+        heapq.heappush(events, (at, seq, fn))
+
+    latencies: List[float] = []
+    failures = 0
+    spilled = 0
+    primary = providers[0].name
+
+    def attempt(arrived: float, tried: set, attempts: int) -> None:
+        nonlocal failures, spilled
+        provider = pick(tried)
+        handle = tracker.begin(provider.key)
+        if provider.in_flight >= provider.rate_limit:
+            handle.finish(success=False, error=_throttled(provider))
+            retry(arrived, tried | {provider.name}, attempts, delay=0.05)
+            return
+        provider.in_flight += 1
+        duration = provider.service_time(rng)
+        failed = rng.random() < provider.error_rate
+
+        def done() -> None:
+            nonlocal spilled
+            provider.in_flight -= 1
+            if failed:
+                handle.finish(success=False, error=RuntimeError("5xx"))
+                retry(arrived, tried | {provider.name}, attempts, delay=0.0)
+                return
+            handle.first_token()
+            handle.finish(output_tokens=200)
+            latencies.append(clock.now - arrived)
+            spilled += provider.name != primary
+
+        schedule(clock.now + duration, done)
+
+    def retry(arrived: float, tried: set, attempts: int, delay: float) -> None:
+        nonlocal failures
+        if attempts >= 3:
+            failures += 1
+            return
+        schedule(clock.now + delay, lambda: attempt(arrived, tried, attempts + 1))
+
+    t = 0.0
+    for _ in range(requests):
+        t += rng.expovariate(rate_per_s)
+        schedule(t, lambda at=t: attempt(at, set(), 1))
+    while events:
+        clock.now, _, fn = heapq.heappop(events)
+        fn()
+
+    latencies.sort()
+    served = len(latencies)
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(served - 1, int(served * 0.99))],
+        "failure_rate": failures / requests,
+        "spillover": spilled / max(1, served),
+    }
+
+
+def _scenario() -> List[FakeProvider]:
+    # A fast primary that saturates and rate-limits, a slower but roomy
+    # secondary, and a flaky third option.
+    return [
+        FakeProvider("primary", median_latency_s=1.0, capacity=4, rate_limit=8),
+        FakeProvider("secondary", median_latency_s=1.6, capacity=8),
+        FakeProvider("tertiary", median_latency_s=1.2, capacity=4, error_rate=0.05),
+    ]
+
+
+def test_adaptive_policies_cut_tail_latency_under_load():
+    results = {
+        policy: simulate(policy, _scenario(), rate_per_s=9.0)
+        for policy in ("cascade", "spillover", "p2c", "least_outstanding")
+    }
+    print(f"\n{'policy':<18}{'p50 s':>8}{'p99 s':>8}{'fail %':>8}{'spill %':>9}")
+    for policy, r in results.items():
+        print(f"{policy:<18}{r['p50']:>8.2f}{r['p99']:>8.2f}"
+              f"{100 * r['failure_rate']:>8.2f}{100 * r['spillover']:>9.1f}")
+
+    cascade = results["cascade"]
+    for policy in ("spillover", "p2c", "least_outstanding"):
+        assert results[policy]["p99"] < cascade["p99"], policy
+    # The sticky policy keeps most traffic on the primary.
+    assert results["spillover"]["spillover"] < results["p2c"]["spillover"]
+
+
+def test_light_load_stays_on_primary():
+    r = simulate("spillover", _scenario(), rate_per_s=0.5, requests=500)
+    assert r["spillover"] < 0.05
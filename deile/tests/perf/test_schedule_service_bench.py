@@ -0,0 +1,83 @@
+"""Per-tick schedule cost at 100 / 1k / 3k entries.
+
+Compares what ``PipelineMonitor._tick_body`` used to do every tick
+(``ScheduleStore.load()`` + ``Schedule.compute_pending()``) with
+``ScheduleService.load()`` + ``ScheduleService.compute_pending()`` on an
+unchanged file where only a handful of entries are due. Run with
+``pytest -s -m perf`` for the table.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from deile.orchestration.pipeline.schedule_service import ScheduleService
+from deile.orchestration.pipeline.scheduler import (OneshotEntry,
+                                                    RecurringEntry, Schedule,
+                                                    ScheduleStore)
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+_SIZES = [100, 1_000, 3_000]
+_TICKS = 3
+_DUE = 5
+_CRONS = ["*/5 * * * *", "0 * * * *", "30 9 * * 1-5", "@daily", "*/15 8-18 * * *"]
+
+
+def _schedule(n: int, now: datetime, rng: random.Random) -> Schedule:
+    schedule = Schedule()
+    for i in range(n):
+        # Just ran: next fire is in the future.
+        schedule.add_recurring(RecurringEntry(
+            id=f"r{i}", action="review", cron=rng.choice(_CRONS), last_run_at=now,
+        ))
+    for i in range(_DUE):
+        schedule.add_oneshot(OneshotEntry(
+            id=f"o{i}", action="implement", run_at=now - timedelta(minutes=i + 1),
+        ))
+    return schedule
+
+
+def _per_tick_ms(fn) -> float:
+    t0 = time.perf_counter()
+    for _ in range(_TICKS):
+        fn()
+    return (time.perf_counter() - t0) / _TICKS * 1e3
+
+
+def test_schedule_service_tick_cost(tmp_path):
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    rows = []
+    for n in _SIZES:
+        store = ScheduleStore(tmp_path / str(n))
+        store.save(_schedule(n, now, rng))
+        st = os.stat(store.path)
+        os.utime(store.path, ns=(st.st_atime_ns, st.st_mtime_ns - 60 * 10**9))
+
+        def legacy():
+            pending = store.load().compute_pending(now)
+            assert len(pending) == _DUE
+
+        service = ScheduleService(store)
+        service.compute_pending(service.load(), now)  # warm: parse + index once
+
+        def cached():
+            pending = service.compute_pending(service.load(), now)
+            assert len(pending) == _DUE
+
+        rows.append((n, _per_tick_ms(legacy), _per_tick_ms(cached)))
+
+    print(f"\n{'entries':>8} {'load+scan ms':>14} {'service ms':>12} {'speedup':>9}")
+    for n, old, new in rows:
+        print(f"{n:>8} {old:>14.2f} {new:>12.3f} {old / new:>8.0f}x")
+
+    n, old, new = rows[-1]
+    assert new * 20 < old
+    # O(due): the cached tick does not grow with the number of idle entries.
+    assert rows[-1][2] < rows[0][2] * 10 + 0.5
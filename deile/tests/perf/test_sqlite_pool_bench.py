@@ -0,0 +1,97 @@
+"""Throughput of per-call ``sqlite3.connect`` vs the pooled ``SQLiteDatabase``.
+
+Mirrors the old access pattern of ``CronStore``/``CostRepository`` (open,
+PRAGMA, execute, commit, close per operation) against the shared writer
+thread + per-thread read connections, for single-row inserts and point
+reads from a few threads. Run with ``pytest -s -m perf`` to see the table.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from deile.storage.sqlite_pool import SQLiteDatabase
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow]
+
+_OPS = 400
+_THREADS = 4
+_SCHEMA = "CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, v REAL)"
+
+
+def _run(threads: int, op) -> float:
+    """Runs ``op(thread_no, i)`` ``_OPS`` times per thread; returns ops/s."""
+    def worker(n):
+        for i in range(_OPS):
+            op(n, i)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    t0 = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return threads * _OPS / (time.perf_counter() - t0)
+
+
+def _per_call(path: Path):
+    lock = threading.Lock()
+
+    def write(n, i):
+        with lock:
+            conn = sqlite3.connect(path, timeout=10)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("INSERT INTO kv VALUES (?, ?)", (f"{n}-{i}", i))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def read(n, i):
+        conn = sqlite3.connect(path, timeout=10)
+        try:
+            conn.execute("SELECT v FROM kv WHERE k = ?", (f"{n}-{i}",)).fetchone()
+        finally:
+            conn.close()
+
+    return write, read
+
+
+def _pooled(db: SQLiteDatabase):
+    def write(n, i):
+        db.write(lambda c: c.execute("INSERT INTO kv VALUES (?, ?)", (f"{n}-{i}", i)))
+
+    def read(n, i):
+        db.read(lambda c: c.execute("SELECT v FROM kv WHERE k = ?", (f"{n}-{i}",)).fetchone())
+
+    return write, read
+
+
+def test_pooled_connections_beat_per_call_connect(tmp_path):
+    baseline_path = tmp_path / "per_call.db"
+    with sqlite3.connect(baseline_path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+    db = SQLiteDatabase(tmp_path / "pooled.db")
+    db.executescript(_SCHEMA)
+
+    results = {}
+    try:
+        for name, (write, read) in (("per-call", _per_call(baseline_path)),
+                                    ("pooled", _pooled(db))):
+            results[name] = (_run(_THREADS, write), _run(_THREADS, read))
+    finally:
+        db.close()
+
+    print(f"\n{'mode':<10}{'writes/s':>12}{'reads/s':>12}")
+    for name, (w, r) in results.items():
+        print(f"{name:<10}{w:>12.0f}{r:>12.0f}")
+    print(f"pool transactions: {db.stats['transactions']} for {db.stats['writes']} writes")
+
+    assert results["pooled"][0] > results["per-call"][0]
+    assert results["pooled"][1] > results["per-call"][1]
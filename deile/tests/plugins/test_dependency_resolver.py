@@ -6,9 +6,9 @@ from deile.plugins.dependency_resolver import DependencyNode, DependencyResolver
 
 
 def _build(edges: list[tuple[str, list[str]]]) -> DependencyResolver:
-    """Build a DependencyResolver with an explicit edge list, bypassing the
-    add_plugin guard that prevents updating already-created nodes.
-    This lets us construct cycles directly, which is what check_circular_dependencies must handle."""
+    """Build a DependencyResolver with an explicit edge list, bypassing
+    add_plugin. This lets us construct cycles directly, which is what
+    check_circular_dependencies must handle."""
     resolver = DependencyResolver()
     # First pass: ensure all nodes exist
     all_nodes = set()
@@ -93,3 +93,28 @@ def test_self_loop():
     cycles = resolver.check_circular_dependencies()
     assert len(cycles) == 1
     assert "A" in cycles[0]
+
+
+@pytest.mark.unit
+def test_add_plugin_fills_placeholder_node():
+    """Nó criado como dependência ganha as próprias dependências depois."""
+    resolver = DependencyResolver()
+    resolver.add_plugin("top", ["mid"])
+    resolver.add_plugin("mid", ["base"])
+    assert resolver.dependency_graph["mid"].dependencies == {"base"}
+    assert resolver.get_dependents("base") == {"mid", "top"}
+
+
+@pytest.mark.unit
+def test_resolve_reload_order_is_topological_over_dependents():
+    """Reload parte do plugin alterado e respeita dependências entre afetados."""
+    resolver = DependencyResolver()
+    resolver.add_plugin("top", ["mid", "side"])
+    resolver.add_plugin("mid", ["base"])
+    resolver.add_plugin("side", ["base", "other"])
+    resolver.add_plugin("other", [])
+    order = resolver.resolve_reload_order("base")
+    assert order[0] == "base"
+    assert set(order) == {"base", "mid", "side", "top"}
+    assert order.index("top") > max(order.index("mid"), order.index("side"))
+    assert resolver.resolve_reload_order("ghost") == ["ghost"]
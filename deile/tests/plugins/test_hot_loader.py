@@ -7,17 +7,22 @@ directly. That handler runs on a watchdog worker thread (``Observer`` extends
 were never scheduled and the documented hot-reload feature was dead.
 
 These tests verify the handler now hops back onto the loop captured by
-``HotLoader.start`` via ``run_coroutine_threadsafe``.
+``HotLoader.start`` via ``call_soon_threadsafe``, and that the
+``ReloadCoordinator`` behind it turns bursts of synthetic watchdog events
+into one debounced, hash-checked, dependency-ordered reload.
 """
 
 from __future__ import annotations
 
 import asyncio
 import threading
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
-from deile.plugins.hot_loader import HotLoader, PluginFileHandler
+from deile.plugins.hot_loader import (HotLoader, PluginFileHandler,
+                                      ReloadCoordinator)
+from deile.plugins.plugin_manager import PluginStatus
 
 
 class _FakePluginManager:
@@ -26,9 +31,10 @@ class _FakePluginManager:
         self.reload_calls: list[str] = []
         self._reload_event = asyncio.Event()
 
-    async def reload_plugin(self, plugin_id: str) -> None:
+    async def reload_plugin(self, plugin_id: str) -> bool:
         self.reload_calls.append(plugin_id)
         self._reload_event.set()
+        return True
 
     async def wait_for_reload(self, timeout: float = 2.0) -> bool:
         try:
@@ -116,3 +122,196 @@ async def test_hot_loader_start_captures_loop(tmp_path) -> None:
     finally:
         await loader.stop()
         assert loader._loop is None
+
+
+class _GraphPluginManager:
+    """Fake manager with a dependency graph and slow, traced reloads."""
+
+    def __init__(self, plugins_dir: Path, graph: dict[str, list[str]], reload_s: float = 0.0):
+        self.plugins_dir = plugins_dir
+        self._graph = graph
+        self._reload_s = reload_s
+        self.status = {plugin_id: PluginStatus.ACTIVE for plugin_id in graph}
+        self.failing: set[str] = set()
+        self.reload_calls: list[str] = []
+        self.in_flight: dict[str, int] = {}
+        self.max_in_flight: dict[str, int] = {}
+        for plugin_id in graph:
+            (plugins_dir / plugin_id).mkdir(parents=True, exist_ok=True)
+            (plugins_dir / plugin_id / "main.py").write_text(f"# {plugin_id} v0\n")
+
+    def list_plugins(self):
+        return [SimpleNamespace(plugin_id=p, dependencies=deps, status=self.status[p])
+                for p, deps in self._graph.items()]
+
+    async def reload_plugin(self, plugin_id: str) -> bool:
+        self.in_flight[plugin_id] = self.in_flight.get(plugin_id, 0) + 1
+        self.max_in_flight[plugin_id] = max(
+            self.max_in_flight.get(plugin_id, 0), self.in_flight[plugin_id]
+        )
+        await asyncio.sleep(self._reload_s)
+        self.in_flight[plugin_id] -= 1
+        self.reload_calls.append(plugin_id)
+        # Como PluginManager.reload_plugin: falha vira False, não exceção.
+        return plugin_id not in self.failing
+
+
+def _modified(path: Path) -> SimpleNamespace:
+    return SimpleNamespace(is_directory=False, src_path=str(path))
+
+
+async def _replay(handler: PluginFileHandler, events, gap_s: float = 0.0) -> None:
+    """Fire events from a worker thread, as the watchdog Observer does."""
+
+    def fire() -> None:
+        for event in events:
+            kind = "on_moved" if hasattr(event, "dest_path") else "on_modified"
+            getattr(handler, kind)(event)
+            if gap_s:
+                threading.Event().wait(gap_s)
+
+    await asyncio.to_thread(fire)
+
+
+async def _coordinated(tmp_path, graph, debounce_s=0.05, reload_s=0.0):
+    pm = _GraphPluginManager(tmp_path / "plugins", graph, reload_s)
+    coordinator = ReloadCoordinator(pm, debounce_s=debounce_s)
+    await coordinator.prime()
+    handler = PluginFileHandler(pm, asyncio.get_running_loop(), coordinator)
+    return pm, coordinator, handler
+
+
+async def test_burst_of_events_coalesces_into_one_reload(tmp_path) -> None:
+    pm, coordinator, handler = await _coordinated(tmp_path, {"alpha": []})
+    main = pm.plugins_dir / "alpha" / "main.py"
+    main.write_text("# alpha v1\n")
+
+    # Editor save: several writes + a swap file, faster than the window.
+    burst = [_modified(main)] * 20 + [_modified(pm.plugins_dir / "alpha" / ".main.py.swp")]
+    await _replay(handler, burst, gap_s=0.002)
+    await coordinator.drain()
+
+    assert pm.reload_calls == ["alpha"]
+    stats = coordinator.get_stats()
+    assert stats["events"] == 20 and stats["coalesced"] == 19 and stats["reloads"] == 1
+
+
+async def test_unchanged_content_is_not_reloaded(tmp_path) -> None:
+    pm, coordinator, handler = await _coordinated(tmp_path, {"alpha": []})
+    main = pm.plugins_dir / "alpha" / "main.py"
+
+    # touch / save-without-changes: mtime moves, bytes do not.
+    main.write_text(main.read_text())
+    await _replay(handler, [_modified(main)] * 3)
+    await coordinator.drain()
+    assert pm.reload_calls == []
+    assert coordinator.get_stats()["skipped_unchanged"] == 1
+
+    main.write_text("# alpha v1\n")
+    await _replay(handler, [_modified(main)])
+    await coordinator.drain()
+    main.write_text("# alpha v1\n")
+    await _replay(handler, [_modified(main)])
+    await coordinator.drain()
+
+    assert pm.reload_calls == ["alpha"]
+    assert coordinator.get_stats()["skipped_unchanged"] == 2
+
+
+async def test_dependents_reload_in_topological_order(tmp_path) -> None:
+    # base <- mid <- top, base <- side; other is unrelated.
+    graph = {"top": ["mid"], "mid": ["base"], "side": ["base"], "base": [], "other": []}
+    pm, coordinator, handler = await _coordinated(tmp_path, graph)
+    (pm.plugins_dir / "base" / "main.py").write_text("# base v1\n")
+
+    await _replay(handler, [_modified(pm.plugins_dir / "base" / "main.py")])
+    await coordinator.drain()
+
+    calls = pm.reload_calls
+    assert calls[0] == "base"
+    assert sorted(calls) == ["base", "mid", "side", "top"]
+    assert calls.index("mid") < calls.index("top")
+
+
+async def test_failed_reload_stops_the_dependent_cascade(tmp_path) -> None:
+    # base <- mid <- top, base <- side.
+    graph = {"top": ["mid"], "mid": ["base"], "side": ["base"], "base": []}
+    pm, coordinator, handler = await _coordinated(tmp_path, graph)
+    pm.failing.add("base")  # half-saved file with a syntax error
+    (pm.plugins_dir / "base" / "main.py").write_text("# base v1 (\n")
+
+    await _replay(handler, [_modified(pm.plugins_dir / "base" / "main.py")])
+    await coordinator.drain()
+
+    assert pm.reload_calls == ["base"]
+    stats = coordinator.get_stats()
+    assert stats["failed"] == 1 and stats["reloads"] == 0
+
+
+async def test_failed_reload_is_retried_on_the_same_content(tmp_path) -> None:
+    pm, coordinator, handler = await _coordinated(tmp_path, {"alpha": []})
+    main = pm.plugins_dir / "alpha" / "main.py"
+    pm.failing.add("alpha")  # e.g. a missing module outside the plugin dir
+    main.write_text("# alpha v1\n")
+    await _replay(handler, [_modified(main)])
+    await coordinator.drain()
+
+    # Outside cause fixed; the same bytes are saved again.
+    pm.failing.clear()
+    main.write_text("# alpha v1\n")
+    await _replay(handler, [_modified(main)])
+    await coordinator.drain()
+
+    assert pm.reload_calls == ["alpha", "alpha"]
+    stats = coordinator.get_stats()
+    assert stats["failed"] == 1 and stats["reloads"] == 1
+    assert stats["skipped_unchanged"] == 0
+
+
+async def test_only_loaded_dependents_are_reloaded(tmp_path) -> None:
+    graph = {"mid": ["base"], "idle": ["base"], "base": []}
+    pm, coordinator, handler = await _coordinated(tmp_path, graph)
+    pm.status["idle"] = PluginStatus.DISABLED
+    pm.status["mid"] = PluginStatus.LOADED
+    (pm.plugins_dir / "base" / "main.py").write_text("# base v1\n")
+
+    await _replay(handler, [_modified(pm.plugins_dir / "base" / "main.py")])
+    await coordinator.drain()
+
+    assert pm.reload_calls == ["base", "mid"]
+
+
+async def test_reloads_are_serialized_per_plugin(tmp_path) -> None:
+    pm, coordinator, handler = await _coordinated(
+        tmp_path, {"alpha": [], "beta": ["alpha"]}, debounce_s=0.01, reload_s=0.1
+    )
+    alpha = pm.plugins_dir / "alpha" / "main.py"
+    beta = pm.plugins_dir / "beta" / "main.py"
+
+    # Changes keep landing while earlier reloads are still running.
+    for version in range(3):
+        alpha.write_text(f"# alpha v{version + 1}\n")
+        beta.write_text(f"# beta v{version + 1}\n")
+        await _replay(handler, [_modified(alpha), _modified(beta)])
+        await asyncio.sleep(0.05)
+    await coordinator.drain()
+
+    assert pm.max_in_flight == {"alpha": 1, "beta": 1}
+    assert pm.reload_calls.count("alpha") >= 1
+    assert pm.reload_calls[-1] == "beta"
+
+
+async def test_atomic_save_via_rename_triggers_reload(tmp_path) -> None:
+    pm, coordinator, handler = await _coordinated(tmp_path, {"alpha": []})
+    plugin_dir = pm.plugins_dir / "alpha"
+    tmp_file = plugin_dir / "main.py.tmp"
+    tmp_file.write_text("# alpha v1\n")
+    tmp_file.replace(plugin_dir / "main.py")
+
+    moved = SimpleNamespace(is_directory=False, src_path=str(tmp_file),
+                            dest_path=str(plugin_dir / "main.py"))
+    outside = _modified(tmp_path / "elsewhere.py")
+    await _replay(handler, [moved, outside])
+    await coordinator.drain()
+
+    assert pm.reload_calls == ["alpha"]
@@ -0,0 +1,274 @@
+"""Tests for the subprocess plugin sandbox (issue #54).
+
+A small suite of misbehaving plugins — CPU hog, memory bomb, hang, hard
+crash, stdout noise — runs under ``PluginSandbox`` and must leave the
+agent process untouched: limits kill or fail the call, the caller gets a
+typed error, and the next call gets a fresh process with the lifecycle
+replayed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from deile.plugins.plugin_manager import PluginManager, PluginStatus
+from deile.plugins.sandbox import (PluginCallError, PluginCrashedError,
+                                   PluginSandbox, PluginSandboxError,
+                                   PluginTimeoutError, SandboxedPlugin,
+                                   SandboxLimits)
+
+_PLUGIN_SOURCE = '''
+import os
+import sys
+import time
+
+from deile.plugins.plugin_manager import BasePlugin
+
+
+class MisbehavingPlugin(BasePlugin):
+    def __init__(self, plugin_id):
+        super().__init__(plugin_id)
+        self.initialized = 0
+        self.counter = 0
+
+    async def initialize(self):
+        self.initialized += 1
+
+    def get_capabilities(self):
+        return ["test.misbehave"]
+
+    async def echo(self, value, suffix=""):
+        print("noise on stdout must not break the framing")
+        return {"value": value, "suffix": suffix, "pid": os.getpid()}
+
+    def increment(self):
+        self.counter += 1
+        return self.counter
+
+    def state(self):
+        return {"initialized": self.initialized, "active": self.is_active,
+                "counter": self.counter}
+
+    def burn_cpu(self):
+        while True:
+            pass
+
+    def allocate(self, megabytes):
+        blob = bytearray(megabytes * 1024 * 1024)
+        return len(blob)
+
+    def hang(self):
+        time.sleep(3600)
+
+    def nap(self, seconds):
+        time.sleep(seconds)
+        return "late"
+
+    def crash(self):
+        sys.stderr.write("about to die\\n")
+        sys.stderr.flush()
+        os._exit(7)
+
+    def open_files(self, count):
+        handles = [open(os.devnull) for _ in range(count)]
+        return len(handles)
+
+    def fail(self):
+        raise ValueError("boom")
+
+    def not_json(self):
+        return object()
+'''
+
+
+def _write_plugin(root: Path, plugin_id: str = "misbehave") -> Path:
+    plugin_dir = root / plugin_id
+    plugin_dir.mkdir(parents=True)
+    (plugin_dir / "main.py").write_text(textwrap.dedent(_PLUGIN_SOURCE))
+    (plugin_dir / "plugin.json").write_text(json.dumps({
+        "plugin_id": plugin_id, "name": "Misbehaving", "version": "1.0.0",
+    }))
+    return plugin_dir
+
+
+@pytest.fixture
+async def sandbox_factory(tmp_path):
+    sandboxes = []
+
+    async def _make(**limits) -> PluginSandbox:
+        sandbox = PluginSandbox(SandboxLimits(**limits))
+        assert await sandbox.isolate_plugin("misbehave", _write_plugin(tmp_path / f"s{len(sandboxes)}"))
+        sandboxes.append(sandbox)
+        return sandbox
+
+    yield _make
+    for sandbox in sandboxes:
+        await sandbox.shutdown()
+
+
+async def test_calls_run_in_another_process(sandbox_factory):
+    sandbox = await sandbox_factory()
+
+    result = await sandbox.execute_in_sandbox("misbehave", "echo", 42, suffix="!")
+
+    assert result["value"] == 42 and result["suffix"] == "!"
+    assert result["pid"] != os.getpid()
+    assert sandbox.plugin_metadata("misbehave")["capabilities"] == ["test.misbehave"]
+
+
+async def test_plugin_exceptions_are_typed_and_keep_the_process(sandbox_factory):
+    sandbox = await sandbox_factory()
+    pid = sandbox.get_stats("misbehave")["pid"]
+
+    with pytest.raises(PluginCallError) as excinfo:
+        await sandbox.execute_in_sandbox("misbehave", "fail")
+    assert excinfo.value.remote_type == "ValueError"
+    with pytest.raises(PluginCallError, match="TypeError"):
+        await sandbox.execute_in_sandbox("misbehave", "not_json")
+    with pytest.raises(PluginCallError, match="AttributeError"):
+        await sandbox.execute_in_sandbox("misbehave", "_private")
+
+    assert sandbox.get_stats("misbehave")["pid"] == pid
+
+
+async def test_cpu_hog_is_killed_by_rlimit_cpu(sandbox_factory):
+    sandbox = await sandbox_factory(cpu_seconds_per_call=1, call_timeout_s=30)
+
+    t0 = time.monotonic()
+    with pytest.raises(PluginCrashedError, match="SIGXCPU|SIGKILL") as excinfo:
+        await sandbox.execute_in_sandbox("misbehave", "burn_cpu")
+
+    assert time.monotonic() - t0 < 10
+    assert excinfo.value.returncode < 0
+    # Restarted transparently on the next call.
+    assert await sandbox.execute_in_sandbox("misbehave", "increment") == 1
+
+
+async def test_loading_is_not_charged_to_the_per_call_cpu_budget(tmp_path):
+    plugin_dir = _write_plugin(tmp_path)
+    main_py = plugin_dir / "main.py"
+    # Import that burns more CPU than one call may use.
+    main_py.write_text(
+        "import time\n"
+        "_t0 = time.process_time()\n"
+        "while time.process_time() - _t0 < 1.5:\n"
+        "    pass\n" + main_py.read_text()
+    )
+    sandbox = PluginSandbox(SandboxLimits(cpu_seconds_per_call=1, call_timeout_s=30))
+    try:
+        assert await sandbox.isolate_plugin("misbehave", plugin_dir)
+        assert await sandbox.execute_in_sandbox("misbehave", "increment") == 1
+    finally:
+        await sandbox.shutdown()
+
+
+async def test_memory_bomb_fails_inside_the_plugin(sandbox_factory):
+    sandbox = await sandbox_factory(memory_bytes=512 * 1024 * 1024)
+
+    with pytest.raises(PluginCallError) as excinfo:
+        await sandbox.execute_in_sandbox("misbehave", "allocate", 2048)
+
+    assert excinfo.value.remote_type == "MemoryError"
+    assert await sandbox.execute_in_sandbox("misbehave", "allocate", 8) == 8 * 1024 * 1024
+
+
+async def test_hang_times_out_and_restarts_with_lifecycle_replayed(sandbox_factory):
+    sandbox = await sandbox_factory(call_timeout_s=1.0)
+    await sandbox.execute_in_sandbox("misbehave", "initialize")
+    await sandbox.execute_in_sandbox("misbehave", "activate")
+    await sandbox.execute_in_sandbox("misbehave", "increment")
+    old_pid = sandbox.get_stats("misbehave")["pid"]
+
+    with pytest.raises(PluginTimeoutError):
+        await sandbox.execute_in_sandbox("misbehave", "hang")
+    assert sandbox.get_stats("misbehave")["alive"] is False
+
+    state = await sandbox.execute_in_sandbox("misbehave", "state")
+    assert state == {"initialized": 1, "active": True, "counter": 0}
+    stats = sandbox.get_stats("misbehave")
+    assert stats["pid"] != old_pid
+    assert stats["timeouts"] == 1 and stats["restarts"] == 1
+
+
+async def test_cancelled_call_does_not_leave_a_stale_reply(sandbox_factory):
+    sandbox = await sandbox_factory()
+    await sandbox.execute_in_sandbox("misbehave", "increment")
+    old_pid = sandbox.get_stats("misbehave")["pid"]
+
+    task = asyncio.ensure_future(sandbox.execute_in_sandbox("misbehave", "nap", 0.5))
+    await asyncio.sleep(0.2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0.5)  # the nap's reply would be in the pipe by now
+
+    result = await sandbox.execute_in_sandbox("misbehave", "echo", 1)
+    assert result["value"] == 1
+    assert result["pid"] != old_pid
+    assert sandbox.get_stats("misbehave")["errors"] == 0
+
+
+async def test_crash_reports_exit_and_stderr(sandbox_factory):
+    sandbox = await sandbox_factory()
+
+    with pytest.raises(PluginCrashedError, match="código 7 — about to die") as excinfo:
+        await sandbox.execute_in_sandbox("misbehave", "crash")
+
+    assert excinfo.value.returncode == 7
+
+
+async def test_restarts_are_capped_per_window(sandbox_factory):
+    sandbox = await sandbox_factory(max_restarts=1, restart_window_s=60)
+
+    with pytest.raises(PluginCrashedError):
+        await sandbox.execute_in_sandbox("misbehave", "crash")
+    with pytest.raises(PluginCrashedError):
+        await sandbox.execute_in_sandbox("misbehave", "crash")
+    with pytest.raises(PluginSandboxError, match="desistindo"):
+        await sandbox.execute_in_sandbox("misbehave", "increment")
+
+
+async def test_open_file_limit(sandbox_factory):
+    sandbox = await sandbox_factory(max_open_files=16)
+
+    with pytest.raises(PluginCallError) as excinfo:
+        await sandbox.execute_in_sandbox("misbehave", "open_files", 64)
+
+    assert excinfo.value.remote_type == "OSError"
+
+
+async def test_unknown_plugin_and_bad_arguments(sandbox_factory):
+    sandbox = await sandbox_factory()
+
+    with pytest.raises(PluginSandboxError, match="não está registrado"):
+        await sandbox.execute_in_sandbox("ghost", "echo", 1)
+    with pytest.raises(PluginSandboxError, match="JSON"):
+        await sandbox.execute_in_sandbox("misbehave", "echo", object())
+    assert not await sandbox.isolate_plugin("instance", object())
+
+
+async def test_plugin_manager_loads_through_the_sandbox(tmp_path):
+    _write_plugin(tmp_path, "misbehave")
+    sandbox = PluginSandbox(SandboxLimits(call_timeout_s=5))
+    manager = PluginManager(plugins_dir=tmp_path, sandbox=sandbox)
+    try:
+        await manager.discover_plugins()
+        assert await manager.activate_plugin("misbehave")
+
+        instance = manager.get_plugin_info("misbehave").instance
+        assert isinstance(instance, SandboxedPlugin)
+        assert instance.get_capabilities() == ["test.misbehave"]
+        assert await instance.call("state") == {"initialized": 1, "active": True, "counter": 0}
+
+        assert await manager.unload_plugin("misbehave")
+        assert manager.get_plugin_info("misbehave").status == PluginStatus.UNKNOWN
+        assert sandbox.get_stats("misbehave")["alive"] is False
+    finally:
+        await sandbox.shutdown()
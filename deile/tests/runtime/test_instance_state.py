@@ -232,9 +232,51 @@ def test_update_stats_is_threadsafe_under_concurrency():
 # ── heartbeat ────────────────────────────────────────────────────────────
 
 
+async def test_heartbeat_loop_updates_slot_without_rewriting_file():
+    state = InstanceState(role="cli", enable_status_server=False)
+    try:
+        assert state.slot is not None
+        before_slot = state.slot.read()
+        mtime = state.path.stat().st_mtime_ns
+        task = asyncio.create_task(state.heartbeat_loop(interval_s=0.05))
+        await asyncio.sleep(0.25)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        after_slot = state.slot.read()
+        assert after_slot.heartbeat_ns > before_slot.heartbeat_ns
+        assert after_slot.state_version == before_slot.state_version
+        assert state.path.stat().st_mtime_ns == mtime  # JSON intocado
+        assert state.snapshot()["last_heartbeat_at"] != _read(state.path)["last_heartbeat_at"]
+    finally:
+        state.close()
+
+
+def test_unchanged_action_and_empty_stats_do_not_flush():
+    state = InstanceState(role="cli", enable_status_server=False)
+    try:
+        state.update_action("tool_execution", detail="bash")
+        version = state.slot.read().state_version
+        started = _read(state.path)["current_action"]["started_at"]
+
+        state.update_action("tool_execution", detail="bash")
+        state.update_stats()
+        assert state.slot.read().state_version == version
+        assert state.snapshot()["current_action"]["started_at"] == started
+
+        state.clear_action()
+        state.clear_action()
+        assert state.slot.read().state_version == version + 1  # só o clear real
+        assert _read(state.path)["current_action"] is None
+    finally:
+        state.close()
+
+
 async def test_heartbeat_loop_updates_last_heartbeat_at():
-    state = InstanceState(role="cli")
+    # Sem registry não há slot: o heartbeat volta a reescrever o state file.
+    state = InstanceState(role="cli", enable_registry=False)
     try:
+        assert state.slot is None
         before = _read(state.path)["last_heartbeat_at"]
         task = asyncio.create_task(state.heartbeat_loop(interval_s=0.05))
         # Garante pelo menos 2 ticks observáveis (≥100ms total).
@@ -3,13 +3,16 @@
 Cobre o lifecycle de registro/derregistro, idempotência por ``instance_id``,
 GC de órfãos (PID morto e state_file ausente), tolerância a JSON corrompido
 e schema_version desconhecido, file lock cross-thread, atomicidade
-write-tmp + replace.
+write-tmp + replace, e a tabela de slots mmap (heartbeat in-place,
+leitura seqlock, reaproveitamento de slots órfãos).
 """
 
 from __future__ import annotations
 
 import json
 import os
+import subprocess
+import sys
 import threading
 
 import pytest
@@ -17,6 +20,7 @@ import pytest
 from deile.runtime.registry import (DEFAULT_REGISTRY_FILENAME,
                                     REGISTRY_SCHEMA_VERSION, Registry,
                                     RegistryEntry)
+from deile.runtime.slots import SlotTable
 
 
 def _entry(instance_id: str, *, pid: int = None, role: str = "cli",
@@ -246,3 +250,107 @@ def test_register_uses_atomic_write_tmp_then_replace(short_runtime_dir):
     # Estado final: 10 entries, sem tmp pendurado.
     assert not reg.path.with_suffix(reg.path.suffix + ".tmp").exists()
     assert len(reg.list(gc=False)) == 10
+
+
+# ── slots mmap ────────────────────────────────────────────────────────────
+
+
+def test_register_claims_slot_only_for_own_pid(short_runtime_dir):
+    reg = Registry(registry_path=short_runtime_dir / "registry.json")
+    reg.register(_entry("cli-own"))
+    reg.register(_entry("cli-other", pid=2_147_483_646))
+
+    assert reg.slot("cli-own") is not None
+    assert reg.slot("cli-other") is None
+    beats = reg.heartbeats()
+    assert set(beats) == {"cli-own"}
+    assert beats["cli-own"].pid == os.getpid()
+
+    reg.deregister("cli-own")
+    assert reg.heartbeats() == {}
+
+
+def test_heartbeat_is_in_place_and_visible_to_other_readers(short_runtime_dir):
+    reg = Registry(registry_path=short_runtime_dir / "registry.json")
+    reg.register(_entry("cli-beat"))
+    before = reg.path.stat().st_mtime_ns
+
+    reg.slot("cli-beat").beat(now_ns=123_000_000_000)
+
+    reader = Registry(registry_path=short_runtime_dir / "registry.json")
+    assert reader.heartbeats()["cli-beat"].heartbeat_ns == 123_000_000_000
+    assert reg.path.stat().st_mtime_ns == before
+
+
+def test_slot_of_dead_pid_is_reused(short_runtime_dir):
+    table = SlotTable(short_runtime_dir / "registry.slots", slot_count=2)
+    table.claim(instance_id="ghost-1", pid=2_147_483_646, role="cli")
+    table.claim(instance_id="ghost-2", pid=2_147_483_645, role="cli")
+    assert table.read_all() == []  # PIDs mortos não aparecem
+
+    handle = table.claim(instance_id="cli-new", pid=os.getpid(), role="cli")
+
+    assert handle is not None and handle.index == 0
+    assert [r.instance_id for r in table.read_all()] == ["cli-new"]
+    table.close()
+
+
+def test_reader_skips_slot_mid_write(short_runtime_dir):
+    table = SlotTable(short_runtime_dir / "registry.slots")
+    handle = table.claim(instance_id="cli-torn", pid=os.getpid(), role="cli")
+    offset = table._mm.find(b"cli-torn") - 40
+    seq = int.from_bytes(table._mm[offset:offset + 8], "little")
+
+    table._mm[offset:offset + 8] = (seq + 1).to_bytes(8, "little")  # escritor "no meio"
+    assert table.read_all() == []
+
+    table._mm[offset:offset + 8] = (seq + 2).to_bytes(8, "little")
+    assert [r.index for r in table.read_all()] == [handle.index]
+    table.close()
+
+
+def test_slot_torn_by_a_dead_writer_is_reclaimed(short_runtime_dir):
+    table = SlotTable(short_runtime_dir / "registry.slots", slot_count=1)
+    table.claim(instance_id="cli-torn", pid=2_147_483_646, role="cli")
+    offset = table._mm.find(b"cli-torn") - 40
+    seq = int.from_bytes(table._mm[offset:offset + 8], "little")
+    table._mm[offset:offset + 8] = (seq + 1).to_bytes(8, "little")  # morreu no meio
+
+    handle = table.claim(instance_id="cli-new", pid=os.getpid(), role="cli")
+
+    assert handle is not None and handle.index == 0
+    assert [r.instance_id for r in table.read_all()] == ["cli-new"]
+    table.close()
+
+
+def test_list_reparses_only_when_file_changes(short_runtime_dir, monkeypatch):
+    reg = Registry(registry_path=short_runtime_dir / "registry.json")
+    reg.register(_entry("cli-a"))
+    assert [e.instance_id for e in reg.list()] == ["cli-a"]
+
+    calls = []
+    real_load = reg._load_unlocked
+    monkeypatch.setattr(reg, "_load_unlocked", lambda: calls.append(1) or real_load())
+    reg.list()
+    assert calls == []
+
+    Registry(registry_path=reg.path).register(_entry("cli-b"))
+    assert {e.instance_id for e in reg.list()} == {"cli-a", "cli-b"}
+    assert calls  # arquivo mudou → reparse
+
+
+def test_slots_are_shared_across_processes(short_runtime_dir):
+    reg = Registry(registry_path=short_runtime_dir / "registry.json")
+    reg.register(_entry("cli-parent"))
+    reg.slot("cli-parent").beat(now_ns=42_000_000_000)
+
+    code = (
+        "import sys; from deile.runtime.slots import SlotTable; "
+        "t = SlotTable(sys.argv[1], create=False); "
+        "print(t.heartbeats()['cli-parent'])"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code, str(reg.slots_path)],
+        capture_output=True, text=True, check=True, timeout=60,
+    )
+    assert float(out.stdout) == 42.0
@@ -0,0 +1,148 @@
+"""Compiled permission policy (``deile/security/permission_policy.py``).
+
+The compiled engine must return exactly what the old linear evaluation
+(sort by priority, first rule whose regex matches) returned; the
+equivalence test replays random rule sets against that reference.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from deile.security.permission_policy import (CompiledPolicy, DecisionCache,
+                                              PrefixTrie, literal_prefix,
+                                              literal_suffix)
+from deile.security.permissions import (PermissionLevel, PermissionManager,
+                                        PermissionRule, ResourceType)
+
+
+def _rule(rule_id, pattern, level=PermissionLevel.READ, tools=("*",), priority=100):
+    return PermissionRule(
+        id=rule_id, name=rule_id, description="",
+        resource_type=ResourceType.FILE, resource_pattern=pattern,
+        tool_names=list(tools), permission_level=level, priority=priority,
+    )
+
+
+def _reference(rules, tool, resource, org_prefix="org__"):
+    applicable = [
+        r for r in sorted(rules, key=lambda r: r.priority)
+        if r.enabled and r.applies_to_tool(tool) and r.matches_resource(resource)
+    ]
+    base = next((r for r in applicable if not r.id.startswith(org_prefix)), None)
+    org = next((r for r in applicable if r.id.startswith(org_prefix)), None)
+    return base, org
+
+
+@pytest.mark.parametrize("pattern,prefix", [
+    (r"^/etc/ssl/.*", "/etc/ssl/"),
+    (r"/home/u\.x/src", "/home/u.x/src"),
+    (r"^/var/lo?g", "/var/l"),
+    (r"^/tmp/a*", "/tmp/"),
+    (r"^/a/\d+", "/a/"),
+    (r".*\.git(/.*)?$", ""),
+    (r"^(/etc|/usr).*", ""),
+    (r"^/etc|/usr", ""),
+    (r"^/a[|]b", "/a"),
+])
+def test_literal_prefix(pattern, prefix):
+    assert literal_prefix(pattern) == prefix
+
+
+@pytest.mark.parametrize("pattern,suffix", [
+    (r".*\.env$", ".env"),
+    (r"^.*/secrets\.ya?ml$", ""),
+    (r".*\.(env|ini)$", ""),
+    (r".*\.py", ""),
+    (r"/abs.*\.py$", ""),
+])
+def test_literal_suffix(pattern, suffix):
+    assert literal_suffix(pattern) == suffix
+
+
+def test_prefix_trie_returns_every_matching_prefix():
+    trie = PrefixTrie()
+    trie.insert("/a", 0)
+    trie.insert("/a/b", 1)
+    trie.insert("/c", 2)
+    assert trie.candidates("/a/b/c") == [0, 1]
+    assert trie.candidates("/x") == []
+
+
+def test_compiled_policy_matches_linear_reference():
+    rng = random.Random(7)
+    dirs = ["/etc", "/home/u", "/home/u/src", "/srv/app", "/tmp"]
+    patterns = (
+        [f"^{d}/.*" for d in dirs]
+        + [r".*\.py$", r".*\.git(/.*)?$", r"^(/etc|/usr).*", r"^/home/(\w+)/\1$",
+           r"(?P<any>.*)\.env$", r"(?i)^/TMP/.*", r"^/srv/app/[a-z]+\.log$",
+           r".*\.env$", r".*/u$", r"^.*\.log$"]
+    )
+    tools = ["read_file", "write_file", "bash_execute"]
+    for trial in range(30):
+        rules = []
+        for i in range(rng.randint(1, 25)):
+            rule_id = f"org__r{i}" if rng.random() < 0.2 else f"r{i}"
+            rule = _rule(rule_id, rng.choice(patterns), rng.choice(list(PermissionLevel)),
+                         tools=rng.choice([["*"], [rng.choice(tools)]]),
+                         priority=rng.choice([5, 10, 50, 100]))
+            rule.enabled = rng.random() > 0.1
+            rules.append(rule)
+        policy = CompiledPolicy(rules, "org__")
+        for _ in range(40):
+            resource = rng.choice(dirs) + rng.choice(
+                ["/x.py", "/.git/config", "/u", "/a.env", "/svc.log", "", "/b.env\n", "/u\nx.env"])
+            tool = rng.choice(tools)
+            assert policy.match(tool, resource) == _reference(rules, tool, resource), (
+                trial, tool, resource)
+
+
+def test_manager_cache_invalidated_on_rule_changes():
+    pm = PermissionManager()
+    assert pm.check_permission("write_file", "./src/a.py", "write")
+    assert pm.check_permission("write_file", "./src/a.py", "write")
+    assert pm.get_stats()["decision_cache"]["hits"] == 1
+
+    pm.add_rule(_rule("deny_src", r"^\./src/.*", PermissionLevel.NONE, priority=1))
+    assert not pm.check_permission("write_file", "./src/a.py", "write")
+
+    # In-place edits (``/permissions disable``) are picked up too.
+    pm.get_rule_by_id("deny_src").enabled = False
+    assert pm.check_permission("write_file", "./src/a.py", "write")
+
+    pm.get_rule_by_id("deny_src").enabled = True
+    assert pm.remove_rule("deny_src")
+    assert pm.check_permission("write_file", "./src/a.py", "write")
+
+
+def test_unrelated_rules_do_not_invalidate_a_manager():
+    pm, other = PermissionManager(), PermissionManager()
+    assert pm.check_permission("write_file", "./src/a.py", "write")
+
+    # Building a rule, or editing one held by another manager, is not a change here.
+    other.add_rule(_rule("deny_src", r"^\./src/.*", PermissionLevel.NONE, priority=1))
+    other.get_rule_by_id("deny_src").enabled = False
+    assert pm.check_permission("write_file", "./src/a.py", "write")
+    assert pm.get_stats()["decision_cache"]["hits"] == 1
+
+    # A removed rule stops notifying the manager it left.
+    rule = _rule("deny_src", r"^\./src/.*", PermissionLevel.NONE, priority=1)
+    pm.add_rule(rule)
+    pm.remove_rule("deny_src")
+    assert pm.check_permission("write_file", "./src/a.py", "write")
+    rule.enabled = False
+    assert pm.check_permission("write_file", "./src/a.py", "write")
+    assert pm.get_stats()["decision_cache"]["hits"] == 2
+
+
+def test_decision_cache_is_bounded_lru():
+    cache = DecisionCache(max_entries=2)
+    cache.put("a", True)
+    cache.put("b", False)
+    assert cache.get("a") is True
+    cache.put("c", True)
+    assert cache.get("b") is None
+    assert cache.get("a") is True and cache.get("c") is True
+    assert len(cache) == 2
@@ -0,0 +1,117 @@
+"""Testes do embedder hashing-trick e do ``VectorIndex`` (flat/IVF).
+
+Cobertura:
+
+1. **Embedder**: determinístico, vetores unitários, textos com vocabulário
+   em comum ficam mais próximos que textos disjuntos; typo ainda casa
+   via trigramas.
+2. **Índice flat**: upsert/remove por id, filtro por ``candidates``.
+3. **IVF**: treina acima do limiar e mantém recall alto vs. busca exata.
+4. **Persistência**: round-trip em ``.npz`` e descarte quando o embedder muda.
+5. **EmbeddingStore**: ``search`` ranqueia por similaridade (não mais os
+   primeiros k) e persiste textos + vetores.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from deile.storage.embeddings import (EmbeddingStore, HashingEmbedder,
+                                      VectorIndex, load_or_create_index,
+                                      normalize_rows)
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    emb = HashingEmbedder(dim=128)
+    a = emb(["kubernetes pod restart loop"])
+    b = HashingEmbedder(dim=128)(["kubernetes pod restart loop"])
+    assert a.shape == (1, 128) and a.dtype == np.float32
+    np.testing.assert_array_equal(a, b)
+    assert abs(float(np.linalg.norm(a[0])) - 1.0) < 1e-5
+    assert not emb([""]).any()
+
+
+def test_hashing_embedder_similarity_tracks_overlap():
+    emb = HashingEmbedder()
+    q, related, typo, unrelated = emb([
+        "database migration failed",
+        "the migration of the database failed yesterday",
+        "databse migratoin failed",
+        "sunny weather at the beach",
+    ])
+    assert q @ related > q @ unrelated
+    assert q @ typo > q @ unrelated
+
+
+def test_flat_index_upsert_remove_and_candidates():
+    rng = np.random.default_rng(1)
+    vecs = normalize_rows(rng.normal(size=(5, 16)).astype(np.float32))
+    idx = VectorIndex(16)
+    idx.add(["a", "b", "c", "d", "e"], vecs)
+    assert [i for i, _ in idx.search(vecs[2], 1)] == ["c"]
+
+    idx.add(["c"], vecs[0:1])  # upsert: "c" agora é igual a "a"
+    assert len(idx) == 5
+    assert {i for i, _ in idx.search(vecs[0], 2)} == {"a", "c"}
+
+    assert idx.remove(["a", "zzz"]) == 1
+    assert "a" not in idx and len(idx) == 4
+    assert [i for i, _ in idx.search(vecs[4], 1)] == ["e"]
+    assert [i for i, _ in idx.search(vecs[4], 3, candidates=["b", "d"])][0] in {"b", "d"}
+    assert idx.search(vecs[4], 3, candidates=["nope"]) == []
+
+
+def test_ivf_trains_and_keeps_recall():
+    rng = np.random.default_rng(7)
+    centers = normalize_rows(rng.normal(size=(20, 32)).astype(np.float32))
+    data = normalize_rows(
+        centers[rng.integers(0, 20, size=3000)] + 0.3 * rng.normal(size=(3000, 32)).astype(np.float32)
+    )
+    ids = [str(i) for i in range(3000)]
+    flat = VectorIndex(32)
+    flat.add(ids, data)
+    ivf = VectorIndex(32, ivf_threshold=1000, nprobe=16)
+    ivf.add(ids, data)
+
+    hits = 0
+    for q in data[:100]:
+        exact = {i for i, _ in flat.search(q, 10)}
+        approx = {i for i, _ in ivf.search(q, 10)}
+        hits += len(exact & approx)
+    assert ivf.is_ivf
+    assert hits / 1000 >= 0.9
+
+
+def test_index_roundtrip_and_embedder_mismatch(tmp_path):
+    emb = HashingEmbedder(dim=64)
+    idx = VectorIndex(64, ivf_threshold=10, nlist=2)
+    idx.add([f"d{i}" for i in range(20)], emb([f"document number {i}" for i in range(20)]))
+    idx.search(emb(["document"])[0], 3)  # força o treino IVF
+    path = tmp_path / "idx.vec.npz"
+    idx.save(path, meta={"embedder": emb.name})
+
+    loaded = load_or_create_index(path, emb, ivf_threshold=10, nlist=2)
+    assert loaded.ids == idx.ids and loaded.is_ivf
+    q = emb(["document number 3"])[0]
+    assert loaded.search(q, 1) == idx.search(q, 1)
+
+    other = load_or_create_index(path, HashingEmbedder(dim=32))
+    assert len(other) == 0 and other.dim == 32
+
+
+def test_embedding_store_ranks_and_persists(tmp_path):
+    path = tmp_path / "store.npz"
+    store = EmbeddingStore(path=path)
+    store.add("how to rotate log files", {"k": 1})
+    store.add("python asyncio event loop", {"k": 2})
+    store.add("log rotation policy for daily files", {"k": 3})
+    top = store.search("rotating logs", top_k=2)
+    assert {hit["metadata"]["k"] for hit in top} == {1, 3}
+    assert top[0]["score"] >= top[1]["score"]
+    store.save()
+
+    reloaded = EmbeddingStore(path=path)
+    assert len(reloaded) == 3
+    assert reloaded.search("asyncio loop", top_k=1)[0]["metadata"] == {"k": 2}
+    reloaded.clear()
+    assert list(reloaded) == []
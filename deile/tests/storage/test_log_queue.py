@@ -0,0 +1,185 @@
+"""Testes do pipeline de logging em fila (:mod:`deile.storage.log_queue`).
+
+Cobre entrega pela thread do listener, as três políticas de descarte com
+seus contadores, o aviso de descarte emitido pelo listener, drenagem no
+``stop`` com fila cheia, rotação + compressão fora da thread que loga e a
+instalação pelo ``_ensure_initialized`` fora do pytest.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import threading
+import time
+
+import pytest
+
+from deile.storage import logs as logs_mod
+from deile.storage.log_queue import (BLOCK, DROP_NEWEST, DROP_OLDEST,
+                                     BoundedQueueHandler, LogPipeline)
+from deile.storage.log_rotation import (HourlyDailyDirRotatingHandler,
+                                        list_archived_log_files)
+
+
+class _Recorder(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+        self.threads.add(threading.current_thread().name)
+
+
+def _record(msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.makeLogRecord({"name": "deile.test", "levelno": level,
+                                  "levelname": logging.getLevelName(level), "msg": msg})
+
+
+def test_records_are_written_by_listener_thread():
+    target = _Recorder()
+    pipeline = LogPipeline(target, queue_size=100)
+    pipeline.start()
+    for i in range(10):
+        pipeline.handler.handle(_record(f"m{i}"))
+    pipeline.stop()
+
+    assert target.messages == [f"m{i}" for i in range(10)]
+    assert threading.current_thread().name not in target.threads
+    assert pipeline.stats()["enqueued"] == 10
+
+
+def test_drop_newest_counts_and_listener_reports():
+    target = _Recorder()
+    pipeline = LogPipeline(target, queue_size=2, drop_policy=DROP_NEWEST)
+    for i in range(5):
+        pipeline.handler.handle(_record(f"m{i}"))
+
+    stats = pipeline.stats()
+    assert stats["dropped"] == 3
+    assert stats["dropped_by_level"] == {"INFO": 3}
+    assert stats["queue_depth"] == 2
+
+    pipeline.start()
+    pipeline.stop()
+    assert target.messages[0] == "log queue full: dropped 3 record(s) (policy=drop_newest)"
+    assert target.messages[1:] == ["m0", "m1"]
+
+
+def test_drop_oldest_keeps_most_recent():
+    target = _Recorder()
+    pipeline = LogPipeline(target, queue_size=2, drop_policy=DROP_OLDEST)
+    for i in range(5):
+        pipeline.handler.handle(_record(f"m{i}"))
+    pipeline.start()
+    pipeline.stop()
+
+    assert target.messages[1:] == ["m3", "m4"]
+    assert pipeline.stats()["dropped"] == 3
+
+
+def test_block_policy_drops_only_after_timeout():
+    handler = BoundedQueueHandler(queue_size=1, drop_policy=BLOCK, block_timeout_s=0.05)
+    handler.handle(_record("m0"))
+
+    t0 = time.perf_counter()
+    handler.handle(_record("m1"))
+
+    assert time.perf_counter() - t0 >= 0.04
+    assert handler.stats()["dropped"] == 1
+
+
+def test_warnings_wait_for_room_under_drop_policy():
+    target = _Recorder()
+    pipeline = LogPipeline(target, queue_size=1, drop_policy=DROP_NEWEST, block_timeout_s=5.0)
+    pipeline.handler.handle(_record("info"))
+    threading.Timer(0.05, pipeline.start).start()
+
+    pipeline.handler.handle(_record("warn", logging.WARNING))
+    pipeline.stop()
+
+    assert target.messages == ["info", "warn"]
+    assert pipeline.stats()["dropped"] == 0
+
+
+def test_stop_drains_a_full_queue_and_is_idempotent():
+    target = _Recorder()
+    pipeline = LogPipeline(target, queue_size=3)
+    for i in range(3):
+        pipeline.handler.handle(_record(f"m{i}"))
+    pipeline.start()
+    pipeline.stop()
+    pipeline.stop()
+
+    assert target.messages == ["m0", "m1", "m2"]
+    assert not pipeline.running
+
+
+def test_rollover_and_compression_run_on_listener_thread(tmp_path, monkeypatch):
+    base = tmp_path / "deile.log"
+    file_handler = HourlyDailyDirRotatingHandler(filename=str(base), compress=True)
+    rotated_on = []
+    original = file_handler.rotator
+
+    def _spy(source, dest):
+        rotated_on.append(threading.current_thread().name)
+        original(source, dest)
+
+    file_handler.rotator = _spy
+    pipeline = LogPipeline(file_handler)
+    logger = logging.getLogger("test.log_queue.rotation")
+    logger.handlers.clear()
+    logger.addHandler(pipeline.handler)
+    logger.propagate = False
+    pipeline.start()
+    try:
+        logger.warning("antes")
+        pipeline.stop()
+        pipeline.start()
+        file_handler.rolloverAt = int(time.time()) - 1
+        logger.warning("depois")
+    finally:
+        pipeline.stop()
+        logger.removeHandler(pipeline.handler)
+        file_handler.close()
+
+    assert rotated_on and threading.current_thread().name not in rotated_on
+    [archived] = list_archived_log_files(tmp_path)
+    assert archived.name.endswith(".log.gz")
+    with gzip.open(archived, "rt") as fh:
+        assert "antes" in fh.read()
+    assert "depois" in base.read_text()
+
+
+def test_ensure_initialized_installs_pipeline_outside_pytest(tmp_path, monkeypatch):
+    monkeypatch.setattr(logs_mod, "_is_running_under_pytest", lambda: False)
+    monkeypatch.setattr(logs_mod.Path, "home", classmethod(lambda cls: tmp_path))
+    monkeypatch.setattr(logs_mod, "_initialized", False)
+    monkeypatch.setattr(logs_mod, "_encrypt_logs_warned", True)
+    monkeypatch.setattr(logs_mod, "_pipeline", None)
+    deile_logger = logging.getLogger("deile")
+    saved = (deile_logger.handlers[:], deile_logger.propagate, deile_logger.level)
+    deile_logger.handlers.clear()
+    try:
+        logs_mod.get_logger("queue_test").info("via fila")
+        [handler] = deile_logger.handlers
+        assert isinstance(handler, BoundedQueueHandler)
+        logs_mod._pipeline.stop()
+        assert "via fila" in (tmp_path / ".deile" / "logs" / "deile.log").read_text()
+        assert logs_mod.log_pipeline_stats()["enqueued"] >= 1
+    finally:
+        if logs_mod._pipeline is not None:
+            logs_mod._pipeline.stop()
+            for h in logs_mod._pipeline.handlers:
+                h.close()
+        deile_logger.handlers[:] = saved[0]
+        deile_logger.propagate = saved[1]
+        deile_logger.setLevel(saved[2])
+
+
+@pytest.mark.parametrize("kwargs", [{"queue_size": 0}, {"drop_policy": "random"}])
+def test_invalid_configuration_is_rejected(kwargs):
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(**kwargs)
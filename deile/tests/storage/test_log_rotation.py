@@ -21,6 +21,7 @@ Cobertura:
 
 from __future__ import annotations
 
+import gzip
 import logging
 import os
 import time
@@ -118,6 +119,26 @@ class TestRotator:
             h.close()
 
 
+    def test_compress_writes_gzip_and_appends_member_on_collision(self, tmp_path):
+        base = tmp_path / "deile.log"
+        h = HourlyDailyDirRotatingHandler(filename=str(base), compress=True,
+                                          retention_days=0)
+        try:
+            dest = tmp_path / "2026-05-25" / "14.log"
+            base.write_text("primeira\n")
+            h.rotator(str(base), str(dest))
+            base.write_text("segunda\n")
+            h.rotator(str(base), str(dest))
+
+            gz = dest.with_name("14.log.gz")
+            assert not dest.exists() and not base.exists()
+            with gzip.open(gz, "rt") as fh:
+                assert fh.read() == "primeira\nsegunda\n"
+            assert list_archived_log_files(tmp_path) == [gz]
+        finally:
+            h.close()
+
+
 # ---------------------------------------------------------------------------
 # GC
 # ---------------------------------------------------------------------------
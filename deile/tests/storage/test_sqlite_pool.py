@@ -0,0 +1,114 @@
+"""Tests for the pooled SQLite access layer (``deile/storage/sqlite_pool.py``)."""
+
+from __future__ import annotations
+
+import gc
+import sqlite3
+import threading
+
+import pytest
+
+from deile.storage import sqlite_pool
+from deile.storage.sqlite_pool import SQLiteDatabase, get_database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = SQLiteDatabase(tmp_path / "pool.db")
+    database.executescript("CREATE TABLE t (k TEXT PRIMARY KEY, v INTEGER);")
+    yield database
+    database.close()
+
+
+def test_write_then_read_sees_committed_row(db):
+    db.write(lambda c: c.execute("INSERT INTO t VALUES ('a', 1)"))
+    assert db.read(lambda c: c.execute("SELECT v FROM t WHERE k='a'").fetchone()) == (1,)
+
+
+def test_failing_job_rolls_back_alone(db):
+    gate = threading.Event()
+    db.submit(lambda c: gate.wait(5))  # holds the writer so the next jobs batch
+    ok = db.submit(lambda c: c.execute("INSERT INTO t VALUES ('ok', 1)"))
+    dup = db.submit(lambda c: (c.execute("INSERT INTO t VALUES ('dup', 1)"),
+                               c.execute("INSERT INTO t VALUES ('dup', 2)")))
+    gate.set()
+    ok.result(5)
+    with pytest.raises(sqlite3.IntegrityError):
+        dup.result(5)
+    keys = db.read(lambda c: [r[0] for r in c.execute("SELECT k FROM t ORDER BY k")])
+    assert keys == ["ok"]
+    # ``ok`` and ``dup`` queued behind the gate and shared one transaction.
+    assert db.stats["transactions"] <= 2
+
+
+def test_concurrent_writers_are_serialized(db):
+    def worker(n):
+        for i in range(50):
+            db.write(lambda c, k=f"{n}-{i}": c.execute("INSERT INTO t VALUES (?, ?)", (k, i)))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert db.read(lambda c: c.execute("SELECT COUNT(*) FROM t").fetchone()[0]) == 400
+    # Jobs that queued up while a commit ran shared its transaction.
+    assert db.stats["transactions"] <= db.stats["writes"]
+
+
+def test_reentrant_write_runs_inline(db):
+    def outer(c):
+        c.execute("INSERT INTO t VALUES ('x', 1)")
+        return db.write(lambda inner: inner.execute("SELECT COUNT(*) FROM t").fetchone()[0])
+
+    assert db.write(outer) == 1
+
+
+def test_read_connection_is_query_only(db):
+    with pytest.raises(sqlite3.OperationalError):
+        db.read(lambda c: c.execute("INSERT INTO t VALUES ('r', 1)"))
+
+
+async def test_async_helpers(db):
+    await db.awrite(lambda c: c.execute("INSERT INTO t VALUES ('async', 7)"))
+    assert await db.aread(lambda c: c.execute("SELECT v FROM t").fetchone()[0]) == 7
+
+
+def test_get_database_shares_instance_per_file(tmp_path):
+    a = get_database(tmp_path / "shared.db")
+    b = get_database(tmp_path / "." / "shared.db")
+    assert a is b
+    a.close()
+    c = get_database(tmp_path / "shared.db")
+    assert c is not a
+    c.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        a.write(lambda conn: None)
+
+
+def test_read_connections_are_closed_when_their_thread_exits(db):
+    def _reader():
+        db.read(lambda c: c.execute("SELECT COUNT(*) FROM t").fetchone())
+
+    for _ in range(20):
+        worker = threading.Thread(target=_reader)
+        worker.start()
+        worker.join()
+    gc.collect()
+
+    # Only the writer connection (and none per finished reader) remains.
+    assert len(db._conns) <= 1
+    assert db.stats["reads"] == 20
+
+
+def test_evicted_database_in_use_is_not_duplicated(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_pool, "_MAX_OPEN_DATABASES", 2)
+    held = get_database(tmp_path / "held.db")
+    try:
+        others = [get_database(tmp_path / f"other{i}.db") for i in range(3)]
+        assert held.path not in sqlite_pool._REGISTRY
+        assert get_database(tmp_path / "held.db") is held
+    finally:
+        held.close()
+        for other in others:
+            other.close()
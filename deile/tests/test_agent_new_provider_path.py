@@ -404,6 +404,42 @@ async def test_cascade_retry_succeeds_after_first_provider_fails():
     assert succeeding.captured_messages, "second provider was never called — cascade retry failed"
 
 
+@pytest.mark.asyncio
+async def test_cancelled_call_releases_its_load_tracker_slot():
+    """A cancelled turn must not leak the provider's in-flight slot."""
+    import asyncio
+
+    from deile.core.models.routing_strategies import LoadTracker, load_key
+
+    started = asyncio.Event()
+
+    class _HangingProvider(_CapturingProvider):
+        async def chat_with_tools(self, **kwargs):
+            started.set()
+            await asyncio.Event().wait()
+
+    provider = _HangingProvider()
+    agent = _build_minimal_agent_with_mock_provider(provider)
+    tracker = LoadTracker()
+
+    from deile.core.agent import AgentSession
+
+    session = AgentSession(session_id="cancel-test", working_directory=Path("/tmp"),
+                           context_data={})
+    with patch("deile.core.models.routing_strategies.get_load_tracker",
+               return_value=tracker):
+        task = asyncio.ensure_future(agent._process_iterative_function_calling(
+            user_input="hang", parse_result=None, session=session,
+        ))
+        await asyncio.wait_for(started.wait(), 5)
+        assert tracker.in_flight(load_key(provider)) == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert tracker.in_flight(load_key(provider)) == 0
+
+
 @pytest.mark.asyncio
 async def test_process_input_returns_structured_budget_exceeded_metadata():
     """R6-H4: process_input must surface BudgetExceeded with metadata flag the CLI can read."""
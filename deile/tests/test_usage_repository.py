@@ -394,6 +394,30 @@ class TestBudgetGuardFromYaml:
         assert guard._per_session > 0
 
 
+# ---------------------------------------------------------------------------
+# Response cache events
+# ---------------------------------------------------------------------------
+
+class TestCacheSummary:
+    def test_empty_summary(self, repo):
+        assert repo.cache_summary() == {
+            "lookups": 0, "hits": 0, "misses": 0, "hit_rate": 0.0,
+            "saved_tokens": 0, "saved_cost_usd": 0.0,
+        }
+
+    def test_aggregates_hits_and_filters_by_call_site(self, repo):
+        repo.record_cache_event("anthropic", "m", hit=True, saved_tokens=100,
+                                saved_cost_usd=0.01, call_site="triage")
+        repo.record_cache_event("anthropic", "m", hit=False, call_site="triage")
+        repo.record_cache_event("anthropic", "m", hit=True, saved_tokens=7,
+                                call_site="commit_msg")
+        triage = repo.cache_summary(call_site="triage")
+        assert triage["hits"] == 1 and triage["misses"] == 1
+        assert triage["saved_tokens"] == 100
+        assert repo.cache_summary()["hit_rate"] == pytest.approx(2 / 3)
+        assert repo.cache_summary(since_ts=time.time() + 60)["lookups"] == 0
+
+
 # ---------------------------------------------------------------------------
 # Singleton factory
 # ---------------------------------------------------------------------------
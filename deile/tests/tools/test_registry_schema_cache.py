@@ -0,0 +1,119 @@
+"""Tests: versioned, memoized provider schema export in ToolRegistry."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from deile.tools import schema_export
+from deile.tools.base import (SecurityLevel, Tool, ToolCategory, ToolContext,
+                              ToolResult, ToolSchema, ToolStatus)
+from deile.tools.registry import ToolRegistry
+
+
+class _SchemaTool(Tool):
+    def __init__(self, name: str, level: SecurityLevel = SecurityLevel.SAFE):
+        super().__init__(schema=_schema(name, level))
+
+    async def execute(self, context: ToolContext) -> ToolResult:
+        return ToolResult(status=ToolStatus.SUCCESS)
+
+
+def _schema(name: str, level: SecurityLevel = SecurityLevel.SAFE) -> ToolSchema:
+    return ToolSchema(
+        name=name,
+        description=f"{name} description",
+        parameters={"type": "object", "properties": {"path": {"type": "string"}}},
+        required=["path"],
+        security_level=level,
+        category=ToolCategory.OTHER,
+    )
+
+
+def _registry(*names: str) -> ToolRegistry:
+    registry = ToolRegistry()
+    for name in names:
+        registry.register(_SchemaTool(name))
+    return registry
+
+
+def _count_conversions(method: str):
+    return patch.object(ToolSchema, method, autospec=True,
+                        side_effect=getattr(ToolSchema, method))
+
+
+def test_repeated_export_converts_once():
+    registry = _registry("read_file", "bash_execute")
+    with _count_conversions("to_anthropic_tool") as spy:
+        first = registry.get_anthropic_tools()
+        second = registry.get_anthropic_tools()
+    assert spy.call_count == 2  # one per tool, first call only
+    assert first == second
+    assert first is not second  # callers get their own list
+    assert registry.get_stats()["schema_cache"]["hits"] == 1
+
+
+def test_providers_are_cached_independently():
+    registry = _registry("a")
+    anthropic = registry.get_anthropic_tools()
+    openai = registry.get_openai_functions()
+    assert anthropic[0]["name"] == "a"
+    assert openai[0]["function"]["name"] == "a"
+
+
+def test_export_order_is_alphabetical_and_stable():
+    registry = _registry("zeta", "alpha", "mid")
+    names = [t["name"] for t in registry.get_anthropic_tools()]
+    assert names == ["alpha", "mid", "zeta"]
+    assert [t.name for t in registry.list_enabled()] == names
+
+    other = _registry("mid", "zeta", "alpha")
+    assert other.get_anthropic_tools() == registry.get_anthropic_tools()
+
+
+def test_register_unregister_enable_bump_version_and_invalidate():
+    registry = _registry("a", "b")
+    v0 = registry.version
+    assert len(registry.get_anthropic_tools()) == 2
+
+    registry.disable_tool("b")
+    assert registry.version > v0
+    assert [t["name"] for t in registry.get_anthropic_tools()] == ["a"]
+
+    v1 = registry.version
+    registry.disable_tool("b")  # no-op: already disabled
+    assert registry.version == v1
+
+    registry.enable_tool("b")
+    registry.register(_SchemaTool("c"))
+    assert [t["name"] for t in registry.get_anthropic_tools()] == ["a", "b", "c"]
+
+    registry.unregister("a")
+    assert [t["name"] for t in registry.get_anthropic_tools()] == ["b", "c"]
+
+
+def test_schema_replaced_outside_registry_is_picked_up():
+    registry = _registry("a")
+    assert registry.get_openai_functions()[0]["function"]["description"] == "a description"
+    replacement = _schema("a")
+    replacement.description = "new description"
+    registry.get("a").set_schema(replacement)
+    assert registry.get_openai_functions()[0]["function"]["description"] == "new description"
+
+
+def test_security_level_is_part_of_the_key():
+    registry = ToolRegistry()
+    registry.register(_SchemaTool("safe", SecurityLevel.SAFE))
+    registry.register(_SchemaTool("danger", SecurityLevel.DANGEROUS))
+    assert len(registry.get_anthropic_tools()) == 2
+    assert len(registry.get_anthropic_tools(security_level=SecurityLevel.SAFE)) == 1
+    assert len(registry.get_anthropic_tools()) == 2
+
+
+def test_export_schemas_memoizes_by_schema_identity():
+    schemas = [_schema("x"), _schema("y")]
+    with _count_conversions("to_openai_function") as spy:
+        first = schema_export.export_schemas(schemas, "openai")
+        second = schema_export.export_schemas(list(schemas), "openai")
+        schema_export.export_schemas([_schema("x")], "openai")
+    assert first == second
+    assert spy.call_count == 3
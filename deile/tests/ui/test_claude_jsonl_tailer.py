@@ -0,0 +1,175 @@
+"""Tests for :mod:`deile.ui.panel.observability.jsonl_tailer`.
+
+Contract under test:
+
+* The first poll keeps only the last ``capacity`` turns; later polls return
+  only what was appended.
+* A half-written last line is carried over, never parsed or lost.
+* Truncation and rotation (new inode) reset the tail.
+* ``load_earlier`` pages older turns in through the sparse index.
+* ``tool_use`` turns stay ``in_progress`` until their result arrives.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from deile.ui.panel.observability import ClaudeJsonlTailer
+from deile.ui.panel.observability.jsonl_parser import ToolUseTurn, UserTurn
+
+
+def _line(i: int) -> str:
+    return json.dumps({"type": "user", "content": f"msg-{i}"}) + "\n"
+
+
+def _append(path: Path, text: str) -> None:
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write(text)
+
+
+def _contents(turns):
+    return [t.content for t in turns]
+
+
+def test_attach_keeps_latest_capacity_turns(tmp_path):
+    p = tmp_path / "s.jsonl"
+    p.write_text("".join(_line(i) for i in range(100)), encoding="utf-8")
+    tailer = ClaudeJsonlTailer(p, capacity=10, index_every=8)
+
+    update = tailer.poll()
+
+    assert _contents(update.new_turns) == [f"msg-{i}" for i in range(90, 100)]
+    assert [t.index for t in tailer.turns] == list(range(90, 100))
+    assert tailer.line_count == 100
+    assert tailer.offset == p.stat().st_size
+    assert tailer.poll().new_turns == []
+
+
+def test_appended_turns_roll_the_ring(tmp_path):
+    p = tmp_path / "s.jsonl"
+    p.write_text("".join(_line(i) for i in range(5)), encoding="utf-8")
+    tailer = ClaudeJsonlTailer(p, capacity=5)
+    tailer.poll()
+
+    _append(p, _line(5) + _line(6))
+    update = tailer.poll()
+
+    assert _contents(update.new_turns) == ["msg-5", "msg-6"]
+    assert _contents(tailer.turns) == [f"msg-{i}" for i in range(2, 7)]
+    assert update.reset is False
+
+
+def test_partial_line_is_carried_over(tmp_path):
+    p = tmp_path / "s.jsonl"
+    full = _line(1)
+    p.write_text(_line(0) + full[:10], encoding="utf-8")
+    tailer = ClaudeJsonlTailer(p)
+
+    first = tailer.poll()
+    assert _contents(first.new_turns) == ["msg-0"]
+    assert first.skipped_malformed_lines == 0
+
+    _append(p, full[10:])
+    second = tailer.poll()
+
+    assert _contents(second.new_turns) == ["msg-1"]
+    assert second.new_turns[0].index == 1
+    assert tailer.skipped_malformed_lines == 0
+
+
+def test_truncation_resets(tmp_path):
+    p = tmp_path / "s.jsonl"
+    p.write_text("".join(_line(i) for i in range(5)), encoding="utf-8")
+    tailer = ClaudeJsonlTailer(p)
+    tailer.poll()
+
+    p.write_text(_line(42), encoding="utf-8")
+    update = tailer.poll()
+
+    assert update.reset is True
+    assert _contents(tailer.turns) == ["msg-42"]
+    assert tailer.turns[0].index == 0
+
+
+def test_rotation_by_inode_resets(tmp_path):
+    p = tmp_path / "s.jsonl"
+    p.write_text(_line(0), encoding="utf-8")
+    tailer = ClaudeJsonlTailer(p)
+    tailer.poll()
+
+    rotated = tmp_path / "s.jsonl.1"
+    os.replace(p, rotated)
+    assert tailer.poll().new_turns == []  # mid-rotation: keep the tail
+    assert _contents(tailer.turns) == ["msg-0"]
+
+    # Same size as before, new inode: only the identity gives it away.
+    p.write_text(_line(7), encoding="utf-8")
+    update = tailer.poll()
+
+    assert update.reset is True
+    assert _contents(update.new_turns) == ["msg-7"]
+
+
+def test_load_earlier_pages_back_to_the_start(tmp_path):
+    p = tmp_path / "s.jsonl"
+    p.write_text("".join(_line(i) for i in range(100)), encoding="utf-8")
+    tailer = ClaudeJsonlTailer(p, capacity=10, index_every=16)
+    tailer.poll()
+    assert len(tailer._line_offsets) == 7  # lines 0, 16, ..., 96
+
+    pages = []
+    before = None
+    while True:
+        page = tailer.load_earlier(before, count=25)
+        if not page:
+            break
+        pages.append(page)
+        before = page[0].index
+
+    seen = [t.index for page in reversed(pages) for t in page]
+    assert seen == list(range(0, 90))
+    assert isinstance(pages[0][0], UserTurn)
+    assert _contents(pages[0])[-1] == "msg-89"
+
+
+def test_load_earlier_skips_malformed_lines(tmp_path):
+    p = tmp_path / "s.jsonl"
+    p.write_text(_line(0) + "not json\n" + _line(2) + _line(3), encoding="utf-8")
+    tailer = ClaudeJsonlTailer(p, capacity=1, index_every=2)
+    tailer.poll()
+
+    page = tailer.load_earlier()
+
+    assert [t.index for t in page] == [0, 2]
+
+
+def test_tool_use_in_progress_until_result(tmp_path):
+    p = tmp_path / "s.jsonl"
+    p.write_text(
+        json.dumps({"type": "tool_use", "id": "toolu_1", "name": "Bash", "input": {}}) + "\n",
+        encoding="utf-8",
+    )
+    tailer = ClaudeJsonlTailer(p)
+    [tool_use] = tailer.poll().new_turns
+    assert isinstance(tool_use, ToolUseTurn) and tool_use.in_progress is True
+
+    _append(p, json.dumps({"type": "tool_result", "tool_use_id": "toolu_1", "content": "ok"}) + "\n")
+    tailer.poll()
+
+    assert tool_use.in_progress is False
+
+
+def test_missing_file_is_empty(tmp_path):
+    tailer = ClaudeJsonlTailer(tmp_path / "nope.jsonl")
+    assert tailer.poll().new_turns == []
+    assert tailer.load_earlier() == []
+
+
+@pytest.mark.parametrize("kwargs", [{"capacity": 0}, {"index_every": 0}])
+def test_rejects_non_positive_sizes(tmp_path, kwargs):
+    with pytest.raises(ValueError):
+        ClaudeJsonlTailer(tmp_path / "s.jsonl", **kwargs)
@@ -0,0 +1,174 @@
+"""Tests for the indexed ``@`` path completion (:mod:`deile.ui.completers.path_index`).
+
+The harness types ``@`` followed by a query one keystroke at a time through
+``HybridCompleter.get_completions`` — exactly what prompt_toolkit does — and
+times each keystroke against ``KEYSTROKE_BUDGET_S``. Also covers
+``.gitignore`` handling, fuzzy ranking, lazy size metadata and the
+single-directory fallback.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from prompt_toolkit.document import Document
+
+from deile.ui.completers import HybridCompleter, path_index
+from deile.ui.completers.path_index import KEYSTROKE_BUDGET_S, PathIndex
+
+# Slack over the search budget for completion construction + CI jitter.
+_KEYSTROKE_LIMIT_S = KEYSTROKE_BUDGET_S * 4
+
+
+def _tree(root: Path, dirs: int = 40, files_per_dir: int = 50) -> None:
+    for d in range(dirs):
+        sub = root / "src" / f"pkg_{d:02d}" / "nested"
+        sub.mkdir(parents=True)
+        for f in range(files_per_dir):
+            (sub / f"module_{f:03d}.py").write_text("x = 1\n")
+    (root / "src" / f"pkg_{dirs // 2:02d}" / "nested" / "hybrid_completer.py").write_text("y" * 2048)
+    (root / "README.md").write_text("readme\n")
+
+
+def _ready_completer(root: Path) -> HybridCompleter:
+    completer = HybridCompleter(working_directory=str(root))
+    completer._get_path_index()
+    assert completer._path_index.wait_ready(10)
+    return completer
+
+
+def _type(completer: HybridCompleter, query: str, prefix: str = "leia @"):
+    """Simulate typing ``query`` after ``prefix``; returns (latencies, last completions)."""
+    latencies, completions = [], []
+    for n in range(len(query) + 1):
+        text = prefix + query[:n]
+        t0 = time.perf_counter()
+        completions = list(completer.get_completions(Document(text), None))
+        latencies.append(time.perf_counter() - t0)
+    return latencies, completions
+
+
+def test_typing_stays_within_keystroke_budget(tmp_path):
+    _tree(tmp_path)
+    completer = _ready_completer(tmp_path)
+
+    latencies, completions = _type(completer, "hybcomp")
+
+    assert max(latencies) < _KEYSTROKE_LIMIT_S, [f"{x * 1e3:.1f}ms" for x in latencies]
+    assert completions[0].text == "src/pkg_20/nested/hybrid_completer.py"
+
+
+def test_no_stat_on_keystroke_and_size_is_lazy(tmp_path, monkeypatch):
+    _tree(tmp_path, dirs=2, files_per_dir=3)
+    completer = _ready_completer(tmp_path)
+    stats = []
+    real_stat = Path.stat
+    monkeypatch.setattr(Path, "stat", lambda self, *a, **kw: stats.append(self) or real_stat(self, *a, **kw))
+
+    [first, *_] = list(completer.get_completions(Document("@hybrid"), None))
+    assert stats == []
+
+    assert first.display_meta_text == "File (2.0KB)"
+    assert len(stats) == 1
+
+
+def test_fuzzy_ranking_prefers_basename_matches(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "config_notes.md").write_text("")
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "other.txt").write_text("")
+    (tmp_path / "cfg.py").write_text("")
+    index = PathIndex(tmp_path)
+    index.start()
+    assert index.wait_ready(10)
+
+    paths = [m.path for m in index.search("config")]
+    assert paths[:2] == ["config", "docs/config_notes.md"]
+    assert "config/other.txt" in paths
+    assert "cfg.py" not in paths
+    assert [m.path for m in index.search("cfgpy")] == ["cfg.py"]
+
+
+def test_gitignore_root_and_nested_are_respected(tmp_path):
+    (tmp_path / ".gitignore").write_text("build/\n*.log\n")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.py").write_text("")
+    (tmp_path / "app.log").write_text("")
+    (tmp_path / "pkg" / "cache").mkdir(parents=True)
+    (tmp_path / "pkg" / ".gitignore").write_text("cache/\n!keep.log\n")
+    (tmp_path / "pkg" / "cache" / "blob.py").write_text("")
+    (tmp_path / "pkg" / "keep.log").write_text("")
+    (tmp_path / "pkg" / "main.py").write_text("")
+    (tmp_path / ".hidden").write_text("")
+    index = PathIndex(tmp_path)
+    index.start()
+    assert index.wait_ready(10)
+
+    paths = {m.path for m in index.search("", limit=100)}
+    # ``!keep.log`` in pkg/ overrides the root ``*.log``, as in ``git status``.
+    assert paths == {"pkg", "pkg/main.py", "pkg/keep.log"}
+
+
+def test_refinement_resumes_a_truncated_scan(tmp_path, monkeypatch):
+    _tree(tmp_path, dirs=10, files_per_dir=20)
+    monkeypatch.setattr(path_index, "_CHECK_EVERY", 16)
+    index = PathIndex(tmp_path)
+    index.start()
+    assert index.wait_ready(10)
+
+    # Budget zero: each keystroke processes a single block and leaves the
+    # rest for the next one; refining never restarts the scan.
+    index.search("m", budget_s=0)
+    assert 0 < index._scan.scanned < len(index)
+    for q in ("mo", "mod", "modu", "modul", "module_019"):
+        index.search(q, budget_s=0)
+    calls = 0
+    while index._scan.pending or index._scan.scanned < len(index):
+        index.search("module_019", budget_s=0)
+        calls += 1
+    assert calls < len(index) // 16 + 1
+    results = index.search("module_019", limit=100)
+    assert len(results) == 10
+    assert all(m.path.endswith("module_019.py") for m in results)
+
+
+def test_stale_index_rebuilds_in_background(tmp_path):
+    (tmp_path / "a.py").write_text("")
+    index = PathIndex(tmp_path, refresh_interval_s=0)
+    index.start()
+    assert index.wait_ready(10)
+    (tmp_path / "b.py").write_text("")
+
+    index.search("b")
+    deadline = time.monotonic() + 10
+    while not index.search("b.py") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [m.path for m in index.search("b.py")] == ["b.py"]
+
+
+@pytest.mark.parametrize("fragment", ["../", "/"])
+def test_paths_outside_root_use_directory_listing(tmp_path, fragment):
+    work = tmp_path / "work"
+    work.mkdir()
+    (tmp_path / "sibling.txt").write_text("")
+    completer = HybridCompleter(working_directory=str(work))
+
+    if fragment == "/":
+        fragment = str(tmp_path) + os.sep
+    texts = [c.text for c in completer.get_completions(Document("@" + fragment + "sib"), None)]
+
+    assert any(t.endswith("sibling.txt") for t in texts)
+    assert completer._path_index is None
+
+
+def test_directory_listing_while_index_builds(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("")
+    monkeypatch.setattr(PathIndex, "start", lambda self: None)
+    completer = HybridCompleter(working_directory=str(tmp_path))
+
+    assert [c.text for c in completer.get_completions(Document("@s"), None)] == ["src/"]
+    assert [c.text for c in completer.get_completions(Document("@src/"), None)] == ["src/main.py"]
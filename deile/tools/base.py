@@ -267,7 +267,9 @@ class ToolResult:
     execution_time: float = 0.0
     display_policy: DisplayPolicy = DisplayPolicy.SYSTEM
     show_cli: bool = True
-    artifact_path: Optional[str] = None
+    # Referência opaca do ArtifactManager (``artifact://<run>/<id>``), não um
+    # path: ler via ``get_artifact``/``open_artifact_output``.
+    artifact_ref: Optional[str] = None
     display_data: Optional[Dict[str, Any]] = None  # Data formatada para UI
     
     @property
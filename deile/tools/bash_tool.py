@@ -308,7 +308,7 @@ class BashExecuteTool(SyncTool):
                 "execution_time": execution_time
             }
             
-            artifact_path = self.artifact_manager.store_artifact(
+            artifact_ref = self.artifact_manager.store_artifact(
                 run_id=run_id,
                 tool_name=self.name,
                 input_data=input_data,
@@ -317,7 +317,7 @@ class BashExecuteTool(SyncTool):
                 status="success" if result.get("exit_code") == 0 else "error"
             )
             
-            return artifact_path
+            return artifact_ref
             
         except Exception as e:
             logger.error(f"Failed to store bash artifact: {e}")
@@ -409,11 +409,11 @@ class BashExecuteTool(SyncTool):
             
             # Store artifact
             run_id = (context.metadata or {}).get("run_id", f"bash_{int(time.time())}")
-            artifact_path = None
+            artifact_ref = None
             
             if capture_output:
-                artifact_path = self._store_artifact(run_id, command, result_data, execution_time)
-                result_data["artifact_path"] = artifact_path
+                artifact_ref = self._store_artifact(run_id, command, result_data, execution_time)
+                result_data["artifact_ref"] = artifact_ref
             
             # Prepare display data
             display_data = {
@@ -442,7 +442,7 @@ class BashExecuteTool(SyncTool):
                 message=message,
                 display_policy=DisplayPolicy.SYSTEM,
                 show_cli=show_cli,
-                artifact_path=artifact_path,
+                artifact_ref=artifact_ref,
                 display_data=display_data,
                 execution_time=execution_time
             )
@@ -3,7 +3,7 @@
 import logging
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from ..core.exceptions import ToolError, ValidationError
 from . import discovery, function_call, schema_export
@@ -25,6 +25,20 @@ class ToolRegistry:
         self._enabled_tools: Set[str] = set()
         self._tool_aliases: Dict[str, str] = {}
         self._auto_discovery_enabled = True
+        # Incrementado a cada mudança no conjunto de tools/habilitadas; faz
+        # parte da chave do cache de exports por provider.
+        self._version = 0
+        self._export_cache = schema_export.ExportCache()
+
+    @property
+    def version(self) -> int:
+        """Versão do conjunto registrado (muda em register/unregister/enable/disable)."""
+        return self._version
+
+    def _bump_version(self) -> None:
+        self._version += 1
+        # Entradas de versões anteriores nunca mais casam; libera já.
+        self._export_cache.clear()
     
     def register(self, tool: Tool, aliases: Optional[List[str]] = None) -> None:
         """Registra uma tool no registry
@@ -66,6 +80,7 @@ class ToolRegistry:
                 if alias in self._tool_aliases:
                     logger.warning(f"Alias '{alias}' already exists, overwriting")
                 self._tool_aliases[alias] = tool_name
+        self._bump_version()
     
     def unregister(self, tool_name: str) -> bool:
         """Remove uma tool do registry
@@ -97,6 +112,7 @@ class ToolRegistry:
         
         # Remove a tool
         del self._tools[tool_name]
+        self._bump_version()
         return True
     
     def get(self, tool_name: str) -> Optional[Tool]:
@@ -142,10 +158,14 @@ class ToolRegistry:
         return sorted(self._tools.keys())
 
     def list_enabled(self) -> List[Tool]:
-        """Lista apenas as tools habilitadas"""
+        """Lista apenas as tools habilitadas, em ordem alfabética de nome.
+
+        A ordem estável importa: a lista vira o bloco de tools enviado ao
+        provider, e qualquer reordenação invalida o prompt cache.
+        """
         return [
-            tool for tool in self._tools.values()
-            if tool.is_enabled and tool.name in self._enabled_tools
+            self._tools[name] for name in sorted(self._tools)
+            if self._tools[name].is_enabled and name in self._enabled_tools
         ]
     
     def enable_tool(self, tool_name: str) -> bool:
@@ -161,8 +181,10 @@ class ToolRegistry:
         if not tool:
             return False
         
-        tool.enable()
-        self._enabled_tools.add(tool.name)  # Usa o nome real, não o alias
+        if not tool.is_enabled or tool.name not in self._enabled_tools:
+            tool.enable()
+            self._enabled_tools.add(tool.name)  # Usa o nome real, não o alias
+            self._bump_version()
         return True
     
     def disable_tool(self, tool_name: str) -> bool:
@@ -178,8 +200,10 @@ class ToolRegistry:
         if not tool:
             return False
         
-        tool.disable()
-        self._enabled_tools.discard(tool.name)  # Usa o nome real, não o alias
+        if tool.is_enabled or tool.name in self._enabled_tools:
+            tool.disable()
+            self._enabled_tools.discard(tool.name)  # Usa o nome real, não o alias
+            self._bump_version()
         return True
     
     async def execute_tool(
@@ -246,14 +270,39 @@ class ToolRegistry:
 
         return discovered_count
 
+    def _cached_export(
+        self,
+        provider: str,
+        exporter: Callable[..., List[Any]],
+        authorized_only: bool,
+        security_level: Optional[SecurityLevel],
+    ) -> List[Any]:
+        """Export memoizado por (versão, provider, filtros, subconjunto exportado).
+
+        O subconjunto entra na chave como ``(nome, id(schema))`` das tools que
+        passam pelos filtros: cobre ``Tool.set_schema`` (usado pelo
+        carregamento de schemas) e mudanças feitas direto na tool, que não
+        passam pelo registry.
+        """
+        selected = tuple(schema_export.iter_authorized_tools(
+            self._tools, self._enabled_tools, authorized_only, security_level
+        ))
+        subset = tuple((tool.name, id(tool.schema)) for tool in selected)
+        key = (self._version, provider, authorized_only, security_level, subset)
+        pin = tuple(tool.schema for tool in selected)
+        return self._export_cache.get_or_build(
+            key, pin,
+            lambda: exporter(self._tools, self._enabled_tools, authorized_only, security_level),
+        )
+
     def get_gemini_functions(
         self,
         authorized_only: bool = True,
         security_level: Optional[SecurityLevel] = None,
     ) -> List[object]:
         """Retorna tools no formato FunctionDeclaration para o Google GenAI SDK."""
-        return schema_export.get_gemini_functions(
-            self._tools, self._enabled_tools, authorized_only, security_level
+        return self._cached_export(
+            "gemini", schema_export.get_gemini_functions, authorized_only, security_level
         )
 
     def get_anthropic_tools(
@@ -262,8 +311,8 @@ class ToolRegistry:
         security_level: Optional[SecurityLevel] = None,
     ) -> List[Dict]:
         """Return tools in Anthropic tool_use format."""
-        return schema_export.get_anthropic_tools(
-            self._tools, self._enabled_tools, authorized_only, security_level
+        return self._cached_export(
+            "anthropic", schema_export.get_anthropic_tools, authorized_only, security_level
         )
 
     def get_openai_functions(
@@ -272,8 +321,8 @@ class ToolRegistry:
         security_level: Optional[SecurityLevel] = None,
     ) -> List[Dict]:
         """Return tools in OpenAI / DeepSeek function_call format."""
-        return schema_export.get_openai_functions(
-            self._tools, self._enabled_tools, authorized_only, security_level
+        return self._cached_export(
+            "openai", schema_export.get_openai_functions, authorized_only, security_level
         )
 
     def load_schemas_from_directory(self, schemas_dir: Path) -> int:
@@ -283,7 +332,10 @@ class ToolRegistry:
         — o I/O de descoberta de schemas vive em módulo dedicado (SRP),
         no mesmo padrão de ``auto_discover`` e ``execute_function_call``.
         """
-        return discovery.load_schemas_from_directory(self, schemas_dir)
+        loaded = discovery.load_schemas_from_directory(self, schemas_dir)
+        if loaded:
+            self._bump_version()
+        return loaded
     
     def execute_function_call(
         self,
@@ -327,7 +379,9 @@ class ToolRegistry:
             "total_aliases": len(self._tool_aliases),
             "auto_discovery_enabled": self._auto_discovery_enabled,
             "tools_with_schemas": tools_with_schemas,
-            "available_functions": function_definitions
+            "available_functions": function_definitions,
+            "version": self._version,
+            "schema_cache": self._export_cache.stats(),
         }
     
     def clear(self) -> None:
@@ -336,6 +390,7 @@ class ToolRegistry:
         self._tools_by_category.clear()
         self._enabled_tools.clear()
         self._tool_aliases.clear()
+        self._bump_version()
     
     def disable_auto_discovery(self) -> None:
         """Desabilita descoberta automática"""
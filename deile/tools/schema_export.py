@@ -5,14 +5,24 @@ de ``ToolSchema`` para os formatos Gemini/Anthropic/OpenAI depende apenas
 de iterar as tools registradas — não do estado de registro/descoberta. O
 registry expõe métodos finos que delegam para estas funções, no mesmo
 padrão já adotado por ``schema_validation.py``.
+
+A conversão é refeita a cada request pelos providers, mas o conjunto de
+tools quase nunca muda entre requests. ``ExportCache`` memoiza a lista
+serializada por provider, chaveada pela identidade dos ``ToolSchema``
+envolvidos; a ordem é sempre alfabética pelo nome da tool, para que o
+prefixo de tools enviado ao provider seja byte-a-byte estável (o prompt
+caching da Anthropic/OpenAI depende disso).
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Dict, Iterator, List, Mapping, Optional, Set
+import threading
+from collections import OrderedDict
+from typing import (Any, Callable, Dict, Hashable, Iterator, List, Mapping,
+                    Optional, Sequence, Set, Tuple)
 
-from .base import SecurityLevel, Tool
+from .base import SecurityLevel, Tool, ToolSchema
 
 logger = logging.getLogger(__name__)
 
@@ -39,9 +49,11 @@ def iter_authorized_tools(
     """Itera as tools que passam pelos filtros de autorização e segurança.
 
     Ponto único da lógica de filtragem compartilhada pelos exportadores
-    por-provider.
+    por-provider. A ordem é alfabética por nome, independente da ordem de
+    registro/descoberta.
     """
-    for tool_name, tool in tools.items():
+    for tool_name in sorted(tools):
+        tool = tools[tool_name]
         if authorized_only and tool_name not in enabled:
             continue
         if security_level and tool.schema:
@@ -101,3 +113,77 @@ def get_openai_functions(
         )
         if tool.schema
     ]
+
+
+# ---------------------------------------------------------------------------
+# Cache de exports
+# ---------------------------------------------------------------------------
+
+_SCHEMA_CONVERTERS: Dict[str, Callable[[ToolSchema], Any]] = {
+    "anthropic": lambda schema: schema.to_anthropic_tool(),
+    "openai": lambda schema: schema.to_openai_function(),
+    "gemini": lambda schema: schema.to_gemini_function(),
+}
+
+
+class ExportCache:
+    """LRU pequeno de listas de tools já serializadas.
+
+    Cada entrada guarda os objetos que compõem a chave (``pin``) junto com
+    o resultado: enquanto a entrada existir, os ``id()`` usados na chave não
+    podem ser reaproveitados por outros objetos.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, Tuple[tuple, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, pin: tuple,
+                     build: Callable[[], List[Any]]) -> List[Any]:
+        """Retorna uma cópia rasa da lista memoizada em ``key`` (ou a constrói)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return list(entry[1])
+            self.misses += 1
+        value = build()
+        with self._lock:
+            self._data[key] = (pin, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return list(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_schema_cache = ExportCache()
+
+
+def export_schemas(schemas: Sequence[ToolSchema], provider: str) -> List[Any]:
+    """Serializa ``schemas`` no formato de ``provider``, com memoização.
+
+    Usado pelos providers sobre a lista de ``ToolSchema`` recebida em
+    ``chat_with_tools``; preserva a ordem recebida. As listas devolvidas são
+    cópias, mas os dicts internos são compartilhados e não devem ser
+    alterados pelo chamador.
+    """
+    if not schemas:
+        return []
+    convert = _SCHEMA_CONVERTERS[provider]
+    pin = tuple(schemas)
+    key = (provider, tuple(id(s) for s in pin))
+    return _schema_cache.get_or_build(key, pin, lambda: [convert(s) for s in pin])
@@ -1,5 +1,6 @@
 """Completers do sistema UI"""
 
 from .hybrid_completer import HybridCompleter
+from .path_index import PathIndex
 
-__all__ = ["HybridCompleter"]
\ No newline at end of file
+__all__ = ["HybridCompleter", "PathIndex"]
@@ -4,12 +4,13 @@ import logging
 import os
 import re
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Callable, Iterable, Optional
 
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.document import Document
 
 from ...commands.registry import get_command_registry
+from .path_index import PathIndex
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +37,14 @@ class HybridCompleter(Completer):
     - Autocompletar normal para texto livre
     """
     
+    # Máximo de arquivos sugeridos por tecla
+    FILE_COMPLETION_LIMIT = 50
+    
     def __init__(self, config_manager=None, working_directory: Optional[str] = None):
         self.config_manager = config_manager
         self.working_directory = working_directory or os.getcwd()
         self._command_registry = None
+        self._path_index: Optional[PathIndex] = None
     
     def get_completions(self, document: Document, complete_event) -> Iterable[Completion]:
         """Retorna completions baseado no contexto atual"""
@@ -123,7 +128,14 @@ class HybridCompleter(Completer):
             logger.error("Error in command completions: %s", e)
     
     def _get_file_completions(self, document: Document, complete_event) -> Iterable[Completion]:
-        """Completions para arquivos com @"""
+        """Completions para arquivos com @
+
+        Caminhos relativos consultam o :class:`PathIndex` (repositório
+        inteiro, fuzzy, sem I/O por tecla). Caminhos absolutos, ``~``,
+        ``..`` ou índice ainda em construção caem na listagem de um único
+        diretório. Em ambos os casos o tamanho do arquivo só é lido quando
+        o menu desenha a linha (``display_meta`` preguiçoso).
+        """
         try:
             text = document.text_before_cursor
             
@@ -136,66 +148,112 @@ class HybridCompleter(Completer):
             path_fragment = text[at_pos + 1:]
             start_position = -(len(path_fragment))
             
-            # Determina diretório base
-            if path_fragment.startswith('/') or (os.name == 'nt' and ':' in path_fragment):
-                # Caminho absoluto
-                base_dir = Path(path_fragment).parent if path_fragment else Path('/')
-                filename_fragment = Path(path_fragment).name if path_fragment else ""
-            else:
-                # Caminho relativo
-                if '/' in path_fragment or '\\' in path_fragment:
-                    base_dir = Path(self.working_directory) / Path(path_fragment).parent
-                    filename_fragment = Path(path_fragment).name
-                else:
-                    base_dir = Path(self.working_directory)
-                    filename_fragment = path_fragment
+            if self._is_outside_index(path_fragment):
+                yield from self._get_directory_completions(path_fragment, start_position)
+                return
             
-            # Lista arquivos no diretório
-            if not base_dir.exists():
+            index = self._get_path_index()
+            if not index.ready:
+                yield from self._get_directory_completions(path_fragment, start_position)
                 return
-                
-            for item in sorted(base_dir.iterdir()):
-                if item.name.startswith('.'):
-                    continue  # Skip hidden files by default
-                
-                if item.name.lower().startswith(filename_fragment.lower()):
-                    # Calcula caminho relativo se possível
-                    try:
-                        rel_path = item.relative_to(self.working_directory)
-                        display_path = str(rel_path)
-                    except ValueError:
-                        display_path = str(item)
-                    
-                    # Adiciona / para diretórios
-                    if item.is_dir():
-                        completion_text = display_path + "/"
-                        display_text = f"📁 {display_path}/"
-                        display_meta = "Directory"
-                    else:
-                        completion_text = display_path
-                        # Determina ícone baseado na extensão
-                        suffix = item.suffix.lower()
-                        icon = self._get_file_icon(suffix)
-                        display_text = f"{icon} {display_path}"
-                        
-                        # Adiciona informações do arquivo
-                        try:
-                            size = item.stat().st_size
-                            size_str = self._format_file_size(size)
-                            display_meta = f"File ({size_str})"
-                        except Exception:
-                            display_meta = "File"
-                    
-                    yield Completion(
-                        text=completion_text,
-                        start_position=start_position,
-                        display=display_text,
-                        display_meta=display_meta
-                    )
+            
+            for match in index.search(path_fragment, limit=self.FILE_COMPLETION_LIMIT):
+                yield self._make_file_completion(
+                    match.path, match.is_dir, start_position,
+                    lambda p=match.path: index.size_of(p),
+                )
                     
         except Exception as e:
             logger.error("Error in file completions: %s", e)
     
+    def _get_path_index(self) -> PathIndex:
+        """Cria (na primeira @) e inicia o índice em background"""
+        if self._path_index is None:
+            self._path_index = PathIndex(self.working_directory)
+            self._path_index.start()
+        return self._path_index
+    
+    @staticmethod
+    def _is_outside_index(path_fragment: str) -> bool:
+        """Fragmentos que apontam para fora da raiz indexada"""
+        if path_fragment.startswith(('/', '~')) or (os.name == 'nt' and ':' in path_fragment):
+            return True
+        return path_fragment.replace('\\', '/').split('/', 1)[0] == '..'
+    
+    def _get_directory_completions(self, path_fragment: str,
+                                   start_position: int) -> Iterable[Completion]:
+        """Listagem de um único diretório por prefixo (fallback, sem ``stat``)"""
+        expanded = os.path.expanduser(path_fragment)
+        if expanded.startswith('/') or (os.name == 'nt' and ':' in expanded):
+            # Caminho absoluto
+            base_dir = Path(expanded).parent if expanded else Path('/')
+            filename_fragment = Path(expanded).name if expanded else ""
+        elif '/' in expanded or '\\' in expanded:
+            base_dir = Path(self.working_directory) / Path(expanded).parent
+            filename_fragment = Path(expanded).name
+        else:
+            base_dir = Path(self.working_directory)
+            filename_fragment = expanded
+        if path_fragment.endswith(('/', '\\')):
+            base_dir, filename_fragment = Path(self.working_directory) / expanded, ""
+        
+        try:
+            with os.scandir(base_dir) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return
+        
+        fragment_lower = filename_fragment.lower()
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue  # Skip hidden files by default
+            if not entry.name.lower().startswith(fragment_lower):
+                continue
+            item = Path(entry.path)
+            # Calcula caminho relativo se possível
+            try:
+                display_path = str(item.relative_to(self.working_directory))
+            except ValueError:
+                display_path = str(item)
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            yield self._make_file_completion(
+                display_path, is_dir, start_position,
+                lambda e=entry: self._entry_size(e),
+            )
+    
+    def _make_file_completion(self, display_path: str, is_dir: bool, start_position: int,
+                              size_getter: Callable[[], Optional[int]]) -> Completion:
+        """Monta a completion; o tamanho é resolvido só na renderização"""
+        if is_dir:
+            return Completion(
+                text=display_path + "/",
+                start_position=start_position,
+                display=f"📁 {display_path}/",
+                display_meta="Directory",
+            )
+        icon = self._get_file_icon(Path(display_path).suffix.lower())
+        return Completion(
+            text=display_path,
+            start_position=start_position,
+            display=f"{icon} {display_path}",
+            display_meta=lambda: self._file_meta(size_getter()),
+        )
+    
+    def _file_meta(self, size: Optional[int]) -> str:
+        if size is None:
+            return "File"
+        return f"File ({self._format_file_size(size)})"
+    
+    @staticmethod
+    def _entry_size(entry: os.DirEntry) -> Optional[int]:
+        try:
+            return entry.stat().st_size
+        except OSError:
+            return None
+    
     def _get_contextual_completions(self, document: Document, complete_event) -> Iterable[Completion]:
         """Completions contextuais gerais"""
         text = document.text_before_cursor.strip()
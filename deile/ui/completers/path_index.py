@@ -0,0 +1,348 @@
+"""PathIndex - índice de caminhos do repositório para o autocompletar ``@``
+
+O ``HybridCompleter`` listava o diretório corrente (``iterdir`` + ``stat``
+por entrada) a cada tecla, só com match por prefixo dentro de um único
+diretório. Em diretórios grandes ou FS de rede o ``@`` travava a digitação.
+
+Aqui o repositório inteiro é indexado UMA vez numa thread em background
+(``os.scandir``, sem ``stat``; respeita ``.gitignore`` da raiz e de
+subpastas via ``pathspec``; ignora ocultos como antes) e cada tecla só
+consulta memória:
+
+- **Match fuzzy por subsequência** (``dhc`` casa ``deile/ui/.../hybrid_completer.py``),
+  ranqueado por faixas: prefixo do nome > substring do nome > prefixo do
+  caminho > substring do caminho > subsequência no nome > subsequência no
+  caminho; empate por caminho mais curto.
+- **Orçamento por tecla** (``KEYSTROKE_BUDGET_S``): a varredura para no
+  deadline e devolve o melhor parcial. O cursor da varredura é guardado e a
+  tecla seguinte (que estende a query) filtra os candidatos já achados e
+  continua de onde parou — árvores enormes convergem em poucas teclas.
+- **Metadados preguiçosos**: tamanho de arquivo só é lido (``stat``, com
+  cache) quando a linha do menu é renderizada — ver :meth:`PathIndex.size_of`.
+
+Rebuild: sob demanda, quando uma busca encontra o índice mais velho que
+``refresh_interval_s`` (sem polling enquanto ninguém digita ``@``).
+"""
+
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pathspec
+
+logger = logging.getLogger(__name__)
+
+KEYSTROKE_BUDGET_S = 0.025
+_DEFAULT_MAX_ENTRIES = 200_000
+_DEFAULT_REFRESH_S = 30.0
+# Granularidade da checagem de deadline nos laços de busca.
+_CHECK_EVERY = 1024
+
+
+@dataclass(frozen=True)
+class PathMatch:
+    """Resultado de busca: caminho relativo à raiz (``/`` como separador)."""
+
+    path: str
+    is_dir: bool
+
+
+@dataclass
+class _Snapshot:
+    """Índice imutável publicado pela thread de build (troca atômica)."""
+
+    paths: List[str]
+    lower: List[str]
+    base_lower: List[str]
+    is_dir: List[bool]
+    generation: int
+    built_at: float
+    truncated: bool
+
+
+@dataclass
+class _ScanState:
+    """Progresso da última busca — permite refinar e retomar na próxima tecla."""
+
+    generation: int
+    query: str
+    matched: List[int]   # casam ``query``
+    pending: List[int]   # casam um prefixo de ``query``, ainda não re-testados
+    scanned: int         # cursor da varredura em ``_Snapshot.lower``
+
+
+class PathIndex:
+    """Índice de caminhos mantido em background para ``root``.
+
+    Thread-safe para leitura: :meth:`search` lê o snapshot publicado sem
+    lock; a thread de build só troca a referência ao terminar.
+    """
+
+    def __init__(self, root, *, max_entries: int = _DEFAULT_MAX_ENTRIES,
+                 refresh_interval_s: float = _DEFAULT_REFRESH_S):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.refresh_interval_s = refresh_interval_s
+        self._snapshot: Optional[_Snapshot] = None
+        self._scan: Optional[_ScanState] = None
+        self._sizes: Dict[str, Optional[int]] = {}
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ── ciclo de vida ─────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Dispara o build inicial em background (idempotente)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._wake.set()
+            self._thread = threading.Thread(
+                target=self._run, name="deile-path-index", daemon=True,
+            )
+            self._thread.start()
+
+    def refresh(self) -> None:
+        """Pede um rebuild (assíncrono)."""
+        self._wake.set()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        return len(snapshot.paths) if snapshot else 0
+
+    def _run(self) -> None:
+        generation = 0
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            generation += 1
+            try:
+                self._snapshot = self._build(generation)
+                self._sizes = {}
+            except Exception as e:  # noqa: BLE001 — índice é best-effort
+                logger.warning("PathIndex build failed for %s: %s", self.root, e)
+            self._ready.set()
+
+    # ── build ─────────────────────────────────────────────────────────────
+
+    def _build(self, generation: int) -> _Snapshot:
+        """Percorre ``root`` com ``os.scandir`` respeitando ``.gitignore``."""
+        entries: List[Tuple[str, bool]] = []
+        truncated = False
+        root_spec = self._load_ignore(self.root)
+        stack: List[Tuple[str, str, List[Tuple[str, pathspec.PathSpec]]]] = [
+            (str(self.root), "", [("", root_spec)] if root_spec else []),
+        ]
+        while stack and not truncated:
+            abs_dir, rel_dir, specs = stack.pop()
+            try:
+                with os.scandir(abs_dir) as it:
+                    children = list(it)
+            except OSError:
+                continue
+            for child in children:
+                if child.name.startswith('.'):
+                    continue  # ocultos (inclui .git) ficam de fora, como antes
+                try:
+                    is_dir = child.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                rel = f"{rel_dir}/{child.name}" if rel_dir else child.name
+                if self._ignored(rel, is_dir, specs):
+                    continue
+                entries.append((rel, is_dir))
+                if len(entries) >= self.max_entries:
+                    truncated = True
+                    break
+                if is_dir:
+                    child_spec = self._load_ignore(Path(child.path))
+                    child_specs = specs + [(rel, child_spec)] if child_spec else specs
+                    stack.append((child.path, rel, child_specs))
+            # Cede o GIL entre diretórios para não disputar com a digitação.
+            time.sleep(0)
+
+        # Rasos primeiro: com query vazia (ou varredura parcial) o usuário
+        # vê o topo do repositório, como na listagem antiga.
+        entries.sort(key=lambda e: (e[0].count('/'), e[0].lower()))
+        paths = [p for p, _ in entries]
+        lower = [p.lower() for p in paths]
+        if truncated:
+            logger.info("PathIndex: %s truncated at %d entries", self.root, self.max_entries)
+        return _Snapshot(
+            paths=paths,
+            lower=lower,
+            base_lower=[p[p.rfind('/') + 1:] for p in lower],
+            is_dir=[d for _, d in entries],
+            generation=generation,
+            built_at=time.monotonic(),
+            truncated=truncated,
+        )
+
+    @staticmethod
+    def _load_ignore(directory: Path) -> Optional[pathspec.PathSpec]:
+        try:
+            lines = (directory / ".gitignore").read_text(encoding="utf-8").splitlines()
+        except (OSError, UnicodeDecodeError):
+            return None
+        return pathspec.GitIgnoreSpec.from_lines(lines)
+
+    @staticmethod
+    def _ignored(rel: str, is_dir: bool,
+                 specs: Sequence[Tuple[str, pathspec.PathSpec]]) -> bool:
+        # Como o git: o ``.gitignore`` mais fundo que tem um padrão casando
+        # decide — inclusive negação (``!keep.log`` anula ``*.log`` da raiz).
+        for base, spec in reversed(specs):
+            local = rel[len(base) + 1:] if base else rel
+            include = spec.check_file(local + "/" if is_dir else local).include
+            if include is not None:
+                return include
+        return False
+
+    # ── busca ─────────────────────────────────────────────────────────────
+
+    def search(self, query: str, limit: int = 50,
+               budget_s: float = KEYSTROKE_BUDGET_S) -> List[PathMatch]:
+        """Melhores ``limit`` caminhos para ``query`` dentro de ``budget_s``.
+
+        Vazio enquanto o primeiro build não terminou (o caller decide o
+        fallback). Query vazia devolve os caminhos mais rasos.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return []
+        self._maybe_refresh(snapshot)
+        q = query.lower().replace('\\', '/')
+        if not q:
+            return [PathMatch(snapshot.paths[i], snapshot.is_dir[i])
+                    for i in range(min(limit, len(snapshot.paths)))]
+
+        deadline = time.perf_counter() + budget_s
+        candidates = self._candidates(snapshot, q, deadline)
+        return self._rank(snapshot, q, candidates, limit, deadline)
+
+    def _candidates(self, snapshot: _Snapshot, q: str, deadline: float) -> List[int]:
+        """Índices cujo caminho contém ``q`` como subsequência.
+
+        Quando ``q`` estende a query anterior só os candidatos dela são
+        re-testados (os demais não podem casar) e a varredura do índice
+        retoma de onde parou. Tudo respeita o deadline: o que não coube
+        fica pendente para a próxima tecla.
+        """
+        subseq = _subsequence_re(q)
+        scan = self._scan
+        matched: List[int] = []
+        if scan is None or scan.generation != snapshot.generation:
+            pending, scanned = [], 0
+        elif q == scan.query:
+            matched, pending, scanned = list(scan.matched), scan.pending, scan.scanned
+        elif q.startswith(scan.query):
+            pending, scanned = scan.matched + scan.pending, scan.scanned
+        else:
+            pending, scanned = [], 0
+
+        lower = snapshot.lower
+        total = len(lower)
+        done = 0
+        # Ao menos um bloco por tecla, mesmo com o deadline já estourado.
+        while done < len(pending) or scanned < total:
+            if done < len(pending):
+                chunk = pending[done:done + _CHECK_EVERY]
+                matched.extend(i for i in chunk if subseq(lower[i]))
+                done += len(chunk)
+            else:
+                stop = min(total, scanned + _CHECK_EVERY)
+                matched.extend(j for j in range(scanned, stop) if subseq(lower[j]))
+                scanned = stop
+            if time.perf_counter() > deadline:
+                break
+        pending = pending[done:]
+        self._scan = _ScanState(snapshot.generation, q, matched, pending, scanned)
+        return matched
+
+    @staticmethod
+    def _rank(snapshot: _Snapshot, q: str, candidates: List[int],
+              limit: int, deadline: float) -> List[PathMatch]:
+        base_subseq = _subsequence_re(q)
+        lower, base_lower = snapshot.lower, snapshot.base_lower
+
+        def _key(i: int) -> Tuple[int, int, str]:
+            p, b = lower[i], base_lower[i]
+            if b.startswith(q):
+                tier = 0
+            elif q in b:
+                tier = 1
+            elif p.startswith(q):
+                tier = 2
+            elif q in p:
+                tier = 3
+            elif base_subseq(b):
+                tier = 4
+            else:
+                tier = 5
+            return tier, len(p), p
+
+        # Ranqueia em blocos para respeitar o deadline mesmo com muitos
+        # candidatos (blocos iniciais = caminhos mais rasos).
+        best: List[Tuple[Tuple[int, int, str], int]] = []
+        for start in range(0, len(candidates), _CHECK_EVERY):
+            chunk = candidates[start:start + _CHECK_EVERY]
+            best = heapq.nsmallest(limit, best + [(_key(i), i) for i in chunk])
+            if time.perf_counter() > deadline:
+                break
+        return [PathMatch(snapshot.paths[i], snapshot.is_dir[i]) for _, i in best]
+
+    def _maybe_refresh(self, snapshot: _Snapshot) -> None:
+        if time.monotonic() - snapshot.built_at > self.refresh_interval_s:
+            self.refresh()
+
+    # ── metadados preguiçosos ─────────────────────────────────────────────
+
+    def size_of(self, path: str) -> Optional[int]:
+        """Tamanho de ``path`` (relativo à raiz) via ``stat`` com cache.
+
+        Pensado para ``display_meta`` callable: só roda quando a linha do
+        menu é desenhada, nunca no caminho da tecla.
+        """
+        if path in self._sizes:
+            return self._sizes[path]
+        try:
+            size: Optional[int] = (self.root / path).stat().st_size
+        except OSError:
+            size = None
+        self._sizes[path] = size
+        return size
+
+
+def _subsequence_re(q: str):
+    """``search`` de uma regex que casa ``q`` como subsequência (C-speed).
+
+    ``a[^b]*b[^c]*c`` em vez de ``a.*?b.*?c``: cada classe negada só tem um
+    jeito de casar (primeira ocorrência), então não há backtracking.
+    """
+    parts = [re.escape(q[0])]
+    for ch in q[1:]:
+        parts.append(f"[^{re.escape(ch)}]*{re.escape(ch)}")
+    return re.compile("".join(parts), re.DOTALL).search
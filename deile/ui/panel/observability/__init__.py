@@ -12,6 +12,8 @@ Public entrypoints:
 * :class:`ClaudeJsonlParser` — incremental parser for
   ``~/.claude/projects/<workspace-hash>/<session-uuid>.jsonl`` produced by
   the Claude CLI.
+* :class:`ClaudeJsonlTailer` — stateful live tail over the same files
+  (ring buffer, rotation detection, paged scroll-back).
 
 For the HTTP client and screen renderers, see the sibling modules:
 
@@ -25,3 +27,5 @@ For the HTTP client and screen renderers, see the sibling modules:
 from deile.ui.panel.observability.jsonl_parser import (  # noqa: F401
     AssistantTurn, ClaudeJsonlParser, ToolResultTurn, ToolUseTurn, Turn,
     UnknownTurn, UserTurn)
+from deile.ui.panel.observability.jsonl_tailer import (  # noqa: F401
+    ClaudeJsonlTailer, TailUpdate)
@@ -16,6 +16,10 @@ during a live tail) and supports incremental reads via :meth:`parse_tail`
 A turn that has a ``tool_use`` *without* its matching ``tool_result`` is
 flagged ``in_progress=True`` so the screen can mark it with ``▶``.
 
+For a long-lived live view, :class:`~deile.ui.panel.observability.jsonl_tailer.ClaudeJsonlTailer`
+keeps state between polls (ring buffer, partial-line carry-over, rotation
+detection, paged scroll-back) on top of this parser.
+
 The parser is deliberately a thin transformation layer — no Rich, no aiohttp,
 no asyncio — so it can be unit-tested with plain ``open()`` fixtures.
 """
@@ -24,10 +28,11 @@ from __future__ import annotations
 
 import json
 import logging
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -202,40 +207,37 @@ class ClaudeJsonlParser:
 
         start = since_byte_offset if 0 <= since_byte_offset <= file_size else 0
 
-        raw_lines: List[str] = []
+        # Keep the latest ``max_turns`` so the live tail always reflects the
+        # current state of the conversation rather than dropping the most
+        # recent activity.  Lines are decoded as they stream in, so memory
+        # stays bounded by ``max_turns`` rather than the file size.  For
+        # repeated polls of a long session use :class:`ClaudeJsonlTailer`.
+        parsed: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=max_turns)
+        count = 0
+        skipped = 0
         try:
             with self.path.open("rb") as fh:
                 if start:
                     fh.seek(start)
                 # Read by lines using bytes to keep precise EOF accounting.
                 for raw in fh:
-                    raw_lines.append(raw.decode(self.encoding, "replace"))
+                    line = raw.decode(self.encoding, "replace").strip()
+                    if not line:
+                        continue
+                    try:
+                        obj = json.loads(line)
+                    except json.JSONDecodeError:
+                        skipped += 1
+                        continue
+                    if not isinstance(obj, dict):
+                        skipped += 1
+                        continue
+                    parsed.append((count, obj))
+                    count += 1
         except OSError as exc:
             logger.warning("read(%s) failed: %s", self.path, exc)
             return TailResult(turns=[], next_offset=start, skipped_malformed_lines=0)
 
-        parsed: List[Tuple[int, Dict[str, Any]]] = []
-        skipped = 0
-        for line in raw_lines:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                skipped += 1
-                continue
-            if not isinstance(obj, dict):
-                skipped += 1
-                continue
-            parsed.append((len(parsed), obj))
-
-        # Keep the latest ``max_turns`` so the live tail always reflects the
-        # current state of the conversation rather than dropping the most
-        # recent activity.
-        if len(parsed) > max_turns:
-            parsed = parsed[-max_turns:]
-
         turns: List[Turn] = [self._parse_object(idx, obj) for idx, obj in parsed]
         self._mark_in_progress(turns)
 
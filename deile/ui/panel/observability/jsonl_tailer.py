@@ -0,0 +1,284 @@
+"""Stateful live tail over a Claude CLI session JSONL file.
+
+:meth:`ClaudeJsonlParser.parse_tail` is stateless: every call reads from an
+offset to EOF and ``json.loads`` every line, so a screen that wants the
+latest turns of a long session ends up re-parsing files that reach hundreds
+of MB.  :class:`ClaudeJsonlTailer` keeps the state between polls instead:
+
+* a ring buffer with the last ``capacity`` parsed turns;
+* the read position plus the bytes of a trailing partial line, carried over
+  and completed by the next poll instead of being parsed half-written;
+* the file identity (``st_dev``/``st_ino``) and size, so rotation and
+  truncation reset the tail instead of resuming at a stale offset;
+* a sparse line index (byte offset of every ``index_every``-th line), so
+  :meth:`ClaudeJsonlTailer.load_earlier` pages older turns in by seeking
+  next to them instead of re-reading the file from the start.
+
+Lines that cannot end up in the ring (everything but the last ``capacity``
+of a read) are only counted for the index, never decoded — attaching to a
+100 MB session costs a newline scan, not 100 MB of ``json.loads``.
+
+``Turn.index`` is the absolute 0-based line number in the file, so pages
+loaded later line up with the live window.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from deile.ui.panel.observability.jsonl_parser import (ClaudeJsonlParser,
+                                                       ToolResultTurn,
+                                                       ToolUseTurn, Turn)
+
+logger = logging.getLogger(__name__)
+
+_READ_BLOCK = 1 << 20
+
+
+@dataclass
+class TailUpdate:
+    """Outcome of :meth:`ClaudeJsonlTailer.poll`."""
+
+    new_turns: List[Turn] = field(default_factory=list)
+    reset: bool = False
+    """``True`` when the file was rotated or truncated — the ring buffer was
+    rebuilt from the new file and anything rendered before is stale."""
+
+    skipped_malformed_lines: int = 0
+
+
+class ClaudeJsonlTailer:
+    """Incremental, rotation-aware tail of one session JSONL file.
+
+    Like :class:`ClaudeJsonlParser` it holds no file handle between calls,
+    so it can be polled from ``asyncio.to_thread``.  Not thread-safe: one
+    tailer per screen.
+    """
+
+    DEFAULT_CAPACITY = 500
+    """Turns kept in the ring buffer."""
+
+    DEFAULT_PAGE_SIZE = 50
+    """Turns returned by :meth:`load_earlier` when ``count`` is omitted."""
+
+    DEFAULT_INDEX_EVERY = 256
+    """Lines between two sparse index entries (bounds the re-read per page)."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        index_every: int = DEFAULT_INDEX_EVERY,
+        encoding: str = "utf-8",
+    ):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity!r}")
+        if index_every <= 0:
+            raise ValueError(f"index_every must be positive, got {index_every!r}")
+        self.path = Path(path)
+        self.capacity = capacity
+        self.index_every = index_every
+        self.encoding = encoding
+        self._parser = ClaudeJsonlParser(self.path, encoding=encoding)
+        self._ring: Deque[Turn] = deque(maxlen=capacity)
+        self._reset_state()
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    @property
+    def turns(self) -> List[Turn]:
+        """Ring buffer contents, oldest first."""
+        return list(self._ring)
+
+    @property
+    def line_count(self) -> int:
+        """Complete lines seen so far (the partial carry-over excluded)."""
+        return self._line_count
+
+    @property
+    def offset(self) -> int:
+        """Byte offset just past the last complete line."""
+        return self._read_pos - len(self._carry)
+
+    def poll(self) -> TailUpdate:
+        """Read whatever was appended since the last poll.
+
+        The first poll attaches to the file: it indexes every line but only
+        decodes the last ``capacity``.  A missing file (e.g. mid-rotation)
+        yields an empty update and keeps the current tail.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return TailUpdate()
+        except OSError as exc:
+            logger.warning("stat(%s) failed: %s", self.path, exc)
+            return TailUpdate()
+
+        reset = False
+        identity = (st.st_dev, st.st_ino)
+        if self._identity is not None and (
+            identity != self._identity or st.st_size < self._read_pos
+        ):
+            logger.info("%s rotated or truncated; resetting tail", self.path)
+            self._reset_state()
+            reset = True
+        if st.st_size == self._read_pos and not reset:
+            return TailUpdate()
+
+        try:
+            with self.path.open("rb") as fh:
+                fst = os.fstat(fh.fileno())
+                self._identity = (fst.st_dev, fst.st_ino)
+                lines = self._consume(fh)
+        except OSError as exc:
+            logger.warning("read(%s) failed: %s", self.path, exc)
+            return TailUpdate(reset=reset)
+
+        turns, skipped = self._parse_lines(lines)
+        self.skipped_malformed_lines += skipped
+        for turn in turns:
+            self._track_tool_state(turn)
+        self._ring.extend(turns)
+        return TailUpdate(new_turns=turns, reset=reset, skipped_malformed_lines=skipped)
+
+    def load_earlier(
+        self,
+        before: Optional[int] = None,
+        count: Optional[int] = None,
+    ) -> List[Turn]:
+        """Turns on lines ``[before - count, before)``, read on demand.
+
+        ``before`` defaults to the oldest turn in the ring buffer, so
+        repeated calls with the ``index`` of the oldest turn on screen page
+        backwards through the session.  Seeks to the nearest sparse index
+        entry, so each page re-reads at most ``index_every`` extra lines.
+        Returns fewer turns than ``count`` when the range holds blank or
+        malformed lines, and ``[]`` once the start of the file is reached.
+        """
+        if count is None:
+            count = self.DEFAULT_PAGE_SIZE
+        if count <= 0:
+            raise ValueError(f"count must be positive, got {count!r}")
+        if before is None:
+            before = self._ring[0].index if self._ring else self._line_count
+        before = min(before, self._line_count)
+        first = max(0, before - count)
+        if first >= before or self._identity is None:
+            return []
+
+        anchor = first // self.index_every
+        line_no = anchor * self.index_every
+        lines: List[Tuple[int, bytes]] = []
+        try:
+            with self.path.open("rb") as fh:
+                fst = os.fstat(fh.fileno())
+                if (fst.st_dev, fst.st_ino) != self._identity:
+                    return []  # rotated since the last poll; next poll resets
+                fh.seek(self._line_offsets[anchor])
+                while line_no < before:
+                    raw = fh.readline()
+                    if not raw.endswith(b"\n"):
+                        break
+                    if line_no >= first:
+                        lines.append((line_no, raw))
+                    line_no += 1
+        except OSError as exc:
+            logger.warning("read(%s) failed: %s", self.path, exc)
+            return []
+
+        turns, _ = self._parse_lines(lines)
+        for turn in turns:
+            if isinstance(turn, ToolUseTurn) and turn.tool_use_id:
+                turn.in_progress = turn.tool_use_id in self._open_tool_uses
+        return turns
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _reset_state(self) -> None:
+        self._identity: Optional[Tuple[int, int]] = None
+        self._read_pos = 0
+        self._carry = b""
+        self._line_count = 0
+        self._line_offsets: List[int] = []
+        self._open_tool_uses: Set[str] = set()
+        self._open_turns: Dict[str, ToolUseTurn] = {}
+        self.skipped_malformed_lines = 0
+        self._ring.clear()
+
+    def _consume(self, fh) -> Deque[Tuple[int, bytes]]:
+        """Scan from the read position to EOF, updating index and carry.
+
+        Returns the last ``capacity`` complete lines as ``(line_no, raw)``;
+        earlier lines are indexed and dropped without being decoded.
+        """
+        every = self.index_every
+        tail: Deque[Tuple[int, bytes]] = deque(maxlen=self.capacity)
+        fh.seek(self._read_pos)
+        while True:
+            block = fh.read(_READ_BLOCK)
+            if not block:
+                break
+            base = self._read_pos - len(self._carry)
+            buf = self._carry + block if self._carry else block
+            self._read_pos += len(block)
+            line_no = self._line_count
+            pos = 0
+            while True:
+                nl = buf.find(b"\n", pos)
+                if nl < 0:
+                    break
+                if line_no % every == 0:
+                    self._line_offsets.append(base + pos)
+                tail.append((line_no, buf[pos:nl]))
+                line_no += 1
+                pos = nl + 1
+            self._line_count = line_no
+            self._carry = buf[pos:]
+        return tail
+
+    def _parse_lines(self, lines: Iterable[Tuple[int, bytes]]) -> Tuple[List[Turn], int]:
+        turns: List[Turn] = []
+        skipped = 0
+        for line_no, raw in lines:
+            text = raw.decode(self.encoding, "replace").strip()
+            if not text:
+                continue
+            try:
+                obj = json.loads(text)
+            except json.JSONDecodeError:
+                skipped += 1
+                continue
+            if not isinstance(obj, dict):
+                skipped += 1
+                continue
+            turns.append(self._parser._parse_object(line_no, obj))
+        return turns, skipped
+
+    def _track_tool_state(self, turn: Turn) -> None:
+        """Keep ``in_progress`` of live ``tool_use`` turns up to date.
+
+        A ``tool_use`` is open until its ``tool_result`` shows up in a later
+        poll; the open set also answers for turns paged in by
+        :meth:`load_earlier`.
+        """
+        if isinstance(turn, ToolUseTurn) and turn.tool_use_id:
+            turn.in_progress = True
+            self._open_tool_uses.add(turn.tool_use_id)
+            self._open_turns[turn.tool_use_id] = turn
+        elif isinstance(turn, ToolResultTurn) and turn.tool_use_id:
+            self._open_tool_uses.discard(turn.tool_use_id)
+            pending = self._open_turns.pop(turn.tool_use_id, None)
+            if pending is not None:
+                pending.in_progress = False
@@ -0,0 +1,399 @@
+"""Followers de log ``kubectl logs -f`` de longa duração para o painel TUI.
+
+Antes, cada provider do painel (``PipelineProvider``, ``WorkerProvider``,
+``ProviderHealthProvider``, ``MultiSourceActivityProvider``) rodava
+``kubectl logs --tail=N`` por pod a cada 2-5s e re-parseava as mesmas
+linhas — dezenas de processos por minuto, CPU crescendo com o nº de pods.
+
+Agora existe UM follower por alvo (``deploy/<nome>`` ou nome de pod):
+
+- ``kubectl logs -f --timestamps`` de longa duração; a primeira conexão
+  faz backfill com ``--tail=N``, as reconexões usam ``--since-time=<último
+  timestamp visto>``.
+- Reconexão com backoff exponencial (pod reiniciado, rede caiu, apiserver
+  derrubou o stream).
+- Dedupe por timestamp: ``--since-time`` tem resolução de segundo no
+  apiserver, então a reconexão re-entrega linhas já vistas — descartamos
+  tudo com timestamp anterior ao último visto e, no mesmo timestamp, as
+  linhas idênticas já bufferizadas.
+- As linhas vão para um ring buffer limitado (``deque(maxlen)``) por alvo,
+  compartilhado por todos os providers via ``LogFollowerHub``.
+
+Providers leem ``hub.read(...)``, que devolve o texto já no formato de
+``kubectl logs --timestamps`` — os parsers existentes continuam intactos.
+``None`` significa "follower ainda não pronto" e o provider cai no
+``kubectl logs --tail`` one-shot legado (cold start / kubectl quebrado).
+
+Followers não lidos por ``idle_ttl_s`` são encerrados (pod sumiu, fonte
+removida da config) — o hub não acumula processos órfãos.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_UTC = timezone.utc
+
+#: Linhas mantidas por alvo. Os providers leem no máximo 400 (``--tail``
+#: do ProviderHealthProvider); folga para janelas ``--since`` maiores.
+DEFAULT_MAX_LINES = 2000
+#: Backfill da primeira conexão (equivalente ao ``--tail`` legado).
+DEFAULT_BACKFILL_LINES = 400
+#: Follower sem leitura por este tempo é encerrado.
+DEFAULT_IDLE_TTL_S = 120.0
+#: Conexão viva sem nenhuma linha por este tempo já conta como pronta
+#: (pod com log vazio não deve forçar fallback one-shot eternamente).
+_READY_GRACE_S = 1.0
+_BACKOFF_MIN_S = 1.0
+_BACKOFF_MAX_S = 30.0
+
+_TS_RE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+\-]\d{2}:\d{2})?\s"
+)
+
+_TsKey = Tuple[str, int]
+
+
+def _ts_key(line: str) -> Optional[_TsKey]:
+    """Chave ordenável do timestamp RFC3339Nano no início da linha.
+
+    ``kubectl logs --timestamps`` emite UTC com até 9 dígitos de fração e
+    zeros à direita cortados — comparação de string direta erraria
+    (``.5Z`` > ``.123Z``). A chave normaliza a fração para nanossegundos.
+    ``None`` para linhas sem timestamp.
+    """
+    m = _TS_RE.match(line)
+    if not m:
+        return None
+    frac = (m.group(2) or "")[:9].ljust(9, "0")
+    return (m.group(1), int(frac))
+
+
+def _ts_datetime(line: str) -> Optional[datetime]:
+    m = _TS_RE.match(line)
+    if not m:
+        return None
+    tz = m.group(3)
+    try:
+        base = datetime.fromisoformat(
+            m.group(1) + (tz if tz and tz != "Z" else "+00:00"))
+    except ValueError:
+        return None
+    frac = (m.group(2) or "")[:6].ljust(6, "0")
+    return base.replace(microsecond=int(frac)).astimezone(_UTC)
+
+
+class LogRingBuffer:
+    """Ring buffer thread-safe de linhas ``--timestamps`` com dedupe.
+
+    ``append`` descarta linhas mais antigas que a última aceita e
+    repetições exatas no mesmo timestamp (sobreposição de reconexão).
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES):
+        self._lines: Deque[str] = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._last_key: Optional[_TsKey] = None
+        self._last_ts_raw: Optional[str] = None
+        self._seen_at_last: Set[str] = set()
+        self.dropped_duplicates = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._lines)
+
+    @property
+    def last_timestamp(self) -> Optional[str]:
+        """Timestamp bruto (RFC3339) da última linha aceita."""
+        with self._lock:
+            return self._last_ts_raw
+
+    def append(self, line: str) -> bool:
+        """Insere ``line`` se não for duplicata. Retorna ``True`` se aceitou."""
+        line = line.rstrip("\r\n")
+        if not line:
+            return False
+        key = _ts_key(line)
+        with self._lock:
+            if key is not None and self._last_key is not None:
+                if key < self._last_key:
+                    self.dropped_duplicates += 1
+                    return False
+                if key == self._last_key and line in self._seen_at_last:
+                    self.dropped_duplicates += 1
+                    return False
+            if key is not None:
+                if key != self._last_key:
+                    self._last_key = key
+                    self._seen_at_last = set()
+                    self._last_ts_raw = line.split(None, 1)[0]
+                self._seen_at_last.add(line)
+            self._lines.append(line)
+            return True
+
+    def snapshot(self, tail: Optional[int] = None,
+                 since: Optional[datetime] = None) -> List[str]:
+        """Cópia das últimas ``tail`` linhas com timestamp ``>= since``."""
+        with self._lock:
+            lines = list(self._lines)
+        if since is not None:
+            # Linhas estão em ordem de timestamp (dedupe garante) — corta do
+            # fim para o começo até sair da janela.
+            start = len(lines)
+            while start > 0:
+                ts = _ts_datetime(lines[start - 1])
+                if ts is not None and ts < since:
+                    break
+                start -= 1
+            lines = lines[start:]
+        if tail is not None and len(lines) > tail:
+            lines = lines[-tail:]
+        return lines
+
+
+class PodLogFollower:
+    """Mantém um ``kubectl logs -f`` vivo para um alvo, reconectando.
+
+    ``popen`` é injetável para testes; o padrão é ``subprocess.Popen``.
+    """
+
+    def __init__(self, kubectl: str, namespace: str, target: str,
+                 *, max_lines: int = DEFAULT_MAX_LINES,
+                 backfill_lines: int = DEFAULT_BACKFILL_LINES,
+                 popen: Callable[..., "subprocess.Popen[str]"] = subprocess.Popen,
+                 backoff_min_s: float = _BACKOFF_MIN_S,
+                 backoff_max_s: float = _BACKOFF_MAX_S):
+        self.kubectl = kubectl
+        self.namespace = namespace
+        self.target = target
+        self.buffer = LogRingBuffer(max_lines)
+        self._backfill_lines = backfill_lines
+        self._popen = popen
+        self._backoff_min_s = backoff_min_s
+        self._backoff_max_s = backoff_max_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._proc: Optional["subprocess.Popen[str]"] = None
+        self._proc_lock = threading.Lock()
+        self._connected_at: Optional[float] = None
+        self.connects = 0
+        self.last_error: Optional[str] = None
+        self.last_read = time.monotonic()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, daemon=True,
+            name=f"log-follow:{self.namespace}/{self.target}",
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        with self._proc_lock:
+            proc = self._proc
+        if proc is not None:
+            _terminate(proc)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_ready(self) -> bool:
+        """``True`` quando o buffer reflete o log do alvo.
+
+        Pronto = já recebeu linhas, ou a conexão atual está viva há mais
+        de ``_READY_GRACE_S`` (log vazio). Antes disso o provider usa o
+        fetch one-shot para a primeira render não ficar vazia.
+        """
+        if len(self.buffer) > 0:
+            return True
+        connected_at = self._connected_at
+        return (connected_at is not None
+                and time.monotonic() - connected_at >= _READY_GRACE_S)
+
+    def build_cmd(self) -> List[str]:
+        cmd = [self.kubectl, "-n", self.namespace, "logs", self.target,
+               "-f", "--timestamps"]
+        since = self.buffer.last_timestamp
+        if since:
+            cmd.append(f"--since-time={since}")
+        else:
+            cmd.append(f"--tail={self._backfill_lines}")
+        return cmd
+
+    def _run(self) -> None:
+        backoff = self._backoff_min_s
+        while not self._stop.is_set():
+            cmd = self.build_cmd()
+            try:
+                proc = self._popen(
+                    cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                    stdin=subprocess.DEVNULL, text=True, bufsize=1,
+                    errors="replace",
+                )
+            except OSError as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self._backoff_max_s)
+                continue
+            with self._proc_lock:
+                self._proc = proc
+            self.connects += 1
+            self._connected_at = time.monotonic()
+            got_lines = False
+            try:
+                assert proc.stdout is not None
+                for line in proc.stdout:
+                    if self._stop.is_set():
+                        break
+                    self.buffer.append(line)
+                    got_lines = True
+            except (OSError, ValueError) as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+            finally:
+                self._connected_at = None
+                with self._proc_lock:
+                    self._proc = None
+                _terminate(proc)
+            if self._stop.is_set():
+                break
+            rc = proc.returncode
+            if rc not in (0, None):
+                self.last_error = f"kubectl logs -f exit {rc}"
+            # Stream que entregou linhas caiu por motivo externo (rotação,
+            # restart do pod): reconecta rápido. Stream que morre sem linhas
+            # (pod inexistente, auth) cresce o backoff até o teto.
+            if got_lines:
+                backoff = self._backoff_min_s
+            logger.debug("log follower %s/%s desconectou (rc=%s); retry em %.1fs",
+                         self.namespace, self.target, rc, backoff)
+            self._stop.wait(backoff)
+            if not got_lines:
+                backoff = min(backoff * 2, self._backoff_max_s)
+
+
+def _terminate(proc: "subprocess.Popen[str]") -> None:
+    if proc.poll() is not None:
+        return
+    try:
+        proc.terminate()
+        proc.wait(timeout=1.0)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        try:
+            proc.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            pass
+    except OSError:
+        pass
+
+
+class LogFollowerHub:
+    """Registro compartilhado ``(namespace, alvo) → PodLogFollower``.
+
+    Um hub por ``PanelData``: providers diferentes lendo o mesmo pod (ex.:
+    ``WorkerProvider`` e ``ProviderHealthProvider``) compartilham UM
+    processo ``kubectl logs -f`` e UM buffer.
+    """
+
+    def __init__(self, *, max_lines: int = DEFAULT_MAX_LINES,
+                 backfill_lines: int = DEFAULT_BACKFILL_LINES,
+                 idle_ttl_s: float = DEFAULT_IDLE_TTL_S,
+                 popen: Callable[..., "subprocess.Popen[str]"] = subprocess.Popen,
+                 backoff_min_s: float = _BACKOFF_MIN_S,
+                 backoff_max_s: float = _BACKOFF_MAX_S):
+        self._max_lines = max_lines
+        self._backfill_lines = backfill_lines
+        self._idle_ttl_s = idle_ttl_s
+        self._popen = popen
+        self._backoff_min_s = backoff_min_s
+        self._backoff_max_s = backoff_max_s
+        self._followers: Dict[Tuple[str, str], PodLogFollower] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def follower(self, kubectl: str, namespace: str,
+                 target: str) -> Optional[PodLogFollower]:
+        """Devolve (iniciando se preciso) o follower do alvo."""
+        key = (namespace, target)
+        with self._lock:
+            if self._closed:
+                return None
+            fol = self._followers.get(key)
+            if fol is None or not fol.alive:
+                fol = PodLogFollower(
+                    kubectl, namespace, target,
+                    max_lines=self._max_lines,
+                    backfill_lines=self._backfill_lines,
+                    popen=self._popen,
+                    backoff_min_s=self._backoff_min_s,
+                    backoff_max_s=self._backoff_max_s,
+                )
+                self._followers[key] = fol
+                fol.start()
+            fol.last_read = time.monotonic()
+        return fol
+
+    def read(self, kubectl: str, namespace: str, target: str,
+             *, tail: Optional[int] = None,
+             since_s: Optional[float] = None) -> Optional[str]:
+        """Texto no formato ``kubectl logs --timestamps`` do buffer do alvo.
+
+        ``None`` quando o follower ainda não está pronto — o chamador faz
+        o fetch one-shot legado.
+        """
+        self.prune_idle()
+        fol = self.follower(kubectl, namespace, target)
+        if fol is None or not fol.is_ready():
+            return None
+        since = (datetime.now(_UTC) - timedelta(seconds=since_s)
+                 if since_s is not None else None)
+        lines = fol.buffer.snapshot(tail=tail, since=since)
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def prune_idle(self) -> int:
+        """Encerra followers sem leitura há ``idle_ttl_s``. Retorna quantos."""
+        now = time.monotonic()
+        with self._lock:
+            stale = [k for k, f in self._followers.items()
+                     if now - f.last_read > self._idle_ttl_s]
+            victims = [self._followers.pop(k) for k in stale]
+        for fol in victims:
+            fol.stop(timeout=0.5)
+        return len(victims)
+
+    def targets(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return sorted(self._followers)
+
+    def close(self) -> None:
+        """Para todos os followers (fim do painel)."""
+        with self._lock:
+            self._closed = True
+            victims = list(self._followers.values())
+            self._followers.clear()
+        for fol in victims:
+            fol.stop()
+
+
+def parse_since(spec: str) -> Optional[float]:
+    """``"10m"``/``"10s"``/``"1h"`` (formato ``kubectl --since``) → segundos."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", spec or "")
+    if not m:
+        return None
+    mult = {"": 1.0, "s": 1.0, "m": 60.0, "h": 3600.0}[m.group(2)]
+    return float(m.group(1)) * mult
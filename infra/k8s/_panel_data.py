@@ -21,8 +21,10 @@ flags k8s/local — permite o painel rodar:
 
 Fontes:
 - pods + recursos:  `kubectl -n <ns> get pods -o json`
-- pipeline:         `kubectl logs deploy/<pipeline-deploy> --tail=200 --timestamps`
-- worker (por pod): `kubectl logs <pod> --tail=200 --timestamps`
+- pipeline:         `kubectl logs -f deploy/<pipeline-deploy> --timestamps`
+                    (follower de longa duração — ver `_log_follower.py`;
+                    `--tail=200` one-shot só no cold start)
+- worker (por pod): `kubectl logs -f <pod> --timestamps` (idem)
 - issues + PRs:     `gh api /repos/<repo>/issues?state=open`
 - custos:           `<usage_db>` (SQLite — default `~/.deile/db/usage.db`)
 - processos locais: `ps -axo pid,pcpu,rss,etime,command`
@@ -51,6 +53,8 @@ from functools import cached_property
 from pathlib import Path
 from typing import Any, Callable, Deque, Dict, Generic, List, Optional, Set, Tuple, TypeVar
 
+from _log_follower import LogFollowerHub, parse_since
+
 T = TypeVar("T")
 
 logger = logging.getLogger(__name__)
@@ -638,13 +642,42 @@ class _KubectlProviderMixin:
     """
 
     _kubectl: Optional[str]
+    _namespace: str
     _enabled: bool = True
+    # Hub de followers ``kubectl logs -f`` compartilhado (``PanelData``).
+    # ``None`` = modo legado: cada fetch roda ``kubectl logs --tail`` one-shot.
+    _log_hub: Optional[LogFollowerHub] = None
 
     def _resolve_kubectl(self) -> Optional[str]:
         if self._kubectl is None:
             self._kubectl = kubectl_bin()
         return self._kubectl
 
+    def _read_logs(self, target: str, *, tail: int,
+                   since: Optional[str] = None,
+                   timeout: float = 5.0) -> Optional[str]:
+        """Log recente de ``target`` no formato ``kubectl logs --timestamps``.
+
+        Com ``_log_hub``: lê do ring buffer do follower (zero subprocess por
+        refresh). Sem hub — ou follower ainda conectando — faz o
+        ``kubectl logs --tail`` one-shot legado. ``None`` se kubectl falhar.
+        """
+        if self._kubectl is None:
+            return None
+        if self._log_hub is not None:
+            text = self._log_hub.read(
+                self._kubectl, self._namespace, target, tail=tail,
+                since_s=parse_since(since) if since else None,
+            )
+            if text is not None:
+                return text
+        cmd = [self._kubectl, "-n", self._namespace, "logs", target,
+               f"--tail={tail}"]
+        if since:
+            cmd.append(f"--since={since}")
+        cmd.append("--timestamps")
+        return _capture_text(cmd, timeout=timeout)
+
     def _check_enabled(self) -> None:
         """Raise para o Cache cair em fallback quando provider desabilitado."""
         if not self._enabled:
@@ -1261,12 +1294,15 @@ class PipelineProvider(_KubectlProviderMixin):
 
     def __init__(self, ttl_s: float = 2.0,
                  namespace: str = NS, deploy: Optional[str] = None,
-                 enabled: bool = True):
-        # 2s: `kubectl logs --tail=200` ~200ms; balanceado entre vivo e custo.
+                 enabled: bool = True,
+                 log_hub: Optional[LogFollowerHub] = None):
+        # 2s: com ``log_hub`` o refresh só relê o ring buffer do follower;
+        # sem hub, `kubectl logs --tail=200` ~200ms por refresh.
         self._kubectl = kubectl_bin()
         self._namespace = namespace
         self._deploy = deploy or self.DEPLOY
         self._enabled = enabled
+        self._log_hub = log_hub
         self._cache: Cache[PipelineState] = Cache(
             ttl_s, self._fetch, fallback=PipelineState(),
         )
@@ -1298,12 +1334,8 @@ class PipelineProvider(_KubectlProviderMixin):
         if replicas_text is not None and replicas_text.strip() in ("0", ""):
             # Deploy parado (scale=0) ou ausente — devolve estado vazio.
             return PipelineState()
-        text = _capture_text(
-            [self._kubectl, "-n", self._namespace, "logs",
-             f"deploy/{self._deploy}",
-             f"--tail={self.TAIL_LINES}", "--timestamps"],
-            timeout=5.0,
-        )
+        text = self._read_logs(f"deploy/{self._deploy}",
+                               tail=self.TAIL_LINES, timeout=5.0)
         if text is None:
             raise RuntimeError(f"kubectl logs {self._deploy} falhou")
         return self._parse(text)
@@ -1531,12 +1563,15 @@ class WorkerProvider(_KubectlProviderMixin):
     def __init__(self, ttl_s: float = 2.0,
                  namespace: str = NS, worker_deploy: str = "deile-worker",
                  enabled: bool = True,
-                 costs: Optional["CostsProvider"] = None):
-        # 2s: N `kubectl logs` (1 por worker) — só roda em background.
+                 costs: Optional["CostsProvider"] = None,
+                 log_hub: Optional[LogFollowerHub] = None):
+        # 2s: com ``log_hub``, 1 follower por worker (buffer compartilhado);
+        # sem hub, N `kubectl logs` (1 por worker) por refresh.
         self._kubectl = kubectl_bin()
         self._namespace = namespace
         self._worker_deploy = worker_deploy
         self._enabled = enabled
+        self._log_hub = log_hub
         # Optional: resolve cost_usd for LastCompletedTask (issue #396).
         self._costs = costs
         self._cache: Cache[Dict[str, WorkerState]] = Cache(
@@ -1567,11 +1602,8 @@ class WorkerProvider(_KubectlProviderMixin):
         pod_names = [n for n in names_raw.split() if n]
         states: Dict[str, WorkerState] = {}
         for name in pod_names:
-            text = _capture_text(
-                [self._kubectl, "-n", self._namespace, "logs", name,
-                 f"--tail={self.TAIL_LINES}", "--timestamps"],
-                timeout=4.0,
-            ) or ""
+            text = self._read_logs(name, tail=self.TAIL_LINES,
+                                   timeout=4.0) or ""
             states[name] = self._parse(name, text)
         return states
 
@@ -1812,10 +1844,12 @@ class ProviderHealthProvider(_KubectlProviderMixin):
     TAIL_LINES = 400
 
     def __init__(self, ttl_s: float = 5.0, namespace: str = NS,
-                 enabled: bool = True):
+                 enabled: bool = True,
+                 log_hub: Optional[LogFollowerHub] = None):
         self._kubectl = kubectl_bin()
         self._namespace = namespace
         self._enabled = enabled
+        self._log_hub = log_hub
         self._cache: Cache[Dict[str, WorkerProviderError]] = Cache(
             ttl_s, self._fetch, fallback={},
         )
@@ -1872,12 +1906,8 @@ class ProviderHealthProvider(_KubectlProviderMixin):
         return out
 
     def _scan_pod(self, pod_name: str, role: str) -> Optional[WorkerProviderError]:
-        text = _capture_text(
-            [self._kubectl, "-n", self._namespace, "logs", pod_name,
-             f"--tail={self.TAIL_LINES}", f"--since={self.SINCE}",
-             "--timestamps"],
-            timeout=4.0,
-        )
+        text = self._read_logs(pod_name, tail=self.TAIL_LINES,
+                               since=self.SINCE, timeout=4.0)
         if not text:
             return None
         if len(text) > MAX_LOG_BYTES:
@@ -2225,7 +2255,8 @@ class MultiSourceActivityProvider(_KubectlProviderMixin):
     customizáveis via ``settings.panel_activity_sources`` (issue #447) ou
     passando ``sources`` diretamente ao construtor.
 
-    Usa ``--since=10s --tail=80 --timestamps`` por source. Cada refresh
+    Usa ``--since=10s --tail=80 --timestamps`` por source (lido do
+    follower compartilhado quando há ``log_hub``). Cada refresh
     mescla todas as linhas num buffer capped em 200, ordenado por timestamp.
     Fontes indisponíveis são silenciosamente ignoradas (provider permanece
     funcional com eventos das demais fontes).
@@ -2233,10 +2264,12 @@ class MultiSourceActivityProvider(_KubectlProviderMixin):
 
     def __init__(self, ttl_s: float = 3.0, namespace: str = NS,
                  enabled: bool = True,
-                 sources: Optional[List[ActivitySource]] = None):
+                 sources: Optional[List[ActivitySource]] = None,
+                 log_hub: Optional[LogFollowerHub] = None):
         self._kubectl = kubectl_bin()
         self._namespace = namespace
         self._enabled = enabled
+        self._log_hub = log_hub
         # D4 (issue #447): fontes configuráveis; None/vazio → default V1.
         if sources:
             self._sources: List[ActivitySource] = sources
@@ -2273,25 +2306,32 @@ class MultiSourceActivityProvider(_KubectlProviderMixin):
         """
         if self._kubectl is None:
             return []
-        cmd = [self._kubectl, "-n", self._namespace, "logs",
-               f"deploy/{deploy}",
-               f"--tail={_MULTI_TAIL_LINES}",
-               f"--since={_MULTI_SINCE}",
-               "--timestamps"]
-        try:
-            out = subprocess.run(cmd, capture_output=True, text=True,
-                                 timeout=3.0)
-        except subprocess.TimeoutExpired:
-            with self._lock:
-                self._last_errors[deploy] = "timeout"
-            return []
-        except OSError:
-            return []
-        if out.returncode != 0:
-            with self._lock:
-                self._last_errors[deploy] = f"exit {out.returncode}"
-            return []
-        text = out.stdout
+        text: Optional[str] = None
+        if self._log_hub is not None:
+            text = self._log_hub.read(
+                self._kubectl, self._namespace, f"deploy/{deploy}",
+                tail=_MULTI_TAIL_LINES, since_s=parse_since(_MULTI_SINCE),
+            )
+        if text is None:
+            cmd = [self._kubectl, "-n", self._namespace, "logs",
+                   f"deploy/{deploy}",
+                   f"--tail={_MULTI_TAIL_LINES}",
+                   f"--since={_MULTI_SINCE}",
+                   "--timestamps"]
+            try:
+                out = subprocess.run(cmd, capture_output=True, text=True,
+                                     timeout=3.0)
+            except subprocess.TimeoutExpired:
+                with self._lock:
+                    self._last_errors[deploy] = "timeout"
+                return []
+            except OSError:
+                return []
+            if out.returncode != 0:
+                with self._lock:
+                    self._last_errors[deploy] = f"exit {out.returncode}"
+                return []
+            text = out.stdout
         if not text:
             return []
         if len(text) > MAX_LOG_BYTES:
@@ -5776,6 +5816,24 @@ def _try_load_status_client():
 _STATUS_CLIENT_CLS = _try_load_status_client()
 
 
+def _try_load_slot_table():
+    """Importa :class:`SlotTable` (heartbeats mmap) se ``deile`` estiver disponível.
+
+    Com slots, o heartbeat de cada instância deixa de reescrever o state
+    file — sem este import o painel standalone só enxerga o
+    ``last_heartbeat_at`` do último flush (e pode marcar stale à toa em
+    instâncias ociosas).
+    """
+    try:
+        from deile.runtime.slots import SlotTable  # noqa: PLC0415
+        return SlotTable
+    except Exception:  # noqa: BLE001 — degradação silenciosa
+        return None
+
+
+_SLOT_TABLE_CLS = _try_load_slot_table()
+
+
 class LocalInstancesProvider:
     """Lê `<runtime_dir>/*.json` (e opcionalmente o Unix socket Fase 2)
     e devolve snapshots por PID.
@@ -5828,6 +5886,8 @@ class LocalInstancesProvider:
         self._cache: Cache[Dict[int, InstanceSnapshot]] = Cache(
             ttl_s, self._fetch, fallback={},
         )
+        # Aberto lazy no primeiro `_fetch` em que `registry.slots` existir.
+        self._slots = None
 
     @property
     def runtime_dir(self) -> Path:
@@ -5859,8 +5919,9 @@ class LocalInstancesProvider:
         except OSError as exc:
             # Permissão / FS corrompido — propaga como last_error.
             raise RuntimeError(f"listdir {self._runtime_dir}: {exc}") from exc
+        heartbeats = self._slot_heartbeats()
         for path in entries:
-            snap = self._load_one(path, now=now)
+            snap = self._load_one(path, now=now, heartbeats=heartbeats)
             if snap is None:
                 continue
             # Conflito (dois state files apontando o mesmo PID — caso muito
@@ -5877,6 +5938,27 @@ class LocalInstancesProvider:
         self._gc_orphan_sockets(out)
         return out
 
+    def _slot_heartbeats(self) -> Dict[str, float]:
+        """`instance_id` → heartbeat (epoch s) lido lock-free de `registry.slots`.
+
+        Vazio sem `deile` importável ou sem arquivo de slots (processos
+        antigos, registry desabilitado) — aí vale o heartbeat do state file.
+        """
+        if _SLOT_TABLE_CLS is None:
+            return {}
+        if self._slots is None:
+            try:
+                self._slots = _SLOT_TABLE_CLS(
+                    self._runtime_dir / "registry.slots", create=False,
+                )
+            except (OSError, ValueError):
+                return {}
+        try:
+            return self._slots.heartbeats()
+        except Exception as exc:  # noqa: BLE001 — best-effort
+            logger.debug("slot heartbeats read failed: %s", exc)
+            return {}
+
     def _gc_orphan_sockets(self, alive: Dict[int, "InstanceSnapshot"]) -> None:
         """Remove sockets cujo state file sumiu (instance morta sem cleanup
         do socket — caso `kill -9` ou crash de event loop pré-atexit).
@@ -5895,8 +5977,9 @@ class LocalInstancesProvider:
                 continue
             self._unlink_quietly(sock)
 
-    def _load_one(self, path: Path,
-                  *, now: datetime) -> Optional[InstanceSnapshot]:
+    def _load_one(self, path: Path, *, now: datetime,
+                  heartbeats: Optional[Dict[str, float]] = None,
+                  ) -> Optional[InstanceSnapshot]:
         # Caminho preferencial (Fase 2): se o socket está vivo, puxamos
         # diretamente — estado mais novo que o último flush. O socket
         # path é derivado do nome do file: `<id>.json` ↔ `<id>.sock`.
@@ -5933,6 +6016,16 @@ class LocalInstancesProvider:
                 schema_version, _INSTANCE_SCHEMA_VERSION, path,
             )
             return None
+        slot_hb = (heartbeats or {}).get(str(payload.get("instance_id") or ""))
+        if slot_hb is not None:
+            # Heartbeat do slot mmap é mais novo que o do último flush do
+            # state file sempre que a instância ficou ociosa.
+            file_hb = _parse_iso_ts(payload.get("last_heartbeat_at"))
+            if file_hb is None or slot_hb > file_hb.timestamp():
+                payload = dict(payload)
+                payload["last_heartbeat_at"] = datetime.fromtimestamp(
+                    slot_hb, _UTC,
+                ).isoformat()
         snap = _snapshot_from_payload(
             payload, now=now, stale_after_s=self._stale_after_s,
         )
@@ -6825,6 +6918,9 @@ class PanelData:
     # Saldo proativo OpenRouter (issue #445, bônus). Independe do cluster (fala
     # direto com a API), mas só instanciado quando há chave configurada.
     openrouter_balance: Optional["OpenRouterBalanceProvider"] = None
+    # Followers ``kubectl logs -f`` compartilhados pelos providers de log
+    # (pipeline, workers, activity, provider_health). ``None`` em local-only.
+    log_hub: Optional[LogFollowerHub] = None
 
     @classmethod
     def from_context(cls, context: RuntimeContext) -> "PanelData":
@@ -6853,16 +6949,20 @@ class PanelData:
         # via `_check_enabled`/`Cache.fallback` quando o modo é local-only
         # (sem custo de subprocess `kubectl`).
         k8s_on = context.k8s_available
+        # Um único hub: o mesmo pod lido por WorkerProvider e
+        # ProviderHealthProvider compartilha processo e buffer.
+        log_hub = LogFollowerHub() if k8s_on else None
         return cls(
             context=context,
             pods=PodsProvider(namespace=context.namespace, enabled=k8s_on),
             pipeline=PipelineProvider(namespace=context.namespace,
                                       deploy=context.pipeline_deploy,
-                                      enabled=k8s_on),
+                                      enabled=k8s_on, log_hub=log_hub),
             workers=WorkerProvider(namespace=context.namespace,
                                    worker_deploy=context.worker_deploy,
                                    enabled=k8s_on,
-                                   costs=CostsProvider(db_path=context.usage_db)),
+                                   costs=CostsProvider(db_path=context.usage_db),
+                                   log_hub=log_hub),
             # `context.repo` pode vir vazio se o operador construiu o
             # ctx direto (sem `.detect()`) — resolve no fallback global.
             # forge_kind do contexto (lido do deployment do NS) decide se
@@ -6916,6 +7016,7 @@ class PanelData:
                 worker_deploy="claude-worker",
                 enabled=k8s_on,
                 costs=CostsProvider(db_path=context.usage_db),
+                log_hub=log_hub,
             ),
             # ClaudeWorkerInfoProvider only when k8s is available — it talks
             # to the claude-worker pod HTTP service.
@@ -6944,14 +7045,15 @@ class PanelData:
             activity=(
                 MultiSourceActivityProvider(namespace=context.namespace,
                                             enabled=k8s_on,
-                                            sources=_sources_from_settings())
+                                            sources=_sources_from_settings(),
+                                            log_hub=log_hub)
                 if k8s_on else None
             ),
             # ProviderHealthProvider (issue #445): só com k8s — varre logs de
             # toda a frota worker-class buscando corte por provedor LLM.
             provider_health=(
                 ProviderHealthProvider(namespace=context.namespace,
-                                       enabled=k8s_on)
+                                       enabled=k8s_on, log_hub=log_hub)
                 if k8s_on else None
             ),
             # OpenRouterBalanceProvider (issue #445, bônus): só quando há chave.
@@ -6961,6 +7063,7 @@ class PanelData:
                 OpenRouterBalanceProvider()
                 if _read_openrouter_key() else None
             ),
+            log_hub=log_hub,
         )
 
     @classmethod
@@ -6984,6 +7087,11 @@ class PanelData:
                           if p is not None)
         return base + optionals
 
+    def close(self) -> None:
+        """Encerra os followers ``kubectl logs -f`` (fim do painel)."""
+        if self.log_hub is not None:
+            self.log_hub.close()
+
     def force_refresh_all(self) -> None:
         """Hotkey [r]: marca todos os caches como vencidos sem bloquear.
 
@@ -7101,6 +7209,9 @@ class BackgroundRefresher:
             self._thread = None
         # `cancel_futures=True` evita esperar fetches já enfileirados.
         self._pool.shutdown(wait=False, cancel_futures=True)
+        # Followers de log vivem enquanto o refresher vive — sem isso os
+        # `kubectl logs -f` sobreviveriam ao fechamento do painel.
+        self._data.close()
 
     def __enter__(self) -> "BackgroundRefresher":
         self.start()
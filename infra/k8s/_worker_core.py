@@ -11,7 +11,8 @@ do CLI concreto (claude, opencode, aider, …):
 * Subprocess one-shot com persistência de stdout/stderr no PVC
   (``/v1/progress/{task_id}``) e timeout que mata o processo.
 * Helpers HTTP: Bearer middleware com whitelist e rate-limiter sliding-window.
-* Filesystem: ``dir_bytes`` e validação de ``task_id``.
+* Filesystem: ``dir_bytes``, contabilidade incremental de workspaces
+  (``WorkspaceAccounting``) e validação de ``task_id``.
 
 Constantes de TTL/heartbeat são passadas *por parâmetro* para que os servidores
 concretos possam monkeypatchá-las nos testes sem afetar este módulo. O
@@ -21,6 +22,7 @@ específico-do-CLI (argv, parsing de saída, auth/OAuth) fica no servidor concre
 from __future__ import annotations
 
 import asyncio
+import heapq
 import hmac
 import json
 import logging
@@ -30,7 +32,7 @@ import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
 from aiohttp import web
 
@@ -328,18 +330,249 @@ def pid_alive(pid: int) -> bool:
 
 
 def dir_bytes(path: Path) -> int:
-    """Soma recursiva dos tamanhos dos arquivos em *path*."""
-    total = 0
+    """Soma recursiva dos tamanhos dos arquivos em *path*.
+
+    ``os.scandir`` + ``lstat`` do próprio ``DirEntry`` (sem objetos ``Path``
+    por arquivo e sem seguir symlinks — um ``node_modules`` com links não é
+    contado duas vezes). Erros de I/O por entrada são ignorados.
+    """
+    walk = _SizeWalk(path)
+    walk.step(None)
+    return walk.total
+
+
+class _SizeWalk:
+    """Varredura de tamanho retomável: ``step(budget)`` processa até *budget*
+    entradas e devolve True quando a árvore foi inteiramente percorrida."""
+
+    __slots__ = ("total", "entries", "_stack")
+
+    def __init__(self, root: Path) -> None:
+        self.total = 0
+        self.entries = 0
+        self._stack = [os.fspath(root)]
+
+    def step(self, budget: Optional[int]) -> bool:
+        # O orçamento é checado entre diretórios: um diretório enorme é lido
+        # inteiro (estouro limitado ao tamanho de um diretório).
+        spent = 0
+        while self._stack:
+            if budget is not None and spent >= budget:
+                self.entries += spent
+                return False
+            current = self._stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        spent += 1
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                self._stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                self.total += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        self.entries += spent
+        return True
+
+
+@dataclass
+class WorkspaceUsage:
+    """Tamanho contabilizado de um workspace."""
+
+    path: str
+    bytes: int = 0
+    #: ``time.time()`` da última medição completa (0 = nunca medido).
+    measured_at: float = 0.0
+    #: Última atividade conhecida (fim de task / mtime do diretório) — chave LRU.
+    last_used: float = 0.0
+    #: Conteúdo mudou desde a última medição (task rodou).
+    dirty: bool = True
+    #: Task em andamento (entre :meth:`WorkspaceAccounting.mark_dirty` e
+    #: ``record``): uma medição no meio da task não o dá por limpo.
+    in_use: bool = False
+
+
+class WorkspaceAccounting:
+    """Contabilidade incremental de bytes por workspace (substitui full scans).
+
+    Os workspaces só mudam enquanto uma task roda com o lease: o servidor
+    chama :meth:`mark_dirty` ao adquirir o lease e :meth:`record` ao fim de
+    cada task, e o tamanho fica em memória. Enquanto a task roda, o
+    workspace continua sujo (re-medido a cada passada).
+    Cada passada de cleanup chama :meth:`refresh`, que registra diretórios
+    novos, esquece os que sumiram e remede os sujos/nunca medidos gastando no
+    máximo ``stat_budget`` entradas por passada — a varredura de um workspace
+    grande continua na passada seguinte de onde parou. :meth:`eviction_order`
+    devolve candidatos por heap (menos recentemente usado primeiro, maior
+    primeiro no empate) e :meth:`pop` entrega o tamanho já conhecido ao
+    remover, sem re-varrer a árvore antes do ``rmtree``.
+
+    Thread-safe: o cleanup roda em ``asyncio.to_thread`` e o registro de fim
+    de task no executor.
+    """
+
+    def __init__(self, *, stat_budget: int = 50_000) -> None:
+        self.stat_budget = stat_budget
+        self._usage: dict = {}
+        self._walks: dict = {}
+        self._lock = threading.Lock()
+        self.stats = {"records": 0, "refresh_stats": 0, "full_walks_avoided": 0}
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.fspath(path)
+
+    def record(self, path: Path, *, last_used: Optional[float] = None) -> int:
+        """Mede *path* por completo agora (fim de task). Retorna os bytes."""
+        size = dir_bytes(path)
+        now = time.time()
+        with self._lock:
+            usage = self._usage.setdefault(self._key(path), WorkspaceUsage(self._key(path)))
+            usage.bytes = size
+            usage.measured_at = now
+            usage.last_used = last_used if last_used is not None else now
+            usage.dirty = False
+            usage.in_use = False
+            self._walks.pop(usage.path, None)
+            self.stats["records"] += 1
+        return size
+
+    def record_soon(self, path: Path) -> "asyncio.Future":
+        """:meth:`record` no executor padrão; falha vai para o log."""
+        future = asyncio.get_running_loop().run_in_executor(None, self.record, path)
+
+        def _log_failure(fut: "asyncio.Future") -> None:
+            if not fut.cancelled() and fut.exception() is not None:
+                logger.warning("workspace accounting: record(%s) falhou: %s",
+                               path, fut.exception())
+
+        future.add_done_callback(_log_failure)
+        return future
+
+    def mark_dirty(self, path: Path) -> None:
+        """Task começou em *path*: re-mede nas próximas :meth:`refresh` até ``record``."""
+        with self._lock:
+            usage = self._usage.setdefault(self._key(path), WorkspaceUsage(self._key(path)))
+            usage.dirty = True
+            usage.in_use = True
+            usage.last_used = time.time()
+
+    def forget(self, path: Path) -> None:
+        with self._lock:
+            self._usage.pop(self._key(path), None)
+            self._walks.pop(self._key(path), None)
+
+    def pop(self, path: Path) -> int:
+        """Remove *path* da contabilidade e devolve seu tamanho.
+
+        Usa o valor contabilizado quando o workspace está limpo; só mede
+        (uma varredura) quando ele nunca foi medido ou está sujo.
+        """
+        with self._lock:
+            usage = self._usage.pop(self._key(path), None)
+            self._walks.pop(self._key(path), None)
+        if usage is not None and not usage.dirty:
+            self.stats["full_walks_avoided"] += 1
+            return usage.bytes
+        return dir_bytes(path)
+
+    def known_size(self, path: Path) -> Optional[int]:
+        """Tamanho contabilizado e limpo de *path*, ou None."""
+        with self._lock:
+            usage = self._usage.get(self._key(path))
+            if usage is None or usage.dirty:
+                return None
+            return usage.bytes
+
+    def refresh(self, root: Path, *, budget: Optional[int] = None) -> int:
+        """Sincroniza com os filhos de *root* e remede dentro do orçamento.
+
+        Returns: entradas de diretório visitadas nesta passada.
+        """
+        budget = self.stat_budget if budget is None else budget
+        try:
+            children = [
+                e for e in os.scandir(root)
+                if not e.name.startswith(".") and e.is_dir(follow_symlinks=False)
+            ]
+        except OSError:
+            return 0
+        present = {e.path: e for e in children}
+        with self._lock:
+            for key in [k for k in self._usage if os.path.dirname(k) == os.fspath(root)
+                        and k not in present]:
+                self._usage.pop(key, None)
+                self._walks.pop(key, None)
+            for key, entry in present.items():
+                if key not in self._usage:
+                    try:
+                        mtime = entry.stat(follow_symlinks=False).st_mtime
+                    except OSError:
+                        mtime = 0.0
+                    self._usage[key] = WorkspaceUsage(key, last_used=mtime)
+            # Primeiro as varreduras já em andamento, depois as nunca medidas,
+            # depois as sujas mais antigas.
+            pending = sorted(
+                (u for k, u in self._usage.items() if k in present and u.dirty),
+                key=lambda u: (u.path not in self._walks, u.measured_at, u.path),
+            )
+        spent = 0
+        for usage in pending:
+            if spent >= budget:
+                break
+            with self._lock:
+                walk = self._walks.setdefault(usage.path, _SizeWalk(Path(usage.path)))
+            before = walk.entries
+            done = walk.step(budget - spent)
+            spent += walk.entries - before
+            if done:
+                with self._lock:
+                    if self._walks.get(usage.path) is walk:
+                        del self._walks[usage.path]
+                        usage.bytes = walk.total
+                        usage.measured_at = time.time()
+                        usage.dirty = usage.in_use
+        self.stats["refresh_stats"] += spent
+        return spent
+
+    def total_bytes(self, root: Path, *, budget: Optional[int] = None) -> int:
+        """Soma contabilizada dos workspaces sob *root* (após :meth:`refresh`).
+
+        Workspaces ainda em medição entram com o último valor conhecido (0 se
+        nunca medidos) — estimativa que converge em poucas passadas.
+        """
+        self.refresh(root, budget=budget)
+        prefix = os.fspath(root)
+        with self._lock:
+            return sum(u.bytes for k, u in self._usage.items()
+                       if os.path.dirname(k) == prefix)
+
+    def eviction_order(self, paths: Iterable[Path]) -> list:
+        """*paths* ordenados para despejo: LRU primeiro, maior primeiro no empate."""
+        heap = []
+        with self._lock:
+            for path in paths:
+                usage = self._usage.get(self._key(path))
+                last_used = usage.last_used if usage else 0.0
+                size = usage.bytes if usage else 0
+                heapq.heappush(heap, (last_used, -size, self._key(path), path))
+        return [heapq.heappop(heap)[3] for _ in range(len(heap))]
+
+
+def filesystem_used_bytes(path: Path) -> Optional[int]:
+    """Bytes ocupados no filesystem de *path* via ``statvfs`` (O(1)).
+
+    Útil quando o PVC de trabalho é um volume dedicado: o agregado vem do
+    kernel sem tocar em nenhum arquivo. ``None`` se ``statvfs`` falhar.
+    """
     try:
-        for f in path.rglob("*"):
-            if f.is_file():
-                try:
-                    total += f.stat().st_size
-                except OSError:
-                    pass
-    except OSError:
-        pass
-    return total
+        st = os.statvfs(path)
+    except (OSError, AttributeError):
+        return None
+    return (st.f_blocks - st.f_bfree) * st.f_frsize
 
 
 # --------------------------------------------------------------------------- #
@@ -832,12 +1065,15 @@ def startup_cleanup(
     retention_days: int = 7,
     has_session: Optional[callable] = None,
     alive_pods: Optional[set] = None,
+    accounting: Optional[WorkspaceAccounting] = None,
 ) -> dict:
     """Remove leases stale e workdirs abandonados sob *root*. Idempotente.
 
     ``has_session``: predicado ``(workdir) -> bool`` p/ preservar sessões ativas
     (ex.: JSONL do claude). ``None`` → elegível só por idade (CLI workers sem
     resume). ``alive_pods``: recuperação proativa de leases cujo pod morreu.
+    ``accounting``: quando informado, ``bytes_freed`` usa o tamanho já
+    contabilizado do workdir em vez de varrê-lo antes do ``rmtree``.
 
     Returns: dict com ``leases_removed``, ``workdirs_removed``, ``bytes_freed``,
     ``errors``.
@@ -897,7 +1133,7 @@ def startup_cleanup(
             remove_reason = f"older than {retention_days}d"
 
         if remove_reason:
-            size = dir_bytes(workdir)
+            size = accounting.pop(workdir) if accounting is not None else dir_bytes(workdir)
             try:
                 shutil.rmtree(workdir)
                 workdirs_removed += 1
@@ -921,6 +1157,217 @@ def startup_cleanup(
     }
 
 
+# --------------------------------------------------------------------------- #
+# Registro de processos do CLI (sem varrer /proc a cada consulta)
+# --------------------------------------------------------------------------- #
+#
+# Status, kill e presença perguntavam "qual PID roda a sessão X?" / "quantos CLIs
+# vivos?" lendo ``/proc/<pid>/cmdline`` de TODOS os processos a cada chamada.
+# O registro anota o PID no spawn (``run_subprocess_with_progress``) e o remove
+# quando o filho termina — via o child watcher do asyncio (``proc.wait()``)
+# para filhos próprios, via ``pidfd`` no event loop para processos adotados.
+# A varredura de ``/proc`` sobra só como recuperação (ex.: processos herdados
+# de antes de um restart), limitada a uma por ``rescan_interval_s``.
+
+
+@dataclass
+class TrackedProcess:
+    """Um processo conhecido do registro."""
+
+    pid: int
+    cmdline: bytes  # argv unido por espaços (mesmo formato da busca em /proc)
+    argv0: str
+    started_at: float
+    adopted: bool = False  # descoberto na varredura, não spawnado por nós
+
+
+def _read_cmdline(proc_root: Path, pid: int) -> Optional[bytes]:
+    try:
+        raw = (proc_root / str(pid) / "cmdline").read_bytes()
+    except OSError:
+        return None
+    return raw.replace(b"\0", b" ")
+
+
+def _release_pidfd(loop: asyncio.AbstractEventLoop, fd: int) -> None:
+    """Tira ``fd`` do seletor de ``loop`` e o fecha (na thread do loop)."""
+    if not loop.is_closed():
+        try:
+            loop.remove_reader(fd)
+        except (RuntimeError, ValueError):
+            pass
+    try:
+        os.close(fd)
+    except OSError:
+        pass
+
+
+class ProcessRegistry:
+    """PIDs dos processos do CLI, mantidos por eventos (ver bloco acima).
+
+    ``adopt_filter`` decide quais cmdlines a varredura de recuperação adota
+    (default: todas); como ``rescan_interval_s``, é atributo público para o
+    servidor ajustar o registro compartilhado. Thread-safe — consultado
+    também de ``to_thread``.
+    """
+
+    def __init__(
+        self,
+        *,
+        rescan_interval_s: float = 30.0,
+        adopt_filter: Optional[Callable[[bytes], bool]] = None,
+    ) -> None:
+        self.rescan_interval_s = rescan_interval_s
+        self.adopt_filter = adopt_filter
+        self._procs: Dict[int, TrackedProcess] = {}
+        self._pidfds: Dict[int, Tuple[asyncio.AbstractEventLoop, int]] = {}
+        self._lock = threading.Lock()
+        self._scanned_root: Optional[Path] = None
+        self._scanned_at = float("-inf")
+        self.stats = {"registered": 0, "reaped": 0, "scans": 0}
+
+    # -------------------------------------------------------------- eventos
+
+    def register(self, pid: int, args: Iterable) -> None:
+        """Anota ``pid`` (com seu argv) no spawn."""
+        argv = [str(a) for a in args]
+        self._add(TrackedProcess(
+            pid=pid, cmdline=" ".join(argv).encode("utf-8", "replace") + b" ",
+            argv0=argv[0] if argv else "", started_at=time.time(),
+        ))
+
+    def _add(self, entry: TrackedProcess) -> None:
+        with self._lock:
+            self._procs[entry.pid] = entry
+            self.stats["registered"] += 1
+        if entry.adopted:
+            self._watch_pidfd(entry.pid)
+
+    def unregister(self, pid: int) -> None:
+        """Remove ``pid`` (o processo terminou)."""
+        with self._lock:
+            if self._procs.pop(pid, None) is not None:
+                self.stats["reaped"] += 1
+            watch = self._pidfds.pop(pid, None)
+        if watch is None:
+            return
+        loop, fd = watch
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop or loop.is_closed():
+            _release_pidfd(loop, fd)
+            return
+        # Fora da thread do loop: o fd ainda está no seletor; fechá-lo aqui
+        # deixaria um reader órfão disparar quando o número fosse reutilizado.
+        try:
+            loop.call_soon_threadsafe(_release_pidfd, loop, fd)
+        except RuntimeError:  # loop fechou no meio do caminho
+            _release_pidfd(loop, fd)
+
+    def _watch_pidfd(self, pid: int) -> None:
+        """Notificação de saída de processo não-filho (Linux ≥ 5.3)."""
+        pidfd_open = getattr(os, "pidfd_open", None)
+        if pidfd_open is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sem loop: validação preguiçosa em _alive
+        try:
+            fd = pidfd_open(pid)
+        except OSError:
+            return
+        with self._lock:
+            self._pidfds[pid] = (loop, fd)
+        loop.add_reader(fd, self.unregister, pid)
+
+    # ------------------------------------------------------------ consultas
+
+    def _alive(self, entry: TrackedProcess, proc_root: Path) -> bool:
+        if not entry.adopted or entry.pid in self._pidfds:
+            return True  # filhos/pidfd: a saída já remove a entrada
+        # Adotado sem pidfd: um read confirma que o PID não foi reciclado.
+        return _read_cmdline(proc_root, entry.pid) == entry.cmdline
+
+    def _live(self, proc_root: Path) -> list:
+        with self._lock:
+            entries = list(self._procs.values())
+        live = []
+        for entry in entries:
+            if self._alive(entry, proc_root):
+                live.append(entry)
+            else:
+                self.unregister(entry.pid)
+        return live
+
+    def recover(self, proc_root: Path, *, force: bool = False) -> bool:
+        """Varredura de ``/proc`` que adota processos desconhecidos.
+
+        No máximo uma por ``rescan_interval_s`` (salvo ``force``); trocar de
+        ``proc_root`` descarta os adotados da raiz anterior. Returns True se
+        varreu.
+        """
+        now = time.monotonic()
+        with self._lock:
+            stale = []
+            if proc_root != self._scanned_root:
+                stale = [p for p, e in self._procs.items() if e.adopted]
+                self._scanned_root = proc_root
+            elif not force and now - self._scanned_at < self.rescan_interval_s:
+                return False
+            self._scanned_at = now
+            self.stats["scans"] += 1
+        for pid in stale:
+            self.unregister(pid)
+        with self._lock:
+            known = set(self._procs)
+        try:
+            names = os.listdir(proc_root)
+        except OSError:
+            return True
+        for name in names:
+            if not name.isdigit() or int(name) in known:
+                continue
+            cmdline = _read_cmdline(proc_root, int(name))
+            if not cmdline or (
+                    self.adopt_filter is not None and not self.adopt_filter(cmdline)):
+                continue
+            argv0 = cmdline.split(b" ", 1)[0].decode("utf-8", "replace")
+            self._add(TrackedProcess(pid=int(name), cmdline=cmdline, argv0=argv0,
+                                     started_at=time.time(), adopted=True))
+        return True
+
+    def find(self, needle: str, *, proc_root: Path = Path("/proc")) -> Optional[int]:
+        """PID cujo cmdline contém ``needle``; varre ``/proc`` só em miss (limitado)."""
+        if not needle:
+            return None
+        target = needle.encode("utf-8")
+        for attempt in range(2):
+            for entry in self._live(proc_root):
+                if target in entry.cmdline:
+                    return entry.pid
+            if attempt or not self.recover(proc_root):
+                return None
+        return None
+
+    def count(
+        self,
+        predicate: Callable[[TrackedProcess], bool],
+        *,
+        proc_root: Path = Path("/proc"),
+    ) -> int:
+        """Processos vivos que satisfazem ``predicate`` (recuperação limitada)."""
+        self.recover(proc_root)
+        return sum(1 for entry in self._live(proc_root) if predicate(entry))
+
+
+#: Registro do processo worker: :func:`run_subprocess_with_progress` anota cada
+#: spawn aqui por default.
+PROCESS_REGISTRY = ProcessRegistry()
+
+
 # --------------------------------------------------------------------------- #
 # Execução de subprocess one-shot com persistência de progresso
 # --------------------------------------------------------------------------- #
@@ -948,6 +1395,7 @@ async def run_subprocess_with_progress(
     timeout: int,
     lease_path: Optional[Path] = None,
     root: Optional[Path] = None,
+    registry: Optional[ProcessRegistry] = None,
 ) -> SubprocessResult:
     """Spawn do subprocess do CLI com persistência de stdout/stderr para o PVC.
 
@@ -958,6 +1406,9 @@ async def run_subprocess_with_progress(
     spawnear e limpa ao terminar — o observador distingue "lease vivo por
     heartbeat" de "CLI rodando agora" sem varrer ``/proc``.
 
+    O PID fica em ``registry`` (default :data:`PROCESS_REGISTRY`) até o filho
+    ser colhido — consultas de PID/contagem do servidor não varrem ``/proc``.
+
     ``root`` é omitível; default via ``DEILE_CLAUDE_WORKER_ROOT``.
     """
     start = time.monotonic()
@@ -977,11 +1428,16 @@ async def run_subprocess_with_progress(
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
     )
+    if registry is None:
+        registry = PROCESS_REGISTRY
+    registry.register(proc.pid, args)
 
     if lease_path is not None:
         await update_lease_subprocess_pid(lease_path, proc.pid)
 
     try:
+        # ``communicate``/``wait`` retornam quando o child watcher do asyncio
+        # colhe o filho — é esse evento que tira o PID do registro.
         stdout_b, stderr_b = await asyncio.wait_for(
             proc.communicate(), timeout=timeout,
         )
@@ -996,6 +1452,8 @@ async def run_subprocess_with_progress(
             stderr=f"subprocess timed out after {timeout}s",
             duration_seconds=duration,
         )
+    finally:
+        registry.unregister(proc.pid)
 
     duration = time.monotonic() - start
     stdout = stdout_b.decode("utf-8", "replace")
@@ -1095,6 +1553,9 @@ __all__ = [
     "classify_provider_error",
     "pid_alive",
     "dir_bytes",
+    "WorkspaceUsage",
+    "WorkspaceAccounting",
+    "filesystem_used_bytes",
     "acquire_lease",
     "update_lease_subprocess_pid",
     "release_lease",
@@ -1107,6 +1568,9 @@ __all__ = [
     "git_fallback_commit",
     "git_push",
     "startup_cleanup",
+    "TrackedProcess",
+    "ProcessRegistry",
+    "PROCESS_REGISTRY",
     "SubprocessResult",
     "run_subprocess_with_progress",
     "make_bearer_auth_mw",
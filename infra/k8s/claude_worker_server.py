@@ -59,10 +59,12 @@ try:
     from jsonl_cost import aggregate_jsonl as _aggregate_jsonl
     from jsonl_cost import context_window_of_model as _context_window_of_model
     from jsonl_cost import summarize_jsonl as _summarize_jsonl
+    from jsonl_cost import SessionCatalog as _SessionCatalog
 except Exception:  # pragma: no cover — sibling sempre presente in-pod
     _aggregate_jsonl = None
     _summarize_jsonl = None
     _context_window_of_model = None
+    _SessionCatalog = None
 
 logger = logging.getLogger("deile.claude_worker_server")
 
@@ -394,7 +396,7 @@ def startup_cleanup(root: Optional[Path] = None) -> dict:
             remove_reason = f"older than {_CLEANUP_RETENTION_DAYS}d"
 
         if remove_reason:
-            size = _dir_bytes(workdir)
+            size = _WORKSPACE_ACCOUNTING.pop(workdir)
             try:
                 shutil.rmtree(workdir)
                 workdirs_removed += 1
@@ -733,6 +735,20 @@ def _load_session_meta(task_id: str) -> Optional[dict]:
 #: monkeypatcham essa variável apontando pra fake dir.
 _PROC_ROOT: str = "/proc"
 
+#: Intervalo mínimo entre varreduras de recuperação do ``/proc`` (s). Fora
+#: delas, PID/contagem vêm do registro mantido no spawn/término.
+_PROC_RESCAN_INTERVAL_S: float = float(
+    os.environ.get("DEILE_CLAUDE_WORKER_PROC_RESCAN_S", "30"),
+)
+
+#: Processos ``claude`` deste pod: registrados no spawn por
+#: :func:`run_subprocess_with_progress`, removidos quando o child watcher colhe
+#: o filho; a varredura de recuperação (ex.: pós-restart) só adota cmdlines
+#: que mencionam ``claude``.
+_CLAUDE_PROCESSES = _core.PROCESS_REGISTRY
+_CLAUDE_PROCESSES.rescan_interval_s = _PROC_RESCAN_INTERVAL_S
+_CLAUDE_PROCESSES.adopt_filter = lambda cmdline: b"claude" in cmdline
+
 
 #: Janela em segundos pra considerar uma sessão claude "viva" via mtime do JSONL.
 #: 60s cobre o caso de claude levando até 1 turno completo (incluindo tools)
@@ -763,21 +779,10 @@ def _is_session_jsonl_recently_active(
     if not session_id:
         return False
     try:
-        home = Path(os.environ.get("HOME", "/home/claude"))
-        projects_dir = home / ".claude" / "projects"
-        if not projects_dir.is_dir():
+        jsonl = _locate_session_jsonl(session_id)
+        if jsonl is None:
             return False
-        cutoff = time.time() - threshold_s
-        for sub in projects_dir.iterdir():
-            if not sub.is_dir():
-                continue
-            jsonl = sub / f"{session_id}.jsonl"
-            try:
-                if jsonl.exists() and jsonl.stat().st_mtime > cutoff:
-                    return True
-            except OSError:
-                continue
-        return False
+        return jsonl.stat().st_mtime > time.time() - threshold_s
     except OSError:
         return False
 
@@ -880,34 +885,17 @@ def _find_task_id_for_session(session_id: str) -> Optional[str]:
 def _find_claude_pid(session_id: str) -> Optional[int]:
     """Return the PID of the running ``claude`` for ``session_id``, or None.
 
-    Same scan as :func:`_is_claude_process_alive`; broken out so the kill
+    Same lookup as :func:`_is_claude_process_alive`; broken out so the kill
     endpoint (issue #347) can target the discovered PID without needing
     the session metadata to remember it (avoids a race between persisting
     the PID and the actual fork).
+
+    Answered from :data:`_CLAUDE_PROCESSES`; ``/proc`` is only scanned on a
+    miss, at most once per ``_PROC_RESCAN_INTERVAL_S``.
     """
     if not session_id:
         return None
-    proc_root = Path(_PROC_ROOT)
-    if not proc_root.is_dir():
-        return None
-    target = session_id.encode("utf-8")
-    try:
-        for proc_dir in proc_root.iterdir():
-            if not proc_dir.name.isdigit():
-                continue
-            cmdline_path = proc_dir / "cmdline"
-            try:
-                cmdline = cmdline_path.read_bytes().replace(b"\0", b" ")
-            except OSError:
-                continue
-            if target in cmdline:
-                try:
-                    return int(proc_dir.name)
-                except ValueError:
-                    return None
-    except OSError:
-        return None
-    return None
+    return _CLAUDE_PROCESSES.find(session_id, proc_root=Path(_PROC_ROOT))
 
 
 # --- Issue #347 follow-up: smart review resume helpers ----------------------
@@ -934,17 +922,9 @@ def _resolve_jsonl_path(session_id: str, workspace: Path) -> Optional[Path]:
     candidate = home / ".claude" / "projects" / f"-{workspace_hash}" / f"{session_id}.jsonl"
     if candidate.exists():
         return candidate
-    # Fallback: lista o dir e procura pelo session_id (algumas versões
-    # do claude CLI normalizam hash de forma diferente).
-    projects_dir = home / ".claude" / "projects"
-    if projects_dir.is_dir():
-        for sub in projects_dir.iterdir():
-            if not sub.is_dir():
-                continue
-            f = sub / f"{session_id}.jsonl"
-            if f.exists():
-                return f
-    return None
+    # Fallback: algumas versões do claude CLI normalizam o hash de forma
+    # diferente — lookup no catálogo de sessões (relista só dirs mudados).
+    return _locate_session_jsonl(session_id)
 
 
 def _estimate_context_tokens(session_id: str, workspace: Path) -> int:
@@ -960,38 +940,49 @@ def _estimate_context_tokens(session_id: str, workspace: Path) -> int:
     (visto 11,5M tokens numa sessão cujo contexto real era ~70K, o que disparava
     promoção-a-fresh espúria a cada review longa). Retorna 0 quando o JSONL está
     ausente/ilegível — fallback conservador (não promove por falha de medição).
+
+    O pico fica no catálogo de sessões: cada resume lê só os bytes anexados
+    desde a medição anterior, não o transcript inteiro.
     """
     jsonl_path = _resolve_jsonl_path(session_id, workspace)
     if jsonl_path is None:
         return 0
-    peak = 0
     try:
-        with jsonl_path.open("r", encoding="utf-8", errors="replace") as f:
-            for line in f:
-                line = line.strip()
-                if not line or not line.startswith("{"):
-                    continue
-                try:
-                    d = json.loads(line)
-                except (json.JSONDecodeError, ValueError):
-                    continue
-                msg = d.get("message") if isinstance(d, dict) else None
-                usage = (msg or {}).get("usage") if isinstance(msg, dict) else None
-                if not isinstance(usage, dict):
-                    usage = d.get("usage") if isinstance(d, dict) else None
-                if not isinstance(usage, dict):
-                    continue
-                ctx = 0
-                for k in ("input_tokens", "cache_read_input_tokens",
-                          "cache_creation_input_tokens"):
-                    v = usage.get(k)
-                    if isinstance(v, (int, float)):
-                        ctx += int(v)
-                if ctx > peak:
-                    peak = ctx
+        catalog = _session_catalog()
+        if catalog is None:
+            return _scan_context_peak(jsonl_path)
+        return catalog.context_peak(str(jsonl_path))
     except OSError as exc:
         logger.warning("context token estimate failed for %s: %s", session_id, exc)
         return 0
+
+
+def _scan_context_peak(jsonl_path: Path) -> int:
+    """Pico de contexto relendo o JSONL inteiro (sem ``jsonl_cost`` na imagem)."""
+    peak = 0
+    with jsonl_path.open("r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line or not line.startswith("{"):
+                continue
+            try:
+                d = json.loads(line)
+            except (json.JSONDecodeError, ValueError):
+                continue
+            msg = d.get("message") if isinstance(d, dict) else None
+            usage = (msg or {}).get("usage") if isinstance(msg, dict) else None
+            if not isinstance(usage, dict):
+                usage = d.get("usage") if isinstance(d, dict) else None
+            if not isinstance(usage, dict):
+                continue
+            ctx = 0
+            for k in ("input_tokens", "cache_read_input_tokens",
+                      "cache_creation_input_tokens"):
+                v = usage.get(k)
+                if isinstance(v, (int, float)):
+                    ctx += int(v)
+            if ctx > peak:
+                peak = ctx
     return peak
 
 
@@ -1317,24 +1308,39 @@ _PRESENCE_TTL_S: int = int(
 )
 
 
+#: Máximo de entradas de diretório visitadas por passada de cleanup para
+#: re-medir workspaces sujos/novos (o resto continua na passada seguinte).
+_WORKSPACE_STAT_BUDGET: int = int(
+    os.environ.get("DEILE_CLAUDE_WORKER_WORKSPACE_STAT_BUDGET", "50000"),
+)
+
+#: Fonte do uso agregado do PVC: ``accounting`` (soma dos tamanhos
+#: contabilizados por workspace) ou ``statvfs`` (uso do filesystem inteiro,
+#: O(1) — indicado quando o volume de trabalho é dedicado).
+_WORKSPACE_USAGE_SOURCE: str = os.environ.get(
+    "DEILE_CLAUDE_WORKER_WORKSPACE_USAGE_SOURCE", "accounting",
+).strip().lower()
+
+#: Tamanhos por workspace mantidos entre passadas (registrados ao fim de cada
+#: task; ver :class:`_worker_core.WorkspaceAccounting`).
+_WORKSPACE_ACCOUNTING = _core.WorkspaceAccounting(stat_budget=_WORKSPACE_STAT_BUDGET)
+
+
 def _workspace_total_bytes(root: Path) -> int:
     """Estimativa rápida do tamanho total ocupado pela árvore de workdirs.
 
-    Usa ``os.walk`` + ``st_size`` em vez de ``du -sb`` para não depender de
-    um binário externo. Erros de I/O por entrada individual são ignorados
-    (best-effort — o cleanup nunca deve abortar por um arquivo inacessível).
+    Não varre a árvore a cada passada: soma os tamanhos contabilizados por
+    :data:`_WORKSPACE_ACCOUNTING`, que re-mede apenas workspaces novos ou
+    sujos dentro de :data:`_WORKSPACE_STAT_BUDGET` entradas. Com
+    ``DEILE_CLAUDE_WORKER_WORKSPACE_USAGE_SOURCE=statvfs`` usa o uso do
+    filesystem (``statvfs``). Erros de I/O são ignorados (best-effort — o
+    cleanup nunca deve abortar por um arquivo inacessível).
     """
-    total = 0
-    try:
-        for dirpath, _dirs, files in os.walk(root):
-            for f in files:
-                try:
-                    total += os.stat(os.path.join(dirpath, f)).st_size
-                except OSError:
-                    continue
-    except OSError:
-        return total
-    return total
+    if _WORKSPACE_USAGE_SOURCE == "statvfs":
+        used = _core.filesystem_used_bytes(root)
+        if used is not None:
+            return used
+    return _WORKSPACE_ACCOUNTING.total_bytes(root)
 
 
 def _workspace_is_stale(
@@ -1504,18 +1510,13 @@ async def _presence_loop(root: Path) -> None:
 
 
 def _remove_workspace_tree(workspace: Path) -> int:
-    """Remove ``workspace`` recursivamente. Retorna bytes liberados (best-effort)."""
+    """Remove ``workspace`` recursivamente. Retorna bytes liberados (best-effort).
+
+    O tamanho vem da contabilidade quando o workspace já foi medido — só
+    varre a árvore antes do ``rmtree`` se ele nunca foi medido ou está sujo.
+    """
     import shutil as _sh  # local import (top-level só importa quando precisa)
-    bytes_freed = 0
-    try:
-        for dirpath, _dirs, files in os.walk(workspace):
-            for f in files:
-                try:
-                    bytes_freed += os.stat(os.path.join(dirpath, f)).st_size
-                except OSError:
-                    continue
-    except OSError:
-        pass
+    bytes_freed = _WORKSPACE_ACCOUNTING.pop(workspace)
     try:
         _sh.rmtree(workspace, ignore_errors=True)
     except OSError as exc:  # pragma: no cover — rmtree(ignore_errors) já tolera
@@ -1547,14 +1548,18 @@ def _cleanup_stale_workspaces(
         logger.warning("workspace cleanup: cannot list root %s: %s", root, exc)
         return summary
 
+    # ``used`` só é acompanhado no modo automático com TTL agressivo: aí o
+    # despejo para assim que o uso volta para baixo do cap.
+    used: Optional[int] = None
     if threshold_s is None:
         # Modo automático: aplica TTL agressivo se o uso passou do cap.
-        used = _workspace_total_bytes(root)
-        if _WORKSPACE_AGGRESSIVE_BYTES > 0 and used > _WORKSPACE_AGGRESSIVE_BYTES:
+        total = _workspace_total_bytes(root)
+        if _WORKSPACE_AGGRESSIVE_BYTES > 0 and total > _WORKSPACE_AGGRESSIVE_BYTES:
             threshold_s = _WORKSPACE_AGGRESSIVE_TTL_S
+            used = total
             logger.warning(
                 "workspace cleanup: uso=%d bytes > cap=%d — aplicando TTL "
-                "agressivo (%ds)", used, _WORKSPACE_AGGRESSIVE_BYTES, threshold_s,
+                "agressivo (%ds)", total, _WORKSPACE_AGGRESSIVE_BYTES, threshold_s,
             )
         else:
             threshold_s = _WORKSPACE_STALE_TTL_S
@@ -1562,15 +1567,26 @@ def _cleanup_stale_workspaces(
 
     alive_pods = _get_alive_pods(root)
     now = time.time()
-    for child in children:
-        if not child.is_dir() or child.name.startswith("."):
-            continue
+    candidates = [
+        child for child in children
+        if child.is_dir() and not child.name.startswith(".")
         # Só remove diretórios que parecem task_id (path-traversal containment).
-        if not _TASK_ID_RE.fullmatch(child.name):
-            continue
+        and _TASK_ID_RE.fullmatch(child.name)
+    ]
+    # Heap LRU (menos recentemente usado primeiro, maior primeiro no empate):
+    # sob pressão de espaço os workspaces mais frios saem antes.
+    for child in _WORKSPACE_ACCOUNTING.eviction_order(candidates):
         summary["inspected"] += 1
         if not _workspace_is_stale(child, threshold_s=threshold_s, now=now, alive_pods=alive_pods):
             continue
+        if (
+            used is not None and used <= _WORKSPACE_AGGRESSIVE_BYTES
+            and not _workspace_is_stale(
+                child, threshold_s=_WORKSPACE_STALE_TTL_S, now=now, alive_pods=alive_pods,
+            )
+        ):
+            # Já abaixo do cap: só o TTL padrão vale para o restante.
+            continue
         # Fix #520 — re-verifica o lease imediatamente antes do rmtree para
         # evitar TOCTOU: um dispatch pode ter adquirido o lease entre o scan
         # acima e este ponto (latência de I/O, preempção de thread, etc.).
@@ -1585,6 +1601,8 @@ def _cleanup_stale_workspaces(
         bytes_freed = _remove_workspace_tree(child)
         summary["removed"] += 1
         summary["bytes_freed"] += bytes_freed
+        if used is not None:
+            used -= bytes_freed
         logger.info(
             "workspace cleanup removed task_id=%s bytes=%d threshold_s=%d",
             child.name, bytes_freed, threshold_s,
@@ -1617,34 +1635,11 @@ async def _workspace_cleanup_loop(root: Path) -> None:
 
 
 def _count_claude_processes() -> int:
-    """Count running claude processes via psutil (preferred) or pgrep fallback."""
-    try:
-        import psutil  # optional dep; absent outside cluster
-        count = 0
-        for proc in psutil.process_iter(["name", "cmdline"]):
-            try:
-                name = proc.info.get("name") or ""
-                cmdline = proc.info.get("cmdline") or []
-                if name.startswith("claude") or (
-                    cmdline and str(cmdline[0]).endswith("/claude")
-                ):
-                    count += 1
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        return count
-    except ImportError:
-        pass
-    # Fallback via pgrep (POSIX).
-    try:
-        result = subprocess.run(
-            ["pgrep", "-fc", "^claude"],
-            capture_output=True, text=True, timeout=5,
-        )
-        if result.returncode in (0, 1):  # 1 = no processes found
-            return int(result.stdout.strip() or "0")
-    except (OSError, ValueError, subprocess.TimeoutExpired):
-        pass
-    return 0
+    """Count running claude processes (registry + throttled ``/proc`` recovery)."""
+    return _CLAUDE_PROCESSES.count(
+        lambda p: os.path.basename(p.argv0).startswith("claude"),
+        proc_root=Path(_PROC_ROOT),
+    )
 
 
 # --------------------------------------------------------------------------- #
@@ -2345,6 +2340,9 @@ async def dispatch_handler(request: web.Request) -> web.Response:
             ),
             "task_id": task_id,
         }, status=409)
+    # A task vai mexer no workspace: o tamanho contabilizado deixa de valer
+    # até o ``record`` do fim da task.
+    _WORKSPACE_ACCOUNTING.mark_dirty(workspace)
 
     stop_hb = asyncio.Event()
     hb_task = asyncio.create_task(
@@ -2447,6 +2445,9 @@ async def dispatch_handler(request: web.Request) -> web.Response:
         except Exception:
             pass
         await _release_lease(workspace / ".lease.json")
+        # Workspace só muda com a task rodando: contabiliza o tamanho agora
+        # (fora do event loop) para o cleanup não precisar varrê-lo.
+        _WORKSPACE_ACCOUNTING.record_soon(workspace)
 
     async def _run_and_finalize() -> None:
         """Executa o subprocess e persiste o resultado final na session.json.
@@ -3435,6 +3436,54 @@ def _projects_dir() -> Path:
     return home / ".claude" / "projects"
 
 
+#: Catálogos de sessão por dir de projetos (HOME pode mudar em testes/dev).
+_SESSION_CATALOGS: dict = {}
+_SESSION_CATALOGS_LOCK = threading.Lock()
+
+
+def _session_catalog_path(projects_dir: Path) -> Path:
+    """Arquivo de estado do catálogo de sessões (no PVC, ao lado do ledger)."""
+    env = os.environ.get("DEILE_CLAUDE_SESSION_CATALOG_PATH")
+    if env and projects_dir == _projects_dir():
+        return Path(env)
+    return projects_dir.parent / "session-catalog.json"
+
+
+def _session_catalog(projects_dir: Optional[Path] = None):
+    """``jsonl_cost.SessionCatalog`` de ``projects_dir`` (default: o do HOME).
+
+    Um por processo e por dir, carregado do estado persistido na primeira
+    consulta e salvo a cada ciclo do harvester. None sem ``jsonl_cost``.
+    """
+    if _SessionCatalog is None:
+        return None
+    if projects_dir is None:
+        projects_dir = _projects_dir()
+    key = str(projects_dir)
+    with _SESSION_CATALOGS_LOCK:
+        catalog = _SESSION_CATALOGS.get(key)
+        if catalog is None:
+            catalog = _SESSION_CATALOGS[key] = _SessionCatalog(
+                key, str(_session_catalog_path(projects_dir)))
+        return catalog
+
+
+def _locate_session_jsonl(session_id: str) -> Optional[Path]:
+    """JSONL de ``session_id`` em qualquer dir de projeto (lookup no catálogo)."""
+    catalog = _session_catalog()
+    if catalog is not None:
+        found = catalog.locate(session_id)
+        return Path(found) if found else None
+    projects_dir = _projects_dir()
+    if not projects_dir.is_dir():
+        return None
+    for sub in projects_dir.iterdir():
+        f = sub / f"{session_id}.jsonl"
+        if f.is_file():
+            return f
+    return None
+
+
 def _cost_ledger_path() -> Path:
     """Caminho do ledger de custo durável (no PVC, sobrevive à poda)."""
     env = os.environ.get("DEILE_CLAUDE_COST_LEDGER_PATH")
@@ -3457,6 +3506,9 @@ def _orphan_jsonl_scan(
     (piso de 1h) — ``now - max(retention_days*86400, grace_s)``. Assim, mesmo
     uma retenção mal-configurada para 0 nunca ceifa dentro da janela TOCTOU.
 
+    A listagem vem do catálogo de sessões: só dirs com ``mtime`` alterado
+    são relistados, e o tamanho de cada dir é medido uma vez por ``mtime``.
+
     Returns ``(list[Path], candidate_bytes)``.
     """
     orphans: list = []
@@ -3467,12 +3519,18 @@ def _orphan_jsonl_scan(
         retention_days = _JSONL_RETENTION_DAYS
     retention_s = max(0, retention_days) * 86400
     cutoff = now - max(retention_s, grace_s)
-    try:
-        children = list(projects_dir.iterdir())
-    except OSError:
-        return orphans, candidate_bytes
-    for pdir in children:
-        if not pdir.is_dir() or _PROJECT_MARKER not in pdir.name:
+    catalog = _session_catalog(projects_dir)
+    if catalog is not None:
+        # Relista só dirs cujo mtime mudou; tamanho medido uma vez por mtime.
+        catalog.sync()
+        children = [(projects_dir / p["name"], p["mtime"]) for p in catalog.projects()]
+    else:
+        try:
+            children = [(p, None) for p in projects_dir.iterdir() if p.is_dir()]
+        except OSError:
+            return orphans, candidate_bytes
+    for pdir, mtime in children:
+        if _PROJECT_MARKER not in pdir.name:
             continue
         task_id = pdir.name.split(_PROJECT_MARKER)[-1]
         if not _TASK_ID_RE.fullmatch(task_id):
@@ -3481,13 +3539,18 @@ def _orphan_jsonl_scan(
         if (work_root / task_id).exists():
             continue
         # Retenção + grace: só órfãos sem modificação além do cutoff.
-        try:
-            if pdir.stat().st_mtime > cutoff:
+        if mtime is None:
+            try:
+                mtime = pdir.stat().st_mtime
+            except OSError:
                 continue
-        except OSError:
+        if mtime > cutoff:
             continue
         orphans.append(pdir)
-        candidate_bytes += _dir_size(pdir)
+        if catalog is not None:
+            candidate_bytes += catalog.project_bytes(pdir.name)
+        else:
+            candidate_bytes += _dir_size(pdir)
     return orphans, candidate_bytes
 
 
@@ -3557,7 +3620,10 @@ def _harvest_and_prune_orphan_jsonl(
         "candidate_bytes": candidate_bytes,
         "errors": [],
     }
+    catalog = _session_catalog(projects_dir)
     if dry_run or not orphans:
+        if not dry_run and catalog is not None:
+            catalog.save()
         return result
 
     # Fail-safe cardinal: NUNCA podar dados não colhidos. Sem o extrator
@@ -3588,7 +3654,10 @@ def _harvest_and_prune_orphan_jsonl(
         # tokens). Qualquer falha de agregação/escrita preserva o dir inteiro.
         dir_fully_accounted = True
         try:
-            jsonls = sorted(pdir.glob("*.jsonl"))
+            if catalog is not None:
+                jsonls = [Path(p) for p in catalog.project_sessions(pdir.name)]
+            else:
+                jsonls = sorted(pdir.glob("*.jsonl"))
         except OSError as exc:
             result["errors"].append(f"glob {pdir}: {exc}")
             continue
@@ -3651,15 +3720,20 @@ def _harvest_and_prune_orphan_jsonl(
             harvested.add(sid)
         if not dir_fully_accounted:
             continue  # preserva o dir: havia custo não contabilizado
-        size = _dir_size(pdir)
+        size = catalog.project_bytes(pdir.name) if catalog is not None else _dir_size(pdir)
         try:
             shutil.rmtree(pdir, ignore_errors=True)
             if not pdir.exists():
                 result["jsonl_dirs_removed"] += 1
                 result["bytes_freed"] += size
+                if catalog is not None:
+                    catalog.forget_project(pdir.name)
         except OSError as exc:
             result["errors"].append(f"rmtree {pdir}: {exc}")
 
+    if catalog is not None:
+        catalog.save()
+
     logger.info(
         "cost-ledger harvest: sessions=%d dirs_removed=%d freed=%d bytes "
         "ledger=+%d bytes errors=%d",
@@ -3768,18 +3842,14 @@ def _cleanup_scan(
 
 
 def _dir_size(p: Path) -> int:
-    """Soma recursiva do tamanho dos arquivos em ``p``. Best-effort: erros → 0."""
-    total = 0
-    try:
-        for child in p.rglob("*"):
-            try:
-                if child.is_file():
-                    total += child.stat().st_size
-            except OSError:
-                pass
-    except OSError:
-        pass
-    return total
+    """Tamanho de ``p``: valor contabilizado se conhecido, senão varredura.
+
+    Best-effort: erros de I/O por entrada são ignorados.
+    """
+    known = _WORKSPACE_ACCOUNTING.known_size(p)
+    if known is not None:
+        return known
+    return _core.dir_bytes(p)
 
 
 def _do_cleanup(
@@ -3833,6 +3903,7 @@ def _do_cleanup(
             size = _dir_size(p)
             shutil.rmtree(p, ignore_errors=True)
             if not p.exists():
+                _WORKSPACE_ACCOUNTING.forget(p)
                 removed_workdirs.append(workdir_str)
                 freed_bytes += size
         except OSError as exc:
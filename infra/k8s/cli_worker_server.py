@@ -77,6 +77,10 @@ _CLEANUP_INTERVAL_S: float = float(
     os.environ.get("DEILE_CLI_WORKER_CLEANUP_INTERVAL_S", "3600")
 )
 
+#: Tamanho por workdir, registrado ao fim de cada task — o cleanup usa o valor
+#: contabilizado em vez de varrer a árvore antes do ``rmtree``.
+_WORKSPACE_ACCOUNTING = _core.WorkspaceAccounting()
+
 #: Retenção dos logs de progresso — gatilho da poda DEPOIS de o custo ser
 #: colhido para o ledger durável. Logs volumosos; ledger minúsculo (~KB).
 _PROGRESS_RETENTION_DAYS: int = int(
@@ -527,6 +531,9 @@ async def dispatch_handler(request: web.Request) -> web.Response:
             ),
             "task_id": task_id,
         }, status=409)
+    # A task vai mexer no workspace: o tamanho contabilizado deixa de valer
+    # até o ``record`` do fim da task.
+    _WORKSPACE_ACCOUNTING.mark_dirty(workspace)
 
     # Plano §1.5: clone + checkout ANTES do CLI. Sem slug o CLI roda no workspace
     # cru e o gate reprova se nada for pushado.
@@ -538,6 +545,7 @@ async def dispatch_handler(request: web.Request) -> web.Response:
         )
         if not repo_ok:
             await _release_lease(workspace / ".lease.json")
+            _WORKSPACE_ACCOUNTING.record_soon(workspace)
             return web.json_response({
                 "ok": False,
                 "error_code": "REPO_SETUP_FAILED",
@@ -586,6 +594,7 @@ async def dispatch_handler(request: web.Request) -> web.Response:
             auth_ok, auth_detail = False, f"provision_auth exceção: {exc}"
         if not auth_ok:
             await _release_lease(workspace / ".lease.json")
+            _WORKSPACE_ACCOUNTING.record_soon(workspace)
             return web.json_response({
                 "ok": False,
                 "error_code": "WORKER_AUTH_EXPIRED",
@@ -678,6 +687,9 @@ async def dispatch_handler(request: web.Request) -> web.Response:
             except Exception:  # noqa: BLE001
                 pass
             await _release_lease(workspace / ".lease.json")
+            # Workspace só muda com a task rodando: contabiliza o tamanho
+            # agora (fora do event loop) para o cleanup não precisar varrê-lo.
+            _WORKSPACE_ACCOUNTING.record_soon(workspace)
 
     if not wait_for_result:
         asyncio.create_task(_run_and_finalize(), name=f"dispatch-{task_id}")
@@ -1148,6 +1160,7 @@ def run_cleanup() -> dict:
     root = _worker_root()
     res = _core.startup_cleanup(
         root, retention_days=_CLEANUP_RETENTION_DAYS, has_session=None,
+        accounting=_WORKSPACE_ACCOUNTING,
     )
     try:
         harvest = harvest_progress_to_ledger(root, _selected_kind())
@@ -84,6 +84,14 @@ def _fleet_progress_parse_source() -> str:
     import inspect
     return inspect.getsource(fleet_progress_parse)
 
+
+def _jsonl_cost_source() -> str:
+    """Source de ``jsonl_cost`` (agregação incremental) para o parser in-pod."""
+    import inspect
+
+    import jsonl_cost
+    return inspect.getsource(jsonl_cost)
+
 # UTC−3, sem DST desde 2019
 BRT = timezone(timedelta(hours=-3))
 
@@ -310,6 +318,11 @@ _FPP = {}
 exec(compile(__FLEET_PROGRESS_PARSE_SOURCE__, "<fleet_progress_parse>", "exec"), _FPP)
 _parse_progress_text = _FPP["parse_progress_text"]
 
+# Idem para jsonl_cost (agregação incremental do claude — placeholder
+# __JSONL_COST_SOURCE__ substituído pelo host).
+_JC = {}
+exec(compile(__JSONL_COST_SOURCE__, "<jsonl_cost>", "exec"), _JC)
+
 
 def _ledger_path():
     # Espelha cli_worker_server._cost_ledger_path.
@@ -381,64 +394,29 @@ def parse_progress_kind():
 
 
 def parse_claude():
+    # Incremental (jsonl_cost.IncrementalAggregator): checkpoint por arquivo no
+    # PVC — cada refresh lê só os bytes anexados desde o anterior, em vez de
+    # reparsear todo o histórico. Mesma dedup (message.id, requestId).
     BASE = "/home/claude/.claude/projects"
+    ck_path = os.environ.get("FLEET_CLAUDE_CHECKPOINT") or os.path.join(
+        os.path.dirname(BASE), ".fleet-cost-checkpoint.json")
+    agg = _JC["IncrementalAggregator"](None if ck_path == "off" else ck_path)
+    paths = sorted(glob.glob(os.path.join(BASE, "**", "*.jsonl"), recursive=True))
+    agg.scan(paths, since_mtime=SINCE_MTIME)
+    agg.save()
     sessions = []
-    for f in sorted(glob.glob(os.path.join(BASE, "**", "*.jsonl"), recursive=True)):
+    for f in paths:
         mt = _mtime(f)
         if SINCE_MTIME and mt is not None and mt < SINCE_MTIME:
             continue
-        sid = os.path.splitext(os.path.basename(f))[0]
-        s = {"worker": "claude", "task_id": sid, "source": f, "models": {},
-             "native_cost": None, "first_ts": None, "last_ts": None,
-             "brief": None, "mtime": mt}
-        seen = set(); noid = 0
-        try:
-            with open(f, errors="replace") as fh:
-                for line in fh:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        o = json.loads(line)
-                    except Exception:
-                        continue
-                    ts = o.get("timestamp")
-                    if ts:
-                        if s["first_ts"] is None:
-                            s["first_ts"] = ts
-                        s["last_ts"] = ts
-                    msg = o.get("message")
-                    if not isinstance(msg, dict):
-                        continue
-                    if (msg.get("role") == "user" or o.get("type") == "user") and s["brief"] is None:
-                        c = msg.get("content")
-                        if isinstance(c, str) and c.strip():
-                            s["brief"] = c[:4000]
-                        elif isinstance(c, list):
-                            parts = [b.get("text", "") for b in c
-                                     if isinstance(b, dict) and b.get("type") == "text"]
-                            t = "\n".join(parts)
-                            if t.strip():
-                                s["brief"] = t[:4000]
-                    if msg.get("role") != "assistant":
-                        continue
-                    rkey = (msg.get("id"), o.get("requestId"))
-                    if rkey == (None, None):
-                        noid += 1; rkey = ("__noid__", noid)
-                    if rkey in seen:
-                        continue
-                    seen.add(rkey)
-                    u = msg.get("usage")
-                    if not isinstance(u, dict):
-                        continue
-                    _add(s, msg.get("model") or "unknown", {
-                        "in": u.get("input_tokens", 0),
-                        "out": u.get("output_tokens", 0),
-                        "cc": u.get("cache_creation_input_tokens", 0),
-                        "cr": u.get("cache_read_input_tokens", 0),
-                    })
-        except Exception:
-            pass
+        summ = agg.summary(f)
+        if summ is None:
+            continue
+        s = {"worker": "claude", "task_id": summ["session_id"], "source": f,
+             "models": {}, "native_cost": None, "first_ts": summ["first_ts"],
+             "last_ts": summ["last_ts"], "brief": summ["brief"], "mtime": mt}
+        for model, tk in summ["models"].items():
+            _add(s, model, tk)
         if any(sum(v.values()) > 0 for v in s["models"].values()):
             sessions.append(s)
     return sessions
@@ -491,6 +469,9 @@ print(json.dumps(fn() if fn else []))
 IN_POD_PARSER = IN_POD_PARSER.replace(
     "__FLEET_PROGRESS_PARSE_SOURCE__",
     repr(_fleet_progress_parse_source()),
+).replace(
+    "__JSONL_COST_SOURCE__",
+    repr(_jsonl_cost_source()),
 )
 
 
@@ -7,7 +7,14 @@ Centraliza o que antes vivia duplicado/embutido em ``session_tokens_audit.py``:
 * Cálculo de custo: ``cost_of_model`` / ``fleet_cost_of_model`` /
   ``nocache_cost_of_model``.
 * ``aggregate_jsonl`` / ``summarize_jsonl`` — agregam um JSONL com dedup
-  ``(message.id, requestId)`` provada contra ``last_total_cost_usd`` (erro < 0,1%).
+  ``(message.id, requestId)`` provada contra ``last_total_cost_usd`` (erro < 0,1%)
+  — janela dos últimos :data:`DEDUP_WINDOW` rounds (as repetições são adjacentes).
+* ``IncrementalAggregator`` / ``read_appended`` — mesma agregação retomada de
+  um checkpoint por arquivo: cada refresh lê só os bytes anexados e o
+  checkpoint (journal JSONL) recebe só as entradas que mudaram.
+* ``SessionCatalog`` — índice persistente ``session_id → JSONL`` (tamanho,
+  offset, pico de contexto, última atividade) para o worker localizar e medir
+  sessões sem varrer ``~/.claude/projects`` nem reler o transcript.
 
 Stdlib-pura: roda no host (``session_tokens_audit.py``) e dentro do pod
 (``claude_worker_server.py``). Sem dependências externas.
@@ -15,10 +22,13 @@ Stdlib-pura: roda no host (``session_tokens_audit.py``) e dentro do pod
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
-from typing import Dict, Optional
+import threading
+import time
+from typing import Dict, List, Optional
 
 # --------------------------------------------------------------------------- #
 # Preços oficiais (USD por MILHÃO de tokens). read = cache hit (0.1x input).   #
@@ -183,8 +193,9 @@ def fleet_cost_of_model(tk: dict, model: str, *, declared: Optional[dict] = None
 
 
 # NOTA DE PARIDADE: este laço de dedup+soma é a fonte única da agregação de
-# custo. O parser in-pod em ``session_tokens_audit.IN_POD_PARSER`` implementa
-# o MESMO algoritmo; paridade travada por
+# custo. O parser in-pod em ``session_tokens_audit.IN_POD_PARSER`` herda de
+# ``SessionAccumulator`` (ganchos ``_on_message``/``_on_round``) em vez de
+# reimplementá-lo; algoritmo travado por
 # ``test_jsonl_cost.test_aggregate_parity_with_inpod_reference``.
 def _empty_model() -> Dict[str, int]:
     return {"in": 0, "out": 0, "cc": 0, "cr": 0, "cc_5m": 0, "cc_1h": 0}
@@ -208,6 +219,188 @@ def _text_of(content) -> str:
     return ""
 
 
+#: Rounds recentes lembrados pelo dedup ``(message.id, requestId)``. As
+#: repetições são deltas de streaming/retries ADJACENTES ao registro original,
+#: então uma janela basta — e mantém o estado persistido O(1) por sessão, em vez
+#: de um set que cresce com o histórico.
+DEDUP_WINDOW = 256
+
+
+class SessionAccumulator:
+    """Dobra registros de um JSONL ``claude -p`` no resumo de :func:`summarize_jsonl`.
+
+    Separado do loop de leitura para o caminho incremental
+    (:class:`IncrementalAggregator`) retomar do ponto onde parou:
+    :meth:`to_state` / :meth:`from_state` serializam o estado em JSON — os
+    agregados mais a janela de dedup (:data:`DEDUP_WINDOW`).
+
+    Subclasses (ex.: o parser in-pod do ``session_tokens_audit``) estendem o
+    resumo por :meth:`_on_message` / :meth:`_on_round` sem duplicar o dedup
+    e a soma de tokens; :meth:`_restore` recupera os campos extras.
+    """
+
+    #: Teto do ``brief`` (``None`` = texto completo).
+    BRIEF_CAP: Optional[int] = _BRIEF_CAP
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.models: Dict[str, Dict[str, int]] = {}
+        self.tools: Dict[str, int] = {}
+        self.stop_reasons: Dict[str, int] = {}
+        self.errors = {"synthetic": 0, "max_tokens": 0, "api_error": 0, "tool_error": 0}
+        self.fields: Dict[str, Optional[str]] = dict.fromkeys(_SUMMARY_FIELDS)
+        self.rounds = 0
+        self.user_msgs = 0
+        self.tool_calls = 0
+        # dict como set ordenado: o mais antigo sai quando a janela enche.
+        self.seen: Dict[tuple, None] = {}
+        self.noid = 0
+
+    def feed_line(self, line: str) -> None:
+        line = line.strip()
+        if not line:
+            return
+        try:
+            o = json.loads(line)
+        except Exception:
+            return
+        if isinstance(o, dict):
+            self.feed(o)
+
+    def feed(self, o: dict) -> None:
+        f = self.fields
+        ts = o.get("timestamp")
+        if ts:
+            if f["first_ts"] is None:
+                f["first_ts"] = ts
+            f["last_ts"] = ts
+        if o.get("cwd") and not f["cwd"]:
+            f["cwd"] = o.get("cwd")
+        if o.get("gitBranch") and not f["git_branch"]:
+            f["git_branch"] = o.get("gitBranch")
+        for src, dst in _LAST_WINS_FIELDS:
+            if o.get(src):
+                f[dst] = o.get(src)
+        if o.get("isApiErrorMessage"):
+            self.errors["api_error"] += 1
+        tur = o.get("toolUseResult")
+        if isinstance(tur, dict) and tur.get("is_error"):
+            self.errors["tool_error"] += 1
+
+        msg = o.get("message")
+        if not isinstance(msg, dict):
+            return
+        role = msg.get("role")
+        if role == "user" or o.get("type") == "user":
+            self.user_msgs += 1
+            if f["brief"] is None:
+                t = _text_of(msg.get("content"))
+                if t.strip():
+                    f["brief"] = t[:self.BRIEF_CAP] if self.BRIEF_CAP else t
+        self._on_message(o, msg)
+        if role != "assistant":
+            return
+        rkey = (msg.get("id"), o.get("requestId"))
+        if rkey == (None, None):
+            self.noid += 1
+            rkey = ("__noid__", self.noid)
+        if rkey in self.seen:
+            return
+        self.seen[rkey] = None
+        if len(self.seen) > DEDUP_WINDOW:
+            del self.seen[next(iter(self.seen))]
+        self.rounds += 1
+        model = msg.get("model") or "unknown"
+        sr = msg.get("stop_reason")
+        if sr:
+            self.stop_reasons[sr] = self.stop_reasons.get(sr, 0) + 1
+            if sr == "max_tokens":
+                self.errors["max_tokens"] += 1
+        if model == "<synthetic>":
+            self.errors["synthetic"] += 1
+        if "prompt is too long" in _text_of(msg.get("content")).lower():
+            self.errors["api_error"] += 1
+        c = msg.get("content")
+        if isinstance(c, list):
+            for b in c:
+                if isinstance(b, dict) and b.get("type") == "tool_use":
+                    self.tool_calls += 1
+                    nm = b.get("name", "?")
+                    self.tools[nm] = self.tools.get(nm, 0) + 1
+        u = msg.get("usage")
+        if isinstance(u, dict):
+            mm = self.models.setdefault(model, _empty_model())
+            mm["in"] += u.get("input_tokens", 0) or 0
+            mm["out"] += u.get("output_tokens", 0) or 0
+            mm["cc"] += u.get("cache_creation_input_tokens", 0) or 0
+            mm["cr"] += u.get("cache_read_input_tokens", 0) or 0
+            ccd = u.get("cache_creation")
+            if isinstance(ccd, dict):
+                mm["cc_5m"] += ccd.get("ephemeral_5m_input_tokens", 0) or 0
+                mm["cc_1h"] += ccd.get("ephemeral_1h_input_tokens", 0) or 0
+        self._on_round(o, msg)
+
+    def _on_message(self, o: dict, msg: dict) -> None:
+        """Gancho: todo registro com ``message`` (antes do dedup de round)."""
+
+    def _on_round(self, o: dict, msg: dict) -> None:
+        """Gancho: cada round assistant novo (depois do dedup e da soma)."""
+
+    def result(self) -> dict:
+        out = {
+            "session_id": self.session_id,
+            "models": {k: dict(v) for k, v in self.models.items()},
+            "tools": dict(self.tools),
+            "assistant_rounds": self.rounds,
+            "user_msgs": self.user_msgs,
+            "tool_calls": self.tool_calls,
+        }
+        out.update(self.fields)
+        out["errors"] = dict(self.errors)
+        out["stop_reasons"] = dict(self.stop_reasons)
+        return out
+
+    def to_state(self) -> dict:
+        state = self.result()
+        state["seen"] = [list(k) for k in self.seen]
+        state["noid"] = self.noid
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict) -> "SessionAccumulator":
+        acc = cls(state.get("session_id") or "")
+        acc.models = {k: dict(v) for k, v in (state.get("models") or {}).items()}
+        acc.tools = dict(state.get("tools") or {})
+        acc.stop_reasons = dict(state.get("stop_reasons") or {})
+        acc.errors.update(state.get("errors") or {})
+        for k in _SUMMARY_FIELDS:
+            acc.fields[k] = state.get(k)
+        acc.rounds = state.get("assistant_rounds", 0) or 0
+        acc.user_msgs = state.get("user_msgs", 0) or 0
+        acc.tool_calls = state.get("tool_calls", 0) or 0
+        acc.seen = dict.fromkeys(tuple(k) for k in (state.get("seen") or ())[-DEDUP_WINDOW:])
+        acc.noid = state.get("noid", 0) or 0
+        acc._restore(state)
+        return acc
+
+    def _restore(self, state: dict) -> None:
+        """Gancho: recupera de ``state`` os campos que a subclasse põe no ``result``."""
+
+
+#: Campos escalares do resumo (ordem = ordem do dict devolvido).
+_SUMMARY_FIELDS = (
+    "cwd", "git_branch", "version", "permission_mode", "entrypoint",
+    "ai_title", "pr_number", "pr_url", "pr_repo", "first_ts", "last_ts", "brief",
+)
+#: (chave no registro JSONL, campo do resumo) — o último valor não-vazio vence.
+_LAST_WINS_FIELDS = (
+    ("version", "version"), ("permissionMode", "permission_mode"),
+    ("entrypoint", "entrypoint"), ("aiTitle", "ai_title"),
+    ("prNumber", "pr_number"), ("prUrl", "pr_url"),
+    ("prRepository", "pr_repo"),
+)
+
+
 def summarize_jsonl(path: str) -> dict:
     """Resumo COMPLETO de uma sessão ``claude -p`` — superset de :func:`aggregate_jsonl`.
 
@@ -223,133 +416,14 @@ def summarize_jsonl(path: str) -> dict:
         ``ai_title``, ``pr_number``, ``pr_url``, ``pr_repo``, ``first_ts``,
         ``last_ts``, ``brief``, ``errors``, ``stop_reasons``.
     """
-    session_id = os.path.splitext(os.path.basename(path))[0]
-    models: Dict[str, Dict[str, int]] = {}
-    tools: Dict[str, int] = {}
-    stop_reasons: Dict[str, int] = {}
-    errors = {"synthetic": 0, "max_tokens": 0, "api_error": 0, "tool_error": 0}
-    first_ts: Optional[str] = None
-    last_ts: Optional[str] = None
-    cwd = git_branch = version = permission_mode = entrypoint = None
-    ai_title = pr_number = pr_url = pr_repo = None
-    brief: Optional[str] = None
-    rounds = user_msgs = tool_calls = 0
-    seen = set()
-    noid = 0
-
+    acc = SessionAccumulator(os.path.splitext(os.path.basename(path))[0])
     try:
         with open(path, errors="replace") as fh:
             for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    o = json.loads(line)
-                except Exception:
-                    continue
-                ts = o.get("timestamp")
-                if ts:
-                    if first_ts is None:
-                        first_ts = ts
-                    last_ts = ts
-                if o.get("cwd") and not cwd:
-                    cwd = o.get("cwd")
-                if o.get("gitBranch") and not git_branch:
-                    git_branch = o.get("gitBranch")
-                if o.get("version"):
-                    version = o.get("version")
-                if o.get("permissionMode"):
-                    permission_mode = o.get("permissionMode")
-                if o.get("entrypoint"):
-                    entrypoint = o.get("entrypoint")
-                if o.get("aiTitle"):
-                    ai_title = o.get("aiTitle")
-                if o.get("prNumber"):
-                    pr_number = o.get("prNumber")
-                if o.get("prUrl"):
-                    pr_url = o.get("prUrl")
-                if o.get("prRepository"):
-                    pr_repo = o.get("prRepository")
-                if o.get("isApiErrorMessage"):
-                    errors["api_error"] += 1
-                tur = o.get("toolUseResult")
-                if isinstance(tur, dict) and tur.get("is_error"):
-                    errors["tool_error"] += 1
-
-                msg = o.get("message")
-                if not isinstance(msg, dict):
-                    continue
-                role = msg.get("role")
-                if role == "user" or o.get("type") == "user":
-                    user_msgs += 1
-                    if brief is None:
-                        t = _text_of(msg.get("content"))
-                        if t.strip():
-                            brief = t[:_BRIEF_CAP]
-                if role != "assistant":
-                    continue
-                rkey = (msg.get("id"), o.get("requestId"))
-                if rkey == (None, None):
-                    noid += 1
-                    rkey = ("__noid__", noid)
-                if rkey in seen:
-                    continue
-                seen.add(rkey)
-                rounds += 1
-                model = msg.get("model") or "unknown"
-                sr = msg.get("stop_reason")
-                if sr:
-                    stop_reasons[sr] = stop_reasons.get(sr, 0) + 1
-                    if sr == "max_tokens":
-                        errors["max_tokens"] += 1
-                if model == "<synthetic>":
-                    errors["synthetic"] += 1
-                if "prompt is too long" in _text_of(msg.get("content")).lower():
-                    errors["api_error"] += 1
-                c = msg.get("content")
-                if isinstance(c, list):
-                    for b in c:
-                        if isinstance(b, dict) and b.get("type") == "tool_use":
-                            tool_calls += 1
-                            nm = b.get("name", "?")
-                            tools[nm] = tools.get(nm, 0) + 1
-                u = msg.get("usage")
-                if not isinstance(u, dict):
-                    continue
-                mm = models.setdefault(model, _empty_model())
-                mm["in"] += u.get("input_tokens", 0) or 0
-                mm["out"] += u.get("output_tokens", 0) or 0
-                mm["cc"] += u.get("cache_creation_input_tokens", 0) or 0
-                mm["cr"] += u.get("cache_read_input_tokens", 0) or 0
-                ccd = u.get("cache_creation")
-                if isinstance(ccd, dict):
-                    mm["cc_5m"] += ccd.get("ephemeral_5m_input_tokens", 0) or 0
-                    mm["cc_1h"] += ccd.get("ephemeral_1h_input_tokens", 0) or 0
+                acc.feed_line(line)
     except OSError:
         pass
-
-    return {
-        "session_id": session_id,
-        "models": models,
-        "tools": tools,
-        "assistant_rounds": rounds,
-        "user_msgs": user_msgs,
-        "tool_calls": tool_calls,
-        "cwd": cwd,
-        "git_branch": git_branch,
-        "version": version,
-        "permission_mode": permission_mode,
-        "entrypoint": entrypoint,
-        "ai_title": ai_title,
-        "pr_number": pr_number,
-        "pr_url": pr_url,
-        "pr_repo": pr_repo,
-        "first_ts": first_ts,
-        "last_ts": last_ts,
-        "brief": brief,
-        "errors": errors,
-        "stop_reasons": stop_reasons,
-    }
+    return acc.result()
 
 
 def aggregate_jsonl(path: str) -> dict:
@@ -370,3 +444,698 @@ def aggregate_jsonl(path: str) -> dict:
         "last_ts": s["last_ts"],
         "assistant_rounds": s["assistant_rounds"],
     }
+
+
+# --------------------------------------------------------------------------- #
+# Agregação incremental com checkpoint por arquivo                             #
+# --------------------------------------------------------------------------- #
+# Refresh do audit/painel reparseava o JSONL inteiro de cada sessão a cada
+# ciclo — custo proporcional ao HISTÓRICO. O checkpoint guarda, por arquivo,
+# ``(inode, offset, head)`` + o estado parcial do acumulador; o próximo ciclo
+# lê só os bytes anexados desde ``offset``. Rotação (inode mudou), truncamento
+# (size < offset) e reescrita (``head`` difere) zeram o checkpoint e o arquivo
+# é relido do início — ``reset=True`` avisa o consumidor de deltas.
+
+#: Bytes do início do arquivo cujo hash detecta reescrita com o mesmo inode.
+_HEAD_BYTES = 64
+
+
+def _head_digest(fh, size: int) -> str:
+    fh.seek(0)
+    return hashlib.sha1(fh.read(min(_HEAD_BYTES, size))).hexdigest()
+
+
+def read_appended(path: str, checkpoint: Optional[dict] = None):
+    """Lê as linhas COMPLETAS anexadas a ``path`` desde ``checkpoint``.
+
+    Returns:
+        ``(lines, new_checkpoint, reset)``. ``lines`` são ``str`` sem o ``\\n``;
+        uma última linha sem quebra só é consumida se já for JSON válido
+        (escrita em andamento fica para o próximo ciclo). ``reset`` indica
+        que o checkpoint anterior foi descartado (rotação/truncamento).
+
+    Raises:
+        OSError: arquivo ausente/ilegível — o chamador decide (pular, podar).
+    """
+    ck = dict(checkpoint or {})
+    st = os.stat(path)
+    reset = False
+    offset = int(ck.get("offset") or 0)
+    if ck and (ck.get("inode") != st.st_ino or st.st_size < offset):
+        reset, ck, offset = True, {}, 0
+    with open(path, "rb") as fh:
+        head = _head_digest(fh, st.st_size)
+        if ck.get("head") and ck["head"] != head and offset >= _HEAD_BYTES:
+            reset, ck, offset = True, {}, 0
+        if st.st_size == offset:
+            data = b""
+        else:
+            fh.seek(offset)
+            data = fh.read(st.st_size - offset)
+    lines = []
+    cut = data.rfind(b"\n")
+    if cut >= 0:
+        lines = data[:cut].decode("utf-8", errors="replace").split("\n")
+        consumed = cut + 1
+    else:
+        consumed = 0
+    tail = data[consumed:]
+    if tail.strip():
+        tail_txt = tail.decode("utf-8", errors="replace")
+        try:
+            json.loads(tail_txt)
+        except ValueError:
+            pass
+        else:
+            lines.append(tail_txt)
+            consumed += len(tail)
+    new_offset = offset + consumed
+    return lines, {
+        "inode": st.st_ino,
+        "offset": new_offset,
+        # ``head`` só é estável quando o prefixo inteiro já foi escrito.
+        "head": head if new_offset >= _HEAD_BYTES else None,
+        "mtime": st.st_mtime,
+    }, reset
+
+
+def _models_delta(before: Dict[str, Dict[str, int]],
+                  after: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+    delta: Dict[str, Dict[str, int]] = {}
+    for model, tk in after.items():
+        prev = before.get(model) or {}
+        d = {k: v - (prev.get(k, 0) or 0) for k, v in tk.items()}
+        if any(d.values()):
+            delta[model] = d
+    return delta
+
+
+class IncrementalAggregator:
+    """Agrega N JSONL de sessão com checkpoint ``(path, inode, offset, parcial)``.
+
+    Uso típico (in-pod, a cada refresh)::
+
+        agg = IncrementalAggregator("~/.claude/.cost-checkpoint.json")
+        deltas = agg.scan(glob.glob(".../*.jsonl"))
+        agg.save()
+
+    Custo do refresh = bytes anexados desde o último ``save()``, não o
+    histórico. Os acumuladores ficam vivos em memória (:meth:`summaries` não
+    re-hidrata nada) e o checkpoint é um journal JSONL: ``save()`` anexa só
+    as entradas dos arquivos que mudaram e compacta quando o journal passa
+    do dobro das entradas vivas. ``accumulator`` troca a classe do
+    acumulador (subclasse de :class:`SessionAccumulator`).
+    """
+
+    VERSION = 2
+    #: Linhas de journal toleradas antes de compactar (além de 2x as vivas).
+    _COMPACT_SLACK = 64
+
+    def __init__(self, state_path: Optional[str] = None, *,
+                 accumulator=SessionAccumulator) -> None:
+        self.state_path = os.path.expanduser(state_path) if state_path else None
+        self.accumulator = accumulator
+        # path → {"ck": checkpoint, "acc": estado} (estado só até hidratar).
+        self._files: Dict[str, dict] = {}
+        self._accs: Dict[str, SessionAccumulator] = {}
+        self._changed: set = set()
+        self._journal_lines = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.state_path:
+            return
+        try:
+            with open(self.state_path, errors="replace") as fh:
+                header = fh.readline()
+                try:
+                    head = json.loads(header)
+                except ValueError:
+                    return
+                if not isinstance(head, dict) or head.get("v") != self.VERSION:
+                    return
+                files: Dict[str, dict] = {}
+                lines = 1
+                for line in fh:
+                    lines += 1
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # append interrompido: a entrada anterior vale
+                    if not isinstance(rec, dict) or not isinstance(rec.get("p"), str):
+                        continue
+                    entry = rec.get("e")
+                    if isinstance(entry, dict):
+                        files[rec["p"]] = entry
+                    else:
+                        files.pop(rec["p"], None)
+        except OSError:
+            return
+        self._files, self._journal_lines = files, lines
+
+    def _acc(self, path: str) -> Optional[SessionAccumulator]:
+        acc = self._accs.get(path)
+        if acc is None:
+            entry = self._files.get(path)
+            if not entry or "acc" not in entry:
+                return None
+            acc = self._accs[path] = self.accumulator.from_state(entry.pop("acc"))
+        return acc
+
+    def _entry(self, path: str) -> Optional[dict]:
+        entry = self._files.get(path)
+        if entry is None:
+            return None
+        acc = self._accs.get(path)
+        state = acc.to_state() if acc is not None else entry.get("acc")
+        return {"ck": entry.get("ck"), "acc": state}
+
+    def save(self) -> None:
+        """Persiste o que mudou desde o último ``save`` (append; compacta às vezes).
+
+        A compactação reescreve o journal inteiro via tmp + ``os.replace`` —
+        nunca meio-escrito; um append interrompido só perde a própria linha.
+        """
+        if not self.state_path or not self._changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            if (not self._journal_lines or self._journal_lines + len(self._changed)
+                    > 2 * len(self._files) + self._COMPACT_SLACK):
+                self._compact()
+            else:
+                chunk = "".join(
+                    json.dumps({"p": p, "e": self._entry(p)}, separators=(",", ":")) + "\n"
+                    for p in sorted(self._changed))
+                with open(self.state_path, "a") as fh:
+                    fh.write(chunk)
+                self._journal_lines += len(self._changed)
+            self._changed.clear()
+        except OSError:
+            pass
+
+    def _compact(self) -> None:
+        tmp = f"{self.state_path}.tmp.{os.getpid()}"
+        try:
+            with open(tmp, "w") as fh:
+                fh.write(json.dumps({"v": self.VERSION}) + "\n")
+                for path in self._files:
+                    fh.write(json.dumps({"p": path, "e": self._entry(path)},
+                                        separators=(",", ":")) + "\n")
+            os.replace(tmp, self.state_path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._journal_lines = len(self._files) + 1
+
+    def _drop(self, path: str) -> None:
+        if self._files.pop(path, None) is not None:
+            self._changed.add(path)
+        self._accs.pop(path, None)
+
+    def update(self, path: str) -> Optional[dict]:
+        """Processa os bytes novos de ``path``.
+
+        Returns:
+            ``None`` se nada mudou (ou o arquivo sumiu — a entrada sai do
+            checkpoint); senão ``{session_id, path, reset, delta, summary}`` —
+            ``delta`` são os tokens por modelo desde o último update (ou o
+            total, quando ``reset``).
+        """
+        entry = self._files.get(path) or {}
+        try:
+            lines, ck, reset = read_appended(path, entry.get("ck"))
+        except OSError:
+            self._drop(path)
+            return None
+        had_state = bool(entry) and not reset
+        if not lines and had_state:
+            if ck != entry.get("ck"):
+                entry["ck"] = ck
+                self._changed.add(path)
+            return None
+        acc = self._acc(path) if had_state else None
+        if acc is None:
+            acc = self.accumulator(os.path.splitext(os.path.basename(path))[0])
+        before = {k: dict(v) for k, v in acc.models.items()}
+        for line in lines:
+            acc.feed_line(line)
+        self._files[path] = {"ck": ck}
+        self._accs[path] = acc
+        self._changed.add(path)
+        return {
+            "session_id": acc.session_id,
+            "path": path,
+            "reset": reset or not had_state,
+            "delta": _models_delta(before, acc.models),
+            "summary": acc.result(),
+        }
+
+    def scan(self, paths, since_mtime: float = 0.0) -> list:
+        """:meth:`update` em cada path; arquivos sumidos saem do checkpoint."""
+        live = set()
+        out = []
+        for path in paths:
+            live.add(path)
+            if since_mtime:
+                try:
+                    if os.path.getmtime(path) < since_mtime:
+                        continue
+                except OSError:
+                    continue
+            upd = self.update(path)
+            if upd is not None:
+                out.append(upd)
+        self.prune(live)
+        return out
+
+    def prune(self, live_paths) -> None:
+        live = set(live_paths)
+        for path in [p for p in self._files if p not in live]:
+            self._drop(path)
+
+    def summary(self, path: str) -> Optional[dict]:
+        acc = self._acc(path)
+        return acc.result() if acc is not None else None
+
+    def summaries(self) -> Dict[str, dict]:
+        out = {}
+        for path in list(self._files):
+            acc = self._acc(path)
+            if acc is not None:
+                out[path] = acc.result()
+        return out
+
+    def mtime(self, path: str) -> Optional[float]:
+        entry = self._files.get(path)
+        return (entry.get("ck") or {}).get("mtime") if entry else None
+
+
+# --------------------------------------------------------------------------- #
+# Catálogo de sessões                                                          #
+# --------------------------------------------------------------------------- #
+# O worker localizava o JSONL de um resume iterando TODOS os dirs de projeto,
+# relia o transcript inteiro para medir o contexto antes de cada resume e
+# relistava a árvore inteira a cada ciclo de harvest de órfãos. O catálogo
+# guarda, por sessão, ``(path, projeto, checkpoint, pico de contexto)`` e, por
+# dir de projeto, ``(mtime_ns, sessões, bytes)``:
+#
+# - ``sync`` só relista um dir de projeto quando o ``mtime_ns`` dele mudou
+#   (criar/remover um JSONL altera o mtime do dir; anexar a ele não). Dirs
+#   modificados dentro de ``_RACY_WINDOW_NS`` da listagem são relistados de
+#   novo — granularidade grossa de timestamp pode esconder uma criação;
+# - ``context_peak`` lê só os bytes anexados desde o checkpoint
+#   (``read_appended``) — rotação/truncamento zeram o pico e relêem do início;
+# - ``project_bytes`` percorre um dir uma vez e depois só re-stat-a os dirs e
+#   os JSONLs vistos — anexar conta pelo tamanho atual, sem nova varredura.
+#
+# O catálogo é um CACHE: toda entrada é revalidada contra o filesystem antes de
+# ser usada, então um arquivo de estado velho (ou sobrescrito por outra réplica
+# no PVC compartilhado) custa no máximo uma releitura, nunca uma resposta errada.
+
+#: Dirs modificados tão perto da listagem são relistados no próximo ``sync``.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def context_tokens_of(record) -> int:
+    """Contexto enviado ao modelo num round: ``input + cache_read + cache_creation``.
+
+    Lê ``message.usage`` (ou ``usage`` no topo); 0 quando o registro não
+    carrega usage.
+    """
+    if not isinstance(record, dict):
+        return 0
+    msg = record.get("message")
+    usage = msg.get("usage") if isinstance(msg, dict) else None
+    if not isinstance(usage, dict):
+        usage = record.get("usage")
+    if not isinstance(usage, dict):
+        return 0
+    ctx = 0
+    for k in ("input_tokens", "cache_read_input_tokens",
+              "cache_creation_input_tokens"):
+        v = usage.get(k)
+        if isinstance(v, (int, float)):
+            ctx += int(v)
+    return ctx
+
+
+def _measure_tree(path: str) -> dict:
+    """Mede um dir de projeto guardando os stats que validam a medida depois.
+
+    ``dirs`` (``rel → mtime_ns``) denuncia criação/remoção em qualquer nível;
+    ``logs`` (``rel → size``) são os ``*.jsonl`` — crescem por append sem mexer
+    no mtime de dir nenhum, então entram no total pelo tamanho ATUAL;
+    ``other`` soma o resto.
+    """
+    tree: dict = {"dirs": {}, "logs": {}, "other": 0}
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        full = os.path.join(path, rel) if rel else path
+        try:
+            tree["dirs"][rel] = os.stat(full, follow_symlinks=False).st_mtime_ns
+            it = os.scandir(full)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                child = os.path.join(rel, entry.name) if rel else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(child)
+                    elif entry.is_file(follow_symlinks=False):
+                        size = entry.stat(follow_symlinks=False).st_size
+                        if entry.name.endswith(".jsonl"):
+                            tree["logs"][child] = size
+                        else:
+                            tree["other"] += size
+                except OSError:
+                    continue
+    return tree
+
+
+def _tree_bytes_if_current(path: str, tree: dict) -> Optional[int]:
+    """Total de ``tree`` com os JSONLs re-stat-ados; ``None`` se a árvore mudou."""
+    total = int(tree.get("other") or 0)
+    try:
+        for rel, mtime_ns in (tree.get("dirs") or {}).items():
+            full = os.path.join(path, rel) if rel else path
+            if os.stat(full, follow_symlinks=False).st_mtime_ns != mtime_ns:
+                return None
+        for rel in tree.get("logs") or ():
+            total += os.stat(os.path.join(path, rel), follow_symlinks=False).st_size
+    except OSError:
+        return None
+    return total
+
+
+def _list_sessions(path: str) -> List[str]:
+    sids: List[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.endswith(".jsonl") and entry.is_file():
+                    sids.append(entry.name[:-len(".jsonl")])
+    except OSError:
+        pass
+    return sids
+
+
+class SessionCatalog:
+    """Índice ``session_id → JSONL`` de um dir ``projects/`` (ver bloco acima).
+
+    Uso típico (in-pod)::
+
+        cat = SessionCatalog("~/.claude/projects", "~/.claude/session-catalog.json")
+        path = cat.locate(session_id)           # lookup; relista só dirs mudados
+        peak = cat.context_peak(path)           # lê só os bytes anexados
+        cat.save()
+
+    Thread-safe (o worker consulta a partir do executor).
+    """
+
+    VERSION = 1
+
+    def __init__(self, projects_dir: str, state_path: Optional[str] = None) -> None:
+        self.projects_dir = os.path.expanduser(str(projects_dir))
+        self.state_path = os.path.expanduser(state_path) if state_path else None
+        self._sessions: Dict[str, dict] = {}
+        self._projects: Dict[str, dict] = {}
+        self._dirty = False
+        self._lock = threading.RLock()
+        self.stats: Dict[str, int] = {"syncs": 0, "relists": 0,
+                                      "bytes_read": 0, "measures": 0}
+        self._load()
+
+    # ----------------------------------------------------------- persistência
+
+    def _load(self) -> None:
+        if not self.state_path:
+            return
+        try:
+            with open(self.state_path, errors="replace") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if (not isinstance(data, dict) or data.get("v") != self.VERSION
+                or data.get("root") != self.projects_dir):
+            return
+        sessions, projects = data.get("sessions"), data.get("projects")
+        if isinstance(sessions, dict) and isinstance(projects, dict):
+            self._sessions, self._projects = sessions, projects
+
+    def save(self) -> None:
+        """Persiste o catálogo (tmp + ``os.replace`` — nunca meio-escrito)."""
+        with self._lock:
+            if not self.state_path or not self._dirty:
+                return
+            tmp = f"{self.state_path}.tmp.{os.getpid()}"
+            try:
+                os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+                with open(tmp, "w") as fh:
+                    json.dump({"v": self.VERSION, "root": self.projects_dir,
+                               "sessions": self._sessions,
+                               "projects": self._projects},
+                              fh, separators=(",", ":"))
+                os.replace(tmp, self.state_path)
+                self._dirty = False
+            except OSError:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------ listagem
+
+    def sync(self) -> int:
+        """Reconcilia com ``projects_dir``. Returns quantos dirs foram relistados.
+
+        O scandir roda FORA do lock — só a decisão (quem relistar) e a
+        aplicação das listagens o seguram; ``locate`` concorrente não espera
+        o disco.
+        """
+        with self._lock:
+            self.stats["syncs"] += 1
+            known = {name: (proj["mtime_ns"], proj["listed_ns"])
+                     for name, proj in self._projects.items()}
+        listings = []
+        seen = set()
+        try:
+            it = os.scandir(self.projects_dir)
+        except OSError:
+            it = None
+        if it is not None:
+            with it:
+                for entry in it:
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                        mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+                    except OSError:
+                        continue
+                    seen.add(entry.name)
+                    mtime_listed = known.get(entry.name)
+                    if (mtime_listed is not None and mtime_listed[0] == mtime_ns
+                            and mtime_listed[1] - mtime_ns > _RACY_WINDOW_NS):
+                        continue
+                    # ``listed_ns`` ANTES do scandir: criação durante a listagem
+                    # cai dentro da janela e força nova relistagem.
+                    listed_ns = time.time_ns()
+                    listings.append((entry.name, entry.path, mtime_ns, listed_ns,
+                                     _list_sessions(entry.path)))
+        with self._lock:
+            for name, path, mtime_ns, listed_ns, sids in listings:
+                self._relist(name, path, mtime_ns, listed_ns, sids)
+            for name in [n for n in self._projects if n not in seen]:
+                self._drop_project(name)
+            return len(listings)
+
+    def _relist(self, name: str, path: str, mtime_ns: int, listed_ns: int,
+                sids: List[str]) -> None:
+        prev = self._projects.get(name) or {}
+        if prev.get("listed_ns", 0) > listed_ns:
+            return  # sync concorrente já aplicou uma listagem mais nova
+        self.stats["relists"] += 1
+        for sid in set(prev.get("sessions") or ()) - set(sids):
+            entry = self._sessions.get(sid)
+            if entry is not None and entry.get("project") == name:
+                del self._sessions[sid]
+        for sid in sids:
+            jpath = os.path.join(path, f"{sid}.jsonl")
+            entry = self._sessions.get(sid)
+            if entry is None or entry.get("path") != jpath:
+                self._sessions[sid] = {"path": jpath, "project": name}
+        self._projects[name] = {
+            "mtime_ns": mtime_ns,
+            "listed_ns": listed_ns,
+            "sessions": sorted(sids),
+            "tree": prev.get("tree"),
+        }
+        self._dirty = True
+
+    def _drop_project(self, name: str) -> None:
+        proj = self._projects.pop(name, None) or {}
+        for sid in proj.get("sessions") or ():
+            entry = self._sessions.get(sid)
+            if entry is not None and entry.get("project") == name:
+                del self._sessions[sid]
+        self._dirty = True
+
+    def forget_project(self, name: str) -> None:
+        """Esquece um dir de projeto removido (poda do harvester)."""
+        with self._lock:
+            if name in self._projects:
+                self._drop_project(name)
+
+    def projects(self) -> List[dict]:
+        """Dirs de projeto conhecidos (``name``, ``path``, ``mtime``), por nome.
+
+        Chame :meth:`sync` antes para refletir o filesystem.
+        """
+        with self._lock:
+            return [{"name": name,
+                     "path": os.path.join(self.projects_dir, name),
+                     "mtime": proj["mtime_ns"] / 1e9}
+                    for name, proj in sorted(self._projects.items())]
+
+    def project_sessions(self, name: str) -> List[str]:
+        """Paths dos ``*.jsonl`` (topo) de um dir de projeto, ordenados."""
+        with self._lock:
+            proj = self._projects.get(name) or {}
+            base = os.path.join(self.projects_dir, name)
+            return [os.path.join(base, f"{sid}.jsonl")
+                    for sid in proj.get("sessions") or ()]
+
+    def project_bytes(self, name: str) -> int:
+        """Bytes do dir de projeto.
+
+        A árvore é percorrida uma vez; depois, basta re-stat-ar os dirs e os
+        JSONLs guardados (ver :func:`_measure_tree`) — append conta sem
+        relistar nada, criação/remoção em qualquer nível força nova medida.
+        """
+        path = os.path.join(self.projects_dir, name)
+        with self._lock:
+            proj = self._projects.get(name)
+            if proj is None:
+                return 0
+            tree = proj.get("tree")
+        total = _tree_bytes_if_current(path, tree) if tree else None
+        if total is not None:
+            return total
+        tree = _measure_tree(path)
+        with self._lock:
+            self.stats["measures"] += 1
+            proj = self._projects.get(name)
+            if proj is not None:
+                proj["tree"] = tree
+                self._dirty = True
+        return int(tree["other"]) + sum(tree["logs"].values())
+
+    # ------------------------------------------------------------- sessões
+
+    def _known_path(self, session_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            path = entry["path"] if entry is not None else None
+        return path if path is not None and os.path.isfile(path) else None
+
+    def locate(self, session_id: str) -> Optional[str]:
+        """Path do JSONL de ``session_id`` — lookup; ``sync`` só em cache-miss."""
+        if not session_id:
+            return None
+        path = self._known_path(session_id)
+        if path is None:
+            self.sync()
+            path = self._known_path(session_id)
+        return path
+
+    def context_peak(self, path: str) -> int:
+        """Pico de contexto (maior round) do JSONL, lendo só os bytes novos.
+
+        Raises:
+            OSError: arquivo ausente/ilegível.
+        """
+        path = str(path)
+        sid = os.path.splitext(os.path.basename(path))[0]
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is None or entry.get("path") != path:
+                parent = os.path.dirname(path)
+                project = (os.path.basename(parent)
+                           if os.path.dirname(parent) == self.projects_dir else None)
+                entry = self._sessions[sid] = {"path": path, "project": project}
+            ck = entry.get("ck")
+            lines, new_ck, reset = read_appended(path, ck)
+            peak = 0 if reset or ck is None else int(entry.get("peak") or 0)
+            for line in lines:
+                self.stats["bytes_read"] += len(line) + 1
+                line = line.strip()
+                if not line.startswith("{"):
+                    continue
+                try:
+                    ctx = context_tokens_of(json.loads(line))
+                except ValueError:
+                    continue
+                if ctx > peak:
+                    peak = ctx
+            if new_ck != ck or peak != entry.get("peak"):
+                entry.update(ck=new_ck, peak=peak)
+                self._dirty = True
+            return peak
+
+    def session(self, session_id: str) -> Optional[dict]:
+        """Entrada do catálogo: ``path``, ``project``, ``size`` (offset lido),
+        ``peak_context_tokens`` e ``last_activity`` (mtime na última leitura)."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            ck = entry.get("ck") or {}
+            return {
+                "session_id": session_id,
+                "path": entry["path"],
+                "project": entry.get("project"),
+                "size": ck.get("offset", 0),
+                "peak_context_tokens": entry.get("peak", 0),
+                "last_activity": ck.get("mtime"),
+            }
+
+
+def main(argv=None) -> int:
+    """CLI in-pod: ``python3 jsonl_cost.py --root DIR --state FILE``.
+
+    Emite JSON com os DELTAS desde o último checkpoint (default) ou os totais
+    de todas as sessões conhecidas (``--totals``). Pensado para
+    ``kubectl exec`` — a resposta carrega só o que mudou.
+    """
+    import argparse
+    import glob
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--root", default=os.path.expanduser("~/.claude/projects"))
+    ap.add_argument("--state", default=os.path.expanduser(
+        "~/.claude/.cost-checkpoint.json"))
+    ap.add_argument("--since-mtime", type=float, default=0.0)
+    ap.add_argument("--totals", action="store_true")
+    args = ap.parse_args(argv)
+    agg = IncrementalAggregator(args.state)
+    paths = sorted(glob.glob(os.path.join(args.root, "**", "*.jsonl"),
+                             recursive=True))
+    deltas = agg.scan(paths, since_mtime=args.since_mtime)
+    agg.save()
+    if args.totals:
+        out = [dict(s, path=p, mtime=agg.mtime(p))
+               for p, s in sorted(agg.summaries().items())]
+    else:
+        out = [{k: d[k] for k in ("session_id", "path", "reset", "delta")}
+               for d in deltas]
+    print(json.dumps(out))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -88,6 +88,7 @@ class PipelineStatusState:
         self.errors_total: int = 0
         self.pods_seen: Dict[str, Dict[str, Any]] = {}
         self.schedule_summary: Dict[str, Any] = {}
+        self.stage_timings: Dict[str, Dict[str, Any]] = {}
         self.backlog: List[Dict[str, Any]] = []
         self.reaper_preview: List[Dict[str, Any]] = []
         self.ledger_snapshot: Dict[str, Dict[str, Any]] = {}
@@ -211,6 +212,11 @@ class PipelineStatusState:
         with self._lock:
             self.schedule_summary = dict(summary)
 
+    def set_stage_timings(self, timings: Dict[str, Dict[str, Any]]) -> None:
+        """Per-stage latency histograms from the monitor's stage scheduler."""
+        with self._lock:
+            self.stage_timings = dict(timings)
+
     def set_pods_seen(self, pods: Dict[str, Dict[str, Any]]) -> None:
         with self._lock:
             self.pods_seen = dict(pods)
@@ -239,6 +245,7 @@ class PipelineStatusState:
                 "errors_total": self.errors_total,
                 "pods_seen": dict(self.pods_seen),
                 "schedule_summary": dict(self.schedule_summary),
+                "stage_timings": dict(self.stage_timings),
                 "now": time.time(),
             }
 
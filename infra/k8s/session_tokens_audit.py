@@ -15,6 +15,10 @@ parser emite JSON cru (contagem de tokens por modelo, tool calls, timestamps,
 brief, PR, erros, git status). O host então calcula o custo em USD, ordena e
 renderiza a UI (tabela Rich + drill-down interativo).
 
+O parse é incremental: um checkpoint por JSONL (inode, offset, parcial) em
+``~/.claude/.audit-checkpoint.json`` no PVC faz cada refresh ler só os bytes
+anexados desde o anterior (``AUDIT_CHECKPOINT=off`` força o parse completo).
+
 Uso
 ---
     python3 infra/k8s/session_tokens_audit.py                 # tabela + modo interativo
@@ -164,235 +168,180 @@ def git_status(cwd):
     state = "clean" if (mod + unt + stg) == 0 else "dirty"
     return {"state": state, "modified": mod, "untracked": unt, "staged": stg, "root": root}
 
-def text_of(content):
-    if isinstance(content, str):
-        return content
-    if isinstance(content, list):
-        parts = []
-        for b in content:
-            if isinstance(b, dict) and b.get("type") == "text":
-                parts.append(b.get("text", ""))
-        return "\n".join(parts)
-    return ""
+# Dedup de rounds, soma de tokens e campos do resumo vêm de
+# ``jsonl_cost.SessionAccumulator`` (inlinado pelo host, fonte única #445).
+# A subclasse só acrescenta o que é exclusivo da auditoria: PRs/issues criados,
+# última resposta, tier/speed e chamadas web. Agregação incremental via
+# ``IncrementalAggregator`` (checkpoint por arquivo no PVC): cada execução lê
+# só os bytes anexados desde a anterior. AUDIT_CHECKPOINT=off desliga.
+_JC = {}
+exec(compile(__JSONL_COST_SOURCE__, "<jsonl_cost>", "exec"), _JC)
+text_of = _JC["_text_of"]
+
+_CREATE_PR = re.compile(r"gh pr create|glab mr create", re.I)
+_CREATE_ISSUE = re.compile(r"gh issue create|glab issue create", re.I)
+_ACTED_PR = re.compile(
+    r"gh (?:pr (?:review|merge|comment|ready|edit|close|reopen)|issue comment)\s+(\d+)"
+    r"|/pulls?/(\d+)"
+    r"|/merge_requests/(\d+)"
+    r"|glab mr \w+\s+(\d+)")
+_AUDIT_EXTRA = {
+    "created_prs": list,     # PRs/MRs criados via gh/glab create (lado "A" azul)
+    "created_issues": list,  # issues criadas via gh/glab create (lado "A" rosa)
+    "acted_prs": list,       # PR alvo de review/merge/comment (fallback do worked)
+    "last_response": None,   # último texto do assistant (resumo do que fez)
+    "terminal_stop_reason": None,  # stop_reason do ÚLTIMO round (como terminou)
+    "service_tier": None,    # standard | priority | batch (guarda do custo)
+    "speed": None,           # standard | fast
+    "web_tool_calls": 0,     # web_search + web_fetch (custo oculto + egress)
+}
+
+
+class AuditAccumulator(_JC["SessionAccumulator"]):
+    BRIEF_CAP = None  # brief completo (sem corte)
+
+    def __init__(self, session_id):
+        super().__init__(session_id)
+        self.extra = {k: (v() if callable(v) else v) for k, v in _AUDIT_EXTRA.items()}
+        self.create_ids = {}  # tool_use_id -> "pr" | "issue" (pareia o resultado)
+
+    def _on_message(self, o, msg):
+        role = msg.get("role")
+        if role == "user" or o.get("type") == "user":
+            # pareia resultado de gh/glab create pelo tool_use_id e colhe o
+            # número criado da URL do stdout (/pull/N, /issues/N, /merge_requests/N).
+            if not self.create_ids:
+                return
+            tur = o.get("toolUseResult")
+            cont = msg.get("content")
+            for b in (cont if isinstance(cont, list) else []):
+                if not (isinstance(b, dict) and b.get("type") == "tool_result"):
+                    continue
+                kind = self.create_ids.get(b.get("tool_use_id"))
+                if not kind:
+                    continue
+                rc = b.get("content")
+                rtxt = rc if isinstance(rc, str) else json.dumps(rc)
+                if isinstance(tur, (dict, list)):
+                    rtxt += " " + json.dumps(tur)
+                elif isinstance(tur, str):
+                    rtxt += " " + tur
+                if kind == "pr":
+                    for mt in re.finditer(r"/(?:pull|merge_requests)/(\d+)", rtxt):
+                        self.extra["created_prs"].append(int(mt.group(1)))
+                else:
+                    for mt in re.finditer(r"/issues/(\d+)", rtxt):
+                        self.extra["created_issues"].append(int(mt.group(1)))
+        elif role == "assistant":
+            # Detecção de comandos gh/glab roda em TODOS os records assistant
+            # (antes do dedup de round): os deltas de streaming têm `content`
+            # PROGRESSIVO — o primeiro (que o dedup mantém) costuma vir SEM os
+            # tool_use. Os números deduplicam via set no fim.
+            cc0 = msg.get("content")
+            for b in (cc0 if isinstance(cc0, list) else []):
+                if not (isinstance(b, dict) and b.get("type") == "tool_use"):
+                    continue
+                inp = b.get("input")
+                cmd = str(inp.get("command") or "") if isinstance(inp, dict) else ""
+                if not cmd:
+                    continue
+                if _CREATE_PR.search(cmd):
+                    self.create_ids[b.get("id")] = "pr"
+                elif _CREATE_ISSUE.search(cmd):
+                    self.create_ids[b.get("id")] = "issue"
+                for mt in _ACTED_PR.finditer(cmd):
+                    nstr = next((g for g in mt.groups() if g), None)
+                    if nstr:
+                        self.extra["acted_prs"].append(int(nstr))
+
+    def _on_round(self, o, msg):
+        ex = self.extra
+        sr = msg.get("stop_reason")
+        if sr:
+            ex["terminal_stop_reason"] = sr  # último round vence
+        txt = text_of(msg.get("content"))
+        if txt.strip():
+            ex["last_response"] = txt   # completo (sem corte)
+        u = msg.get("usage")
+        if not isinstance(u, dict):
+            return
+        if u.get("service_tier"):
+            ex["service_tier"] = u.get("service_tier")
+        if u.get("speed"):
+            ex["speed"] = u.get("speed")
+        stu = u.get("server_tool_use")
+        if isinstance(stu, dict):
+            ex["web_tool_calls"] += (
+                (stu.get("web_search_requests", 0) or 0)
+                + (stu.get("web_fetch_requests", 0) or 0))
+
+    def result(self):
+        out = super().result()
+        out.update({k: (list(v) if isinstance(v, list) else v)
+                    for k, v in self.extra.items()})
+        return out
+
+    def to_state(self):
+        state = super().to_state()
+        state["create_ids"] = dict(self.create_ids)
+        return state
+
+    def _restore(self, state):
+        for k, default in _AUDIT_EXTRA.items():
+            v = state.get(k)
+            self.extra[k] = (list(v or ()) if callable(default)
+                             else (v if v is not None else default))
+        self.create_ids = dict(state.get("create_ids") or {})
+
+
+CHECKPOINT = os.environ.get("AUDIT_CHECKPOINT") or os.path.join(
+    os.path.dirname(BASE), ".audit-checkpoint.json")
+agg = _JC["IncrementalAggregator"](
+    None if CHECKPOINT == "off" else CHECKPOINT, accumulator=AuditAccumulator)
 
 sessions = []
+live_paths = set()
 for f in sorted(glob.glob(os.path.join(BASE, "**", "*.jsonl"), recursive=True)):
+    live_paths.add(f)
     if SINCE_MTIME and os.path.getmtime(f) < SINCE_MTIME:
         continue
-    rec = {
-        "jsonl": f,
-        "project_dir": os.path.dirname(f),
-        "session_file": os.path.basename(f),
-        "models": {},          # model -> {in,out,cc,cr,cc_5m,cc_1h}
-        "tools": {},           # tool name -> count
-        "assistant_rounds": 0,
-        "user_msgs": 0,
-        "tool_calls": 0,
-        "cwd": None,
-        "git_branch": None,
-        "version": None,
-        "permission_mode": None,
-        "entrypoint": None,
-        "ai_title": None,
-        "pr_number": None,
-        "pr_url": None,
-        "pr_repo": None,
-        "meta_branch": None,     # branch real (session.json) — issue via auto/issue-N
-        "created_prs": [],       # PRs/MRs criados via gh/glab create (lado "A" azul)
-        "created_issues": [],    # issues criadas via gh/glab create (lado "A" rosa)
-        "acted_prs": [],         # PR alvo de review/merge/comment (fallback do worked)
-        "first_ts": None,
-        "last_ts": None,
-        "brief": None,
-        "last_response": None,   # último texto do assistant (resumo do que fez)
-        "terminal_stop_reason": None,  # stop_reason do ÚLTIMO round (como terminou)
-        "service_tier": None,    # standard | priority | batch (guarda do custo)
-        "speed": None,           # standard | fast
-        "web_tool_calls": 0,     # web_search + web_fetch (custo oculto + egress)
-        "errors": {"synthetic": 0, "max_tokens": 0, "api_error": 0, "tool_error": 0},
-        "stop_reasons": {},
-    }
-    seen_resp = set()   # dedup de respostas assistant por (message.id, requestId)
-    create_ids = {}     # tool_use_id -> "pr"|"issue" (comandos gh/glab create)
-    nonid_ctr = [0]
     try:
-        with open(f, errors="replace") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    o = json.loads(line)
-                except Exception:
-                    continue
-                ts = o.get("timestamp")
-                if ts:
-                    if rec["first_ts"] is None:
-                        rec["first_ts"] = ts
-                    rec["last_ts"] = ts
-                if o.get("cwd") and not rec["cwd"]:
-                    rec["cwd"] = o.get("cwd")
-                if o.get("gitBranch") and not rec["git_branch"]:
-                    rec["git_branch"] = o.get("gitBranch")
-                if o.get("version"):
-                    rec["version"] = o.get("version")
-                if o.get("permissionMode"):
-                    rec["permission_mode"] = o.get("permissionMode")
-                if o.get("entrypoint"):
-                    rec["entrypoint"] = o.get("entrypoint")
-                if o.get("aiTitle"):
-                    rec["ai_title"] = o.get("aiTitle")
-                if o.get("prNumber"):
-                    rec["pr_number"] = o.get("prNumber")
-                if o.get("prUrl"):
-                    rec["pr_url"] = o.get("prUrl")
-                if o.get("prRepository"):
-                    rec["pr_repo"] = o.get("prRepository")
-                if o.get("isApiErrorMessage"):
-                    rec["errors"]["api_error"] += 1
-                tur = o.get("toolUseResult")
-                if isinstance(tur, dict) and tur.get("is_error"):
-                    rec["errors"]["tool_error"] += 1
-
-                msg = o.get("message")
-                if not isinstance(msg, dict):
-                    continue
-                role = msg.get("role")
-                if role == "user" or o.get("type") == "user":
-                    rec["user_msgs"] += 1
-                    if rec["brief"] is None:
-                        t = text_of(msg.get("content"))
-                        if t.strip():
-                            rec["brief"] = t   # completo (sem corte)
-                    # pareia resultado de gh/glab create pelo tool_use_id e colhe o
-                    # número criado da URL do stdout (/pull/N, /issues/N, /merge_requests/N).
-                    if create_ids:
-                        cont = msg.get("content")
-                        for b in (cont if isinstance(cont, list) else []):
-                            if not (isinstance(b, dict) and b.get("type") == "tool_result"):
-                                continue
-                            kind = create_ids.get(b.get("tool_use_id"))
-                            if not kind:
-                                continue
-                            rc = b.get("content")
-                            rtxt = rc if isinstance(rc, str) else json.dumps(rc)
-                            if isinstance(tur, (dict, list)):
-                                rtxt += " " + json.dumps(tur)
-                            elif isinstance(tur, str):
-                                rtxt += " " + tur
-                            if kind == "pr":
-                                for mt in re.finditer(r"/(?:pull|merge_requests)/(\d+)", rtxt):
-                                    rec["created_prs"].append(int(mt.group(1)))
-                            else:
-                                for mt in re.finditer(r"/issues/(\d+)", rtxt):
-                                    rec["created_issues"].append(int(mt.group(1)))
-                if role == "assistant":
-                    # Detecção de comandos gh/glab roda em TODOS os records assistant
-                    # (antes do dedup de round). Motivo: os deltas de streaming têm
-                    # `content` PROGRESSIVO — o primeiro (que o dedup mantém) costuma vir
-                    # SEM os tool_use; os comandos reais chegam em deltas posteriores
-                    # (dup=True), que o dedup pula. Os números deduplicam via set no fim.
-                    cc0 = msg.get("content")
-                    if isinstance(cc0, list):
-                        for b in cc0:
-                            if not (isinstance(b, dict) and b.get("type") == "tool_use"):
-                                continue
-                            inp = b.get("input")
-                            cmd = str(inp.get("command") or "") if isinstance(inp, dict) else ""
-                            if not cmd:
-                                continue
-                            if re.search(r"gh pr create|glab mr create", cmd, re.I):
-                                create_ids[b.get("id")] = "pr"
-                            elif re.search(r"gh issue create|glab issue create", cmd, re.I):
-                                create_ids[b.get("id")] = "issue"
-                            # PR alvo de uma ação (review/merge/comment/api) — fallback
-                            # do "worked PR" quando não há registro pr-link.
-                            for mt in re.finditer(
-                                    r"gh (?:pr (?:review|merge|comment|ready|edit|close|reopen)|issue comment)\s+(\d+)"
-                                    r"|/pulls?/(\d+)"
-                                    r"|/merge_requests/(\d+)"
-                                    r"|glab mr \w+\s+(\d+)", cmd):
-                                nstr = next((g for g in mt.groups() if g), None)
-                                if nstr:
-                                    rec["acted_prs"].append(int(nstr))
-                    # claude grava o MESMO registro assistant repetido (deltas de
-                    # streaming), todos com o usage final IDÊNTICO. Sem dedup, In/
-                    # Out/Cache/Rnd/Tools/custo inflam ~13-32x. Conta cada resposta
-                    # da API uma vez por (message.id, requestId) — provado contra o
-                    # last_total_cost_usd do fornecedor (erro < 0,1%).
-                    rkey = (msg.get("id"), o.get("requestId"))
-                    if rkey == (None, None):
-                        nonid_ctr[0] += 1
-                        rkey = ("__noid__", nonid_ctr[0])
-                    if rkey in seen_resp:
-                        continue
-                    seen_resp.add(rkey)
-                    rec["assistant_rounds"] += 1
-                    model = msg.get("model") or "unknown"
-                    sr = msg.get("stop_reason")
-                    if sr:
-                        rec["stop_reasons"][sr] = rec["stop_reasons"].get(sr, 0) + 1
-                        rec["terminal_stop_reason"] = sr  # último round vence
-                        if sr == "max_tokens":
-                            rec["errors"]["max_tokens"] += 1
-                    if model == "<synthetic>":
-                        rec["errors"]["synthetic"] += 1
-                    txt = text_of(msg.get("content"))
-                    if "Prompt is too long" in txt or "prompt is too long" in txt:
-                        rec["errors"]["api_error"] += 1
-                    if txt.strip():
-                        rec["last_response"] = txt   # completo (sem corte)
-                    c = msg.get("content")
-                    if isinstance(c, list):
-                        for b in c:
-                            if isinstance(b, dict) and b.get("type") == "tool_use":
-                                rec["tool_calls"] += 1
-                                nm = b.get("name", "?")
-                                rec["tools"][nm] = rec["tools"].get(nm, 0) + 1
-                    u = msg.get("usage")
-                    if isinstance(u, dict):
-                        mm = rec["models"].setdefault(
-                            model, {"in": 0, "out": 0, "cc": 0, "cr": 0, "cc_5m": 0, "cc_1h": 0})
-                        mm["in"] += u.get("input_tokens", 0) or 0
-                        mm["out"] += u.get("output_tokens", 0) or 0
-                        cc = u.get("cache_creation_input_tokens", 0) or 0
-                        mm["cc"] += cc
-                        mm["cr"] += u.get("cache_read_input_tokens", 0) or 0
-                        ccd = u.get("cache_creation")
-                        if isinstance(ccd, dict):
-                            mm["cc_5m"] += ccd.get("ephemeral_5m_input_tokens", 0) or 0
-                            mm["cc_1h"] += ccd.get("ephemeral_1h_input_tokens", 0) or 0
-                        stt = u.get("service_tier")
-                        if stt:
-                            rec["service_tier"] = stt
-                        spd = u.get("speed")
-                        if spd:
-                            rec["speed"] = spd
-                        stu = u.get("server_tool_use")
-                        if isinstance(stu, dict):
-                            rec["web_tool_calls"] += (
-                                (stu.get("web_search_requests", 0) or 0)
-                                + (stu.get("web_fetch_requests", 0) or 0))
+        agg.update(f)
     except Exception:
         pass
+    rec = agg.summary(f)
+    if rec is None:
+        continue
+    # Pós-processamento (git/meta/stage) sobre o resumo: o checkpoint guarda
+    # só o que vem do JSONL.
+    out = {"jsonl": f, "project_dir": os.path.dirname(f),
+           "session_file": os.path.basename(f)}
+    out.update(rec)
+    del out["session_id"]
     try:
-        rec["mtime"] = os.path.getmtime(f)
+        out["mtime"] = os.path.getmtime(f)
     except Exception:
-        rec["mtime"] = None
-    rec["git"] = git_status(rec["cwd"])
-    meta = read_task_meta(rec["project_dir"])
-    rec["meta_model"] = meta.get("model")
-    rec["reasoning_effort"] = meta.get("reasoning_effort")
-    rec["ultracode"] = meta.get("ultracode")
-    rec["meta_branch"] = meta.get("branch")
-    rec["created_prs"] = sorted(set(rec["created_prs"]))
-    rec["created_issues"] = sorted(set(rec["created_issues"]))
-    rec["acted_prs"] = sorted(set(rec["acted_prs"]))
+        out["mtime"] = None
+    out["git"] = git_status(out["cwd"])
+    meta = read_task_meta(out["project_dir"])
+    out["meta_model"] = meta.get("model")
+    out["reasoning_effort"] = meta.get("reasoning_effort")
+    out["ultracode"] = meta.get("ultracode")
+    out["meta_branch"] = meta.get("branch")
+    out["created_prs"] = sorted(set(out["created_prs"]))
+    out["created_issues"] = sorted(set(out["created_issues"]))
+    out["acted_prs"] = sorted(set(out["acted_prs"]))
     # stage do meta é ground truth (o pipeline gravou); regex do brief é fallback.
-    rec["stage"] = meta.get("stage") or guess_stage(rec["brief"])
+    out["stage"] = meta.get("stage") or guess_stage(out["brief"])
     # só inclui sessões que tenham ao menos uma resposta assistant com tokens
-    if any((sum(v.values()) > 0) for v in rec["models"].values()):
-        sessions.append(rec)
+    if any((sum(v.values()) > 0) for v in out["models"].values()):
+        sessions.append(out)
+
+agg.prune(live_paths)
+try:
+    agg.save()
+except Exception:
+    pass
 
 # Ledger de custo (issue #445): sessões já podadas do disco vivem só aqui.
 # O harvester do claude_worker_server colheu o RESUMO COMPLETO de cada sessão
@@ -486,6 +435,19 @@ print(json.dumps(sessions))
 '''
 
 
+def _jsonl_cost_source() -> str:
+    """Source de ``jsonl_cost`` inlinado no parser (pod pode não ter o módulo)."""
+    import inspect
+
+    import jsonl_cost
+    return inspect.getsource(jsonl_cost)
+
+
+# repr() escapa o source como literal Python seguro para o placeholder.
+IN_POD_PARSER = IN_POD_PARSER.replace(
+    "__JSONL_COST_SOURCE__", repr(_jsonl_cost_source()))
+
+
 # --------------------------------------------------------------------------- #
 # Host helpers                                                                 #
 # --------------------------------------------------------------------------- #